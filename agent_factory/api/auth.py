@@ -0,0 +1,20 @@
+"""API authentication dependencies."""
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from agent_factory.api.config import get_settings
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(None, alias="X-Admin-Key")) -> None:
+    """
+    Allow only requests carrying the admin API key.
+
+    Fails closed: when ADMIN_API_KEY is not configured every request is rejected.
+    """
+    expected = get_settings().admin_api_key
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin API not configured")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
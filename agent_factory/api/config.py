@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     app_url: str = "https://rivet.io"
     api_url: str = "https://api.rivet.io"
     debug: bool = False
+    admin_api_key: str = ""  # X-Admin-Key for operational endpoints; empty disables them
     
     # Stripe
     stripe_secret_key: str = ""
@@ -21,6 +22,8 @@ class Settings(BaseSettings):
     stripe_price_basic: str = ""
     stripe_price_pro: str = ""
     stripe_price_enterprise: str = ""
+    webhook_queue_path: str = "data/stripe_webhooks.db"
+    webhook_workers: int = 4
     
     # Database
     database_url: str = ""
@@ -42,6 +42,19 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("Stripe secret key not set!")
 
+    # Start Stripe webhook workers (also drains events queued before a restart)
+    from agent_factory.api.routers.stripe import get_webhook_queue
+    await get_webhook_queue().start()
+
+    # Open the shared Atlas CMMS client (pooled connections, shared token)
+    from agent_factory.integrations.atlas import AtlasConfigError, atlas_config, get_atlas_client
+    if atlas_config.atlas_enabled:
+        try:
+            await get_atlas_client().open()
+            logger.info("Atlas CMMS client ready")
+        except AtlasConfigError as e:
+            logger.warning(f"Atlas CMMS client disabled: {e}")
+
     # Initialize Factory.io MachineStateManager (optional)
     try:
         from agent_factory.platform.config import load_machine_config
@@ -97,6 +110,18 @@ async def lifespan(app: FastAPI):
         await state_manager.stop()
         logger.info("Factory.io polling stopped")
 
+    # Stop Stripe webhook workers (in-flight events are retried on next start)
+    from agent_factory.api.routers.stripe import shutdown_webhook_queue
+    await shutdown_webhook_queue()
+
+    # Close the shared Atlas CMMS client
+    from agent_factory.integrations.atlas import shutdown_atlas_client
+    await shutdown_atlas_client()
+
+    # Stop manual ingestion workers (lets running jobs finish)
+    from agent_factory.knowledge.manual_ingestion import shutdown_ingestion_queue
+    shutdown_ingestion_queue(wait=True)
+
 
 def get_state_manager() -> "MachineStateManager":
     """
@@ -1,26 +1,31 @@
 """Manual management endpoints for RIVET backend.
 
 Handles:
-- Manual upload and indexing
+- Manual upload (streamed to disk) and background indexing
+- Indexing job status
 - Manual search (by query, manufacturer, component family)
 - Manual gap tracking
 - Manual listing
 """
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple
+import hashlib
 import logging
 from pathlib import Path
 import tempfile
 
-from agent_factory.rivet_pro.database import RIVETProDatabase
-from agent_factory.knowledge.manual_indexer import ManualIndexer
+from agent_factory.knowledge.manual_ingestion import get_ingestion_queue
 from agent_factory.knowledge.manual_search import ManualSearchService
 from agent_factory.observability.langsmith_config import trace_endpoint
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Uploads are copied to disk in 1 MB chunks instead of being read into memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 # =============================================================================
 # SCHEMAS
@@ -36,6 +41,21 @@ class ManualUploadResponse(BaseModel):
     indexed: bool
 
 
+class ManualJobResponse(BaseModel):
+    """Status of a background manual indexing job."""
+    job_id: str
+    status: str
+    progress: float
+    pages_done: int
+    total_pages: int
+    sha256: str
+    size_bytes: int
+    duplicate: bool = False
+    manual_id: Optional[str] = None
+    error: Optional[str] = None
+    manual: Optional[ManualUploadResponse] = None
+
+
 class ManualSearchRequest(BaseModel):
     """Request to search manuals."""
     query: str
@@ -90,7 +110,79 @@ class ManualGapsResponse(BaseModel):
 # ENDPOINTS
 # =============================================================================
 
-@router.post("/upload", response_model=ManualUploadResponse)
+def _copy_upload(source: BinaryIO) -> Tuple[str, str, int]:
+    """
+    Copy an upload's spooled file to a temp file, hashing it on the way.
+
+    Blocking (disk I/O and SHA-256); run it in a worker thread.
+
+    Args:
+        source: UploadFile.file
+
+    Returns:
+        (temp_path, sha256_hex, size_bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+        temp_path = temp_file.name
+        try:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                temp_file.write(chunk)
+                size += len(chunk)
+        except Exception:
+            temp_file.close()
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+    return temp_path, digest.hexdigest(), size
+
+
+async def _save_upload(upload: UploadFile) -> Tuple[str, str, int]:
+    """
+    Stream an upload to a temp file off the event loop.
+
+    Args:
+        upload: Incoming file upload
+
+    Returns:
+        (temp_path, sha256_hex, size_bytes)
+    """
+    return await run_in_threadpool(_copy_upload, upload.file)
+
+
+def _job_response(job, duplicate: bool = False) -> ManualJobResponse:
+    """Build the API response for an ingestion job."""
+    manual = None
+    if job.manual:
+        manual = ManualUploadResponse(
+            manual_id=str(job.manual['id']),
+            title=job.manual.get('title') or job.title,
+            manufacturer=job.manual.get('manufacturer') or job.manufacturer,
+            component_family=job.manual.get('component_family') or job.component_family,
+            page_count=job.manual.get('page_count') or 0,
+            indexed=bool(job.manual.get('indexed'))
+        )
+    return ManualJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        progress=job.progress,
+        pages_done=job.pages_done,
+        total_pages=job.total_pages,
+        sha256=job.sha256,
+        size_bytes=job.size_bytes,
+        duplicate=duplicate,
+        manual_id=job.manual_id,
+        error=job.error,
+        manual=manual
+    )
+
+
+@router.post("/upload", response_model=ManualJobResponse, status_code=202)
 @trace_endpoint
 async def upload_manual(
     file: UploadFile = File(...),
@@ -100,7 +192,11 @@ async def upload_manual(
     document_type: str = Form("user_manual")
 ):
     """
-    Upload and index a manual PDF.
+    Upload a manual PDF and queue it for indexing.
+
+    The file is streamed to disk and indexed by a background worker; poll
+    GET /jobs/{job_id} for progress. Re-uploading identical content returns
+    the existing job instead of indexing it again.
 
     Args:
         file: PDF file upload
@@ -110,7 +206,7 @@ async def upload_manual(
         document_type: Document type (user_manual, installation_guide, etc.)
 
     Returns:
-        ManualUploadResponse with manual_id and indexing status
+        ManualJobResponse with job_id and current status
     """
     logger.info(f"Uploading manual: {title} ({manufacturer})")
 
@@ -118,50 +214,44 @@ async def upload_manual(
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-    # Save uploaded file to temp location
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-        content = await file.read()
-        temp_file.write(content)
-        temp_path = temp_file.name
-
     try:
-        # Index manual
-        indexer = ManualIndexer()
-        manual_id = indexer.index_manual(
-            file_path=temp_path,
-            title=title,
-            manufacturer=manufacturer,
-            component_family=component_family,
-            document_type=document_type
-        )
-
-        # Get manual details
-        db = RIVETProDatabase()
-        manual_details = db.search_manuals()
-        manual = next((m for m in manual_details if str(m['id']) == manual_id), None)
-
-        if not manual:
-            raise HTTPException(status_code=500, detail="Failed to retrieve indexed manual")
-
-        return ManualUploadResponse(
-            manual_id=manual_id,
-            title=title,
-            manufacturer=manufacturer,
-            component_family=component_family,
-            page_count=manual.get('page_count', 0),
-            indexed=True
-        )
-
+        temp_path, sha256, size = await _save_upload(file)
     except Exception as e:
         logger.error(f"Manual upload failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    queue = get_ingestion_queue()
+    existing = queue.find_by_hash(sha256)
+    job = queue.submit(
+        file_path=temp_path,
+        sha256=sha256,
+        title=title,
+        manufacturer=manufacturer,
+        component_family=component_family,
+        document_type=document_type,
+        size_bytes=size
+    )
 
-    finally:
-        # Cleanup temp file
-        try:
-            Path(temp_path).unlink()
-        except Exception as e:
-            logger.warning(f"Failed to cleanup temp file: {e}")
+    duplicate = (existing is not None and existing.job_id == job.job_id) or job.deduplicated
+    return _job_response(job, duplicate=duplicate)
+
+
+@router.get("/jobs/{job_id}", response_model=ManualJobResponse)
+@trace_endpoint
+async def get_upload_job(job_id: str):
+    """
+    Get progress of a manual indexing job.
+
+    Args:
+        job_id: Job id returned by POST /upload
+
+    Returns:
+        ManualJobResponse (includes the manual record once completed)
+    """
+    job = get_ingestion_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _job_response(job, duplicate=job.deduplicated)
 
 
 @router.post("/search", response_model=ManualSearchResponse)
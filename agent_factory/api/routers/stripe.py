@@ -2,17 +2,19 @@
 
 Handles:
 - Checkout session creation
-- Webhook processing
+- Webhook processing (verify + ack, handlers run from a durable queue)
 - Billing portal
 - Subscription management
 """
+import asyncio
 import stripe
-from fastapi import APIRouter, Request, HTTPException, Header
+from fastapi import APIRouter, Depends, Request, HTTPException, Header
 from pydantic import BaseModel, EmailStr
 from typing import Literal, Optional
 import logging
 from datetime import datetime
 
+from agent_factory.api.auth import require_admin
 from agent_factory.api.config import get_settings
 from agent_factory.observability.langsmith_config import trace_endpoint
 from agent_factory.api.services.user_provisioning import (
@@ -24,6 +26,7 @@ from agent_factory.api.services.telegram_notifications import (
     send_telegram_welcome,
     notify_payment_failed
 )
+from agent_factory.api.services.webhook_queue import WebhookEventQueue
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -190,8 +193,13 @@ async def stripe_webhook(
     stripe_signature: str = Header(alias="Stripe-Signature")
 ):
     """
-    Handle Stripe webhook events.
-    
+    Verify, persist and acknowledge Stripe webhook events.
+
+    Handlers run from the webhook queue after the response is sent, so slow
+    provisioning no longer makes Stripe time out and redeliver. A redelivered
+    event (same `event.id`) is acknowledged as a duplicate and not run again.
+    Events for the same customer are handled in creation order.
+
     **Events handled:**
     - `checkout.session.completed`: Provision new user
     - `customer.subscription.updated`: Update tier
@@ -219,26 +227,26 @@ async def stripe_webhook(
     
     event_type = event["type"]
     event_data = event["data"]["object"]
-    
-    logger.info(f"Processing Stripe webhook: {event_type}")
-    
-    # Route to appropriate handler
-    handlers = {
-        "checkout.session.completed": handle_checkout_completed,
-        "customer.subscription.created": handle_subscription_created,
-        "customer.subscription.updated": handle_subscription_updated,
-        "customer.subscription.deleted": handle_subscription_deleted,
-        "invoice.payment_succeeded": handle_payment_succeeded,
-        "invoice.payment_failed": handle_payment_failed,
-    }
-    
-    handler = handlers.get(event_type)
-    if handler:
-        await handler(event_data)
-    else:
-        logger.info(f"Unhandled webhook event type: {event_type}")
-    
-    return WebhookResponse(status="ok", event_type=event_type)
+
+    queue = get_webhook_queue()
+    if not queue.running:
+        await queue.start()
+
+    accepted = await queue.enqueue(
+        event["id"],
+        event_type,
+        payload.decode("utf-8"),
+        ordering_key=event_data.get("customer"),
+        created=event.get("created"),
+    )
+
+    return WebhookResponse(status="queued" if accepted else "duplicate", event_type=event_type)
+
+
+@router.get("/webhooks/stripe/metrics", dependencies=[Depends(require_admin)])
+async def stripe_webhook_metrics():
+    """Webhook queue depth, lag, retries and duplicate deliveries."""
+    return get_webhook_queue().metrics()
 
 
 # =============================================================================
@@ -261,7 +269,7 @@ async def handle_checkout_completed(session: dict):
     # Get subscription details
     current_period_end = None
     if subscription_id:
-        subscription = stripe.Subscription.retrieve(subscription_id)
+        subscription = await asyncio.to_thread(stripe.Subscription.retrieve, subscription_id)
         logger.info(f"Subscription status: {subscription.status}")
         current_period_end = datetime.fromtimestamp(subscription.current_period_end)
 
@@ -361,6 +369,39 @@ async def handle_payment_failed(invoice: dict):
     #         await notify_payment_failed(user.telegram_id, customer_email, amount_due, attempt_count)
 
 
+WEBHOOK_HANDLERS = {
+    "checkout.session.completed": handle_checkout_completed,
+    "customer.subscription.created": handle_subscription_created,
+    "customer.subscription.updated": handle_subscription_updated,
+    "customer.subscription.deleted": handle_subscription_deleted,
+    "invoice.payment_succeeded": handle_payment_succeeded,
+    "invoice.payment_failed": handle_payment_failed,
+}
+
+_webhook_queue: Optional[WebhookEventQueue] = None
+
+
+def get_webhook_queue() -> WebhookEventQueue:
+    """Return the process-wide Stripe webhook queue."""
+    global _webhook_queue
+    if _webhook_queue is None:
+        _webhook_queue = WebhookEventQueue(
+            settings.webhook_queue_path,
+            handlers=WEBHOOK_HANDLERS,
+            workers=settings.webhook_workers,
+        )
+    return _webhook_queue
+
+
+async def shutdown_webhook_queue() -> None:
+    """Stop the webhook workers (called on API shutdown)."""
+    global _webhook_queue
+    if _webhook_queue is not None:
+        await _webhook_queue.stop()
+        _webhook_queue.close()
+        _webhook_queue = None
+
+
 # =============================================================================
 # BILLING PORTAL
 # =============================================================================
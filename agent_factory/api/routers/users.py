@@ -97,8 +97,8 @@ async def provision_user(request: UserProvisionRequest):
     # ==========================================================================
     # TODO: Create user in Atlas CMMS (WS-1)
     # ==========================================================================
-    # from agent_factory.integrations.atlas import AtlasClient
-    # atlas = AtlasClient()
+    # from agent_factory.integrations.atlas import get_atlas_client
+    # atlas = get_atlas_client()
     # atlas_user = await atlas.create_user(
     #     email=request.email,
     #     role="technician",
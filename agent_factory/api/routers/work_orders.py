@@ -86,8 +86,8 @@ async def create_work_order(request: WorkOrderCreate):
     # ==========================================================================
     # TODO: Create in Atlas CMMS (WS-1 provides AtlasClient)
     # ==========================================================================
-    # from agent_factory.integrations.atlas import AtlasClient
-    # atlas = AtlasClient()
+    # from agent_factory.integrations.atlas import get_atlas_client
+    # atlas = get_atlas_client()
     # 
     # work_order = await atlas.create_work_order({
     #     "title": request.title,
@@ -220,8 +220,8 @@ async def search_assets(
     # ==========================================================================
     # TODO: Query Atlas CMMS
     # ==========================================================================
-    # from agent_factory.integrations.atlas import AtlasClient
-    # atlas = AtlasClient()
+    # from agent_factory.integrations.atlas import get_atlas_client
+    # atlas = get_atlas_client()
     # assets = await atlas.search_assets(query=q, limit=limit)
     
     # Placeholder - return empty for now
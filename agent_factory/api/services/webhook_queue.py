@@ -0,0 +1,384 @@
+"""Durable webhook event queue.
+
+The Stripe webhook endpoint verifies the signature, stores the event here
+and returns immediately; background workers run the handlers afterwards.
+Stripe no longer times out waiting for provisioning, and redeliveries of an
+event already stored are acknowledged without running its handler again.
+
+Features:
+- SQLite store (WAL) with a unique constraint on the event id
+- Async workers with exponential backoff + jitter; dead-lettered after max_attempts
+- Per-key ordering: an event waits while an earlier event for the same
+  customer is queued, retrying or in flight
+- Claims are leases: a worker marks an event "processing" with a lease
+  it renews while the handler runs; events whose lease expired (the worker
+  crashed) are re-queued, while live leases held by another process are left
+  alone
+- Metrics: depth, lag (oldest queued event age, receive -> done), duplicates
+
+Usage:
+    queue = WebhookEventQueue("data/stripe_webhooks.db", handlers={"invoice.paid": on_paid})
+    await queue.start()
+    accepted = await queue.enqueue("evt_123", "invoice.paid", payload_json, ordering_key="cus_42")
+    queue.metrics()
+"""
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EVENT_QUEUED = "queued"
+EVENT_PROCESSING = "processing"
+EVENT_DONE = "done"
+EVENT_DEAD = "dead"
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL UNIQUE,
+    event_type TEXT NOT NULL,
+    ordering_key TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    duplicates INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    received_at REAL NOT NULL,
+    finished_at REAL,
+    last_error TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_events_status ON webhook_events (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_webhook_events_key ON webhook_events (ordering_key, status);
+"""
+
+# Oldest ready event with no earlier unfinished event for the same key
+_CLAIM = """
+SELECT seq, event_id, event_type, payload, attempts, received_at FROM webhook_events e
+WHERE e.status = 'queued' AND e.next_attempt_at <= ?
+  AND (e.ordering_key = '' OR NOT EXISTS (
+      SELECT 1 FROM webhook_events p
+      WHERE p.ordering_key = e.ordering_key
+        AND p.status IN ('queued', 'processing')
+        AND (p.created < e.created OR (p.created = e.created AND p.seq < e.seq))
+  ))
+ORDER BY e.created, e.seq
+LIMIT 1
+"""
+
+
+@dataclass
+class WebhookQueueMetrics:
+    """Counters since start (read with WebhookEventQueue.metrics())."""
+    received: int = 0
+    duplicates: int = 0
+    processed: int = 0
+    retries: int = 0
+    dead_lettered: int = 0
+    unhandled: int = 0
+    last_lag_sec: float = 0.0  # receive -> done for the last processed event
+    max_lag_sec: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class WebhookEventQueue:
+    """SQLite-backed queue of webhook events processed by async workers.
+
+    Example:
+        >>> queue = WebhookEventQueue(":memory:", handlers={"checkout.session.completed": handle})
+        >>> await queue.start()
+        >>> await queue.enqueue(event["id"], event["type"], payload, ordering_key=customer_id)
+        True
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        handlers: Dict[str, Handler],
+        workers: int = 4,
+        max_attempts: int = 8,
+        base_backoff: float = 2.0,
+        max_backoff: float = 600.0,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300.0,
+    ):
+        """
+        Args:
+            db_path: SQLite file (":memory:" for tests)
+            handlers: event_type -> async handler(event_object)
+            workers: Concurrent worker tasks
+            max_attempts: Attempts before an event is dead-lettered
+            base_backoff: First retry delay in seconds (doubles per attempt)
+            max_backoff: Retry delay cap in seconds
+            poll_interval: Idle wake-up interval (picks up due retries)
+            lease_seconds: How long a claim lasts without renewal; renewed
+                every lease_seconds / 3 while the handler runs
+        """
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._metrics = WebhookQueueMetrics()
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(webhook_events)")}
+        if "lease_until" not in columns:  # Store created before leases
+            self._db.execute("ALTER TABLE webhook_events ADD COLUMN lease_until REAL")
+        self._lock = threading.Lock()
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _insert(self, event_id: str, event_type: str, payload: str, ordering_key: str, created: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO webhook_events "
+                "(event_id, event_type, ordering_key, created, payload, status, next_attempt_at, received_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (event_id, event_type, ordering_key or "", created or now, payload, EVENT_QUEUED, now, now),
+            )
+            if cursor.rowcount:
+                self._metrics.received += 1
+                return True
+            self._db.execute("UPDATE webhook_events SET duplicates = duplicates + 1 WHERE event_id = ?", (event_id,))
+            self._metrics.duplicates += 1
+            return False
+
+    async def enqueue(
+        self,
+        event_id: str,
+        event_type: str,
+        payload: str,
+        ordering_key: Optional[str] = None,
+        created: Optional[float] = None,
+    ) -> bool:
+        """Persist an event (durably) for background processing.
+
+        Args:
+            event_id: Provider event id (unique; redeliveries are ignored)
+            event_type: Handler lookup key
+            payload: Raw event JSON
+            ordering_key: Events with the same key run one at a time in
+                creation order (e.g. Stripe customer id)
+            created: Provider creation timestamp (defaults to receive time)
+
+        Returns:
+            True if the event is new, False for a duplicate delivery
+        """
+        accepted = await asyncio.to_thread(self._insert, event_id, event_type, payload, ordering_key or "", created)
+        if accepted:
+            logger.info(f"Queued webhook {event_type} ({event_id})")
+            if self._wakeup:
+                self._wakeup.set()
+        else:
+            logger.info(f"Duplicate webhook delivery ignored: {event_type} ({event_id})")
+        return accepted
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Re-queue events whose lease expired and start the workers."""
+        if self._tasks:
+            return
+        with self._lock:
+            recovered = self._reclaim_expired(time.time())
+        if recovered:
+            logger.warning(f"Re-queued {recovered} webhook event(s) whose worker lease expired")
+
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"webhook-worker-{i}") for i in range(self.workers)
+        ]
+        logger.info(f"Webhook queue started ({self.workers} workers)")
+
+    async def stop(self) -> None:
+        """Stop the workers (events in flight are re-queued once their lease expires)."""
+        # Flag as well as cancel: wait_for() can swallow a cancel that races its timeout
+        self._stopping = True
+        if self._wakeup:
+            self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _reclaim_expired(self, now: float) -> int:
+        """Re-queue processing events whose lease ran out (caller holds the lock)."""
+        return self._db.execute(
+            "UPDATE webhook_events SET status = ?, lease_until = NULL "
+            "WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+            (EVENT_QUEUED, EVENT_PROCESSING, now),
+        ).rowcount
+
+    def _claim(self) -> Optional[tuple]:
+        with self._lock:
+            now = time.time()
+            self._reclaim_expired(now)
+            while True:
+                row = self._db.execute(_CLAIM, (now,)).fetchone()
+                if row is None:
+                    return None
+                # Conditional: another process sharing the file may have claimed it first
+                claimed = self._db.execute(
+                    "UPDATE webhook_events SET status = ?, lease_until = ? WHERE seq = ? AND status = ?",
+                    (EVENT_PROCESSING, now + self.lease_seconds, row[0], EVENT_QUEUED),
+                ).rowcount
+                if claimed == 1:
+                    return row
+
+    def _renew(self, seq: int) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE webhook_events SET lease_until = ? WHERE seq = ? AND status = ?",
+                (time.time() + self.lease_seconds, seq, EVENT_PROCESSING),
+            )
+
+    async def _keep_lease(self, seq: int) -> None:
+        """Renew an event's lease until cancelled (runs alongside its handler)."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self._renew, seq)
+
+    def _finish(self, seq: int, received_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE webhook_events SET status = ?, finished_at = ?, last_error = NULL, lease_until = NULL WHERE seq = ?",
+                (EVENT_DONE, now, seq),
+            )
+            self._metrics.processed += 1
+            self._metrics.last_lag_sec = now - received_at
+            self._metrics.max_lag_sec = max(self._metrics.max_lag_sec, now - received_at)
+
+    def _fail(self, seq: int, attempts: int, error: str) -> Optional[float]:
+        """Schedule a retry (returns delay) or dead-letter the event (returns None)."""
+        with self._lock:
+            if attempts >= self.max_attempts:
+                self._db.execute(
+                    "UPDATE webhook_events SET status = ?, attempts = ?, finished_at = ?, last_error = ?, lease_until = NULL "
+                    "WHERE seq = ?",
+                    (EVENT_DEAD, attempts, time.time(), error, seq),
+                )
+                self._metrics.dead_lettered += 1
+                return None
+
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+            delay *= random.uniform(0.8, 1.2)
+            self._db.execute(
+                "UPDATE webhook_events SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, lease_until = NULL "
+                "WHERE seq = ?",
+                (EVENT_QUEUED, attempts, time.time() + delay, error, seq),
+            )
+            self._metrics.retries += 1
+            return delay
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            row = await asyncio.to_thread(self._claim)
+            if row is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            seq, event_id, event_type, payload, attempts, received_at = row
+            handler = self.handlers.get(event_type)
+            lease = asyncio.create_task(self._keep_lease(seq))
+            try:
+                if handler is None:
+                    logger.info(f"Unhandled webhook event type: {event_type}")
+                    self._metrics.unhandled += 1
+                else:
+                    event = json.loads(payload)
+                    await handler(event.get("data", {}).get("object", {}))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = await asyncio.to_thread(self._fail, seq, attempts + 1, f"{type(e).__name__}: {e}")
+                if delay is None:
+                    logger.error(f"Webhook {event_type} ({event_id}) dead-lettered after {attempts + 1} attempts: {e}")
+                else:
+                    logger.warning(f"Webhook {event_type} ({event_id}) failed, retry in {delay:.1f}s: {e}")
+            else:
+                await asyncio.to_thread(self._finish, seq, received_at)
+            finally:
+                lease.cancel()
+                # Completing an event may unblock the next one for its key
+                self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Stored state of one event."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT event_id, event_type, ordering_key, status, attempts, duplicates, "
+                "received_at, finished_at, last_error, lease_until FROM webhook_events WHERE event_id = ?",
+                (event_id,),
+            )
+            row = cursor.fetchone()
+            columns = [c[0] for c in cursor.description]
+        return dict(zip(columns, row, strict=True)) if row else None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, lag and counters."""
+        now = time.time()
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM webhook_events GROUP BY status").fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(received_at) FROM webhook_events WHERE status IN (?, ?)", (EVENT_QUEUED, EVENT_PROCESSING)
+            ).fetchone()[0]
+            duplicates_total = self._db.execute("SELECT COALESCE(SUM(duplicates), 0) FROM webhook_events").fetchone()[0]
+
+        return {
+            **self._metrics.to_dict(),
+            "queued": counts.get(EVENT_QUEUED, 0),
+            "processing": counts.get(EVENT_PROCESSING, 0),
+            "done": counts.get(EVENT_DONE, 0),
+            "dead": counts.get(EVENT_DEAD, 0),
+            "duplicates_total": duplicates_total,
+            "lag_sec": now - oldest if oldest else 0.0,
+            "workers": len(self._tasks),
+        }
@@ -11,11 +11,11 @@ except ImportError:
 
 # Try to import callbacks (for old orchestrator compatibility)
 try:
-    from .callbacks import EventBus, EventType, Event, create_default_event_bus
+    from .callbacks import EventBus, EventType, Event, DispatchPolicy, create_default_event_bus
     _callbacks_available = True
 except ImportError:
     _callbacks_available = False
-    EventBus = EventType = Event = create_default_event_bus = None
+    EventBus = EventType = Event = DispatchPolicy = create_default_event_bus = None
 
 __all__ = [
     "RivetOrchestrator",  # New: RIVET Pro orchestrator
@@ -26,4 +26,6 @@ if _agent_factory_available:
     __all__.append("AgentFactory")
 
 if _callbacks_available:
-    __all__.extend(["EventBus", "EventType", "Event", "create_default_event_bus"])
+    __all__.extend([
+        "EventBus", "EventType", "Event", "DispatchPolicy", "create_default_event_bus"
+    ])
@@ -17,6 +17,7 @@ WHAT THIS DOES:
     3. Maintains circular buffer history (configurable max size, default 1000 events)
     4. Isolates listener errors (one bad listener doesn't crash system)
     5. Enables real-time monitoring, logging, audit trails
+    6. Dispatches to listeners off the emitting thread (per-listener bounded queues)
 
 WHY WE NEED THIS:
     - Observability: Track what agents are doing in real-time
@@ -32,12 +33,16 @@ PLC ANALOGY:
     - Listeners = HMI screens and SCADA systems subscribed to events
     - History = Circular buffer like PLC event log (keeps last N events)
     - Isolated errors = If HMI crashes, PLC keeps running
+    - Listener queues = Buffered comms cards - a slow HMI never stalls the scan
 """
 
+import queue
+import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Any, Optional, Callable
+from typing import Deque, Dict, List, Any, Optional, Callable, Tuple
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -84,6 +89,33 @@ class EventType(str, Enum):
     TOOL_CALL = "tool_call"          # Agent invokes a tool
 
 
+class DispatchPolicy(str, Enum):
+    """
+    What emit() does when a listener's queue is full.
+
+    PURPOSE:
+        Makes backpressure explicit per listener instead of silently blocking agents.
+        Like choosing whether a full PLC comms buffer overwrites or waits.
+
+    WHAT THIS DEFINES:
+        - DROP_NEWEST: Discard the event being emitted (default, never blocks)
+        - DROP_OLDEST: Discard the oldest queued event to make room
+        - BLOCK: Wait up to block_timeout for space, then drop
+
+    WHY WE NEED THIS:
+        - Telemetry listeners can lose events; audit listeners should not
+        - Drops are counted so lossy listeners are visible in get_stats()
+
+    PLC ANALOGY:
+        - DROP_NEWEST = Buffer full, ignore new alarm
+        - DROP_OLDEST = Circular buffer, overwrite oldest alarm
+        - BLOCK = Handshake, wait for receiver to acknowledge
+    """
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # DATA STRUCTURES
 # ═══════════════════════════════════════════════════════════════════════════
@@ -163,6 +195,148 @@ class Event:
         }
 
 
+@dataclass
+class ListenerStats:
+    """
+    Dispatch counters for one listener.
+
+    PURPOSE:
+        Makes listener health observable - how many events were delivered,
+        dropped under backpressure, or raised inside the callback.
+
+    WHAT THIS STORES:
+        - name: Callback name (for display)
+        - policy: DispatchPolicy in effect
+        - queued: Events currently waiting in the queue
+        - delivered: Events passed to the callback
+        - dropped: Events discarded because the queue was full
+        - errors: Callback invocations that raised
+    """
+    name: str
+    policy: DispatchPolicy
+    queued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "policy": self.policy.value,
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+_STOP = object()  # Sentinel that tells a worker thread to exit
+
+
+class _ListenerWorker:
+    """
+    Bounded queue plus daemon thread that delivers events to one callback.
+
+    One worker per distinct callback, shared across all event types that
+    callback is registered for. Reference counted by EventBus.on()/off().
+    With threaded=False (sync mode) no thread is started and EventBus calls
+    the callback inline; the worker only carries the stats.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Event], None],
+        queue_size: int,
+        policy: DispatchPolicy,
+        block_timeout: float,
+        threaded: bool = True
+    ):
+        self.callback = callback
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.refcount = 0
+        self.stats = ListenerStats(
+            name=getattr(callback, "__qualname__", repr(callback)),
+            policy=policy
+        )
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        if threaded:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"EventBus-{self.stats.name}",
+                daemon=True  # Never keep the process alive for telemetry
+            )
+            self._thread.start()
+
+    def submit(self, event: Event) -> bool:
+        """Enqueue event according to policy. Returns False if dropped."""
+        try:
+            if self.policy == DispatchPolicy.BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == DispatchPolicy.DROP_OLDEST:
+            try:
+                oldest = self._queue.get_nowait()
+                self._queue.task_done()
+                if oldest is _STOP:
+                    # Never discard the stop sentinel (the thread would leak): drop the new event
+                    self._queue.put(_STOP)
+                    self.stats.dropped += 1
+                    return False
+                self.stats.dropped += 1
+                self._queue.put_nowait(event)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+
+        self.stats.dropped += 1
+        return False
+
+    def _run(self) -> None:
+        """Drain the queue until the stop sentinel arrives."""
+        while True:
+            event = self._queue.get()
+            try:
+                if event is _STOP:
+                    return
+                _invoke(self.callback, event, self.stats)
+            finally:
+                self._queue.task_done()
+
+    def join(self) -> None:
+        """Block until every queued event has been delivered."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Deliver what is queued, then stop the worker thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+
+    def snapshot(self) -> ListenerStats:
+        """Copy of current stats with live queue depth."""
+        self.stats.queued = self._queue.qsize()
+        return ListenerStats(**self.stats.__dict__)
+
+
+def _invoke(callback: Callable[[Event], None], event: Event, stats: Optional[ListenerStats]) -> None:
+    """Call a listener with error isolation (one failure doesn't affect others)."""
+    try:
+        callback(event)
+        if stats is not None:
+            stats.delivered += 1
+    except Exception as e:
+        if stats is not None:
+            stats.errors += 1
+        print(f"[EventBus] Callback error: {e}")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # EVENT BUS - PUB/SUB SYSTEM
 # ═══════════════════════════════════════════════════════════════════════════
@@ -178,8 +352,8 @@ class EventBus:
 
     WHAT THIS DOES:
         1. Maintains registry of listeners (callbacks) per event type
-        2. Emits events to all registered listeners for that type
-        3. Stores event history in circular buffer (configurable size)
+        2. Emits events to all registered listeners for that type (queued per listener)
+        3. Stores event history in circular buffer (configurable size), indexed by type/agent
         4. Isolates listener errors (one bad listener doesn't crash bus)
         5. Provides history querying (filter by type, agent, limit)
 
@@ -203,18 +377,35 @@ class EventBus:
         - History = Circular event log buffer (keeps last N events)
         - Error isolation = If one HMI crashes, others still get events
 
+    DISPATCH MODES:
+        - Async (default): emit() records history and enqueues the event on each
+          listener's bounded queue; a worker thread per listener delivers it.
+          Agent latency no longer depends on how many (or how slow) listeners are.
+        - Sync (sync=True): listeners are called inline on the emitting thread,
+          so tests can assert on side effects right after emit().
+
     Implements: REQ-CB-003 through REQ-CB-008
     Spec: specs/callbacks-v1.0.md
 
     Attributes:
         _listeners: Registered callbacks by event type
-        _history: Chronological list of events
+        _workers: Per-callback queue/thread and dispatch counters
+        _history: Ring buffer of (sequence, event), newest last
+        _by_type: Entries of _history per event type (evicted with it)
+        _by_agent: Entries of _history per agent name (evicted with it)
         _max_history: Maximum events to store
     """
 
-    def __init__(self, max_history: int = 1000):
+    def __init__(
+        self,
+        max_history: int = 1000,
+        sync: bool = False,
+        queue_size: int = 1000,
+        policy: DispatchPolicy = DispatchPolicy.DROP_NEWEST,
+        block_timeout: float = 1.0
+    ):
         """
-        Initialize event bus with configurable history.
+        Initialize event bus with configurable history and dispatch.
 
         PURPOSE:
             Sets up empty event bus ready to register listeners and emit events.
@@ -222,20 +413,26 @@ class EventBus:
 
         WHAT THIS DOES:
             1. Creates empty listener registry (dict of lists)
-            2. Creates empty event history (list)
-            3. Sets maximum history size (circular buffer limit)
+            2. Creates empty ring-buffer history plus type/agent indexes
+            3. Stores dispatch defaults (mode, queue size, full-queue policy)
 
         WHY WE NEED THIS:
             - Configurable buffer: Adjust memory vs history depth trade-off
+            - Configurable backpressure: Slow listeners drop or block, explicitly
             - Clean start: No pre-existing listeners or events
 
         INPUTS:
             max_history: Maximum events to store before oldest are dropped (default 1000)
+            sync: Call listeners inline on the emitting thread (tests, scripts)
+            queue_size: Default per-listener queue capacity (async mode)
+            policy: Default DispatchPolicy when a listener queue is full
+            block_timeout: Seconds BLOCK policy waits before dropping
 
         PLC ANALOGY:
             Like initializing PLC event log:
             - max_history = Log buffer size (e.g., 1000 events)
             - Oldest events auto-deleted when buffer full (FIFO)
+            - queue_size = Comms buffer per HMI
 
         EDGE CASES:
             - max_history=0 → No history stored (events still emitted to listeners)
@@ -245,19 +442,41 @@ class EventBus:
             - Memory growing unbounded → Reduce max_history
             - Events missing from history → Increase max_history
             - Listeners not firing → Check registration happens before emit
+            - Listener sees events late → Expected in async mode; call flush()
+            - get_stats() shows drops → Raise queue_size or use BLOCK policy
 
         Implements: REQ-CB-003
         """
         # STEP 1: Initialize empty listener registry (dict of event_type -> list of callbacks)
         self._listeners: Dict[EventType, List[Callable[[Event], None]]] = {}
-
-        # STEP 2: Initialize empty event history (chronological list)
-        self._history: List[Event] = []
-
-        # STEP 3: Store maximum history size for circular buffer behavior
-        self._max_history = max_history
-
-    def on(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
+        self._workers: Dict[Callable[[Event], None], _ListenerWorker] = {}
+
+        # STEP 2: Initialize ring-buffer history and per-type/per-agent indexes
+        self._max_history = max(max_history, 0)
+        self._history: Deque[Tuple[int, Event]] = deque(maxlen=self._max_history)
+        self._by_type: Dict[EventType, Deque[Tuple[int, Event]]] = {}
+        self._by_agent: Dict[str, Deque[Tuple[int, Event]]] = {}
+        self._seq = 0  # Sequence number of the last emitted event
+
+        # STEP 3: Store dispatch defaults
+        self._sync = sync
+        self._queue_size = queue_size
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._lock = threading.Lock()
+
+    @property
+    def sync(self) -> bool:
+        """Whether listeners are called inline on the emitting thread."""
+        return self._sync
+
+    def on(
+        self,
+        event_type: EventType,
+        callback: Callable[[Event], None],
+        policy: Optional[DispatchPolicy] = None,
+        queue_size: Optional[int] = None
+    ) -> None:
         """
         Register listener for specific event type (subscribe).
 
@@ -268,7 +487,8 @@ class EventBus:
         WHAT THIS DOES:
             1. Creates listener list for this event type if it doesn't exist
             2. Appends callback to list of listeners for this type
-            3. Callback will be called for all future events of this type
+            3. Starts (or reuses) the callback's queue and worker thread
+            4. Callback will be called for all future events of this type
 
         WHY WE NEED THIS:
             - Selective monitoring: Only listen for events you care about
@@ -278,6 +498,8 @@ class EventBus:
         INPUTS:
             event_type: Type of event to listen for (e.g., EventType.ERROR)
             callback: Function with signature `def func(event: Event) -> None`
+            policy: Full-queue policy for this callback (default: bus policy)
+            queue_size: Queue capacity for this callback (default: bus queue_size)
 
         PLC ANALOGY:
             Like subscribing HMI to specific PLC alarm types:
@@ -287,22 +509,37 @@ class EventBus:
 
         EDGE CASES:
             - Same callback registered twice → Both will be called (duplicates allowed)
-            - Callback raises exception → Isolated in emit(), doesn't crash bus
+            - Callback raises exception → Isolated in dispatch, doesn't crash bus
+            - Same callback on several types → One shared queue/worker (first policy wins)
 
         Examples:
             >>> bus = EventBus()
             >>> bus.on(EventType.AGENT_START, lambda e: print(f"Agent started: {e.agent_name}"))
-            >>> bus.on(EventType.ERROR, lambda e: logging.error(e.data))
+            >>> bus.on(EventType.ERROR, audit_log, policy=DispatchPolicy.BLOCK)
 
         Implements: REQ-CB-005 (Listener Management)
         Spec: specs/callbacks-v1.0.md#section-2.5
         """
-        # STEP 1: Create listener list for this event type if doesn't exist
-        if event_type not in self._listeners:
-            self._listeners[event_type] = []
-
-        # STEP 2: Append callback to listener list
-        self._listeners[event_type].append(callback)
+        with self._lock:
+            # STEP 1: Create listener list for this event type if doesn't exist
+            if event_type not in self._listeners:
+                self._listeners[event_type] = []
+
+            # STEP 2: Append callback to listener list
+            self._listeners[event_type].append(callback)
+
+            # STEP 3: Start or reuse the callback's worker
+            worker = self._workers.get(callback)
+            if worker is None:
+                worker = _ListenerWorker(
+                    callback,
+                    queue_size=queue_size or self._queue_size,
+                    policy=policy or self._policy,
+                    block_timeout=self._block_timeout,
+                    threaded=not self._sync
+                )
+                self._workers[callback] = worker
+            worker.refcount += 1
 
     def off(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """
@@ -315,12 +552,14 @@ class EventBus:
         WHAT THIS DOES:
             1. Finds listener list for this event type
             2. Removes callback from list (if present)
-            3. Silently ignores if callback wasn't registered (no error)
+            3. Stops the callback's worker once its last registration is gone
+               (already-queued events are still delivered)
+            4. Silently ignores if callback wasn't registered (no error)
 
         WHY WE NEED THIS:
             - Cleanup: Remove listeners when no longer needed
             - Dynamic: Change subscriptions at runtime
-            - Memory: Prevent listener leak
+            - Memory: Prevent listener (and thread) leak
 
         INPUTS:
             event_type: Type of event to stop listening for
@@ -338,14 +577,24 @@ class EventBus:
 
         Implements: REQ-CB-005
         """
-        # STEP 1: Check if event type has any listeners
-        if event_type in self._listeners:
+        with self._lock:
+            # STEP 1: Check if event type has any listeners
+            if event_type not in self._listeners:
+                return
             try:
                 # STEP 2: Remove callback from listener list
                 self._listeners[event_type].remove(callback)
             except ValueError:
-                # STEP 3: Callback not in list - silently ignore
-                pass  # Not an error, just wasn't registered
+                # STEP 4: Callback not in list - silently ignore
+                return  # Not an error, just wasn't registered
+
+            # STEP 3: Release the worker when no registrations remain
+            worker = self._workers.get(callback)
+            if worker is not None:
+                worker.refcount -= 1
+                if worker.refcount <= 0:
+                    del self._workers[callback]
+                    worker.stop()
 
     def emit(
         self,
@@ -362,8 +611,10 @@ class EventBus:
 
         WHAT THIS DOES:
             1. Creates Event object with current UTC timestamp
-            2. Adds event to circular buffer history
-            3. Notifies all registered listeners for this event type
+            2. Adds event to ring-buffer history and its type/agent indexes
+            3. Hands the event to every registered listener for this type:
+               async mode enqueues (O(1) per listener, never runs the callback),
+               sync mode calls the callback inline
             4. Isolates listener errors (one failure doesn't crash bus)
             5. Returns created Event object
 
@@ -371,6 +622,7 @@ class EventBus:
             - Broadcast: One emit reaches multiple listeners
             - Decoupled: Producer doesn't know who's listening
             - Reliable: Listener failures don't affect producer
+            - Fast: Slow telemetry/persistence listeners don't add agent latency
             - Traceable: All events logged to history
 
         INPUTS:
@@ -383,21 +635,22 @@ class EventBus:
 
         PROCESS:
             1. Create Event with UTC timestamp
-            2. Append to history, drop oldest if buffer full (circular buffer)
+            2. Append to history, oldest dropped automatically when full (deque maxlen)
             3. Get all listeners for this event type
-            4. Call each listener with event
-            5. If listener throws exception, log error and continue to next
+            4. Enqueue (async) or call (sync) each listener
+            5. Full queue → apply listener's DispatchPolicy, count drops
             6. Return event
 
         EDGE CASES:
             - No listeners registered → Event still logged to history
-            - Listener throws exception → Logged, other listeners still called
+            - Listener throws exception → Logged and counted, other listeners still called
             - max_history=0 → Event not stored but still emitted
             - History full → Oldest event dropped (FIFO)
+            - Listener queue full → Dropped or blocked per DispatchPolicy
 
         TROUBLESHOOTING:
             - Listeners not called → Check they're registered before emit
-            - Listener crashes entire bus → File bug (should be isolated)
+            - Listener side effects missing right after emit → Call flush() or use sync=True
             - Events missing from history → Buffer too small, increase max_history
             - Listener errors logged → Check listener implementation
 
@@ -406,7 +659,7 @@ class EventBus:
             - Event = Alarm condition occurred
             - History = Event log buffer (FIFO, keeps last N)
             - Listeners = HMI screens subscribed to this alarm type
-            - Error isolation = If one HMI crashes, others still get alarm
+            - Queues = Comms buffers, PLC scan never waits on an HMI
             - Returns event = Confirmation alarm was logged
 
         Implements: REQ-CB-006 (emit() Behavior)
@@ -420,26 +673,43 @@ class EventBus:
             agent_name=agent_name
         )
 
-        # STEP 2: Add to history with circular buffer behavior
-        self._history.append(event)
-        if len(self._history) > self._max_history:
-            self._history.pop(0)  # Remove oldest event (FIFO)
-
-        # STEP 3: Get all registered listeners for this event type
-        listeners = self._listeners.get(event_type, [])
-
-        # STEP 4: Call each listener with error isolation
-        for callback in listeners:
-            try:
-                callback(event)  # Notify listener
-            except Exception as e:
-                # STEP 5: Isolate listener errors (don't crash bus)
-                print(f"[EventBus] Callback error: {e}")
-                # Continue to next listener (one failure doesn't affect others)
-
-        # STEP 6: Return created event
+        with self._lock:
+            # STEP 2: Add to ring buffer and indexes (oldest evicted from all three, O(1))
+            self._seq += 1
+            if self._max_history:
+                if len(self._history) == self._max_history:
+                    self._evict_oldest()
+                entry = (self._seq, event)
+                self._history.append(entry)
+                self._by_type.setdefault(event_type, deque()).append(entry)
+                if agent_name is not None:
+                    self._by_agent.setdefault(agent_name, deque()).append(entry)
+
+            # STEP 3: Snapshot listeners so on()/off() during dispatch is safe
+            workers = [self._workers[cb] for cb in self._listeners.get(event_type, [])]
+
+        # STEP 4: Dispatch with error isolation (outside the lock)
+        for worker in workers:
+            if self._sync:
+                _invoke(worker.callback, event, worker.stats)
+            else:
+                worker.submit(event)
+
+        # STEP 5: Return created event
         return event
 
+    def _evict_oldest(self) -> None:
+        """Drop the oldest history entry from the ring and its indexes (caller holds the lock)."""
+        _, event = self._history.popleft()
+        # Indexes are in emit order, so the evicted entry is leftmost in its buckets
+        for index, key in ((self._by_type, event.event_type), (self._by_agent, event.agent_name)):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket.popleft()
+            if not bucket:
+                del index[key]  # Keep one bucket per *live* type/agent only
+
     def get_history(
         self,
         event_type: Optional[EventType] = None,
@@ -454,10 +724,10 @@ class EventBus:
             Like querying a PLC event log to diagnose machine faults.
 
         WHAT THIS DOES:
-            1. Starts with full event history
-            2. Filters by event_type if specified
-            3. Filters by agent_name if specified
-            4. Returns most recent N events (tail of list)
+            1. Picks the narrowest index (per type or per agent) instead of the full log
+            2. Walks it newest-first (indexes only hold events still in the ring)
+            3. Applies the remaining filter
+            4. Stops after `limit` matches (cost is O(limit), not O(history))
 
         WHY WE NEED THIS:
             - Debugging: Replay sequence of events to diagnose issues
@@ -502,19 +772,32 @@ class EventBus:
         Implements: REQ-CB-004 (Event History)
         Spec: specs/callbacks-v1.0.md#section-2.4
         """
-        # STEP 1: Start with full history
-        filtered = self._history
-
-        # STEP 2: Apply event_type filter if specified
-        if event_type is not None:
-            filtered = [e for e in filtered if e.event_type == event_type]
-
-        # STEP 3: Apply agent_name filter if specified
-        if agent_name is not None:
-            filtered = [e for e in filtered if e.agent_name == agent_name]
-
-        # STEP 4: Return most recent N events (tail of list)
-        return filtered[-limit:]  # Negative index takes from end
+        if limit <= 0:
+            return []
+
+        with self._lock:
+            # STEP 1: Choose the smallest candidate set
+            candidates: Deque[Tuple[int, Event]] = self._history
+            if event_type is not None:
+                candidates = self._by_type.get(event_type, deque())
+            if agent_name is not None:
+                by_agent = self._by_agent.get(agent_name, deque())
+                if event_type is None or len(by_agent) < len(candidates):
+                    candidates = by_agent
+
+            # STEP 2-4: Walk newest-first until limit matches found
+            matched: List[Event] = []
+            for _, event in reversed(candidates):
+                if event_type is not None and event.event_type != event_type:
+                    continue
+                if agent_name is not None and event.agent_name != agent_name:
+                    continue
+                matched.append(event)
+                if len(matched) >= limit:
+                    break
+
+        matched.reverse()  # Chronological order (newest last)
+        return matched
 
     def clear_history(self) -> None:
         """
@@ -525,7 +808,7 @@ class EventBus:
             Like clearing a PLC event log while keeping alarm subscriptions active.
 
         WHAT THIS DOES:
-            1. Replaces history list with empty list
+            1. Empties the ring buffer and its type/agent indexes
             2. Listeners remain registered (doesn't affect subscriptions)
             3. Future events will be logged normally
 
@@ -543,6 +826,7 @@ class EventBus:
         EDGE CASES:
             - Already empty → No change (idempotent)
             - Events in progress → Cleared immediately (may lose recent events)
+            - Events queued for listeners → Still delivered (queues untouched)
 
         TROUBLESHOOTING:
             - Events reappear → New events being emitted (working as designed)
@@ -555,8 +839,61 @@ class EventBus:
 
         Implements: REQ-CB-004
         """
-        # STEP 1: Replace history with empty list (GC will clean up old events)
-        self._history = []
+        with self._lock:
+            self._history.clear()
+            self._by_type.clear()
+            self._by_agent.clear()
+
+    def flush(self) -> None:
+        """
+        Block until every queued event has been delivered to its listener.
+
+        PURPOSE:
+            Lets tests, scripts and shutdown paths wait for async listeners to
+            catch up. No-op in sync mode.
+
+        EDGE CASES:
+            - BLOCK policy listener that never returns → flush() never returns
+            - Events emitted concurrently with flush() → May or may not be included
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.join()
+
+    def close(self) -> None:
+        """
+        Deliver queued events and stop all listener worker threads.
+
+        PURPOSE:
+            Clean shutdown. Listeners are unregistered; history is kept.
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+            self._listeners.clear()
+        for worker in workers:
+            worker.stop()
+
+    def get_stats(self) -> List[ListenerStats]:
+        """
+        Get dispatch counters for every registered listener.
+
+        PURPOSE:
+            Monitoring - spot listeners that drop events or raise errors.
+            Like reading PLC comms diagnostics (buffer depth, lost frames).
+
+        OUTPUTS:
+            List of ListenerStats snapshots (queued, delivered, dropped, errors)
+
+        Examples:
+            >>> for stats in bus.get_stats():
+            ...     if stats.dropped:
+            ...         print(f"{stats.name} dropped {stats.dropped} events")
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+        return [worker.snapshot() for worker in workers]
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -564,7 +901,7 @@ class EventBus:
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def create_default_event_bus(verbose: bool = False) -> EventBus:
+def create_default_event_bus(verbose: bool = False, sync: bool = False) -> EventBus:
     """
     Create EventBus with optional console logging.
 
@@ -584,6 +921,7 @@ def create_default_event_bus(verbose: bool = False) -> EventBus:
 
     INPUTS:
         verbose: Enable console logging for all events (default False)
+        sync: Call listeners inline instead of on worker threads (tests)
 
     OUTPUTS:
         Configured EventBus instance ready to use
@@ -624,7 +962,7 @@ def create_default_event_bus(verbose: bool = False) -> EventBus:
     Spec: specs/callbacks-v1.0.md#section-5.1
     """
     # STEP 1: Create EventBus with default settings
-    bus = EventBus()  # Default: 1000 event history
+    bus = EventBus(sync=sync)  # Default: 1000 event history
 
     # STEP 2: If verbose mode, register console logger for all event types
     if verbose:
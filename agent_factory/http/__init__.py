@@ -8,6 +8,9 @@ This module provides a production-ready HTTP client with:
 - Structured error objects for triage
 - LangSmith tracing integration
 - Connection pooling
+- Shared async fetch service (HTTP/2, conditional-request disk cache,
+  streaming downloads with size caps, per-host limits)
+- Per-host token-bucket rate limiting
 
 Quick Start:
     >>> from agent_factory.http import get_client, CONFIGS
@@ -30,6 +33,12 @@ Service-Specific Configs:
     >>>
     >>> # For web scraping (longest timeouts)
     >>> scraper_client = get_client(CONFIGS["scraper"])
+
+Downloads and Scraping:
+    >>> from agent_factory.http import get_fetch_service
+    >>> fetcher = get_fetch_service()
+    >>> result = fetcher.download_sync(pdf_url, "data/sources/pdfs/manual.pdf")
+    >>> print(result.from_cache, result.size)
 """
 
 from typing import Optional
@@ -57,6 +66,7 @@ from .errors import (
     ClientError,
     TooManyRedirectsError,
     DeserializationError,
+    ResponseTooLargeError,
     CATEGORY_TIMEOUT,
     CATEGORY_CONNECTION_ERROR,
     CATEGORY_RATE_LIMITED,
@@ -64,8 +74,24 @@ from .errors import (
     CATEGORY_CLIENT_ERROR,
     CATEGORY_TOO_MANY_REDIRECTS,
     CATEGORY_DESERIALIZATION_ERROR,
+    CATEGORY_RESPONSE_TOO_LARGE,
     RETRYABLE_CATEGORIES
 )
+from .fetch import (
+    FetchService,
+    FetchConfig,
+    FetchResult,
+    FetchMetrics,
+    FetchCache,
+    CacheEntry,
+    get_fetch_service,
+    shutdown_fetch_service
+)
+from .rate_limit import (
+    TokenBucket,
+    HostRateLimiter,
+    get_host_limiter
+)
 from .retry import (
     create_retry_decorator,
     should_retry_error,
@@ -237,6 +263,7 @@ __all__ = [
     "ClientError",
     "TooManyRedirectsError",
     "DeserializationError",
+    "ResponseTooLargeError",
 
     # Error categories (constants)
     "CATEGORY_TIMEOUT",
@@ -246,6 +273,7 @@ __all__ = [
     "CATEGORY_CLIENT_ERROR",
     "CATEGORY_TOO_MANY_REDIRECTS",
     "CATEGORY_DESERIALIZATION_ERROR",
+    "CATEGORY_RESPONSE_TOO_LARGE",
     "RETRYABLE_CATEGORIES",
 
     # Retry utilities
@@ -266,6 +294,21 @@ __all__ = [
     "get_client",
     "reset_default_client",
 
+    # Fetch service (downloads, scraping)
+    "FetchService",
+    "FetchConfig",
+    "FetchResult",
+    "FetchMetrics",
+    "FetchCache",
+    "CacheEntry",
+    "get_fetch_service",
+    "shutdown_fetch_service",
+
+    # Rate limiting
+    "TokenBucket",
+    "HostRateLimiter",
+    "get_host_limiter",
+
     # Convenience functions
     "get",
     "post",
@@ -148,6 +148,18 @@ class DeserializationError(HTTPClientError):
     pass
 
 
+class ResponseTooLargeError(HTTPClientError):
+    """Response body exceeded the configured size cap.
+
+    Raised when:
+    - Content-Length exceeds max_bytes
+    - A streamed body (no Content-Length) grows past max_bytes
+
+    This error is NOT retryable (the resource won't get smaller).
+    """
+    pass
+
+
 # Error category constants
 CATEGORY_TIMEOUT = "timeout"
 CATEGORY_CONNECTION_ERROR = "connection_error"
@@ -156,6 +168,7 @@ CATEGORY_SERVER_ERROR = "server_error"
 CATEGORY_CLIENT_ERROR = "client_error"
 CATEGORY_TOO_MANY_REDIRECTS = "too_many_redirects"
 CATEGORY_DESERIALIZATION_ERROR = "deserialization_error"
+CATEGORY_RESPONSE_TOO_LARGE = "response_too_large"
 
 # Retryable error categories (used by retry logic)
 RETRYABLE_CATEGORIES = {
@@ -0,0 +1,868 @@
+"""Shared async fetch service for downloads and scraping.
+
+One httpx.AsyncClient for all outbound GETs (PDF downloads, forum pages,
+web scraping) instead of a fresh `requests.get` per call:
+
+- Pooled keep-alive connections, HTTP/2 when `h2` is installed
+- On-disk content-addressed cache: bodies stored once by SHA-256, entries
+  revalidated with If-None-Match / If-Modified-Since (304 = no body resent),
+  least recently used bodies evicted past a size cap
+- Streaming downloads straight to disk with a size cap
+- Per-host concurrency limits (be polite to OEM sites and forums)
+- Metrics: requests, cache hits, revalidations, bytes, latency
+
+The client lives on a dedicated event-loop thread, so it can be shared by
+async code running on any loop (FastAPI, Telegram bot) and by sync code
+(LangGraph nodes, scripts) through the *_sync methods.
+
+Example:
+    >>> from agent_factory.http import get_fetch_service
+    >>> fetcher = get_fetch_service()
+    >>>
+    >>> # Sync (e.g. inside a LangGraph node)
+    >>> result = fetcher.fetch_sync("https://example.com/page")
+    >>> print(result.status_code, result.from_cache, len(result.content))
+    >>>
+    >>> # Async, many URLs, capped per host
+    >>> results = await fetcher.fetch_many(urls)
+    >>>
+    >>> # Stream a PDF to disk, refusing anything over 100 MB
+    >>> result = fetcher.download_sync(url, "data/sources/pdfs/manual.pdf", max_bytes=100 * 1024 * 1024)
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from .config import TimeoutConfig
+from .errors import (
+    HTTPError,
+    ClientError,
+    ConnectionError,
+    RateLimitError,
+    ResponseTooLargeError,
+    ServerError,
+    TimeoutError,
+    TooManyRedirectsError,
+    CATEGORY_CLIENT_ERROR,
+    CATEGORY_CONNECTION_ERROR,
+    CATEGORY_RATE_LIMITED,
+    CATEGORY_RESPONSE_TOO_LARGE,
+    CATEGORY_SERVER_ERROR,
+    CATEGORY_TIMEOUT,
+    CATEGORY_TOO_MANY_REDIRECTS,
+)
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept in cache entries. Bodies are stored decoded, so
+# Content-Encoding / Content-Length of the wire format don't apply to them.
+_CACHED_HEADERS = (
+    "content-type", "content-disposition",
+    "etag", "last-modified", "cache-control", "expires",
+)
+_CHUNK_SIZE = 64 * 1024
+_WRITE_BATCH = 1024 * 1024  # Bytes buffered before a (threaded) disk write
+
+
+@dataclass
+class FetchConfig:
+    """Fetch service configuration.
+
+    Attributes:
+        cache_dir: On-disk cache directory (None disables caching)
+        cache_max_bytes: Cache body size cap; least recently used bodies are evicted (0 = unlimited)
+        timeout: Connect/read/total timeouts (total bounds waiting for a pool slot)
+        max_connections: Pool size across all hosts
+        max_keepalive_connections: Idle connections kept open
+        keepalive_expiry: Seconds an idle connection stays open
+        per_host_limit: Concurrent requests per host
+        host_limits: Per-host overrides, e.g. {"www.reddit.com": 2}
+        http2: Negotiate HTTP/2 where the server supports it (needs `h2`)
+        max_bytes: Default response size cap (0 = unlimited)
+        default_ttl: Seconds to treat responses without freshness info as fresh
+        follow_redirects: Follow redirects
+        max_redirects: Redirect limit
+        user_agent: User-Agent header
+    """
+    cache_dir: Optional[str] = "data/cache/http"
+    cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    timeout: TimeoutConfig = field(default_factory=lambda: TimeoutConfig(connect=10.0, read=30.0, total=120.0))
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    per_host_limit: int = 6
+    host_limits: Dict[str, int] = field(default_factory=dict)
+    http2: bool = True
+    max_bytes: int = 200 * 1024 * 1024
+    default_ttl: float = 0.0
+    follow_redirects: bool = True
+    max_redirects: int = 10
+    user_agent: str = "Mozilla/5.0 (compatible; AgentFactory/1.0)"
+
+    @classmethod
+    def from_env(cls) -> "FetchConfig":
+        """Load configuration from environment variables.
+
+        Environment variables:
+            FETCH_CACHE_DIR: Cache directory, empty to disable (default: data/cache/http)
+            FETCH_CACHE_MAX_BYTES: Cache size cap (default: 2 GB, 0 = unlimited)
+            FETCH_PER_HOST_LIMIT: Concurrent requests per host (default: 6)
+            FETCH_MAX_BYTES: Default response size cap (default: 200 MB)
+            FETCH_HTTP2: Enable HTTP/2 (default: true)
+        """
+        return cls(
+            cache_dir=os.getenv("FETCH_CACHE_DIR", "data/cache/http") or None,
+            cache_max_bytes=int(os.getenv("FETCH_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))),
+            per_host_limit=int(os.getenv("FETCH_PER_HOST_LIMIT", "6")),
+            max_bytes=int(os.getenv("FETCH_MAX_BYTES", str(200 * 1024 * 1024))),
+            http2=os.getenv("FETCH_HTTP2", "true").lower() in ("true", "1", "yes"),
+        )
+
+
+# ============================================================================
+# Results and metrics
+# ============================================================================
+
+@dataclass
+class FetchResult:
+    """Outcome of a fetch or download.
+
+    Attributes:
+        url: Final URL (after redirects)
+        status_code: HTTP status (200 for cache hits and revalidations)
+        headers: Response headers (lower-case keys)
+        content: Body bytes (None for successful downloads to disk; error
+            bodies stay in memory and dest is left untouched)
+        path: Destination file for successful downloads
+        size: Body size in bytes
+        sha256: Body hash (None for uncached error responses)
+        from_cache: Body came from the on-disk cache
+        revalidated: Server answered 304 Not Modified
+        redirected: Request was redirected
+        http_version: e.g. "HTTP/2" (empty for fresh cache hits)
+        elapsed_ms: Wall time including waiting for a host slot
+    """
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: Optional[bytes] = None
+    path: Optional[Path] = None
+    size: int = 0
+    sha256: Optional[str] = None
+    from_cache: bool = False
+    revalidated: bool = False
+    redirected: bool = False
+    http_version: str = ""
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the Content-Type charset (default UTF-8)."""
+        data = self.content if self.content is not None else (self.path.read_bytes() if self.path else b"")
+        charset = "utf-8"
+        for part in self.headers.get("content-type", "").split(";"):
+            part = part.strip()
+            if part.lower().startswith("charset="):
+                charset = part.split("=", 1)[1].strip('"') or charset
+        try:
+            return data.decode(charset, errors="replace")
+        except LookupError:
+            return data.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> "FetchResult":
+        """Raise the matching HTTPClientError for 4xx/5xx responses."""
+        if self.ok:
+            return self
+        if self.status_code == 429:
+            category, error_class = CATEGORY_RATE_LIMITED, RateLimitError
+        elif self.status_code >= 500:
+            category, error_class = CATEGORY_SERVER_ERROR, ServerError
+        else:
+            category, error_class = CATEGORY_CLIENT_ERROR, ClientError
+        retry_after = self.headers.get("retry-after", "")
+        raise error_class(HTTPError(
+            category=category,
+            http_status=self.status_code,
+            url=_sanitize_url(self.url),
+            method="GET",
+            request_id=self.headers.get("x-request-id"),
+            summary=f"HTTP {self.status_code}",
+            raw_error=None,
+            retry_after=int(retry_after) if retry_after.isdigit() else None,
+        ))
+
+
+@dataclass
+class FetchMetrics:
+    """Counters for the fetch service (read with to_dict())."""
+    requests: int = 0
+    network_requests: int = 0
+    cache_hits: int = 0
+    revalidated: int = 0
+    errors: int = 0
+    bytes_downloaded: int = 0
+    bytes_from_cache: int = 0
+    cache_evictions: int = 0
+    total_ms: float = 0.0
+    by_host: Dict[str, int] = field(default_factory=dict)
+    by_status: Dict[int, int] = field(default_factory=dict)
+    http_versions: Dict[str, int] = field(default_factory=dict)
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cache_hit_rate"] = (self.cache_hits + self.revalidated) / self.requests if self.requests else 0.0
+        data["avg_ms"] = self.total_ms / self.requests if self.requests else 0.0
+        return data
+
+
+def _sanitize_url(url: str) -> str:
+    """Drop query strings (may carry API keys) for logging and errors."""
+    return url.split("?", 1)[0] + ("?..." if "?" in url else "")
+
+
+# ============================================================================
+# On-disk cache
+# ============================================================================
+
+@dataclass
+class CacheEntry:
+    """Cached response metadata; the body lives in the blob store."""
+    url: str
+    sha256: str
+    size: int
+    status_code: int
+    headers: Dict[str, str]
+    stored_at: float
+    expires_at: float
+    final_url: str = ""
+    redirected: bool = False
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+
+def _freshness(headers: Dict[str, str], now: float, default_ttl: float) -> Optional[float]:
+    """
+    Expiry time for a response, or None if it must not be stored.
+
+    Honors Cache-Control no-store / no-cache / max-age and Expires. A response
+    with no freshness info but an ETag or Last-Modified is stored and
+    revalidated on every use.
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        expires_at = now
+    elif directives.get("max-age", "").isdigit():
+        expires_at = now + int(directives["max-age"])
+    elif headers.get("expires"):
+        try:
+            expires_at = parsedate_to_datetime(headers["expires"]).timestamp()
+        except (TypeError, ValueError):
+            expires_at = now
+    else:
+        expires_at = now + default_ttl
+
+    if expires_at <= now and not (headers.get("etag") or headers.get("last-modified")):
+        return None  # Can't be reused or revalidated
+    return expires_at
+
+
+def _place_body(body: Path, dest: Path, move: bool) -> None:
+    """Copy (cached blob) or move (uncached temp file) a body to dest. Blocking."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if move:
+        shutil.move(str(body), dest)
+    else:
+        shutil.copyfile(body, dest)
+
+
+class FetchCache:
+    """
+    Content-addressed response cache.
+
+    Layout:
+        <dir>/blobs/ab/ab12...   body, named by its SHA-256 (shared by URLs)
+        <dir>/entries/cd/cd34... JSON metadata, named by SHA-256 of the URL
+        <dir>/tmp/               in-progress downloads
+
+    Blob mtimes track last use; once blobs exceed max_bytes the least
+    recently used are deleted, and entries pointing at them are dropped on
+    their next lookup.
+    """
+
+    def __init__(self, directory: Union[str, Path], default_ttl: float = 0.0, max_bytes: int = 0):
+        self.directory = Path(directory)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        for sub in ("blobs", "entries", "tmp"):
+            (self.directory / sub).mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self._blobs())
+
+    @property
+    def tmp_dir(self) -> Path:
+        return self.directory / "tmp"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.directory / "blobs" / sha256[:2] / sha256
+
+    @property
+    def size(self) -> int:
+        """Total bytes of stored bodies."""
+        return self._size
+
+    def _blobs(self) -> List[Path]:
+        return [p for p in (self.directory / "blobs").glob("*/*") if p.is_file()]
+
+    def _entry_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "entries" / key[:2] / f"{key}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        path = self._entry_path(url)
+        if not path.exists():
+            return None
+        try:
+            entry = CacheEntry(**json.loads(path.read_text(encoding="utf-8")))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Dropping corrupt cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        blob = self.blob_path(entry.sha256)
+        try:
+            os.utime(blob)  # Mark as recently used
+        except FileNotFoundError:
+            path.unlink(missing_ok=True)  # Body was evicted
+            return None
+        return entry
+
+    def _write_entry(self, entry: CacheEntry) -> None:
+        path = self._entry_path(entry.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def store(self, url: str, tmp_path: Path, sha256: str, size: int,
+              status_code: int, headers: Dict[str, str],
+              final_url: Optional[str] = None, redirected: bool = False) -> Optional[CacheEntry]:
+        """
+        Move a downloaded body into the blob store and record the entry.
+
+        Returns None (and leaves tmp_path alone) if the response isn't cacheable.
+        """
+        now = time.time()
+        expires_at = _freshness(headers, now, self.default_ttl)
+        if expires_at is None:
+            return None
+
+        blob = self.blob_path(sha256)
+        if blob.exists():
+            tmp_path.unlink(missing_ok=True)  # Same body already stored (another URL or revision)
+            os.utime(blob)
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, blob)
+            with self._lock:
+                self._size += size
+
+        entry = CacheEntry(
+            url=url,
+            sha256=sha256,
+            size=size,
+            status_code=status_code,
+            headers={k: v for k, v in headers.items() if k in _CACHED_HEADERS},
+            stored_at=now,
+            expires_at=expires_at,
+            final_url=final_url or url,
+            redirected=redirected,
+        )
+        self._write_entry(entry)
+        return entry
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Delete least recently used bodies until the cache fits max_bytes.
+
+        Args:
+            keep: SHA-256 of a body that must survive (the one just stored)
+
+        Returns:
+            Number of bodies deleted
+        """
+        if not self.max_bytes or self._size <= self.max_bytes:
+            return 0
+        with self._lock:
+            blobs = []
+            for path in self._blobs():
+                try:
+                    blobs.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            removed = 0
+            for _, path in sorted(blobs):
+                if self._size <= self.max_bytes:
+                    break
+                if path.name == keep:
+                    continue
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                self._size -= size
+                removed += 1
+        if removed:
+            logger.info(f"Fetch cache evicted {removed} bodies ({self._size} bytes kept)")
+        return removed
+
+    def refresh(self, entry: CacheEntry, headers: Dict[str, str]) -> CacheEntry:
+        """Apply a 304 response's headers (new validators / freshness) to an entry."""
+        now = time.time()
+        merged = dict(entry.headers)
+        merged.update({k: v for k, v in headers.items() if k in _CACHED_HEADERS})
+        entry.headers = merged
+        entry.stored_at = now
+        entry.expires_at = _freshness(merged, now, self.default_ttl) or now
+        self._write_entry(entry)
+        return entry
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        for sub in ("blobs", "entries", "tmp"):
+            (self.directory / sub).mkdir(parents=True, exist_ok=True)
+        self._size = 0
+
+
+# ============================================================================
+# Fetch service
+# ============================================================================
+
+class FetchService:
+    """Shared async GET/download service (see module docstring)."""
+
+    def __init__(self, config: Optional[FetchConfig] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            config: FetchConfig (default: FetchConfig.from_env())
+            transport: Custom httpx transport (tests)
+        """
+        self.config = config or FetchConfig.from_env()
+        self.cache = (
+            FetchCache(self.config.cache_dir, self.config.default_ttl, self.config.cache_max_bytes)
+            if self.config.cache_dir else None
+        )
+        self.metrics = FetchMetrics()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Event loop plumbing
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="fetch-service", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def _on_service_loop(self, coro):
+        """Await a coroutine on the service loop from whatever loop we're on."""
+        loop = self._ensure_loop()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return await coro
+        except RuntimeError:
+            pass
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _run_sync(self, coro):
+        if self._loop is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Use the async API from inside the fetch service loop")
+        return self._submit(coro).result()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            timeout = self.config.timeout
+            self._client = httpx.AsyncClient(
+                http2=self.config.http2 and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(connect=timeout.connect, read=timeout.read,
+                                      write=timeout.read, pool=timeout.total),
+                follow_redirects=self.config.follow_redirects,
+                max_redirects=self.config.max_redirects,
+                headers={"User-Agent": self.config.user_agent},
+                transport=self._transport,
+            )
+        return self._client
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.config.host_limits.get(host, self.config.per_host_limit))
+            self._host_slots[host] = slot
+        return slot
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def fetch(self, url: str, **kwargs) -> FetchResult:
+        """GET a URL into memory.
+
+        Args:
+            url: URL
+            headers: Extra request headers
+            params: Query parameters (part of the cache key)
+            use_cache: Read/write the on-disk cache (default: True)
+            max_bytes: Size cap (default: config.max_bytes, 0 = unlimited)
+
+        Returns:
+            FetchResult (check .ok / call .raise_for_status() for HTTP errors)
+
+        Raises:
+            TimeoutError, ConnectionError, TooManyRedirectsError, ResponseTooLargeError
+        """
+        return await self._on_service_loop(self._fetch(url, **kwargs))
+
+    async def download(self, url: str, dest: Union[str, Path], **kwargs) -> FetchResult:
+        """Stream a URL to a file (same options as fetch()); result.path is dest."""
+        return await self._on_service_loop(self._fetch(url, dest=Path(dest), **kwargs))
+
+    async def fetch_many(self, urls: Iterable[str], **kwargs) -> List[Union[FetchResult, Exception]]:
+        """Fetch URLs concurrently (bounded per host); failures are returned, not raised."""
+        async def gather():
+            return await asyncio.gather(*(self._fetch(url, **kwargs) for url in urls), return_exceptions=True)
+        return await self._on_service_loop(gather())
+
+    def fetch_sync(self, url: str, **kwargs) -> FetchResult:
+        """Blocking fetch() for sync callers (safe inside another running loop's thread)."""
+        return self._run_sync(self._fetch(url, **kwargs))
+
+    def download_sync(self, url: str, dest: Union[str, Path], **kwargs) -> FetchResult:
+        """Blocking download()."""
+        return self._run_sync(self._fetch(url, dest=Path(dest), **kwargs))
+
+    def close(self) -> None:
+        """Close pooled connections and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def shutdown():
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"Fetch service shutdown error: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+        self._host_slots.clear()
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+
+    async def _fetch(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        max_bytes: Optional[int] = None,
+        dest: Optional[Path] = None,
+    ) -> FetchResult:
+        start = time.perf_counter()
+        metrics = self.metrics
+        metrics.requests += 1
+        if params:
+            url = str(httpx.URL(url, params=params))
+        host = urlparse(url).hostname or ""
+        limit = self.config.max_bytes if max_bytes is None else max_bytes
+
+        cache = self.cache if use_cache else None
+        entry = cache.get(url) if cache else None
+        if entry is not None and entry.is_fresh():
+            metrics.cache_hits += 1
+            return self._finish(await self._from_cache(entry, dest), start)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+
+        async with self._host_slot(host):
+            metrics.in_flight += 1
+            metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+            try:
+                async with self._get_client().stream("GET", url, headers=request_headers) as response:
+                    metrics.network_requests += 1
+                    metrics.by_host[host] = metrics.by_host.get(host, 0) + 1
+                    metrics.by_status[response.status_code] = metrics.by_status.get(response.status_code, 0) + 1
+                    metrics.http_versions[response.http_version] = metrics.http_versions.get(response.http_version, 0) + 1
+                    response_headers = {k.lower(): v for k, v in response.headers.items()}
+                    final_url = str(response.url)
+                    redirected = bool(response.history)
+
+                    if response.status_code == 304 and entry is not None:
+                        metrics.revalidated += 1
+                        entry = cache.refresh(entry, response_headers)
+                        result = await self._from_cache(entry, dest)
+                        result.url = final_url
+                        result.revalidated = True
+                        result.redirected = redirected
+                        result.http_version = response.http_version
+                        return self._finish(result, start)
+
+                    declared = response_headers.get("content-length", "")
+                    if limit and declared.isdigit() and int(declared) > limit:
+                        raise self._too_large(url, f"Content-Length {declared} exceeds {limit} bytes")
+
+                    tmp_path, size, sha256 = await self._stream_to_temp(response, url, limit, dest)
+                    metrics.bytes_downloaded += size
+                    http_version = response.http_version
+                    status_code = response.status_code
+
+            except httpx.TimeoutException as e:
+                metrics.errors += 1
+                raise TimeoutError(self._transport_error(
+                    CATEGORY_TIMEOUT, url, f"Timed out: {type(e).__name__}", e)) from e
+            except httpx.TooManyRedirects as e:
+                metrics.errors += 1
+                raise TooManyRedirectsError(self._transport_error(
+                    CATEGORY_TOO_MANY_REDIRECTS, url, f"Too many redirects (max: {self.config.max_redirects})", e)) from e
+            except httpx.TransportError as e:
+                metrics.errors += 1
+                raise ConnectionError(self._transport_error(
+                    CATEGORY_CONNECTION_ERROR, url, f"Connection failed: {str(e)[:100]}", e)) from e
+            except ResponseTooLargeError:
+                metrics.errors += 1
+                raise
+            finally:
+                metrics.in_flight -= 1
+
+        # Body is on disk in tmp_path: cache it, then hand it to the caller.
+        # File work runs in a thread: bodies can be up to max_bytes and the
+        # service loop is shared by every fetch and download_sync caller.
+        stored = None
+        if cache is not None and status_code == 200:
+            stored = await asyncio.to_thread(
+                cache.store, url, tmp_path, sha256, size, status_code, response_headers,
+                final_url=final_url, redirected=redirected,
+            )
+            if stored:
+                metrics.cache_evictions += await asyncio.to_thread(cache.evict, keep=sha256)
+        body_path = cache.blob_path(sha256) if stored else tmp_path
+
+        result = FetchResult(
+            url=final_url,
+            status_code=status_code,
+            headers=response_headers,
+            size=size,
+            sha256=sha256,
+            redirected=redirected,
+            http_version=http_version,
+        )
+        if dest is not None and result.ok:
+            await asyncio.to_thread(_place_body, body_path, dest, move=not stored)
+            result.path = dest
+        else:
+            result.content = await asyncio.to_thread(body_path.read_bytes)
+            if not stored:
+                body_path.unlink(missing_ok=True)
+        return self._finish(result, start)
+
+    async def _stream_to_temp(self, response: httpx.Response, url: str, limit: int, dest: Optional[Path]):
+        """Write the body to a temp file (hashing as we go), enforcing the size cap."""
+        if self.cache is not None:
+            tmp_dir = self.cache.tmp_dir
+        elif dest is not None:
+            tmp_dir = dest.parent
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            tmp_dir = None
+        fd, name = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+        tmp_path = Path(name)
+
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+
+        def write(data: bytes) -> None:
+            digest.update(data)
+            f.write(data)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                    size += len(chunk)
+                    if limit and size > limit:
+                        raise self._too_large(url, f"Body exceeded {limit} bytes")
+                    buffer += chunk
+                    if len(buffer) >= _WRITE_BATCH:
+                        await asyncio.to_thread(write, bytes(buffer))
+                        buffer.clear()
+                if buffer:
+                    await asyncio.to_thread(write, bytes(buffer))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path, size, digest.hexdigest()
+
+    async def _from_cache(self, entry: CacheEntry, dest: Optional[Path]) -> FetchResult:
+        blob = self.cache.blob_path(entry.sha256)
+        result = FetchResult(
+            url=entry.final_url or entry.url,
+            status_code=entry.status_code,
+            headers=dict(entry.headers),
+            size=entry.size,
+            sha256=entry.sha256,
+            from_cache=True,
+            redirected=entry.redirected,
+        )
+        if dest is not None:
+            await asyncio.to_thread(_place_body, blob, dest, move=False)
+            result.path = dest
+        else:
+            result.content = await asyncio.to_thread(blob.read_bytes)
+        self.metrics.bytes_from_cache += entry.size
+        return result
+
+    def _finish(self, result: FetchResult, start: float) -> FetchResult:
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics.total_ms += result.elapsed_ms
+        return result
+
+    @staticmethod
+    def _transport_error(category: str, url: str, summary: str, error: Exception) -> HTTPError:
+        return HTTPError(
+            category=category,
+            http_status=None,
+            url=_sanitize_url(url),
+            method="GET",
+            request_id=None,
+            summary=summary,
+            raw_error=error,
+            retry_after=None,
+        )
+
+    def _too_large(self, url: str, summary: str) -> ResponseTooLargeError:
+        return ResponseTooLargeError(HTTPError(
+            category=CATEGORY_RESPONSE_TOO_LARGE,
+            http_status=None,
+            url=_sanitize_url(url),
+            method="GET",
+            request_id=None,
+            summary=summary,
+            raw_error=None,
+            retry_after=None,
+        ))
+
+
+# Global shared instance
+_fetch_service: Optional[FetchService] = None
+_fetch_service_lock = threading.Lock()
+
+
+def get_fetch_service(config: Optional[FetchConfig] = None) -> FetchService:
+    """Get or create the process-wide FetchService.
+
+    Args:
+        config: Only used when the service is first created
+
+    Returns:
+        Shared FetchService instance
+    """
+    global _fetch_service
+    with _fetch_service_lock:
+        if _fetch_service is None:
+            _fetch_service = FetchService(config)
+        return _fetch_service
+
+
+def shutdown_fetch_service() -> None:
+    """Close the shared FetchService (no-op if never created)."""
+    global _fetch_service
+    with _fetch_service_lock:
+        service, _fetch_service = _fetch_service, None
+    if service is not None:
+        service.close()
+
+
+atexit.register(shutdown_fetch_service)
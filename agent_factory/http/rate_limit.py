@@ -0,0 +1,180 @@
+"""Token-bucket rate limiting, shared per host.
+
+Rate limits are per client IP, so every scraper hitting the same API
+should draw from the same bucket. HostRateLimiter keeps one TokenBucket
+per host; the buckets can be slowed down or paused at runtime when an
+API says so (Stack Exchange `backoff`, Reddit X-Ratelimit-* headers,
+HTTP 429 Retry-After).
+
+Example:
+    >>> from agent_factory.http import get_host_limiter
+    >>> limiter = get_host_limiter()
+    >>> limiter.configure("www.reddit.com", rate=1.0, capacity=5)
+    >>>
+    >>> limiter.acquire("https://www.reddit.com/r/PLC/search.json")  # blocks if needed
+    >>> limiter.pause("www.reddit.com", 30)  # server asked us to back off
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill at `rate` per second up to `capacity`. Callers reserve
+    tokens ahead of time (the balance may go negative), so concurrent
+    callers queue fairly instead of all waking at once.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now; return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if available right now."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until or self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` could be taken (0 if available now); takes nothing."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            deficit = max(0.0, tokens - self._tokens) / self.rate
+            return max(deficit, self._paused_until - now)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available; returns seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Async acquire(); returns seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Grant nothing for `seconds` (extends, never shortens, an existing pause)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate (e.g. to spread remaining quota over a window)."""
+        if rate <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds left in the current pause (0 if not paused)."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use."""
+
+    def __init__(self, default_rate: float = 5.0, default_capacity: float = 5.0):
+        """
+        Args:
+            default_rate: Requests/second for hosts without explicit config
+            default_capacity: Burst size for hosts without explicit config
+        """
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+        self._settings: Dict[str, Tuple[float, float]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(host_or_url: str) -> str:
+        if "://" in host_or_url:
+            return (urlparse(host_or_url).hostname or "").lower()
+        return host_or_url.lower()
+
+    def configure(self, host: str, rate: float, capacity: float = 1.0) -> None:
+        """Set the rate for a host (replaces an existing bucket)."""
+        host = self._host(host)
+        with self._lock:
+            self._settings[host] = (rate, capacity)
+            self._buckets[host] = TokenBucket(rate, capacity)
+
+    def ensure(self, host: str, rate: float, capacity: float = 1.0) -> None:
+        """Configure a host unless it already has settings (first caller wins)."""
+        host = self._host(host)
+        with self._lock:
+            if host not in self._settings:
+                self._settings[host] = (rate, capacity)
+                self._buckets[host] = TokenBucket(rate, capacity)
+
+    def bucket(self, host_or_url: str) -> TokenBucket:
+        """Bucket for a host or URL."""
+        host = self._host(host_or_url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, capacity = self._settings.get(host, (self.default_rate, self.default_capacity))
+                bucket = self._buckets[host] = TokenBucket(rate, capacity)
+            return bucket
+
+    def acquire(self, host_or_url: str, tokens: float = 1.0) -> float:
+        return self.bucket(host_or_url).acquire(tokens)
+
+    async def acquire_async(self, host_or_url: str, tokens: float = 1.0) -> float:
+        return await self.bucket(host_or_url).acquire_async(tokens)
+
+    def pause(self, host_or_url: str, seconds: float) -> None:
+        self.bucket(host_or_url).pause(seconds)
+
+
+# Global shared instance (rate limits are per client IP, not per object)
+_host_limiter: Optional[HostRateLimiter] = None
+_host_limiter_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostRateLimiter:
+    """Get the process-wide HostRateLimiter."""
+    global _host_limiter
+    with _host_limiter_lock:
+        if _host_limiter is None:
+            _host_limiter = HostRateLimiter()
+        return _host_limiter
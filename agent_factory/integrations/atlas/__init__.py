@@ -11,9 +11,21 @@ Example:
     ...         "priority": "HIGH"
     ...     })
     ...     print(f"Created work order: {work_order['id']}")
+
+Long-lived services share one pooled client and token:
+    >>> from agent_factory.integrations.atlas import get_atlas_client
+    >>> atlas = get_atlas_client()
+    >>> batch = await atlas.create_work_orders([{"title": "Fix pump"}, {"title": "Check motor"}])
 """
 
-from .client import AtlasClient, AtlasTokenCache
+from .client import (
+    AtlasClient,
+    AtlasTokenCache,
+    AtlasBatchResult,
+    get_atlas_client,
+    shutdown_atlas_client,
+    get_token_cache
+)
 from .config import atlas_config, AtlasConfig
 from .exceptions import (
     AtlasError,
@@ -29,6 +41,10 @@ __all__ = [
     # Client
     "AtlasClient",
     "AtlasTokenCache",
+    "AtlasBatchResult",
+    "get_atlas_client",
+    "shutdown_atlas_client",
+    "get_token_cache",
 
     # Configuration
     "atlas_config",
@@ -6,13 +6,16 @@ comprehensive error handling with retries.
 """
 
 import asyncio
+import logging
+import time
 import httpx
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable, Iterable
 from langsmith import traceable
 
 from .config import atlas_config
 from .exceptions import (
+    AtlasError,
     AtlasAuthError,
     AtlasAPIError,
     AtlasNotFoundError,
@@ -21,6 +24,11 @@ from .exceptions import (
     AtlasConfigError
 )
 
+logger = logging.getLogger(__name__)
+
+# Never send a token this close (seconds) to its expiry
+TOKEN_EXPIRY_SKEW = 10
+
 
 class AtlasTokenCache:
     """Thread-safe JWT token cache with automatic expiry.
@@ -29,10 +37,19 @@ class AtlasTokenCache:
     concurrent requests while respecting token expiration times. It uses
     asyncio locks to prevent race conditions.
 
+    Re-authentication is single-flight: concurrent callers that find the
+    token missing, stale, or rejected (401) queue on one refresh lock, and
+    only the first one signs in; the rest reuse the token it cached.
+
+    Expiry is tracked on the monotonic clock, so wall-clock jumps (NTP,
+    suspend/resume) never make a token look valid for too long.
+
     Attributes:
         _token: Cached JWT token string
-        _expires_at: Token expiration datetime
+        _expires_at: Token expiration time (time.monotonic() seconds)
         _lock: Asyncio lock for thread-safe access
+        _refresh_lock: Asyncio lock serializing re-authentication
+        refreshes: Number of sign-ins performed through refresh()
 
     Example:
         >>> cache = AtlasTokenCache()
@@ -44,8 +61,10 @@ class AtlasTokenCache:
     def __init__(self):
         """Initialize empty token cache with lock."""
         self._token: Optional[str] = None
-        self._expires_at: Optional[datetime] = None
+        self._expires_at: Optional[float] = None
         self._lock = asyncio.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self.refreshes = 0
 
     async def get_token(self) -> Optional[str]:
         """Get cached token if still valid.
@@ -58,12 +77,7 @@ class AtlasTokenCache:
             JWT token string if valid, None if expired or not set.
         """
         async with self._lock:
-            if self._token and self._expires_at:
-                # Check if token is still valid with buffer
-                buffer = timedelta(seconds=atlas_config.atlas_token_refresh_buffer)
-                if datetime.utcnow() + buffer < self._expires_at:
-                    return self._token
-            return None
+            return self._token if self.is_valid else None
 
     async def set_token(self, token: str, ttl_seconds: int = None):
         """Cache a new token with expiration time.
@@ -77,7 +91,7 @@ class AtlasTokenCache:
 
         async with self._lock:
             self._token = token
-            self._expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+            self._expires_at = time.monotonic() + ttl_seconds
 
     async def clear(self):
         """Clear cached token (force re-authentication on next request)."""
@@ -94,8 +108,106 @@ class AtlasTokenCache:
         """
         if not self._token or not self._expires_at:
             return False
-        buffer = timedelta(seconds=atlas_config.atlas_token_refresh_buffer)
-        return datetime.utcnow() + buffer < self._expires_at
+        buffer = atlas_config.atlas_token_refresh_buffer
+        return time.monotonic() + buffer < self._expires_at
+
+    def peek(self) -> Tuple[Optional[str], bool]:
+        """Get the token for immediate use plus whether a refresh is due.
+
+        Unlike get_token(), a token inside the refresh buffer is still
+        returned (it has not expired yet), so callers can keep using it
+        while a refresh runs in the background. Tokens closer than
+        TOKEN_EXPIRY_SKEW seconds to expiry are never returned.
+
+        Returns:
+            (token or None, refresh_due)
+        """
+        if not self._token or not self._expires_at:
+            return None, True
+        now = time.monotonic()
+        buffer = atlas_config.atlas_token_refresh_buffer
+        if now + min(TOKEN_EXPIRY_SKEW, buffer) >= self._expires_at:
+            return None, True
+        return self._token, now + buffer >= self._expires_at
+
+    async def refresh(
+        self,
+        stale: Optional[str],
+        authenticate: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Re-authenticate once for all concurrent callers.
+
+        Args:
+            stale: Token the caller found unusable (None if there was none)
+            authenticate: Coroutine function that signs in and caches the
+                new token via set_token()
+
+        Returns:
+            A fresh token, either newly issued or cached by a concurrent
+            caller that won the race.
+        """
+        async with self._refresh_lock:
+            token, refresh_due = self.peek()
+            if token and token != stale and not refresh_due:
+                return token
+            self.refreshes += 1
+            return await authenticate()
+
+
+# Token caches shared by every client for the same Atlas account
+_token_caches: Dict[Tuple[str, str], AtlasTokenCache] = {}
+
+
+def get_token_cache(base_url: str, email: str) -> AtlasTokenCache:
+    """Get the process-wide token cache for an Atlas account.
+
+    Clients created with this cache sign in once per process instead of once
+    per client instance.
+
+    Args:
+        base_url: Atlas API base URL
+        email: Account email
+
+    Returns:
+        Shared AtlasTokenCache
+    """
+    key = (base_url.rstrip('/'), email.lower())
+    if key not in _token_caches:
+        _token_caches[key] = AtlasTokenCache()
+    return _token_caches[key]
+
+
+@dataclass
+class AtlasBatchResult:
+    """Outcome of a batch call, in input order.
+
+    Attributes:
+        results: Response per item (None where the item failed)
+        errors: Item index -> Atlas error raised for that item
+    """
+
+    results: List[Optional[Dict[str, Any]]] = field(default_factory=list)
+    errors: Dict[int, AtlasError] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if every item succeeded."""
+        return not self.errors
+
+    @property
+    def succeeded(self) -> int:
+        return len(self.results) - len(self.errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "results": self.results,
+            "errors": {
+                index: {"type": type(error).__name__, "message": error.message, "details": error.details}
+                for index, error in self.errors.items()
+            },
+            "succeeded": self.succeeded,
+            "failed": len(self.errors),
+        }
 
 
 class AtlasClient:
@@ -113,6 +225,13 @@ class AtlasClient:
         - LangSmith tracing for observability
         - Async context manager support
         - Type-safe API methods
+        - Pooled keep-alive connections for long-lived use
+        - Proactive, single-flight token refresh
+        - Batch helpers for bulk work order and asset operations
+
+    Long-lived services should use the process-wide client from
+    get_atlas_client() (opened and closed by the API lifespan) instead of a
+    client per request: its connections stay warm and its token is shared.
 
     Example:
         >>> async with AtlasClient() as client:
@@ -129,7 +248,10 @@ class AtlasClient:
         email: str = None,
         password: str = None,
         timeout: float = None,
-        max_retries: int = None
+        max_retries: int = None,
+        token_cache: AtlasTokenCache = None,
+        limits: httpx.Limits = None,
+        transport: httpx.AsyncBaseTransport = None
     ):
         """Initialize Atlas client with configuration.
 
@@ -139,6 +261,10 @@ class AtlasClient:
             password: Admin password (default from config)
             timeout: Request timeout in seconds (default from config)
             max_retries: Max retry attempts (default from config)
+            token_cache: Token cache to use (default: private to this client;
+                pass get_token_cache(base_url, email) to share one)
+            limits: Connection pool limits (default from config)
+            transport: Custom httpx transport (e.g. a mock server in tests)
 
         Raises:
             AtlasConfigError: If required configuration is missing
@@ -155,24 +281,74 @@ class AtlasClient:
         if not self.email or not self.password:
             raise AtlasConfigError("Atlas credentials not configured")
 
-        self._token_cache = AtlasTokenCache()
+        self.limits = limits or httpx.Limits(
+            max_connections=atlas_config.atlas_max_connections,
+            max_keepalive_connections=atlas_config.atlas_max_keepalive_connections,
+            keepalive_expiry=atlas_config.atlas_keepalive_expiry
+        )
+        self._transport = transport
+        self._token_cache = token_cache or AtlasTokenCache()
         self._client: Optional[httpx.AsyncClient] = None
+        self._refresh_task: Optional[asyncio.Task] = None
 
-    async def __aenter__(self):
-        """Async context manager entry - creates HTTP client."""
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=self.timeout,
-            headers={"Content-Type": "application/json"}
-        )
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None
+
+    async def open(self) -> "AtlasClient":
+        """Create the pooled HTTP client (no-op if already open)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport,
+                headers={"Content-Type": "application/json"}
+            )
         return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit - closes HTTP client."""
+    async def aclose(self):
+        """Close pooled connections and stop any background token refresh."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except (asyncio.CancelledError, AtlasError):
+                pass
+        self._refresh_task = None
         if self._client:
             await self._client.aclose()
             self._client = None
 
+    async def __aenter__(self):
+        """Async context manager entry - creates HTTP client."""
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - closes HTTP client."""
+        await self.aclose()
+
+    async def _get_token(self) -> str:
+        """Return a usable token, signing in or refreshing as needed.
+
+        A missing or expired token blocks on a single-flight sign-in. A token
+        inside the refresh buffer is returned immediately while one
+        background task fetches its replacement.
+        """
+        token, refresh_due = self._token_cache.peek()
+        if token is None:
+            return await self._token_cache.refresh(None, self._authenticate)
+        if refresh_due and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_in_background(token))
+        return token
+
+    async def _refresh_in_background(self, stale: str):
+        try:
+            await self._token_cache.refresh(stale, self._authenticate)
+        except AtlasError as e:
+            # The current token is still valid; the next request retries
+            logger.warning(f"Proactive Atlas token refresh failed: {e}")
+
     @traceable(name="atlas_authenticate")
     async def _authenticate(self) -> str:
         """Authenticate with Atlas and return JWT token.
@@ -258,10 +434,11 @@ class AtlasClient:
             AtlasRateLimitError: Rate limit exceeded (429)
             AtlasAPIError: Other API errors
         """
+        if self._client is None:
+            await self.open()
+
         # Get or refresh token
-        token = await self._token_cache.get_token()
-        if not token:
-            token = await self._authenticate()
+        token = await self._get_token()
 
         try:
             # Execute request
@@ -273,9 +450,10 @@ class AtlasClient:
                 headers={"Authorization": f"Bearer {token}"}
             )
 
-            # Handle 401 - token expired, refresh once
+            # Handle 401 - token expired or revoked, refresh once (concurrent
+            # 401s for the same token share a single sign-in)
             if response.status_code == 401 and retry_count == 0:
-                await self._token_cache.clear()
+                await self._token_cache.refresh(token, self._authenticate)
                 return await self._request(method, endpoint, json_data, params, retry_count=1)
 
             # Handle 404 - resource not found
@@ -458,6 +636,112 @@ class AtlasClient:
         """
         return await self._request("GET", f"/assets/{asset_id}")
 
+    # ========================================================================
+    # Batch API Methods
+    # ========================================================================
+
+    async def _batch(
+        self,
+        calls: Iterable[Callable[[], Awaitable[Dict[str, Any]]]],
+        max_concurrency: Optional[int] = None
+    ) -> AtlasBatchResult:
+        """Run per-item calls concurrently over the pooled connections.
+
+        Args:
+            calls: One zero-argument coroutine function per item
+            max_concurrency: Max in-flight requests (default from config)
+
+        Returns:
+            AtlasBatchResult in input order; an Atlas error on one item does
+            not fail the others.
+        """
+        if self._client is None:
+            await self.open()
+        limit = asyncio.Semaphore(max_concurrency or atlas_config.atlas_batch_concurrency)
+
+        async def run(call):
+            async with limit:
+                return await call()
+
+        done = await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+        result = AtlasBatchResult()
+        for index, item in enumerate(done):
+            if isinstance(item, AtlasError):
+                result.errors[index] = item
+                result.results.append(None)
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                result.results.append(item)
+        return result
+
+    @traceable(name="atlas_batch_create_work_orders")
+    async def create_work_orders(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> AtlasBatchResult:
+        """Create many work orders (see create_work_order for fields).
+
+        Args:
+            items: Work order data dictionaries
+            max_concurrency: Max in-flight requests (default from config)
+
+        Returns:
+            AtlasBatchResult with the created work orders in input order
+        """
+        return await self._batch(
+            [lambda data=data: self.create_work_order(data) for data in items],
+            max_concurrency
+        )
+
+    @traceable(name="atlas_batch_update_work_orders")
+    async def update_work_orders(
+        self,
+        updates: Dict[str, Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> AtlasBatchResult:
+        """Apply partial updates to many work orders.
+
+        Args:
+            updates: Work order ID -> fields to update
+            max_concurrency: Max in-flight requests (default from config)
+
+        Returns:
+            AtlasBatchResult in the iteration order of updates
+        """
+        return await self._batch(
+            [
+                lambda wo_id=wo_id, fields=fields: self.update_work_order(wo_id, fields)
+                for wo_id, fields in updates.items()
+            ],
+            max_concurrency
+        )
+
+    @traceable(name="atlas_batch_get_work_orders")
+    async def get_work_orders(
+        self,
+        work_order_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> AtlasBatchResult:
+        """Fetch many work orders by ID (missing ones land in errors)."""
+        return await self._batch(
+            [lambda wo_id=wo_id: self.get_work_order(wo_id) for wo_id in work_order_ids],
+            max_concurrency
+        )
+
+    @traceable(name="atlas_batch_get_assets")
+    async def get_assets(
+        self,
+        asset_ids: List[str],
+        max_concurrency: Optional[int] = None
+    ) -> AtlasBatchResult:
+        """Fetch many assets by ID (missing ones land in errors)."""
+        return await self._batch(
+            [lambda asset_id=asset_id: self.get_asset(asset_id) for asset_id in asset_ids],
+            max_concurrency
+        )
+
     # ========================================================================
     # User API Methods
     # ========================================================================
@@ -499,7 +783,46 @@ class AtlasClient:
             ...     health = await client.health_check()
             ...     print(health["status"])  # "UP" if healthy
         """
+        if self._client is None:
+            await self.open()
+
         # Health endpoint doesn't require authentication
         response = await self._client.get("/health")
         response.raise_for_status()
         return response.json() if response.content else {"status": "UP"}
+
+
+# ============================================================================
+# Shared client
+# ============================================================================
+
+_shared_client: Optional[AtlasClient] = None
+
+
+def get_atlas_client() -> AtlasClient:
+    """Get the process-wide Atlas client.
+
+    The client is created from atlas_config on first use, keeps its
+    connection pool open across requests and uses the shared token cache.
+    Do not use it as a context manager; call shutdown_atlas_client() on
+    application shutdown instead.
+
+    Raises:
+        AtlasConfigError: If required configuration is missing
+    """
+    global _shared_client
+    if _shared_client is None:
+        base_url = atlas_config.atlas_base_url
+        _shared_client = AtlasClient(
+            base_url=base_url,
+            token_cache=get_token_cache(base_url, atlas_config.atlas_email)
+        )
+    return _shared_client
+
+
+async def shutdown_atlas_client() -> None:
+    """Close the shared Atlas client (no-op if never created)."""
+    global _shared_client
+    client, _shared_client = _shared_client, None
+    if client is not None:
+        await client.aclose()
@@ -23,6 +23,10 @@ class AtlasConfig(BaseSettings):
         ATLAS_ENABLED: Feature flag to enable/disable Atlas integration (default: true)
         ATLAS_TOKEN_TTL: JWT token TTL in seconds (default: 86400 = 24 hours)
         ATLAS_TOKEN_REFRESH_BUFFER: Seconds before expiry to refresh token (default: 300 = 5 minutes)
+        ATLAS_MAX_CONNECTIONS: Connection pool size for the shared client (default: 20)
+        ATLAS_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept open (default: 10)
+        ATLAS_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default: 30.0)
+        ATLAS_BATCH_CONCURRENCY: Max in-flight requests per batch call (default: 8)
 
     Example:
         >>> from agent_factory.integrations.atlas.config import atlas_config
@@ -48,6 +52,12 @@ class AtlasConfig(BaseSettings):
     atlas_token_ttl: int = 86400  # 24 hours
     atlas_token_refresh_buffer: int = 300  # 5 minutes
 
+    # Connection Pool (shared client)
+    atlas_max_connections: int = 20
+    atlas_max_keepalive_connections: int = 10
+    atlas_keepalive_expiry: float = 30.0
+    atlas_batch_concurrency: int = 8
+
     # Pydantic Settings Configuration
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -92,6 +102,10 @@ class AtlasConfig(BaseSettings):
             errors.append("ATLAS_TOKEN_REFRESH_BUFFER must be non-negative")
         if self.atlas_token_refresh_buffer >= self.atlas_token_ttl:
             errors.append("ATLAS_TOKEN_REFRESH_BUFFER must be less than ATLAS_TOKEN_TTL")
+        if self.atlas_max_connections <= 0:
+            errors.append("ATLAS_MAX_CONNECTIONS must be positive")
+        if self.atlas_batch_concurrency <= 0:
+            errors.append("ATLAS_BATCH_CONCURRENCY must be positive")
 
         return errors
 
@@ -26,9 +26,11 @@ from telegram.ext import (
 
 from agent_factory.core.agent_factory import AgentFactory
 from agent_factory.cli.agent_presets import get_agent
+from agent_factory.memory.storage import SQLiteStorage
 
 from .config import TelegramConfig
 from .session_manager import TelegramSessionManager
+from .dispatcher import ChatDispatcher
 from .formatters import ResponseFormatter
 from . import handlers
 from . import github_handlers
@@ -72,7 +74,20 @@ class TelegramBot:
             >>> bot = TelegramBot(config)
         """
         self.config = config
-        self.session_manager = TelegramSessionManager()
+        self.session_manager = TelegramSessionManager(
+            max_sessions=config.max_sessions,
+            ttl_hours=config.session_ttl_hours,
+            spill_storage=(
+                SQLiteStorage(config.session_spill_path)
+                if config.session_spill_path else None
+            )
+        )
+        self.dispatcher = ChatDispatcher(
+            max_concurrent=config.max_concurrent_agents,
+            max_queued_per_chat=config.max_queued_per_chat,
+            max_queued_total=config.max_queued_total,
+            coalesce_seconds=config.coalesce_seconds
+        )
         self.factory = AgentFactory(verbose=False)
 
         # Initialize RIVET Pro handlers (for voice message routing)
@@ -87,7 +102,9 @@ class TelegramBot:
             rivet_handlers=self.rivet_handlers
         )
 
-        # Build application
+        # Build application (updates are processed in order; message_handler
+        # hands agent turns to ChatDispatcher and returns, so only those run
+        # concurrently)
         self.app = Application.builder().token(config.bot_token).build()
 
         # Store bot instance in context for handlers
@@ -292,8 +309,8 @@ class TelegramBot:
             ...     "research"
             ... )
         """
-        # Get or create session
-        session = self.session_manager.get_or_create(chat_id, agent_type)
+        # Get or create session (in a thread: a spilled session is restored from disk)
+        session = await asyncio.to_thread(self.session_manager.get_or_create, chat_id, agent_type)
 
         # Add user message to history
         session.add_user_message(message)
@@ -324,11 +341,11 @@ Please respond to the current message, referencing the previous conversation whe
             else:
                 input_with_context = message
 
-            response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    agent_executor.invoke,
-                    {"input": input_with_context}
-                ),
+            # Bounded pool: a burst across chats queues instead of spawning threads
+            response = await self.dispatcher.run_blocking(
+                chat_id,
+                agent_executor.invoke,
+                {"input": input_with_context},
                 timeout=self.config.max_agent_execution_time
             )
 
@@ -355,7 +372,7 @@ Please respond to the current message, referencing the previous conversation whe
 
         # LOG QUERY FOR STREAM 2 (Query Intelligence)
         # This captures what equipment users ask about to prioritize scraping
-        self._log_query_intelligence(user_id, message)
+        self._log_query_intelligence(chat_id, message)
 
         # Filter PII if enabled
         if self.config.enable_pii_filtering:
@@ -593,6 +610,12 @@ Please respond to the current message, referencing the previous conversation whe
             # Stop health server
             await self._stop_health_server()
 
+            # Drop queued agent turns
+            await self.dispatcher.shutdown()
+
+            # Write out sessions still waiting to spill
+            await asyncio.to_thread(self.session_manager.close)
+
             # Cleanup Telegram bot
             await self.app.updater.stop()
             await self.app.stop()
@@ -607,6 +630,7 @@ Please respond to the current message, referencing the previous conversation whe
         Returns:
             Dictionary with stats:
             - sessions: Session statistics
+            - dispatch: Agent queue depth and wait times
             - config: Bot configuration summary
 
         Example:
@@ -616,6 +640,7 @@ Please respond to the current message, referencing the previous conversation whe
         """
         return {
             "sessions": self.session_manager.get_stats(),
+            "dispatch": self.dispatcher.metrics.to_dict(),
             "config": {
                 "rate_limit": self.config.rate_limit,
                 "session_ttl_hours": self.config.session_ttl_hours,
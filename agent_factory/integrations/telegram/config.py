@@ -54,6 +54,17 @@ class TelegramConfig(BaseModel):
         le=168  # 1 week max
     )
 
+    max_sessions: int = Field(
+        default=10_000,
+        description="Max sessions held in memory (least recently used evicted)",
+        ge=1
+    )
+
+    session_spill_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for evicted sessions (None = discard them)"
+    )
+
     allowed_users: Optional[List[int]] = Field(
         default=None,
         description="Whitelist of allowed chat IDs (None = all users)"
@@ -78,6 +89,33 @@ class TelegramConfig(BaseModel):
         le=300  # 5 minutes max
     )
 
+    max_concurrent_agents: int = Field(
+        default=4,
+        description="Agent turns running at once across all chats",
+        ge=1,
+        le=64
+    )
+
+    max_queued_per_chat: int = Field(
+        default=3,
+        description="Messages a chat may have waiting before 'busy' replies",
+        ge=1,
+        le=20
+    )
+
+    max_queued_total: int = Field(
+        default=100,
+        description="Messages waiting across all chats before 'busy' replies",
+        ge=1
+    )
+
+    coalesce_seconds: float = Field(
+        default=0.75,
+        description="Quiet period for merging rapid messages into one turn",
+        ge=0,
+        le=10
+    )
+
     max_response_chunks: int = Field(
         default=5,
         description="Max message chunks for long responses",
@@ -110,6 +148,9 @@ class TelegramConfig(BaseModel):
         - TELEGRAM_BOT_TOKEN (required)
         - TELEGRAM_RATE_LIMIT (optional)
         - TELEGRAM_ALLOWED_USERS (optional, comma-separated)
+        - TELEGRAM_MAX_SESSIONS (optional)
+        - TELEGRAM_SESSION_SPILL_PATH (optional)
+        - TELEGRAM_MAX_CONCURRENT_AGENTS (optional)
 
         Returns:
             TelegramConfig instance
@@ -141,5 +182,8 @@ class TelegramConfig(BaseModel):
             bot_token=bot_token,
             rate_limit=int(os.getenv("TELEGRAM_RATE_LIMIT", "10")),
             allowed_users=allowed_users,
+            max_sessions=int(os.getenv("TELEGRAM_MAX_SESSIONS", "10000")),
+            session_spill_path=os.getenv("TELEGRAM_SESSION_SPILL_PATH") or None,
+            max_concurrent_agents=int(os.getenv("TELEGRAM_MAX_CONCURRENT_AGENTS", "4")),
             log_conversations=os.getenv("TELEGRAM_LOG_CONVERSATIONS", "false").lower() == "true"
         )
@@ -0,0 +1,293 @@
+"""
+Per-chat work queues for agent turns.
+
+Each chat gets one ordered queue drained by a single task, so an agent never
+runs twice at once on the same history. Messages that arrive while a turn is
+waiting (within `coalesce_seconds`, or while the previous turn runs) are
+merged into one turn. A global semaphore and a bounded thread pool cap how
+many agents run at once across all chats; when queues get too deep, new
+messages are shed with DispatcherBusy instead of piling up.
+
+Blocking agent calls go through run_blocking(). If one times out, its thread
+keeps running, so the chat keeps its slot (and its next turn waits) until
+the thread actually returns.
+
+Example:
+    >>> dispatcher = ChatDispatcher(max_concurrent=4)
+    >>> try:
+    ...     reply = await dispatcher.submit(chat_id, text, run_turn)
+    ... except DispatcherBusy as e:
+    ...     await update.message.reply_text(e.user_message)
+    >>> if reply is None:
+    ...     return  # merged into a later message's turn
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+# (chat_id, merged message text) -> reply
+TurnHandler = Callable[[int, str], Awaitable[str]]
+
+
+class DispatcherBusy(Exception):
+    """Raised when a message is shed because queues are full."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def user_message(self) -> str:
+        return (
+            f"I'm busy with other requests right now. "
+            f"Please wait about {self.retry_after} seconds and try again."
+        )
+
+
+@dataclass
+class DispatchMetrics:
+    """Queue depth and wait-time counters."""
+
+    submitted: int = 0
+    turns: int = 0
+    coalesced: int = 0
+    shed: int = 0
+    failed_turns: int = 0
+    timed_out: int = 0
+    queued: int = 0
+    running: int = 0
+    active_chats: int = 0
+    peak_queued: int = 0
+    total_wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+    total_turn_sec: float = 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        started = self.turns + self.coalesced
+        data["avg_wait_sec"] = self.total_wait_sec / started if started else 0.0
+        data["avg_turn_sec"] = self.total_turn_sec / self.turns if self.turns else 0.0
+        return data
+
+
+@dataclass
+class _Pending:
+    text: str
+    enqueued: float
+    future: asyncio.Future = field(repr=False)
+
+
+class ChatDispatcher:
+    """
+    Serialized per-chat queues over a global bounded worker pool.
+
+    Must be used from a single event loop (the bot's).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_queued_per_chat: int = 3,
+        max_queued_total: int = 100,
+        coalesce_seconds: float = 0.75,
+        max_coalesced: int = 5
+    ):
+        """
+        Args:
+            max_concurrent: Agent turns running at once across all chats
+            max_queued_per_chat: Messages a chat may have waiting before shedding
+            max_queued_total: Messages waiting across all chats before shedding
+            coalesce_seconds: Quiet period to wait for follow-up messages
+            max_coalesced: Max messages merged into one turn
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued_per_chat = max_queued_per_chat
+        self.max_queued_total = max_queued_total
+        self.coalesce_seconds = coalesce_seconds
+        self.max_coalesced = max_coalesced
+
+        # Blocking agent calls run here instead of the default pool
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrent,
+            thread_name_prefix="telegram-agent"
+        )
+        self.metrics = DispatchMetrics()
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._queues: Dict[int, Deque[_Pending]] = {}
+        self._drainers: Dict[int, asyncio.Task] = {}
+        self._abandoned: Dict[int, List[Future]] = {}  # Timed-out calls still running
+        self._turn_seconds = 5.0  # EWMA of turn duration, for retry hints
+
+    def _retry_after(self) -> int:
+        backlog = self.metrics.queued + self.metrics.running
+        return max(1, round(self._turn_seconds * backlog / self.max_concurrent))
+
+    def _admit(self, chat_id: int) -> None:
+        depth = len(self._queues.get(chat_id, ()))
+        if depth >= self.max_queued_per_chat:
+            reason = f"chat {chat_id} has {depth} queued messages"
+        elif self.metrics.queued >= self.max_queued_total:
+            reason = f"{self.metrics.queued} messages queued across all chats"
+        else:
+            return
+        self.metrics.shed += 1
+        raise DispatcherBusy(reason, self._retry_after())
+
+    async def submit(self, chat_id: int, text: str, handler: TurnHandler) -> Optional[str]:
+        """
+        Queue a message for the chat and wait for its turn.
+
+        Returns:
+            The reply for the turn this message was part of, or None if the
+            message was merged into a turn answered on a later message
+
+        Raises:
+            DispatcherBusy: If the message was shed (nothing was queued)
+        """
+        return await asyncio.shield(self.enqueue(chat_id, text, handler))
+
+    def enqueue(self, chat_id: int, text: str, handler: TurnHandler) -> asyncio.Future:
+        """
+        Queue a message without waiting for its turn.
+
+        Lets the caller return to the update loop right away while keeping
+        arrival order (the message is queued before this returns).
+
+        Returns:
+            Future resolving like submit()
+
+        Raises:
+            DispatcherBusy: If the message was shed (nothing was queued)
+        """
+        self._admit(chat_id)
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(chat_id, deque())
+        queue.append(_Pending(text, time.monotonic(), future))
+        self.metrics.submitted += 1
+        self.metrics.queued += 1
+        self.metrics.peak_queued = max(self.metrics.peak_queued, self.metrics.queued)
+
+        if chat_id not in self._drainers:
+            self._drainers[chat_id] = asyncio.create_task(self._drain(chat_id, handler))
+            self.metrics.active_chats = len(self._drainers)
+
+        return future
+
+    async def run_blocking(
+        self,
+        chat_id: int,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run a blocking call for the chat on the agent thread pool.
+
+        Raises:
+            asyncio.TimeoutError: If the call takes longer than timeout. The
+                thread can't be interrupted, so the call is remembered and the
+                chat's slot stays held until it finishes.
+        """
+        future = self.executor.submit(func, *args)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timed_out += 1
+            self._abandoned.setdefault(chat_id, []).append(future)
+            raise
+
+    async def _drain(self, chat_id: int, handler: TurnHandler) -> None:
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                await self._wait_for_quiet(queue)
+                async with self._slots:
+                    # Messages that arrived while waiting for a slot join this turn
+                    batch = [queue.popleft() for _ in range(min(len(queue), self.max_coalesced))]
+                    try:
+                        await self._run_turn(chat_id, batch, handler)
+                    except asyncio.CancelledError:
+                        for pending in batch:
+                            if not pending.future.done():
+                                pending.future.cancel()
+                        raise
+                    # Replies are out; keep the slot until timed-out calls return
+                    await self._wait_abandoned(chat_id)
+        finally:
+            del self._drainers[chat_id]
+            self.metrics.active_chats = len(self._drainers)
+            if queue:
+                # Cancelled mid-queue: fail the leftovers rather than hang callers
+                for pending in queue:
+                    if not pending.future.done():
+                        pending.future.cancel()
+                self.metrics.queued -= len(queue)
+                queue.clear()
+            del self._queues[chat_id]
+
+    async def _wait_abandoned(self, chat_id: int) -> None:
+        abandoned = self._abandoned.pop(chat_id, None)
+        if abandoned:
+            await asyncio.wait([asyncio.wrap_future(future) for future in abandoned])
+
+    async def _wait_for_quiet(self, queue: Deque[_Pending]) -> None:
+        """Wait until no new message arrived for coalesce_seconds (or the batch is full)."""
+        while len(queue) < self.max_coalesced:
+            idle = time.monotonic() - queue[-1].enqueued
+            if idle >= self.coalesce_seconds:
+                return
+            await asyncio.sleep(self.coalesce_seconds - idle)
+
+    async def _run_turn(self, chat_id: int, batch: List[_Pending], handler: TurnHandler) -> None:
+        started = time.monotonic()
+        self.metrics.queued -= len(batch)
+        self.metrics.running += 1
+        self.metrics.turns += 1
+        self.metrics.coalesced += len(batch) - 1
+        for pending in batch:
+            wait = started - pending.enqueued
+            self.metrics.total_wait_sec += wait
+            self.metrics.max_wait_sec = max(self.metrics.max_wait_sec, wait)
+
+        error: Optional[BaseException] = None
+        reply: Optional[str] = None
+        try:
+            reply = await handler(chat_id, "\n".join(p.text for p in batch))
+        except Exception as e:
+            self.metrics.failed_turns += 1
+            error = e
+        finally:
+            elapsed = time.monotonic() - started
+            self.metrics.running -= 1
+            self.metrics.total_turn_sec += elapsed
+            self._turn_seconds = 0.8 * self._turn_seconds + 0.2 * elapsed
+
+        *merged, last = batch
+        for pending in merged:
+            if not pending.future.done():
+                pending.future.set_result(None)
+        if last.future.done():
+            return
+        if error is not None:
+            last.future.set_exception(error)
+        else:
+            last.future.set_result(reply)
+
+    def queue_depth(self, chat_id: int) -> int:
+        """Messages waiting for the chat (excluding a running turn)."""
+        return len(self._queues.get(chat_id, ()))
+
+    async def shutdown(self) -> None:
+        """Cancel queued work and release the worker threads."""
+        drainers = list(self._drainers.values())
+        for task in drainers:
+            task.cancel()
+        await asyncio.gather(*drainers, return_exceptions=True)
+        self._abandoned.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
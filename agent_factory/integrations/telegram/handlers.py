@@ -7,11 +7,14 @@ Handlers:
 - Callback handlers: Inline button presses (agent selection, approvals)
 """
 
+import asyncio
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ChatAction
 
 from .formatters import ResponseFormatter
+from .dispatcher import DispatcherBusy
 from .intent_detector import IntentDetector
 from . import kb_handlers
 from . import github_handlers
@@ -352,19 +355,43 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Otherwise, proceed with general chat (existing behavior)
     # Get agent type (auto-select research if not set for conversational mode)
-    agent_type = bot_instance.session_manager.get_agent_type(chat_id)
+    # (in a thread: a spilled session is restored from disk)
+    agent_type = await asyncio.to_thread(bot_instance.session_manager.get_agent_type, chat_id)
     if not agent_type:
         agent_type = "research"  # Default to research agent for immediate chat
-        bot_instance.session_manager.set_agent_type(chat_id, agent_type)
+        await asyncio.to_thread(bot_instance.session_manager.set_agent_type, chat_id, agent_type)
 
-    # Execute agent
-    try:
-        response = await bot_instance.execute_agent_message(
-            chat_id,
-            message_text,
-            agent_type
+    async def run_turn(turn_chat_id: int, turn_text: str) -> str:
+        return await bot_instance.execute_agent_message(
+            turn_chat_id,
+            turn_text,
+            await asyncio.to_thread(bot_instance.session_manager.get_agent_type, turn_chat_id)
         )
 
+    # Execute agent (one turn at a time per chat; rapid messages are merged).
+    # The message is queued now, in update order; the turn and its reply run
+    # in the background so the next update (often a follow-up to merge) is
+    # handled without waiting for the agent.
+    try:
+        turn = bot_instance.dispatcher.enqueue(chat_id, message_text, run_turn)
+    except DispatcherBusy as e:
+        await update.message.reply_text(e.user_message)
+        return
+
+    context.application.create_task(
+        _reply_to_turn(update, context, bot_instance, turn),
+        update=update
+    )
+
+
+async def _reply_to_turn(update: Update, context: ContextTypes.DEFAULT_TYPE, bot_instance, turn):
+    """Wait for a dispatched agent turn and send its reply."""
+    chat_id = update.effective_chat.id
+    try:
+        response = await turn
+        if response is None:
+            return  # Answered together with a later message
+
         # Format and send response
         chunks = ResponseFormatter.chunk_message(
             response,
@@ -378,6 +405,11 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
             await update.message.reply_text(chunk)
 
+    except asyncio.CancelledError:
+        if not turn.cancelled():
+            raise
+        return  # Queued turn dropped on shutdown
+
     except Exception as e:
         error_msg = ResponseFormatter.format_error(e)
         await update.message.reply_text(
@@ -523,7 +555,7 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         agent_type = callback_data.replace("agent_", "")
 
         # Set agent type
-        bot_instance.session_manager.set_agent_type(chat_id, agent_type)
+        await asyncio.to_thread(bot_instance.session_manager.set_agent_type, chat_id, agent_type)
 
         # Get agent info
         agent_info = ResponseFormatter.format_agent_info(agent_type, True)
@@ -3,6 +3,10 @@ Database operations for Telegram Machine Library.
 
 Provides CRUD operations for user machines and query history.
 All operations are SYNCHRONOUS (not async) using DatabaseManager.
+
+Reads always go to the database first (a user expects to see the machine
+they just added); the local mirror (knowledge/local_mirror.py) only answers
+when every provider is down. Timestamps from the mirror are ISO strings.
 """
 
 import logging
@@ -10,16 +14,41 @@ from typing import Optional, List, Dict
 from datetime import datetime
 
 from agent_factory.core.database_manager import DatabaseManager
+from agent_factory.knowledge.local_mirror import LocalMirror, get_local_mirror
 
 logger = logging.getLogger(__name__)
 
+MACHINE_FIELDS = (
+    'id', 'user_id', 'nickname', 'manufacturer', 'model_number',
+    'serial_number', 'location', 'notes', 'photo_file_id',
+    'last_queried', 'created_at'
+)
+
 
 class MachineLibraryDB:
     """Database layer for machine library operations."""
 
-    def __init__(self):
-        """Initialize with DatabaseManager (multi-provider with failover)."""
+    def __init__(self, mirror: Optional[LocalMirror] = None):
+        """
+        Initialize with DatabaseManager (multi-provider with failover).
+
+        Args:
+            mirror: Local mirror used when all providers fail (shared mirror if None)
+        """
         self.db = DatabaseManager()
+        self.mirror = mirror if mirror is not None else get_local_mirror(self.db.primary_provider)
+
+    def _read(self, remote, local):
+        """Database first; mirror only if every provider fails."""
+        if self.mirror is None:
+            return remote()
+        return self.mirror.read_through("user_machines", remote=remote, local=local, prefer_local=False)
+
+    @staticmethod
+    def _machine_from_mirror(row: Dict, fields=MACHINE_FIELDS) -> Dict:
+        machine = {field: row.get(field) for field in fields}
+        machine['id'] = str(machine['id'])
+        return machine
 
     # ============================================================================
     # CREATE
@@ -91,58 +120,48 @@ class MachineLibraryDB:
             List of machine dicts with keys: id, nickname, manufacturer,
             model_number, serial_number, location, notes, photo_file_id, last_queried
         """
-        rows = self.db.execute_query(
-            """SELECT id, nickname, manufacturer, model_number, serial_number,
-                      location, notes, photo_file_id, last_queried
-               FROM user_machines
-               WHERE user_id = %s
-               ORDER BY updated_at DESC""",
-            (user_id,),
-            fetch_mode="all"
-        )
-
-        if not rows:
-            return []
-
-        machines = []
-        for row in rows:
-            machines.append({
-                'id': str(row[0]),
-                'nickname': row[1],
-                'manufacturer': row[2],
-                'model_number': row[3],
-                'serial_number': row[4],
-                'location': row[5],
-                'notes': row[6],
-                'photo_file_id': row[7],
-                'last_queried': row[8]
-            })
-
-        return machines
-
-    def get_machine(self, machine_id: str) -> Optional[Dict]:
-        """
-        Get machine by ID.
-
-        Args:
-            machine_id: UUID of machine
-
-        Returns:
-            Machine dict or None if not found
-        """
-        result = self.db.execute_query(
-            """SELECT id, user_id, nickname, manufacturer, model_number,
-                      serial_number, location, notes, photo_file_id,
-                      last_queried, created_at
-               FROM user_machines
-               WHERE id = %s""",
-            (machine_id,),
-            fetch_mode="one"
-        )
-
-        if not result:
-            return None
-
+        list_fields = tuple(f for f in MACHINE_FIELDS if f not in ('user_id', 'created_at'))
+
+        def remote():
+            rows = self.db.execute_query(
+                """SELECT id, nickname, manufacturer, model_number, serial_number,
+                          location, notes, photo_file_id, last_queried
+                   FROM user_machines
+                   WHERE user_id = %s
+                   ORDER BY updated_at DESC""",
+                (user_id,),
+                fetch_mode="all"
+            )
+
+            if not rows:
+                return []
+
+            machines = []
+            for row in rows:
+                machines.append({
+                    'id': str(row[0]),
+                    'nickname': row[1],
+                    'manufacturer': row[2],
+                    'model_number': row[3],
+                    'serial_number': row[4],
+                    'location': row[5],
+                    'notes': row[6],
+                    'photo_file_id': row[7],
+                    'last_queried': row[8]
+                })
+
+            return machines
+
+        def local():
+            rows = self.mirror.select(
+                "user_machines", filters={"user_id": user_id}, order_by="updated_at", descending=True
+            )
+            return [self._machine_from_mirror(row, list_fields) for row in rows]
+
+        return self._read(remote, local)
+
+    @staticmethod
+    def _machine_from_row(result) -> Dict:
         return {
             'id': str(result[0]),
             'user_id': result[1],
@@ -157,6 +176,34 @@ class MachineLibraryDB:
             'created_at': result[10]
         }
 
+    def get_machine(self, machine_id: str) -> Optional[Dict]:
+        """
+        Get machine by ID.
+
+        Args:
+            machine_id: UUID of machine
+
+        Returns:
+            Machine dict or None if not found
+        """
+        def remote():
+            result = self.db.execute_query(
+                """SELECT id, user_id, nickname, manufacturer, model_number,
+                          serial_number, location, notes, photo_file_id,
+                          last_queried, created_at
+                   FROM user_machines
+                   WHERE id = %s""",
+                (machine_id,),
+                fetch_mode="one"
+            )
+            return self._machine_from_row(result) if result else None
+
+        def local():
+            row = self.mirror.get("user_machines", machine_id)
+            return self._machine_from_mirror(row) if row else None
+
+        return self._read(remote, local)
+
     def get_machine_by_nickname(self, user_id: str, nickname: str) -> Optional[Dict]:
         """
         Get machine by user_id and nickname.
@@ -168,32 +215,23 @@ class MachineLibraryDB:
         Returns:
             Machine dict or None if not found
         """
-        result = self.db.execute_query(
-            """SELECT id, user_id, nickname, manufacturer, model_number,
-                      serial_number, location, notes, photo_file_id,
-                      last_queried, created_at
-               FROM user_machines
-               WHERE user_id = %s AND nickname = %s""",
-            (user_id, nickname),
-            fetch_mode="one"
-        )
-
-        if not result:
-            return None
-
-        return {
-            'id': str(result[0]),
-            'user_id': result[1],
-            'nickname': result[2],
-            'manufacturer': result[3],
-            'model_number': result[4],
-            'serial_number': result[5],
-            'location': result[6],
-            'notes': result[7],
-            'photo_file_id': result[8],
-            'last_queried': result[9],
-            'created_at': result[10]
-        }
+        def remote():
+            result = self.db.execute_query(
+                """SELECT id, user_id, nickname, manufacturer, model_number,
+                          serial_number, location, notes, photo_file_id,
+                          last_queried, created_at
+                   FROM user_machines
+                   WHERE user_id = %s AND nickname = %s""",
+                (user_id, nickname),
+                fetch_mode="one"
+            )
+            return self._machine_from_row(result) if result else None
+
+        def local():
+            rows = self.mirror.select("user_machines", filters={"user_id": user_id, "nickname": nickname}, limit=1)
+            return self._machine_from_mirror(rows[0]) if rows else None
+
+        return self._read(remote, local)
 
     # ============================================================================
     # UPDATE
@@ -5,6 +5,7 @@ Public API:
     - OCRPipeline: Main pipeline with GPT-4o → Gemini fallback
     - OCRResult: Unified result dataclass
     - OCRProvider: Base class for providers (extensible)
+    - OCRResultCache / OCRMetrics: result cache and latency metrics
 
 Usage:
     from agent_factory.integrations.telegram.ocr import OCRPipeline
@@ -19,6 +20,13 @@ Usage:
 """
 
 from .pipeline import OCRPipeline, validate_photo_quality
+from .execution import (
+    LatencyHistogram,
+    OCRMetrics,
+    OCRResultCache,
+    hedged_extract,
+    prepare_image,
+)
 from .providers import (
     OCRResult,
     OCRProvider,
@@ -38,6 +46,13 @@ __all__ = [
     # Data models
     "OCRResult",
 
+    # Execution layer
+    "OCRResultCache",
+    "OCRMetrics",
+    "LatencyHistogram",
+    "prepare_image",
+    "hedged_extract",
+
     # Base classes (for extensibility)
     "OCRProvider",
 
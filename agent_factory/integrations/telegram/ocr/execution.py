@@ -0,0 +1,501 @@
+"""
+OCR Execution Layer - Downscale, Cache, Hedge, Measure
+
+Sits between OCRPipeline and the vision providers:
+    - prepare_image: single decode, EXIF rotation, downscale to the vision
+      models' tile limits and JPEG re-encode before upload
+    - OCRResultCache: perceptual-hash cache, so the same nameplate photo
+      forwarded around a group chat is analyzed once
+    - hedged_extract: start the fallback provider once the primary is slower
+      than a threshold; the first good answer wins, the other is cancelled
+    - LatencyHistogram / OCRMetrics: per-provider latency distribution
+"""
+
+import asyncio
+import copy
+import hashlib
+import io
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .providers import OCRProvider, OCRResult
+
+
+logger = logging.getLogger(__name__)
+
+
+# GPT-4o (detail=high) fits images into 2048x2048 and then scales the short
+# side to 768 before tiling into 512px tiles; Gemini tiles at 768px. Anything
+# larger is resized server-side anyway, so uploading it only costs bandwidth.
+MAX_LONG_SIDE = 2048
+MAX_SHORT_SIDE = 768
+JPEG_QUALITY = 85
+
+# 16x16 difference hash: 256 bits, enough spatial detail that two different
+# plates of the same drive model do not collide at the default distance
+HASH_SIZE = 16
+DEFAULT_MAX_DISTANCE = 10
+
+DEFAULT_BUCKETS_MS = (250, 500, 1000, 2000, 3000, 5000, 8000, 13000, 20000, 30000)
+
+# additional_specs keys (split into words) that identify one physical unit
+# or its owner rather than the model
+IDENTITY_SPEC_WORDS = frozenset({
+    "serial", "sn", "asset", "mac", "ip", "imei", "owner", "customer", "site", "location",
+})
+
+
+# ============================================================================
+# Image preparation
+# ============================================================================
+
+@dataclass
+class PreparedImage:
+    """Upload-ready image plus the keys used by the result cache."""
+    data: bytes
+    width: int
+    height: int
+    original_bytes: int
+    digest: str  # sha256 of the original bytes (exact-match cache key)
+    phash: Optional[int] = None  # None if the image could not be decoded
+    resized: bool = False
+
+
+def perceptual_hash(image, hash_size: int = HASH_SIZE) -> int:
+    """
+    Difference hash of a PIL image.
+
+    Robust to re-encoding, resizing and Telegram's recompression of
+    forwarded photos; not to crops or rotations.
+    """
+    from PIL import Image
+
+    gray = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = gray.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def identifies_unit(result: OCRResult) -> bool:
+    """
+    True if a result describes one specific unit rather than a model.
+
+    Fault codes, serial numbers and identity specs (asset tag, MAC, owner...)
+    differ between two photos that hash alike, and the cache is shared by
+    all users, so such results are only ever served for the exact same bytes.
+    """
+    if result.fault_code or result.serial_number:
+        return True
+    return any(
+        IDENTITY_SPEC_WORDS.intersection(re.split(r"[^a-z0-9]+", str(key).lower()))
+        for key, value in (result.additional_specs or {}).items()
+        if value not in (None, "")
+    )
+
+
+def _target_size(width: int, height: int, max_long_side: int, max_short_side: int) -> Tuple[int, int]:
+    scale = min(1.0, max_long_side / max(width, height), max_short_side / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def prepare_image(
+    image_bytes: bytes,
+    max_long_side: int = MAX_LONG_SIDE,
+    max_short_side: int = MAX_SHORT_SIDE,
+    quality: int = JPEG_QUALITY,
+) -> PreparedImage:
+    """
+    Downscale and re-encode a photo for the vision APIs.
+
+    Args:
+        image_bytes: Raw image bytes as received from Telegram
+        max_long_side: Longest side after resizing
+        max_short_side: Shortest side after resizing
+        quality: JPEG quality for the re-encode
+
+    Returns:
+        PreparedImage; the original bytes are passed through unchanged when
+        the photo is already a small enough JPEG or cannot be decoded
+    """
+    digest = hashlib.sha256(image_bytes).hexdigest()
+
+    try:
+        from PIL import Image, ImageOps
+
+        img = Image.open(io.BytesIO(image_bytes))
+        source_format = img.format
+        rotated = img.getexif().get(0x0112, 1) not in (1, None)  # EXIF orientation
+        width, height = img.size
+        target = _target_size(width, height, max_long_side, max_short_side)
+        passthrough = source_format == "JPEG" and target == (width, height) and not rotated
+
+        # Let the JPEG decoder scale by 1/2, 1/4 or 1/8 while decoding; a
+        # 12 MP phone photo then never gets fully decompressed. When the
+        # bytes go out unchanged only the hash needs pixels, so decode tiny.
+        if source_format == "JPEG":
+            img.draft("RGB", (HASH_SIZE * 16, HASH_SIZE * 16) if passthrough else target)
+
+        if passthrough:
+            return PreparedImage(image_bytes, width, height, len(image_bytes), digest, perceptual_hash(img))
+
+        if rotated:
+            img = ImageOps.exif_transpose(img)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        target = _target_size(img.width, img.height, max_long_side, max_short_side)
+        if img.size != target:
+            img = img.resize(target, Image.BICUBIC, reducing_gap=2.0)
+        phash = perceptual_hash(img)
+
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality)
+        data = buffer.getvalue()
+
+    except Exception as e:
+        # Let the provider deal with whatever this is (same as the quality check)
+        logger.warning(f"[OCR] Image preparation skipped: {e}")
+        return PreparedImage(image_bytes, 0, 0, len(image_bytes), digest)
+
+    return PreparedImage(data, img.width, img.height, len(image_bytes), digest, phash, resized=True)
+
+
+# ============================================================================
+# Result cache
+# ============================================================================
+
+@dataclass
+class _CacheEntry:
+    phash: Optional[int]
+    result: OCRResult
+    expires_at: float
+
+
+class OCRResultCache:
+    """
+    LRU cache of OCR results keyed by image digest and perceptual hash.
+
+    Exact byte matches hit directly; otherwise the closest stored hash within
+    max_distance bits is used (linear scan - a few hundred entries at most).
+    Results that identify a unit (fault code, serial number, asset/owner
+    specs - see identifies_unit) only match exactly: a photo of a second
+    drive of the same model, possibly another user's, hashes alike but has
+    its own serial and may show a different code on its display.
+
+    begin()/finish() track photos being analyzed, so a copy that arrives
+    while the first is still with the provider waits for that answer
+    instead of starting its own.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 24 * 3600,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[PreparedImage, asyncio.Future]] = {}
+
+    def get(self, image: PreparedImage) -> Optional[OCRResult]:
+        """Return a copy of the cached result for this image, or None."""
+        now = time.monotonic()
+        key = image.digest if image.digest in self._entries else self._nearest(image.phash, now)
+        if key is None:
+            return None
+
+        entry = self._entries[key]
+        if entry.expires_at <= now:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry.result)
+
+    def put(self, image: PreparedImage, result: OCRResult) -> None:
+        """Store a result (a copy; callers may keep mutating theirs)."""
+        self._entries[image.digest] = _CacheEntry(
+            phash=image.phash,
+            result=copy.deepcopy(result),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(image.digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def begin(self, image: PreparedImage) -> None:
+        """Mark a photo as being analyzed; lookups of it wait in wait_inflight()."""
+        if image.digest not in self._inflight:
+            self._inflight[image.digest] = (image, asyncio.get_running_loop().create_future())
+
+    def finish(self, image: PreparedImage, result: Optional[OCRResult]) -> None:
+        """Store the result (None if not worth caching) and release waiters."""
+        if result is not None:
+            self.put(image, result)
+        entry = self._inflight.pop(image.digest, None)
+        if entry is not None and not entry[1].done():
+            entry[1].set_result(copy.deepcopy(result))
+
+    async def wait_inflight(self, image: PreparedImage) -> Optional[OCRResult]:
+        """
+        Wait for an in-flight analysis of the same photo.
+
+        Returns a copy of its result, or None if nothing matching is in
+        flight or the analysis produced nothing worth reusing.
+        """
+        for other, future in list(self._inflight.values()):
+            exact = other.digest == image.digest
+            if not exact and not self._similar(image.phash, other.phash):
+                continue
+            result = await asyncio.shield(future)
+            if result is None or (not exact and identifies_unit(result)):
+                return None
+            return copy.deepcopy(result)
+        return None
+
+    def _similar(self, a: Optional[int], b: Optional[int]) -> bool:
+        return a is not None and b is not None and hamming_distance(a, b) <= self.max_distance
+
+    def _nearest(self, phash: Optional[int], now: float) -> Optional[str]:
+        if phash is None:
+            return None
+        best_key, best_distance = None, self.max_distance + 1
+        for key, entry in self._entries.items():
+            if entry.phash is None or entry.expires_at <= now or identifies_unit(entry.result):
+                continue
+            distance = hamming_distance(phash, entry.phash)
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+        return best_key
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with exact percentiles over a recent window.
+
+    Buckets are cumulative-friendly upper bounds in milliseconds (the last
+    bucket is +Inf), matching what Prometheus/StatsD exporters expect.
+
+    Calls cancelled before answering are recorded as lower bounds: they stay
+    out of the buckets, count and average (completed calls only) but enter
+    the percentile window at their elapsed time. Otherwise a provider whose
+    slow calls keep losing hedges looks faster than it is, its p95 drops and
+    it gets hedged (and cancelled) ever earlier.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS, window: int = 512):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.censored = 0
+        self.total_ms = 0.0
+        self._recent: deque = deque(maxlen=window)
+
+    def observe(self, ms: float) -> None:
+        for i, bound in enumerate(self.buckets_ms):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ms += ms
+        self._recent.append(ms)
+
+    def observe_lower_bound(self, ms: float) -> None:
+        """Record a call abandoned after ms milliseconds (its latency is at least that)."""
+        self.censored += 1
+        self._recent.append(ms)
+
+    def percentile(self, p: float) -> float:
+        """
+        Percentile (0.0-1.0) of the recent window, in milliseconds.
+
+        A lower bound when it lands on a cancelled call.
+        """
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound:g}" for bound in self.buckets_ms] + ["+Inf"]
+        return {
+            "count": self.count,
+            "censored": self.censored,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p90_ms": self.percentile(0.90),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+@dataclass
+class OCRMetrics:
+    """Counters for the OCR pipeline (read with to_dict())."""
+    requests: int = 0
+    cache_hits: int = 0
+    hedged: int = 0  # Fallback started because the primary was slow
+    hedge_wins: int = 0  # ...and its answer was the one returned
+    cancelled: int = 0  # Provider calls abandoned after another answered
+    bytes_received: int = 0
+    bytes_uploaded: int = 0
+    latency: Dict[str, LatencyHistogram] = field(default_factory=dict)  # Per provider (cancelled calls as lower bounds)
+    errors: Dict[str, int] = field(default_factory=dict)
+    wins: Dict[str, int] = field(default_factory=dict)
+
+    def histogram(self, provider: str) -> LatencyHistogram:
+        if provider not in self.latency:
+            self.latency[provider] = LatencyHistogram()
+        return self.latency[provider]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "cancelled": self.cancelled,
+            "bytes_received": self.bytes_received,
+            "bytes_uploaded": self.bytes_uploaded,
+            "latency": {name: hist.to_dict() for name, hist in self.latency.items()},
+            "errors": dict(self.errors),
+            "wins": dict(self.wins),
+        }
+
+
+# ============================================================================
+# Hedged execution
+# ============================================================================
+
+@dataclass
+class HedgeOutcome:
+    """What hedged_extract did and which answer it kept."""
+    result: Optional[OCRResult]
+    attempts: List[OCRResult] = field(default_factory=list)  # Completed calls, in completion order
+    started: List[str] = field(default_factory=list)  # Provider names, in start order
+    hedged: bool = False
+
+
+async def _timed_extract(
+    name: str,
+    provider: OCRProvider,
+    image_bytes: bytes,
+    metrics: Optional[OCRMetrics],
+) -> OCRResult:
+    start = time.perf_counter()
+    try:
+        result = await provider.extract(image_bytes)
+    except asyncio.CancelledError:
+        if metrics:
+            metrics.cancelled += 1
+            metrics.histogram(name).observe_lower_bound((time.perf_counter() - start) * 1000)
+        raise
+    except Exception as e:
+        result = OCRResult(confidence=0.0, provider=name, error=f"{name} extraction failed: {e}")
+
+    if metrics:
+        metrics.histogram(name).observe((time.perf_counter() - start) * 1000)
+        if result.error:
+            metrics.errors[name] = metrics.errors.get(name, 0) + 1
+    return result
+
+
+async def hedged_extract(
+    providers: Sequence[Tuple[str, OCRProvider]],
+    image_bytes: bytes,
+    accept: Callable[[OCRResult], bool],
+    hedge_after: float,
+    metrics: Optional[OCRMetrics] = None,
+) -> HedgeOutcome:
+    """
+    Run providers in priority order, hedging slow calls.
+
+    The next provider starts when the running ones have all answered without
+    an acceptable result, or when hedge_after seconds pass since the last
+    start. The first acceptable answer is returned and the rest cancelled;
+    if none is acceptable, the highest-confidence answer is returned
+    (earlier providers win ties).
+
+    Args:
+        providers: (name, provider) pairs, primary first
+        image_bytes: Prepared image
+        accept: Whether a result is good enough to stop
+        hedge_after: Seconds to wait on a call before starting the next provider
+        metrics: Optional metrics to record latencies into
+
+    Returns:
+        HedgeOutcome (result is None only when no provider was given)
+    """
+    outcome = HedgeOutcome(result=None)
+    if not providers:
+        return outcome
+
+    order = {name: i for i, (name, _) in enumerate(providers)}
+    pending: Dict[asyncio.Task, str] = {}
+    next_index = 0
+    deadline = 0.0
+
+    def start_next() -> None:
+        nonlocal next_index, deadline
+        name, provider = providers[next_index]
+        next_index += 1
+        task = asyncio.create_task(_timed_extract(name, provider, image_bytes, metrics))
+        pending[task] = name
+        outcome.started.append(name)
+        deadline = time.monotonic() + hedge_after
+
+    start_next()
+    try:
+        while pending:
+            timeout = max(0.0, deadline - time.monotonic()) if next_index < len(providers) else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                outcome.hedged = True
+                start_next()
+                continue
+
+            for task in sorted(done, key=lambda t: order[pending[t]]):
+                pending.pop(task)
+                result = task.result()
+                outcome.attempts.append(result)
+                if accept(result):
+                    outcome.result = result
+                    return outcome
+
+            if not pending and next_index < len(providers):
+                start_next()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    ranked = sorted(outcome.attempts, key=lambda r: (-r.confidence, order.get(r.provider, len(order))))
+    outcome.result = ranked[0] if ranked else None
+    return outcome
@@ -2,14 +2,24 @@
 OCR Pipeline - Dual Provider Orchestration
 
 Manages GPT-4o (primary) → Gemini (fallback) OCR flow with quality validation.
+Photos are downscaled before upload, results are cached by perceptual hash,
+and Gemini is started early (hedged) when GPT-4o is slow - see execution.py.
 """
 
+import asyncio
 import os
-from typing import Optional, Tuple
-from datetime import datetime
+import time
+from typing import List, Optional, Tuple
 import logging
 
-from .providers import OCRResult
+from .execution import (
+    MAX_SHORT_SIDE,
+    OCRMetrics,
+    OCRResultCache,
+    hedged_extract,
+    prepare_image,
+)
+from .providers import OCRProvider, OCRResult
 from .gpt4o_provider import GPT4oProvider
 from .gemini_provider import GeminiProvider
 
@@ -31,6 +41,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Adaptive hedging: need this many primary timings before trusting its p95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_FLOOR_SECONDS = 1.5
+
 
 def validate_photo_quality(image_bytes: bytes) -> Tuple[bool, str]:
     """
@@ -89,16 +103,20 @@ class OCRPipeline:
 
     Flow:
         1. Validate photo quality
-        2. Try GPT-4o (primary)
-        3. If confidence < threshold or error, try Gemini (fallback)
-        4. Return best result
+        2. Downscale/re-encode for upload; return cached result for a known photo
+        3. Try GPT-4o (primary); start Gemini (fallback) if GPT-4o is slow,
+           fails or returns confidence < threshold
+        4. Return the first good result (or the best one)
     """
 
     def __init__(
         self,
         gpt4o_api_key: Optional[str] = None,
         gemini_api_key: Optional[str] = None,
-        fallback_threshold: float = 0.5
+        fallback_threshold: float = 0.5,
+        hedge_after_seconds: Optional[float] = None,
+        cache: Optional[OCRResultCache] = None,
+        max_short_side: Optional[int] = None,
     ):
         """
         Initialize OCR pipeline with dual providers.
@@ -107,8 +125,28 @@ class OCRPipeline:
             gpt4o_api_key: OpenAI API key (or None for env var)
             gemini_api_key: Gemini API key (or None for env var)
             fallback_threshold: Confidence threshold to trigger fallback (default 0.5)
+            hedge_after_seconds: Start Gemini if GPT-4o has not answered after this
+                long (default OCR_HEDGE_AFTER_SECONDS or 4.0; lowered to GPT-4o's
+                recent p95 once there are enough samples)
+            cache: Result cache (default: in-memory, sized by OCR_CACHE_SIZE /
+                OCR_CACHE_TTL_SECONDS; OCR_CACHE_SIZE=0 disables it)
+            max_short_side: Downscale target for uploads (default OCR_MAX_SHORT_SIDE or 768)
         """
         self.fallback_threshold = fallback_threshold
+        self.hedge_after_seconds = (
+            hedge_after_seconds if hedge_after_seconds is not None
+            else float(os.getenv("OCR_HEDGE_AFTER_SECONDS", "4.0"))
+        )
+        self.hedge_floor_seconds = HEDGE_FLOOR_SECONDS
+        self.max_short_side = max_short_side or int(os.getenv("OCR_MAX_SHORT_SIDE", str(MAX_SHORT_SIDE)))
+
+        if cache is None and int(os.getenv("OCR_CACHE_SIZE", "512")) > 0:
+            cache = OCRResultCache(
+                max_entries=int(os.getenv("OCR_CACHE_SIZE", "512")),
+                ttl_seconds=float(os.getenv("OCR_CACHE_TTL_SECONDS", str(24 * 3600))),
+            )
+        self.cache = cache
+        self.metrics = OCRMetrics()
 
         # Initialize GPT-4o provider (primary)
         try:
@@ -126,6 +164,33 @@ class OCRPipeline:
             logger.warning("[OCR Pipeline] Gemini provider unavailable (no API key)")
             self.gemini_provider = None
 
+    def _providers(self) -> List[Tuple[str, OCRProvider]]:
+        """Available providers in priority order."""
+        providers = []
+        if self.gpt4o_provider and self.gpt4o_provider.is_available():
+            providers.append(("gpt4o", self.gpt4o_provider))
+        if self.gemini_provider and self.gemini_provider.is_available():
+            providers.append(("gemini", self.gemini_provider))
+        return providers
+
+    def hedge_delay(self, provider: str = "gpt4o") -> float:
+        """
+        Seconds to wait on a provider before starting the next one.
+
+        Once the provider has HEDGE_MIN_SAMPLES timings, hedge at its p95
+        (so roughly 1 in 20 requests pays for a second call), never later
+        than hedge_after_seconds and never earlier than hedge_floor_seconds.
+        Calls cancelled after losing a hedge count at their elapsed time.
+        """
+        histogram = self.metrics.latency.get(provider)
+        if histogram is None or histogram.count + histogram.censored < HEDGE_MIN_SAMPLES:
+            return self.hedge_after_seconds
+        p95 = histogram.percentile(0.95) / 1000
+        return min(self.hedge_after_seconds, max(self.hedge_floor_seconds, p95))
+
+    def _accept(self, result: OCRResult) -> bool:
+        return not result.error and result.confidence >= self.fallback_threshold
+
     @traceable(
         run_type="tool",
         name="OCR.analyze_photo",
@@ -147,15 +212,17 @@ class OCRPipeline:
 
         Returns:
             OCRResult with best extraction from available providers
+            (cached=True if the same photo was analyzed recently)
 
         Flow:
             1. Quality check (unless skipped)
-            2. Try GPT-4o (primary)
-            3. If GPT-4o fails or low confidence, try Gemini
-            4. Return best result
+            2. Downscale + cache lookup
+            3. GPT-4o, hedged with Gemini (slow, failed or low confidence)
+            4. Return first good result, else the best one
         """
-        pipeline_start = datetime.utcnow()
+        pipeline_start = time.perf_counter()
         user_log = f"[{user_id}]" if user_id else "[OCR]"
+        self.metrics.requests += 1
 
         # Step 1: Quality check
         if not skip_quality_check:
@@ -174,88 +241,64 @@ class OCRPipeline:
 
         logger.info(f"{user_log} Quality check: {quality_msg}")
 
-        # Step 2: Try GPT-4o (primary)
-        primary_result = None
-        fallback_triggered = False
-
-        if self.gpt4o_provider and self.gpt4o_provider.is_available():
-            try:
-                logger.info(f"{user_log} Trying GPT-4o (primary)")
-                primary_result = await self.gpt4o_provider.extract(image_bytes)
-
+        # Step 2: Downscale for upload (CPU-bound, keep it off the event loop)
+        prepared = await asyncio.to_thread(prepare_image, image_bytes, max_short_side=self.max_short_side)
+        self.metrics.bytes_received += prepared.original_bytes
+
+        if self.cache is not None:
+            # Same photo analyzed recently, or being analyzed right now for
+            # another chat member (forwards tend to arrive together)
+            cached = self.cache.get(prepared) or await self.cache.wait_inflight(prepared)
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                cached.cached = True
+                cached.processing_time_ms = int((time.perf_counter() - pipeline_start) * 1000)
                 logger.info(
-                    f"{user_log} GPT-4o result: "
-                    f"confidence={primary_result.confidence:.2f}, "
-                    f"manufacturer={primary_result.manufacturer}, "
-                    f"model={primary_result.model_number}"
+                    f"{user_log} OCR cache hit: provider={cached.provider}, "
+                    f"confidence={cached.confidence:.2f}"
                 )
+                return cached
+            self.cache.begin(prepared)
 
-                # Check if result is good enough
-                if primary_result.confidence >= self.fallback_threshold and not primary_result.error:
-                    # Success with GPT-4o
-                    total_ms = int((datetime.utcnow() - pipeline_start).total_seconds() * 1000)
-                    primary_result.processing_time_ms = total_ms
-
-                    logger.info(f"{user_log} GPT-4o success (confidence {primary_result.confidence:.2f})")
-                    return primary_result
-
-                else:
-                    # Low confidence or error - trigger fallback
-                    fallback_triggered = True
-                    logger.warning(
-                        f"{user_log} GPT-4o below threshold "
-                        f"(confidence={primary_result.confidence:.2f}, error={primary_result.error})"
-                    )
-
-            except Exception as e:
-                fallback_triggered = True
-                logger.error(f"{user_log} GPT-4o failed: {e}")
-
-        else:
-            fallback_triggered = True
-            logger.warning(f"{user_log} GPT-4o provider unavailable")
-
-        # Step 3: Try Gemini (fallback)
-        fallback_result = None
-
-        if fallback_triggered and self.gemini_provider and self.gemini_provider.is_available():
-            try:
-                logger.info(f"{user_log} Trying Gemini (fallback)")
-                fallback_result = await self.gemini_provider.extract(image_bytes)
-
-                logger.info(
-                    f"{user_log} Gemini result: "
-                    f"confidence={fallback_result.confidence:.2f}, "
-                    f"manufacturer={fallback_result.manufacturer}, "
-                    f"model={fallback_result.model_number}"
-                )
+        if prepared.resized:
+            logger.info(
+                f"{user_log} Upload image {prepared.width}x{prepared.height}, "
+                f"{prepared.original_bytes:,} -> {len(prepared.data):,} bytes"
+            )
 
-            except Exception as e:
-                logger.error(f"{user_log} Gemini failed: {e}")
+        # Step 3: Providers, primary first, hedged
+        providers = self._providers()
+        outcome = None
+        try:
+            if providers:
+                self.metrics.bytes_uploaded += len(prepared.data)
+            outcome = await hedged_extract(
+                providers,
+                prepared.data,
+                accept=self._accept,
+                hedge_after=self.hedge_delay(providers[0][0]) if providers else 0.0,
+                metrics=self.metrics,
+            )
+        finally:
+            if self.cache is not None:
+                result = outcome.result if outcome else None
+                self.cache.finish(prepared, result if result and self._accept(result) else None)
+
+        for attempt in outcome.attempts:
+            logger.info(
+                f"{user_log} {attempt.provider} result: "
+                f"confidence={attempt.confidence:.2f}, "
+                f"manufacturer={attempt.manufacturer}, "
+                f"model={attempt.model_number}, "
+                f"error={attempt.error}"
+            )
 
         # Step 4: Return best result
-        total_ms = int((datetime.utcnow() - pipeline_start).total_seconds() * 1000)
-
-        # Choose best result
-        if fallback_result and primary_result:
-            # Both available - pick higher confidence
-            if fallback_result.confidence > primary_result.confidence:
-                logger.info(f"{user_log} Using Gemini result (better confidence)")
-                final_result = fallback_result
-            else:
-                logger.info(f"{user_log} Using GPT-4o result (better confidence)")
-                final_result = primary_result
-
-        elif fallback_result:
-            logger.info(f"{user_log} Using Gemini result (only option)")
-            final_result = fallback_result
-
-        elif primary_result:
-            logger.info(f"{user_log} Using GPT-4o result (only option)")
-            final_result = primary_result
+        total_ms = int((time.perf_counter() - pipeline_start) * 1000)
+        final_result = outcome.result
 
-        else:
-            # Both failed
+        if final_result is None:
+            # Both failed (or none configured)
             logger.error(f"{user_log} All OCR providers failed")
             return OCRResult(
                 confidence=0.0,
@@ -264,6 +307,12 @@ class OCRPipeline:
                 processing_time_ms=total_ms
             )
 
+        if outcome.hedged:
+            self.metrics.hedged += 1
+            if final_result.provider != providers[0][0]:
+                self.metrics.hedge_wins += 1
+        self.metrics.wins[final_result.provider] = self.metrics.wins.get(final_result.provider, 0) + 1
+
         # Update total processing time
         final_result.processing_time_ms = total_ms
 
@@ -271,6 +320,7 @@ class OCRPipeline:
             f"{user_log} Final OCR result: "
             f"provider={final_result.provider}, "
             f"confidence={final_result.confidence:.2f}, "
+            f"started={outcome.started}, hedged={outcome.hedged}, "
             f"time={total_ms}ms"
         )
 
@@ -278,14 +328,17 @@ class OCRPipeline:
         if LANGSMITH_AVAILABLE:
             run_tree = get_current_run_tree()
             if run_tree:
+                primary = next((a for a in outcome.attempts if a.provider == providers[0][0]), None)
                 run_tree.metadata.update({
                     "user_id": user_id,
                     "image_size_bytes": len(image_bytes),
+                    "upload_size_bytes": len(prepared.data),
                     "quality_check": quality_msg if not skip_quality_check else "Skipped",
-                    "primary_provider": "gpt4o",
-                    "primary_confidence": primary_result.confidence if primary_result else 0.0,
-                    "fallback_triggered": fallback_triggered,
-                    "fallback_provider": "gemini" if fallback_triggered else None,
+                    "primary_provider": providers[0][0],
+                    "primary_confidence": primary.confidence if primary else 0.0,
+                    "fallback_triggered": len(outcome.started) > 1,
+                    "fallback_provider": outcome.started[1] if len(outcome.started) > 1 else None,
+                    "hedged": outcome.hedged,
                     "provider_used": final_result.provider,
                     "manufacturer": final_result.manufacturer,
                     "model_number": final_result.model_number,
@@ -307,15 +360,14 @@ class OCRPipeline:
 
     def get_available_providers(self) -> list:
         """Get list of available provider names."""
-        providers = []
-
-        if self.gpt4o_provider and self.gpt4o_provider.is_available():
-            providers.append("gpt4o")
-
-        if self.gemini_provider and self.gemini_provider.is_available():
-            providers.append("gemini")
-
-        return providers
+        return [name for name, _ in self._providers()]
+
+    def get_metrics(self) -> dict:
+        """Cache, hedging and per-provider latency metrics."""
+        data = self.metrics.to_dict()
+        data["cache_entries"] = len(self.cache) if self.cache is not None else 0
+        data["hedge_after_seconds"] = self.hedge_delay()
+        return data
 
     def is_any_provider_available(self) -> bool:
         """Check if at least one OCR provider is configured."""
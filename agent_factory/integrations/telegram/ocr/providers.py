@@ -172,6 +172,7 @@ class OCRResult:
     confidence: float = 0.0  # 0.0-1.0
     provider: str = "unknown"  # "gpt4o", "gemini", etc.
     processing_time_ms: int = 0
+    cached: bool = False  # Served from the pipeline's result cache
 
     # Error handling
     error: Optional[str] = None
@@ -203,6 +204,7 @@ class OCRResult:
             "confidence": self.confidence,
             "provider": self.provider,
             "processing_time_ms": self.processing_time_ms,
+            "cached": self.cached,
             "error": self.error,
         }
 
@@ -18,6 +18,8 @@ from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from langsmith import traceable
 from agent_factory.integrations.telegram.ocr.pipeline import OCRPipeline
+from agent_factory.integrations.telegram.voice.pipeline import VoicePipeline
+from agent_factory.integrations.telegram.voice.transcriber import WhisperTranscriber
 
 load_dotenv()
 
@@ -54,6 +56,7 @@ orchestrator = None
 kb_manager = None
 openai_client = None
 ocr_pipeline = None
+voice_pipeline = None
 
 
 async def get_atom_count() -> int:
@@ -823,10 +826,10 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     Same routing as text messages (A/B/C/D routes).
     """
-    global orchestrator, openai_client
+    global orchestrator, voice_pipeline
 
     # Check dependencies
-    if openai_client is None:
+    if voice_pipeline is None:
         await update.message.reply_text(
             "⚠️ Voice transcription is not available. Please use text messages."
         )
@@ -847,28 +850,19 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     processing_msg = await update.message.reply_text("🎤 Processing voice...")
 
     try:
-        # Download voice file
+        # Download voice file into memory
         file = await context.bot.get_file(voice.file_id)
-
-        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
-            await file.download_to_drive(tmp.name)
-            audio_path = Path(tmp.name)
+        audio = bytes(await file.download_as_bytearray())
 
         # Transcribe with Whisper
         await processing_msg.edit_text("🎤 Transcribing...")
 
-        with open(audio_path, 'rb') as audio_file:
-            transcription = await openai_client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="en"
-            )
-
-        transcribed_text = transcription.text.strip()
-        logger.info(f"[{user_id}] Transcribed: {transcribed_text[:100]}...")
-
-        # Cleanup
-        audio_path.unlink()
+        transcript = await voice_pipeline.transcribe(audio, duration=voice.duration, language="en")
+        transcribed_text = transcript.text
+        logger.info(
+            f"[{user_id}] Transcribed ({transcript.segments} segment(s), "
+            f"{transcript.elapsed_ms:.0f}ms): {transcribed_text[:100]}..."
+        )
 
         # Acknowledge transcription
         await processing_msg.edit_text(
@@ -912,7 +906,7 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def post_init(app: Application):
-    global orchestrator, openai_client, kb_manager
+    global orchestrator, openai_client, kb_manager, voice_pipeline
     try:
         # Initialize database connection
         from agent_factory.core.database_manager import DatabaseManager
@@ -940,6 +934,7 @@ async def post_init(app: Application):
     # Initialize OpenAI client for Vision API
     if OPENAI_API_KEY:
         openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        voice_pipeline = VoicePipeline(WhisperTranscriber(client=openai_client))
         logger.info("OpenAI Vision API client initialized")
     else:
         logger.warning("OpenAI API key not set - photo OCR disabled")
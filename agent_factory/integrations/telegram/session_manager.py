@@ -2,14 +2,27 @@
 Telegram session management.
 
 Maps Telegram chat IDs to Agent Factory sessions with lifecycle management.
+
+State is bounded so a long-running bot does not grow with every chat it
+has ever seen:
+- Sessions live in a SessionStore (sharded LRU + TTL, lazy expiry)
+- Rate limiting uses one TokenBucket per chat, kept in a bounded LRU
+- Evicted sessions can spill to a MemoryStorage backend (e.g. SQLite);
+  writes happen on a background thread, but restoring a spilled session
+  reads the backend, so async handlers call get_or_create/get_agent_type/
+  set_agent_type through asyncio.to_thread when spill is enabled
 """
 
+import math
+import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
-from collections import defaultdict
 
+from agent_factory.http.rate_limit import TokenBucket
 from agent_factory.memory.session import Session
-from agent_factory.memory.storage import InMemoryStorage
+from agent_factory.memory.session_store import SessionStore
+from agent_factory.memory.storage import InMemoryStorage, MemoryStorage
 
 
 class TelegramSessionManager:
@@ -17,36 +30,57 @@ class TelegramSessionManager:
     Manages chat sessions mapped to Agent Factory Sessions.
 
     Features:
-    - Chat ID → Session mapping
-    - Agent type per chat
-    - Rate limiting per user
-    - Session lifecycle (creation, reset, expiry)
+    - Chat ID → Session mapping (bounded, LRU + TTL)
+    - Agent type per chat (stored in session metadata)
+    - Token-bucket rate limiting per user
+    - Session lifecycle (creation, reset, expiry, optional spill)
     - Usage tracking
 
     Example:
-        >>> manager = TelegramSessionManager()
+        >>> manager = TelegramSessionManager(max_sessions=5000)
         >>> session = manager.get_or_create(chat_id=12345, agent_type="bob")
         >>> manager.set_agent_type(12345, "research")
         >>> manager.reset_session(12345)
     """
 
-    def __init__(self):
-        """Initialize session manager."""
-        # Chat ID → Agent Factory Session
-        self.sessions: Dict[int, Session] = {}
-
-        # Chat ID → agent type (research, coding, bob)
-        self.agent_types: Dict[int, str] = {}
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_hours: float = 24,
+        spill_storage: Optional[MemoryStorage] = None,
+        shards: int = 16
+    ):
+        """
+        Initialize session manager.
 
-        # Chat ID → list of message timestamps (for rate limiting)
-        self.message_times: Dict[int, list] = defaultdict(list)
+        Args:
+            max_sessions: Max live sessions (and rate-limit buckets) kept in memory
+            ttl_hours: Idle hours before a session expires
+            spill_storage: Backend for evicted sessions (None = drop them)
+            shards: Session store partitions (one lock each)
+        """
+        self.store = SessionStore(
+            max_sessions=max_sessions,
+            ttl_seconds=ttl_hours * 3600,
+            shards=shards,
+            spill_storage=spill_storage
+        )
 
-        # Chat ID → last activity timestamp
-        self.last_active: Dict[int, datetime] = {}
+        # Chat ID → TokenBucket, LRU-bounded like the sessions
+        self._buckets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+        self._buckets_lock = threading.Lock()
+        self._max_buckets = max_sessions
+        self.messages_allowed = 0
+        self.messages_limited = 0
 
-        # Approval workflow state
+        # Approval workflow state (dropped with the session)
         self.pending_approvals: Dict[int, dict] = {}  # chat_id → approval data
 
+    @staticmethod
+    def _session_id(chat_id: int) -> str:
+        # Stable per chat so a spilled session can be found again
+        return f"telegram_{chat_id}"
+
     def get_or_create(
         self,
         chat_id: int,
@@ -65,15 +99,18 @@ class TelegramSessionManager:
         Example:
             >>> session = manager.get_or_create(12345, "research")
         """
-        if chat_id not in self.sessions:
-            self.sessions[chat_id] = Session(
+        session = self.store.get(chat_id, self._session_id(chat_id))
+        if session is None:
+            session = Session(
+                session_id=self._session_id(chat_id),
                 user_id=f"telegram_{chat_id}",
                 storage=InMemoryStorage()
             )
-            self.agent_types[chat_id] = agent_type
+            session.metadata["agent_type"] = agent_type
+            self.store.put(chat_id, session)
 
-        self.last_active[chat_id] = datetime.now()
-        return self.sessions[chat_id]
+        session.last_active = datetime.now()
+        return session
 
     def reset_session(self, chat_id: int) -> None:
         """
@@ -88,14 +125,8 @@ class TelegramSessionManager:
         Example:
             >>> manager.reset_session(12345)
         """
-        if chat_id in self.sessions:
-            del self.sessions[chat_id]
-        if chat_id in self.agent_types:
-            del self.agent_types[chat_id]
-        if chat_id in self.last_active:
-            del self.last_active[chat_id]
-        if chat_id in self.pending_approvals:
-            del self.pending_approvals[chat_id]
+        self.store.pop(chat_id, self._session_id(chat_id))
+        self.pending_approvals.pop(chat_id, None)
 
     def set_agent_type(self, chat_id: int, agent_type: str) -> None:
         """
@@ -110,8 +141,7 @@ class TelegramSessionManager:
         Example:
             >>> manager.set_agent_type(12345, "coding")
         """
-        self.agent_types[chat_id] = agent_type
-        self.last_active[chat_id] = datetime.now()
+        self.get_or_create(chat_id, agent_type).metadata["agent_type"] = agent_type
 
     def get_agent_type(self, chat_id: int) -> str:
         """
@@ -127,7 +157,10 @@ class TelegramSessionManager:
             >>> agent_type = manager.get_agent_type(12345)
             'bob'
         """
-        return self.agent_types.get(chat_id, "bob")
+        session = self.store.get(chat_id, self._session_id(chat_id))
+        if session is None:
+            return "bob"
+        return session.metadata.get("agent_type", "bob")
 
     def check_rate_limit(
         self,
@@ -153,26 +186,27 @@ class TelegramSessionManager:
             >>> if not allowed:
             ...     print(f"Wait {wait_time} seconds")
         """
-        now = datetime.now()
-        window_start = now - timedelta(seconds=window_seconds)
-
-        # Clean old timestamps
-        self.message_times[chat_id] = [
-            ts for ts in self.message_times[chat_id]
-            if ts > window_start
-        ]
-
-        # Check limit
-        if len(self.message_times[chat_id]) >= limit:
-            # Calculate wait time
-            oldest_in_window = min(self.message_times[chat_id])
-            wait_until = oldest_in_window + timedelta(seconds=window_seconds)
-            wait_seconds = int((wait_until - now).total_seconds()) + 1
-            return False, wait_seconds
-
-        # Add current timestamp
-        self.message_times[chat_id].append(now)
-        return True, None
+        bucket = self._bucket(chat_id, limit, window_seconds)
+        if bucket.try_acquire():
+            self.messages_allowed += 1
+            return True, None
+
+        self.messages_limited += 1
+        return False, max(1, math.ceil(bucket.wait_time()))
+
+    def _bucket(self, chat_id: int, limit: int, window_seconds: int) -> TokenBucket:
+        """Get the chat's bucket (burst of `limit`, refilling over the window)."""
+        rate = limit / window_seconds
+        with self._buckets_lock:
+            bucket = self._buckets.get(chat_id)
+            if bucket is None or bucket.capacity != limit or bucket.rate != rate:
+                bucket = TokenBucket(rate=rate, capacity=limit)
+                self._buckets[chat_id] = bucket
+            self._buckets.move_to_end(chat_id)
+            # The LRU bucket is the longest idle, most likely already refilled
+            while len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+            return bucket
 
     def cleanup_expired(self, ttl_hours: int = 24) -> int:
         """
@@ -188,18 +222,21 @@ class TelegramSessionManager:
             >>> cleaned = manager.cleanup_expired(ttl_hours=24)
             >>> print(f"Cleaned {cleaned} expired sessions")
         """
-        now = datetime.now()
-        expiry_threshold = now - timedelta(hours=ttl_hours)
+        expired = self.store.sweep(ttl_seconds=ttl_hours * 3600)
+        for chat_id in expired:
+            self.pending_approvals.pop(chat_id, None)
 
-        expired_chats = [
-            chat_id for chat_id, last_active in self.last_active.items()
-            if last_active < expiry_threshold
-        ]
+        # Approvals left behind by sessions that expired lazily
+        threshold = datetime.now() - timedelta(hours=ttl_hours)
+        for chat_id, approval in list(self.pending_approvals.items()):
+            if approval["timestamp"] < threshold:
+                self.pending_approvals.pop(chat_id, None)
 
-        for chat_id in expired_chats:
-            self.reset_session(chat_id)
+        return len(expired)
 
-        return len(expired_chats)
+    def close(self) -> None:
+        """Write out pending spilled sessions (call on shutdown)."""
+        self.store.close()
 
     def get_stats(self) -> dict:
         """
@@ -216,17 +253,16 @@ class TelegramSessionManager:
             >>> print(f"Active: {stats['active_sessions']}")
         """
         agent_counts = defaultdict(int)
-        for agent_type in self.agent_types.values():
-            agent_counts[agent_type] += 1
-
-        total_messages = sum(
-            len(times) for times in self.message_times.values()
-        )
+        for session in self.store.values():
+            agent_counts[session.metadata.get("agent_type", "bob")] += 1
 
         return {
-            "active_sessions": len(self.sessions),
+            "active_sessions": len(self.store),
             "agent_distribution": dict(agent_counts),
-            "total_messages": total_messages
+            "total_messages": self.messages_allowed,
+            "rate_limited": self.messages_limited,
+            "rate_limit_buckets": len(self._buckets),
+            "store": self.store.metrics.to_dict()
         }
 
     # Approval workflow methods (Factor 7)
@@ -1,6 +1,7 @@
 """Voice message handling for Telegram bot."""
 
 from agent_factory.integrations.telegram.voice.handler import VoiceHandler
+from agent_factory.integrations.telegram.voice.pipeline import VoicePipeline, VoiceTranscript
 from agent_factory.integrations.telegram.voice.transcriber import WhisperTranscriber
 
-__all__ = ["VoiceHandler", "WhisperTranscriber"]
+__all__ = ["VoiceHandler", "VoicePipeline", "VoiceTranscript", "WhisperTranscriber"]
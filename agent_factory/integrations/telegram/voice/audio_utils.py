@@ -1,8 +1,48 @@
 """Audio format conversion utilities for voice messages."""
 
+import array
+import asyncio
+import io
+import math
 import subprocess
+import sys
+import wave
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Formats the Whisper API accepts as-is (Telegram voice notes are OGG/Opus)
+WHISPER_FORMATS = {"ogg", "wav", "mp3", "flac", "webm", "m4a"}
+
+SAMPLE_RATE = 16000  # Whisper resamples to 16 kHz mono internally
+FRAME_SECONDS = 0.02
+
+
+def detect_format(audio: bytes) -> Optional[str]:
+    """
+    Identify an audio container from its magic bytes.
+
+    Returns:
+        "ogg", "wav", "mp3", "flac", "webm", "m4a" or None if unknown
+    """
+    if audio[:4] == b"OggS":
+        return "ogg"
+    if audio[:4] == b"RIFF" and audio[8:12] == b"WAVE":
+        return "wav"
+    if audio[:4] == b"fLaC":
+        return "flac"
+    if audio[:3] == b"ID3" or (len(audio) > 1 and audio[0] == 0xFF and audio[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if audio[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if audio[4:8] == b"ftyp":
+        return "m4a"
+    return None
 
 
 class AudioConverter:
@@ -41,11 +81,73 @@ class AudioConverter:
 
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"FFmpeg conversion failed: {e.stderr.decode()}") from e
-        except FileNotFoundError:
+        except FileNotFoundError as e:
             raise RuntimeError(
                 "ffmpeg not found. Please install ffmpeg: "
                 "https://ffmpeg.org/download.html"
+            ) from e
+
+    @staticmethod
+    async def pipe(audio: bytes, output_args: List[str]) -> bytes:
+        """
+        Run ffmpeg on in-memory audio (stdin -> stdout, no temp files).
+
+        Args:
+            audio: Input audio bytes (any container ffmpeg can probe from a pipe)
+            output_args: ffmpeg output options, e.g. ["-f", "wav"]
+
+        Returns:
+            Converted audio bytes
+
+        Raises:
+            RuntimeError: If ffmpeg is missing or the conversion fails
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                '-i', 'pipe:0', *output_args, 'pipe:1',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
+        except FileNotFoundError as e:
+            raise RuntimeError(
+                "ffmpeg not found. Please install ffmpeg: "
+                "https://ffmpeg.org/download.html"
+            ) from e
+
+        stdout, stderr = await process.communicate(audio)
+        if process.returncode != 0:
+            raise RuntimeError(f"FFmpeg conversion failed: {stderr.decode(errors='replace')}")
+        return stdout
+
+    @staticmethod
+    async def decode_pcm(audio: bytes, sample_rate: int = SAMPLE_RATE) -> bytes:
+        """
+        Decode audio to 16-bit mono PCM at sample_rate.
+
+        WAV input at the right rate/width/channels is unpacked in-process;
+        everything else goes through an ffmpeg pipe.
+        """
+        if detect_format(audio) == "wav":
+            with wave.open(io.BytesIO(audio)) as wav:
+                if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) == (sample_rate, 2, 1):
+                    return wav.readframes(wav.getnframes())
+
+        return await AudioConverter.pipe(
+            audio, ['-f', 's16le', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-ac', '1']
+        )
+
+    @staticmethod
+    def pcm_to_wav(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bytes:
+        """Wrap 16-bit mono PCM in an in-memory WAV container."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return buffer.getvalue()
 
     @staticmethod
     def cleanup_audio_files(*paths: Path) -> None:
@@ -53,3 +155,76 @@ class AudioConverter:
         for path in paths:
             if path and path.exists():
                 path.unlink(missing_ok=True)
+
+
+def frame_energies(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> List[float]:
+    """RMS level of each 20 ms frame of 16-bit mono PCM."""
+    frame = int(sample_rate * FRAME_SECONDS)
+    count = len(pcm) // 2 // frame
+    if count == 0:
+        return []
+
+    if np is not None:
+        samples = np.frombuffer(pcm[: count * frame * 2], dtype="<i2").astype(np.float32)
+        return np.sqrt(np.mean(samples.reshape(count, frame) ** 2, axis=1)).tolist()
+
+    samples = array.array("h")
+    samples.frombytes(pcm[: count * frame * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    # Every 4th sample is plenty to tell speech from silence
+    return [
+        math.sqrt(sum(s * s for s in samples[i * frame:(i + 1) * frame:4]) / (frame / 4))
+        for i in range(count)
+    ]
+
+
+def plan_segments(
+    pcm: bytes,
+    sample_rate: int = SAMPLE_RATE,
+    target_seconds: float = 30.0,
+    max_seconds: float = 60.0,
+    min_silence_seconds: float = 0.3,
+) -> List[Tuple[int, int]]:
+    """
+    Split points for long audio, placed in pauses.
+
+    Each segment ends in the middle of the silence closest to target_seconds
+    after its start (searching between half the target and max_seconds);
+    with no pause in that window the segment is cut hard at max_seconds.
+
+    Returns:
+        (start_byte, end_byte) ranges covering the whole PCM buffer
+    """
+    energies = frame_energies(pcm, sample_rate)
+    if not energies:
+        return [(0, len(pcm))] if pcm else []
+
+    # Relative threshold: a phone in a plant has a noise floor, not zeros
+    loud = sorted(energies)[int(len(energies) * 0.9)]
+    threshold = max(200.0, loud * 0.1)
+
+    min_run = max(1, int(min_silence_seconds / FRAME_SECONDS))
+    pauses = []  # Frame index at the middle of each silence
+    run_start = None
+    for i, energy in enumerate(energies + [float("inf")]):
+        if energy < threshold:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            if i - run_start >= min_run:
+                pauses.append((run_start + i) // 2)
+            run_start = None
+
+    frame_bytes = int(sample_rate * FRAME_SECONDS) * 2
+    target, longest, shortest = (int(s / FRAME_SECONDS) for s in (target_seconds, max_seconds, target_seconds / 2))
+    cuts = []
+    start = 0
+    while len(energies) - start > longest:
+        candidates = [p for p in pauses if start + shortest <= p <= start + longest]
+        cut = min(candidates, key=lambda p: abs(p - (start + target))) if candidates else start + longest
+        cuts.append(cut)
+        start = cut
+
+    bounds = [0] + [cut * frame_bytes for cut in cuts] + [len(pcm)]
+    return list(zip(bounds[:-1], bounds[1:], strict=True))
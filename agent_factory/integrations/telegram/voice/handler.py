@@ -1,6 +1,5 @@
 """Voice message handler for Telegram bot."""
 
-import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -9,7 +8,7 @@ from telegram.ext import ContextTypes
 from telegram.constants import ChatAction
 
 from agent_factory.integrations.telegram.voice.transcriber import WhisperTranscriber
-from agent_factory.integrations.telegram.voice.audio_utils import AudioConverter
+from agent_factory.integrations.telegram.voice.pipeline import VoicePipeline
 from agent_factory.rivet_pro.intent_detector import IntentDetector
 
 
@@ -18,8 +17,8 @@ class VoiceHandler:
     Handles voice messages in Telegram bot.
 
     Flow:
-    1. Download voice message (OGG format from Telegram)
-    2. Transcribe using Whisper
+    1. Download voice message into memory (OGG format from Telegram)
+    2. Transcribe using Whisper (long notes split and transcribed concurrently)
     3. Acknowledge transcription to user
     4. Pass text to intent detector
     5. Route to appropriate handler
@@ -30,7 +29,8 @@ class VoiceHandler:
         transcriber: WhisperTranscriber,
         intent_detector: IntentDetector,
         conversation_manager,  # ConversationManager
-        rivet_handlers  # RIVETProHandlers
+        rivet_handlers,  # RIVETProHandlers
+        voice_pipeline: Optional[VoicePipeline] = None
     ):
         """
         Initialize voice handler.
@@ -40,8 +40,11 @@ class VoiceHandler:
             intent_detector: Intent detection service
             conversation_manager: Multi-turn conversation manager
             rivet_handlers: RIVET Pro handlers for routing
+            voice_pipeline: Shared transcription pipeline (default: one built
+                around transcriber)
         """
         self.transcriber = transcriber
+        self.voice_pipeline = voice_pipeline or VoicePipeline(transcriber)
         self.intent_detector = intent_detector
         self.conversation_manager = conversation_manager
         self.rivet_handlers = rivet_handlers
@@ -67,19 +70,15 @@ class VoiceHandler:
             action=ChatAction.TYPING
         )
 
-        audio_path: Optional[Path] = None
-
         try:
-            # Download voice file to temp directory
+            # Download voice file into memory
             file = await context.bot.get_file(voice.file_id)
-
-            with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
-                await file.download_to_drive(tmp.name)
-                audio_path = Path(tmp.name)
+            audio = bytes(await file.download_as_bytearray())
 
             # Transcribe using Whisper
             # Note: Whisper supports OGG directly, no conversion needed
-            transcribed_text = await self.transcriber.transcribe(audio_path)
+            transcript = await self.voice_pipeline.transcribe(audio, duration=voice.duration)
+            transcribed_text = transcript.text
 
             if not transcribed_text:
                 await update.message.reply_text(
@@ -158,10 +157,6 @@ class VoiceHandler:
                 "Please try sending a text message instead."
             )
 
-        finally:
-            # Cleanup audio file
-            if audio_path:
-                AudioConverter.cleanup_audio_files(audio_path)
 
     async def handle_voice_question_followup(
         self,
@@ -185,17 +180,12 @@ class VoiceHandler:
             action=ChatAction.TYPING
         )
 
-        audio_path: Optional[Path] = None
-
         try:
             # Download and transcribe
             file = await context.bot.get_file(voice.file_id)
+            audio = bytes(await file.download_as_bytearray())
 
-            with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
-                await file.download_to_drive(tmp.name)
-                audio_path = Path(tmp.name)
-
-            question = await self.transcriber.transcribe(audio_path)
+            question = (await self.voice_pipeline.transcribe(audio, duration=voice.duration)).text
 
             # If there's a print in context, analyze it with the question
             if print_path or context.user_data.get("current_print"):
@@ -220,7 +210,3 @@ class VoiceHandler:
             await update.message.reply_text(
                 "❌ Error processing voice question. Please try text instead."
             )
-
-        finally:
-            if audio_path:
-                AudioConverter.cleanup_audio_files(audio_path)
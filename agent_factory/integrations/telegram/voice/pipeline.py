@@ -0,0 +1,203 @@
+"""In-memory voice transcription pipeline.
+
+Voice notes never touch the disk:
+
+1. Short notes in a format Whisper accepts (Telegram sends OGG/Opus) are
+   uploaded as-is - no conversion at all.
+2. Long notes are decoded to PCM through an ffmpeg pipe (stdin/stdout),
+   split in pauses, and the segments are transcribed concurrently.
+3. Anything Whisper does not accept is converted through the same pipe.
+
+A semaphore shared by every chat bounds the number of Whisper requests in
+flight, so a burst of long notes cannot exhaust the API rate limit or the
+bot's connection pool.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from agent_factory.integrations.telegram.voice.audio_utils import (
+    SAMPLE_RATE,
+    WHISPER_FORMATS,
+    AudioConverter,
+    detect_format,
+    plan_segments,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VoiceTranscript:
+    """Transcription result plus how it was produced."""
+    text: str
+    audio_format: Optional[str]
+    segments: int = 1
+    converted: bool = False
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class VoiceMetrics:
+    """Counters for the voice pipeline (read with to_dict())."""
+    notes: int = 0
+    passthrough: int = 0  # Uploaded without conversion
+    converted: int = 0
+    split: int = 0  # Notes transcribed in several segments
+    segments: int = 0  # Whisper requests
+    errors: int = 0
+    audio_bytes: int = 0
+    total_ms: float = 0.0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["avg_ms"] = self.total_ms / self.notes if self.notes else 0.0
+        return data
+
+
+class VoicePipeline:
+    """
+    Transcribes voice notes from memory with bounded concurrency.
+
+    Example:
+        >>> pipeline = VoicePipeline(WhisperTranscriber())
+        >>> audio = bytes(await telegram_file.download_as_bytearray())
+        >>> transcript = await pipeline.transcribe(audio, duration=voice.duration)
+        >>> transcript.text
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        max_concurrent: Optional[int] = None,
+        split_after_seconds: float = 60.0,
+        target_segment_seconds: float = 30.0,
+        max_segment_seconds: float = 60.0,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            transcriber: Object with async transcribe(audio, language=, filename=)
+                (WhisperTranscriber)
+            max_concurrent: Whisper requests in flight across all chats
+                (default VOICE_MAX_CONCURRENT or 8)
+            split_after_seconds: Notes longer than this are split in pauses
+            target_segment_seconds: Preferred segment length when splitting
+            max_segment_seconds: Hard cut if no pause is found
+        """
+        self.transcriber = transcriber
+        self.max_concurrent = max_concurrent or int(os.getenv("VOICE_MAX_CONCURRENT", "8"))
+        self.split_after_seconds = split_after_seconds
+        self.target_segment_seconds = target_segment_seconds
+        self.max_segment_seconds = max_segment_seconds
+        self.metrics = VoiceMetrics()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+
+    async def transcribe(
+        self,
+        audio: bytes,
+        duration: Optional[float] = None,
+        language: Optional[str] = None,
+    ) -> VoiceTranscript:
+        """
+        Transcribe a voice note held in memory.
+
+        Args:
+            audio: Raw audio bytes as downloaded from Telegram
+            duration: Length in seconds if known (Telegram sends it with the
+                voice message); decides whether splitting is worth a decode
+            language: Optional language code passed to Whisper
+
+        Returns:
+            VoiceTranscript (text is "" when nothing was recognized)
+        """
+        start = time.perf_counter()
+        audio_format = detect_format(audio)
+        self.metrics.notes += 1
+        self.metrics.audio_bytes += len(audio)
+
+        try:
+            long_note = duration is None or duration > self.split_after_seconds
+            if long_note or audio_format not in WHISPER_FORMATS:
+                transcript = await self._transcribe_decoded(audio, audio_format, language)
+            else:
+                transcript = None
+
+            if transcript is None:
+                self.metrics.passthrough += 1
+                text = await self._transcribe_one(audio, f"voice.{audio_format}", language)
+                transcript = VoiceTranscript(text=text, audio_format=audio_format)
+
+        except Exception:
+            self.metrics.errors += 1
+            raise
+
+        transcript.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics.total_ms += transcript.elapsed_ms
+        return transcript
+
+    async def _transcribe_decoded(
+        self,
+        audio: bytes,
+        audio_format: Optional[str],
+        language: Optional[str],
+    ) -> Optional[VoiceTranscript]:
+        """
+        Decode to PCM, split long audio in pauses, transcribe segments.
+
+        Returns None when the original bytes should be uploaded unchanged
+        (short note, or no ffmpeg for a format Whisper accepts anyway).
+        """
+        try:
+            pcm = await AudioConverter.decode_pcm(audio)
+        except RuntimeError as e:
+            if audio_format in WHISPER_FORMATS:
+                logger.warning(f"[Voice] Decode failed, sending note unsplit: {e}")
+                return None
+            raise
+
+        seconds = len(pcm) / 2 / SAMPLE_RATE
+        if seconds <= self.split_after_seconds and audio_format in WHISPER_FORMATS:
+            return None  # Duration was unknown; short after all
+
+        ranges = await asyncio.to_thread(
+            plan_segments,
+            pcm,
+            target_seconds=self.target_segment_seconds,
+            max_seconds=self.max_segment_seconds,
+        ) if seconds > self.split_after_seconds else [(0, len(pcm))]
+
+        texts = await asyncio.gather(*(
+            self._transcribe_one(AudioConverter.pcm_to_wav(pcm[begin:end]), f"segment-{i}.wav", language)
+            for i, (begin, end) in enumerate(ranges)
+        ))
+
+        self.metrics.converted += 1
+        if len(ranges) > 1:
+            self.metrics.split += 1
+            logger.info(f"[Voice] {seconds:.0f}s note transcribed in {len(ranges)} segments")
+
+        return VoiceTranscript(
+            text=" ".join(t for t in texts if t),
+            audio_format=audio_format,
+            segments=len(ranges),
+            converted=True,
+        )
+
+    async def _transcribe_one(self, audio: bytes, filename: str, language: Optional[str]) -> str:
+        async with self._slots:
+            self.metrics.segments += 1
+            self.metrics.in_flight += 1
+            self.metrics.peak_in_flight = max(self.metrics.peak_in_flight, self.metrics.in_flight)
+            try:
+                text = await self.transcriber.transcribe(audio, language=language, filename=filename)
+            finally:
+                self.metrics.in_flight -= 1
+        return (text or "").strip()
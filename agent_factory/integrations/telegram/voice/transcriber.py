@@ -2,38 +2,69 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+
+AudioInput = Union[Path, bytes]
 
 
 class WhisperTranscriber:
     """
     Handles voice message transcription using OpenAI's Whisper model.
 
+    Uses the async OpenAI client, so a transcription never blocks the bot's
+    event loop. Audio can be a file path or in-memory bytes.
+
     Attributes:
-        client: OpenAI API client
+        client: Async OpenAI API client
         model: Whisper model name (default: whisper-1)
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "whisper-1"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "whisper-1",
+        client: Optional[AsyncOpenAI] = None
+    ):
         """
         Initialize Whisper transcriber.
 
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: Whisper model to use
+            client: Existing AsyncOpenAI client to share (optional)
         """
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = client or AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
         self.model = model
 
-    async def transcribe(self, audio_path: Path, language: Optional[str] = None) -> str:
+    @staticmethod
+    def _file(audio: AudioInput, filename: Optional[str]) -> Tuple[str, bytes]:
+        """(filename, bytes) upload tuple; Whisper picks the decoder from the name."""
+        if isinstance(audio, (bytes, bytearray)):
+            return filename or "voice.ogg", bytes(audio)
+
+        if not audio.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio}")
+        return filename or audio.name, audio.read_bytes()
+
+    async def transcribe(
+        self,
+        audio: AudioInput,
+        language: Optional[str] = None,
+        filename: Optional[str] = None,
+        prompt: Optional[str] = None
+    ) -> str:
         """
-        Transcribe audio file to text.
+        Transcribe audio to text.
 
         Args:
-            audio_path: Path to audio file (supports OGG, WAV, MP3, etc.)
+            audio: Path to an audio file or raw audio bytes (OGG, WAV, MP3, etc.)
             language: Optional language code (e.g., 'en', 'es') for better accuracy
+            filename: Upload name for byte input; its extension tells Whisper
+                the format (default: voice.ogg)
+            prompt: Optional text to bias spelling (e.g., equipment names)
 
         Returns:
             Transcribed text
@@ -42,23 +73,23 @@ class WhisperTranscriber:
             FileNotFoundError: If audio file doesn't exist
             Exception: If transcription fails
         """
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        upload = self._file(audio, filename)
 
         try:
-            with open(audio_path, "rb") as audio_file:
-                # Whisper API accepts various formats directly (OGG, WAV, MP3, etc.)
-                kwargs = {
-                    "model": self.model,
-                    "file": audio_file,
-                    "response_format": "text"
-                }
+            # Whisper API accepts various formats directly (OGG, WAV, MP3, etc.)
+            kwargs = {
+                "model": self.model,
+                "file": upload,
+                "response_format": "text"
+            }
 
-                # Add language if specified for better accuracy
-                if language:
-                    kwargs["language"] = language
+            # Add language if specified for better accuracy
+            if language:
+                kwargs["language"] = language
+            if prompt:
+                kwargs["prompt"] = prompt
 
-                response = self.client.audio.transcriptions.create(**kwargs)
+            response = await self.client.audio.transcriptions.create(**kwargs)
 
             return response.strip()
 
@@ -67,34 +98,34 @@ class WhisperTranscriber:
 
     async def transcribe_with_timestamps(
         self,
-        audio_path: Path,
-        language: Optional[str] = None
+        audio: AudioInput,
+        language: Optional[str] = None,
+        filename: Optional[str] = None
     ) -> dict:
         """
         Transcribe audio with word-level timestamps.
 
         Args:
-            audio_path: Path to audio file
+            audio: Path to an audio file or raw audio bytes
             language: Optional language code
+            filename: Upload name for byte input (default: voice.ogg)
 
         Returns:
             Dict with 'text' and 'segments' (timestamp data)
         """
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        upload = self._file(audio, filename)
 
         try:
-            with open(audio_path, "rb") as audio_file:
-                kwargs = {
-                    "model": self.model,
-                    "file": audio_file,
-                    "response_format": "verbose_json"  # Returns timestamps
-                }
+            kwargs = {
+                "model": self.model,
+                "file": upload,
+                "response_format": "verbose_json"  # Returns timestamps
+            }
 
-                if language:
-                    kwargs["language"] = language
+            if language:
+                kwargs["language"] = language
 
-                response = self.client.audio.transcriptions.create(**kwargs)
+            response = await self.client.audio.transcriptions.create(**kwargs)
 
             return {
                 "text": response.text,
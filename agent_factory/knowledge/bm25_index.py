@@ -0,0 +1,790 @@
+"""
+BM25 Lexical Index for Manual Chunks
+
+Inverted index over manual chunks with Okapi BM25 scoring. ManualIndexer adds
+chunks as it streams them out of a PDF; ManualSearchService queries the index
+and returns the highest-scoring chunks (or manuals) via a heap.
+
+Tokenization keeps industrial identifiers intact. "1756-L83E" is indexed as
+the whole code plus its separator-free form and its parts, and zero-padded
+fault codes are also indexed unpadded, so "F2", "F0002", "E123" and "E-123"
+all find each other.
+
+On-disk format (single file, loaded with mmap):
+    MAGIC (8 bytes) | header offset (u64) | header length (u64)
+    array blocks (doc metadata, postings, chunk text)
+    JSON header (vocabulary -> posting ranges, manual metadata, block offsets)
+
+Postings and chunk text stay in the mapped file until a term is updated, so
+loading a large index costs one JSON parse, not a rebuild. Scoring is
+vectorized with numpy when it is installed and falls back to a pure-Python
+accumulator with heapq top-k otherwise.
+
+Usage:
+    index = BM25Index.load("data/manual_index.bm25")
+    index.register_manual(manual_id, title="PowerFlex 525", manufacturer="Allen-Bradley")
+    index.add_chunk(manual_id, {"text": "...", "chunk_index": 0})
+    hits = index.search("fault F0002", top_k=5)
+    index.save()
+"""
+
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional (removed from core deps); pure-Python scoring below
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TOKENIZATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Alphanumeric runs joined by - _ . / (part numbers, fault codes, versions)
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+_SEPARATORS = re.compile(r"[-_./]")
+# Letter prefix + zero-padded number: F0002 -> f2, E04 -> e4
+_PADDED_CODE = re.compile(r"^([a-z]{1,3})0+(\d+)$")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "with",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Lowercase terms, with extra variants for compound codes
+
+    Example:
+        >>> tokenize("Fault F0002 on 1756-L83E")
+        ['fault', 'f0002', 'f2', '1756-l83e', '1756l83e', '1756', 'l83e']
+    """
+    terms: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        word = match.group()
+        parts = _SEPARATORS.split(word)
+        if len(parts) > 1:
+            terms.append(word)
+            terms.append("".join(parts))
+            terms.extend(
+                p for p in parts
+                if p not in STOPWORDS and (len(p) > 1 or p.isdigit())
+            )
+        elif word not in STOPWORDS:
+            terms.append(word)
+
+        padded = _PADDED_CODE.match("".join(parts))
+        if padded:
+            terms.append(padded.group(1) + padded.group(2))
+    return terms
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════════════════════════════
+
+_MAGIC = b"AFBM25\x00\x01"
+_PREAMBLE = struct.Struct("<8sQQ")
+_FORMAT_VERSION = 1
+
+
+@dataclass
+class SearchHit:
+    """One scored chunk."""
+    manual_id: str
+    chunk_index: int
+    score: float
+    text: str
+    section_type: Optional[str] = None
+    manual: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize hit with manual metadata."""
+        return {
+            "manual_id": self.manual_id,
+            "chunk_index": self.chunk_index,
+            "section_type": self.section_type,
+            "score": self.score,
+            "text": self.text,
+            **{k: v for k, v in self.manual.items() if k != "manual_id"},
+        }
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index over manual chunks.
+
+    Features:
+    - Chunks added one at a time while a manual is being indexed
+    - Manufacturer / component family filters (case-insensitive substring)
+    - Top-k chunks or top-k manuals (best chunk per manual) via heapq
+    - Compact binary file, memory-mapped on load
+    - Thread-safe (one lock; indexing and search may overlap)
+
+    Example:
+        >>> index = BM25Index()
+        >>> index.register_manual("m1", title="PowerFlex 525", manufacturer="Allen-Bradley")
+        >>> index.add_chunk("m1", {"text": "F0002 auxiliary input fault", "chunk_index": 0})
+        >>> index.search("F2")[0].manual_id
+        'm1'
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            path: File used by save() when no path is passed
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Clear all in-memory state."""
+        # Manuals (numbered in registration order)
+        self._manuals: List[Dict[str, Any]] = []
+        self._manual_numbers: Dict[str, int] = {}
+        self._removed: Set[int] = set()
+
+        # Per-document arrays (document number = position)
+        self._doc_manual = array("I")
+        self._doc_chunk = array("I")
+        self._doc_len = array("I")
+        self._doc_section = array("H")
+        self._sections: List[str] = [""]
+        self._section_numbers: Dict[str, int] = {"": 0}
+        self._texts: List[str] = []  # documents added since load
+
+        # Postings: term -> (doc numbers, term frequencies)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+
+        # Memory-mapped state from load()
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_terms: Dict[str, Tuple[int, int]] = {}
+        self._mapped_docs: Optional[memoryview] = None
+        self._mapped_tfs: Optional[memoryview] = None
+        self._mapped_text_offsets: Optional[memoryview] = None
+        self._mapped_text: Optional[memoryview] = None
+        self._mapped_doc_count = 0
+
+        self._live_docs = 0
+        self._live_len = 0
+
+        # Bumped on every mutation; invalidates the numpy scoring cache
+        self._version = 0
+        self._np_cache: Optional[Tuple[int, Any, Any]] = None
+
+        # Changed since the last save/load (flush() is a no-op otherwise)
+        self._dirty = False
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Writing
+    # ───────────────────────────────────────────────────────────────────────
+
+    def register_manual(self, manual_id: str, **metadata: Any) -> None:
+        """
+        Register a manual (or replace an existing one) before adding chunks.
+
+        Args:
+            manual_id: Manual UUID
+            **metadata: title, manufacturer, component_family, ...
+        """
+        manual_id = str(manual_id)
+        with self._lock:
+            if manual_id in self._manual_numbers:
+                self.remove_manual(manual_id)
+            self._manual_numbers[manual_id] = len(self._manuals)
+            self._manuals.append({"manual_id": manual_id, **metadata})
+            self._dirty = True
+
+    def add_chunk(self, manual_id: str, chunk: Dict[str, Any]) -> int:
+        """
+        Index one chunk.
+
+        Args:
+            manual_id: Manual UUID (registered implicitly if unknown)
+            chunk: {text, chunk_index, section_type} as yielded by ManualIndexer
+
+        Returns:
+            Document number of the chunk
+        """
+        manual_id = str(manual_id)
+        text = chunk.get("text", "")
+        terms = tokenize(text)
+
+        with self._lock:
+            if manual_id not in self._manual_numbers:
+                self.register_manual(manual_id)
+
+            section = chunk.get("section_type") or ""
+            if section not in self._section_numbers:
+                self._section_numbers[section] = len(self._sections)
+                self._sections.append(section)
+
+            doc = len(self._doc_len)
+            self._doc_manual.append(self._manual_numbers[manual_id])
+            self._doc_chunk.append(int(chunk.get("chunk_index", 0)))
+            self._doc_len.append(len(terms))
+            self._doc_section.append(self._section_numbers[section])
+            self._texts.append(text)
+
+            counts: Dict[str, int] = defaultdict(int)
+            for term in terms:
+                counts[term] += 1
+            for term, tf in counts.items():
+                docs, tfs = self._writable_postings(term)
+                docs.append(doc)
+                tfs.append(tf)
+
+            self._live_docs += 1
+            self._live_len += len(terms)
+            self._version += 1
+            self._dirty = True
+            return doc
+
+    def add_chunks(self, manual_id: str, chunks: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index many chunks for one manual.
+
+        Returns:
+            Number of chunks added
+        """
+        count = 0
+        for chunk in chunks:
+            self.add_chunk(manual_id, chunk)
+            count += 1
+        return count
+
+    def remove_manual(self, manual_id: str) -> bool:
+        """
+        Remove a manual from search results.
+
+        Its postings are dropped on the next save().
+
+        Args:
+            manual_id: Manual UUID
+
+        Returns:
+            True if the manual was indexed
+        """
+        with self._lock:
+            number = self._manual_numbers.pop(str(manual_id), None)
+            if number is None:
+                return False
+            self._removed.add(number)
+            self._version += 1
+            self._dirty = True
+            for doc, owner in enumerate(self._doc_manual):
+                if owner == number:
+                    self._live_docs -= 1
+                    self._live_len -= self._doc_len[doc]
+            return True
+
+    def _writable_postings(self, term: str) -> Tuple[array, array]:
+        """Postings lists for a term, copied out of the mapped file if needed."""
+        postings = self._postings.get(term)
+        if postings is None:
+            mapped = self._mapped_terms.pop(term, None)
+            if mapped is not None:
+                start, count = mapped
+                postings = (
+                    array("I", self._mapped_docs[start:start + count]),
+                    array("I", self._mapped_tfs[start:start + count]),
+                )
+            else:
+                postings = (array("I"), array("I"))
+            self._postings[term] = postings
+        return postings
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Searching
+    # ───────────────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        manufacturer: Optional[str] = None,
+        component_family: Optional[str] = None,
+        group_by_manual: bool = False
+    ) -> List[SearchHit]:
+        """
+        Rank chunks for a query with BM25.
+
+        Args:
+            query: Query text
+            top_k: Number of hits to return
+            manufacturer: Filter (case-insensitive substring)
+            component_family: Filter (case-insensitive substring)
+            group_by_manual: Return the best chunk of each manual only
+
+        Returns:
+            Hits ordered by descending score
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or top_k <= 0:
+            return []
+
+        with self._lock:
+            if self._live_docs == 0:
+                return []
+
+            allowed = self._allowed_manuals(manufacturer, component_family)
+            if allowed is not None and not allowed:
+                return []
+
+            if np is not None:
+                top = self._top_numpy(terms, top_k, allowed, group_by_manual)
+            else:
+                top = self._top_python(terms, top_k, allowed, group_by_manual)
+            return [self._hit(doc, score) for doc, score in top]
+
+    def _idf(self, df: int) -> float:
+        """BM25 inverse document frequency (always positive)."""
+        return math.log(1 + (self._live_docs - df + 0.5) / (df + 0.5))
+
+    def _top_python(
+        self,
+        terms: List[str],
+        top_k: int,
+        allowed: Optional[Set[int]],
+        group_by_manual: bool
+    ) -> List[Tuple[int, float]]:
+        """Score with a dict accumulator and select top-k with heapq."""
+        k1 = self.k1
+        base = k1 * (1 - self.b)
+        scale = k1 * self.b * self._live_docs / self._live_len if self._live_len else 0.0
+        doc_len = self._doc_len
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in terms:
+            docs, tfs = self._read_postings(term)
+            if not docs:
+                continue
+            weight = self._idf(len(docs)) * (k1 + 1)
+            for doc, tf in zip(docs, tfs, strict=True):
+                scores[doc] += weight * tf / (tf + base + scale * doc_len[doc])
+
+        doc_manual = self._doc_manual
+        removed = self._removed
+        if group_by_manual:
+            best: Dict[int, Tuple[int, float]] = {}
+            for doc, score in scores.items():
+                owner = doc_manual[doc]
+                if owner in removed or (allowed is not None and owner not in allowed):
+                    continue
+                current = best.get(owner)
+                if current is None or score > current[1]:
+                    best[owner] = (doc, score)
+            candidates: Iterable[Tuple[int, float]] = best.values()
+        else:
+            candidates = (
+                (doc, score) for doc, score in scores.items()
+                if doc_manual[doc] not in removed
+                and (allowed is None or doc_manual[doc] in allowed)
+            )
+
+        return heapq.nlargest(top_k, candidates, key=itemgetter(1))
+
+    def _top_numpy(
+        self,
+        terms: List[str],
+        top_k: int,
+        allowed: Optional[Set[int]],
+        group_by_manual: bool
+    ) -> List[Tuple[int, float]]:
+        """Score with numpy over dense per-document arrays."""
+        if self._np_cache is None or self._np_cache[0] != self._version:
+            k1 = self.k1
+            scale = k1 * self.b * self._live_docs / self._live_len if self._live_len else 0.0
+            norm = k1 * (1 - self.b) + scale * np.array(self._doc_len, dtype=np.float64)
+            self._np_cache = (self._version, np.array(self._doc_manual, dtype=np.int64), norm)
+        _, doc_manual, norm = self._np_cache
+
+        scores = np.zeros(len(norm))
+        for term in terms:
+            docs, tfs = self._read_postings(term)
+            if not len(docs):
+                continue
+            if isinstance(docs, memoryview):
+                docs = np.frombuffer(docs, dtype=np.uint32)
+                tfs = np.frombuffer(tfs, dtype=np.uint32)
+            else:
+                docs = np.array(docs, dtype=np.int64)
+                tfs = np.array(tfs, dtype=np.float64)
+            weight = self._idf(len(docs)) * (self.k1 + 1)
+            # A document appears at most once per posting list, so += is safe
+            scores[docs] += weight * tfs / (tfs + norm[docs])
+
+        candidates = np.flatnonzero(scores)
+        if self._removed or allowed is not None:
+            live = np.ones(len(self._manuals), dtype=bool)
+            if allowed is not None:
+                live[:] = False
+                live[list(allowed)] = True
+            live[list(self._removed)] = False
+            candidates = candidates[live[doc_manual[candidates]]]
+        if not len(candidates):
+            return []
+
+        if group_by_manual:
+            ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+            _, first = np.unique(doc_manual[ordered], return_index=True)
+            top = ordered[np.sort(first)[:top_k]]
+        else:
+            if len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            top = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [(int(doc), float(scores[doc])) for doc in top]
+
+    def _read_postings(self, term: str) -> Tuple[Any, Any]:
+        """Postings for a term without copying mapped data."""
+        postings = self._postings.get(term)
+        if postings is not None:
+            return postings
+        mapped = self._mapped_terms.get(term)
+        if mapped is None:
+            return (), ()
+        start, count = mapped
+        return self._mapped_docs[start:start + count], self._mapped_tfs[start:start + count]
+
+    def _allowed_manuals(
+        self,
+        manufacturer: Optional[str],
+        component_family: Optional[str]
+    ) -> Optional[Set[int]]:
+        """Manual numbers passing the filters (None = no filter)."""
+        if not manufacturer and not component_family:
+            return None
+        allowed = set()
+        for number in self._manual_numbers.values():
+            manual = self._manuals[number]
+            if manufacturer and manufacturer.lower() not in str(manual.get("manufacturer") or "").lower():
+                continue
+            if component_family and component_family.lower() not in str(manual.get("component_family") or "").lower():
+                continue
+            allowed.add(number)
+        return allowed
+
+    def _hit(self, doc: int, score: float) -> SearchHit:
+        """Build a SearchHit for a document number."""
+        manual = self._manuals[self._doc_manual[doc]]
+        return SearchHit(
+            manual_id=manual["manual_id"],
+            chunk_index=self._doc_chunk[doc],
+            score=score,
+            text=self._text(doc),
+            section_type=self._sections[self._doc_section[doc]] or None,
+            manual=manual,
+        )
+
+    def _text(self, doc: int) -> str:
+        """Chunk text (decoded from the mapped file for loaded documents)."""
+        if doc < self._mapped_doc_count:
+            start = self._mapped_text_offsets[doc]
+            end = self._mapped_text_offsets[doc + 1]
+            return bytes(self._mapped_text[start:end]).decode("utf-8")
+        return self._texts[doc - self._mapped_doc_count]
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Persistence
+    # ───────────────────────────────────────────────────────────────────────
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Write the index to disk, dropping removed manuals.
+
+        The file is written next to the target and atomically renamed, then
+        re-mapped so memory held by added documents is released.
+
+        Args:
+            path: Output file (default: self.path)
+
+        Returns:
+            Path written
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path given and index has no default path")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+
+        with self._lock:
+            self._write(tmp)
+            self._close_mmap()
+            os.replace(tmp, target)
+            self._attach(target)
+            if self.path is None:
+                self.path = target
+
+        logger.info(f"Saved BM25 index: {self._live_docs} chunks -> {target}")
+        return target
+
+    def _write(self, path: Path) -> None:
+        """Serialize live documents to path (caller holds the lock)."""
+        # Renumber live manuals and documents
+        manual_map: Dict[int, int] = {}
+        manuals = []
+        for number in sorted(self._manual_numbers.values()):
+            manual_map[number] = len(manuals)
+            manuals.append(self._manuals[number])
+
+        doc_map: Dict[int, int] = {}
+        doc_manual, doc_chunk, doc_len, doc_section = array("I"), array("I"), array("I"), array("H")
+        text_offsets = array("Q", [0])
+        text_parts: List[bytes] = []
+        text_size = 0
+        for doc in range(len(self._doc_len)):
+            owner = self._doc_manual[doc]
+            if owner not in manual_map:
+                continue
+            doc_map[doc] = len(doc_len)
+            doc_manual.append(manual_map[owner])
+            doc_chunk.append(self._doc_chunk[doc])
+            doc_len.append(self._doc_len[doc])
+            doc_section.append(self._doc_section[doc])
+            encoded = self._text(doc).encode("utf-8")
+            text_parts.append(encoded)
+            text_size += len(encoded)
+            text_offsets.append(text_size)
+
+        terms: Dict[str, List[int]] = {}
+        post_docs, post_tfs = array("I"), array("I")
+        for term in sorted(set(self._postings) | set(self._mapped_terms)):
+            docs, tfs = self._read_postings(term)
+            start = len(post_docs)
+            for doc, tf in zip(docs, tfs, strict=True):
+                new_doc = doc_map.get(doc)
+                if new_doc is not None:
+                    post_docs.append(new_doc)
+                    post_tfs.append(tf)
+            if len(post_docs) > start:
+                terms[term] = [start, len(post_docs) - start]
+
+        blocks = [
+            ("doc_manual", doc_manual), ("doc_chunk", doc_chunk),
+            ("doc_len", doc_len), ("doc_section", doc_section),
+            ("text_offsets", text_offsets),
+            ("post_docs", post_docs), ("post_tfs", post_tfs),
+        ]
+
+        with open(path, "wb") as f:
+            f.write(_PREAMBLE.pack(_MAGIC, 0, 0))
+            offsets: Dict[str, List[Any]] = {}
+            for name, data in blocks:
+                f.write(b"\x00" * (-f.tell() % 8))
+                offsets[name] = [f.tell(), len(data), data.typecode]
+                data.tofile(f)
+            offsets["text"] = [f.tell(), text_size, "B"]
+            for part in text_parts:
+                f.write(part)
+
+            header = json.dumps({
+                "version": _FORMAT_VERSION,
+                "byteorder": sys.byteorder,
+                "k1": self.k1,
+                "b": self.b,
+                "doc_count": len(doc_len),
+                "total_len": sum(doc_len),
+                "manuals": manuals,
+                "sections": self._sections,
+                "blocks": offsets,
+                "terms": terms,
+            }, separators=(",", ":"), default=str).encode("utf-8")
+            header_offset = f.tell()
+            f.write(header)
+            f.seek(0)
+            f.write(_PREAMBLE.pack(_MAGIC, header_offset, len(header)))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BM25Index":
+        """
+        Memory-map an index written by save().
+
+        A missing file yields an empty index that will save to path.
+
+        Args:
+            path: Index file
+
+        Returns:
+            BM25Index
+        """
+        index = cls(path=path)
+        if Path(path).exists():
+            index._attach(Path(path))
+        return index
+
+    def _attach(self, path: Path) -> None:
+        """Replace in-memory state with the mapped contents of path."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_offset, header_len = _PREAMBLE.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError(f"Not a BM25 index file: {path}")
+        header = json.loads(bytes(mapped[header_offset:header_offset + header_len]))
+        if header["version"] != _FORMAT_VERSION or header["byteorder"] != sys.byteorder:
+            mapped.close()
+            raise ValueError(f"Incompatible BM25 index file: {path}")
+
+        view = memoryview(mapped)
+
+        def block(name: str) -> memoryview:
+            offset, count, typecode = header["blocks"][name]
+            size = count * array(typecode).itemsize
+            return view[offset:offset + size].cast(typecode)
+
+        self._reset()
+        self.k1 = header["k1"]
+        self.b = header["b"]
+        self._mmap = mapped
+        self._manuals = header["manuals"]
+        self._manual_numbers = {m["manual_id"]: i for i, m in enumerate(self._manuals)}
+        self._sections = header["sections"]
+        self._section_numbers = {s: i for i, s in enumerate(self._sections)}
+
+        # Per-document metadata is small and read on every hit: copy it
+        self._doc_manual = array("I", block("doc_manual"))
+        self._doc_chunk = array("I", block("doc_chunk"))
+        self._doc_len = array("I", block("doc_len"))
+        self._doc_section = array("H", block("doc_section"))
+
+        # Postings and text stay in the mapped file
+        self._mapped_terms = {t: (s, c) for t, (s, c) in header["terms"].items()}
+        self._mapped_docs = block("post_docs")
+        self._mapped_tfs = block("post_tfs")
+        self._mapped_text_offsets = block("text_offsets")
+        self._mapped_text = block("text")
+        self._mapped_doc_count = header["doc_count"]
+
+        self._live_docs = header["doc_count"]
+        self._live_len = header["total_len"]
+
+    def _close_mmap(self) -> None:
+        """Release views into the mapped file before closing it."""
+        if self._mmap is None:
+            return
+        for view in (self._mapped_docs, self._mapped_tfs, self._mapped_text_offsets, self._mapped_text):
+            if view is not None:
+                view.release()
+        self._mapped_docs = self._mapped_tfs = None
+        self._mapped_text_offsets = self._mapped_text = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a slice; the mapping is freed with it
+            pass
+        self._mmap = None
+
+    def flush(self) -> None:
+        """Save to self.path if one is configured and the index changed (errors are logged)."""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.save()
+        except Exception as e:
+            logger.warning(f"Failed to save BM25 index to {self.path}: {e}")
+
+    def close(self) -> None:
+        """Unmap the index file."""
+        with self._lock:
+            if self._mmap is not None:
+                # Keep the index usable: pull mapped data into memory first
+                for term in list(self._mapped_terms):
+                    self._writable_postings(term)
+                self._texts = [self._text(d) for d in range(self._mapped_doc_count)] + self._texts
+                self._mapped_doc_count = 0
+                self._close_mmap()
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Introspection
+    # ───────────────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        """Number of searchable chunks."""
+        return self._live_docs
+
+    @property
+    def manual_count(self) -> int:
+        """Number of searchable manuals."""
+        return len(self._manual_numbers)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct terms (including terms of removed manuals until save)."""
+        return len(self._postings) + len(self._mapped_terms)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the index changed since it was last saved or loaded."""
+        return self._dirty
+
+    def __contains__(self, manual_id: str) -> bool:
+        """Whether a manual is indexed."""
+        return str(manual_id) in self._manual_numbers
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"BM25Index(chunks={self._live_docs}, manuals={self.manual_count}, "
+            f"terms={self.vocabulary_size})"
+        )
+
+
+_default_index: Optional[BM25Index] = None
+_default_index_lock = threading.Lock()
+
+
+def get_manual_index() -> BM25Index:
+    """
+    Return the process-wide manual index.
+
+    Loaded from MANUAL_INDEX_PATH (default: data/manual_index.bm25) on first use.
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            path = os.getenv("MANUAL_INDEX_PATH", "data/manual_index.bm25")
+            try:
+                _default_index = BM25Index.load(path)
+            except Exception as e:
+                logger.warning(f"Failed to load manual index {path}: {e}. Starting empty.")
+                _default_index = BM25Index(path=path)
+        return _default_index
@@ -0,0 +1,956 @@
+"""
+Knowledge Base Snapshots - Columnar Export/Import for knowledge_atoms
+
+Bootstrapping an environment by replaying the upload_atoms_* scripts pushes
+atoms through Supabase one HTTP call at a time and re-sends every embedding
+as JSON text. A snapshot is instead a directory of Parquet files (one per
+vendor) with embeddings stored as fixed-size float32 columns, plus a
+manifest with row counts and SHA-256 checksums:
+
+    snapshot/
+        manifest.json
+        manufacturer=allen-bradley/part-00000.parquet
+        manufacturer=siemens/part-00000.parquet
+        ...
+
+Export streams rows out of PostgreSQL with binary COPY. Import goes the
+other way: each Parquet row group is encoded as a binary COPY stream into a
+temp staging table, then upserted into knowledge_atoms in one statement -
+no per-row round trips, no float-to-text conversion. Imports can also target
+the local SQLite provider (embeddings as float32 BLOBs).
+
+Loads record finished row groups in a progress file, so an interrupted
+restore resumes where it stopped; upserts on atom_id make a replayed row
+group harmless.
+
+Usage:
+    from agent_factory.knowledge.kb_snapshot import (
+        PostgresTarget, SQLiteTarget, export_postgres, load_snapshot,
+    )
+
+    export_postgres(conn, "data/snapshots/kb-2026-10-18")
+    load_snapshot("data/snapshots/kb-2026-10-18", SQLiteTarget("data/local.db"))
+
+CLI:
+    poetry run python scripts/kb_snapshot.py export data/snapshots/kb
+    poetry run python scripts/kb_snapshot.py import data/snapshots/kb --sqlite data/local.db
+
+Requires pyarrow (and numpy); everything else in the package works without it.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import struct
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DEFAULT_TABLE = "knowledge_atoms"
+DEFAULT_PARTITION_COLUMN = "manufacturer"
+DEFAULT_KEY = "atom_id"
+DEFAULT_ROW_GROUP_SIZE = 8192
+
+# Column kinds (how a PostgreSQL column is carried through the snapshot)
+KIND_TEXT = "text"            # text, varchar, uuid, json/jsonb, anything else as ::text
+KIND_INT = "int"              # smallint, integer, bigint
+KIND_FLOAT = "float"          # real, double precision, numeric
+KIND_BOOL = "bool"
+KIND_TIMESTAMP = "timestamp"  # timestamp[tz], date -> microseconds since epoch (UTC)
+KIND_LIST = "list"            # arrays of text/int/float
+KIND_VECTOR = "vector"        # pgvector -> fixed_size_list<float32>[dim]
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_NULL = struct.pack(">i", -1)
+_STAGE_TABLE = "kb_snapshot_stage"
+
+
+class SnapshotError(Exception):
+    """Snapshot is malformed or incompatible with the target."""
+
+
+class ChecksumError(SnapshotError):
+    """A partition file is missing or doesn't match its manifest checksum."""
+
+
+def _require_arrow():
+    if pa is None or np is None:
+        raise ImportError(
+            "pyarrow and numpy required for KB snapshots. "
+            "Install with: poetry add pyarrow numpy"
+        )
+
+
+# ============================================================================
+# Manifest
+# ============================================================================
+
+@dataclass
+class SnapshotColumn:
+    """One column of the snapshotted table."""
+    name: str
+    kind: str
+    pg_type: Optional[str] = None    # format_type() in the source database
+    item_kind: Optional[str] = None  # element kind for KIND_LIST
+    dim: Optional[int] = None        # vector dimension for KIND_VECTOR
+
+    def arrow_type(self):
+        if self.kind == KIND_VECTOR:
+            return pa.list_(pa.float32(), self.dim)
+        if self.kind == KIND_LIST:
+            return pa.list_(_SCALAR_ARROW_TYPES[self.item_kind or KIND_TEXT]())
+        return _SCALAR_ARROW_TYPES[self.kind]()
+
+
+_SCALAR_ARROW_TYPES = {
+    KIND_TEXT: lambda: pa.string(),
+    KIND_INT: lambda: pa.int64(),
+    KIND_FLOAT: lambda: pa.float64(),
+    KIND_BOOL: lambda: pa.bool_(),
+    KIND_TIMESTAMP: lambda: pa.timestamp("us", tz="UTC"),
+}
+
+
+@dataclass
+class SnapshotPartition:
+    """One Parquet file (all rows for one vendor)."""
+    key: str
+    path: str
+    rows: int
+    bytes: int
+    sha256: str
+
+
+@dataclass
+class SnapshotManifest:
+    """Contents of manifest.json."""
+    table: str
+    columns: List[SnapshotColumn]
+    partitions: List[SnapshotPartition] = field(default_factory=list)
+    partition_column: Optional[str] = DEFAULT_PARTITION_COLUMN
+    created_at: str = ""
+    snapshot_id: str = ""
+    version: int = SNAPSHOT_VERSION
+
+    @property
+    def total_rows(self) -> int:
+        return sum(p.rows for p in self.partitions)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["total_rows"] = self.total_rows
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SnapshotManifest":
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version: {data.get('version')}")
+        return cls(
+            table=data["table"],
+            columns=[SnapshotColumn(**c) for c in data["columns"]],
+            partitions=[SnapshotPartition(**p) for p in data["partitions"]],
+            partition_column=data.get("partition_column"),
+            created_at=data.get("created_at", ""),
+            snapshot_id=data.get("snapshot_id", ""),
+        )
+
+
+def read_manifest(directory) -> SnapshotManifest:
+    """Load manifest.json from a snapshot directory."""
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        raise SnapshotError(f"Not a snapshot directory (no {MANIFEST_NAME}): {directory}")
+    return SnapshotManifest.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def verify_snapshot(directory) -> SnapshotManifest:
+    """
+    Check every partition file against the manifest.
+
+    Returns:
+        The manifest, if all files are present and match
+
+    Raises:
+        ChecksumError: Listing every missing or mismatched partition
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    problems = []
+
+    for part in manifest.partitions:
+        path = directory / part.path
+        if not path.exists():
+            problems.append(f"{part.path}: missing")
+        elif path.stat().st_size != part.bytes:
+            problems.append(f"{part.path}: size {path.stat().st_size} != {part.bytes}")
+        elif _file_sha256(path) != part.sha256:
+            problems.append(f"{part.path}: sha256 mismatch")
+
+    if problems:
+        raise ChecksumError("Snapshot verification failed: " + "; ".join(problems))
+    return manifest
+
+
+def partition_key(value: Any) -> str:
+    """Filesystem-safe partition name for a vendor value."""
+    slug = re.sub(r"[^a-z0-9]+", "-", str(value or "").lower()).strip("-")
+    return slug or "unknown"
+
+
+# ============================================================================
+# Writing snapshots
+# ============================================================================
+
+class SnapshotWriter:
+    """
+    Stream rows into per-vendor Parquet files.
+
+    Rows are buffered per partition and written as one row group every
+    row_group_size rows, so memory stays bounded regardless of table size.
+    """
+
+    def __init__(
+        self,
+        directory,
+        columns: List[SnapshotColumn],
+        table: str = DEFAULT_TABLE,
+        partition_column: Optional[str] = DEFAULT_PARTITION_COLUMN,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+    ):
+        """
+        Args:
+            directory: Output directory (created if needed)
+            columns: Column definitions; rows are tuples in this order
+            table: Source table name recorded in the manifest
+            partition_column: Column to partition files by (None = one file)
+            row_group_size: Rows per Parquet row group (= rows per import batch)
+            compression: Parquet compression codec
+        """
+        _require_arrow()
+        for column in columns:
+            if column.kind == KIND_VECTOR and not column.dim:
+                raise ValueError(f"Vector column '{column.name}' needs a dimension")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.columns = columns
+        self.table = table
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = pa.schema([(c.name, c.arrow_type()) for c in columns])
+
+        names = [c.name for c in columns]
+        self.partition_column = partition_column if partition_column in names else None
+        self._partition_index = names.index(partition_column) if self.partition_column else None
+
+        self._buffers: Dict[str, List[Sequence[Any]]] = {}
+        self._buffered = 0
+        self._writers: Dict[str, Any] = {}
+        self._rows: Dict[str, int] = {}
+
+    def _relative_path(self, key: str) -> str:
+        if self.partition_column is None:
+            return "part-00000.parquet"
+        return f"{self.partition_column}={key}/part-00000.parquet"
+
+    def write(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Buffer rows (tuples in column order), flushing full row groups."""
+        count = 0
+        for row in rows:
+            key = partition_key(row[self._partition_index]) if self._partition_index is not None else "all"
+            buffer = self._buffers.setdefault(key, [])
+            buffer.append(row)
+            self._buffered += 1
+            count += 1
+
+            if len(buffer) >= self.row_group_size:
+                self._flush(key)
+            elif self._buffered >= self.row_group_size * 4:
+                # Many small vendors: flush the biggest buffer to bound memory
+                self._flush(max(self._buffers, key=lambda k: len(self._buffers[k])))
+        return count
+
+    def _flush(self, key: str) -> None:
+        buffer = self._buffers.pop(key, [])
+        if not buffer:
+            return
+        self._buffered -= len(buffer)
+
+        writer = self._writers.get(key)
+        if writer is None:
+            path = self.directory / self._relative_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(str(path), self.schema, compression=self.compression)
+            self._writers[key] = writer
+
+        writer.write_table(rows_to_table(buffer, self.columns, self.schema), row_group_size=self.row_group_size)
+        self._rows[key] = self._rows.get(key, 0) + len(buffer)
+
+    def close(self) -> SnapshotManifest:
+        """Flush, close files, checksum them and write manifest.json."""
+        for key in list(self._buffers):
+            self._flush(key)
+        for writer in self._writers.values():
+            writer.close()
+
+        partitions = []
+        for key in sorted(self._writers):
+            relative = self._relative_path(key)
+            path = self.directory / relative
+            partitions.append(SnapshotPartition(
+                key=key,
+                path=relative,
+                rows=self._rows[key],
+                bytes=path.stat().st_size,
+                sha256=_file_sha256(path),
+            ))
+
+        manifest = SnapshotManifest(
+            table=self.table,
+            columns=self.columns,
+            partitions=partitions,
+            partition_column=self.partition_column,
+            created_at=datetime.utcnow().isoformat(),
+            snapshot_id=hashlib.sha256("".join(p.sha256 for p in partitions).encode()).hexdigest()[:16],
+        )
+
+        tmp_path = self.directory / f"{MANIFEST_NAME}.tmp"
+        tmp_path.write_text(json.dumps(manifest.to_dict(), indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.directory / MANIFEST_NAME)
+
+        logger.info(f"Wrote snapshot of {manifest.total_rows} rows in {len(partitions)} partitions to {self.directory}")
+        return manifest
+
+
+def rows_to_table(rows: List[Sequence[Any]], columns: List[SnapshotColumn], schema=None):
+    """Transpose row tuples into an Arrow table (vectors stacked with numpy)."""
+    arrays = []
+    for index, column in enumerate(columns):
+        values = [row[index] for row in rows]
+        if column.kind == KIND_VECTOR:
+            arrays.append(_vector_array(values, column))
+        else:
+            arrays.append(pa.array(values, type=column.arrow_type()))
+    return pa.Table.from_arrays(arrays, schema=schema or pa.schema([(c.name, c.arrow_type()) for c in columns]))
+
+
+def _vector_array(values: List[Any], column: SnapshotColumn):
+    mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    dense = np.zeros((len(values), column.dim), dtype=np.float32)
+    present = [v for v in values if v is not None]
+    if present:
+        try:
+            dense[~mask] = np.asarray(present, dtype=np.float32)
+        except ValueError as e:
+            raise SnapshotError(f"Column '{column.name}' has vectors that aren't {column.dim}-dimensional") from e
+    return pa.FixedSizeListArray.from_arrays(
+        pa.array(dense.reshape(-1)), column.dim, mask=pa.array(mask) if mask.any() else None
+    )
+
+
+def _vector_matrix(array, dim: int):
+    """(n, dim) float32 view of a fixed-size-list array (null rows are zeros)."""
+    values = array.values.to_numpy(zero_copy_only=False)
+    start = array.offset * dim
+    return values[start:start + len(array) * dim].reshape(-1, dim)
+
+
+# ============================================================================
+# PostgreSQL binary COPY encoding
+# ============================================================================
+
+def encode_copy_binary(table, columns: List[SnapshotColumn]) -> bytes:
+    """
+    Encode an Arrow table as a PostgreSQL binary COPY stream.
+
+    Field encodings match the staging table built by PostgresTarget:
+    text/list -> text (lists as JSON), int/timestamp -> int8,
+    float -> float8, bool -> bool, vector -> pgvector binary.
+    """
+    fields = [_encode_column(table.column(c.name).combine_chunks(), c) for c in columns]
+    field_count = struct.pack(">h", len(columns))
+
+    out = [_COPY_SIGNATURE, struct.pack(">ii", 0, 0)]
+    for row in zip(*fields, strict=True):
+        out.append(field_count)
+        out.extend(row)
+    out.append(struct.pack(">h", -1))
+    return b"".join(out)
+
+
+def _encode_column(array, column: SnapshotColumn) -> List[bytes]:
+    kind = column.kind
+
+    if kind == KIND_VECTOR:
+        size = 4 + 4 * column.dim
+        header = struct.pack(">ihh", size, column.dim, 0)
+        big_endian = _vector_matrix(array, column.dim).astype(">f4")
+        nulls = array.is_null().to_numpy(zero_copy_only=False)
+        return [_NULL if nulls[i] else header + big_endian[i].tobytes() for i in range(len(array))]
+
+    if kind == KIND_TIMESTAMP:
+        array = array.cast(pa.int64())
+    values = array.to_pylist()
+
+    if kind in (KIND_INT, KIND_TIMESTAMP):
+        return [_NULL if v is None else struct.pack(">iq", 8, v) for v in values]
+    if kind == KIND_FLOAT:
+        return [_NULL if v is None else struct.pack(">id", 8, v) for v in values]
+    if kind == KIND_BOOL:
+        return [_NULL if v is None else struct.pack(">i?", 1, v) for v in values]
+
+    encoded = []
+    for value in values:
+        if value is None:
+            encoded.append(_NULL)
+        else:
+            data = (json.dumps(value) if kind == KIND_LIST else value).encode("utf-8")
+            encoded.append(struct.pack(">i", len(data)) + data)
+    return encoded
+
+
+class _ChunkReader:
+    """Exact-size reads over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+        self._pos = 0
+
+    def read(self, size: int) -> bytes:
+        while len(self._buffer) - self._pos < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                raise SnapshotError("Truncated COPY stream")
+            if self._pos > (1 << 20):
+                del self._buffer[:self._pos]
+                self._pos = 0
+            self._buffer += chunk
+        data = bytes(self._buffer[self._pos:self._pos + size])
+        self._pos += size
+        return data
+
+
+def decode_copy_binary(chunks: Iterable[bytes], columns: List[SnapshotColumn]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Parse a binary COPY stream produced by the export query into row tuples.
+
+    Vectors come back as float32 numpy arrays, timestamps as microseconds,
+    lists as Python lists.
+    """
+    reader = _ChunkReader(chunks)
+    if reader.read(len(_COPY_SIGNATURE)) != _COPY_SIGNATURE:
+        raise SnapshotError("Not a binary COPY stream")
+    _flags, extension_length = struct.unpack(">ii", reader.read(8))
+    reader.read(extension_length)
+
+    decoders = [_FIELD_DECODERS[c.kind] for c in columns]
+    while True:
+        (field_count,) = struct.unpack(">h", reader.read(2))
+        if field_count == -1:
+            return
+        if field_count != len(columns):
+            raise SnapshotError(f"Expected {len(columns)} fields, got {field_count}")
+
+        row = []
+        for decode in decoders:
+            (length,) = struct.unpack(">i", reader.read(4))
+            row.append(None if length == -1 else decode(reader.read(length)))
+        yield tuple(row)
+
+
+_FIELD_DECODERS = {
+    KIND_TEXT: lambda b: b.decode("utf-8"),
+    KIND_INT: lambda b: struct.unpack(">q", b)[0],
+    KIND_TIMESTAMP: lambda b: struct.unpack(">q", b)[0],
+    KIND_FLOAT: lambda b: struct.unpack(">d", b)[0],
+    KIND_BOOL: lambda b: b != b"\x00",
+    KIND_LIST: lambda b: json.loads(b.decode("utf-8")),
+    KIND_VECTOR: lambda b: np.frombuffer(b, dtype=">f4", offset=4).astype(np.float32),
+}
+
+
+# ============================================================================
+# PostgreSQL export
+# ============================================================================
+
+_COLUMNS_QUERY = """
+    SELECT a.attname, format_type(a.atttypid, a.atttypmod), t.typname, t.typcategory
+    FROM pg_attribute a
+    JOIN pg_type t ON t.oid = a.atttypid
+    WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+    ORDER BY a.attnum
+"""
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_kind(typname: str, category: str) -> Tuple[str, Optional[str]]:
+    """Map a PostgreSQL type to (kind, item_kind)."""
+    if typname == "vector":
+        return KIND_VECTOR, None
+    if category == "A":
+        element = typname.lstrip("_")
+        if element in ("int2", "int4", "int8"):
+            return KIND_LIST, KIND_INT
+        if element in ("float4", "float8", "numeric"):
+            return KIND_LIST, KIND_FLOAT
+        return KIND_LIST, KIND_TEXT
+    if typname in ("int2", "int4", "int8"):
+        return KIND_INT, None
+    if typname in ("float4", "float8", "numeric"):
+        return KIND_FLOAT, None
+    if typname == "bool":
+        return KIND_BOOL, None
+    if typname in ("timestamp", "timestamptz", "date"):
+        return KIND_TIMESTAMP, None
+    return KIND_TEXT, None
+
+
+def postgres_columns(connection, table: str = DEFAULT_TABLE) -> List[SnapshotColumn]:
+    """Describe a PostgreSQL table as snapshot columns."""
+    with connection.cursor() as cur:
+        cur.execute(_COLUMNS_QUERY, (table,))
+        rows = cur.fetchall()
+        if not rows:
+            raise SnapshotError(f"Table not found or has no columns: {table}")
+
+        columns = []
+        for name, pg_type, typname, category in rows:
+            kind, item_kind = _column_kind(typname, category)
+            dim = None
+            if kind == KIND_VECTOR:
+                match = re.search(r"\((\d+)\)", pg_type)
+                if match:
+                    dim = int(match.group(1))
+                else:
+                    # Untyped vector column: take the dimension from the data
+                    cur.execute(
+                        f"SELECT vector_dims({_quote(name)}) FROM {table} "
+                        f"WHERE {_quote(name)} IS NOT NULL LIMIT 1"
+                    )
+                    found = cur.fetchone()
+                    dim = found[0] if found else 1
+            columns.append(SnapshotColumn(name, kind, pg_type=pg_type, item_kind=item_kind, dim=dim))
+        return columns
+
+
+def _export_expression(column: SnapshotColumn) -> str:
+    name = _quote(column.name)
+    if column.kind == KIND_TEXT:
+        return f"{name}::text"
+    if column.kind == KIND_INT:
+        return f"{name}::int8"
+    if column.kind == KIND_FLOAT:
+        return f"{name}::float8"
+    if column.kind == KIND_TIMESTAMP:
+        return f"(extract(epoch from {name}) * 1000000)::int8"
+    if column.kind == KIND_LIST:
+        return f"array_to_json({name})::text"
+    return name
+
+
+def _copy_out(cursor, sql: str) -> Iterator[bytes]:
+    """Stream COPY ... TO STDOUT (psycopg 3, or psycopg2 via a spooled file)."""
+    if hasattr(cursor, "copy"):
+        with cursor.copy(sql) as copy:
+            for data in copy:
+                yield bytes(data)
+    else:
+        import tempfile
+
+        with tempfile.SpooledTemporaryFile(max_size=64 << 20) as buffer:
+            cursor.copy_expert(sql, buffer)
+            buffer.seek(0)
+            yield from iter(lambda: buffer.read(1 << 20), b"")
+
+
+def _copy_in(cursor, sql: str, data: bytes) -> None:
+    """Send a COPY ... FROM STDIN payload (psycopg 3 or psycopg2)."""
+    if hasattr(cursor, "copy"):
+        with cursor.copy(sql) as copy:
+            copy.write(data)
+    else:
+        cursor.copy_expert(sql, io.BytesIO(data))
+
+
+def export_postgres(
+    connection,
+    directory,
+    table: str = DEFAULT_TABLE,
+    partition_column: Optional[str] = DEFAULT_PARTITION_COLUMN,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> SnapshotManifest:
+    """
+    Export a PostgreSQL table to a snapshot directory via binary COPY.
+
+    Args:
+        connection: psycopg (3 or 2) connection
+        directory: Output directory
+        table: Table to export
+        partition_column: Column to partition files by (vendor)
+        row_group_size: Rows per Parquet row group
+
+    Returns:
+        The written manifest
+    """
+    _require_arrow()
+    start = time.time()
+    columns = postgres_columns(connection, table)
+    writer = SnapshotWriter(directory, columns, table=table, partition_column=partition_column,
+                            row_group_size=row_group_size)
+
+    select = ", ".join(_export_expression(c) for c in columns)
+    sql = f"COPY (SELECT {select} FROM {table}) TO STDOUT (FORMAT BINARY)"
+
+    with connection.cursor() as cur:
+        cur.execute("SET TIME ZONE 'UTC'")
+        writer.write(decode_copy_binary(_copy_out(cur, sql), columns))
+    connection.rollback()  # read-only; end the transaction
+
+    manifest = writer.close()
+    logger.info(f"Exported {manifest.total_rows} rows from {table} in {time.time() - start:.1f}s")
+    return manifest
+
+
+# ============================================================================
+# Import targets
+# ============================================================================
+
+class PostgresTarget:
+    """
+    Load snapshots into PostgreSQL with binary COPY.
+
+    Each row group is COPY'd into a temp staging table (ON COMMIT DELETE
+    ROWS) and upserted into the target table by key, in one transaction.
+    Columns the target doesn't have are skipped; values are cast to the
+    target's column types (uuid, jsonb, vector(n), text[], ...).
+    """
+
+    def __init__(self, connection, table: str = DEFAULT_TABLE, key: Optional[str] = DEFAULT_KEY,
+                 name: Optional[str] = None, release=None):
+        """
+        Args:
+            connection: psycopg (3 or 2) connection
+            table: Target table
+            key: Upsert key (None = plain INSERT)
+            name: Identifies this target in the resume progress file
+            release: Called with no arguments on close() (return conn to pool)
+        """
+        self.connection = connection
+        self.table = table
+        self.key = key
+        self.name = name or f"postgres:{table}"
+        self._release = release
+        self._columns: List[SnapshotColumn] = []
+        self._copy_sql = ""
+        self._insert_sql = ""
+
+    @classmethod
+    def from_manager(cls, db=None, provider: Optional[str] = None, **kwargs) -> "PostgresTarget":
+        """Borrow a connection from DatabaseManager (primary provider by default)."""
+        if db is None:
+            from agent_factory.core.database_manager import DatabaseManager
+            db = DatabaseManager()
+        backend = db.providers[provider or db.primary_provider]
+        conn = backend.get_connection()
+        return cls(conn, name=f"postgres:{backend.name}", release=lambda: backend.release_connection(conn), **kwargs)
+
+    def prepare(self, manifest: SnapshotManifest) -> None:
+        with self.connection.cursor() as cur:
+            cur.execute(_COLUMNS_QUERY, (self.table,))
+            target_types = {name: pg_type for name, pg_type, _typname, _category in cur.fetchall()}
+            if not target_types:
+                raise SnapshotError(f"Target table not found: {self.table}")
+
+            self._columns = [c for c in manifest.columns if c.name in target_types]
+            skipped = [c.name for c in manifest.columns if c.name not in target_types]
+            if skipped:
+                logger.warning(f"Target {self.table} lacks columns {skipped}; they won't be loaded")
+
+            stage_columns = []
+            select = []
+            for column in self._columns:
+                name = _quote(column.name)
+                target_type = target_types[column.name]
+                if column.kind == KIND_VECTOR:
+                    match = re.search(r"\((\d+)\)", target_type)
+                    if match and int(match.group(1)) != column.dim:
+                        raise SnapshotError(
+                            f"Column '{column.name}' is {column.dim}-dim in the snapshot, {target_type} in the target"
+                        )
+                    stage_columns.append(f"{name} {target_type}")
+                    select.append(name)
+                elif column.kind == KIND_TIMESTAMP:
+                    stage_columns.append(f"{name} int8")
+                    select.append(f"to_timestamp({name} / 1000000.0)::{target_type}")
+                elif column.kind == KIND_LIST:
+                    stage_columns.append(f"{name} text")
+                    select.append(
+                        f"CASE WHEN {name} IS NULL THEN NULL "
+                        f"ELSE ARRAY(SELECT json_array_elements_text({name}::json))::{target_type} END"
+                    )
+                else:
+                    stage_type = {KIND_INT: "int8", KIND_FLOAT: "float8", KIND_BOOL: "bool"}.get(column.kind, "text")
+                    stage_columns.append(f"{name} {stage_type}")
+                    select.append(f"{name}::{target_type}")
+
+            cur.execute("SET TIME ZONE 'UTC'")
+            cur.execute(f"DROP TABLE IF EXISTS {_STAGE_TABLE}")
+            cur.execute(f"CREATE TEMP TABLE {_STAGE_TABLE} ({', '.join(stage_columns)}) ON COMMIT DELETE ROWS")
+        self.connection.commit()
+
+        names = ", ".join(_quote(c.name) for c in self._columns)
+        self._copy_sql = f"COPY {_STAGE_TABLE} ({names}) FROM STDIN (FORMAT BINARY)"
+        self._insert_sql = f"INSERT INTO {self.table} ({names}) SELECT {', '.join(select)} FROM {_STAGE_TABLE}"
+        if self.key and self.key in {c.name for c in self._columns}:
+            updates = ", ".join(f"{_quote(c.name)} = EXCLUDED.{_quote(c.name)}"
+                                for c in self._columns if c.name != self.key)
+            self._insert_sql += f" ON CONFLICT ({_quote(self.key)}) DO UPDATE SET {updates}"
+
+    def load(self, table) -> int:
+        data = encode_copy_binary(table, self._columns)
+        try:
+            with self.connection.cursor() as cur:
+                _copy_in(cur, self._copy_sql, data)
+                cur.execute(self._insert_sql)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        return table.num_rows
+
+    def close(self) -> None:
+        if self._release:
+            self._release()
+            self._release = None
+
+
+_SQLITE_TYPES = {
+    KIND_TEXT: "TEXT",
+    KIND_INT: "INTEGER",
+    KIND_FLOAT: "REAL",
+    KIND_BOOL: "INTEGER",
+    KIND_TIMESTAMP: "TEXT",
+    KIND_LIST: "TEXT",
+    KIND_VECTOR: "BLOB",
+}
+
+
+def decode_embedding(blob: Optional[bytes]):
+    """Embedding BLOB written by SQLiteTarget -> float32 numpy array."""
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype="<f4")
+
+
+class SQLiteTarget:
+    """
+    Load snapshots into SQLite (e.g. the local provider's data/local.db).
+
+    The table is created from the snapshot columns if needed. Embeddings
+    are stored as little-endian float32 BLOBs (see decode_embedding), lists
+    as JSON text, timestamps as ISO-8601 text.
+    """
+
+    def __init__(self, db_path="data/local.db", table: Optional[str] = None, key: Optional[str] = DEFAULT_KEY):
+        """
+        Args:
+            db_path: SQLite database file
+            table: Target table (default: the snapshot's table)
+            key: Upsert key (unique index created if missing; None = plain INSERT)
+        """
+        self.db_path = Path(db_path)
+        self.table = table
+        self.key = key
+        self.name = f"sqlite:{self.db_path.resolve()}"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._columns: List[SnapshotColumn] = []
+        self._insert_sql = ""
+
+    def prepare(self, manifest: SnapshotManifest) -> None:
+        self.table = self.table or manifest.table
+        self._columns = manifest.columns
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        definitions = ", ".join(f"{_quote(c.name)} {_SQLITE_TYPES[c.kind]}" for c in self._columns)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(self.table)} ({definitions})")
+
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({_quote(self.table)})")}
+        for column in self._columns:
+            if column.name not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(column.name)} {_SQLITE_TYPES[column.kind]}"
+                )
+
+        names = [c.name for c in self._columns]
+        self._insert_sql = (
+            f"INSERT INTO {_quote(self.table)} ({', '.join(_quote(n) for n in names)}) "
+            f"VALUES ({', '.join('?' for _ in names)})"
+        )
+        if self.key and self.key in names:
+            self._conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'idx_{self.table}_{self.key}')} "
+                f"ON {_quote(self.table)} ({_quote(self.key)})"
+            )
+            updates = ", ".join(f"{_quote(n)} = excluded.{_quote(n)}" for n in names if n != self.key)
+            self._insert_sql += f" ON CONFLICT ({_quote(self.key)}) DO UPDATE SET {updates}"
+        self._conn.commit()
+
+    def load(self, table) -> int:
+        columns = []
+        for column in self._columns:
+            array = table.column(column.name).combine_chunks()
+            if column.kind == KIND_VECTOR:
+                little_endian = _vector_matrix(array, column.dim).astype("<f4")
+                nulls = array.is_null().to_numpy(zero_copy_only=False)
+                columns.append([None if nulls[i] else little_endian[i].tobytes() for i in range(len(array))])
+            elif column.kind == KIND_TIMESTAMP:
+                columns.append([v.isoformat() if v is not None else None for v in array.to_pylist()])
+            elif column.kind == KIND_LIST:
+                columns.append([json.dumps(v) if v is not None else None for v in array.to_pylist()])
+            else:
+                columns.append(array.to_pylist())
+
+        with self._conn:
+            self._conn.executemany(self._insert_sql, zip(*columns, strict=True))
+        return table.num_rows
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ============================================================================
+# Loading snapshots
+# ============================================================================
+
+@dataclass
+class LoadReport:
+    """Outcome of load_snapshot()."""
+    rows_loaded: int = 0
+    rows_skipped: int = 0  # already loaded by an earlier (interrupted) run
+    row_groups: int = 0
+    partitions: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_loaded / self.seconds if self.seconds else 0.0
+
+
+def _progress_path(directory: Path, target_name: str) -> Path:
+    digest = hashlib.sha256(target_name.encode()).hexdigest()[:12]
+    return directory / f".load-progress-{digest}.json"
+
+
+def load_snapshot(
+    directory,
+    target,
+    verify: bool = True,
+    resume: bool = True,
+    partitions: Optional[Iterable[str]] = None,
+    progress_path=None,
+) -> LoadReport:
+    """
+    Load a snapshot into a target, one row group per transaction.
+
+    Args:
+        directory: Snapshot directory
+        target: PostgresTarget or SQLiteTarget
+        verify: Check partition checksums before loading anything
+        resume: Skip row groups an earlier run already committed to this target
+        partitions: Only load these partition keys (e.g. ["siemens"])
+        progress_path: Where to record progress (default: inside the snapshot)
+
+    Returns:
+        LoadReport
+
+    Raises:
+        ChecksumError: If verify is set and a partition doesn't match
+    """
+    _require_arrow()
+    start = time.time()
+    directory = Path(directory)
+    manifest = verify_snapshot(directory) if verify else read_manifest(directory)
+    progress_path = Path(progress_path) if progress_path else _progress_path(directory, target.name)
+
+    progress = {"snapshot_id": manifest.snapshot_id, "target": target.name, "row_groups": {}}
+    if resume and progress_path.exists():
+        try:
+            saved = json.loads(progress_path.read_text(encoding="utf-8"))
+            if saved.get("snapshot_id") == manifest.snapshot_id:
+                progress = saved
+        except ValueError:
+            logger.warning(f"Ignoring unreadable load progress file {progress_path}")
+
+    wanted = set(partitions) if partitions is not None else None
+    report = LoadReport()
+
+    target.prepare(manifest)
+    try:
+        for part in manifest.partitions:
+            if wanted is not None and part.key not in wanted:
+                continue
+            report.partitions += 1
+
+            parquet = pq.ParquetFile(str(directory / part.path))
+            done = progress["row_groups"].get(part.path, 0)
+            for group in range(parquet.num_row_groups):
+                if group < done:
+                    report.rows_skipped += parquet.metadata.row_group(group).num_rows
+                    continue
+
+                report.rows_loaded += target.load(parquet.read_row_group(group))
+                report.row_groups += 1
+
+                progress["row_groups"][part.path] = group + 1
+                tmp_path = progress_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(progress), encoding="utf-8")
+                os.replace(tmp_path, progress_path)
+    finally:
+        target.close()
+
+    report.seconds = time.time() - start
+    logger.info(
+        f"Loaded {report.rows_loaded} rows ({report.rows_skipped} already present) into "
+        f"{target.name} in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+    return report
@@ -0,0 +1,1120 @@
+"""
+Local Knowledge Mirror - SQLite Copy of the KB for Bot Lookups
+
+Every /kb_search, manual lookup and "my machines" listing used to be a
+network round trip to Neon/Supabase/VPS - tens to hundreds of milliseconds
+on a good day, and a hard failure when all providers are down. The mirror
+keeps a local SQLite file with the same rows:
+
+    knowledge_atoms     FTS5 over title/summary/content/keywords,
+                        embeddings as little-endian float32 BLOBs
+    equipment_manuals   FTS5 over title/manufacturer/component_family
+    user_machines       fallback copy (reads stay remote for read-your-writes)
+
+Each table is pulled incrementally with keyset pagination on
+(updated_at, key) - see migrations/011_mirror_sync_columns.sql - and a
+watermark per table in mirror_state. Every pull starts a few minutes
+before the watermark (sync_overlap_seconds), so rows from transactions that
+committed after a later row was pulled are not skipped. Rows with
+deleted_at set (tombstones) are removed. Hard deletes are picked up by an
+occasional full resync.
+
+One mirror file holds one remote database: the VPS KB and the primary
+provider have different rows and different embedding models, so each gets
+its own file (mirror_path(source)), and a mirror refuses rows from another
+source. The embedding model of the mirrored vectors is recorded at sync
+time; semantic_search() raises MirrorMiss for query vectors from another
+model or dimension.
+
+Reads go through read_through(): serve from the mirror while it is fresh,
+otherwise ask the remote and fall back to the (stale) mirror if the remote
+fails. A local miss (MirrorMiss or an empty result) goes to the remote.
+status() reports row counts and staleness per table.
+
+Usage:
+    from agent_factory.knowledge.local_mirror import LocalMirror, PostgresMirrorSource, mirror_path
+
+    mirror = LocalMirror(mirror_path("neon"), source="neon")
+    mirror.sync(PostgresMirrorSource.from_manager(provider="neon"))
+    atoms = mirror.search_text("knowledge_atoms", "powerflex f004", limit=5)
+
+CLI:
+    poetry run python scripts/kb_mirror.py sync [--source vps]
+    poetry run python scripts/kb_mirror.py status
+
+numpy is optional (speeds up semantic_search); everything else is stdlib.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_DB_PATH = "data/kb_mirror.db"
+DEFAULT_MIRROR_DIR = "data"
+DEFAULT_MAX_STALENESS_SECONDS = 900.0
+DEFAULT_SYNC_OVERLAP_SECONDS = 300.0
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ============================================================================
+# Table specs
+# ============================================================================
+
+@dataclass(frozen=True)
+class MirrorTable:
+    """
+    How one remote table is mirrored.
+
+    The full remote row is kept as JSON in `data`; text_columns are copied
+    into real columns for the FTS5 index and filter_columns for indexed
+    equality filters.
+    """
+    name: str
+    key: str
+    text_columns: Tuple[str, ...] = ()
+    filter_columns: Tuple[str, ...] = ()
+    embedding_column: Optional[str] = None
+    updated_column: str = "updated_at"
+    deleted_column: Optional[str] = None
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Local columns besides key/updated_at/data/embedding (deduplicated, ordered)."""
+        seen = {self.key, "updated_at", "data", "embedding"}
+        columns = []
+        for column in self.text_columns + self.filter_columns:
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+        return tuple(columns)
+
+    @property
+    def signature(self) -> str:
+        """Changes whenever the local layout changes (forces a rebuild)."""
+        payload = json.dumps([self.key, self.text_columns, self.filter_columns, self.embedding_column])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+ATOMS = MirrorTable(
+    name="knowledge_atoms",
+    key="atom_id",
+    text_columns=("title", "summary", "content", "keywords"),
+    filter_columns=("vendor", "manufacturer", "atom_type", "type", "equipment_type"),
+    embedding_column="embedding",
+    deleted_column="deleted_at",
+)
+
+MANUALS = MirrorTable(
+    name="equipment_manuals",
+    key="id",
+    text_columns=("title", "manufacturer", "component_family"),
+    filter_columns=("indexed",),
+)
+
+MACHINES = MirrorTable(
+    name="user_machines",
+    key="id",
+    filter_columns=("user_id", "nickname"),
+)
+
+DEFAULT_TABLES: Tuple[MirrorTable, ...] = (ATOMS, MANUALS, MACHINES)
+
+
+# ============================================================================
+# Value conversion
+# ============================================================================
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _iso(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _scalar(value: Any) -> Optional[str]:
+    """Filter column value (bools as "1"/"0", everything else as text)."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value)
+
+
+def _text(value: Any) -> Optional[str]:
+    """FTS column value (lists flattened to space-separated text)."""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value if v is not None)
+    return str(value)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return None
+    return str(value)
+
+
+def parse_embedding(value: Any) -> Optional[array]:
+    """pgvector text ("[0.1,0.2]"), list or numpy array -> float32 array."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip().strip("[]")
+        if not value:
+            return None
+        value = [float(v) for v in value.split(",")]
+    try:
+        vector = array("f", (float(v) for v in value))
+    except (TypeError, ValueError):
+        return None
+    return vector if len(vector) else None
+
+
+def encode_embedding(value: Any) -> Optional[bytes]:
+    """Embedding -> little-endian float32 BLOB (same layout as kb_snapshot)."""
+    vector = parse_embedding(value)
+    if vector is None:
+        return None
+    if array("H", [1]).tobytes() != b"\x01\x00":
+        vector.byteswap()
+    return vector.tobytes()
+
+
+def decode_embedding(blob: Optional[bytes]) -> Optional[array]:
+    """Little-endian float32 BLOB -> float32 array."""
+    if blob is None:
+        return None
+    vector = array("f")
+    vector.frombytes(blob)
+    if array("H", [1]).tobytes() != b"\x01\x00":
+        vector.byteswap()
+    return vector
+
+
+def fts_query(text: str, columns: Optional[Sequence[str]] = None) -> str:
+    """
+    User text -> FTS5 query matching any token (tokens quoted, so no syntax errors).
+
+    columns restricts the match to those FTS columns.
+    """
+    tokens = dict.fromkeys(t.lower() for t in _TOKEN_RE.findall(text))
+    match = " OR ".join(f'"{token}"' for token in tokens)
+    if match and columns:
+        return "{" + " ".join(_quote(c) for c in columns) + "} : (" + match + ")"
+    return match
+
+
+def _overlap(watermark: Optional[str], seconds: float) -> Optional[Tuple[str, str]]:
+    """
+    Keyset start for an incremental pull: `seconds` before the watermark.
+
+    updated_at is stamped before commit, so a transaction can commit rows
+    older than the newest row already pulled. Re-reading a window behind
+    the watermark picks those up (re-pulled rows are idempotent upserts).
+    Watermarks that aren't timestamps are used as-is.
+    """
+    if watermark is None:
+        return None
+    if seconds <= 0:
+        return None
+    try:
+        moment = datetime.fromisoformat(watermark)
+    except ValueError:
+        return None
+    return (moment - timedelta(seconds=seconds)).isoformat(), ""
+
+
+class MirrorMiss(LookupError):
+    """The mirror cannot answer this read (e.g. the query embedding comes from another model)."""
+
+
+class MirrorSourceError(ValueError):
+    """Rows from one remote database were about to land in another database's mirror."""
+
+
+# ============================================================================
+# Remote source
+# ============================================================================
+
+class PostgresMirrorSource:
+    """
+    Pulls changed rows from PostgreSQL with keyset pagination.
+
+    Works with anything that hands out psycopg2 connections: a
+    DatabaseManager provider or the VPS KB client's pool. `name` identifies
+    the database (one mirror file per name) and `embedding_model` the model
+    that produced its knowledge_atoms embeddings.
+    """
+
+    def __init__(
+        self,
+        get_connection: Callable[[], Any],
+        release_connection: Optional[Callable[[Any], None]] = None,
+        name: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+    ):
+        self._get_connection = get_connection
+        self._release_connection = release_connection
+        self.name = name
+        self.embedding_model = embedding_model
+
+    @classmethod
+    def from_manager(
+        cls,
+        db_manager=None,
+        provider: Optional[str] = None,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    ) -> "PostgresMirrorSource":
+        """Source backed by a DatabaseManager provider (default: primary)."""
+        if db_manager is None:
+            from agent_factory.core.database_manager import DatabaseManager
+            db_manager = DatabaseManager()
+        name = provider or db_manager.primary_provider
+        backend = db_manager.providers[name]
+        return cls(backend.get_connection, backend.release_connection, name=name, embedding_model=embedding_model)
+
+    @classmethod
+    def from_vps_client(cls, client) -> "PostgresMirrorSource":
+        """Source backed by a VPSKBClient connection pool."""
+        return cls(
+            client._get_connection,
+            client._return_connection,
+            name="vps",
+            embedding_model=client.EMBEDDING_MODEL,
+        )
+
+    def fetch_changes(
+        self,
+        table: MirrorTable,
+        since: Optional[Tuple[str, str]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Rows with (updated_at, key) > since, oldest first."""
+        from psycopg2.extras import RealDictCursor
+
+        updated, key = _quote(table.updated_column), _quote(table.key)
+        sql = f"SELECT * FROM {_quote(table.name)}"
+        params: List[Any] = []
+        if since is not None:
+            sql += f" WHERE ({updated}, {key}::text) > (%s, %s)"
+            params.extend(since)
+        sql += f" ORDER BY {updated}, {key}::text LIMIT %s"
+        params.append(limit)
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(sql, params)
+                rows = [dict(row) for row in cur.fetchall()]
+            conn.commit()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if self._release_connection is not None:
+                self._release_connection(conn)
+
+
+# ============================================================================
+# Mirror
+# ============================================================================
+
+@dataclass
+class SyncResult:
+    """Outcome of one table sync."""
+    table: str
+    upserted: int = 0
+    deleted: int = 0
+    full: bool = False
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class MirrorMetrics:
+    """Where reads were served from."""
+    local_reads: int = 0
+    local_misses: int = 0
+    remote_reads: int = 0
+    fallback_reads: int = 0
+    failed_reads: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "local_reads": self.local_reads,
+            "local_misses": self.local_misses,
+            "remote_reads": self.remote_reads,
+            "fallback_reads": self.fallback_reads,
+            "failed_reads": self.failed_reads,
+        }
+
+
+@dataclass
+class _VectorIndex:
+    generation: int
+    keys: List[str] = field(default_factory=list)
+    vectors: Any = None  # numpy matrix (unit rows) or list of (array, norm)
+
+
+class LocalMirror:
+    """
+    SQLite mirror of the remote knowledge tables.
+
+    Safe to share between threads: each thread gets its own connection,
+    the file runs in WAL mode so reads never wait on a sync.
+    """
+
+    def __init__(
+        self,
+        db_path=DEFAULT_DB_PATH,
+        tables: Sequence[MirrorTable] = DEFAULT_TABLES,
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+        source: Optional[str] = None,
+        sync_overlap_seconds: float = DEFAULT_SYNC_OVERLAP_SECONDS,
+    ):
+        """
+        Args:
+            db_path: Mirror file (created if missing)
+            tables: Tables to mirror
+            max_staleness_seconds: How old the last successful sync may be
+                before reads go to the remote first
+            source: Remote database this file mirrors (recorded on first
+                use; syncing another source raises MirrorSourceError)
+            sync_overlap_seconds: How far behind the watermark each
+                incremental pull starts (longer than the slowest writing
+                transaction)
+        """
+        self.db_path = Path(db_path)
+        self.tables: Dict[str, MirrorTable] = {t.name: t for t in tables}
+        self.max_staleness_seconds = max_staleness_seconds
+        self.sync_overlap_seconds = sync_overlap_seconds
+        self.metrics = MirrorMetrics()
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._vector_lock = threading.Lock()
+        self._vector_index: Dict[str, _VectorIndex] = {}
+        self._stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+        self.source = self._claim_source(source)
+
+    # ------------------------------------------------------------------
+    # Connection / schema
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS mirror_state (
+                    table_name TEXT PRIMARY KEY,
+                    signature TEXT,
+                    watermark TEXT,
+                    watermark_key TEXT,
+                    last_sync_at REAL,
+                    last_full_sync_at REAL,
+                    last_attempt_at REAL,
+                    last_error TEXT,
+                    generation INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS mirror_meta (key TEXT PRIMARY KEY, value TEXT)")
+            for table in self.tables.values():
+                row = conn.execute(
+                    "SELECT signature FROM mirror_state WHERE table_name = ?", (table.name,)
+                ).fetchone()
+                if row is not None and row["signature"] != table.signature:
+                    logger.info(f"Mirror layout for {table.name} changed, rebuilding")
+                    conn.execute(f"DROP TABLE IF EXISTS {_quote(table.name + '_fts')}")
+                    conn.execute(f"DROP TABLE IF EXISTS {_quote(table.name)}")
+                    conn.execute("DELETE FROM mirror_state WHERE table_name = ?", (table.name,))
+                self._create_table(conn, table)
+                conn.execute(
+                    "INSERT OR IGNORE INTO mirror_state (table_name, signature) VALUES (?, ?)",
+                    (table.name, table.signature),
+                )
+
+    def _create_table(self, conn: sqlite3.Connection, table: MirrorTable) -> None:
+        name = _quote(table.name)
+        columns = "".join(f", {_quote(c)} TEXT COLLATE NOCASE" for c in table.columns)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} ("
+            f"{_quote(table.key)} TEXT PRIMARY KEY, updated_at TEXT{columns}, "
+            f"data TEXT NOT NULL, embedding BLOB)"
+        )
+        for column in table.filter_columns:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table.name}_{column}')} ON {name} ({_quote(column)})"
+            )
+        if not table.text_columns:
+            return
+
+        fts = _quote(table.name + "_fts")
+        cols = ", ".join(_quote(c) for c in table.text_columns)
+        new = ", ".join(f"new.{_quote(c)}" for c in table.text_columns)
+        old = ", ".join(f"old.{_quote(c)}" for c in table.text_columns)
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content={name}, content_rowid='rowid', tokenize='porter unicode61')"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(table.name + '_ai')} AFTER INSERT ON {name} BEGIN "
+            f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.rowid, {new}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(table.name + '_ad')} AFTER DELETE ON {name} BEGIN "
+            f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {_quote(table.name + '_au')} AFTER UPDATE ON {name} BEGIN "
+            f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+            f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.rowid, {new}); END"
+        )
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Optional[str]) -> None:
+        conn.execute(
+            "INSERT INTO mirror_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _claim_source(self, source: Optional[str]) -> Optional[str]:
+        """Record which database this file mirrors; refuse a different one."""
+        recorded = self._meta("source")
+        if source is None or source == recorded:
+            return recorded
+        if recorded is not None:
+            raise MirrorSourceError(
+                f"Mirror {self.db_path} holds '{recorded}', not '{source}' (use mirror_path('{source}'))"
+            )
+        conn = self._connection()
+        with conn:
+            self._set_meta(conn, "source", source)
+        return source
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Model that produced the mirrored embeddings (None if never recorded)."""
+        return self._meta("embedding_model")
+
+    def _table(self, name: str) -> MirrorTable:
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise KeyError(f"Table '{name}' is not mirrored. Mirrored: {list(self.tables)}") from None
+
+    def close(self) -> None:
+        """Stop background sync and close this thread's connection."""
+        self.stop_background_sync()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _upsert_sql(self, table: MirrorTable) -> str:
+        names = [table.key, "updated_at", *table.columns, "data", "embedding"]
+        updates = ", ".join(f"{_quote(n)} = excluded.{_quote(n)}" for n in names[1:])
+        return (
+            f"INSERT INTO {_quote(table.name)} ({', '.join(_quote(n) for n in names)}) "
+            f"VALUES ({', '.join('?' for _ in names)}) "
+            f"ON CONFLICT ({_quote(table.key)}) DO UPDATE SET {updates}"
+        )
+
+    def _row_values(self, table: MirrorTable, row: Dict[str, Any]) -> Tuple[Any, ...]:
+        data = {k: v for k, v in row.items() if k != table.embedding_column}
+        values: List[Any] = [str(row[table.key]), _iso(row.get(table.updated_column))]
+        for column in table.columns:
+            value = row.get(column)
+            values.append(_text(value) if column in table.text_columns else _scalar(value))
+        values.append(json.dumps(data, default=_json_default))
+        values.append(encode_embedding(row.get(table.embedding_column)) if table.embedding_column else None)
+        return tuple(values)
+
+    def sync_table(
+        self,
+        table: str,
+        source,
+        full: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> SyncResult:
+        """
+        Pull changes for one table.
+
+        Each page is committed with its watermark, so an interrupted sync
+        resumes where it stopped. Incremental pulls start
+        sync_overlap_seconds before the watermark. full=True re-reads
+        everything and drops local rows the remote no longer has (hard
+        deletes); it is forced when the source's embedding model changed.
+
+        Raises:
+            MirrorSourceError: If the source is another database
+            Whatever the source raises (recorded in mirror_state.last_error)
+        """
+        spec = self._table(table)
+        source_name = getattr(source, "name", None)
+        if source_name is not None:
+            self.source = self._claim_source(source_name)
+        model = getattr(source, "embedding_model", None) if spec.embedding_column else None
+        if model is not None and self.embedding_model not in (None, model):
+            logger.info(f"Embedding model changed ({self.embedding_model} -> {model}), full resync of {spec.name}")
+            full = True
+
+        result = SyncResult(table=spec.name, full=full)
+        start = time.perf_counter()
+        conn = self._connection()
+        name, key = _quote(spec.name), _quote(spec.key)
+        upsert_sql = self._upsert_sql(spec)
+
+        with self._sync_lock:
+            state = conn.execute("SELECT * FROM mirror_state WHERE table_name = ?", (spec.name,)).fetchone()
+            since = None
+            if not full and state["watermark"] is not None:
+                since = _overlap(state["watermark"], self.sync_overlap_seconds) or (
+                    state["watermark"], state["watermark_key"]
+                )
+            if full:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS mirror_seen (k TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM mirror_seen")
+
+            try:
+                while True:
+                    rows = source.fetch_changes(spec, since, batch_size)
+                    if not rows:
+                        break
+                    with conn:
+                        for row in rows:
+                            row_key = str(row[spec.key])
+                            if spec.deleted_column and row.get(spec.deleted_column) is not None:
+                                cursor = conn.execute(f"DELETE FROM {name} WHERE {key} = ?", (row_key,))
+                                result.deleted += cursor.rowcount
+                            else:
+                                conn.execute(upsert_sql, self._row_values(spec, row))
+                                result.upserted += 1
+                                if full:
+                                    conn.execute("INSERT OR IGNORE INTO mirror_seen (k) VALUES (?)", (row_key,))
+                        last = rows[-1]
+                        since = (_iso(last.get(spec.updated_column)) or (since[0] if since else ""), str(last[spec.key]))
+                        conn.execute(
+                            "UPDATE mirror_state SET watermark = ?, watermark_key = ?, "
+                            "generation = generation + 1 WHERE table_name = ?",
+                            (since[0], since[1], spec.name),
+                        )
+                    if len(rows) < batch_size:
+                        break
+
+                now = time.time()
+                with conn:
+                    if model is not None:
+                        self._set_meta(conn, "embedding_model", model)
+                    if full:
+                        cursor = conn.execute(f"DELETE FROM {name} WHERE {key} NOT IN (SELECT k FROM mirror_seen)")
+                        result.deleted += cursor.rowcount
+                        if cursor.rowcount:
+                            conn.execute(
+                                "UPDATE mirror_state SET generation = generation + 1 WHERE table_name = ?",
+                                (spec.name,),
+                            )
+                        conn.execute(
+                            "UPDATE mirror_state SET last_full_sync_at = ? WHERE table_name = ?", (now, spec.name)
+                        )
+                    conn.execute(
+                        "UPDATE mirror_state SET last_sync_at = ?, last_attempt_at = ?, last_error = NULL "
+                        "WHERE table_name = ?",
+                        (now, now, spec.name),
+                    )
+            except Exception as e:
+                result.error = str(e)
+                with conn:
+                    conn.execute(
+                        "UPDATE mirror_state SET last_attempt_at = ?, last_error = ? WHERE table_name = ?",
+                        (time.time(), str(e)[:500], spec.name),
+                    )
+                raise
+            finally:
+                result.seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Mirror sync {spec.name}: {result.upserted} upserted, {result.deleted} deleted "
+            f"in {result.seconds:.2f}s{' (full)' if full else ''}"
+        )
+        return result
+
+    def sync(
+        self,
+        source,
+        tables: Optional[Iterable[str]] = None,
+        full: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[SyncResult]:
+        """Sync several tables; a failing table is logged and doesn't stop the others."""
+        results = []
+        for name in tables or list(self.tables):
+            try:
+                results.append(self.sync_table(name, source, full=full, batch_size=batch_size))
+            except Exception as e:
+                logger.error(f"Mirror sync of {name} failed: {e}")
+                results.append(SyncResult(table=name, full=full, error=str(e)))
+        return results
+
+    def start_background_sync(
+        self,
+        source,
+        interval_seconds: float = 300.0,
+        full_every_seconds: float = 24 * 3600.0,
+    ) -> None:
+        """Sync every `interval_seconds` in a daemon thread (full resync once per `full_every_seconds`)."""
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                for name in list(self.tables):
+                    last_full = self._state(name)["last_full_sync_at"]
+                    full = last_full is None or time.time() - last_full >= full_every_seconds
+                    try:
+                        self.sync_table(name, source, full=full)
+                    except Exception as e:
+                        logger.warning(f"Background mirror sync of {name} failed: {e}")
+                self._stop.wait(interval_seconds)
+
+        self._sync_thread = threading.Thread(target=loop, name="kb-mirror-sync", daemon=True)
+        self._sync_thread.start()
+
+    def stop_background_sync(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout)
+            self._sync_thread = None
+
+    # ------------------------------------------------------------------
+    # Staleness
+    # ------------------------------------------------------------------
+
+    def _state(self, table: str) -> sqlite3.Row:
+        return self._connection().execute("SELECT * FROM mirror_state WHERE table_name = ?", (table,)).fetchone()
+
+    def staleness(self, table: str) -> float:
+        """Seconds since the last successful sync (inf if never synced)."""
+        state = self._state(self._table(table).name)
+        if state is None or state["last_sync_at"] is None:
+            return math.inf
+        return max(0.0, time.time() - state["last_sync_at"])
+
+    def is_fresh(self, table: str) -> bool:
+        return self.staleness(table) <= self.max_staleness_seconds
+
+    def has_rows(self, table: str) -> bool:
+        spec = self._table(table)
+        return self._connection().execute(f"SELECT 1 FROM {_quote(spec.name)} LIMIT 1").fetchone() is not None
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-table rows, last sync, staleness and last error."""
+        conn = self._connection()
+        report = {}
+        for name, spec in self.tables.items():
+            state = self._state(name)
+            age = self.staleness(name)
+            report[name] = {
+                "rows": conn.execute(f"SELECT COUNT(*) FROM {_quote(spec.name)}").fetchone()[0],
+                "last_sync_at": (
+                    datetime.fromtimestamp(state["last_sync_at"]).isoformat() if state["last_sync_at"] else None
+                ),
+                "staleness_seconds": None if math.isinf(age) else round(age, 1),
+                "fresh": age <= self.max_staleness_seconds,
+                "watermark": state["watermark"],
+                "last_error": state["last_error"],
+            }
+        return report
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_through(
+        self,
+        table: str,
+        remote: Callable[[], T],
+        local: Callable[[], T],
+        prefer_local: bool = True,
+    ) -> T:
+        """
+        Serve a read from the mirror or the remote.
+
+        prefer_local=True: use the mirror while it is fresh, otherwise the
+        remote. prefer_local=False: always try the remote first (for data
+        the caller may have just written). A local answer that raises
+        MirrorMiss or comes back empty is not trusted; the remote is asked.
+        Either way, when the remote raises and the mirror can answer, the
+        mirror answers (possibly stale).
+        """
+        if prefer_local and self.is_fresh(table):
+            try:
+                result = local()
+            except MirrorMiss as e:
+                logger.debug(f"Mirror can't answer {table} read ({e}), asking remote")
+            else:
+                if result:
+                    self.metrics.local_reads += 1
+                    return result
+            self.metrics.local_misses += 1
+
+        try:
+            result = remote()
+            self.metrics.remote_reads += 1
+            return result
+        except Exception as e:
+            remote_error = e
+            if not self.has_rows(table):
+                self.metrics.failed_reads += 1
+                raise
+
+        try:
+            result = local()
+        except MirrorMiss:
+            self.metrics.failed_reads += 1
+            raise remote_error from None
+        age = self.staleness(table)
+        logger.warning(
+            f"Remote read of {table} failed ({remote_error}); serving mirror "
+            f"({'never synced' if math.isinf(age) else f'{age:.0f}s old'})"
+        )
+        self.metrics.fallback_reads += 1
+        return result
+
+    @staticmethod
+    def _where(spec: MirrorTable, filters: Optional[Dict[str, Any]], contains: Optional[Dict[str, str]], alias: str):
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            if column not in spec.columns and column != spec.key:
+                raise ValueError(f"{spec.name} has no mirrored column '{column}'")
+            clauses.append(f"{alias}.{_quote(column)} = ?")
+            params.append(_scalar(value))
+        for column, value in (contains or {}).items():
+            if column not in spec.columns:
+                raise ValueError(f"{spec.name} has no mirrored column '{column}'")
+            clauses.append(f"{alias}.{_quote(column)} LIKE ?")
+            params.append(f"%{value}%")
+        return clauses, params
+
+    def get(self, table: str, key: Any) -> Optional[Dict[str, Any]]:
+        """One row by primary key."""
+        spec = self._table(table)
+        row = self._connection().execute(
+            f"SELECT data FROM {_quote(spec.name)} WHERE {_quote(spec.key)} = ?", (str(key),)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def select(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        contains: Optional[Dict[str, str]] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows matching equality `filters` and substring `contains`
+        (case-insensitive, mirrored columns only).
+        """
+        spec = self._table(table)
+        clauses, params = self._where(spec, filters, contains, "t")
+        sql = f"SELECT t.data FROM {_quote(spec.name)} t"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            if order_by not in spec.columns and order_by not in (spec.key, "updated_at"):
+                raise ValueError(f"{spec.name} has no mirrored column '{order_by}'")
+            sql += f" ORDER BY t.{_quote(order_by)}{' DESC' if descending else ''}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row["data"]) for row in self._connection().execute(sql, params)]
+
+    def search_text(
+        self,
+        table: str,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        contains: Optional[Dict[str, str]] = None,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked full-text search (any query token matches, like a
+        Postgres to_tsquery 'a | b').
+
+        Rows carry a "rank" key (higher is better). `predicate` filters
+        the decoded rows for conditions the mirrored columns can't express.
+        `columns` limits the match to some text columns.
+        """
+        spec = self._table(table)
+        if not spec.text_columns:
+            raise ValueError(f"{spec.name} has no full-text index")
+        for column in columns or ():
+            if column not in spec.text_columns:
+                raise ValueError(f"{spec.name} has no full-text column '{column}'")
+        match = fts_query(query, columns)
+        if not match:
+            return []
+
+        fts = _quote(spec.name + "_fts")
+        clauses, params = self._where(spec, filters, contains, "t")
+        sql = (
+            f"SELECT t.data, bm25({fts}) AS score FROM {fts} "
+            f"JOIN {_quote(spec.name)} t ON t.rowid = {fts}.rowid "
+            f"WHERE {fts} MATCH ?"
+        )
+        if clauses:
+            sql += " AND " + " AND ".join(clauses)
+        sql += " ORDER BY score LIMIT ?"
+        fetch = limit * 5 if predicate else limit
+
+        results = []
+        for row in self._connection().execute(sql, [match, *params, fetch]):
+            item = json.loads(row["data"])
+            if predicate is not None and not predicate(item):
+                continue
+            item["rank"] = -row["score"]
+            results.append(item)
+            if len(results) >= limit:
+                break
+        return results
+
+    def search_substring(
+        self,
+        table: str,
+        text: Optional[str],
+        columns: Sequence[str] = (),
+        array_column: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "created_at",
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Local equivalent of the remote ILIKE keyword queries:
+
+            WHERE (col ILIKE '%text%' OR ... OR lower(text) = ANY(array_column))
+              AND <filters>
+            ORDER BY order_by DESC LIMIT limit
+
+        The whole text is one substring (no tokenizing), `order_by` is a
+        field of the remote row (NULLs first, as in Postgres). text=None
+        applies only the filters. SQLite's LIKE folds ASCII case only.
+        """
+        spec = self._table(table)
+        clauses, params = self._where(spec, filters, None, "t")
+        if text is not None:
+            any_of = []
+            for column in columns:
+                if column not in spec.columns:
+                    raise ValueError(f"{spec.name} has no mirrored column '{column}'")
+                any_of.append(f"t.{_quote(column)} LIKE ?")
+                params.append(f"%{text}%")
+            if array_column:
+                any_of.append("EXISTS (SELECT 1 FROM json_each(t.data, ?) e WHERE e.value = ?)")
+                params.extend([f"$.{array_column}", text.lower()])
+            if not any_of:
+                raise ValueError("search_substring needs columns or array_column")
+            clauses.append("(" + " OR ".join(any_of) + ")")
+
+        sql = f"SELECT t.data FROM {_quote(spec.name)} t"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY json_extract(t.data, ?) IS NULL DESC, json_extract(t.data, ?) DESC LIMIT ?"
+        params.extend([f"$.{order_by}", f"$.{order_by}", limit])
+        return [json.loads(row["data"]) for row in self._connection().execute(sql, params)]
+
+    def _vectors(self, spec: MirrorTable) -> _VectorIndex:
+        """Embeddings for a table, decoded once per sync generation."""
+        generation = self._state(spec.name)["generation"]
+        index = self._vector_index.get(spec.name)
+        if index is not None and index.generation == generation:
+            return index
+
+        with self._vector_lock:
+            index = self._vector_index.get(spec.name)
+            if index is not None and index.generation == generation:
+                return index
+            keys, vectors = [], []
+            for row in self._connection().execute(
+                f"SELECT {_quote(spec.key)} AS k, embedding FROM {_quote(spec.name)} WHERE embedding IS NOT NULL"
+            ):
+                keys.append(row["k"])
+                vectors.append(row["embedding"])
+
+            index = _VectorIndex(generation=generation, keys=keys)
+            if np is not None and vectors and len({len(v) for v in vectors}) == 1:
+                matrix = np.frombuffer(b"".join(vectors), dtype="<f4").reshape(len(vectors), -1)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                index.vectors = (matrix / norms).astype(np.float32)
+            else:
+                decoded = [decode_embedding(v) for v in vectors]
+                index.vectors = [(v, math.sqrt(sum(x * x for x in v)) or 1.0) for v in decoded]
+            self._vector_index[spec.name] = index
+            return index
+
+    def semantic_search(
+        self,
+        table: str,
+        embedding: Sequence[float],
+        limit: int = 5,
+        similarity_threshold: float = 0.0,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        embedding_model: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Cosine-similarity search over mirrored embeddings (brute force).
+
+        Rows carry a "similarity" key, highest first.
+
+        Raises:
+            MirrorMiss: If embedding_model differs from the mirrored
+                vectors' model, or no mirrored vector has the query's
+                dimension (scores across embedding spaces are meaningless)
+        """
+        spec = self._table(table)
+        if not spec.embedding_column:
+            raise ValueError(f"{spec.name} has no embeddings")
+        if embedding_model is not None and self.embedding_model != embedding_model:
+            raise MirrorMiss(
+                f"{spec.name} embeddings are from {self.embedding_model or 'an unknown model'}, "
+                f"query is from {embedding_model}"
+            )
+        query = parse_embedding(embedding)
+        if query is None:
+            return []
+        index = self._vectors(spec)
+        if not index.keys:
+            return []
+
+        if np is not None and not isinstance(index.vectors, list):
+            q = np.asarray(query, dtype=np.float32)
+            if q.shape[0] != index.vectors.shape[1]:
+                raise MirrorMiss(f"Query has {q.shape[0]} dims, {spec.name} embeddings {index.vectors.shape[1]}")
+            q /= np.linalg.norm(q) or 1.0
+            scores = index.vectors @ q
+            order = np.argsort(-scores)
+            scored = ((index.keys[i], float(scores[i])) for i in order)
+        else:
+            q_norm = math.sqrt(sum(x * x for x in query)) or 1.0
+            pairs = []
+            for key, (vector, norm) in zip(index.keys, index.vectors, strict=True):
+                if len(vector) == len(query):
+                    pairs.append((key, sum(a * b for a, b in zip(vector, query, strict=True)) / (norm * q_norm)))
+            if not pairs:
+                raise MirrorMiss(f"No {spec.name} embedding has the query's {len(query)} dims")
+            scored = iter(sorted(pairs, key=lambda pair: -pair[1]))
+
+        results = []
+        for key, similarity in scored:
+            if similarity < similarity_threshold:
+                break
+            item = self.get(spec.name, key)
+            if item is None or (predicate is not None and not predicate(item)):
+                continue
+            item["similarity"] = similarity
+            results.append(item)
+            if len(results) >= limit:
+                break
+        return results
+
+
+# ============================================================================
+# Shared instance
+# ============================================================================
+
+_mirrors: Dict[str, LocalMirror] = {}
+_mirror_lock = threading.Lock()
+
+
+def mirror_path(source: str) -> Path:
+    """Mirror file for one remote database: $KB_MIRROR_DIR/kb_mirror_<source>.db."""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", str(source))
+    return Path(os.getenv("KB_MIRROR_DIR", DEFAULT_MIRROR_DIR)) / f"kb_mirror_{safe}.db"
+
+
+def get_local_mirror(source: str) -> Optional[LocalMirror]:
+    """
+    Process-wide mirror of one remote database, or None when there is
+    nothing to read.
+
+    Args:
+        source: The database the caller reads remotely: "vps" for the VPS
+            KB, otherwise the provider name ("neon", "supabase", ...)
+
+    Configured by KB_MIRROR_DIR (default data), KB_MIRROR_MAX_STALENESS
+    (seconds, default 900) and KB_MIRROR_ENABLED (default true). Returns
+    None until the mirror file has been created by a sync, so callers
+    never create an empty mirror by accident.
+    """
+    if os.getenv("KB_MIRROR_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    with _mirror_lock:
+        if source not in _mirrors:
+            path = mirror_path(source)
+            if not path.exists():
+                return None
+            _mirrors[source] = LocalMirror(
+                path,
+                max_staleness_seconds=float(os.getenv("KB_MIRROR_MAX_STALENESS", DEFAULT_MAX_STALENESS_SECONDS)),
+                source=source,
+            )
+        return _mirrors[source]
@@ -2,9 +2,12 @@
 Manual Indexer for OEM Documentation
 
 Uses PyPDF2 for PDF text extraction (pure Python, no C++ builds)
+Extracts pages in parallel and streams them through the chunker
+(see agent_factory.knowledge.pdf_extraction)
 Chunks text into 500-character blocks with 100-char overlap
 Detects common manual sections for better retrieval
-Stores chunks in RIVETProDatabase
+Adds chunks to the BM25 search index as they are produced
+Stores manual records in RIVETProDatabase
 
 Usage:
     indexer = ManualIndexer(db)
@@ -17,18 +20,16 @@ Usage:
 """
 
 import logging
-import re
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from uuid import uuid4
-
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    raise ImportError(
-        "PyPDF2 not installed. Install with: poetry add pypdf2"
-    )
-
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from agent_factory.knowledge.bm25_index import BM25Index, get_manual_index
+from agent_factory.knowledge.pdf_extraction import (
+    PDFExtractionEngine,
+    SectionIndex,
+    StreamingChunker,
+)
 from agent_factory.rivet_pro.database import RIVETProDatabase
 
 logger = logging.getLogger(__name__)
@@ -55,20 +56,30 @@ class ManualIndexer:
     Indexes OEM manuals into searchable chunks.
 
     Process:
-    1. Extract text from PDF using PyPDF2
-    2. Detect section boundaries
-    3. Chunk text (500 chars, 100 char overlap)
-    4. Store in database via RIVETProDatabase
+    1. Extract text from PDF using PyPDF2 (page ranges in a process pool)
+    2. Detect section boundaries as pages stream in
+    3. Chunk text (500 chars, 100 char overlap) without holding the whole document
+    4. Add chunks to the BM25 search index
+    5. Store manual record in database via RIVETProDatabase
     """
 
-    def __init__(self, db: Optional[RIVETProDatabase] = None):
+    def __init__(
+        self,
+        db: Optional[RIVETProDatabase] = None,
+        engine: Optional[PDFExtractionEngine] = None,
+        search_index: Optional[BM25Index] = None
+    ):
         """
         Initialize manual indexer.
 
         Args:
             db: RIVETProDatabase instance (creates new if None)
+            engine: Shared PDFExtractionEngine (creates default if None)
+            search_index: BM25Index receiving chunks (shared manual index if None)
         """
         self.db = db or RIVETProDatabase()
+        self.engine = engine or PDFExtractionEngine()
+        self.search_index = search_index if search_index is not None else get_manual_index()
         self.chunk_size = 500
         self.chunk_overlap = 100
 
@@ -78,7 +89,10 @@ class ManualIndexer:
         title: str,
         manufacturer: str,
         component_family: str,
-        document_type: str = "user_manual"
+        document_type: str = "user_manual",
+        progress: Optional[Callable[[int], None]] = None,
+        content_sha256: Optional[str] = None,
+        flush: bool = True
     ) -> str:
         """
         Index a manual PDF into the database.
@@ -89,6 +103,11 @@ class ManualIndexer:
             manufacturer: Manufacturer name
             component_family: Component type (VFD, PLC, etc.)
             document_type: Document type (user_manual, installation_guide, etc.)
+            progress: Optional callback receiving the number of pages processed so far
+            content_sha256: Hex SHA-256 of the file, stored for upload dedupe
+            flush: Save the search index afterwards. Batch callers (the
+                ingestion queue) pass False and flush once per batch, since
+                each save rewrites the whole index file
 
         Returns:
             manual_id (UUID string)
@@ -109,158 +128,194 @@ class ManualIndexer:
             manufacturer=manufacturer,
             component_family=component_family,
             file_path=str(file_path_obj.absolute()),
-            document_type=document_type
+            document_type=document_type,
+            content_sha256=content_sha256
         )
         manual_id = manual['id']
+        self.search_index.register_manual(
+            str(manual_id),
+            title=title,
+            manufacturer=manufacturer,
+            component_family=component_family,
+            document_type=document_type
+        )
 
-        # Step 2: Extract text from PDF
+        # Steps 2-4: Extract pages, detect sections, chunk and index in one streaming pass
         try:
-            text, page_count = self._extract_pdf_text(file_path_obj)
-            logger.info(f"Extracted {len(text)} chars from {page_count} pages")
+            page_count, chunk_count, section_count, char_count = self._index_pages(
+                file_path_obj, progress, manual_id=str(manual_id)
+            )
+            logger.info(f"Extracted {char_count} chars from {page_count} pages")
         except Exception as e:
             logger.error(f"PDF extraction failed: {e}")
+            self.search_index.remove_manual(str(manual_id))
             raise
 
-        # Step 3: Detect sections
-        sections = self._detect_sections(text)
-        logger.info(f"Detected {len(sections)} sections")
-
-        # Step 4: Chunk text
-        chunks = self._chunk_text(text, sections)
-        logger.info(f"Created {len(chunks)} chunks")
+        logger.info(f"Detected {section_count} sections")
+        logger.info(f"Created {chunk_count} chunks")
 
-        # Step 5: Store chunks (Phase 1: just count, Phase 2: store in vector DB)
-        # For now, we mark the manual as indexed with the chunk count
+        # Step 5: Persist the search index and mark the manual as indexed
+        if flush:
+            self.search_index.flush()
         self.db.update_manual_indexed(
             manual_id=manual_id,
             collection_name="equipment_manuals",
             page_count=page_count
         )
 
-        logger.info(f"Indexed manual {manual_id}: {len(chunks)} chunks, {page_count} pages")
+        logger.info(f"Indexed manual {manual_id}: {chunk_count} chunks, {page_count} pages")
         return manual_id
 
-    def _extract_pdf_text(self, file_path: Path) -> Tuple[str, int]:
+    def backfill_index(self) -> Dict[str, int]:
         """
-        Extract text from PDF using PyPDF2.
+        Add indexed manuals that have no chunks in the search index.
 
-        Args:
-            file_path: Path to PDF file
+        Manuals ingested before the BM25 index existed only have a database
+        record; their chunks are rebuilt from the stored file_path. Manuals
+        whose file is gone are skipped (search still lists them unranked).
 
         Returns:
-            (extracted_text, page_count)
+            {"indexed", "missing_file", "failed"} counts
         """
-        reader = PdfReader(str(file_path))
-        page_count = len(reader.pages)
+        counts = {"indexed": 0, "missing_file": 0, "failed": 0}
+        for manual in self.db.get_all_manuals():
+            manual_id = str(manual['id'])
+            if manual_id in self.search_index:
+                continue
 
-        text_parts = []
-        for page_num, page in enumerate(reader.pages, start=1):
+            file_path = Path(manual.get('file_path') or "")
+            if not manual.get('file_path') or not file_path.exists():
+                counts["missing_file"] += 1
+                continue
+
+            self.search_index.register_manual(
+                manual_id,
+                title=manual.get('title', ""),
+                manufacturer=manual.get('manufacturer', ""),
+                component_family=manual.get('component_family', ""),
+                document_type=manual.get('document_type', "user_manual")
+            )
             try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+                self._index_pages(file_path, manual_id=manual_id)
+                counts["indexed"] += 1
             except Exception as e:
-                logger.warning(f"Failed to extract page {page_num}: {e}")
-                continue
+                logger.error(f"Backfill failed for manual {manual_id}: {e}")
+                self.search_index.remove_manual(manual_id)
+                counts["failed"] += 1
 
-        full_text = "\n".join(text_parts)
-        return full_text, page_count
+        self.search_index.flush()
+        logger.info(f"Search index backfill: {counts}")
+        return counts
 
-    def _detect_sections(self, text: str) -> List[Dict]:
+    def iter_chunks(
+        self,
+        file_path: Path,
+        stats: Optional[Dict] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Iterator[Dict]:
         """
-        Detect section boundaries in text.
+        Stream chunks for a PDF as pages are extracted.
 
-        Returns:
-            List of {section_type, start_pos, end_pos}
-        """
-        sections = []
-        text_lower = text.lower()
-
-        for section_type, keywords in SECTION_KEYWORDS.items():
-            for keyword in keywords:
-                # Look for keyword at start of line (section header pattern)
-                pattern = rf'^\s*{re.escape(keyword)}\s*$'
-                for match in re.finditer(pattern, text_lower, re.MULTILINE | re.IGNORECASE):
-                    sections.append({
-                        "section_type": section_type,
-                        "start_pos": match.start(),
-                        "keyword": keyword
-                    })
-
-        # Sort by position
-        sections.sort(key=lambda x: x["start_pos"])
-
-        # Add end positions
-        for i, section in enumerate(sections):
-            if i + 1 < len(sections):
-                section["end_pos"] = sections[i + 1]["start_pos"]
-            else:
-                section["end_pos"] = len(text)
-
-        return sections
+        Only the current chunk window is held in memory, never the whole text.
 
-    def _chunk_text(self, text: str, sections: List[Dict]) -> List[Dict]:
+        Args:
+            file_path: Path to PDF file
+            stats: Optional dict filled with page_count, section_count and
+                char_count once the generator is exhausted
+            progress: Optional callback receiving the number of pages processed so far
+
+        Yields:
+            {text, section_type, chunk_index, start_pos, end_pos}
         """
-        Chunk text into 500-char blocks with 100-char overlap.
+        sections = SectionIndex(SECTION_KEYWORDS)
+        chunker = StreamingChunker(
+            self.chunk_size, self.chunk_overlap, section_of=sections.section_at
+        )
+        page_count = 0
+        for page in self.engine.iter_pages(file_path):
+            page_count += 1
+            offset = chunker.feed(page.text)
+            sections.scan(page.text, offset)
+            yield from chunker.ready()
+            if progress is not None:
+                progress(page_count)
+        yield from chunker.finish()
+
+        if stats is not None:
+            stats.update(
+                page_count=page_count,
+                section_count=len(sections),
+                char_count=chunker.length
+            )
+
+    def _index_pages(
+        self,
+        file_path: Path,
+        progress: Optional[Callable[[int], None]] = None,
+        manual_id: Optional[str] = None
+    ) -> Tuple[int, int, int, int]:
+        """
+        Run the streaming extraction pass.
 
         Args:
-            text: Full text to chunk
-            sections: Section boundaries (from _detect_sections)
+            file_path: Path to PDF file
+            progress: Optional callback receiving pages processed so far
+            manual_id: If given, chunks are added to the search index under this id
 
         Returns:
-            List of {text, section_type, chunk_index, start_pos, end_pos}
+            (page_count, chunk_count, section_count, char_count)
         """
-        chunks = []
-        chunk_index = 0
-        pos = 0
-
-        while pos < len(text):
-            # Determine chunk boundaries
-            chunk_start = pos
-            chunk_end = min(pos + self.chunk_size, len(text))
+        stats: Dict = {}
+        chunk_count = 0
+        for chunk in self.iter_chunks(file_path, stats, progress):
+            if manual_id is not None:
+                self.search_index.add_chunk(manual_id, chunk)
+            chunk_count += 1
+        return stats["page_count"], chunk_count, stats["section_count"], stats["char_count"]
 
-            # Extract chunk text
-            chunk_text = text[chunk_start:chunk_end].strip()
-
-            # Skip empty chunks
-            if not chunk_text:
-                pos = chunk_end
-                continue
-
-            # Determine section type for this chunk
-            section_type = self._get_section_at_position(chunk_start, sections)
+    def _extract_pdf_text(self, file_path: Path) -> Tuple[str, int]:
+        """
+        Extract the full text of a PDF.
 
-            chunks.append({
-                "text": chunk_text,
-                "section_type": section_type,
-                "chunk_index": chunk_index,
-                "start_pos": chunk_start,
-                "end_pos": chunk_end
-            })
+        Args:
+            file_path: Path to PDF file
 
-            chunk_index += 1
+        Returns:
+            (extracted_text, page_count)
+        """
+        return self.engine.extract_text(file_path)
 
-            # Move position forward with overlap
-            pos = chunk_end - self.chunk_overlap
+    def _detect_sections(self, text: str) -> List[Dict]:
+        """
+        Detect section boundaries in text.
 
-        return chunks
+        Returns:
+            List of {section_type, start_pos, end_pos, keyword}
+        """
+        index = SectionIndex(SECTION_KEYWORDS)
+        index.scan(text)
+        return index.sections(len(text))
 
-    def _get_section_at_position(self, pos: int, sections: List[Dict]) -> str:
+    def _chunk_text(self, text: str, sections: List[Dict]) -> List[Dict]:
         """
-        Get section type at a given text position.
+        Chunk text into 500-char blocks with 100-char overlap.
 
         Args:
-            pos: Position in text
-            sections: Section boundaries
+            text: Full text to chunk
+            sections: Section boundaries (from _detect_sections)
 
         Returns:
-            Section type string or "general"
+            List of {text, section_type, chunk_index, start_pos, end_pos}
         """
-        for section in sections:
-            if section["start_pos"] <= pos < section["end_pos"]:
-                return section["section_type"]
+        starts = [section["start_pos"] for section in sections]
+
+        def section_of(pos: int) -> str:
+            index = bisect_right(starts, pos) - 1
+            return sections[index]["section_type"] if index >= 0 else "general"
 
-        return "general"
+        chunker = StreamingChunker(self.chunk_size, self.chunk_overlap, section_of=section_of)
+        chunker.feed(text)
+        return list(chunker.finish())
 
     def get_manual_chunks(self, manual_id: str) -> List[Dict]:
         """
@@ -287,9 +342,11 @@ class ManualIndexer:
         Returns:
             True if deleted successfully
         """
-        # Phase 1: Just delete the manual record
+        # Phase 1: Remove chunks from the search index, keep the manual record
         # Phase 2: Also delete chunks from vector store
         try:
+            if self.search_index.remove_manual(manual_id):
+                self.search_index.flush()
             # Note: Database doesn't have delete_manual method yet
             logger.warning(f"Manual deletion not fully implemented: {manual_id}")
             return False
@@ -0,0 +1,340 @@
+"""
+Background Manual Ingestion Queue
+
+Runs ManualIndexer jobs on a worker pool so the upload request returns as soon
+as the file is on disk. Each job is tracked by id (queued -> indexing ->
+completed/failed) with page-level progress, and uploads are deduplicated by
+SHA-256 so an identical PDF is never indexed twice: in memory for jobs this
+process has seen, and through equipment_manuals.content_sha256 for manuals
+indexed before a restart.
+
+Usage:
+    queue = get_ingestion_queue()
+    job = queue.submit(
+        file_path="/tmp/upload.pdf",
+        sha256=digest,
+        title="PowerFlex 525 User Manual",
+        manufacturer="Allen-Bradley",
+        component_family="VFD"
+    )
+    queue.get(job.job_id).to_dict()
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from agent_factory.knowledge.pdf_extraction import count_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# JOB STATE
+# ═══════════════════════════════════════════════════════════════════════════
+
+JOB_QUEUED = "queued"
+JOB_INDEXING = "indexing"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class IngestionJob:
+    """Status of one manual indexing job."""
+    job_id: str
+    sha256: str
+    title: str
+    manufacturer: str
+    component_family: str
+    document_type: str = "user_manual"
+    size_bytes: int = 0
+    status: str = JOB_QUEUED
+    pages_done: int = 0
+    total_pages: int = 0
+    manual_id: Optional[str] = None
+    manual: Optional[Dict[str, Any]] = None
+    deduplicated: bool = False
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished (successfully or not)."""
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of pages processed (0.0 - 1.0)."""
+        if self.status == JOB_COMPLETED:
+            return 1.0
+        if not self.total_pages:
+            return 0.0
+        return min(1.0, self.pages_done / self.total_pages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for API responses."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "pages_done": self.pages_done,
+            "total_pages": self.total_pages,
+            "sha256": self.sha256,
+            "size_bytes": self.size_bytes,
+            "title": self.title,
+            "manufacturer": self.manufacturer,
+            "component_family": self.component_family,
+            "manual_id": self.manual_id,
+            "deduplicated": self.deduplicated,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INGESTION QUEUE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ManualIngestionQueue:
+    """
+    Worker pool for manual indexing jobs.
+
+    Features:
+    - Jobs run on a bounded thread pool (one ManualIndexer / DB connection per job)
+    - Page-level progress reported through ManualIndexer's progress callback
+    - SHA-256 dedupe: an identical upload returns the existing job, or
+      completes with the already indexed manual found in the database
+    - Finished jobs are retained up to max_jobs, oldest evicted first
+    - The search index is saved once each time the queue drains, not per
+      job (a save rewrites the whole index file)
+
+    Example:
+        >>> queue = ManualIngestionQueue(max_workers=2)
+        >>> job = queue.submit("/tmp/manual.pdf", digest, "Manual", "ABB", "VFD")
+        >>> queue.get(job.job_id).status
+        'indexing'
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        indexer_factory: Optional[Callable[[], Any]] = None,
+        max_jobs: int = 1000,
+        delete_after_index: bool = True
+    ):
+        """
+        Initialize ingestion queue.
+
+        Args:
+            max_workers: Number of concurrent indexing jobs
+            indexer_factory: Callable returning a ManualIndexer (default: ManualIndexer)
+            max_jobs: Maximum number of job records retained
+            delete_after_index: Remove the uploaded file once the job finishes
+        """
+        if indexer_factory is None:
+            from agent_factory.knowledge.manual_indexer import ManualIndexer
+            indexer_factory = ManualIndexer
+
+        self.indexer_factory = indexer_factory
+        self.max_jobs = max_jobs
+        self.delete_after_index = delete_after_index
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="manual-ingest"
+        )
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._by_hash: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._active = 0
+        self._unflushed: Dict[int, Any] = {}  # id(search_index) -> index with unsaved jobs
+
+    def submit(
+        self,
+        file_path: str,
+        sha256: str,
+        title: str,
+        manufacturer: str,
+        component_family: str,
+        document_type: str = "user_manual",
+        size_bytes: int = 0
+    ) -> IngestionJob:
+        """
+        Queue a PDF for indexing.
+
+        If a job for the same content hash is queued, running or completed,
+        that job is returned instead and the new file is discarded.
+
+        Args:
+            file_path: Path to the uploaded PDF (owned by the queue from here on)
+            sha256: Hex SHA-256 of the file contents
+            title: Manual title
+            manufacturer: Manufacturer name
+            component_family: Component family (VFD, PLC, etc.)
+            document_type: Document type
+            size_bytes: File size in bytes
+
+        Returns:
+            IngestionJob (new, or the existing job for identical content)
+        """
+        with self._lock:
+            existing_id = self._by_hash.get(sha256)
+            existing = self._jobs.get(existing_id) if existing_id else None
+            if existing is not None and existing.status != JOB_FAILED:
+                logger.info(f"Duplicate upload {sha256[:12]} -> job {existing.job_id}")
+                duplicate = True
+            else:
+                duplicate = False
+                job = IngestionJob(
+                    job_id=str(uuid.uuid4()),
+                    sha256=sha256,
+                    title=title,
+                    manufacturer=manufacturer,
+                    component_family=component_family,
+                    document_type=document_type,
+                    size_bytes=size_bytes,
+                )
+                self._jobs[job.job_id] = job
+                self._by_hash[sha256] = job.job_id
+                self._evict_finished()
+
+        if duplicate:
+            self._discard(file_path)
+            return existing
+
+        with self._lock:
+            self._active += 1
+        self._executor.submit(self._run, job, file_path)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Get a job by id (None if unknown or evicted)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find_by_hash(self, sha256: str) -> Optional[IngestionJob]:
+        """Get the job that ingested the given content hash."""
+        with self._lock:
+            job_id = self._by_hash.get(sha256)
+            return self._jobs.get(job_id) if job_id else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.flush()
+
+    def flush(self) -> None:
+        """Save every search index that received chunks since the last flush."""
+        with self._lock:
+            indexes = list(self._unflushed.values())
+            self._unflushed.clear()
+        for index in indexes:
+            index.flush()
+
+    def _run(self, job: IngestionJob, file_path: str) -> None:
+        """Worker body: index the PDF and record the outcome on the job."""
+        indexer = None
+        status = JOB_FAILED
+        try:
+            job.status = JOB_INDEXING
+            indexer = self.indexer_factory()
+
+            existing = indexer.db.get_manual_by_hash(job.sha256)
+            if existing is not None:
+                job.manual_id = str(existing['id'])
+                job.manual = existing
+                job.total_pages = job.pages_done = existing.get('page_count') or 0
+                job.deduplicated = True
+                status = JOB_COMPLETED
+                logger.info(f"Ingestion job {job.job_id}: content already indexed as manual {job.manual_id}")
+                return
+
+            job.total_pages = count_pdf_pages(file_path)
+
+            def on_progress(pages_done: int) -> None:
+                job.pages_done = pages_done
+
+            manual_id = indexer.index_manual(
+                file_path=file_path,
+                title=job.title,
+                manufacturer=job.manufacturer,
+                component_family=job.component_family,
+                document_type=job.document_type,
+                progress=on_progress,
+                content_sha256=job.sha256,
+                flush=False
+            )
+            job.manual_id = str(manual_id)
+            job.manual = indexer.db.get_manual(job.manual_id)
+            status = JOB_COMPLETED
+            logger.info(f"Ingestion job {job.job_id} completed: manual {job.manual_id}")
+
+        except Exception as e:
+            logger.error(f"Ingestion job {job.job_id} failed: {e}")
+            job.error = str(e)
+
+        finally:
+            if indexer is not None:
+                try:
+                    indexer.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close indexer: {e}")
+            if self.delete_after_index:
+                self._discard(file_path)
+
+            with self._lock:
+                self._active -= 1
+                drained = self._active == 0
+                index = getattr(indexer, "search_index", None)
+                if index is not None:
+                    self._unflushed[id(index)] = index
+            if drained:
+                self.flush()
+
+            # Publish the final status last so pollers never see a half-finished job
+            job.finished_at = datetime.now()
+            job.status = status
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs beyond max_jobs (caller holds the lock)."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.done][:excess]:
+            job = self._jobs.pop(job_id)
+            if self._by_hash.get(job.sha256) == job_id:
+                del self._by_hash[job.sha256]
+
+    @staticmethod
+    def _discard(file_path: str) -> None:
+        """Remove an uploaded file, ignoring errors."""
+        try:
+            Path(file_path).unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Failed to cleanup upload file: {e}")
+
+
+_default_queue: Optional[ManualIngestionQueue] = None
+
+
+def get_ingestion_queue() -> ManualIngestionQueue:
+    """Return the process-wide shared ManualIngestionQueue."""
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = ManualIngestionQueue()
+    return _default_queue
+
+
+def shutdown_ingestion_queue(wait: bool = True) -> None:
+    """Shut down the shared queue (called on API shutdown)."""
+    global _default_queue
+    if _default_queue is not None:
+        _default_queue.shutdown(wait=wait)
+        _default_queue = None
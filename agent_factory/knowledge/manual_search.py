@@ -1,8 +1,10 @@
 """
 Manual Search Service
 
-Wrapper around VectorStore with formatted results and filtering.
-Returns search results with snippets and metadata for API consumption.
+Ranks manual chunks with the BM25 index (bm25_index.py) and returns
+formatted results with snippets and metadata for API consumption.
+Manual records are read through the local mirror (local_mirror.py) when
+one has been synced.
 
 Usage:
     service = ManualSearchService()
@@ -16,6 +18,8 @@ Usage:
 import logging
 from typing import List, Dict, Optional
 
+from agent_factory.knowledge.bm25_index import BM25Index, get_manual_index, tokenize
+from agent_factory.knowledge.local_mirror import LocalMirror, get_local_mirror
 from agent_factory.knowledge.vector_store import VectorStore
 from agent_factory.rivet_pro.database import RIVETProDatabase
 
@@ -28,15 +32,17 @@ class ManualSearchService:
 
     Features:
     - Search with manufacturer/family filtering
-    - Formatted results with snippets
+    - Formatted results with snippets from the best-matching chunk
     - Metadata enrichment
-    - Result ranking
+    - BM25 relevance ranking (best chunk per manual)
     """
 
     def __init__(
         self,
         vector_store: Optional[VectorStore] = None,
-        db: Optional[RIVETProDatabase] = None
+        db: Optional[RIVETProDatabase] = None,
+        search_index: Optional[BM25Index] = None,
+        mirror: Optional[LocalMirror] = None
     ):
         """
         Initialize search service.
@@ -44,9 +50,38 @@ class ManualSearchService:
         Args:
             vector_store: VectorStore instance (creates new if None)
             db: RIVETProDatabase instance (creates new if None)
+            search_index: BM25Index over manual chunks (shared manual index if None)
+            mirror: Local SQLite mirror for manual records (shared mirror of
+                the database's provider if None)
         """
         self.vector_store = vector_store or VectorStore()
         self.db = db or RIVETProDatabase()
+        self.search_index = search_index if search_index is not None else get_manual_index()
+        self.mirror = mirror if mirror is not None else get_local_mirror(self.db.provider)
+
+    def _manual_records(
+        self,
+        manufacturer: Optional[str] = None,
+        component_family: Optional[str] = None
+    ) -> List[Dict]:
+        """Indexed manual records, from the mirror when fresh (or when the database is down)."""
+        def remote():
+            return self.db.search_manuals(manufacturer=manufacturer, component_family=component_family)
+
+        if self.mirror is None:
+            return remote()
+
+        contains = {}
+        if manufacturer:
+            contains["manufacturer"] = manufacturer
+        if component_family:
+            contains["component_family"] = component_family
+
+        return self.mirror.read_through(
+            "equipment_manuals",
+            remote=remote,
+            local=lambda: self.mirror.select("equipment_manuals", filters={"indexed": True}, contains=contains)
+        )
 
     def search(
         self,
@@ -80,31 +115,68 @@ class ManualSearchService:
         """
         logger.info(f"Searching manuals: query='{query}', mfr={manufacturer}, family={component_family}")
 
-        # Phase 1: Use database search (lexical)
-        # Phase 2: Use vector store search (semantic)
-        db_results = self.db.search_manuals(
+        # Manuals ingested before the BM25 index (until backfill_index has run)
+        # have no chunks: they are listed after the ranked hits, not dropped
+        unindexed = [
+            manual for manual in self._manual_records(manufacturer, component_family)
+            if str(manual['id']) not in self.search_index
+        ]
+
+        if len(self.search_index) == 0:
+            # Nothing indexed yet (e.g. fresh deployment): list matching manuals
+            return self._search_database(query, unindexed, top_k)
+
+        hits = self.search_index.search(
+            query,
+            top_k=top_k,
             manufacturer=manufacturer,
-            component_family=component_family
+            component_family=component_family,
+            group_by_manual=True
         )
 
-        # Format results
+        formatted_results = [
+            {
+                "manual_id": hit.manual_id,
+                "title": hit.manual.get("title", ""),
+                "manufacturer": hit.manual.get("manufacturer", ""),
+                "component_family": hit.manual.get("component_family", ""),
+                "snippet": self._create_snippet(hit.text, query),
+                "score": hit.score,
+                "distance": 1.0 / (1.0 + hit.score),
+                "section_type": hit.section_type,
+                "chunk_index": hit.chunk_index
+            }
+            for hit in hits
+        ]
+        if unindexed and len(formatted_results) < top_k:
+            formatted_results += self._search_database(query, unindexed, top_k - len(formatted_results))
+
+        logger.info(f"Found {len(formatted_results)} results")
+        return formatted_results
+
+    def _search_database(self, query: str, manuals: List[Dict], top_k: int) -> List[Dict]:
+        """
+        Unranked listing of manual records without indexed chunks.
+
+        Manuals whose title shares a term with the query come first; order is
+        otherwise the database's.
+        """
+        query_terms = set(tokenize(query))
+        db_results = sorted(manuals, key=lambda m: not query_terms & set(tokenize(m.get('title') or "")))
+
         formatted_results = []
         for idx, manual in enumerate(db_results[:top_k]):
-            # Create snippet from title (Phase 1)
-            # Phase 2: Use actual chunk text with query highlighting
-            snippet = self._create_snippet(manual['title'], query)
-
             formatted_results.append({
                 "manual_id": str(manual['id']),
                 "title": manual['title'],
                 "manufacturer": manual['manufacturer'],
                 "component_family": manual['component_family'],
-                "snippet": snippet,
-                "score": 1.0 / (idx + 1),  # Simple ranking
-                "distance": idx / 100.0     # Placeholder distance
+                "snippet": self._create_snippet(manual['title'], query),
+                "score": 1.0 / (idx + 1),  # Insertion order (no relevance signal)
+                "distance": idx / 100.0
             })
 
-        logger.info(f"Found {len(formatted_results)} results")
+        logger.info(f"Found {len(formatted_results)} results (database fallback)")
         return formatted_results
 
     def search_by_fault_code(
@@ -137,7 +209,7 @@ class ManualSearchService:
             Manual details dict or None if not found
         """
         # Query database for manual details
-        manuals = self.db.search_manuals()
+        manuals = self._manual_records()
 
         for manual in manuals:
             if str(manual['id']) == manual_id:
@@ -168,10 +240,7 @@ class ManualSearchService:
         Returns:
             List of manual summaries
         """
-        manuals = self.db.search_manuals(
-            manufacturer=manufacturer,
-            component_family=component_family
-        )
+        manuals = self._manual_records(manufacturer, component_family)
 
         return [
             {
@@ -228,19 +297,22 @@ class ManualSearchService:
         Returns:
             Snippet with "..." ellipsis if truncated
         """
-        # Phase 1: Simple truncation
-        # Phase 2: Extract actual relevant chunk with query highlighting
-
         if len(text) <= max_length:
             return text
 
-        # Try to find query in text
+        # Try to find the query, then its first matching term, in text
         text_lower = text.lower()
         query_lower = query.lower()
 
-        if query_lower in text_lower:
+        match_pos = text_lower.find(query_lower)
+        if match_pos < 0:
+            for term in tokenize(query):
+                match_pos = text_lower.find(term)
+                if match_pos >= 0:
+                    break
+
+        if match_pos >= 0:
             # Extract snippet around query match
-            match_pos = text_lower.find(query_lower)
             start = max(0, match_pos - 50)
             end = min(len(text), match_pos + 150)
 
@@ -0,0 +1,474 @@
+"""
+Shared PDF Extraction Engine
+
+Process-parallel, streaming PDF text extraction used by ManualIndexer,
+PrintIndexer and OEMPDFScraperAgent.
+
+- Page ranges are fanned out to a process pool (PDF parsing is CPU bound
+  and PyPDF2 holds the GIL); the pool is shared by every engine in the
+  process and uses the "spawn" start method, so worker startup is paid
+  once and workers never inherit the parent's threads or locks
+- Pages are yielded in order as soon as they are ready, so callers can
+  chunk/index without holding the whole document in memory
+- The number of pages in flight is capped (max_buffered_pages) to bound
+  peak RSS regardless of document size
+- Section headers are found with one combined regex per page and looked
+  up with bisect
+- StreamingChunker produces the same fixed-size overlapping chunks the
+  indexers always produced, from a bounded text buffer
+
+Usage:
+    engine = PDFExtractionEngine(max_workers=4)
+    sections = SectionIndex(SECTION_KEYWORDS)
+    chunker = StreamingChunker(500, 100, section_of=sections.section_at)
+
+    for page in engine.iter_pages("manual.pdf"):
+        offset = chunker.feed(page.text)
+        sections.scan(page.text, offset)
+        for chunk in chunker.ready():
+            store(chunk)
+    for chunk in chunker.finish():
+        store(chunk)
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError as e:
+    raise ImportError(
+        "PyPDF2 not installed. Install with: poetry add pypdf2"
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+
+# Range extractor signature: (file_path, start_page, end_page) -> per-page results.
+# Must be a module-level function so it can be sent to worker processes.
+RangeExtractor = Callable[[str, int, int], List[Any]]
+PageCounter = Callable[[str], int]
+
+
+@dataclass
+class PageText:
+    """Plain text of one PDF page (page_number is 1-based)."""
+
+    page_number: int
+    text: str
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PYPDF2 BACKEND (default)
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+# One open reader per process. PyPDF2 flattens the whole page tree on first
+# page access, so re-opening the file for every page range would repeat
+# that work for each range. In-process extraction may run on several
+# threads (e.g. the manual ingestion queue), hence the lock.
+_reader_cache: Dict[str, Tuple[float, "PdfReader"]] = {}
+_reader_lock = threading.Lock()
+
+
+def _open_reader(file_path: str) -> "PdfReader":
+    """Return a cached PdfReader for file_path (invalidated on mtime change)."""
+    mtime = os.path.getmtime(file_path)
+    with _reader_lock:
+        cached = _reader_cache.get(file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    reader = PdfReader(file_path)
+    with _reader_lock:
+        _reader_cache.clear()  # Keep at most one document open per process
+        _reader_cache[file_path] = (mtime, reader)
+    return reader
+
+
+def release_readers() -> None:
+    """Drop cached readers (frees the parsed document in this process)."""
+    with _reader_lock:
+        _reader_cache.clear()
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """Count pages with PyPDF2 (reads only the page tree)."""
+    return len(_open_reader(file_path).pages)
+
+
+def extract_text_range(file_path: str, start: int, end: int) -> List[PageText]:
+    """
+    Extract plain text for pages [start, end) with PyPDF2.
+
+    Runs inside a worker process. Pages that fail to extract come back
+    with empty text so page numbering stays aligned.
+    """
+    reader = _open_reader(file_path)
+    pages = []
+    for index in range(start, min(end, len(reader.pages))):
+        try:
+            text = reader.pages[index].extract_text() or ""
+        except Exception as e:
+            logger.warning(f"Failed to extract page {index + 1}: {e}")
+            text = ""
+        pages.append(PageText(page_number=index + 1, text=text))
+    return pages
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SHARED PROCESS POOL
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the process-wide extraction pool, creating it on first use.
+
+    The first caller's max_workers sizes the pool; later engines share it
+    (each engine still caps its own pages in flight).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Shut down the shared pool (a new one is created on next use)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EXTRACTION ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class PDFExtractionEngine:
+    """
+    Fans page ranges out to a process pool and streams pages back in order.
+
+    Small documents (fewer than parallel_threshold pages) and max_workers=1
+    are extracted in-process, since pool startup would dominate.
+
+    Memory cap: at most max_buffered_pages pages are submitted but not yet
+    consumed by the caller, so peak memory is independent of page count.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 16,
+        max_buffered_pages: int = 256,
+        parallel_threshold: int = 32
+    ):
+        """
+        Initialize extraction engine.
+
+        Args:
+            max_workers: Worker processes (default: CPU count, capped at 8);
+                sizes the shared pool if this engine is the first to use it
+            pages_per_task: Pages extracted per worker task
+            max_buffered_pages: Cap on pages in flight (memory bound)
+            parallel_threshold: Minimum page count before using the pool
+        """
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 8)
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_buffered_pages = max(self.pages_per_task, max_buffered_pages)
+        self.parallel_threshold = parallel_threshold
+
+    def iter_pages(
+        self,
+        file_path: Union[str, Path],
+        extract_range: RangeExtractor = extract_text_range,
+        count_pages: PageCounter = count_pdf_pages
+    ) -> Iterator[Any]:
+        """
+        Yield per-page results in page order.
+
+        Args:
+            file_path: Path to PDF file
+            extract_range: Module-level function extracting a page range
+            count_pages: Module-level function returning the page count
+
+        Yields:
+            Whatever extract_range returns per page (PageText by default)
+        """
+        path = str(file_path)
+        try:
+            page_count = count_pages(path)
+            ranges = [
+                (start, min(start + self.pages_per_task, page_count))
+                for start in range(0, page_count, self.pages_per_task)
+            ]
+
+            if self.max_workers <= 1 or page_count < self.parallel_threshold:
+                for start, end in ranges:
+                    yield from extract_range(path, start, end)
+                return
+
+            yield from self._iter_parallel(path, ranges, extract_range)
+        finally:
+            release_readers()
+
+    def _iter_parallel(
+        self,
+        path: str,
+        ranges: List[Tuple[int, int]],
+        extract_range: RangeExtractor
+    ) -> Iterator[Any]:
+        """Run ranges on the shared process pool, yielding results in page order."""
+        max_in_flight = max(1, self.max_buffered_pages // self.pages_per_task)
+        pending: Deque[Future] = deque()
+        next_range = 0
+        pool = get_extraction_pool(self.max_workers)
+
+        try:
+            while next_range < len(ranges) or pending:
+                # Keep the pool busy without exceeding the memory cap
+                while next_range < len(ranges) and len(pending) < max_in_flight:
+                    start, end = ranges[next_range]
+                    pending.append(pool.submit(extract_range, path, start, end))
+                    next_range += 1
+
+                # Yield the oldest range first to preserve page order
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def extract_text(self, file_path: Union[str, Path]) -> Tuple[str, int]:
+        """
+        Extract the full document text (for callers that need it all at once).
+
+        Returns:
+            (extracted_text, page_count) - non-empty pages joined by newlines
+        """
+        parts = []
+        page_count = 0
+        for page in self.iter_pages(file_path):
+            page_count += 1
+            if page.text:
+                parts.append(page.text)
+        return "\n".join(parts), page_count
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SECTION DETECTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class SectionIndex:
+    """
+    Section boundaries found with one combined regex, looked up with bisect.
+
+    A section header is a line that consists only of a keyword (case
+    insensitive). A position belongs to the last header at or before it.
+    """
+
+    def __init__(self, keywords_by_section: Dict[str, List[str]]):
+        """
+        Build the combined header pattern.
+
+        Args:
+            keywords_by_section: {section_type: [keyword, ...]}
+        """
+        self._section_by_keyword: Dict[str, str] = {}
+        for section_type, keywords in keywords_by_section.items():
+            for keyword in keywords:
+                self._section_by_keyword.setdefault(keyword.lower(), section_type)
+
+        # Longest first so "preventive maintenance" wins over "maintenance"
+        alternatives = sorted(self._section_by_keyword, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"^\s*(" + "|".join(re.escape(k) for k in alternatives) + r")\s*$",
+            re.MULTILINE | re.IGNORECASE
+        )
+        self._starts: List[int] = []
+        self._sections: List[Dict[str, Any]] = []
+
+    def scan(self, text: str, offset: int = 0) -> int:
+        """
+        Record headers in text that starts at document position offset.
+
+        Must be called in document order.
+
+        Returns:
+            Number of headers found
+        """
+        found = 0
+        for match in self._pattern.finditer(text):
+            keyword = match.group(1).lower()
+            start = offset + match.start()
+            if self._sections:
+                self._sections[-1]["end_pos"] = start
+            self._starts.append(start)
+            self._sections.append({
+                "section_type": self._section_by_keyword[keyword],
+                "start_pos": start,
+                "end_pos": None,
+                "keyword": keyword
+            })
+            found += 1
+        return found
+
+    def section_at(self, pos: int) -> str:
+        """Section type at document position pos, or "general"."""
+        index = bisect_right(self._starts, pos) - 1
+        if index < 0:
+            return "general"
+        return self._sections[index]["section_type"]
+
+    def sections(self, text_length: int) -> List[Dict[str, Any]]:
+        """All sections as {section_type, start_pos, end_pos, keyword}."""
+        result = [dict(section) for section in self._sections]
+        if result:
+            result[-1]["end_pos"] = text_length
+        return result
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STREAMING CHUNKER
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class StreamingChunker:
+    """
+    Fixed-size overlapping chunker over text fed page by page.
+
+    Produces the same chunks as slicing the joined document text
+    (pages joined with newlines, empty pages skipped) while keeping only
+    the unconsumed tail in memory.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        section_of: Optional[Callable[[int], str]] = None
+    ):
+        """
+        Initialize chunker.
+
+        Args:
+            chunk_size: Characters per chunk
+            chunk_overlap: Characters shared between consecutive chunks
+            section_of: Optional position -> section_type lookup
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.section_of = section_of
+        self._buffer = ""
+        self._buffer_start = 0  # Document position of _buffer[0]
+        self._length = 0  # Document length fed so far
+        self._pos = 0  # Start of the next chunk
+        self._chunk_index = 0
+        self._has_text = False
+
+    def feed(self, text: str) -> int:
+        """
+        Append one page of text.
+
+        Returns:
+            Document position where this page starts (for SectionIndex.scan)
+        """
+        if not text:
+            return self._length
+        if self._has_text:
+            self._buffer += "\n"
+            self._length += 1
+        start = self._length
+        self._buffer += text
+        self._length += len(text)
+        self._has_text = True
+        return start
+
+    def ready(self) -> Iterator[Dict[str, Any]]:
+        """Yield every chunk that is complete given the text fed so far."""
+        while self._pos + self.chunk_size < self._length:
+            chunk = self._make_chunk(self._pos + self.chunk_size)
+            self._pos += self.chunk_size - self.chunk_overlap
+            self._trim()
+            if chunk is not None:
+                yield chunk
+
+    def finish(self) -> Iterator[Dict[str, Any]]:
+        """Yield the remaining chunks once the whole document was fed."""
+        yield from self.ready()
+        if self._pos < self._length:
+            chunk = self._make_chunk(self._length)
+            self._pos = self._length
+            self._trim()
+            if chunk is not None:
+                yield chunk
+
+    def _make_chunk(self, chunk_end: int) -> Optional[Dict[str, Any]]:
+        chunk_start = self._pos
+        text = self._buffer[
+            chunk_start - self._buffer_start:chunk_end - self._buffer_start
+        ].strip()
+        if not text:
+            return None
+        chunk = {
+            "text": text,
+            "chunk_index": self._chunk_index,
+            "start_pos": chunk_start,
+            "end_pos": chunk_end
+        }
+        if self.section_of is not None:
+            chunk["section_type"] = self.section_of(chunk_start)
+        self._chunk_index += 1
+        return chunk
+
+    def _trim(self) -> None:
+        """Drop buffered text before the next chunk start."""
+        drop = self._pos - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start = self._pos
+
+    @property
+    def length(self) -> int:
+        """Document length fed so far."""
+        return self._length
+
+    @property
+    def chunk_count(self) -> int:
+        """Chunks emitted so far."""
+        return self._chunk_index
+
+
+def chunk_text(
+    text: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    section_of: Optional[Callable[[int], str]] = None
+) -> List[Dict[str, Any]]:
+    """Chunk an in-memory string (convenience wrapper over StreamingChunker)."""
+    chunker = StreamingChunker(chunk_size, chunk_overlap, section_of=section_of)
+    chunker.feed(text)
+    return list(chunker.finish())
@@ -18,18 +18,10 @@ Usage:
 """
 
 import logging
-import re
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from uuid import uuid4
-
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    raise ImportError(
-        "PyPDF2 not installed. Install with: poetry add pypdf2"
-    )
 
+from agent_factory.knowledge.pdf_extraction import PDFExtractionEngine, chunk_text
 from agent_factory.rivet_pro.database import RIVETProDatabase
 
 logger = logging.getLogger(__name__)
@@ -59,14 +51,20 @@ class PrintIndexer:
     - User-namespaced storage (each machine has own prints)
     """
 
-    def __init__(self, db: Optional[RIVETProDatabase] = None):
+    def __init__(
+        self,
+        db: Optional[RIVETProDatabase] = None,
+        engine: Optional[PDFExtractionEngine] = None
+    ):
         """
         Initialize print indexer.
 
         Args:
             db: RIVETProDatabase instance (creates new if None)
+            engine: Shared PDFExtractionEngine (creates default if None)
         """
         self.db = db or RIVETProDatabase()
+        self.engine = engine or PDFExtractionEngine()
         self.chunk_size = 400  # Smaller than manuals (400 vs 500)
         self.chunk_overlap = 80  # Proportional overlap
 
@@ -142,7 +140,10 @@ class PrintIndexer:
 
     def _extract_pdf_text(self, file_path: Path) -> Tuple[str, int]:
         """
-        Extract text from PDF using PyPDF2.
+        Extract text from PDF (page ranges extracted in parallel).
+
+        Prints are typically a handful of pages and print type detection
+        needs the full text, so the text is collected rather than streamed.
 
         Args:
             file_path: Path to PDF file
@@ -150,21 +151,7 @@ class PrintIndexer:
         Returns:
             (extracted_text, page_count)
         """
-        reader = PdfReader(str(file_path))
-        page_count = len(reader.pages)
-
-        text_parts = []
-        for page_num, page in enumerate(reader.pages, start=1):
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            except Exception as e:
-                logger.warning(f"Failed to extract page {page_num}: {e}")
-                continue
-
-        full_text = "\n".join(text_parts)
-        return full_text, page_count
+        return self.engine.extract_text(file_path)
 
     def _detect_print_type(self, text: str, name: str) -> str:
         """
@@ -197,36 +184,7 @@ class PrintIndexer:
         Returns:
             List of {text, chunk_index, start_pos, end_pos}
         """
-        chunks = []
-        chunk_index = 0
-        pos = 0
-
-        while pos < len(text):
-            # Determine chunk boundaries
-            chunk_start = pos
-            chunk_end = min(pos + self.chunk_size, len(text))
-
-            # Extract chunk text
-            chunk_text = text[chunk_start:chunk_end].strip()
-
-            # Skip empty chunks
-            if not chunk_text:
-                pos = chunk_end
-                continue
-
-            chunks.append({
-                "text": chunk_text,
-                "chunk_index": chunk_index,
-                "start_pos": chunk_start,
-                "end_pos": chunk_end
-            })
-
-            chunk_index += 1
-
-            # Move position forward with overlap
-            pos = chunk_end - self.chunk_overlap
-
-        return chunks
+        return chunk_text(text, self.chunk_size, self.chunk_overlap)
 
     def get_print_chunks(self, print_id: str) -> List[Dict]:
         """
@@ -11,7 +11,10 @@ Core Components:
 - MemoryStorage: Abstract storage backend
 - InMemoryStorage: In-memory storage (development)
 - SQLiteStorage: SQLite persistence (production)
+- SessionStore: Bounded LRU + TTL store of live sessions
 - ContextManager: Context window management
+- RollingSummary: Incremental summary of evicted turns
+- TokenCounter: Cached tokenizer-backed token counting
 
 Example Usage:
     >>> from agent_factory.memory import Session, SQLiteStorage
@@ -32,21 +35,27 @@ Example Usage:
 
 from agent_factory.memory.history import Message, MessageHistory
 from agent_factory.memory.session import Session
+from agent_factory.memory.session_store import SessionStore, SessionStoreMetrics
 from agent_factory.memory.storage import (
     MemoryStorage,
     InMemoryStorage,
     SQLiteStorage,
     SupabaseMemoryStorage,
 )
-from agent_factory.memory.context_manager import ContextManager
+from agent_factory.memory.context_manager import ContextManager, RollingSummary
+from agent_factory.memory.token_counter import TokenCounter
 
 __all__ = [
     "Message",
     "MessageHistory",
     "Session",
+    "SessionStore",
+    "SessionStoreMetrics",
     "MemoryStorage",
     "InMemoryStorage",
     "SQLiteStorage",
     "SupabaseMemoryStorage",
     "ContextManager",
+    "RollingSummary",
+    "TokenCounter",
 ]
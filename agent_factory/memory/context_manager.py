@@ -13,11 +13,52 @@ Example Usage:
     >>> manager = ContextManager(max_tokens=1000)
     >>> messages = manager.fit_to_window(history)
     >>> print(len(messages))  # Only messages that fit in 1000 tokens
+    >>>
+    >>> # Keep a rolling summary of evicted turns across calls
+    >>> summary = RollingSummary()
+    >>> messages = manager.fit_to_window(history, summary=summary)
 """
 
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import accumulate
 from typing import Any, Callable, List, Optional
 
 from agent_factory.memory.history import Message, MessageHistory
+from agent_factory.memory.token_counter import get_default_counter
+
+
+# Summarizer signature: (previous_summary, newly_evicted_messages) -> new_summary
+Summarizer = Callable[[str, List[Message]], str]
+
+
+@dataclass
+class RollingSummary:
+    """
+    Incrementally maintained summary of messages evicted from the window.
+
+    Owned by the caller (one per conversation) and passed to
+    ContextManager.fit_to_window. Only messages evicted since the last call
+    are folded into the summary, so the full history is never re-summarized.
+
+    Attributes:
+        text: Current summary text (empty until something is evicted)
+        covered: Number of non-system messages folded into the summary
+        user_count: Evicted user messages (used by the default summarizer)
+        assistant_count: Evicted assistant messages (used by the default summarizer)
+    """
+
+    text: str = ""
+    covered: int = 0
+    user_count: int = 0
+    assistant_count: int = 0
+
+    def reset(self) -> None:
+        """Forget everything (e.g. after the history was cleared)."""
+        self.text = ""
+        self.covered = 0
+        self.user_count = 0
+        self.assistant_count = 0
 
 
 class ContextManager:
@@ -25,10 +66,12 @@ class ContextManager:
     Manages conversation context windows for LLM token limits.
 
     Features:
-    - Token counting with configurable counter
+    - Token counting with a real tokenizer, cached per message
+    - O(n) window fitting (prefix sums + binary search)
     - Message truncation to fit token windows
     - Preserve system messages
     - Keep most recent messages
+    - Incremental rolling summary of evicted turns
 
     Example:
         >>> manager = ContextManager(max_tokens=4000)
@@ -39,7 +82,9 @@ class ContextManager:
         self,
         max_tokens: int = 4000,
         token_counter: Optional[Callable[[Message], int]] = None,
-        preserve_system: bool = True
+        preserve_system: bool = True,
+        summarizer: Optional[Summarizer] = None,
+        summary_max_tokens: int = 256
     ):
         """
         Initialize context manager.
@@ -48,13 +93,18 @@ class ContextManager:
             max_tokens: Maximum tokens for context window
             token_counter: Optional custom token counter function
             preserve_system: Always include system messages
+            summarizer: Optional incremental summarizer for evicted messages
+            summary_max_tokens: Tokens reserved for the rolling summary
         """
         self.max_tokens = max_tokens
         self.preserve_system = preserve_system
+        self.summarizer = summarizer
+        self.summary_max_tokens = summary_max_tokens
 
-        # Default token counter (rough estimate: 1 token ≈ 4 characters)
+        # Shared tokenizer-backed counter; caches counts per message
+        self._text_counter = get_default_counter()
         if token_counter is None:
-            token_counter = lambda msg: len(msg.content) // 4 + 4  # +4 for role overhead
+            token_counter = self._text_counter
 
         self.token_counter = token_counter
 
@@ -73,7 +123,8 @@ class ContextManager:
     def fit_to_window(
         self,
         history: MessageHistory,
-        reserve_tokens: int = 0
+        reserve_tokens: int = 0,
+        summary: Optional[RollingSummary] = None
     ) -> List[Message]:
         """
         Fit message history to token window.
@@ -81,9 +132,18 @@ class ContextManager:
         Keeps most recent messages that fit within max_tokens.
         System messages are always preserved if preserve_system=True.
 
+        Token counts are cached per message, so each call is O(n) with a
+        binary search over prefix sums to find the first message that fits.
+
+        If a RollingSummary is passed, messages evicted since the previous
+        call are folded into it and the summary is inserted as a system
+        message after the preserved system messages. summary_max_tokens are
+        reserved for it once anything has been evicted.
+
         Args:
             history: Message history to fit
             reserve_tokens: Tokens to reserve for response
+            summary: Optional rolling summary state for this conversation
 
         Returns:
             List of messages that fit in token window
@@ -97,6 +157,8 @@ class ContextManager:
         all_messages = history.get_messages()
 
         if not all_messages:
+            if summary is not None:
+                summary.reset()
             return []
 
         # Separate system and non-system messages
@@ -104,25 +166,111 @@ class ContextManager:
         other_messages = [m for m in all_messages if m.role != "system"]
 
         # Always include system messages if preserve_system=True
-        result = []
+        result: List[Message] = []
         tokens_used = 0
 
         if self.preserve_system and system_messages:
             result.extend(system_messages)
             tokens_used = self.count_tokens(system_messages)
 
-        # Add other messages from most recent backwards
-        for message in reversed(other_messages):
-            msg_tokens = self.token_counter(message)
+        prefix = self._prefix_sums(other_messages)
+        start = self._find_window_start(prefix, available_tokens - tokens_used)
 
-            if tokens_used + msg_tokens <= available_tokens:
-                result.insert(len(system_messages), message)  # Insert after system messages
-                tokens_used += msg_tokens
-            else:
-                break
+        if summary is not None:
+            if start > 0 or summary.text:
+                # Something is (or was) evicted - make room for the summary
+                start = self._find_window_start(
+                    prefix, available_tokens - tokens_used - self.summary_max_tokens
+                )
+            summary_message = self._update_summary(summary, other_messages, start)
+            if summary_message is not None:
+                result.append(summary_message)
 
+        result.extend(other_messages[start:])
         return result
 
+    def _prefix_sums(self, messages: List[Message]) -> List[int]:
+        """
+        Build token prefix sums: prefix[i] = tokens in messages[:i].
+
+        Args:
+            messages: Messages in chronological order
+
+        Returns:
+            List of len(messages) + 1 running totals
+        """
+        prefix = [0]
+        prefix.extend(accumulate(self.token_counter(m) for m in messages))
+        return prefix
+
+    @staticmethod
+    def _find_window_start(prefix: List[int], budget: int) -> int:
+        """
+        Find the earliest index such that messages[index:] fit in budget.
+
+        Binary search over the prefix sums, O(log n).
+
+        Args:
+            prefix: Token prefix sums from _prefix_sums
+            budget: Tokens available for the messages
+
+        Returns:
+            Index of the first message to keep (len(messages) if none fit)
+        """
+        if budget <= 0:
+            return len(prefix) - 1
+
+        # Smallest start with total - prefix[start] <= budget
+        return bisect_left(prefix, prefix[-1] - budget)
+
+    def _update_summary(
+        self,
+        summary: RollingSummary,
+        messages: List[Message],
+        start: int
+    ) -> Optional[Message]:
+        """
+        Fold newly evicted messages into the rolling summary.
+
+        Args:
+            summary: Rolling summary state to update in place
+            messages: Non-system messages in chronological order
+            start: Index of the first message kept in the window
+
+        Returns:
+            System message carrying the summary, or None if nothing was evicted
+        """
+        if summary.covered > len(messages):
+            # History was cleared or rewritten since the last call
+            summary.reset()
+
+        if start > summary.covered:
+            evicted = messages[summary.covered:start]
+            if self.summarizer is not None:
+                summary.text = self.summarizer(summary.text, evicted)
+            else:
+                summary.user_count += sum(1 for m in evicted if m.role == "user")
+                summary.assistant_count += sum(1 for m in evicted if m.role == "assistant")
+                summary.text = self._default_summary_text(summary)
+            summary.covered = start
+
+        if not summary.text:
+            return None
+
+        content = self._text_counter.truncate_text(
+            summary.text,
+            max(self.summary_max_tokens - 4, 0)  # 4 tokens of role overhead
+        )
+        return Message(role="system", content=content, metadata={"summary": True})
+
+    @staticmethod
+    def _default_summary_text(summary: RollingSummary) -> str:
+        """Counts-only summary used when no summarizer is configured."""
+        return (
+            f"[Previous conversation: {summary.user_count} user messages, "
+            f"{summary.assistant_count} assistant messages]"
+        )
+
     def truncate_message(
         self,
         message: Message,
@@ -150,9 +298,11 @@ class ContextManager:
         if current_tokens <= max_tokens:
             return message
 
-        # Estimate characters needed (rough: 4 chars per token)
-        target_chars = max_tokens * 4 - len(suffix)
-        truncated_content = message.content[:target_chars] + suffix
+        # Leave room for role overhead and the suffix
+        content_budget = max_tokens - 4 - self._text_counter.count_text(suffix)
+        truncated_content = self._text_counter.truncate_text(
+            message.content, content_budget
+        ) + suffix
 
         return Message(
             role=message.role,
@@ -198,8 +348,7 @@ class ContextManager:
         Returns:
             Estimated token count
         """
-        # Simple estimation: 1 token ≈ 4 characters
-        return len(text) // 4
+        return self._text_counter.count_text(text)
 
     def __repr__(self) -> str:
         """String representation."""
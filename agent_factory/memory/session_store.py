@@ -0,0 +1,289 @@
+"""
+Bounded session store for long-running bots.
+
+Keeps live Session objects in memory with a hard size cap and a TTL:
+- Sharded by key (e.g. Telegram chat ID), one lock per shard
+- Each shard is an LRU (OrderedDict ordered by last touch), so the least
+  recently used session is evicted first and expired sessions sit at the
+  front where a sweep can stop at the first live one
+- Expiry is lazy: a stale session is dropped when it is next looked up
+- Optionally spills evicted (still live) sessions to a MemoryStorage
+  backend and restores them on the next lookup. Spill writes are
+  write-behind on one background thread, so put() never waits on disk;
+  a session still waiting to be written is restored from memory
+
+Times come from time.monotonic(), so wall-clock jumps (NTP, DST) neither
+expire nor resurrect sessions.
+
+Example Usage:
+    >>> from agent_factory.memory import SessionStore, SQLiteStorage
+    >>>
+    >>> store = SessionStore(max_sessions=5000, ttl_seconds=24 * 3600,
+    ...                      spill_storage=SQLiteStorage("telegram_sessions.db"))
+    >>> store.put(12345, session)
+    >>> store.get(12345, session_id=session.session_id)  # restored if spilled
+    >>> store.sweep()  # drop expired sessions
+    >>> store.close()  # finish pending spill writes
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from agent_factory.memory.session import Session
+from agent_factory.memory.storage import MemoryStorage
+
+
+@dataclass
+class SessionStoreMetrics:
+    """Counters for session store activity."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+    spilled: int = 0
+    restored: int = 0
+    spill_errors: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _Shard:
+    """One LRU partition: key -> (session, last_touch)."""
+
+    __slots__ = ("entries", "lock")
+
+    def __init__(self):
+        self.entries: "OrderedDict[Hashable, Tuple[Session, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class SessionStore:
+    """
+    Sharded LRU + TTL store of Session objects.
+
+    All operations are O(1) except sweep(), which is O(expired sessions).
+    Thread-safe. With spill storage, get() may read one spilled session
+    from the backend on a miss; async callers should run it in a thread.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: Optional[float] = 24 * 3600,
+        shards: int = 16,
+        spill_storage: Optional[MemoryStorage] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_sessions: Size cap across all shards (LRU eviction beyond it)
+            ttl_seconds: Idle time before a session expires (None = never)
+            shards: Number of independently locked partitions
+            spill_storage: Backend that receives evicted sessions (None = drop them)
+            clock: Monotonic time source (injectable for tests)
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        shards = max(1, min(shards, max_sessions))
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.spill_storage = spill_storage
+        self.metrics = SessionStoreMetrics()
+        self._clock = clock
+        self._shards = [_Shard() for _ in range(shards)]
+        self._shard_capacity = -(-max_sessions // shards)
+
+        # Write-behind spill: session_id -> evicted session not yet saved, plus
+        # an ordered queue of saves/deletes drained by one writer thread
+        self._spill_pending: Dict[str, Session] = {}
+        self._spill_lock = threading.Lock()
+        self._spill_queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._spill_thread: Optional[threading.Thread] = None
+
+    def _shard(self, key: Hashable) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _is_expired(self, touched: float, now: float, ttl: Optional[float]) -> bool:
+        return ttl is not None and now - touched > ttl
+
+    def get(self, key: Hashable, session_id: Optional[str] = None) -> Optional[Session]:
+        """
+        Look up a session and mark it recently used.
+
+        Expired sessions are dropped and reported as missing. On a miss,
+        a spilled copy is restored when `session_id` is given.
+        """
+        shard = self._shard(key)
+        now = self._clock()
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                session, touched = entry
+                if not self._is_expired(touched, now, self.ttl_seconds):
+                    shard.entries[key] = (session, now)
+                    shard.entries.move_to_end(key)
+                    self.metrics.hits += 1
+                    return session
+                del shard.entries[key]
+                self.metrics.expired += 1
+            self.metrics.misses += 1
+
+        if self.spill_storage is None or session_id is None:
+            return None
+        return self._restore(key, session_id)
+
+    def _restore(self, key: Hashable, session_id: str) -> Optional[Session]:
+        with self._spill_lock:
+            session = self._spill_pending.pop(session_id, None)
+        if session is None:
+            try:
+                session = self.spill_storage.load_session(session_id)
+            except Exception:
+                self.metrics.spill_errors += 1
+                return None
+        if session is None:
+            return None
+
+        # Spilled copies carry wall-clock activity; apply the TTL to them too
+        if self.ttl_seconds is not None and (
+            datetime.now() - session.last_active > timedelta(seconds=self.ttl_seconds)
+        ):
+            self._delete_spilled(session_id)
+            self.metrics.expired += 1
+            return None
+
+        self.metrics.restored += 1
+        self.put(key, session)
+        return session
+
+    def put(self, key: Hashable, session: Session) -> None:
+        """Insert or replace a session, evicting the LRU entry if the shard is full."""
+        shard = self._shard(key)
+        evicted: List[Session] = []
+        with shard.lock:
+            shard.entries[key] = (session, self._clock())
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > self._shard_capacity:
+                _, (old, _) = shard.entries.popitem(last=False)
+                self.metrics.evicted += 1
+                evicted.append(old)
+
+        # Storage I/O happens on the spill writer thread
+        for old in evicted:
+            self._spill(old)
+
+    def _spill(self, session: Session) -> None:
+        if self.spill_storage is None:
+            return
+        with self._spill_lock:
+            self._spill_pending[session.session_id] = session
+        self._enqueue_spill("save", session.session_id)
+
+    def _delete_spilled(self, session_id: str) -> None:
+        with self._spill_lock:
+            self._spill_pending.pop(session_id, None)
+        self._enqueue_spill("delete", session_id)
+
+    def _enqueue_spill(self, op: str, session_id: str) -> None:
+        with self._spill_lock:
+            if self._spill_thread is None:
+                self._spill_thread = threading.Thread(
+                    target=self._spill_writer, name="SessionStore-spill", daemon=True
+                )
+                self._spill_thread.start()
+        self._spill_queue.put((op, session_id))
+
+    def _spill_writer(self) -> None:
+        """Apply queued saves/deletes in order until the stop sentinel (None)."""
+        while True:
+            item = self._spill_queue.get()
+            try:
+                if item is None:
+                    return
+                op, session_id = item
+                if op == "save":
+                    with self._spill_lock:
+                        session = self._spill_pending.get(session_id)
+                    if session is None:
+                        continue  # Restored or deleted before it was written
+                    self.spill_storage.save_session(session)
+                    with self._spill_lock:
+                        if self._spill_pending.get(session_id) is session:
+                            del self._spill_pending[session_id]
+                    self.metrics.spilled += 1
+                else:
+                    self.spill_storage.delete_session(session_id)
+            except Exception:
+                self.metrics.spill_errors += 1
+            finally:
+                self._spill_queue.task_done()
+
+    def flush_spills(self) -> None:
+        """Block until every queued spill write has reached the backend."""
+        if self._spill_thread is not None:
+            self._spill_queue.join()
+
+    def close(self) -> None:
+        """Finish pending spill writes and stop the writer thread."""
+        with self._spill_lock:
+            thread, self._spill_thread = self._spill_thread, None
+        if thread is not None:
+            self._spill_queue.put(None)
+            thread.join()
+
+    def pop(self, key: Hashable, session_id: Optional[str] = None) -> Optional[Session]:
+        """Remove a session (and its spilled copy, when `session_id` is given)."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.pop(key, None)
+        if self.spill_storage is not None and session_id is not None:
+            self._delete_spilled(session_id)
+        return entry[0] if entry else None
+
+    def sweep(self, ttl_seconds: Optional[float] = None) -> List[Hashable]:
+        """
+        Drop expired sessions; returns their keys.
+
+        Args:
+            ttl_seconds: Override the store TTL for this sweep
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl is None:
+            return []
+        now = self._clock()
+        removed: List[Hashable] = []
+        for shard in self._shards:
+            with shard.lock:
+                # LRU order: the first live entry ends the scan
+                while shard.entries:
+                    key, (_, touched) = next(iter(shard.entries.items()))
+                    if not self._is_expired(touched, now, ttl):
+                        break
+                    del shard.entries[key]
+                    removed.append(key)
+        self.metrics.expired += len(removed)
+        return removed
+
+    def values(self) -> List[Session]:
+        """Snapshot of live sessions (expired ones not yet swept included)."""
+        sessions: List[Session] = []
+        for shard in self._shards:
+            with shard.lock:
+                sessions.extend(session for session, _ in shard.entries.values())
+        return sessions
+
+    def __contains__(self, key: Hashable) -> bool:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+        return entry is not None and not self._is_expired(entry[1], self._clock(), self.ttl_seconds)
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
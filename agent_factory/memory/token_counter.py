@@ -0,0 +1,202 @@
+"""
+Token counting for context window management.
+
+Uses tiktoken (cl100k_base) when it is installed and falls back to a
+BPE-shaped heuristic otherwise. The heuristic counts digit runs, punctuation
+and word pieces separately, so code, part numbers and fault codes
+(e.g. "1756-L83E", "F0002") are not undercounted the way ``len(text) // 4`` is.
+
+Counts are cached per message on first sight, keyed by role and content, so
+repeated ``fit_to_window`` calls over a growing history only tokenize the
+new messages.
+
+Example Usage:
+    >>> from agent_factory.memory.token_counter import TokenCounter
+    >>>
+    >>> counter = TokenCounter()
+    >>> counter.count_text("Fault F0002 on drive 1756-L83E")
+    >>> counter.count_message(message)  # cached after the first call
+"""
+
+import re
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from agent_factory.memory.history import Message
+
+try:
+    import tiktoken
+except ImportError:
+    # tiktoken is optional (Rust build issues on Render); heuristic fallback below
+    tiktoken = None
+
+
+# Tokens added per message for role/formatting overhead (OpenAI chat format)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Approximates how BPE vocabularies split text: letter runs, digit runs
+# (cl100k groups at most 3 digits), whitespace, and individual symbols.
+_HEURISTIC_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|\s+|[^\sA-Za-z\d]")
+
+
+def _heuristic_count(text: str) -> int:
+    """Estimate BPE token count without a tokenizer."""
+    tokens = 0
+    for piece in _HEURISTIC_PATTERN.findall(text):
+        first = piece[0]
+        if first.isspace():
+            # Single spaces merge into the following word; newlines/indent do not
+            if piece != " ":
+                tokens += 1
+        elif first.isalpha():
+            # Common English words are one token; long identifiers split ~every 4 chars
+            tokens += 1 if len(piece) <= 6 else (len(piece) + 3) // 4
+        else:
+            tokens += 1
+    return tokens
+
+
+class TokenCounter:
+    """
+    Counts tokens for messages and text with a per-message cache.
+
+    Features:
+    - Real tokenizer (tiktoken) when available
+    - Heuristic fallback tuned for code and part numbers
+    - LRU cache of per-message counts (bounded by max_cache_size)
+
+    Example:
+        >>> counter = TokenCounter(encoding_name="cl100k_base")
+        >>> counter.count_message(Message(role="user", content="Hello"))
+        5
+    """
+
+    def __init__(
+        self,
+        encoding_name: str = "cl100k_base",
+        max_cache_size: int = 100_000,
+        use_tokenizer: bool = True
+    ):
+        """
+        Initialize token counter.
+
+        Args:
+            encoding_name: tiktoken encoding to use
+            max_cache_size: Maximum number of cached message counts
+            use_tokenizer: Set False to force the heuristic counter
+        """
+        self.encoding_name = encoding_name
+        self.max_cache_size = max_cache_size
+        self._encoding = None
+        self._cache: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if use_tokenizer and tiktoken is not None:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding_name)
+            except Exception:
+                # Encoding files may be unavailable offline - fall back to heuristic
+                self._encoding = None
+
+    @property
+    def uses_tokenizer(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self._encoding is not None
+
+    def count_text(self, text: str) -> int:
+        """
+        Count tokens in raw text (uncached).
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return _heuristic_count(text)
+
+    def count_message(self, message: Message) -> int:
+        """
+        Count tokens for a message, including role overhead.
+
+        Counts are cached by (role, content) on first sight.
+
+        Args:
+            message: Message to count
+
+        Returns:
+            Token count
+        """
+        key = (message.role, message.content)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        tokens = self.count_text(message.content) + MESSAGE_OVERHEAD_TOKENS
+        self._cache[key] = tokens
+        if len(self._cache) > self.max_cache_size:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def truncate_text(self, text: str, max_tokens: int) -> str:
+        """
+        Truncate text to at most max_tokens tokens.
+
+        Args:
+            text: Text to truncate
+            max_tokens: Maximum tokens to keep
+
+        Returns:
+            Truncated text (or original if it fits)
+        """
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self._encoding.decode(tokens[:max_tokens])
+
+        pieces: List[str] = []
+        used = 0
+        for match in _HEURISTIC_PATTERN.finditer(text):
+            piece_tokens = _heuristic_count(match.group())
+            if used + piece_tokens > max_tokens:
+                break
+            pieces.append(match.group())
+            used += piece_tokens
+        return "".join(pieces)
+
+    def __call__(self, message: Message) -> int:
+        """Allow use as a ContextManager token_counter callable."""
+        return self.count_message(message)
+
+    def clear_cache(self) -> None:
+        """Clear cached message counts."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        """String representation."""
+        backend = self.encoding_name if self.uses_tokenizer else "heuristic"
+        return f"TokenCounter(backend={backend}, cached={len(self._cache)})"
+
+
+_default_counter: Optional[TokenCounter] = None
+
+
+def get_default_counter() -> TokenCounter:
+    """Return the process-wide shared TokenCounter."""
+    global _default_counter
+    if _default_counter is None:
+        _default_counter = TokenCounter()
+    return _default_counter
@@ -0,0 +1,309 @@
+"""
+Native async Factory.io tag acquisition.
+
+Replaces the thread-pool + sync tool + JSON round trip that
+MachineStateManager used for every poll:
+
+- One shared httpx.AsyncClient with keep-alive (no new TCP connection per poll)
+- Reads for machines on the same Factory.io host that land on the same tick
+  are coalesced into ONE request for the union of their tags
+- Typed results (TagReadResult) straight from the response, no JSON string
+- AdaptivePollInterval: polls fast right after a change, backs off while idle
+
+Usage:
+    from agent_factory.platform.state.acquisition import TagAcquisition
+
+    acquisition = TagAcquisition()
+    result = await acquisition.read("http://localhost:7410", ["conveyor_running", "at_entry"])
+    if result.ok:
+        print(result.values["conveyor_running"])
+    await acquisition.close()
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TagValue = Union[bool, int, float]
+
+READ_PATH = "/api/tag/values/by-name"
+
+
+class FactoryIOError(Exception):
+    """Factory.io request failed (connection, HTTP status or malformed body)."""
+
+
+@dataclass
+class TagReadResult:
+    """
+    Values read for one caller.
+
+    Attributes:
+        values: tag_name -> value for every tag that was read
+        errors: tag_name -> error message reported by Factory.io
+        coalesced: Number of callers that shared the HTTP request
+        elapsed_ms: Request latency
+    """
+    values: Dict[str, TagValue] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    coalesced: int = 1
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class AcquisitionMetrics:
+    """Counters for the acquisition layer (read with to_dict())."""
+    reads: int = 0  # Calls to read()
+    requests: int = 0  # HTTP requests sent
+    coalesced_reads: int = 0  # Reads that shared another read's request
+    tags_requested: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    by_host: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["avg_ms"] = self.total_ms / self.requests if self.requests else 0.0
+        data["reads_per_request"] = self.reads / self.requests if self.requests else 0.0
+        return data
+
+
+@dataclass
+class _HostBatch:
+    """Reads for one host waiting for the same request."""
+    tag_names: Set[str] = field(default_factory=set)
+    callers: int = 0
+    future: Optional[asyncio.Future] = None
+
+
+class TagAcquisition:
+    """
+    Shared async reader for Factory.io tag values.
+
+    read() calls for the same base URL that arrive within coalesce_seconds
+    of each other are sent as one request; each caller gets back only the
+    tags it asked for.
+
+    Example:
+        >>> acquisition = TagAcquisition(coalesce_seconds=0.02)
+        >>> a, b = await asyncio.gather(
+        ...     acquisition.read(url, ["at_entry"]),
+        ...     acquisition.read(url, ["conveyor_running"]),
+        ... )
+        >>> acquisition.metrics.requests
+        1
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        coalesce_seconds: float = 0.02,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            timeout: Request timeout in seconds (default FACTORY_IO_TIMEOUT or 5)
+            coalesce_seconds: How long the first read of a tick waits for
+                other machines on the same host before the request is sent
+            max_keepalive_connections: Idle connections kept open
+            keepalive_expiry: Seconds an idle connection stays open
+            transport: Custom httpx transport (tests)
+        """
+        self.timeout = timeout or float(os.getenv("FACTORY_IO_TIMEOUT", "5"))
+        self.coalesce_seconds = coalesce_seconds
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.metrics = AcquisitionMetrics()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: Dict[str, _HostBatch] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(self.timeout),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def read(self, base_url: str, tag_names: Iterable[str]) -> TagReadResult:
+        """
+        Read tag values by name, sharing the request with concurrent readers.
+
+        Args:
+            base_url: Factory.io Web API URL (e.g. http://localhost:7410)
+            tag_names: Tags to read
+
+        Returns:
+            TagReadResult with this caller's tags only
+
+        Raises:
+            FactoryIOError: If the request fails
+        """
+        names = list(dict.fromkeys(tag_names))
+        self.metrics.reads += 1
+        if not names:
+            return TagReadResult()
+
+        host = base_url.rstrip("/")
+        batch = self._pending.get(host)
+        if batch is None:
+            batch = _HostBatch(future=asyncio.get_running_loop().create_future())
+            self._pending[host] = batch
+            asyncio.create_task(self._flush(host, batch), name=f"factoryio_read_{host}")
+        else:
+            self.metrics.coalesced_reads += 1
+
+        batch.tag_names.update(names)
+        batch.callers += 1
+
+        # shield: one cancelled poller must not cancel the others' request
+        values, errors, elapsed_ms = await asyncio.shield(batch.future)
+
+        return TagReadResult(
+            values={name: values[name] for name in names if name in values},
+            errors={name: errors[name] for name in names if name in errors},
+            coalesced=batch.callers,
+            elapsed_ms=elapsed_ms,
+        )
+
+    async def _flush(self, host: str, batch: _HostBatch) -> None:
+        if self.coalesce_seconds > 0:
+            await asyncio.sleep(self.coalesce_seconds)
+        else:
+            await asyncio.sleep(0)  # Still let reads from the same loop pass join
+        # Reads arriving from here on start the next batch
+        self._pending.pop(host, None)
+
+        try:
+            result = await self._request(host, sorted(batch.tag_names))
+        except Exception as e:
+            if not batch.future.done():
+                batch.future.set_exception(e)
+            # Retrieved here so an all-cancelled batch doesn't log "never retrieved"
+            batch.future.exception()
+        else:
+            if not batch.future.done():
+                batch.future.set_result(result)
+
+    async def _request(self, host: str, tag_names: List[str]):
+        self.metrics.requests += 1
+        self.metrics.tags_requested += len(tag_names)
+        self.metrics.by_host[host] = self.metrics.by_host.get(host, 0) + 1
+
+        start = time.perf_counter()
+        try:
+            # Factory.io takes the tag names as a JSON body on GET
+            response = await self._get_client().request("GET", f"{host}{READ_PATH}", json=tag_names)
+            response.raise_for_status()
+            items = response.json()
+        except httpx.ConnectError as e:
+            self.metrics.errors += 1
+            raise FactoryIOError(f"Cannot connect to Factory.io at {host}") from e
+        except (httpx.HTTPError, ValueError) as e:
+            self.metrics.errors += 1
+            raise FactoryIOError(f"Factory.io read failed at {host}: {e}") from e
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.metrics.total_ms += elapsed_ms
+
+        values: Dict[str, TagValue] = {}
+        errors: Dict[str, str] = {}
+        for item in items:
+            name = item.get("name", "unknown")
+            if "error" in item:
+                errors[name] = item["error"]
+            else:
+                values[name] = item["value"]
+        return values, errors, elapsed_ms
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@dataclass
+class AdaptivePollInterval:
+    """
+    Poll interval that tightens after changes and relaxes while idle.
+
+    Intervals are min_seconds * 2^k, so every machine's ticks fall on a shared
+    grid (see next_deadline) and machines on one host poll in the same tick
+    even at different speeds - which is what lets reads coalesce.
+
+    - change seen: drop straight to min_seconds
+    - idle poll: double, up to max_seconds
+    - failure: unchanged (the circuit breaker handles dead hosts)
+
+    Attributes:
+        min_seconds: Fastest interval (right after a change)
+        max_seconds: Slowest interval (long idle), rounded down to the grid
+        current_seconds: Interval in effect
+    """
+    min_seconds: float = 0.5
+    max_seconds: float = 10.0
+    current_seconds: float = 0.0
+
+    def __post_init__(self):
+        steps = max(0, int(math.floor(math.log2(max(self.max_seconds / self.min_seconds, 1.0)))))
+        self.max_seconds = self.min_seconds * 2 ** steps
+        if not self.current_seconds:
+            self.current_seconds = self.max_seconds
+        self.current_seconds = self._snap(self.current_seconds)
+
+    @classmethod
+    def for_interval(
+        cls,
+        poll_interval_seconds: float,
+        min_seconds: float = 0.5,
+        idle_factor: float = 2.0,
+    ) -> "AdaptivePollInterval":
+        """
+        Interval ladder around a configured poll interval.
+
+        Starts at poll_interval_seconds (rounded down to the grid) and backs
+        off to idle_factor times that while nothing changes.
+        """
+        min_seconds = min(min_seconds, poll_interval_seconds)
+        return cls(
+            min_seconds=min_seconds,
+            max_seconds=poll_interval_seconds * idle_factor,
+            current_seconds=poll_interval_seconds,
+        )
+
+    def _snap(self, seconds: float) -> float:
+        steps = int(math.floor(math.log2(max(seconds / self.min_seconds, 1.0)) + 1e-9))
+        return min(self.min_seconds * 2 ** steps, self.max_seconds)
+
+    def record_poll(self, changed: bool) -> float:
+        """Update after a successful poll; returns the new interval."""
+        if changed:
+            self.current_seconds = self.min_seconds
+        else:
+            self.current_seconds = min(self.current_seconds * 2, self.max_seconds)
+        return self.current_seconds
+
+    def next_deadline(self, now: float, epoch: float = 0.0) -> float:
+        """First grid tick (epoch + n * current_seconds) strictly after now."""
+        ticks = math.floor((now - epoch) / self.current_seconds + 1e-9) + 1
+        return epoch + ticks * self.current_seconds
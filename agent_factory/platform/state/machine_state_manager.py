@@ -4,6 +4,10 @@ Machine State Manager for Factory.io Polling & Caching
 Provides background polling of Factory.io I/O tags with circuit breaker,
 change detection, and subscription-based notifications.
 
+Tags are read through TagAcquisition (acquisition.py): one keep-alive
+HTTP client, one request per Factory.io host per tick, and poll intervals
+that tighten after a change and relax while the machine is idle.
+
 Usage:
     from agent_factory.platform.state.machine_state_manager import MachineStateManager
     from agent_factory.platform.config import load_machine_config
@@ -32,16 +36,20 @@ Usage:
 import asyncio
 import json
 import logging
+import os
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Awaitable, Callable, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Set
 
 from agent_factory.platform.config import MachineConfig
+from agent_factory.platform.state.acquisition import AdaptivePollInterval, TagAcquisition
 from agent_factory.platform.types import IOTagStatus
-from agent_factory.tools.factoryio.readwrite_tool import FactoryIOReadWriteTool
+
+if TYPE_CHECKING:
+    from agent_factory.tools.factoryio.readwrite_tool import FactoryIOReadWriteTool
 
 logger = logging.getLogger(__name__)
 
@@ -181,10 +189,12 @@ class MachineState:
         machine_id: Unique machine identifier
         current_state: Dict of tag_name → IOTagStatus (cached values)
         circuit_breaker: Circuit breaker instance for this machine
+        poll_interval: Adaptive poll interval for this machine
     """
     machine_id: str
     current_state: Dict[str, IOTagStatus] = field(default_factory=dict)
     circuit_breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    poll_interval: AdaptivePollInterval = field(default_factory=AdaptivePollInterval)
 
     def get_changed_tags(self, new_tags: List[IOTagStatus]) -> List[IOTagStatus]:
         """
@@ -286,7 +296,8 @@ class MachineStateManager:
 
     Features:
     - Async background polling (doesn't block FastAPI)
-    - ThreadPoolExecutor for sync tool calls (4 workers)
+    - Native async reads, coalesced per Factory.io host (TagAcquisition)
+    - Adaptive poll intervals: fast after a change, slower while idle
     - Graceful shutdown (cancels all tasks)
     - Per-machine poll intervals (configurable)
 
@@ -298,12 +309,23 @@ class MachineStateManager:
         await manager.stop()  # Stop polling, cleanup
     """
 
-    def __init__(self, machines: List[MachineConfig]):
+    def __init__(
+        self,
+        machines: List[MachineConfig],
+        acquisition: Optional[TagAcquisition] = None,
+        min_poll_seconds: Optional[float] = None,
+        idle_backoff_factor: Optional[float] = None,
+    ):
         """
         Initialize state manager with machine configurations.
 
         Args:
             machines: List of MachineConfig objects
+            acquisition: Shared TagAcquisition (default: one owned by this manager)
+            min_poll_seconds: Interval right after a change
+                (default FACTORY_IO_MIN_POLL_SECONDS or 0.5)
+            idle_backoff_factor: Idle machines slow down to this multiple of
+                their configured interval (default FACTORY_IO_IDLE_BACKOFF or 2)
         """
         self.machines = {m.machine_id: m for m in machines}
         self.states: Dict[str, MachineState] = {}
@@ -312,14 +334,41 @@ class MachineStateManager:
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.running = False
 
-        # Initialize Factory.io tools
-        self.readwrite_tool = FactoryIOReadWriteTool()
+        self.acquisition = acquisition or TagAcquisition()
+        self._owns_acquisition = acquisition is None
+
+        # Optional sync tool override: when set, polls go through it instead
+        # of the async acquisition layer (legacy path, used by tests)
+        self.readwrite_tool: Optional["FactoryIOReadWriteTool"] = None
+
+        self.min_poll_seconds = min_poll_seconds or float(os.getenv("FACTORY_IO_MIN_POLL_SECONDS", "0.5"))
+        self.idle_backoff_factor = idle_backoff_factor or float(os.getenv("FACTORY_IO_IDLE_BACKOFF", "2"))
+        self._epoch = 0.0
+
+        # Tag names and Input/Output types, computed once per machine
+        self._tag_names: Dict[str, List[str]] = {}
+        self._tag_types: Dict[str, Dict[str, str]] = {}
 
         # Initialize state for each machine
-        for machine_id in self.machines:
-            self.states[machine_id] = MachineState(machine_id=machine_id)
+        for machine_id, config in self.machines.items():
+            self.states[machine_id] = MachineState(
+                machine_id=machine_id,
+                poll_interval=AdaptivePollInterval.for_interval(
+                    config.poll_interval_seconds,
+                    min_seconds=self.min_poll_seconds,
+                    idle_factor=self.idle_backoff_factor,
+                ),
+            )
             self.subscriptions[machine_id] = []
 
+            tag_types = {tag.tag: "Output" for tag in config.controllable_outputs}
+            tag_types.update({tag.tag: "Input" for tag in config.monitored_inputs})
+            self._tag_types[machine_id] = tag_types
+            self._tag_names[machine_id] = list(dict.fromkeys(
+                [tag.tag for tag in config.monitored_inputs]
+                + [tag.tag for tag in config.controllable_outputs]
+            ))
+
         logger.info(f"MachineStateManager initialized with {len(machines)} machine(s)")
 
     async def start(self) -> None:
@@ -334,6 +383,8 @@ class MachineStateManager:
             return
 
         self.running = True
+        # Shared tick grid: machines on one host wake together and coalesce
+        self._epoch = asyncio.get_running_loop().time()
 
         for machine_id, config in self.machines.items():
             task = asyncio.create_task(
@@ -353,7 +404,7 @@ class MachineStateManager:
         Stop all polling tasks and cleanup.
 
         Cancels all background tasks, waits for them to finish,
-        and shuts down the ThreadPoolExecutor.
+        closes the HTTP client and shuts down the ThreadPoolExecutor.
         """
         if not self.running:
             logger.warning("MachineStateManager not running")
@@ -369,6 +420,9 @@ class MachineStateManager:
         # Wait for cancellation
         await asyncio.gather(*self.polling_tasks.values(), return_exceptions=True)
 
+        if self._owns_acquisition:
+            await self.acquisition.close()
+
         # Shutdown executor
         self.executor.shutdown(wait=True)
 
@@ -378,19 +432,20 @@ class MachineStateManager:
         """
         Background polling loop for one machine.
 
-        Polls Factory.io at configured interval, detects changes,
-        notifies subscribers, and updates circuit breaker.
+        Polls Factory.io on the machine's adaptive interval, detects
+        changes, notifies subscribers, and updates circuit breaker.
 
         Args:
             machine_id: Machine to poll
             config: Machine configuration
         """
         state = self.states[machine_id]
-        poll_interval = config.poll_interval_seconds
+        poll_interval = state.poll_interval
+        loop = asyncio.get_running_loop()
 
         logger.info(
             f"Polling loop started for {machine_id} "
-            f"(interval: {poll_interval}s)"
+            f"(interval: {poll_interval.min_seconds}-{poll_interval.max_seconds}s)"
         )
 
         while self.running:
@@ -400,7 +455,7 @@ class MachineStateManager:
                     await asyncio.sleep(1)  # Short sleep, check again
                     continue
 
-                # Read tags from Factory.io (async wrapper around sync tool)
+                # Read tags from Factory.io (coalesced with same-host machines)
                 new_tags = await self._read_tags_async(config)
 
                 # Detect changes
@@ -415,6 +470,7 @@ class MachineStateManager:
 
                 # Record success
                 state.circuit_breaker.record_success()
+                poll_interval.record_poll(changed=bool(changed_tags))
 
             except asyncio.CancelledError:
                 # Task cancelled during shutdown
@@ -428,16 +484,19 @@ class MachineStateManager:
                 )
                 state.circuit_breaker.record_failure()
 
-            # Sleep until next poll
-            await asyncio.sleep(poll_interval)
+            # Sleep until the next tick on the shared grid
+            now = loop.time()
+            await asyncio.sleep(poll_interval.next_deadline(now, self._epoch) - now)
 
         logger.info(f"Polling loop stopped for {machine_id}")
 
     async def _read_tags_async(self, config: MachineConfig) -> List[IOTagStatus]:
         """
-        Read tags from Factory.io (async wrapper around sync tool).
+        Read tags from Factory.io.
 
-        Uses ThreadPoolExecutor to avoid blocking event loop.
+        Goes through the shared TagAcquisition, so machines on the same
+        host polled in the same tick share one request. If a sync
+        readwrite_tool has been set, it is called in the executor instead.
 
         Args:
             config: Machine configuration
@@ -448,19 +507,37 @@ class MachineStateManager:
         Raises:
             Exception: If Factory.io returns error
         """
-        # Collect all tag names (inputs + outputs)
-        tag_names = []
-        for tag_config in config.monitored_inputs:
-            tag_names.append(tag_config.tag)
-        for tag_config in config.controllable_outputs:
-            tag_names.append(tag_config.tag)
+        tag_names = self._tag_names.get(config.machine_id)
+        if tag_names is None:
+            tag_names = [t.tag for t in config.monitored_inputs + config.controllable_outputs]
 
         if not tag_names:
             logger.warning(f"No tags configured for {config.machine_id}")
             return []
 
-        # Call sync tool in executor
-        loop = asyncio.get_event_loop()
+        if self.readwrite_tool is not None:
+            values = await self._read_tags_with_tool(tag_names)
+        else:
+            result = await self.acquisition.read(config.factory_io_url, tag_names)
+            if not result.ok:
+                errors = [f"{name}: {error}" for name, error in result.errors.items()]
+                raise Exception(f"Factory.io returned errors: {errors}")
+            values = result.values
+
+        # Convert to IOTagStatus objects
+        tag_types = self._tag_types.get(config.machine_id, {})
+        return [
+            IOTagStatus(
+                tag_name=tag_name,
+                value=value,
+                tag_type=tag_types.get(tag_name, "Output")
+            )
+            for tag_name, value in values.items()
+        ]
+
+    async def _read_tags_with_tool(self, tag_names: List[str]) -> Dict[str, object]:
+        """Read through the sync readwrite_tool in the executor."""
+        loop = asyncio.get_running_loop()
         result_json = await loop.run_in_executor(
             self.executor,
             self.readwrite_tool._run,
@@ -478,26 +555,7 @@ class MachineStateManager:
             errors = result.get("errors", [])
             raise Exception(f"Factory.io returned errors: {errors}")
 
-        # Convert to IOTagStatus objects
-        values = result["values"]
-        tags = []
-
-        for tag_name, value in values.items():
-            # Determine tag type (Input or Output)
-            tag_type = "Output"  # Default
-
-            for tag_config in config.monitored_inputs:
-                if tag_config.tag == tag_name:
-                    tag_type = "Input"
-                    break
-
-            tags.append(IOTagStatus(
-                tag_name=tag_name,
-                value=value,
-                tag_type=tag_type
-            ))
-
-        return tags
+        return result["values"]
 
     async def _notify_subscribers(
         self,
@@ -632,7 +690,8 @@ class MachineStateManager:
                     "state": "CLOSED" | "OPEN" | "HALF_OPEN",
                     "failure_count": int,
                     "backoff_seconds": int,
-                    "tag_count": int
+                    "tag_count": int,
+                    "poll_interval_seconds": float
                 }
             }
         """
@@ -644,7 +703,8 @@ class MachineStateManager:
                 "state": cb.state.value,
                 "failure_count": cb.failure_count,
                 "backoff_seconds": cb.current_backoff_seconds,
-                "tag_count": len(state.current_state)
+                "tag_count": len(state.current_state),
+                "poll_interval_seconds": state.poll_interval.current_seconds
             }
 
         return health
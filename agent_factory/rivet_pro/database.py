@@ -432,17 +432,37 @@ class RIVETProDatabase:
         manufacturer: str,
         component_family: str,
         file_path: str,
-        document_type: str = 'user_manual'
+        document_type: str = 'user_manual',
+        content_sha256: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create new equipment manual record"""
         return self._execute_one(
             """
             INSERT INTO equipment_manuals
-            (title, manufacturer, component_family, file_path, document_type)
-            VALUES (%s, %s, %s, %s, %s)
+            (title, manufacturer, component_family, file_path, document_type, content_sha256)
+            VALUES (%s, %s, %s, %s, %s, %s)
             RETURNING *
             """,
-            (title, manufacturer, component_family, file_path, document_type)
+            (title, manufacturer, component_family, file_path, document_type, content_sha256)
+        )
+
+    def get_manual(self, manual_id: str) -> Optional[Dict[str, Any]]:
+        """Get equipment manual record by ID"""
+        return self._execute_one(
+            "SELECT * FROM equipment_manuals WHERE id = %s",
+            (manual_id,)
+        )
+
+    def get_manual_by_hash(self, content_sha256: str) -> Optional[Dict[str, Any]]:
+        """Get the most recently indexed manual with the given file SHA-256"""
+        return self._execute_one(
+            """
+            SELECT * FROM equipment_manuals
+            WHERE content_sha256 = %s AND indexed = TRUE
+            ORDER BY indexed_at DESC
+            LIMIT 1
+            """,
+            (content_sha256,)
         )
 
     def update_manual_indexed(
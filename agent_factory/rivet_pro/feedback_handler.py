@@ -130,6 +130,7 @@ class FeedbackHandler:
                 ELSE NULL
             END
             WHERE atom_id = $1
+            AND deleted_at IS NULL
             RETURNING success_rate
             """,
             (atom_id,),
@@ -156,6 +157,7 @@ class FeedbackHandler:
             SELECT feedback_positive_count + feedback_negative_count as total
             FROM knowledge_atoms
             WHERE atom_id = $1
+            AND deleted_at IS NULL
             """,
             (atom_id,),
             fetch_mode="one"
@@ -233,6 +235,7 @@ class FeedbackHandler:
                 usage_count
             FROM knowledge_atoms
             WHERE success_rate < $1
+            AND deleted_at IS NULL
             AND (feedback_positive_count + feedback_negative_count) >= $2
             ORDER BY success_rate ASC, usage_count DESC
             LIMIT $3
@@ -3,12 +3,18 @@ RAG Retriever for RIVET Pro
 
 Knowledge base search and coverage estimation.
 
+Keyword searches are served from the local SQLite mirror of the Supabase
+KB (knowledge/local_mirror.py) while it is fresh and has matches; hybrid
+searches always go to the database. The mirror is the degraded fallback
+when the database is unreachable.
+
 Phase 2/8 of RIVET Pro Multi-Agent Backend.
 """
 
 from typing import List, Optional, Dict, Any
 import logging
 
+from agent_factory.knowledge.local_mirror import get_local_mirror
 from agent_factory.rivet_pro.models import RivetIntent, KBCoverage
 from agent_factory.rivet_pro.rag.config import (
     RetrievedDoc,
@@ -27,6 +33,9 @@ from agent_factory.rivet_pro.rag.filters import (
 
 logger = logging.getLogger(__name__)
 
+# Local mirror of the database get_supabase_client() reads
+MIRROR_SOURCE = "supabase"
+
 
 def get_supabase_client():
     """Get Supabase client for knowledge base queries."""
@@ -63,23 +72,42 @@ def search_docs(
     if config.vendor_filter is None and agent_id in AGENT_CONFIGS:
         config.vendor_filter = AGENT_CONFIGS[agent_id].vendor_filter
 
+    metadata_filter = build_metadata_filter(intent)
+
+    if config.vendor_filter:
+        metadata_filter["vendor"] = {"$eq": config.vendor_filter}
+    if config.equipment_filter:
+        metadata_filter["equipment_filter"] = {"$eq": config.equipment_filter}
+
+    atom_type_filter = build_atom_type_filter(config.atom_type_filter)
+    full_filter = combine_filters(metadata_filter, atom_type_filter)
+
+    use_hybrid = bool(config.use_hybrid_search and intent.raw_summary)
+    mirror = get_local_mirror(MIRROR_SOURCE)
+
+    # The mirror only answers the query mode it reproduces (keyword search)
+    if mirror is not None and not use_hybrid and mirror.is_fresh(COLLECTION_NAME):
+        docs = _mirror_search(mirror, intent, full_filter, top_k)
+        if docs:
+            mirror.metrics.local_reads += 1
+            logger.info(f"Retrieved {len(docs)} documents for agent '{agent_id}' (local mirror)")
+            return docs
+        mirror.metrics.local_misses += 1
+
     client = get_supabase_client()
     if not client:
+        if mirror is not None and mirror.has_rows(COLLECTION_NAME):
+            logger.warning(
+                "No database client available, keyword search on stale local mirror"
+                + (" instead of hybrid search" if use_hybrid else "")
+            )
+            mirror.metrics.fallback_reads += 1
+            return _mirror_search(mirror, intent, full_filter, top_k)
         logger.warning("No database client available")
         return []
 
     try:
-        metadata_filter = build_metadata_filter(intent)
-
-        if config.vendor_filter:
-            metadata_filter["vendor"] = {"$eq": config.vendor_filter}
-        if config.equipment_filter:
-            metadata_filter["equipment_filter"] = {"$eq": config.equipment_filter}
-
-        atom_type_filter = build_atom_type_filter(config.atom_type_filter)
-        full_filter = combine_filters(metadata_filter, atom_type_filter)
-
-        if config.use_hybrid_search and intent.raw_summary:
+        if use_hybrid:
             docs = _hybrid_search(client, intent, full_filter, top_k, config)
         else:
             docs = _keyword_search(client, intent, full_filter, top_k)
@@ -142,7 +170,9 @@ def _hybrid_search(
         ).execute()
 
         docs = []
-        for row in response.data[:top_k]:
+        # The RPC filters tombstones (migration 012); skip any an older definition returns
+        live_rows = [row for row in response.data if not row.get("deleted_at")]
+        for row in live_rows[:top_k]:
             try:
                 doc = _parse_db_row(row)
                 docs.append(doc)
@@ -167,7 +197,8 @@ def _keyword_search(
     keywords = extract_search_keywords(intent)
 
     try:
-        query = client.from_(COLLECTION_NAME).select("*")
+        # Tombstoned atoms (removed from their source on re-ingestion) never match
+        query = client.from_(COLLECTION_NAME).select("*").is_("deleted_at", "null")
 
         for key, condition in metadata_filter.items():
             if "$eq" in condition:
@@ -199,6 +230,58 @@ def _keyword_search(
         return []
 
 
+def _matches_filter(row: Dict[str, Any], metadata_filter: Dict[str, Any]) -> bool:
+    """Apply a Supabase-style metadata filter to a mirrored row."""
+    for key, condition in metadata_filter.items():
+        value = row.get(key)
+        if "$eq" in condition and value != condition["$eq"]:
+            return False
+        if "$in" in condition and value not in condition["$in"]:
+            return False
+        if "$contains" in condition:
+            if not isinstance(value, list) or not all(v in value for v in condition["$contains"]):
+                return False
+    return True
+
+
+def _mirror_search(
+    mirror: Any,
+    intent: RivetIntent,
+    metadata_filter: Dict[str, Any],
+    top_k: int
+) -> List[RetrievedDoc]:
+    """
+    Local twin of _keyword_search: any keyword in the keywords column
+    (like textSearch("keywords", "a | b")), BM25 rank squashed into 0-1
+    as similarity. No keywords -> no local answer.
+    """
+    keywords = extract_search_keywords(intent)
+    if not keywords:
+        return []
+
+    try:
+        rows = mirror.search_text(
+            COLLECTION_NAME,
+            " ".join(keywords),
+            limit=top_k,
+            predicate=lambda row: _matches_filter(row, metadata_filter),
+            columns=("keywords",)
+        )
+    except Exception as e:
+        logger.error(f"Local mirror search failed: {e}")
+        return []
+
+    docs = []
+    for row in rows:
+        rank = max(row.get("rank", 0.0), 0.0)
+        row.setdefault("similarity", rank / (1.0 + rank))
+        try:
+            docs.append(_parse_db_row(row))
+        except Exception as e:
+            logger.warning(f"Failed to parse document: {e}")
+    return docs
+
+
 def _parse_db_row(row: Dict[str, Any]) -> RetrievedDoc:
     """Parse database row into RetrievedDoc model."""
     return RetrievedDoc(
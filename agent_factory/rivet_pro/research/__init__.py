@@ -11,12 +11,18 @@ from agent_factory.rivet_pro.research.forum_scraper import (
     ForumResult,
     StackOverflowScraper,
     RedditScraper,
-    ForumScraper
+    ForumScraper,
+    ForumResultCache,
+    ForumSearchError,
+    normalize_query
 )
 
 __all__ = [
     "ForumResult",
     "StackOverflowScraper",
     "RedditScraper",
-    "ForumScraper"
+    "ForumScraper",
+    "ForumResultCache",
+    "ForumSearchError",
+    "normalize_query"
 ]
@@ -2,15 +2,30 @@
 Forum scrapers for Stack Overflow and Reddit.
 
 Retrieves technical discussions from forums when Route C (No KB Coverage) is triggered.
+
+Request budget per search_all() call:
+- Stack Overflow: 1 search + 1 batched /answers/{ids} call
+- Reddit: 1 search per subreddit + 1 comment fetch per returned post
+- Sources (and subreddits) are queried concurrently, throttled by a shared
+  per-host token bucket that honors Stack Exchange `backoff` and Reddit
+  X-Ratelimit-* headers
+- Repeated queries (after normalization) are served from a local cache;
+  a search where any request failed (source down, subreddit or answer batch
+  missing) is returned but never cached
 """
 
+import re
+import threading
 import time
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Literal, Optional
-from urllib.parse import quote_plus
+from typing import List, Dict, Any, Literal, Optional, Tuple
 import logging
 
+from agent_factory.http.rate_limit import HostRateLimiter, get_host_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,25 +40,55 @@ class ForumResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class ForumSearchError(RuntimeError):
+    """A forum API request failed after all retries."""
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: lower-case, punctuation dropped, single spaces."""
+    return " ".join(re.sub(r"[^\w\s\-.+#]", " ", query.lower()).split())
+
+
+def _header_float(response: requests.Response, name: str) -> Optional[float]:
+    """Numeric response header, or None if missing/unparseable."""
+    try:
+        return float(response.headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
 class StackOverflowScraper:
     """
     Scrapes Stack Overflow using the StackExchange API v2.3.
 
     API Limits: 300 requests/day (no authentication required)
-    Rate Limiting: Exponential backoff on 429 responses
+    Rate Limiting: Shared per-host token bucket; honors the `backoff` field
+    in responses and backs off exponentially on 429
     """
 
     BASE_URL = "https://api.stackexchange.com/2.3"
+    HOST = "api.stackexchange.com"
+    RATE_PER_SECOND = 5.0  # API hard limit is 30/s per IP
+    BURST = 5
+    MAX_IDS_PER_CALL = 100  # Vectorized endpoint limit
 
-    def __init__(self, max_retries: int = 3):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        session: Optional[requests.Session] = None,
+        limiter: Optional[HostRateLimiter] = None
+    ):
         self.max_retries = max_retries
-        self.session = requests.Session()
+        self.session = session or requests.Session()
+        self.limiter = limiter or get_host_limiter()
+        self.limiter.ensure(self.HOST, self.RATE_PER_SECOND, self.BURST)
 
     def search(
         self,
         query: str,
         tags: Optional[List[str]] = None,
-        limit: int = 5
+        limit: int = 5,
+        errors: Optional[List[str]] = None
     ) -> List[ForumResult]:
         """
         Search Stack Overflow for answered questions.
@@ -52,9 +97,11 @@ class StackOverflowScraper:
             query: Search query string
             tags: List of tags to filter by (e.g., ["plc", "industrial-automation"])
             limit: Maximum number of results
+            errors: If given, a description of each failed request (the
+                search itself or an answer batch) is appended
 
         Returns:
-            List of ForumResult objects
+            List of ForumResult objects (empty if the search failed)
         """
         if tags is None:
             tags = ["plc", "industrial-automation"]
@@ -72,21 +119,21 @@ class StackOverflowScraper:
         try:
             response = self._make_request(f"{self.BASE_URL}/search/advanced", params)
             if not response:
-                return []
+                raise ForumSearchError("search request failed after retries")
 
             data = response.json()
-            items = data.get("items", [])
+            # Only include answered questions
+            items = [item for item in data.get("items", []) if item.get("is_answered", False)]
+
+            # Fetch all accepted answers in one vectorized call
+            answer_ids = [item["accepted_answer_id"] for item in items if item.get("accepted_answer_id")]
+            answers = self._get_answers(answer_ids, errors=errors) if answer_ids else {}
 
             results = []
             for item in items:
-                # Only include answered questions
-                if not item.get("is_answered", False):
-                    continue
-
-                # Get accepted answer if available
                 answer_id = item.get("accepted_answer_id")
                 if answer_id:
-                    answer_text = self._get_answer(answer_id)
+                    answer_text = answers.get(answer_id, "[Answer unavailable]")
                 else:
                     answer_text = "[No accepted answer]"
 
@@ -109,24 +156,39 @@ class StackOverflowScraper:
 
         except Exception as e:
             logger.error(f"Stack Overflow search failed: {e}")
+            if errors is not None:
+                errors.append(f"search: {e}")
             return []
 
+    def _get_answers(self, answer_ids: List[int], errors: Optional[List[str]] = None) -> Dict[int, str]:
+        """
+        Fetch answer texts by ID ({ids} is ';'-joined, up to 100 per call).
+
+        Failed batches are logged and, if given, appended to errors.
+        """
+        answers: Dict[int, str] = {}
+        for start in range(0, len(answer_ids), self.MAX_IDS_PER_CALL):
+            batch = answer_ids[start:start + self.MAX_IDS_PER_CALL]
+            try:
+                response = self._make_request(
+                    f"{self.BASE_URL}/answers/{';'.join(str(i) for i in batch)}",
+                    {"site": "stackoverflow", "filter": "withbody", "pagesize": len(batch)}
+                )
+                if not response:
+                    raise ForumSearchError("answers request failed after retries")
+                for item in response.json().get("items", []):
+                    if item.get("answer_id") is not None:
+                        answers[item["answer_id"]] = self._strip_html(item.get("body", ""))
+            except Exception as e:
+                logger.error(f"Failed to fetch answers {batch}: {e}")
+                if errors is not None:
+                    errors.append(f"answers {batch}: {e}")
+
+        return answers
+
     def _get_answer(self, answer_id: int) -> str:
         """Fetch answer text by ID."""
-        try:
-            response = self._make_request(
-                f"{self.BASE_URL}/answers/{answer_id}",
-                {"site": "stackoverflow", "filter": "withbody"}
-            )
-            if response:
-                data = response.json()
-                items = data.get("items", [])
-                if items:
-                    return self._strip_html(items[0].get("body", ""))
-        except Exception as e:
-            logger.error(f"Failed to fetch answer {answer_id}: {e}")
-
-        return "[Answer unavailable]"
+        return self._get_answers([answer_id]).get(answer_id, "[Answer unavailable]")
 
     def _make_request(self, url: str, params: Dict[str, Any]) -> Optional[requests.Response]:
         """
@@ -137,15 +199,17 @@ class StackOverflowScraper:
         """
         for attempt in range(self.max_retries):
             try:
+                self.limiter.acquire(self.HOST)
                 response = self.session.get(url, params=params, timeout=10)
 
                 # Rate limit handling
                 if response.status_code == 429:
                     wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                     logger.warning(f"Rate limited. Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
+                    self.limiter.pause(self.HOST, wait_time)
                     continue
 
+                self._apply_backoff(response)
                 response.raise_for_status()
                 return response
 
@@ -156,10 +220,27 @@ class StackOverflowScraper:
 
         return None
 
+    def _apply_backoff(self, response: requests.Response) -> None:
+        """Honor the API's `backoff` field (seconds before the next request)."""
+        try:
+            data = response.json()
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        backoff = data.get("backoff")
+        if isinstance(backoff, (int, float)) and backoff > 0:
+            logger.warning(f"Stack Exchange requested backoff of {backoff}s")
+            self.limiter.pause(self.HOST, backoff)
+
+        quota = data.get("quota_remaining")
+        if isinstance(quota, int) and quota < 10:
+            logger.warning(f"Stack Exchange quota low: {quota} requests remaining")
+
     @staticmethod
     def _strip_html(html: str) -> str:
         """Strip HTML tags from text (basic implementation)."""
-        import re
         clean = re.sub(r'<[^>]+>', '', html)
         clean = re.sub(r'\s+', ' ', clean).strip()
         return clean[:1000]  # Limit to 1000 chars
@@ -170,23 +251,36 @@ class RedditScraper:
     Scrapes Reddit using unauthenticated JSON endpoint.
 
     API Limits: 60 requests/minute (no authentication required)
-    Rate Limiting: Respects X-Ratelimit-* headers
+    Rate Limiting: Shared per-host token bucket, slowed or paused according
+    to X-Ratelimit-Remaining / X-Ratelimit-Reset
     """
 
     BASE_URL = "https://www.reddit.com"
+    HOST = "www.reddit.com"
+    RATE_PER_SECOND = 1.0  # 60/minute
+    BURST = 5
+    MAX_WORKERS = 4
 
-    def __init__(self, max_retries: int = 3):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        session: Optional[requests.Session] = None,
+        limiter: Optional[HostRateLimiter] = None
+    ):
         self.max_retries = max_retries
-        self.session = requests.Session()
+        self.session = session or requests.Session()
         self.session.headers.update({
             "User-Agent": "AgentFactory/1.0 (Industrial Automation Research Bot)"
         })
+        self.limiter = limiter or get_host_limiter()
+        self.limiter.ensure(self.HOST, self.RATE_PER_SECOND, self.BURST)
 
     def search(
         self,
         query: str,
         subreddits: Optional[List[str]] = None,
-        limit: int = 5
+        limit: int = 5,
+        errors: Optional[List[str]] = None
     ) -> List[ForumResult]:
         """
         Search Reddit for relevant posts.
@@ -195,32 +289,63 @@ class RedditScraper:
             query: Search query string
             subreddits: List of subreddits to search (e.g., ["PLC", "industrialmaintenance"])
             limit: Maximum number of results
+            errors: If given, a description of each failed request (subreddit
+                search or comment fetch) is appended
 
         Returns:
-            List of ForumResult objects
+            List of ForumResult objects (from the subreddits that answered)
         """
+        errors = errors if errors is not None else []
         if subreddits is None:
             subreddits = ["PLC", "industrialmaintenance", "electricians", "automation"]
 
-        all_results = []
-
-        for subreddit in subreddits:
-            try:
-                results = self._search_subreddit(subreddit, query, limit=2)  # 2 per subreddit
-                all_results.extend(results)
-            except Exception as e:
-                logger.error(f"Reddit search failed for r/{subreddit}: {e}")
-                continue
-
-        # Sort by score and return top results
-        all_results.sort(key=lambda x: x.metadata.get("score", 0), reverse=True)
-        results = all_results[:limit]
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            # Search subreddits concurrently (2 per subreddit)
+            searches = [
+                (subreddit, pool.submit(self._search_posts, subreddit, query, 2))
+                for subreddit in subreddits
+            ]
+            posts: List[Tuple[str, Dict[str, Any]]] = []
+            for subreddit, future in searches:
+                try:
+                    posts.extend((subreddit, post) for post in future.result())
+                except Exception as e:
+                    logger.error(f"Reddit search failed for r/{subreddit}: {e}")
+                    errors.append(f"r/{subreddit}: {e}")
+
+            # Sort by score and fetch top comments only for posts we return
+            posts.sort(key=lambda p: p[1].get("score", 0), reverse=True)
+            posts = posts[:limit]
+            fetches = [pool.submit(self._fetch_top_comment, subreddit, post.get("id")) for subreddit, post in posts]
+            comments = []
+            for (_, post), future in zip(posts, fetches, strict=True):
+                try:
+                    comments.append(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to fetch comment for post {post.get('id')}: {e}")
+                    errors.append(f"comments {post.get('id')}: {e}")
+                    comments.append("[No comments]")
+
+        results = [
+            ForumResult(
+                source_type="reddit",
+                url=f"{self.BASE_URL}{post.get('permalink', '')}",
+                title=post.get("title", ""),
+                content=f"POST:\n{post.get('title', '')}\n\n{post.get('selftext', '')}\n\nTOP COMMENT:\n{top_comment}",
+                metadata={
+                    "score": post.get("score", 0),
+                    "num_comments": post.get("num_comments", 0),
+                    "subreddit": subreddit
+                }
+            )
+            for (subreddit, post), top_comment in zip(posts, comments, strict=True)
+        ]
 
         logger.info(f"Reddit search found {len(results)} results for query: {query}")
         return results
 
-    def _search_subreddit(self, subreddit: str, query: str, limit: int) -> List[ForumResult]:
-        """Search a specific subreddit."""
+    def _search_posts(self, subreddit: str, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Search a specific subreddit; returns post data that passes the quality filter."""
         url = f"{self.BASE_URL}/r/{subreddit}/search.json"
         params = {
             "q": query,
@@ -231,51 +356,34 @@ class RedditScraper:
 
         response = self._make_request(url, params)
         if not response:
-            return []
+            raise ForumSearchError(f"r/{subreddit} search failed after retries")
 
         data = response.json()
-        posts = data.get("data", {}).get("children", [])
-
-        results = []
-        for post_data in posts:
-            post = post_data.get("data", {})
-
-            # Filter: score >= 5, num_comments >= 2
-            if post.get("score", 0) < 5 or post.get("num_comments", 0) < 2:
-                continue
-
-            # Get top comment
-            top_comment = self._get_top_comment(subreddit, post.get("id"))
+        posts = [post_data.get("data", {}) for post_data in data.get("data", {}).get("children", [])]
 
-            result = ForumResult(
-                source_type="reddit",
-                url=f"{self.BASE_URL}{post.get('permalink', '')}",
-                title=post.get("title", ""),
-                content=f"POST:\n{post.get('title', '')}\n\n{post.get('selftext', '')}\n\nTOP COMMENT:\n{top_comment}",
-                metadata={
-                    "score": post.get("score", 0),
-                    "num_comments": post.get("num_comments", 0),
-                    "subreddit": subreddit
-                }
-            )
-            results.append(result)
-
-        return results
+        # Filter: score >= 5, num_comments >= 2
+        return [post for post in posts if post.get("score", 0) >= 5 and post.get("num_comments", 0) >= 2]
 
     def _get_top_comment(self, subreddit: str, post_id: str) -> str:
         """Fetch top comment for a post."""
         try:
-            url = f"{self.BASE_URL}/r/{subreddit}/comments/{post_id}.json"
-            response = self._make_request(url, params={"limit": 1})
-            if response:
-                data = response.json()
-                if len(data) > 1:
-                    comments = data[1].get("data", {}).get("children", [])
-                    if comments:
-                        return comments[0].get("data", {}).get("body", "")[:500]
+            return self._fetch_top_comment(subreddit, post_id)
         except Exception as e:
             logger.error(f"Failed to fetch comment for post {post_id}: {e}")
+            return "[No comments]"
 
+    def _fetch_top_comment(self, subreddit: str, post_id: str) -> str:
+        """Top comment for a post ("[No comments]" if it has none); raises if the request fails."""
+        url = f"{self.BASE_URL}/r/{subreddit}/comments/{post_id}.json"
+        response = self._make_request(url, params={"limit": 1})
+        if not response:
+            raise ForumSearchError(f"comments for {post_id} failed after retries")
+
+        data = response.json()
+        if len(data) > 1:
+            comments = data[1].get("data", {}).get("children", [])
+            if comments:
+                return comments[0].get("data", {}).get("body", "")[:500]
         return "[No comments]"
 
     def _make_request(self, url: str, params: Dict[str, Any]) -> Optional[requests.Response]:
@@ -287,12 +395,15 @@ class RedditScraper:
         """
         for attempt in range(self.max_retries):
             try:
+                self.limiter.acquire(self.HOST)
                 response = self.session.get(url, params=params, timeout=10)
+                self._apply_rate_headers(response)
 
-                # Check rate limit headers
-                remaining = response.headers.get("X-Ratelimit-Remaining")
-                if remaining and int(remaining) < 5:
-                    logger.warning(f"Reddit rate limit low: {remaining} requests remaining")
+                if response.status_code == 429:
+                    wait_time = _header_float(response, "Retry-After") or 2 ** attempt
+                    logger.warning(f"Reddit rate limited. Waiting {wait_time}s before retry...")
+                    self.limiter.pause(self.HOST, wait_time)
+                    continue
 
                 response.raise_for_status()
                 return response
@@ -304,6 +415,55 @@ class RedditScraper:
 
         return None
 
+    def _apply_rate_headers(self, response: requests.Response) -> None:
+        """Spread the remaining quota over the reset window; pause when it's gone."""
+        remaining = _header_float(response, "X-Ratelimit-Remaining")
+        reset = _header_float(response, "X-Ratelimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        if remaining < 1:
+            logger.warning(f"Reddit rate limit exhausted, pausing {reset:.0f}s")
+            self.limiter.pause(self.HOST, reset)
+        else:
+            if remaining < 5:
+                logger.warning(f"Reddit rate limit low: {remaining:.0f} requests remaining")
+            self.limiter.bucket(self.HOST).set_rate(min(self.RATE_PER_SECOND, remaining / max(reset, 1.0)))
+
+
+class ForumResultCache:
+    """Small in-memory TTL/LRU cache of search_all() results."""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[float, List[ForumResult]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Optional[List[ForumResult]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: Any, results: List[ForumResult]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
 class ForumScraper:
     """
@@ -312,9 +472,15 @@ class ForumScraper:
     Searches both Stack Overflow and Reddit in parallel.
     """
 
-    def __init__(self):
-        self.stackoverflow = StackOverflowScraper()
-        self.reddit = RedditScraper()
+    def __init__(
+        self,
+        stackoverflow: Optional[StackOverflowScraper] = None,
+        reddit: Optional[RedditScraper] = None,
+        cache_ttl_seconds: float = 3600
+    ):
+        self.stackoverflow = stackoverflow or StackOverflowScraper()
+        self.reddit = reddit or RedditScraper()
+        self.cache = ForumResultCache(ttl_seconds=cache_ttl_seconds)
 
     def search_all(
         self,
@@ -335,21 +501,42 @@ class ForumScraper:
         Returns:
             List of ForumResult objects (combined from all sources)
         """
-        results = []
+        cache_key = (
+            normalize_query(query),
+            tuple(stackoverflow_tags) if stackoverflow_tags is not None else None,
+            tuple(reddit_subreddits) if reddit_subreddits is not None else None,
+            limit,
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Forum search cache hit: {len(cached)} results ({query})")
+            return cached
 
-        # Stack Overflow search
-        try:
-            so_results = self.stackoverflow.search(query, tags=stackoverflow_tags, limit=5)
-            results.extend(so_results)
-        except Exception as e:
-            logger.error(f"Stack Overflow search failed: {e}")
-
-        # Reddit search
-        try:
-            reddit_results = self.reddit.search(query, subreddits=reddit_subreddits, limit=5)
-            results.extend(reddit_results)
-        except Exception as e:
-            logger.error(f"Reddit search failed: {e}")
+        results = []
+        failed = False
+        so_errors: List[str] = []
+        reddit_errors: List[str] = []
+
+        # Query all sources concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            searches = [
+                ("Stack Overflow", so_errors, pool.submit(
+                    self.stackoverflow.search, query, tags=stackoverflow_tags, limit=5, errors=so_errors
+                )),
+                ("Reddit", reddit_errors, pool.submit(
+                    self.reddit.search, query, subreddits=reddit_subreddits, limit=5, errors=reddit_errors
+                )),
+            ]
+            for name, errors, future in searches:
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    failed = True
+                    logger.error(f"{name} search failed: {e}")
+                    continue
+                if errors:
+                    failed = True
+                    logger.warning(f"{name} search incomplete: {'; '.join(errors)}")
 
         # Sort by relevance score (favor Stack Overflow, then Reddit score)
         def sort_key(r: ForumResult) -> int:
@@ -363,6 +550,10 @@ class ForumScraper:
         # Return top N results
         limited_results = results[:limit]
 
+        # Don't cache partial or empty answers (a source may just be down)
+        if limited_results and not failed:
+            self.cache.put(cache_key, limited_results)
+
         logger.info(f"Forum search completed: {len(limited_results)} total results ({query})")
         return limited_results
 
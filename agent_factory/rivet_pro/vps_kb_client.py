@@ -10,6 +10,7 @@ Features:
 - Equipment-specific queries
 - Connection pooling for performance
 - Automatic fallback (VPS down -> graceful degradation)
+- Local SQLite mirror for sub-millisecond reads and offline fallback
 - Health monitoring
 
 Usage:
@@ -26,6 +27,7 @@ Configuration:
     - VPS_KB_PASSWORD (required)
     - VPS_KB_DATABASE (default: rivet)
     - VPS_OLLAMA_URL (default: http://72.60.175.144:11434)
+    - KB_MIRROR_DIR / KB_MIRROR_MAX_STALENESS (see knowledge/local_mirror.py)
 
 Created: 2025-12-15
 """
@@ -40,6 +42,8 @@ from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from agent_factory.knowledge.local_mirror import LocalMirror, get_local_mirror
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -52,8 +56,17 @@ class VPSKBClient:
     high-level query methods for knowledge atom retrieval.
     """
 
-    def __init__(self):
-        """Initialize VPS KB Client with connection pool"""
+    # Ollama model behind knowledge_atoms.embedding on the VPS
+    EMBEDDING_MODEL = "nomic-embed-text"
+
+    def __init__(self, mirror: Optional[LocalMirror] = None):
+        """
+        Initialize VPS KB Client with connection pool.
+
+        Args:
+            mirror: Local SQLite mirror of the VPS KB (shared "vps" mirror if
+                None; sync it with scripts/kb_mirror.py sync --source vps)
+        """
 
         # VPS connection config
         self.config = {
@@ -76,6 +89,15 @@ class VPSKBClient:
         self._health_status = None
         self._health_cache_duration = timedelta(minutes=1)
 
+        # Local mirror: serves reads while fresh, answers when the VPS is down
+        self.mirror = mirror if mirror is not None else get_local_mirror("vps")
+
+    def _read(self, remote, local):
+        """Run a knowledge_atoms read through the mirror (remote only if none)."""
+        if self.mirror is None:
+            return remote()
+        return self.mirror.read_through("knowledge_atoms", remote=remote, local=local)
+
     def _init_pool(self):
         """Initialize connection pool"""
         try:
@@ -153,7 +175,7 @@ class VPSKBClient:
             conn = self._get_connection()
             with conn.cursor() as cur:
                 # Count atoms
-                cur.execute("SELECT COUNT(*) as count FROM knowledge_atoms")
+                cur.execute("SELECT COUNT(*) as count FROM knowledge_atoms WHERE deleted_at IS NULL")
                 result = cur.fetchone()
                 health["atom_count"] = result["count"] if result else 0
 
@@ -161,6 +183,7 @@ class VPSKBClient:
                 cur.execute("""
                     SELECT MAX(created_at) as last_ingestion
                     FROM knowledge_atoms
+                    WHERE deleted_at IS NULL
                 """)
                 result = cur.fetchone()
                 if result and result["last_ingestion"]:
@@ -224,8 +247,24 @@ class VPSKBClient:
             ...     print(atom['title'])
         """
         try:
-            conn = self._get_connection()
+            atoms = self._read(
+                remote=lambda: self._query_atoms_remote(topic, limit),
+                local=lambda: self.mirror.search_substring(
+                    "knowledge_atoms", topic, columns=("title", "summary", "content"),
+                    array_column="keywords", limit=limit
+                )
+            )
+            logger.info(f"Keyword search '{topic}' returned {len(atoms)} atoms")
+            return atoms
+
+        except Exception as e:
+            logger.error(f"Failed to query atoms for topic '{topic}': {e}")
+            return []
 
+    def _query_atoms_remote(self, topic: str, limit: int) -> List[Dict[str, Any]]:
+        """ILIKE keyword search on the VPS database (raises on failure)."""
+        conn = self._get_connection()
+        try:
             with conn.cursor() as cur:
                 query = """
                     SELECT atom_id, atom_type, vendor, product, title, summary,
@@ -233,10 +272,11 @@ class VPSKBClient:
                            prerequisites, steps, keywords, difficulty,
                            source_url, source_pages, created_at
                     FROM knowledge_atoms
-                    WHERE title ILIKE %s
-                       OR summary ILIKE %s
-                       OR content ILIKE %s
-                       OR %s = ANY(keywords)
+                    WHERE deleted_at IS NULL
+                      AND (title ILIKE %s
+                           OR summary ILIKE %s
+                           OR content ILIKE %s
+                           OR %s = ANY(keywords))
                     ORDER BY created_at DESC
                     LIMIT %s
                 """
@@ -249,17 +289,10 @@ class VPSKBClient:
                     limit
                 ))
 
-                atoms = [dict(row) for row in cur.fetchall()]
-
+                return [dict(row) for row in cur.fetchall()]
+        finally:
             self._return_connection(conn)
 
-            logger.info(f"Keyword search '{topic}' returned {len(atoms)} atoms")
-            return atoms
-
-        except Exception as e:
-            logger.error(f"Failed to query atoms for topic '{topic}': {e}")
-            return []
-
     def search_by_equipment(
         self,
         equipment_type: Optional[str] = None,
@@ -287,15 +320,13 @@ class VPSKBClient:
             logger.warning("search_by_equipment called without filters")
             return []
 
-        try:
-            conn = self._get_connection()
-
-            # Build dynamic query based on filters
-            conditions = []
+        def remote():
+            # Build dynamic query based on filters (tombstoned atoms never match)
+            conditions = ["deleted_at IS NULL"]
             params = []
 
             if equipment_type:
-                conditions.append("title ILIKE %s OR content ILIKE %s OR %s = ANY(keywords)")
+                conditions.append("(title ILIKE %s OR content ILIKE %s OR %s = ANY(keywords))")
                 eq_pattern = f'%{equipment_type}%'
                 params.extend([eq_pattern, eq_pattern, equipment_type.lower()])
 
@@ -315,12 +346,22 @@ class VPSKBClient:
             """
             params.append(limit)
 
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                atoms = [dict(row) for row in cur.fetchall()]
-
-            self._return_connection(conn)
+            conn = self._get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(query, params)
+                    return [dict(row) for row in cur.fetchall()]
+            finally:
+                self._return_connection(conn)
+
+        def local():
+            return self.mirror.search_substring(
+                "knowledge_atoms", equipment_type, columns=("title", "content"), array_column="keywords",
+                filters={"vendor": manufacturer.lower()} if manufacturer else None, limit=limit
+            )
 
+        try:
+            atoms = self._read(remote, local)
             logger.info(f"Equipment search (type={equipment_type}, mfr={manufacturer}) "
                        f"returned {len(atoms)} atoms")
             return atoms
@@ -360,7 +401,7 @@ class VPSKBClient:
             embedding_response = requests.post(
                 f"{self.ollama_url}/api/embeddings",
                 json={
-                    "model": "nomic-embed-text",
+                    "model": self.EMBEDDING_MODEL,
                     "prompt": query_text
                 },
                 timeout=10
@@ -373,9 +414,33 @@ class VPSKBClient:
 
             query_embedding = embedding_response.json()["embedding"]
 
-            # Search for similar atoms using pgvector
-            conn = self._get_connection()
+            atoms = self._read(
+                remote=lambda: self._query_atoms_semantic_remote(query_embedding, limit, similarity_threshold),
+                local=lambda: self.mirror.semantic_search(
+                    "knowledge_atoms", query_embedding, limit=limit, similarity_threshold=similarity_threshold,
+                    embedding_model=self.EMBEDDING_MODEL
+                )
+            )
+
+            logger.info(f"Semantic search '{query_text[:50]}...' returned "
+                       f"{len(atoms)} atoms (threshold={similarity_threshold})")
+            return atoms
+
+        except Exception as e:
+            logger.error(f"Semantic search failed: {e}")
+            # Fallback to keyword search
+            logger.info("Falling back to keyword search")
+            return self.query_atoms(query_text, limit)
 
+    def _query_atoms_semantic_remote(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """pgvector cosine search on the VPS database (raises on failure)."""
+        conn = self._get_connection()
+        try:
             with conn.cursor() as cur:
                 query = """
                     SELECT atom_id, atom_type, vendor, product, title, summary,
@@ -385,6 +450,7 @@ class VPSKBClient:
                            1 - (embedding <=> %s::vector) as similarity
                     FROM knowledge_atoms
                     WHERE embedding IS NOT NULL
+                      AND deleted_at IS NULL
                       AND 1 - (embedding <=> %s::vector) >= %s
                     ORDER BY similarity DESC
                     LIMIT %s
@@ -400,20 +466,10 @@ class VPSKBClient:
                     limit
                 ))
 
-                atoms = [dict(row) for row in cur.fetchall()]
-
+                return [dict(row) for row in cur.fetchall()]
+        finally:
             self._return_connection(conn)
 
-            logger.info(f"Semantic search '{query_text[:50]}...' returned "
-                       f"{len(atoms)} atoms (threshold={similarity_threshold})")
-            return atoms
-
-        except Exception as e:
-            logger.error(f"Semantic search failed: {e}")
-            # Fallback to keyword search
-            logger.info("Falling back to keyword search")
-            return self.query_atoms(query_text, limit)
-
     def close(self):
         """Close all connections in pool"""
         if self.pool:
@@ -5,6 +5,8 @@ SCAFFOLD = Specification-driven Autonomous Code generation Framework
 
 Components:
 - WorktreeManager: Manages isolated git worktrees for parallel task execution
+- WorktreePool: Recycles a fixed set of worktrees across tasks
+- ParallelTaskRunner: Runs independent tasks concurrently in bounded slots
 - ContextAssembler: Prepares execution context for Claude Code CLI
 - ClaudeExecutor: Executes tasks using Claude Code CLI in headless mode
 - PRCreator: Creates draft PRs automatically after task completion (Phase 3)
@@ -13,7 +15,8 @@ Components:
 from agent_factory.scaffold.models import (
     WorktreeMetadata,
     TaskContext,
-    ExecutionResult
+    ExecutionResult,
+    SlotLimits
 )
 from agent_factory.scaffold.worktree_manager import (
     WorktreeManager,
@@ -21,6 +24,11 @@ from agent_factory.scaffold.worktree_manager import (
     WorktreeExistsError,
     WorktreeNotFoundError,
     WorktreeLimitError,
+    WorktreePool,
+)
+from agent_factory.scaffold.parallel_runner import (
+    ParallelTaskRunner,
+    RunReport
 )
 from agent_factory.scaffold.claude_executor import (
     ClaudeExecutor,
@@ -33,12 +41,17 @@ __all__ = [
     "WorktreeMetadata",
     "TaskContext",
     "ExecutionResult",
+    "SlotLimits",
     # WorktreeManager
     "WorktreeManager",
     "WorktreeManagerError",
     "WorktreeExistsError",
     "WorktreeNotFoundError",
     "WorktreeLimitError",
+    "WorktreePool",
+    # ParallelTaskRunner
+    "ParallelTaskRunner",
+    "RunReport",
     # ClaudeExecutor
     "ClaudeExecutor",
     "ClaudeExecutorError",
@@ -7,14 +7,17 @@ Features:
 - Generates repo snapshot (file tree, recent commits, key files)
 - Formats task specifications
 - Creates execution-ready prompts
+- Reuses the repo snapshot across tasks via ContextCache (keyed by HEAD)
 """
 
 import logging
 import subprocess
+import time
 from pathlib import Path
 from typing import Dict, Optional, List
 
 from agent_factory.scaffold.backlog_parser import BacklogParser, TaskSpec
+from agent_factory.scaffold.context_cache import ContextCache, get_context_cache
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +46,8 @@ class ContextAssembler:
         self,
         repo_root: Path,
         max_tree_depth: int = 3,
-        max_commits: int = 10
+        max_commits: int = 10,
+        cache: Optional[ContextCache] = None
     ):
         """Initialize ContextAssembler.
 
@@ -51,11 +55,14 @@ class ContextAssembler:
             repo_root: Root directory of repository
             max_tree_depth: Maximum depth for file tree (default: 3)
             max_commits: Maximum commits to include (default: 10)
+            cache: Snapshot cache (default: shared process-wide cache for repo_root)
         """
         self.repo_root = Path(repo_root).resolve()
         self.max_tree_depth = max_tree_depth
         self.max_commits = max_commits
         self.backlog_parser = BacklogParser()
+        self.cache = cache if cache is not None else get_context_cache(self.repo_root)
+        self.last_stats: Dict = {}
 
         # Verify CLAUDE.md exists
         self.claude_md_path = self.repo_root / "CLAUDE.md"
@@ -81,12 +88,17 @@ class ContextAssembler:
         """
         task_id = task.get("id", "unknown")
         logger.info(f"Assembling context for {task_id}")
+        start = time.perf_counter()
 
         try:
-            # Components
+            # Components (tree and commits come from the cache inside a git repo)
             system_prompt = self._read_claude_md()
-            file_tree = self._generate_file_tree()
-            git_history = self._extract_git_commits()
+            snapshot = self.cache.snapshot(self.max_tree_depth, self.max_commits)
+            if snapshot is not None:
+                file_tree, git_history = snapshot.file_tree, snapshot.git_history
+            else:
+                file_tree = self._generate_file_tree()
+                git_history = self._extract_git_commits()
             task_spec = self._format_task_spec(task)
 
             # Assemble complete context
@@ -114,7 +126,19 @@ class ContextAssembler:
 Execute the task according to the acceptance criteria. Make all necessary changes, run tests, and ensure the implementation is complete before finishing.
 """
 
-            logger.debug(f"Context assembled: {len(context)} chars")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.cache.record_assembly(elapsed_ms)
+            self.last_stats = {
+                "task_id": task_id,
+                "elapsed_ms": elapsed_ms,
+                "head": snapshot.head if snapshot else None,
+                "hits": snapshot.hits if snapshot else [],
+                "misses": snapshot.misses if snapshot else ["tree", "commits"],
+            }
+            logger.info(
+                f"Context for {task_id} assembled in {elapsed_ms:.1f}ms "
+                f"({len(context)} chars, hits={self.last_stats['hits']}, misses={self.last_stats['misses']})"
+            )
             return context
 
         except Exception as e:
@@ -127,40 +151,52 @@ Execute the task according to the acceptance criteria. Make all necessary change
         Returns:
             System prompt content
         """
-        if not self.claude_md_path.exists():
-            logger.warning("CLAUDE.md not found - using minimal prompt")
-            return "You are a helpful AI assistant helping implement tasks."
-
         try:
-            content = self.claude_md_path.read_text(encoding='utf-8')
-
-            # Extract first section (usually contains core instructions)
-            lines = content.split('\n')
-            prompt_lines = []
-            in_prompt = False
+            # Re-parsed only when CLAUDE.md's mtime or size changes
+            prompt, _ = self.cache.claude_md(self.claude_md_path, self._parse_claude_md)
+        except Exception as e:
+            logger.warning(f"Error reading CLAUDE.md: {e}")
+            return "You are a helpful AI assistant helping implement tasks."
 
-            for line in lines:
-                # Start collecting after first header
-                if line.startswith('# ') and not in_prompt:
-                    in_prompt = True
-                    prompt_lines.append(line)
-                elif in_prompt:
-                    # Stop at second major section (##)
-                    if line.startswith('## ') and len(prompt_lines) > 50:
-                        break
-                    prompt_lines.append(line)
+        if prompt is None:
+            logger.warning("CLAUDE.md not found - using minimal prompt")
+            return "You are a helpful AI assistant helping implement tasks."
+        return prompt
 
-            prompt = '\n'.join(prompt_lines[:200])  # Limit to first 200 lines
-            logger.debug(f"Extracted {len(prompt_lines)} lines from CLAUDE.md")
+    def _parse_claude_md(self, content: str) -> str:
+        """Extract the system prompt section from CLAUDE.md content.
 
-            return prompt
+        Args:
+            content: CLAUDE.md text
 
-        except Exception as e:
-            logger.warning(f"Error reading CLAUDE.md: {e}")
-            return "You are a helpful AI assistant helping implement tasks."
+        Returns:
+            System prompt content
+        """
+        # Extract first section (usually contains core instructions)
+        lines = content.split('\n')
+        prompt_lines = []
+        in_prompt = False
+
+        for line in lines:
+            # Start collecting after first header
+            if line.startswith('# ') and not in_prompt:
+                in_prompt = True
+                prompt_lines.append(line)
+            elif in_prompt:
+                # Stop at second major section (##)
+                if line.startswith('## ') and len(prompt_lines) > 50:
+                    break
+                prompt_lines.append(line)
+
+        prompt = '\n'.join(prompt_lines[:200])  # Limit to first 200 lines
+        logger.debug(f"Extracted {len(prompt_lines)} lines from CLAUDE.md")
+
+        return prompt
 
     def _generate_file_tree(self) -> str:
-        """Generate file tree snapshot (max depth 3).
+        """Generate file tree snapshot outside git (max depth 3).
+
+        Inside a git repo the tree comes from ContextCache (git ls-files).
 
         Returns:
             File tree as markdown string
@@ -0,0 +1,362 @@
+"""SCAFFOLD Platform - Context Cache
+
+Caches the parts of a task context that don't depend on the task.
+
+Between two tasks the repository snapshot is almost always identical, so
+ContextAssembler asks this cache instead of shelling out to `tree` and
+`git log` (and re-reading CLAUDE.md) every time:
+
+- File tree: read in-process from `git ls-files -z`, rendered with depth
+  and ignore rules. When HEAD moves, the path set is patched from
+  `git diff --name-status` instead of listing the whole repo again.
+- Recent commits: memoized per HEAD commit.
+- CLAUDE.md: parsed once per (mtime, size).
+
+Entries are keyed by the HEAD commit plus an mtime signature of the git
+index, so a `git add`/`git rm` without a commit also invalidates the tree.
+
+Usage:
+    from agent_factory.scaffold.context_cache import get_context_cache
+
+    cache = get_context_cache(repo_root)
+    snapshot = cache.snapshot(max_depth=3, max_commits=10)
+    print(snapshot.file_tree, snapshot.hits)
+"""
+
+import fnmatch
+import logging
+import re
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IGNORE = frozenset({
+    "node_modules", "__pycache__", ".git", ".venv", "venv",
+    ".pytest_cache", ".mypy_cache", "dist", "build",
+})
+MAX_TREE_LINES = 200
+SHA_RE = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+
+@dataclass
+class RepoSnapshot:
+    """Task-independent part of a context.
+
+    Attributes:
+        head: HEAD commit the snapshot describes
+        file_tree: Rendered file tree (markdown code block)
+        git_history: Recent commits (markdown code block)
+        hits: Components served from cache ("tree", "commits")
+        misses: Components rebuilt ("tree", "tree_incremental", "commits")
+    """
+    head: str
+    file_tree: str
+    git_history: str
+    hits: List[str] = field(default_factory=list)
+    misses: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ContextCacheMetrics:
+    """Counters for the context cache (read with to_dict())."""
+    snapshots: int = 0
+    tree_hits: int = 0
+    tree_full_scans: int = 0
+    tree_incremental: int = 0
+    commit_hits: int = 0
+    commit_misses: int = 0
+    claude_md_hits: int = 0
+    claude_md_misses: int = 0
+    assemblies: int = 0
+    assembly_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["avg_assembly_ms"] = self.assembly_ms / self.assemblies if self.assemblies else 0.0
+        return data
+
+
+def render_tree(
+    root_name: str,
+    paths: Iterable[str],
+    max_depth: int = 3,
+    ignore: FrozenSet[str] = DEFAULT_IGNORE,
+    max_lines: int = MAX_TREE_LINES
+) -> str:
+    """Render repo-relative paths as an indented tree.
+
+    Files deeper than max_depth are folded into a "dir/ (N files)" line
+    for the directory at the depth limit; any path with an ignored
+    component (exact name or glob) is dropped.
+
+    Returns:
+        File tree as markdown string
+    """
+    def ignored(part: str) -> bool:
+        return part in ignore or any(fnmatch.fnmatch(part, pattern) for pattern in ignore if "*" in pattern)
+
+    tree: Dict = {}
+    folded: Dict[Tuple[str, ...], int] = {}
+    for path in paths:
+        parts = path.split("/")
+        if any(ignored(part) for part in parts):
+            continue
+        if len(parts) > max_depth:
+            key = tuple(parts[:max_depth])
+            folded[key] = folded.get(key, 0) + 1
+            parts = parts[:max_depth]
+            node = tree
+            for part in parts:
+                node = node.setdefault(part, {})
+            continue
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node.setdefault(parts[-1], None)
+
+    lines = [f"{root_name}/"]
+
+    def walk(node: Dict, prefix: Tuple[str, ...]):
+        # Directories first, then files, each alphabetically
+        for name in sorted(node, key=lambda n: (node[n] is None, n)):
+            if len(lines) > max_lines:
+                return
+            indent = "  " * (len(prefix) + 1)
+            child = node[name]
+            if child is None:
+                lines.append(f"{indent}{name}")
+                continue
+            hidden = folded.get(prefix + (name,))
+            lines.append(f"{indent}{name}/" + (f" ({hidden} files)" if hidden else ""))
+            walk(child, prefix + (name,))
+
+    walk(tree, ())
+
+    if len(lines) > max_lines:
+        return "```\n" + "\n".join(lines[:max_lines]) + "\n... (truncated)\n```"
+    return "```\n" + "\n".join(lines) + "\n```"
+
+
+def apply_name_status(paths: Set[str], diff_output: str) -> int:
+    """Patch a path set with `git diff --name-status -z` output.
+
+    Returns:
+        Number of changes applied
+    """
+    fields = diff_output.split("\0")
+    changes = 0
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in "RC":  # Rename/copy: status, old path, new path
+            old, new = fields[i + 1], fields[i + 2]
+            if status == "R":
+                paths.discard(old)
+            paths.add(new)
+            i += 3
+        else:
+            if status == "D":
+                paths.discard(fields[i + 1])
+            else:  # A, M, T
+                paths.add(fields[i + 1])
+            i += 2
+        changes += 1
+    return changes
+
+
+class ContextCache:
+    """Process-wide cache of repository snapshots for one repo.
+
+    Thread-safe: parallel SCAFFOLD slots share one instance.
+
+    Example:
+        >>> cache = ContextCache(Path.cwd())
+        >>> snap = cache.snapshot(max_depth=3, max_commits=10)
+        >>> snap = cache.snapshot(max_depth=3, max_commits=10)
+        >>> snap.hits
+        ['tree', 'commits']
+    """
+
+    def __init__(self, repo_root: Path, ignore: Optional[Iterable[str]] = None):
+        """Initialize ContextCache.
+
+        Args:
+            repo_root: Root directory of repository
+            ignore: Path component names/globs left out of the tree
+                (default: node_modules, __pycache__, .git, virtualenvs, build dirs)
+        """
+        self.repo_root = Path(repo_root).resolve()
+        self.ignore = frozenset(ignore) if ignore is not None else DEFAULT_IGNORE
+        self.metrics = ContextCacheMetrics()
+        self._lock = threading.RLock()
+
+        # Path set for the last seen (head, signature)
+        self._paths: Optional[Set[str]] = None
+        self._paths_key: Optional[Tuple[str, Tuple]] = None
+        self._trees: Dict[Tuple, str] = {}  # (head, signature, depth) -> rendered tree
+        self._commits: Dict[Tuple[str, int], str] = {}  # (head, count) -> git log block
+        self._claude_md: Dict[Tuple[str, int, int], str] = {}  # (path, mtime_ns, size) -> prompt
+
+    def _git(self, *args: str, timeout: int = 10) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.repo_root,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"git {args[0]} unavailable: {e}")
+            return None
+        return result.stdout if result.returncode == 0 else None
+
+    def head(self) -> Optional[Tuple[str, Tuple]]:
+        """(HEAD sha, index mtime signature), or None outside a git repo."""
+        output = self._git("rev-parse", "--git-dir", "HEAD", timeout=5)
+        lines = (output or "").split()
+        if len(lines) != 2 or not SHA_RE.match(lines[1]):
+            return None  # Not a git repo, or no commits yet
+
+        git_dir, sha = lines
+        try:
+            stat = (self.repo_root / git_dir / "index").stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = ()
+        return sha, signature
+
+    def _tracked_paths(self, key: Tuple[str, Tuple]) -> Tuple[Optional[Set[str]], str]:
+        """Path set for key, patched incrementally when only HEAD moved."""
+        if self._paths is not None and self._paths_key == key:
+            return self._paths, "hit"
+
+        head, _ = key
+        if self._paths is not None and self._paths_key and self._paths_key[0] != head:
+            diff = self._git("diff", "--name-status", "-z", "-M", self._paths_key[0], head)
+            if diff is not None:
+                paths = set(self._paths)
+                applied = apply_name_status(paths, diff)
+                logger.debug(f"File tree patched with {applied} change(s) {self._paths_key[0][:8]}..{head[:8]}")
+                self._paths, self._paths_key = paths, key
+                return paths, "incremental"
+
+        listing = self._git("ls-files", "-z", timeout=30)
+        if listing is None:
+            return None, "unavailable"
+        self._paths = {path for path in listing.split("\0") if path}
+        self._paths_key = key
+        return self._paths, "full"
+
+    def file_tree(self, key: Tuple[str, Tuple], max_depth: int) -> Tuple[Optional[str], str]:
+        """Rendered tree for key: (tree or None, "hit" | "incremental" | "full" | "unavailable")."""
+        with self._lock:
+            tree_key = (key[0], key[1], max_depth)
+            if tree_key in self._trees:
+                self.metrics.tree_hits += 1
+                return self._trees[tree_key], "hit"
+
+            paths, how = self._tracked_paths(key)
+            if paths is None:
+                return None, how
+
+            if how == "incremental":
+                self.metrics.tree_incremental += 1
+            else:
+                self.metrics.tree_full_scans += 1
+
+            tree = render_tree(self.repo_root.name, paths, max_depth, self.ignore)
+            # Only the current HEAD's trees are worth keeping
+            self._trees = {k: v for k, v in self._trees.items() if k[0] == key[0]}
+            self._trees[tree_key] = tree
+            return tree, how
+
+    def git_history(self, head: str, max_commits: int) -> Tuple[Optional[str], bool]:
+        """Recent commits as markdown, memoized per HEAD: (text or None, hit)."""
+        with self._lock:
+            cached = self._commits.get((head, max_commits))
+            if cached is not None:
+                self.metrics.commit_hits += 1
+                return cached, True
+
+        output = self._git("log", f"-{max_commits}", "--oneline", "--decorate", head, timeout=5)
+        if output is None:
+            return None, False
+
+        text = f"```\n{output}\n```"
+        with self._lock:
+            self.metrics.commit_misses += 1
+            self._commits = {k: v for k, v in self._commits.items() if k[0] == head}
+            self._commits[(head, max_commits)] = text
+        return text, False
+
+    def claude_md(self, path: Path, parse: Callable[[str], str]) -> Tuple[Optional[str], bool]:
+        """Parsed CLAUDE.md, re-parsed only when its mtime or size changes.
+
+        Returns:
+            (prompt or None if the file is missing, hit)
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return None, False
+
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._claude_md:
+                self.metrics.claude_md_hits += 1
+                return self._claude_md[key], True
+
+        prompt = parse(path.read_text(encoding='utf-8'))
+        with self._lock:
+            self.metrics.claude_md_misses += 1
+            self._claude_md = {k: v for k, v in self._claude_md.items() if k[0] != key[0]}
+            self._claude_md[key] = prompt
+        return prompt, False
+
+    def record_assembly(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.metrics.assemblies += 1
+            self.metrics.assembly_ms += elapsed_ms
+
+    def snapshot(self, max_depth: int = 3, max_commits: int = 10) -> Optional[RepoSnapshot]:
+        """Tree and recent commits for the current HEAD (None outside git)."""
+        key = self.head()
+        if key is None:
+            return None
+
+        with self._lock:
+            self.metrics.snapshots += 1
+
+        snapshot = RepoSnapshot(head=key[0], file_tree="", git_history="")
+
+        tree, how = self.file_tree(key, max_depth)
+        if tree is None:
+            return None
+        snapshot.file_tree = tree
+        (snapshot.hits if how == "hit" else snapshot.misses).append("tree" if how in ("hit", "full") else "tree_incremental")
+
+        history, hit = self.git_history(key[0], max_commits)
+        snapshot.git_history = history if history is not None else "Git history unavailable"
+        (snapshot.hits if hit else snapshot.misses).append("commits")
+
+        return snapshot
+
+
+# Process-wide caches (ClaudeCodeHandler builds a new ContextAssembler per task)
+_caches: Dict[Path, ContextCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_context_cache(repo_root: Path) -> ContextCache:
+    """Get the shared ContextCache for a repository."""
+    root = Path(repo_root).resolve()
+    with _caches_lock:
+        cache = _caches.get(root)
+        if cache is None:
+            cache = _caches[root] = ContextCache(root)
+        return cache
@@ -6,6 +6,11 @@ Data models for SCAFFOLD autonomous development system.
 from dataclasses import dataclass, asdict
 from typing import List, Optional
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 
 @dataclass
 class WorktreeMetadata:
@@ -277,3 +282,42 @@ class PRResult:
             error=data.get("error"),
             commits_pushed=data.get("commits_pushed", [])
         )
+
+
+@dataclass
+class SlotLimits:
+    """Resource limits and wall-clock budget for one execution slot.
+
+    Attributes:
+        timeout_sec: Wall-clock budget per task (capped by the session's remaining time)
+        max_memory_mb: Address-space limit for the executor process (None = unlimited)
+        max_cpu_sec: CPU-time limit for the executor process (None = unlimited)
+    """
+    timeout_sec: int = 1800
+    max_memory_mb: Optional[int] = None
+    max_cpu_sec: Optional[int] = None
+
+    def apply(self, pid: int) -> bool:
+        """Apply memory/CPU limits to a running process (Linux prlimit).
+
+        Called right after Popen instead of through preexec_fn, which is not
+        safe while other slots' threads are running.
+
+        Returns:
+            True if limits were applied (or none are configured)
+        """
+        if self.max_memory_mb is None and self.max_cpu_sec is None:
+            return True
+        if resource is None or not hasattr(resource, "prlimit"):
+            return False
+
+        if self.max_memory_mb is not None:
+            limit = self.max_memory_mb * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+        if self.max_cpu_sec is not None:
+            resource.prlimit(pid, resource.RLIMIT_CPU, (self.max_cpu_sec, self.max_cpu_sec))
+        return True
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
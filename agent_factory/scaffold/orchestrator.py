@@ -11,16 +11,23 @@ Workflow:
 6. Process result (create PR, update Backlog.md)
 7. Cleanup worktree
 8. Repeat until queue empty or safety limit hit
+
+Steps 2-7 run in up to max_concurrent slots at once (ParallelTaskRunner),
+each in a recycled pool worktree. Fetched tasks already have their
+dependencies satisfied, so a batch can run fully in parallel.
 """
 
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from agent_factory.scaffold.models import SlotLimits
+from agent_factory.scaffold.parallel_runner import ParallelTaskRunner, RunReport
 from agent_factory.scaffold.task_fetcher import TaskFetcher
 from agent_factory.scaffold.task_router import TaskRouter, TaskExecutionError
 from agent_factory.scaffold.session_manager import SessionManager
 from agent_factory.scaffold.result_processor import ResultProcessor
+from agent_factory.scaffold.worktree_manager import WorktreePool
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +64,9 @@ class ScaffoldOrchestrator:
         max_concurrent: int = 3,
         max_cost: float = 5.0,
         max_time_hours: float = 4.0,
-        labels: Optional[List[str]] = None
+        labels: Optional[List[str]] = None,
+        slot_limits: Optional[SlotLimits] = None,
+        recycle_worktrees: bool = True
     ):
         """Initialize ScaffoldOrchestrator.
 
@@ -65,15 +74,20 @@ class ScaffoldOrchestrator:
             repo_root: Root directory of git repository
             dry_run: If True, log actions without executing
             max_tasks: Maximum tasks to process
-            max_concurrent: Maximum concurrent worktrees
+            max_concurrent: Maximum tasks executing at once (one worktree each)
             max_cost: Maximum API cost in USD
             max_time_hours: Maximum wall-clock time in hours
             labels: Optional label filter for tasks
+            slot_limits: Per-slot wall-clock budget and memory/CPU limits
+            recycle_worktrees: Reuse a pool of worktrees instead of creating
+                and deleting one per task (default: True)
         """
         self.repo_root = Path(repo_root).resolve()
         self.dry_run = dry_run
         self.max_tasks = max_tasks
+        self.max_concurrent = max_concurrent
         self.labels = labels
+        self.slot_limits = slot_limits or SlotLimits()
 
         # Components
         self.task_fetcher = TaskFetcher(cache_ttl_sec=60)
@@ -82,9 +96,11 @@ class ScaffoldOrchestrator:
             repo_root=repo_root,
             max_concurrent=max_concurrent,
             max_cost=max_cost,
-            max_time_hours=max_time_hours
+            max_time_hours=max_time_hours,
+            worktree_pool=WorktreePool(repo_root, size=max_concurrent) if recycle_worktrees else None
         )
         self.result_processor = ResultProcessor()
+        self._last_report: Optional[RunReport] = None
 
         # Logging
         self.logger = logging.getLogger("scaffold_orchestrator")
@@ -132,35 +148,24 @@ class ScaffoldOrchestrator:
             for i, task in enumerate(tasks, 1):
                 self.logger.info(f"  {i}. {task['id']}: {task.get('title', 'Untitled')} (priority={task.get('priority', 'low')})")
 
-            # Process each task
-            for i, task in enumerate(tasks, 1):
-                self.logger.info(f"\n{'='*60}")
-                self.logger.info(f"Processing task {i}/{len(tasks)}: {task['id']}")
-                self.logger.info(f"{'='*60}")
-
-                # Check safety limits
-                can_continue, reason = self.session_mgr.check_can_continue()
-                if not can_continue:
-                    self.logger.error(f"Safety limit hit: {reason}")
-                    self.logger.error("Stopping session early")
-                    break
-
-                # Dry-run mode
-                if self.dry_run:
+            # Dry-run mode
+            if self.dry_run:
+                for task in tasks:
                     self.logger.info(f"[DRY RUN] Would execute {task['id']}: {task.get('title', 'Untitled')}")
                     self.logger.info(f"[DRY RUN] Priority: {task.get('priority', 'low')}, Labels: {task.get('labels', [])}")
-                    continue
+                return self._build_summary()
 
-                # Execute with recovery
-                success = self._execute_task_with_recovery(task)
+            # Process tasks in parallel slots
+            runner = ParallelTaskRunner(
+                execute=self._execute_slot,
+                max_concurrent=self.max_concurrent,
+                can_continue=self.session_mgr.check_can_continue
+            )
+            self._last_report = runner.run(tasks)
 
-                # Track result
-                if success:
-                    self.session_mgr.state.tasks_completed.append(task["id"])
-                    self.logger.info(f"✓ Task {task['id']} completed successfully")
-                else:
-                    self.session_mgr.state.tasks_failed.append(task["id"])
-                    self.logger.warning(f"✗ Task {task['id']} failed")
+            if self._last_report.stopped_reason:
+                self.logger.error(f"Safety limit hit: {self._last_report.stopped_reason}")
+                self.logger.error("Stopped session early")
 
             # Build summary
             summary = self._build_summary()
@@ -223,6 +228,27 @@ class ScaffoldOrchestrator:
 
         return False
 
+    def _execute_slot(self, task: Dict) -> bool:
+        """Run one task in a slot and record the outcome (thread-safe).
+
+        Args:
+            task: Task dict
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self.logger.info(f"Processing task {task['id']}: {task.get('title', 'Untitled')}")
+
+        success = self._execute_task_with_recovery(task)
+        self.session_mgr.mark_task_finished(task["id"], success)
+
+        if success:
+            self.logger.info(f"✓ Task {task['id']} completed successfully")
+        else:
+            self.logger.warning(f"✗ Task {task['id']} failed")
+
+        return success
+
     def _execute_task_with_recovery(self, task: Dict) -> bool:
         """Execute task with error handling and recovery.
 
@@ -248,9 +274,10 @@ class ScaffoldOrchestrator:
             handler = self.router.get_handler(handler_name)
             self.logger.info(f"Routing to {handler_name} handler")
 
-            # Execute
-            self.logger.info(f"Executing task via {handler_name}")
-            result = handler.execute(task, worktree_path)
+            # Execute within the slot's wall-clock budget
+            timeout_sec = max(1, int(min(self.slot_limits.timeout_sec, self.session_mgr.remaining_seconds())))
+            self.logger.info(f"Executing task via {handler_name} (budget {timeout_sec}s)")
+            result = handler.execute(task, worktree_path, timeout_sec=timeout_sec, limits=self.slot_limits)
 
             # Process result
             if result["success"]:
@@ -348,6 +375,12 @@ class ScaffoldOrchestrator:
             "total_duration_sec": state.total_duration_sec
         }
 
+        report = self._last_report
+        if report is not None:
+            summary["tasks_skipped"] = len(report.skipped)
+            summary["peak_concurrency"] = report.peak_concurrency
+            summary["wall_sec"] = report.wall_sec
+
         # Add safety stats if available
         try:
             summary["safety_stats"] = self.session_mgr.safety.get_stats()
@@ -0,0 +1,127 @@
+"""SCAFFOLD Platform - Parallel Task Runner
+
+Runs backlog tasks in a bounded pool of execution slots.
+
+Features:
+- N slots (threads); each task runs in its own worktree, so slots don't interfere
+- Safety limits checked before every dispatch; running tasks finish, no new
+  ones start once a limit is hit
+- Tasks start in priority order
+
+Batches come from TaskFetcher, which only returns tasks whose dependencies
+are already Done, so tasks in one batch never depend on each other.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunReport:
+    """Outcome of a parallel run.
+
+    Attributes:
+        completed: Task IDs that succeeded (in completion order)
+        failed: Task IDs that failed
+        skipped: task_id -> reason for tasks never started
+        stopped_reason: Safety limit that stopped dispatching (if any)
+        peak_concurrency: Most tasks running at once
+        wall_sec: Wall-clock duration of the run
+    """
+    completed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    stopped_reason: Optional[str] = None
+    peak_concurrency: int = 0
+    wall_sec: float = 0.0
+
+
+class ParallelTaskRunner:
+    """Execute tasks concurrently in a fixed number of slots.
+
+    Example:
+        >>> runner = ParallelTaskRunner(
+        ...     execute=orchestrator._execute_slot,
+        ...     max_concurrent=3,
+        ...     can_continue=session_mgr.check_can_continue
+        ... )
+        >>> report = runner.run(tasks)
+        >>> print(f"{len(report.completed)} done, peak {report.peak_concurrency} slots")
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[Dict], bool],
+        max_concurrent: int = 3,
+        can_continue: Optional[Callable[[], Tuple[bool, Optional[str]]]] = None
+    ):
+        """Initialize ParallelTaskRunner.
+
+        Args:
+            execute: Runs one task to completion; returns True on success.
+                Called from slot threads, so it must be thread-safe.
+            max_concurrent: Number of slots
+            can_continue: Safety check called before each dispatch
+        """
+        self.execute = execute
+        self.max_concurrent = max(1, max_concurrent)
+        self.can_continue = can_continue or (lambda: (True, None))
+
+    def run(self, tasks: List[Dict]) -> RunReport:
+        """Run tasks until all are done, skipped, or a safety limit is hit.
+
+        Args:
+            tasks: Task dicts in priority order
+
+        Returns:
+            RunReport
+        """
+        report = RunReport()
+        start = time.time()
+        pending = list(tasks)
+        running: Dict[Future, str] = {}
+
+        def slot(task: Dict) -> bool:
+            try:
+                return bool(self.execute(task))
+            except Exception as e:
+                logger.error(f"Slot error for {task['id']}: {e}", exc_info=True)
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="scaffold-slot") as pool:
+            while pending or running:
+                # Fill free slots, highest priority first
+                while pending and len(running) < self.max_concurrent and report.stopped_reason is None:
+                    can_continue, reason = self.can_continue()
+                    if not can_continue:
+                        report.stopped_reason = reason
+                        logger.error(f"Safety limit hit: {reason} - no new tasks will start")
+                        break
+
+                    task = pending.pop(0)
+                    logger.info(f"Starting {task['id']} ({len(running) + 1}/{self.max_concurrent} slots busy)")
+                    running[pool.submit(slot, task)] = task["id"]
+                    report.peak_concurrency = max(report.peak_concurrency, len(running))
+
+                if not running:
+                    # Nothing in flight and dispatching stopped
+                    for task in pending:
+                        report.skipped[task["id"]] = f"not started: {report.stopped_reason}"
+                    pending = []
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task_id = running.pop(future)
+                    if future.result():
+                        report.completed.append(task_id)
+                    else:
+                        report.failed.append(task_id)
+
+        report.wall_sec = time.time() - start
+        return report
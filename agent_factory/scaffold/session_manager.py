@@ -7,15 +7,20 @@ Features:
 - Integrates SafetyMonitor for cost/time/failure tracking
 - Persists session state to .scaffold/sessions/{id}.json
 - Resume functionality for interrupted sessions
+- Thread-safe: parallel slots update state under one lock, and the
+  state file is replaced atomically
 """
 
 import json
 import logging
+import os
+import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
 
-from agent_factory.scaffold.worktree_manager import WorktreeManager
+from agent_factory.scaffold.worktree_manager import WorktreeManager, WorktreePool
 from agent_factory.scaffold.models import SessionState
 
 # Import SafetyMonitor from scripts (absolute import)
@@ -62,7 +67,8 @@ class SessionManager:
         repo_root: Path,
         max_concurrent: int = 3,
         max_cost: float = 5.0,
-        max_time_hours: float = 4.0
+        max_time_hours: float = 4.0,
+        worktree_pool: Optional[WorktreePool] = None
     ):
         """Initialize SessionManager.
 
@@ -71,8 +77,12 @@ class SessionManager:
             max_concurrent: Maximum concurrent worktrees (default: 3)
             max_cost: Maximum API cost in USD (default: 5.0)
             max_time_hours: Maximum wall-clock time in hours (default: 4.0)
+            worktree_pool: Recycle pool worktrees instead of creating and
+                deleting one per task (optional)
         """
         self.repo_root = Path(repo_root).resolve()
+        self.worktree_pool = worktree_pool
+        self._lock = threading.RLock()
         self.max_cost = max_cost
         self.max_time_hours = max_time_hours
 
@@ -169,14 +179,19 @@ class SessionManager:
 
         logger.info(f"Allocating worktree for {task_id}")
 
-        worktree_path = self.worktree_mgr.create_worktree(
-            task_id=task_id,
-            creator="scaffold-orchestrator"
-        )
+        if self.worktree_pool is not None:
+            worktree_path = self.worktree_pool.acquire(task_id)
+        else:
+            with self._lock:
+                worktree_path = self.worktree_mgr.create_worktree(
+                    task_id=task_id,
+                    creator="scaffold-orchestrator"
+                )
 
         # Track in session state
-        self.state.tasks_in_progress[task_id] = worktree_path
-        self._save_state()
+        with self._lock:
+            self.state.tasks_in_progress[task_id] = worktree_path
+            self._save_state()
 
         logger.debug(f"Worktree allocated: {worktree_path}")
 
@@ -195,12 +210,17 @@ class SessionManager:
         logger.info(f"Cleaning up worktree for {task_id} (force={force})")
 
         try:
-            self.worktree_mgr.cleanup_worktree(task_id, force=force)
+            if self.worktree_pool is not None:
+                self.worktree_pool.release(task_id)
+            else:
+                with self._lock:
+                    self.worktree_mgr.cleanup_worktree(task_id, force=force)
 
             # Remove from session state
-            if task_id in self.state.tasks_in_progress:
-                del self.state.tasks_in_progress[task_id]
-                self._save_state()
+            with self._lock:
+                if task_id in self.state.tasks_in_progress:
+                    del self.state.tasks_in_progress[task_id]
+                    self._save_state()
 
             logger.debug(f"Worktree cleaned up: {task_id}")
 
@@ -219,7 +239,33 @@ class SessionManager:
         if not self.state:
             return False, "No active session"
 
-        return self.safety.check_limits()
+        with self._lock:
+            return self.safety.check_limits()
+
+    def remaining_seconds(self) -> float:
+        """Wall-clock time left before the session's time limit."""
+        if not self.state:
+            return 0.0
+
+        elapsed = (datetime.now() - datetime.fromisoformat(self.state.start_time)).total_seconds()
+        return max(0.0, self.state.max_time_hours * 3600 - elapsed)
+
+    def mark_task_finished(self, task_id: str, success: bool):
+        """Move a task to the completed or failed list.
+
+        Args:
+            task_id: Task identifier
+            success: True for completed, False for failed
+        """
+        if not self.state:
+            raise SessionManagerError("No active session")
+
+        with self._lock:
+            if success:
+                self.state.tasks_completed.append(task_id)
+            else:
+                self.state.tasks_failed.append(task_id)
+            self._save_state()
 
     def record_task_success(
         self,
@@ -237,18 +283,19 @@ class SessionManager:
         if not self.state:
             raise SessionManagerError("No active session")
 
-        # Update SafetyMonitor
-        self.safety.record_issue_success(
-            issue_number=task_id,
-            cost=cost,
-            duration_sec=duration_sec
-        )
+        with self._lock:
+            # Update SafetyMonitor
+            self.safety.record_issue_success(
+                issue_number=task_id,
+                cost=cost,
+                duration_sec=duration_sec
+            )
 
-        # Update session totals
-        self.state.total_cost += cost
-        self.state.total_duration_sec += duration_sec
+            # Update session totals
+            self.state.total_cost += cost
+            self.state.total_duration_sec += duration_sec
 
-        self._save_state()
+            self._save_state()
 
         logger.info(f"Task {task_id} success recorded (cost=${cost:.2f}, duration={duration_sec:.1f}s)")
 
@@ -268,18 +315,19 @@ class SessionManager:
         if not self.state:
             raise SessionManagerError("No active session")
 
-        # Update SafetyMonitor
-        self.safety.record_issue_failure(
-            issue_number=task_id,
-            error=error,
-            cost=cost
-        )
+        with self._lock:
+            # Update SafetyMonitor
+            self.safety.record_issue_failure(
+                issue_number=task_id,
+                error=error,
+                cost=cost
+            )
 
-        # Update session totals
-        if cost > 0:
-            self.state.total_cost += cost
+            # Update session totals
+            if cost > 0:
+                self.state.total_cost += cost
 
-        self._save_state()
+            self._save_state()
 
         logger.warning(f"Task {task_id} failure recorded: {error}")
 
@@ -305,15 +353,24 @@ class SessionManager:
         }
 
     def _save_state(self):
-        """Save session state to JSON file."""
+        """Save session state to JSON file (atomic replace, under the lock)."""
         if not self.state:
             return
 
         session_file = self._sessions_dir / f"{self.state.session_id}.json"
 
         try:
-            with open(session_file, 'w') as f:
-                json.dump(self.state.to_dict(), f, indent=2)
+            with self._lock:
+                data = json.dumps(self.state.to_dict(), indent=2)
+                # Readers never see a half-written file, even mid-crash
+                fd, tmp_path = tempfile.mkstemp(dir=self._sessions_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        f.write(data)
+                    os.replace(tmp_path, session_file)
+                except BaseException:
+                    Path(tmp_path).unlink(missing_ok=True)
+                    raise
 
             logger.debug(f"Session state saved: {session_file}")
 
@@ -11,9 +11,11 @@ import time
 import re
 import logging
 import subprocess
-from typing import Dict
+from typing import Dict, Optional
 from pathlib import Path
 
+from agent_factory.scaffold.models import SlotLimits
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,7 +94,8 @@ class ClaudeCodeHandler:
         self,
         task: Dict,
         worktree_path: str,
-        timeout_sec: int = 1800
+        timeout_sec: int = 1800,
+        limits: Optional[SlotLimits] = None
     ) -> Dict:
         """Execute task via Claude Code CLI.
 
@@ -100,6 +103,7 @@ class ClaudeCodeHandler:
             task: Task dict with title, description, acceptance_criteria
             worktree_path: Absolute path to worktree
             timeout_sec: Timeout in seconds (default: 1800 = 30 min)
+            limits: Optional memory/CPU limits for the CLI process
 
         Returns:
             Result dict with keys: success, output, cost, duration_sec, files_changed
@@ -125,12 +129,11 @@ class ClaudeCodeHandler:
         start_time = time.time()
 
         try:
-            result = subprocess.run(
+            result = self._run_cli(
                 ["claude", "code", "execute", "--cwd", worktree_path],
-                input=prompt,
-                capture_output=True,
-                text=True,
-                timeout=timeout_sec
+                prompt,
+                timeout_sec,
+                limits
             )
 
             duration = time.time() - start_time
@@ -168,6 +171,35 @@ class ClaudeCodeHandler:
             logger.error(f"Unexpected error executing task: {e}")
             raise TaskExecutionError(f"Execution error: {e}") from e
 
+    def _run_cli(
+        self,
+        cmd: list,
+        prompt: str,
+        timeout_sec: int,
+        limits: Optional[SlotLimits] = None
+    ) -> subprocess.CompletedProcess:
+        """Run the CLI like subprocess.run, applying slot limits after spawn.
+
+        Raises:
+            subprocess.TimeoutExpired: If timeout_sec elapses (process is killed)
+        """
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        ) as process:
+            if limits and not limits.apply(process.pid):
+                logger.warning("Slot memory/CPU limits not supported on this platform")
+            try:
+                stdout, stderr = process.communicate(prompt, timeout=timeout_sec)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
     def _build_prompt(self, task: Dict) -> str:
         """Build prompt from task specification.
 
@@ -271,7 +303,8 @@ class ManualActionHandler:
         self,
         task: Dict,
         worktree_path: str,
-        timeout_sec: int = 1800
+        timeout_sec: int = 1800,
+        limits: Optional[SlotLimits] = None
     ) -> Dict:
         """Flag task as requiring manual intervention.
 
@@ -279,6 +312,7 @@ class ManualActionHandler:
             task: Task dict
             worktree_path: Worktree path (unused for manual tasks)
             timeout_sec: Timeout (unused for manual tasks)
+            limits: Slot limits (unused for manual tasks)
 
         Returns:
             Result dict indicating manual action required
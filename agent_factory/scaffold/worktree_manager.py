@@ -6,7 +6,10 @@ Extracted and enhanced from agentcli.py (lines 675-940).
 """
 
 import json
+import os
 import subprocess
+import tempfile
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -344,3 +347,238 @@ class WorktreeManager:
 
         with open(self.metadata_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class WorktreePool:
+    """Fixed set of reusable worktrees, one per execution slot.
+
+    Creating a worktree checks out the whole tree and deleting it throws away
+    ignored build artifacts (venvs, caches) that the next task would rebuild.
+    The pool creates each slot once at ../agent-factory-slot-{n} and, per task,
+    only moves it to a fresh branch:
+
+    - acquire: worktree add -b (new slot) or reset, clean and checkout -b
+      (recycled slot) autonomous/{task-id} at base_ref
+    - release: detach, reset, clean (ignored files kept), delete the branch
+
+    An existing autonomous/{task-id} branch is never reset: acquire raises
+    WorktreeExistsError instead, like WorktreeManager.create_worktree. Busy
+    slots are recorded in .scaffold/worktrees.json alongside WorktreeManager
+    entries.
+
+    Git commands that write the shared repository (worktree add, branch
+    creation/deletion) are serialized; per-worktree reset/clean run in parallel.
+
+    Example:
+        >>> pool = WorktreePool(repo_root=Path.cwd(), size=3)
+        >>> path = pool.acquire("task-42")
+        >>> pool.release("task-42")
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        size: int = 3,
+        base_ref: str = "HEAD",
+        slot_prefix: str = "agent-factory-slot",
+        metadata_path: Optional[Path] = None,
+        creator: str = "scaffold-pool"
+    ):
+        """Initialize WorktreePool.
+
+        Args:
+            repo_root: Root directory of git repository
+            size: Number of slots (maximum concurrent tasks)
+            base_ref: Ref new task branches start from (resolved at acquire time)
+            slot_prefix: Directory name prefix for slot worktrees
+            metadata_path: Path to metadata JSON file (default: .scaffold/worktrees.json)
+            creator: Creator recorded in worktree metadata
+        """
+        self.repo_root = Path(repo_root).resolve()
+        self.size = size
+        self.base_ref = base_ref
+        self.creator = creator
+        self.metadata_path = metadata_path or (self.repo_root / ".scaffold" / "worktrees.json")
+        self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        self.slot_paths = [self.repo_root.parent / f"{slot_prefix}-{i}" for i in range(size)]
+        self.created = 0  # Slots created by this pool (recycled ones don't count)
+        self.reused = 0
+
+        self._assigned: Dict[str, int] = {}  # clean task_id -> slot index
+        self._free = list(range(size))
+        self._lock = threading.Lock()  # Pool bookkeeping and worktrees.json
+        self._git_lock = threading.Lock()  # Writes to the shared .git
+
+        # This pool owns the slots: entries left by a previous run are stale
+        self._update_metadata(drop_slots=True)
+
+    def _git(self, args: List[str], cwd: Path, shared: bool = False) -> subprocess.CompletedProcess:
+        if shared:
+            with self._git_lock:
+                return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+        return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+
+    def _update_metadata(
+        self,
+        add: Optional[WorktreeMetadata] = None,
+        remove: Optional[str] = None,
+        drop_slots: bool = False
+    ) -> None:
+        """Read-modify-write worktrees.json (caller must not hold the lock)."""
+        slot_paths = {str(path) for path in self.slot_paths}
+        with self._lock:
+            data = {}
+            if self.metadata_path.exists():
+                try:
+                    data = json.loads(self.metadata_path.read_text(encoding="utf-8"))
+                except json.JSONDecodeError:
+                    data = {}
+            if drop_slots:
+                data = {k: v for k, v in data.items() if v.get("worktree_path") not in slot_paths}
+            if remove is not None:
+                data.pop(remove, None)
+            if add is not None:
+                data[add.task_id] = add.to_dict()
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.metadata_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.metadata_path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+    def _branch_exists(self, branch: str) -> bool:
+        result = self._git(["rev-parse", "--verify", "--quiet", f"refs/heads/{branch}"], self.repo_root)
+        return result.returncode == 0
+
+    def _checkout_branch(self, path: Path, branch: str, base: str) -> None:
+        """Create branch at base in the slot, adding the slot worktree if needed."""
+        if (path / ".git").exists():
+            self._scrub(path)
+            result = self._git(["checkout", "--quiet", "-b", branch, base], path, shared=True)
+            if result.returncode != 0:
+                raise WorktreeManagerError(f"Failed to check out task branch: {result.stderr}")
+            self.reused += 1
+            return
+
+        result = self._git(["worktree", "add", "-b", branch, str(path), base], self.repo_root, shared=True)
+        if result.returncode != 0:
+            raise WorktreeManagerError(f"Failed to create pool worktree: {result.stderr}")
+        self.created += 1
+
+    def _scrub(self, path: Path) -> None:
+        """Drop uncommitted changes and untracked files (ignored files stay)."""
+        for args in (["reset", "--hard", "--quiet"], ["clean", "-fd", "--quiet"]):
+            result = self._git(args, path)
+            if result.returncode != 0:
+                raise WorktreeManagerError(f"Failed to reset pool worktree {path}: {result.stderr}")
+
+    def acquire(self, task_id: str) -> str:
+        """Check out a fresh autonomous/{task-id} branch in a free slot.
+
+        Args:
+            task_id: Task identifier (e.g., "task-42")
+
+        Returns:
+            str: Absolute path to the slot worktree
+
+        Raises:
+            WorktreeExistsError: If the task already holds a slot or its branch exists
+            WorktreeLimitError: If every slot is in use
+            WorktreeManagerError: If a git command fails
+        """
+        if not task_id or not task_id.strip():
+            raise WorktreeManagerError("task_id cannot be empty")
+        clean_id = task_id.lower().replace(" ", "-").replace("_", "-")
+
+        with self._lock:
+            if clean_id in self._assigned:
+                raise WorktreeExistsError(f"Task '{clean_id}' already holds a pool slot")
+            if not self._free:
+                raise WorktreeLimitError(
+                    f"All {self.size} pool slots in use: {sorted(self._assigned)}"
+                )
+            slot = self._free.pop(0)
+            self._assigned[clean_id] = slot
+
+        path = self.slot_paths[slot]
+        branch_name = f"autonomous/{clean_id}"
+        try:
+            if self._branch_exists(branch_name):
+                raise WorktreeExistsError(
+                    f"Branch '{branch_name}' already exists (left by an earlier run?)"
+                )
+            base = self._git(["rev-parse", self.base_ref], self.repo_root)
+            if base.returncode != 0:
+                raise WorktreeManagerError(f"Cannot resolve {self.base_ref}: {base.stderr}")
+
+            self._checkout_branch(path, branch_name, base.stdout.strip())
+        except Exception:
+            with self._lock:
+                del self._assigned[clean_id]
+                self._free.append(slot)
+            raise
+
+        self._update_metadata(add=WorktreeMetadata(
+            task_id=clean_id,
+            worktree_path=str(path),
+            branch_name=branch_name,
+            created_at=datetime.now(timezone.utc).isoformat(),
+            creator=self.creator,
+            status="active",
+            pr_url=None
+        ))
+        return str(path)
+
+    def release(self, task_id: str, delete_branch: bool = True) -> bool:
+        """Return a task's slot to the pool.
+
+        Args:
+            task_id: Task identifier
+            delete_branch: Delete autonomous/{task-id} after detaching (default: True)
+
+        Returns:
+            bool: True if successful
+
+        Raises:
+            WorktreeNotFoundError: If the task holds no slot
+            WorktreeManagerError: If the slot cannot be reset
+        """
+        clean_id = task_id.lower().replace(" ", "-").replace("_", "-")
+
+        with self._lock:
+            if clean_id not in self._assigned:
+                raise WorktreeNotFoundError(f"Task '{clean_id}' holds no pool slot")
+            slot = self._assigned[clean_id]
+
+        path = self.slot_paths[slot]
+        try:
+            self._git(["checkout", "--quiet", "--detach"], path)
+            self._scrub(path)
+            if delete_branch:
+                self._git(["branch", "-D", f"autonomous/{clean_id}"], self.repo_root, shared=True)
+        finally:
+            with self._lock:
+                del self._assigned[clean_id]
+                self._free.append(slot)
+            self._update_metadata(remove=clean_id)
+
+        return True
+
+    def in_use(self) -> Dict[str, str]:
+        """Return task_id -> slot path for every busy slot."""
+        with self._lock:
+            return {task_id: str(self.slot_paths[slot]) for task_id, slot in self._assigned.items()}
+
+    def remove_all(self) -> None:
+        """Delete every slot worktree (e.g. when shrinking the pool)."""
+        with self._lock:
+            if self._assigned:
+                raise WorktreeManagerError(f"Pool slots still in use: {sorted(self._assigned)}")
+
+        for path in self.slot_paths:
+            if (path / ".git").exists():
+                self._git(["worktree", "remove", "--force", str(path)], self.repo_root, shared=True)
+        self._git(["worktree", "prune"], self.repo_root, shared=True)
@@ -29,6 +29,8 @@ from .response_gap_filler import (
     KnowledgeGap,
     GapType,
     FilledGap,
+    GapFillQueue,
+    gap_signature,
 )
 
 # File tools (Phase 4)
@@ -84,6 +86,8 @@ __all__ = [
     "KnowledgeGap",
     "GapType",
     "FilledGap",
+    "GapFillQueue",
+    "gap_signature",
     # File tools
     "ReadFileTool",
     "WriteFileTool",
@@ -15,6 +15,10 @@ Usage:
         if gap:
             filled = await filler.fill_gap(gap)
             # New atoms are now in KB
+
+    # Or without blocking the user's response (concurrent hits on the same
+    # gap share one fill)
+    gap = filler.detect_and_schedule(query, search_results, confidence)
 """
 
 import asyncio
@@ -117,6 +121,101 @@ class AtomCandidate(BaseModel):
     embedding: Optional[List[float]] = None
 
 
+def gap_signature(gap: KnowledgeGap) -> str:
+    """
+    Identity of a gap for deduplicating fills.
+
+    Two users asking about the same fault code on the same drive produce the
+    same signature even if they phrase the question differently. Gaps with no
+    extracted entities fall back to the normalized query text.
+    """
+    entities = [
+        gap.extracted_manufacturer,
+        gap.extracted_equipment_type,
+        gap.extracted_model,
+        gap.extracted_fault_code,
+    ]
+    parts = [str(gap.gap_type)] + [(e or "").strip().lower() for e in entities]
+    if not any(entities):
+        parts.append(" ".join(gap.original_query.lower().split()))
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+class GapFillQueue:
+    """
+    Background queue for gap fills.
+
+    Fills run as asyncio tasks on the caller's event loop, at most
+    `max_concurrent` at a time, so research never sits on a user's request
+    path. A gap whose signature is already queued or running joins the
+    existing fill instead of starting a second one.
+    """
+
+    def __init__(self, filler: "KnowledgeGapFiller", max_concurrent: int = 2, max_pending: int = 50):
+        """
+        Args:
+            filler: KnowledgeGapFiller whose fill_gap() does the work
+            max_concurrent: Fills running at once
+            max_pending: Queued + running fills before new gaps are dropped
+        """
+        self.filler = filler
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"submitted": 0, "deduplicated": 0, "completed": 0, "failed": 0, "dropped": 0}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def submit(self, gap: KnowledgeGap) -> Optional[asyncio.Future]:
+        """
+        Queue a gap fill (must be called from a running event loop).
+
+        Returns:
+            Future resolving to the FilledGap (shared with any concurrent
+            submit of the same gap), or None if the queue is full
+        """
+        signature = gap_signature(gap)
+        existing = self._in_flight.get(signature)
+        if existing is not None:
+            self.stats["deduplicated"] += 1
+            logger.info(f"Gap {gap.gap_id} joins in-flight fill {signature}")
+            return existing
+
+        if len(self._in_flight) >= self.max_pending:
+            self.stats["dropped"] += 1
+            logger.warning(f"Gap fill queue full ({self.max_pending}), dropping: {gap.description}")
+            return None
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        self.stats["submitted"] += 1
+        task = asyncio.get_running_loop().create_task(self._run(signature, gap))
+        self._in_flight[signature] = task
+        return task
+
+    async def _run(self, signature: str, gap: KnowledgeGap) -> FilledGap:
+        try:
+            async with self._semaphore:
+                filled = await self.filler.fill_gap(gap)
+            self.stats["completed"] += 1
+            return filled
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Background gap fill failed for {gap.gap_id}: {e}")
+            raise
+        finally:
+            self._in_flight.pop(signature, None)
+
+    async def join(self) -> None:
+        """Wait for all queued and running fills to finish."""
+        while self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+
+
 # ============================================================================
 # Gap Detector
 # ============================================================================
@@ -315,8 +414,11 @@ class KnowledgeGapFiller:
     2. Generate research task
     3. Execute research via ResearchExecutorTool
     4. Parse results into atom candidates
-    5. Insert atoms into knowledge base
+    5. Embed all atoms in one batch, write them with one multi-row upsert
     6. Return filled gap report
+
+    detect_and_fill() / schedule_fill() run fills through a background
+    GapFillQueue, deduplicated by gap signature.
     """
 
     def __init__(
@@ -325,6 +427,7 @@ class KnowledgeGapFiller:
         research_executor: Optional[ResearchExecutorTool] = None,
         auto_insert: bool = True,
         require_approval: bool = False,
+        max_concurrent_fills: int = 2,
     ):
         self.kb_client = kb_client
         self.research_executor = research_executor or ResearchExecutorTool()
@@ -332,6 +435,7 @@ class KnowledgeGapFiller:
         self.require_approval = require_approval
 
         self.gap_detector = ResponseGapDetector()
+        self.fill_queue = GapFillQueue(self, max_concurrent=max_concurrent_fills)
         self._pending_atoms: Dict[str, AtomCandidate] = {}
         self._db_manager = None  # Lazy-init singleton
 
@@ -352,16 +456,44 @@ class KnowledgeGapFiller:
         """
         Detect gap and fill it if found.
 
-        Convenience method that combines detection and filling.
+        Convenience method that combines detection and filling. Waits for the
+        fill; concurrent calls for the same gap share a single fill.
         """
         gap = self.gap_detector.detect(query, search_results, response_confidence)
 
         if gap:
             logger.info(f"Detected knowledge gap: {gap.gap_type} - {gap.description}")
-            return await self.fill_gap(gap)
+            future = self.schedule_fill(gap)
+            if future is None:
+                return None
+            return await asyncio.shield(future)
 
         return None
 
+    def detect_and_schedule(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        response_confidence: float,
+    ) -> Optional[KnowledgeGap]:
+        """
+        Detect gap and queue a background fill without waiting for it.
+
+        Returns:
+            The detected gap (fill queued or joined), or None if no gap
+        """
+        gap = self.gap_detector.detect(query, search_results, response_confidence)
+
+        if gap:
+            logger.info(f"Detected knowledge gap: {gap.gap_type} - {gap.description} (background fill)")
+            self.schedule_fill(gap)
+
+        return gap
+
+    def schedule_fill(self, gap: KnowledgeGap) -> Optional[asyncio.Future]:
+        """Queue fill_gap(gap) in the background (see GapFillQueue.submit)."""
+        return self.fill_queue.submit(gap)
+
     async def fill_gap(self, gap: KnowledgeGap) -> FilledGap:
         """
         Fill a detected knowledge gap via research.
@@ -573,12 +705,23 @@ class KnowledgeGapFiller:
         #     logger.warning("No KB client configured, atoms not inserted")
         #     return created, updated
 
+        if not atoms:
+            return created, updated, failures
+
+        # One embedding request for the whole fill
+        embeddings = await self._generate_embeddings([atom.content for atom in atoms])
+        for atom, embedding in zip(atoms, embeddings, strict=True):
+            atom.embedding = embedding
+
+        # One multi-row upsert; fall back to row-by-row to isolate bad rows
+        try:
+            created, updated = await self._upsert_atoms(atoms)
+            return created, updated, failures
+        except Exception as e:
+            logger.warning(f"Bulk upsert of {len(atoms)} atoms failed, retrying row by row: {e}")
+
         for atom in atoms:
             try:
-                # Generate embedding
-                embedding = await self._generate_embedding(atom.content)
-                atom.embedding = embedding
-
                 # Check if exists
                 existing = await self._check_existing_atom(atom.id)
 
@@ -602,16 +745,20 @@ class KnowledgeGapFiller:
 
         return created, updated, failures
 
-    async def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for atom content"""
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in one batched request"""
         try:
             from langchain_openai import OpenAIEmbeddings
 
             embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-            return await embeddings.aembed_query(text)
+            return await embeddings.aembed_documents(texts)
         except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            return []
+            logger.error(f"Failed to generate embeddings for {len(texts)} texts: {e}")
+            return [[] for _ in texts]
+
+    async def _generate_embedding(self, text: str) -> List[float]:
+        """Generate embedding for atom content"""
+        return (await self._generate_embeddings([text]))[0]
 
     async def _check_existing_atom(self, atom_id: str) -> bool:
         """Check if atom already exists in KB (CORRECTED)"""
@@ -688,6 +835,88 @@ class KnowledgeGapFiller:
 
         logger.info(f"Inserted research atom: {atom.id} - {atom.title}")
 
+    async def _upsert_atoms(self, atoms: List[AtomCandidate]) -> Tuple[List[str], List[str]]:
+        """
+        Insert or update atoms with a single multi-row statement.
+
+        Conflicting atom_ids get the same columns _update_atom() sets.
+        RETURNING (xmax = 0) tells inserted rows from updated ones.
+
+        Returns:
+            Tuple of (created_ids, updated_ids)
+        """
+        db = self.db_manager
+
+        # Duplicate ids in one statement would make ON CONFLICT fail; last wins
+        unique = list({atom.id: atom for atom in atoms}.values())
+        now = datetime.utcnow()
+
+        rows = []
+        params: List[Any] = []
+        for atom in unique:
+            rows.append("(" + ", ".join(["%s"] * 15) + ")")
+            params.extend(self._atom_row(atom, now))
+
+        sql = f"""
+            INSERT INTO knowledge_atoms (
+                atom_id,
+                atom_type,
+                title,
+                summary,
+                content,
+                manufacturer,
+                product_family,
+                difficulty,
+                source_document,
+                source_pages,
+                source_url,
+                quality_score,
+                embedding,
+                created_at,
+                updated_at
+            ) VALUES {", ".join(rows)}
+            ON CONFLICT (atom_id) DO UPDATE
+            SET content = EXCLUDED.content,
+                quality_score = EXCLUDED.quality_score,
+                embedding = EXCLUDED.embedding,
+                updated_at = EXCLUDED.updated_at
+            RETURNING atom_id, (xmax = 0) AS inserted
+        """
+
+        result = await asyncio.to_thread(db.execute_query, sql, tuple(params), "all")
+
+        created = [row[0] for row in result or [] if row[1]]
+        updated = [row[0] for row in result or [] if not row[1]]
+        logger.info(f"Upserted {len(unique)} research atoms ({len(created)} new, {len(updated)} updated)")
+        return created, updated
+
+    @staticmethod
+    def _atom_row(atom: AtomCandidate, now: datetime) -> Tuple:
+        """Column values for _upsert_atoms(), same mapping as _insert_atom()"""
+        summary = atom.content[:200] if len(atom.content) > 200 else atom.content
+        embedding_vector = f"[{','.join(map(str, atom.embedding))}]" if atom.embedding else None
+        product_family = getattr(atom, 'product_family', None) or \
+                        getattr(atom, 'equipment_type', None) or \
+                        'Unknown'
+
+        return (
+            atom.id,
+            'concept',
+            atom.title,
+            summary,
+            atom.content,
+            atom.manufacturer or 'Unknown',
+            product_family,
+            'intermediate',
+            atom.sources[0] if atom.sources else 'Autonomous Research',
+            [],
+            atom.sources[0] if atom.sources else None,
+            atom.confidence_score,
+            embedding_vector,
+            now,
+            now,
+        )
+
     async def _update_atom(self, atom: AtomCandidate) -> None:
         """Update existing atom in KB (CORRECTED)"""
         db = self.db_manager
@@ -812,6 +1041,28 @@ class RivetCEOGapIntegration:
             response_confidence=response_confidence,
         )
 
+    def check_and_schedule(
+        self,
+        query: str,
+        kb_results: List[Dict[str, Any]],
+        response_confidence: float,
+        manufacturer: Optional[str] = None,
+    ) -> Optional[KnowledgeGap]:
+        """
+        Check for knowledge gap and fill it in the background.
+
+        Returns immediately; use this on the user's request path and answer
+        with what the KB has now. Returns the detected gap, if any.
+        """
+        if manufacturer:
+            self.filler.gap_detector.KNOWN_MANUFACTURERS.add(manufacturer.lower())
+
+        return self.filler.detect_and_schedule(
+            query=query,
+            search_results=kb_results,
+            response_confidence=response_confidence,
+        )
+
     async def research_manufacturer(
         self,
         manufacturer: str,
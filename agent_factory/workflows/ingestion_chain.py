@@ -6,6 +6,8 @@ Knowledge Base Ingestion Chain - LangGraph-Powered Pipeline
 1. Source Acquisition - Download PDFs, scrape web, fetch YouTube transcripts
 2. Content Extraction - Parse text, preserve structure, identify content types
 3. Semantic Chunking - Split into coherent atom candidates (200-400 words)
+   (+ Change Detection - diff chunk hashes against the source's manifest so
+   only added/changed chunks reach the LLM; removed chunks are tombstoned)
 4. Atom Generation - LLM extraction → structured Pydantic models
 5. Quality Validation - 5-dimension scoring (completeness, clarity, accuracy)
 6. Embedding Generation - OpenAI text-embedding-3-small (1536-dim vectors)
@@ -39,6 +41,14 @@ from agent_factory.memory.storage import SupabaseMemoryStorage
 from core.models import LearningObject, PLCAtom, EducationalLevel, Status
 from agent_factory.core.database_manager import DatabaseManager
 from agent_factory.observability import IngestionMonitor, TelegramNotifier
+from agent_factory.http import get_fetch_service
+from agent_factory.workflows.ingestion_manifest import (
+    SourceManifest,
+    STATUS_REJECTED,
+    STATUS_STORED,
+    atom_id_for,
+    chunk_hash,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -159,9 +169,18 @@ class IngestionState(TypedDict):
     current_stage: str
     retry_count: int
 
+    # Incremental re-ingestion (chunk hashes, see ingestion_manifest.py)
+    incremental: bool
+    reused_atom_ids: List[str]
+    restored_chunks: List[str]
+    removed_chunks: List[str]
+    rejected_chunks: List[str]
+
     # Results
     atoms_created: int
     atoms_failed: int
+    atoms_reused: int
+    atoms_tombstoned: int
 
 
 # ============================================================================
@@ -177,7 +196,8 @@ def source_acquisition_node(state: IngestionState) -> IngestionState:
     - YouTube videos (fetch transcript)
     - Web pages (scrape HTML)
 
-    Deduplication: Hash URL → skip if already processed
+    Deduplication: Hash URL → skip if already processed, unless the run is
+    incremental (then the source is re-fetched and diffed chunk by chunk)
     """
     logger.info(f"[Stage 1] Acquiring source: {state['url']}")
     state["current_stage"] = "acquisition"
@@ -188,6 +208,7 @@ def source_acquisition_node(state: IngestionState) -> IngestionState:
 
         # Check for duplicates via URL hash
         url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+        already_seen = False
 
         try:
             duplicate_check = storage.client.table("source_fingerprints") \
@@ -196,9 +217,12 @@ def source_acquisition_node(state: IngestionState) -> IngestionState:
                 .execute()
 
             if duplicate_check.data:
-                logger.warning(f"Source already processed: {url}")
-                state["errors"].append(f"Duplicate source: {url}")
-                return state
+                if not state.get("incremental"):
+                    logger.warning(f"Source already processed: {url}")
+                    state["errors"].append(f"Duplicate source: {url}")
+                    return state
+                already_seen = True
+                logger.info(f"Source seen before - re-ingesting incrementally: {url}")
         except Exception as e:
             # Gracefully degrade if source_fingerprints table doesn't exist
             error_msg = str(e)
@@ -233,12 +257,13 @@ def source_acquisition_node(state: IngestionState) -> IngestionState:
 
         # Store fingerprint to prevent re-processing
         try:
-            storage.client.table("source_fingerprints").insert({
-                "fingerprint": url_hash,
-                "url": url,
-                "source_type": state["source_type"],
-                "processed_at": datetime.utcnow().isoformat()
-            }).execute()
+            if not already_seen:
+                storage.client.table("source_fingerprints").insert({
+                    "fingerprint": url_hash,
+                    "url": url,
+                    "source_type": state["source_type"],
+                    "processed_at": datetime.utcnow().isoformat()
+                }).execute()
         except Exception as e:
             # Gracefully degrade if source_fingerprints table doesn't exist
             error_msg = str(e)
@@ -277,47 +302,30 @@ def _download_pdf(url: str) -> tuple[str, Dict[str, Any]]:
     }
 
     try:
-        # STEP 1: Check for redirects (HEAD request first)
-        try:
-            head_response = requests.head(url, timeout=10, allow_redirects=False)
-
-            # Detect redirect status codes
-            if head_response.status_code in [301, 302, 303, 307, 308]:
-                metadata["is_direct_pdf"] = False
-                metadata["redirect_url"] = head_response.headers.get('Location', 'Unknown')
-                logger.warning(f"URL is a redirect ({head_response.status_code}): {url} -> {metadata['redirect_url']}")
-        except Exception as e:
-            logger.warning(f"HEAD request failed, proceeding with GET: {e}")
+        # STEP 1: Stream to disk through the shared fetch service (pooled
+        # connections, size cap, ETag/Last-Modified revalidation on re-ingest)
+        output_dir = Path("data/sources/pdfs")
+        filename = Path(urlparse(url).path).name or "downloaded.pdf"
+        output_path = output_dir / filename
 
-        # STEP 2: Download PDF
-        response = requests.get(url, timeout=30, allow_redirects=True)
-        response.raise_for_status()
+        result = get_fetch_service().download_sync(url, output_path)
+        result.raise_for_status()
 
         # Check if final URL is different (redirect happened)
-        if response.url != url:
+        if result.redirected or result.url != url:
             metadata["is_direct_pdf"] = False
-            metadata["redirect_url"] = response.url
-            logger.warning(f"Redirect detected: {url} -> {response.url}")
+            metadata["redirect_url"] = result.url
+            logger.warning(f"Redirect detected: {url} -> {result.url}")
 
         # Check Content-Type
-        content_type = response.headers.get('Content-Type', '')
+        content_type = result.headers.get('content-type', '')
         if 'application/pdf' not in content_type and 'pdf' not in content_type.lower():
             logger.warning(f"Content-Type is not PDF: {content_type}")
             metadata["is_direct_pdf"] = False
 
-        # STEP 3: Save to temp directory
-        output_dir = Path("data/sources/pdfs")
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        filename = Path(urlparse(url).path).name or "downloaded.pdf"
-        output_path = output_dir / filename
-
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+        metadata["file_size_kb"] = result.size // 1024
 
-        metadata["file_size_kb"] = len(response.content) // 1024
-
-        # STEP 4: Extract text + page count using PyPDF2
+        # STEP 2: Extract text + page count using PyPDF2
         from PyPDF2 import PdfReader
 
         reader = PdfReader(output_path)
@@ -682,6 +690,57 @@ def chunking_node(state: IngestionState) -> IngestionState:
     return state
 
 
+def change_detection_node(state: IngestionState) -> IngestionState:
+    """
+    Diff semantic chunks against the source's ingestion manifest.
+
+    Each chunk is keyed by a content hash. Chunks already in the manifest
+    reuse their stored atom (and embedding); only added or edited chunks stay
+    in state["chunks"] for the LLM stages. Chunks that disappeared since the
+    last run are queued for tombstoning in the storage stage.
+
+    On a first run the manifest is empty, so every chunk is "changed".
+    """
+    logger.info("[Stage 3b] Detecting changed chunks")
+    state["current_stage"] = "change_detection"
+
+    chunks = state.get("chunks", [])
+    if not chunks:
+        # Nothing extracted (download/parse failure) - never treat that as
+        # "every page was removed"
+        return state
+
+    try:
+        manifest = SourceManifest.load(state["url"])
+        diff = manifest.diff(chunks)
+
+        state["chunks"] = diff.changed
+        state["reused_atom_ids"] = diff.reused_atom_ids
+        state["restored_chunks"] = [entry["chunk_hash"] for entry in diff.restored]
+        state["removed_chunks"] = diff.removed_hashes
+        state["atoms_reused"] = len(diff.reused_atom_ids)
+
+        counts = diff.summary()
+        logger.info(
+            f"[Stage 3b] {counts['changed']} changed, {counts['unchanged']} unchanged, "
+            f"{counts['restored']} restored, {counts['removed']} removed chunks"
+        )
+
+    except Exception as e:
+        # Manifest trouble must never block ingestion - fall back to a full run,
+        # still under chunk-derived atom ids so the next run can reconcile them
+        logger.warning(f"[Stage 3b] Change detection failed, processing all chunks: {e}")
+        for chunk in chunks:
+            chunk.setdefault("chunk_hash", chunk_hash(chunk["text"]))
+
+    return state
+
+
+def _route_after_change_detection(state: IngestionState) -> str:
+    """Skip the LLM stages entirely when no chunk changed."""
+    return "generate" if state.get("chunks") else "store"
+
+
 # ============================================================================
 # Stage 4: Atom Generation
 # ============================================================================
@@ -707,7 +766,9 @@ def atom_generation_node(state: IngestionState) -> IngestionState:
         llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
 
         atoms = []
-        for i, chunk in enumerate(chunks[:50]):  # Limit to first 50 chunks for now
+        # Every changed chunk: a capped run would leave the tail of a long
+        # source out of the manifest and of the knowledge base
+        for i, chunk in enumerate(chunks):
             try:
                 atom_dict = _generate_atom_from_chunk(llm, chunk, state["source_metadata"])
                 if atom_dict:
@@ -779,6 +840,11 @@ Focus on clarity, accuracy, and educational value. Return only valid JSON."""
             logger.error(f"LLM response (first 200 chars): {atom_json[:200]}")
             return None
 
+        # Stable id per (source, chunk content) so re-runs upsert in place
+        if chunk.get("chunk_hash"):
+            atom_dict["id"] = atom_id_for(source_metadata["url_hash"], chunk["chunk_hash"])
+            atom_dict["chunk_hash"] = chunk["chunk_hash"]
+
         # Add source metadata
         atom_dict["source_urls"] = [source_metadata["url"]]
         atom_dict["citation"] = f"Source: {source_metadata['url']}"
@@ -833,6 +899,9 @@ def quality_validation_node(state: IngestionState) -> IngestionState:
                     validated_atoms.append(atom)
                 else:
                     logger.warning(f"Atom failed validation (score: {score}): {atom.get('title', 'Unknown')}")
+                    # Remember the chunk so an unchanged re-run doesn't pay to reject it again
+                    if atom.get("chunk_hash"):
+                        state.setdefault("rejected_chunks", []).append(atom["chunk_hash"])
                     # TODO: Route to human review queue
 
             except Exception as e:
@@ -940,29 +1009,37 @@ def storage_node(state: IngestionState) -> IngestionState:
     Save atoms to Supabase knowledge_atoms table.
 
     Includes:
-    - Deduplication check
+    - Deduplication check (stable atom ids, upsert on atom_id)
     - Retry logic (3x exponential backoff)
     - Error logging to failed_ingestions table
+    - Tombstoning atoms whose chunks were removed from the source
+    - Tombstoning (once) pre-manifest atoms of the source, whose random ids
+      no chunk maps to
+    - Updating the source's ingestion manifest
     """
     logger.info("[Stage 7] Storing atoms to Supabase")
     state["current_stage"] = "storage"
 
     try:
         atoms = state.get("validated_atoms", [])
+        removed_chunks = state.get("removed_chunks", [])
+        restored_chunks = state.get("restored_chunks", [])
+        rejected_chunks = state.get("rejected_chunks", [])
 
-        if not atoms:
+        if not atoms and not (removed_chunks or restored_chunks or rejected_chunks or state.get("reused_atom_ids")):
             state["errors"].append("No validated atoms to store")
             return state
 
         storage = SupabaseMemoryStorage()
+        manifest = SourceManifest.load(state["url"])
 
         atoms_created = 0
         atoms_failed = 0
 
         for atom in atoms:
             try:
-                # Insert into knowledge_atoms table
-                storage.client.table("knowledge_atoms").insert({
+                # Upsert into knowledge_atoms table
+                storage.client.table("knowledge_atoms").upsert({
                     "atom_id": atom.get("id", f"atom:{datetime.utcnow().timestamp()}"),
                     "atom_type": atom.get("learning_resource_type", "explanation"),
                     "title": atom.get("title", "Untitled"),
@@ -984,18 +1061,58 @@ def storage_node(state: IngestionState) -> IngestionState:
                     "page_count": atom.get("page_count", 0),
                     "is_direct_pdf": atom.get("is_direct_pdf", True),
                     "manual_type": atom.get("manual_type", "unknown")
-                }).execute()
+                }, on_conflict="atom_id").execute()
 
                 atoms_created += 1
 
+                if atom.get("chunk_hash"):
+                    manifest.record(
+                        atom["chunk_hash"], atom["id"], STATUS_STORED,
+                        quality_score=atom.get("quality_score", 0),
+                        embedding_model=atom.get("embedding_model"),
+                    )
+
             except Exception as e:
                 logger.error(f"Failed to store atom '{atom.get('title', 'Unknown')}': {e}")
                 atoms_failed += 1
 
+        for content_hash in rejected_chunks:
+            manifest.record(content_hash, None, STATUS_REJECTED)
+
+        # Removed chunks: mark their atoms deleted; restored chunks: un-delete
+        removed_ids = [manifest.chunks[h]["atom_id"] for h in removed_chunks
+                       if manifest.chunks.get(h, {}).get("atom_id")]
+        if _set_atoms_deleted(storage, removed_ids, datetime.utcnow().isoformat()):
+            manifest.tombstone(removed_chunks)
+            state["atoms_tombstoned"] = len(removed_ids)
+
+        restored_ids = [manifest.chunks[h]["atom_id"] for h in restored_chunks
+                        if manifest.chunks.get(h, {}).get("atom_id")]
+        if _set_atoms_deleted(storage, restored_ids, None):
+            manifest.restore(restored_chunks)
+
+        # Only once every chunk of this run is stored under its chunk-derived
+        # id, so the old copies are never removed without replacements
+        if atoms_failed == 0 and manifest.needs_legacy_reconcile:
+            now = datetime.utcnow().isoformat()
+            legacy_count = _tombstone_legacy_atoms(storage, state["url"], manifest.url_hash, now)
+            if legacy_count is not None:
+                manifest.legacy_reconciled_at = now
+                state["atoms_tombstoned"] = state.get("atoms_tombstoned", 0) + legacy_count
+
+        try:
+            manifest.save()
+        except Exception as e:
+            # Next run re-processes these chunks; upsert keeps that idempotent
+            logger.warning(f"Failed to save ingestion manifest: {e}")
+
         state["atoms_created"] = atoms_created
         state["atoms_failed"] = atoms_failed
 
-        logger.info(f"[Stage 7] Stored {atoms_created} atoms ({atoms_failed} failed)")
+        logger.info(
+            f"[Stage 7] Stored {atoms_created} atoms ({atoms_failed} failed), "
+            f"reused {state.get('atoms_reused', 0)}, tombstoned {state.get('atoms_tombstoned', 0)}"
+        )
 
     except Exception as e:
         logger.error(f"[Stage 7] Storage failed: {e}")
@@ -1004,6 +1121,60 @@ def storage_node(state: IngestionState) -> IngestionState:
     return state
 
 
+def _set_atoms_deleted(storage: SupabaseMemoryStorage, atom_ids: List[str], deleted_at: Optional[str]) -> bool:
+    """
+    Set knowledge_atoms.deleted_at for atom_ids (None clears the tombstone).
+
+    Returns True when the update succeeded (or there was nothing to do), so
+    the manifest only records tombstones the database actually holds.
+    """
+    if not atom_ids:
+        return True
+
+    try:
+        storage.client.table("knowledge_atoms") \
+            .update({"deleted_at": deleted_at}) \
+            .in_("atom_id", atom_ids) \
+            .execute()
+        return True
+    except Exception as e:
+        # Gracefully degrade if the deleted_at column hasn't been migrated yet
+        error_msg = str(e)
+        if "Could not find" in error_msg or "PGRST204" in error_msg:
+            logger.warning("knowledge_atoms.deleted_at not found - run migration 010 to enable tombstones")
+        else:
+            logger.warning(f"Failed to update atom tombstones: {e}")
+        return False
+
+
+def _tombstone_legacy_atoms(storage: SupabaseMemoryStorage, url: str, url_hash: str, deleted_at: str) -> Optional[int]:
+    """
+    Tombstone live atoms of a source that predate chunk-derived atom ids.
+
+    Atoms stored before the ingestion manifest have random ids (or ids the
+    LLM picked), so no manifest entry points at them and change detection
+    can never reconcile them. Once the source is stored under
+    atom:<url hash>:<chunk hash> ids, every other live atom with the same
+    source_url is a stale copy.
+
+    Returns the number of atoms tombstoned, or None if the update failed.
+    """
+    try:
+        response = storage.client.table("knowledge_atoms") \
+            .update({"deleted_at": deleted_at}) \
+            .eq("source_url", url) \
+            .is_("deleted_at", "null") \
+            .not_.like("atom_id", f"atom:{url_hash}:%") \
+            .execute()
+        legacy_count = len(response.data or [])
+        if legacy_count:
+            logger.info(f"Tombstoned {legacy_count} pre-manifest atoms of {url}")
+        return legacy_count
+    except Exception as e:
+        logger.warning(f"Failed to tombstone pre-manifest atoms of {url}: {e}")
+        return None
+
+
 # ============================================================================
 # LangGraph Workflow
 # ============================================================================
@@ -1021,6 +1192,7 @@ def create_ingestion_chain() -> StateGraph:
     workflow.add_node("acquire", source_acquisition_node)
     workflow.add_node("extract", content_extraction_node)
     workflow.add_node("chunk", chunking_node)
+    workflow.add_node("detect", change_detection_node)
     workflow.add_node("generate", atom_generation_node)
     workflow.add_node("validate", quality_validation_node)
     workflow.add_node("embed", embedding_node)
@@ -1030,7 +1202,12 @@ def create_ingestion_chain() -> StateGraph:
     workflow.set_entry_point("acquire")
     workflow.add_edge("acquire", "extract")
     workflow.add_edge("extract", "chunk")
-    workflow.add_edge("chunk", "generate")
+    workflow.add_edge("chunk", "detect")
+    workflow.add_conditional_edges(
+        "detect",
+        _route_after_change_detection,
+        {"generate": "generate", "store": "store"}
+    )
     workflow.add_edge("generate", "validate")
     workflow.add_edge("validate", "embed")  # TODO: Add conditional routing for failed validation
     workflow.add_edge("embed", "store")
@@ -1043,6 +1220,32 @@ def create_ingestion_chain() -> StateGraph:
 # Helper Functions
 # ============================================================================
 
+def _initial_state(url: str, incremental: bool = False) -> IngestionState:
+    """Fresh pipeline state for one source."""
+    return {
+        "url": url,
+        "source_type": "",
+        "raw_content": None,
+        "chunks": [],
+        "atoms": [],
+        "validated_atoms": [],
+        "embeddings": [],
+        "source_metadata": {},
+        "errors": [],
+        "current_stage": "",
+        "retry_count": 0,
+        "incremental": incremental,
+        "reused_atom_ids": [],
+        "restored_chunks": [],
+        "removed_chunks": [],
+        "rejected_chunks": [],
+        "atoms_created": 0,
+        "atoms_failed": 0,
+        "atoms_reused": 0,
+        "atoms_tombstoned": 0
+    }
+
+
 def _detect_source_type(url: str) -> str:
     """Detect source type from URL."""
     if url.endswith(".pdf") or "pdf" in url.lower():
@@ -1061,13 +1264,14 @@ def _detect_source_type(url: str) -> str:
 # Public API
 # ============================================================================
 
-async def _ingest_source_monitored(url: str, monitor: IngestionMonitor) -> Dict[str, Any]:
+async def _ingest_source_monitored(url: str, monitor: IngestionMonitor, incremental: bool = False) -> Dict[str, Any]:
     """
     Internal async function that runs ingestion with monitoring.
 
     Args:
         url: Source URL
         monitor: IngestionMonitor instance
+        incremental: Re-ingest a previously seen source chunk by chunk
 
     Returns:
         Ingestion results
@@ -1081,21 +1285,7 @@ async def _ingest_source_monitored(url: str, monitor: IngestionMonitor) -> Dict[
             chain = create_ingestion_chain()
 
             # Initialize state
-            initial_state: IngestionState = {
-                "url": url,
-                "source_type": "",
-                "raw_content": None,
-                "chunks": [],
-                "atoms": [],
-                "validated_atoms": [],
-                "embeddings": [],
-                "source_metadata": {},
-                "errors": [],
-                "current_stage": "",
-                "retry_count": 0,
-                "atoms_created": 0,
-                "atoms_failed": 0
-            }
+            initial_state = _initial_state(url, incremental)
 
             # Run chain
             import time
@@ -1150,6 +1340,8 @@ async def _ingest_source_monitored(url: str, monitor: IngestionMonitor) -> Dict[
                 "success": success,
                 "atoms_created": atoms_created,
                 "atoms_failed": atoms_failed,
+                "atoms_reused": final_state.get("atoms_reused", 0),
+                "atoms_tombstoned": final_state.get("atoms_tombstoned", 0),
                 "errors": errors,
                 "source_metadata": final_state["source_metadata"],
                 "total_duration_ms": total_duration_ms
@@ -1164,12 +1356,16 @@ async def _ingest_source_monitored(url: str, monitor: IngestionMonitor) -> Dict[
             raise
 
 
-def ingest_source(url: str) -> Dict[str, Any]:
+def ingest_source(url: str, incremental: bool = False) -> Dict[str, Any]:
     """
     Ingest a single source through the complete pipeline.
 
     Args:
         url: Source URL (PDF, YouTube, or web page)
+        incremental: Re-ingest even if the URL was seen before. Chunks are
+            diffed against the source's manifest: unchanged chunks reuse their
+            atoms, only added/changed chunks hit the LLM, and atoms from
+            removed chunks are tombstoned.
 
     Returns:
         Ingestion results with atom counts and errors
@@ -1182,7 +1378,7 @@ def ingest_source(url: str) -> Dict[str, Any]:
     if monitor:
         # Run with monitoring
         try:
-            return asyncio.run(_ingest_source_monitored(url, monitor))
+            return asyncio.run(_ingest_source_monitored(url, monitor, incremental))
         except Exception as e:
             logger.error(f"Monitored ingestion failed: {e}")
             return {
@@ -1200,21 +1396,7 @@ def ingest_source(url: str) -> Dict[str, Any]:
         chain = create_ingestion_chain()
 
         # Initialize state
-        initial_state: IngestionState = {
-            "url": url,
-            "source_type": "",
-            "raw_content": None,
-            "chunks": [],
-            "atoms": [],
-            "validated_atoms": [],
-            "embeddings": [],
-            "source_metadata": {},
-            "errors": [],
-            "current_stage": "",
-            "retry_count": 0,
-            "atoms_created": 0,
-            "atoms_failed": 0
-        }
+        initial_state = _initial_state(url, incremental)
 
         # Run chain
         try:
@@ -1239,6 +1421,8 @@ def ingest_source(url: str) -> Dict[str, Any]:
                 "success": success,
                 "atoms_created": atoms_created,
                 "atoms_failed": atoms_failed,
+                "atoms_reused": final_state.get("atoms_reused", 0),
+                "atoms_tombstoned": final_state.get("atoms_tombstoned", 0),
                 "errors": errors,
                 "source_metadata": final_state["source_metadata"]
             }
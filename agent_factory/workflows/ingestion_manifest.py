@@ -0,0 +1,272 @@
+"""
+Ingestion Manifest - Per-Source Chunk Hashes for Incremental Re-Ingestion
+
+The ingestion chain used to treat every run of a source as brand new. The
+manifest records, for each source URL, the content hash of every chunk that
+has been through atom generation and which atom it produced. On the next run
+the chunker output is diffed against the manifest:
+
+- unchanged chunks reuse their existing atom (and its stored embedding)
+- added or edited chunks go through the LLM stages
+- chunks that disappeared have their atoms tombstoned
+
+Atoms stored before manifests existed have random ids no chunk maps to; the
+first manifest-tracked run of a source tombstones them once
+(legacy_reconciled_at records that it happened).
+
+A revised 500-page manual therefore costs roughly what its changed pages
+cost. Manifests are small JSON files (hashes and atom ids only, no vectors)
+under data/ingestion_manifests/, one per source.
+
+Usage:
+    manifest = SourceManifest.load(url)
+    diff = manifest.diff(chunks)
+    for chunk in diff.changed:
+        ...  # generate, validate, embed, store
+        manifest.record(chunk["chunk_hash"], atom_id, STATUS_STORED)
+    manifest.tombstone(diff.removed_hashes)
+    manifest.save()
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+STATUS_STORED = "stored"          # Atom generated, validated and stored
+STATUS_REJECTED = "rejected"      # Atom failed quality validation (don't pay for it again)
+STATUS_TOMBSTONED = "tombstoned"  # Chunk removed from the source; atom marked deleted
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def default_manifest_dir() -> Path:
+    """Directory holding per-source manifests (INGESTION_MANIFEST_DIR overrides)."""
+    return Path(os.getenv("INGESTION_MANIFEST_DIR", "data/ingestion_manifests"))
+
+
+def url_fingerprint(url: str) -> str:
+    """Same 16-char URL hash the chain stores in source_fingerprints."""
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+def chunk_hash(text: str) -> str:
+    """
+    Stable content hash for a chunk.
+
+    Whitespace is collapsed first so re-extraction of an unchanged page
+    (different line wrapping, trailing spaces) keeps the same hash.
+    """
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def atom_id_for(url_hash: str, content_hash: str) -> str:
+    """Deterministic atom id, so re-runs upsert instead of duplicating."""
+    return f"atom:{url_hash}:{content_hash[:16]}"
+
+
+@dataclass
+class ChunkDiff:
+    """Result of comparing a fresh chunking run against the manifest."""
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: List[Dict[str, Any]] = field(default_factory=list)
+    restored: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def reused_atom_ids(self) -> List[str]:
+        """Atoms carried over without touching the LLM or embedding model."""
+        return [e["atom_id"] for e in self.unchanged + self.restored if e.get("atom_id")]
+
+    @property
+    def removed_hashes(self) -> List[str]:
+        return [e["chunk_hash"] for e in self.removed]
+
+    @property
+    def removed_atom_ids(self) -> List[str]:
+        return [e["atom_id"] for e in self.removed if e.get("atom_id")]
+
+    @property
+    def restored_atom_ids(self) -> List[str]:
+        return [e["atom_id"] for e in self.restored if e.get("atom_id")]
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "changed": len(self.changed),
+            "unchanged": len(self.unchanged),
+            "restored": len(self.restored),
+            "removed": len(self.removed),
+        }
+
+
+class SourceManifest:
+    """
+    Chunk hash -> atom mapping for one source.
+
+    Entries are keyed by chunk hash and hold the atom id, status, and the
+    chunk's position in the last run (informational only - moving a chunk
+    doesn't change its hash, so reordered pages are free).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        path: Optional[Path] = None,
+        chunks: Optional[Dict[str, Dict[str, Any]]] = None,
+        updated_at: Optional[str] = None,
+        legacy_reconciled_at: Optional[str] = None,
+    ):
+        """
+        Args:
+            url: Source URL
+            path: Manifest file (default: <manifest dir>/<url hash>.json)
+            chunks: Existing entries keyed by chunk hash
+            updated_at: ISO timestamp of the last save
+            legacy_reconciled_at: When pre-manifest (random id) atoms of this
+                source were tombstoned, None if not yet
+        """
+        self.url = url
+        self.url_hash = url_fingerprint(url)
+        self.path = Path(path) if path else default_manifest_dir() / f"{self.url_hash}.json"
+        self.chunks: Dict[str, Dict[str, Any]] = chunks or {}
+        self.updated_at = updated_at
+        self.legacy_reconciled_at = legacy_reconciled_at
+
+    @classmethod
+    def load(cls, url: str, directory: Optional[Path] = None) -> "SourceManifest":
+        """
+        Load the manifest for a source, or an empty one if none exists yet.
+
+        A corrupt or foreign-version file is treated as missing: the worst
+        case is one full re-ingestion, never a crash.
+        """
+        path = Path(directory or default_manifest_dir()) / f"{url_fingerprint(url)}.json"
+        if not path.exists():
+            return cls(url, path=path)
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"unsupported manifest version {data.get('version')}")
+            return cls(
+                url, path=path, chunks=data.get("chunks", {}), updated_at=data.get("updated_at"),
+                legacy_reconciled_at=data.get("legacy_reconciled_at"),
+            )
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable ingestion manifest {path}: {e}")
+            return cls(url, path=path)
+
+    def __len__(self) -> int:
+        return sum(1 for e in self.chunks.values() if e.get("status") != STATUS_TOMBSTONED)
+
+    @property
+    def stored_atom_ids(self) -> List[str]:
+        """Live atoms this manifest accounts for."""
+        return [e["atom_id"] for e in self.chunks.values() if e.get("status") == STATUS_STORED and e.get("atom_id")]
+
+    @property
+    def needs_legacy_reconcile(self) -> bool:
+        """True until pre-manifest atoms have been tombstoned, once there are atoms to replace them."""
+        return self.legacy_reconciled_at is None and bool(self.stored_atom_ids)
+
+    def diff(self, chunks: Iterable[Dict[str, Any]]) -> ChunkDiff:
+        """
+        Classify chunks against the manifest.
+
+        Stamps "chunk_hash" and "chunk_index" onto each chunk dict. Duplicate
+        chunks within one run (repeated boilerplate) collapse to the first.
+
+        Args:
+            chunks: Chunker output (dicts with a "text" key)
+
+        Returns:
+            ChunkDiff with changed chunk dicts and unchanged/restored/removed
+            manifest entries
+        """
+        result = ChunkDiff()
+        seen = set()
+
+        for index, chunk in enumerate(chunks):
+            content_hash = chunk_hash(chunk["text"])
+            if content_hash in seen:
+                continue
+            seen.add(content_hash)
+            chunk["chunk_hash"] = content_hash
+            chunk["chunk_index"] = index
+
+            entry = self.chunks.get(content_hash)
+            if entry is None:
+                result.changed.append(chunk)
+                continue
+
+            entry["chunk_index"] = index
+            if entry.get("status") == STATUS_TOMBSTONED:
+                # Page came back (e.g. revision reverted) - un-delete the old atom
+                if entry.get("atom_id"):
+                    result.restored.append({"chunk_hash": content_hash, **entry})
+                else:
+                    result.changed.append(chunk)
+            else:
+                result.unchanged.append({"chunk_hash": content_hash, **entry})
+
+        for content_hash, entry in self.chunks.items():
+            if content_hash not in seen and entry.get("status") != STATUS_TOMBSTONED:
+                result.removed.append({"chunk_hash": content_hash, **entry})
+
+        return result
+
+    def record(
+        self,
+        content_hash: str,
+        atom_id: Optional[str],
+        status: str = STATUS_STORED,
+        **metadata: Any,
+    ) -> None:
+        """Record the outcome of processing one chunk."""
+        entry = self.chunks.setdefault(content_hash, {})
+        entry.update(metadata)
+        entry["atom_id"] = atom_id
+        entry["status"] = status
+        entry["updated_at"] = datetime.utcnow().isoformat()
+
+    def restore(self, content_hashes: Iterable[str]) -> None:
+        """Mark previously tombstoned chunks as live again."""
+        for content_hash in content_hashes:
+            entry = self.chunks.get(content_hash)
+            if entry is not None:
+                entry["status"] = STATUS_STORED if entry.get("atom_id") else STATUS_REJECTED
+                entry["updated_at"] = datetime.utcnow().isoformat()
+
+    def tombstone(self, content_hashes: Iterable[str]) -> None:
+        """Mark chunks as removed from the source (entries are kept for restore)."""
+        for content_hash in content_hashes:
+            entry = self.chunks.get(content_hash)
+            if entry is not None:
+                entry["status"] = STATUS_TOMBSTONED
+                entry["updated_at"] = datetime.utcnow().isoformat()
+
+    def save(self) -> Path:
+        """Write atomically (temp file + rename) so a crash never leaves half a manifest."""
+        self.updated_at = datetime.utcnow().isoformat()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps({
+            "version": MANIFEST_VERSION,
+            "url": self.url,
+            "url_hash": self.url_hash,
+            "updated_at": self.updated_at,
+            "legacy_reconciled_at": self.legacy_reconciled_at,
+            "chunks": self.chunks,
+        }, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        return self.path
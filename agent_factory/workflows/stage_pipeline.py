@@ -0,0 +1,383 @@
+"""
+Stage Pipeline - Streaming, bounded-queue execution of sequential phases.
+
+Batch jobs like the daily KB build used to run phase by phase: every PDF
+downloaded, then every PDF extracted, then every atom uploaded. One slow
+vendor site held up everything downstream and the CPU idled while the
+network worked. A StagePipeline connects the phases with bounded
+asyncio.Queues instead, so the first PDF's atoms are embedded and uploaded
+while later PDFs are still downloading:
+
+    source -> [download x4] -> [extract x2] -> [build] -> [embed, batch 100] -> [upload, batch 50]
+
+Per stage:
+- workers: concurrent workers (sync functions run in threads)
+- batch_size / batch_timeout: hand the function lists of items
+- fan_out: the function returns several items for the next stage
+- key / checkpoint_value / restore: checkpoint support
+
+A PipelineCheckpoint (JSON lines) records each finished (stage, key); a
+rerun after a crash restores those results instead of recomputing them.
+The PipelineReport gives wall time and per-stage utilization (busy time /
+worker time), which shows the bottleneck directly.
+
+Usage:
+    pipeline = StagePipeline([
+        Stage("download", download, workers=4, key=lambda url: url),
+        Stage("extract", extract, workers=2),
+        Stage("upload", upload_batch, batch_size=50),
+    ], checkpoint=PipelineCheckpoint("data/checkpoints/run.jsonl"))
+
+    report = await pipeline.run(urls)
+    print(report.summary())
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed between stages
+
+
+# ============================================================================
+# Checkpoint
+# ============================================================================
+
+class PipelineCheckpoint:
+    """
+    Append-only record of finished (stage, key) pairs.
+
+    Stored as JSON lines so a crash mid-write loses at most the last line.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._done: Dict[Tuple[str, str], Any] = {}
+        self._file = None
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line
+                    self._done[(record["stage"], record["key"])] = record.get("value")
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def done(self, stage: str, key: str) -> bool:
+        return (stage, key) in self._done
+
+    def get(self, stage: str, key: str) -> Any:
+        return self._done.get((stage, key))
+
+    def mark(self, stage: str, key: str, value: Any = None) -> None:
+        """Record a finished item (value must be JSON-serializable)."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({"stage": stage, "key": key, "value": value}, default=str) + "\n")
+        self._file.flush()
+        self._done[(stage, key)] = value
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ============================================================================
+# Stages and metrics
+# ============================================================================
+
+@dataclass
+class Stage:
+    """
+    One phase of a StagePipeline.
+
+    func(item) -> result (or func(items) -> results aligned with items when
+    batch_size > 1). A None result drops the item, an Exception result
+    fails it; with fan_out the result is an iterable of items for the next
+    stage. Checkpointed stages need `key`; checkpoint_value(item, result)
+    picks what is stored (default: the result) and restore(item, stored)
+    rebuilds the result on resume.
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    batch_size: int = 1
+    batch_timeout: float = 1.0
+    fan_out: bool = False
+    key: Optional[Callable[[Any], str]] = None
+    checkpoint_value: Optional[Callable[[Any, Any], Any]] = None
+    restore: Optional[Callable[[Any, Any], Any]] = None
+
+
+@dataclass
+class StageStats:
+    """Counters for one stage."""
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    restored: int = 0
+    errors: int = 0
+    calls: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0  # Waiting on a full downstream queue
+    first_output_at: Optional[float] = None
+
+    def utilization(self, wall_seconds: float) -> float:
+        if wall_seconds <= 0:
+            return 0.0
+        return min(1.0, self.busy_seconds / (wall_seconds * self.workers))
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "restored": self.restored,
+            "errors": self.errors,
+            "calls": self.calls,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "utilization": round(self.utilization(wall_seconds), 3),
+        }
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of StagePipeline.run()."""
+    wall_seconds: float
+    stages: Dict[str, StageStats]
+    results: List[Any] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "stages": {name: stats.to_dict(self.wall_seconds) for name, stats in self.stages.items()},
+            "errors": len(self.errors),
+        }
+
+    def summary(self) -> str:
+        """One line per stage: items, errors, utilization."""
+        lines = [f"Wall time: {self.wall_seconds:.1f}s"]
+        for name, stats in self.stages.items():
+            lines.append(
+                f"  {name:<12} x{stats.workers}  in={stats.items_in} out={stats.items_out} "
+                f"restored={stats.restored} errors={stats.errors} "
+                f"util={stats.utilization(self.wall_seconds):.0%} blocked={stats.blocked_seconds:.1f}s"
+            )
+        return "\n".join(lines)
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+class StagePipeline:
+    """
+    Runs stages concurrently, connected by bounded queues.
+
+    Items are processed independently: an exception fails that item (it is
+    logged, counted and recorded in report.errors) and the rest continue.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 64,
+        checkpoint: Optional[PipelineCheckpoint] = None,
+        collect_results: bool = True,
+        max_errors_recorded: int = 200,
+    ):
+        """
+        Args:
+            stages: Stages in order
+            queue_size: Capacity of each inter-stage queue (backpressure)
+            checkpoint: Resume state (None = no checkpointing)
+            collect_results: Keep the last stage's outputs in report.results
+            max_errors_recorded: Cap on report.errors entries
+        """
+        if not stages:
+            raise ValueError("StagePipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.checkpoint = checkpoint
+        self.collect_results = collect_results
+        self.max_errors_recorded = max_errors_recorded
+
+    async def run(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> PipelineReport:
+        """Feed `items` through every stage; returns once all stages drain."""
+        start = time.perf_counter()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stats = {s.name: StageStats(name=s.name, workers=s.workers) for s in self.stages}
+        report = PipelineReport(wall_seconds=0.0, stages=stats)
+
+        tasks = [asyncio.create_task(self._feed(items, queues[0], self.stages[0].workers))]
+        for index, stage in enumerate(self.stages):
+            last = index + 1 == len(self.stages)
+            out_queue = None if last else queues[index + 1]
+            next_workers = 0 if last else self.stages[index + 1].workers
+            remaining = [stage.workers]
+            for _ in range(stage.workers):
+                tasks.append(asyncio.create_task(self._worker(
+                    stage, queues[index], out_queue, next_workers, stats[stage.name], report, remaining
+                )))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        report.wall_seconds = time.perf_counter() - start
+        logger.info(f"Pipeline finished\n{report.summary()}")
+        return report
+
+    @staticmethod
+    async def _feed(items, queue: asyncio.Queue, workers: int) -> None:
+        if hasattr(items, "__aiter__"):
+            async for item in items:
+                await queue.put(item)
+        else:
+            for item in items:
+                await queue.put(item)
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    async def _next_batch(self, stage: Stage, queue: asyncio.Queue) -> Tuple[List[Any], bool]:
+        """Up to batch_size items; waits at most batch_timeout after the first. Returns (batch, finished)."""
+        item = await queue.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + stage.batch_timeout
+        while len(batch) < stage.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _call(self, stage: Stage, arg: Any, stats: StageStats) -> Any:
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(stage.func):
+                return await stage.func(arg)
+            result = await asyncio.to_thread(stage.func, arg)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        finally:
+            stats.calls += 1
+            stats.busy_seconds += time.perf_counter() - started
+
+    def _record_error(self, stage: Stage, item: Any, error: Exception, report: PipelineReport) -> None:
+        key = stage.key(item) if stage.key else repr(item)[:200]
+        logger.error(f"[{stage.name}] {key}: {error}")
+        report.stages[stage.name].errors += 1
+        if len(report.errors) < self.max_errors_recorded:
+            report.errors.append({"stage": stage.name, "item": str(key), "error": str(error)})
+
+    def _checkpoint_key(self, stage: Stage, item: Any) -> Optional[str]:
+        if self.checkpoint is None or stage.key is None:
+            return None
+        return str(stage.key(item))
+
+    async def _emit(self, stage: Stage, result: Any, out_queue: Optional[asyncio.Queue],
+                    stats: StageStats, report: PipelineReport) -> None:
+        if result is None:
+            return
+        outputs = list(result) if stage.fan_out else [result]
+        for output in outputs:
+            stats.items_out += 1
+            if stats.first_output_at is None:
+                stats.first_output_at = time.perf_counter()
+            if out_queue is None:
+                if self.collect_results:
+                    report.results.append(output)
+                continue
+            if out_queue.full():
+                blocked = time.perf_counter()
+                await out_queue.put(output)
+                stats.blocked_seconds += time.perf_counter() - blocked
+            else:
+                out_queue.put_nowait(output)
+
+    async def _worker(self, stage: Stage, in_queue: asyncio.Queue, out_queue: Optional[asyncio.Queue],
+                      next_workers: int, stats: StageStats, report: PipelineReport, remaining: List[int]) -> None:
+        finished = False
+        while not finished:
+            batch, finished = await self._next_batch(stage, in_queue)
+            if not batch:
+                continue
+            stats.items_in += len(batch)
+
+            # Restore checkpointed items instead of recomputing them
+            pending = []
+            for item in batch:
+                key = self._checkpoint_key(stage, item)
+                if key is not None and self.checkpoint.done(stage.name, key):
+                    stored = self.checkpoint.get(stage.name, key)
+                    stats.restored += 1
+                    try:
+                        restored = stage.restore(item, stored) if stage.restore else stored
+                    except Exception as e:
+                        self._record_error(stage, item, e, report)
+                        continue
+                    await self._emit(stage, restored, out_queue, stats, report)
+                else:
+                    pending.append(item)
+            if not pending:
+                continue
+
+            if stage.batch_size > 1:
+                try:
+                    results = await self._call(stage, pending, stats)
+                    if len(results) != len(pending):
+                        raise ValueError(f"returned {len(results)} results for {len(pending)} items")
+                except Exception as e:
+                    for item in pending:
+                        self._record_error(stage, item, e, report)
+                    continue
+                pairs = list(zip(pending, results, strict=True))
+            else:
+                pairs = []
+                for item in pending:
+                    try:
+                        pairs.append((item, await self._call(stage, item, stats)))
+                    except Exception as e:
+                        self._record_error(stage, item, e, report)
+
+            for item, result in pairs:
+                if isinstance(result, Exception):
+                    self._record_error(stage, item, result, report)
+                    continue
+                key = self._checkpoint_key(stage, item)
+                if key is not None:
+                    value = stage.checkpoint_value(item, result) if stage.checkpoint_value else result
+                    self.checkpoint.mark(stage.name, key, value)
+                await self._emit(stage, result, out_queue, stats, report)
+
+        # Last worker out closes the downstream stage
+        remaining[0] -= 1
+        if remaining[0] == 0 and out_queue is not None:
+            for _ in range(next_workers):
+                await out_queue.put(_DONE)
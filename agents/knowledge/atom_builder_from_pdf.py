@@ -177,15 +177,18 @@ class AtomBuilderFromPDF:
         "caution": ["caution", "damage", "malfunction", "incorrect operation"]
     }
 
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None, inline_embeddings: bool = True):
         """
         Initialize Atom Builder.
 
         Args:
             openai_api_key: OpenAI API key for embeddings (or set OPENAI_API_KEY env var)
+            inline_embeddings: Embed each atom as it is built (one API call per atom).
+                Set False to leave embeddings empty and call embed_atoms() in batches.
         """
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.openai_client = None
+        self.inline_embeddings = inline_embeddings
 
         if OpenAI and self.openai_api_key:
             self.openai_client = OpenAI(api_key=self.openai_api_key)
@@ -342,6 +345,44 @@ class AtomBuilderFromPDF:
             print(f"  [WARN] Embedding generation failed: {e}")
             return None
 
+    @staticmethod
+    def embedding_text(atom: KnowledgeAtom) -> str:
+        """Text embedded for an atom (title + summary + start of content)."""
+        return f"{atom.title}\n{atom.summary}\n{atom.content[:1000]}"
+
+    def embed_atoms(self, atoms: List[KnowledgeAtom], batch_size: int = 100) -> int:
+        """
+        Fill in missing embeddings with one API call per batch.
+
+        Args:
+            atoms: Atoms to embed (atoms that already have an embedding are skipped)
+            batch_size: Inputs per embeddings request
+
+        Returns:
+            Number of atoms embedded
+        """
+        if not self.openai_client:
+            return 0
+
+        pending = [atom for atom in atoms if atom.embedding is None]
+        embedded = 0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                response = self.openai_client.embeddings.create(
+                    model="text-embedding-3-small",
+                    input=[self.embedding_text(atom)[:8000] for atom in batch]
+                )
+            except Exception as e:
+                print(f"  [WARN] Batch embedding failed ({len(batch)} atoms): {e}")
+                continue
+            for item in response.data:
+                batch[item.index].embedding = item.embedding
+            embedded += len(response.data)
+
+        self.stats["embeddings_generated"] += embedded
+        return embedded
+
     def create_atom_from_section(
         self,
         section: Dict,
@@ -400,8 +441,9 @@ class AtomBuilderFromPDF:
         keywords = self.extract_keywords(heading, content)
 
         # Generate embedding
-        embedding_text = f"{heading}\n{summary}\n{content[:1000]}"
-        embedding = self.generate_embedding(embedding_text)
+        embedding = None
+        if self.inline_embeddings:
+            embedding = self.generate_embedding(f"{heading}\n{summary}\n{content[:1000]}")
 
         # Create atom
         # Build citations (Perplexity format)
@@ -496,8 +538,9 @@ class AtomBuilderFromPDF:
         keywords = [str(h).lower() for h in headers if h]
 
         # Embedding
-        embedding_text = f"{title}\n{summary}\n{content[:1000]}"
-        embedding = self.generate_embedding(embedding_text)
+        embedding = None
+        if self.inline_embeddings:
+            embedding = self.generate_embedding(f"{title}\n{summary}\n{content[:1000]}")
 
         atom = KnowledgeAtom(
             atom_id=atom_id,
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Segment-level narration engine for the voice production agent
+
+Instead of sending a whole script to TTS in one call:
+- The script is split into sentence (or paragraph) segments
+- Each segment is cached on disk keyed by (provider, voice, normalized text
+  hash), so fixing one sentence only re-synthesizes that sentence and
+  recurring intros/outros are synthesized once
+- Cache misses are synthesized concurrently, capped per provider
+  (provider.max_concurrent)
+- Segments are joined with ffmpeg's concat demuxer using stream copy
+  (no re-encode; all segments of a provider/voice share one format)
+
+Providers: EdgeTTSProvider (FREE), OpenAITTSProvider (PAID), and
+StubTTSProvider for local tests and benchmarks.
+
+Example:
+    >>> engine = NarrationEngine(EdgeTTSProvider("en-US-GuyNeural"))
+    >>> report = await engine.synthesize(script, "data/audio/plc_001.mp3")
+    >>> print(report.cache_hits, report.synthesized)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+import unicodedata
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", "data/tts_cache"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[.!?][\"')\]])\s+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+# ============================================================================
+# Segmentation
+# ============================================================================
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys (Unicode NFKC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split an over-long sentence at commas/semicolons, then at spaces."""
+    if len(text) <= max_chars:
+        return [text]
+    pieces: List[str] = []
+    current = ""
+    for part in re.split(r"(?<=[,;:])\s+|\s+", text):
+        candidate = f"{current} {part}".strip()
+        if current and len(candidate) > max_chars:
+            pieces.append(current)
+            current = part
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_segments(
+    text: str,
+    granularity: str = "sentence",
+    max_chars: int = 500
+) -> List[str]:
+    """
+    Split a script into TTS segments.
+
+    Args:
+        text: Script text
+        granularity: "sentence" (best cache reuse) or "paragraph" (fewer calls)
+        max_chars: Longest segment sent to the provider
+
+    Returns:
+        Normalized, non-empty segments in reading order
+    """
+    if granularity not in ("sentence", "paragraph"):
+        raise ValueError(f"Unknown granularity: {granularity}. Use: sentence or paragraph")
+
+    segments: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = normalize_text(paragraph)
+        if not paragraph:
+            continue
+        if granularity == "paragraph" and len(paragraph) <= max_chars:
+            segments.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            sentence = sentence.strip()
+            if sentence:
+                segments.extend(_split_long(sentence, max_chars))
+    return segments
+
+
+def segment_key(provider: str, voice: str, text: str) -> str:
+    """Cache key for one segment: hash of provider, voice and normalized text."""
+    payload = f"{provider}\0{voice}\0{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# Providers
+# ============================================================================
+
+class TTSProvider:
+    """
+    Base class for TTS backends.
+
+    Subclasses set `name`, `suffix` and `max_concurrent` and implement
+    synthesize(); the engine handles caching, concurrency and joining.
+    """
+
+    name = "base"
+    suffix = ".mp3"
+    max_concurrent = 4
+
+    def __init__(self, voice: str):
+        self.voice = voice
+
+    async def synthesize(self, text: str, output_path: str) -> None:
+        raise NotImplementedError
+
+
+class EdgeTTSProvider(TTSProvider):
+    """Microsoft Edge neural voices (FREE, rate limited by the service)."""
+
+    name = "edge"
+    max_concurrent = 4
+
+    async def synthesize(self, text: str, output_path: str) -> None:
+        try:
+            import edge_tts
+        except ImportError as e:
+            raise ImportError("edge-tts not installed. Run: poetry add edge-tts") from e
+
+        await edge_tts.Communicate(text, self.voice).save(output_path)
+
+
+class OpenAITTSProvider(TTSProvider):
+    """OpenAI TTS API (PAID, $15/1M chars)."""
+
+    name = "openai"
+    max_concurrent = 3
+
+    def __init__(self, voice: str, model: str = "tts-1"):
+        super().__init__(voice)
+        self.model = model
+        self.name = f"openai-{model}"
+
+    def _synthesize_sync(self, text: str, output_path: str) -> None:
+        try:
+            from openai import OpenAI
+        except ImportError as e:
+            raise ImportError("openai not installed. Run: poetry add openai") from e
+
+        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        response = client.audio.speech.create(model=self.model, voice=self.voice, input=text)
+        response.stream_to_file(output_path)
+
+    async def synthesize(self, text: str, output_path: str) -> None:
+        await asyncio.to_thread(self._synthesize_sync, text, output_path)
+
+
+class StubTTSProvider(TTSProvider):
+    """
+    Local provider for tests and benchmarks (no network, no API key).
+
+    Writes deterministic bytes per (voice, text) after `latency` seconds
+    and records calls and peak concurrency.
+    """
+
+    name = "stub"
+
+    def __init__(self, voice: str = "stub-voice", latency: float = 0.0, max_concurrent: int = 4):
+        super().__init__(voice)
+        self.latency = latency
+        self.max_concurrent = max_concurrent
+        self.calls: List[str] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def synthesize(self, text: str, output_path: str) -> None:
+        self.calls.append(text)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            Path(output_path).write_bytes(f"[{self.voice}:{text}]".encode("utf-8"))
+        finally:
+            self.in_flight -= 1
+
+
+# ============================================================================
+# Segment cache and joining
+# ============================================================================
+
+class SegmentCache:
+    """
+    Synthesized segments on disk.
+
+    Layout: <cache_dir>/<provider>/<voice>/<key[:2]>/<key><suffix>.
+    Files appear atomically, so an interrupted synthesis is never a hit.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+
+    def path(self, provider: TTSProvider, key: str) -> Path:
+        return self.cache_dir / provider.name / provider.voice / key[:2] / f"{key}{provider.suffix}"
+
+    def get(self, provider: TTSProvider, key: str) -> Optional[Path]:
+        path = self.path(provider, key)
+        return path if path.exists() else None
+
+
+def _run_ffmpeg(args: List[str]) -> None:
+    try:
+        subprocess.run(["ffmpeg", "-y", *args], check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg failed: {e.stderr.decode()}")
+        raise RuntimeError(f"Audio concatenation failed: {e.stderr.decode()}") from e
+    except FileNotFoundError as e:
+        raise RuntimeError("FFmpeg not found. Please install FFmpeg.") from e
+
+
+def concat_segments(segment_paths: List[Path], output_path: Path) -> None:
+    """Join segments with the concat demuxer and stream copy (no re-encode)."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if len(segment_paths) == 1:
+        shutil.copyfile(segment_paths[0], output_path)
+        return
+
+    list_path = output_path.with_name(f"{output_path.name}.segments.txt")
+    list_path.write_text("".join(
+        f"file '{Path(p).resolve().as_posix()}'\n" for p in segment_paths
+    ))
+    try:
+        _run_ffmpeg(["-f", "concat", "-safe", "0", "-i", str(list_path), "-c", "copy", str(output_path)])
+    finally:
+        list_path.unlink(missing_ok=True)
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+@dataclass
+class NarrationReport:
+    """What one synthesize() call did."""
+
+    output_path: str
+    segments: int
+    unique_segments: int
+    cache_hits: int
+    synthesized: int
+    synth_seconds: float
+    total_seconds: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class NarrationEngine:
+    """Cached, concurrent, segment-level narration for one provider/voice."""
+
+    def __init__(
+        self,
+        provider: TTSProvider,
+        cache: Optional[SegmentCache] = None,
+        granularity: str = "sentence",
+        max_chars: int = 500
+    ):
+        """
+        Args:
+            provider: TTS backend (its max_concurrent caps parallel requests)
+            cache: Segment cache (default: data/tts_cache, or $TTS_CACHE_DIR)
+            granularity: "sentence" or "paragraph"
+            max_chars: Longest segment sent to the provider
+        """
+        self.provider = provider
+        self.cache = cache or SegmentCache()
+        self.granularity = granularity
+        self.max_chars = max_chars
+
+    async def _synthesize_segment(self, text: str, key: str, limit: asyncio.Semaphore) -> Path:
+        path = self.cache.path(self.provider, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per call: concurrent engines/processes may miss the same key
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=f".tmp{path.suffix}")
+        os.close(fd)
+        tmp = Path(tmp_name)
+        async with limit:
+            try:
+                await self.provider.synthesize(text, tmp_name)
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+        return path
+
+    async def synthesize(self, text: str, output_path: str) -> NarrationReport:
+        """
+        Narrate a script to output_path.
+
+        Raises:
+            ValueError: If the script has no text
+            RuntimeError: If ffmpeg is needed and missing or fails
+        """
+        started = time.perf_counter()
+        segments = split_segments(text, self.granularity, self.max_chars)
+        if not segments:
+            raise ValueError("Script has no text to narrate")
+
+        keys = [segment_key(self.provider.name, self.provider.voice, s) for s in segments]
+        unique: Dict[str, str] = dict(zip(keys, segments, strict=True))
+        paths: Dict[str, Path] = {}
+        misses: Dict[str, str] = {}
+        for key, segment in unique.items():
+            cached = self.cache.get(self.provider, key)
+            if cached:
+                paths[key] = cached
+            else:
+                misses[key] = segment
+
+        synth_started = time.perf_counter()
+        if misses:
+            # Fresh per call: asyncio primitives are bound to one event loop
+            limit = asyncio.Semaphore(self.provider.max_concurrent)
+            done = await asyncio.gather(*(
+                self._synthesize_segment(segment, key, limit) for key, segment in misses.items()
+            ), return_exceptions=True)
+            # Let every segment finish so successful ones are cached for the retry
+            errors = [result for result in done if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+            paths.update(zip(misses, done, strict=True))
+        synth_seconds = time.perf_counter() - synth_started
+
+        concat_segments([paths[key] for key in keys], Path(output_path))
+
+        report = NarrationReport(
+            output_path=str(output_path),
+            segments=len(segments),
+            unique_segments=len(unique),
+            cache_hits=len(unique) - len(misses),
+            synthesized=len(misses),
+            synth_seconds=synth_seconds,
+            total_seconds=time.perf_counter() - started
+        )
+        logger.info(
+            f"Narration {output_path}: {report.segments} segments, "
+            f"{report.cache_hits} cached, {report.synthesized} synthesized"
+        )
+        return report
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Rendering helpers shared by the media agents
+
+Provides:
+- get_font() / gradient_mask(): process-wide caches. Font paths are probed
+  once per (font, size) and the thumbnail gradient is drawn once per
+  resolution instead of once per variant
+- render_thumbnail(): pure, picklable thumbnail renderer (ThumbnailSpec in,
+  file size out)
+- render_thumbnails(): batch rendering across a process pool
+- RenderCache: content-hash cache - unchanged inputs (same text, colors,
+  audio/visual bytes, renderer version) copy the previous output instead
+  of rendering or encoding again
+- BackgroundSegments + assemble_video(): the background video is encoded
+  once per (size, color, fps) as a short segment; each video concatenates
+  it with stream copy and only the audio is (re)encoded when needed
+
+Used by: agents/media/thumbnail_agent.py, agents/media/video_assembly_agent.py
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageEnhance, ImageFont
+
+logger = logging.getLogger(__name__)
+
+# Bump when drawing or encoding changes, so cached renders are not reused
+RENDER_VERSION = "1"
+
+FONT_PATH_TEMPLATES = (
+    "C:\\Windows\\Fonts\\{name}",
+    "/usr/share/fonts/truetype/{name}",
+    "/System/Library/Fonts/{name}",
+)
+
+DEFAULT_CACHE_DIR = Path(os.getenv("MEDIA_RENDER_CACHE", "data/render_cache"))
+
+
+# ============================================================================
+# Font and gradient caches
+# ============================================================================
+
+@functools.lru_cache(maxsize=64)
+def get_font(font_name: str, size: int) -> ImageFont.ImageFont:
+    """
+    Load a font by filename, probing the common font directories once.
+
+    Args:
+        font_name: Font filename (e.g., 'arial.ttf')
+        size: Font size in points
+
+    Returns:
+        FreeTypeFont, or Pillow's default font if none of the paths load
+    """
+    for template in FONT_PATH_TEMPLATES:
+        try:
+            return ImageFont.truetype(template.format(name=font_name), size)
+        except (OSError, IOError):
+            continue
+
+    logger.warning(f"Font {font_name} not found, using default")
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=8)
+def gradient_mask(width: int, height: int) -> Image.Image:
+    """
+    Ellipse gradient alpha mask (darkest at the center, max 30% opacity).
+
+    Built once per resolution; callers must not modify the returned image.
+    """
+    mask = Image.new("L", (width, height), 0)
+    draw = ImageDraw.Draw(mask)
+    for i in range(10):
+        offset = i * 40
+        if 2 * offset > min(width, height):
+            break  # Small resolutions run out of room for inner rings
+        draw.ellipse(
+            [(offset, offset), (width - offset, height - offset)],
+            fill=int(255 * (10 - i) / 10 * 0.3)
+        )
+    return mask
+
+
+def apply_gradient(img: Image.Image) -> None:
+    """Darken the image toward the center for text readability (in place)."""
+    img.paste((0, 0, 0), (0, 0, img.width, img.height), gradient_mask(img.width, img.height))
+
+
+def wrap_text(text: str, max_chars: int = 35) -> List[str]:
+    """Greedy word wrap to at most max_chars per line (long words stay whole)."""
+    lines = []
+    current_line: List[str] = []
+
+    for word in text.split():
+        test_line = " ".join(current_line + [word])
+        if len(test_line) <= max_chars:
+            current_line.append(word)
+        else:
+            if current_line:
+                lines.append(" ".join(current_line))
+            current_line = [word]
+
+    if current_line:
+        lines.append(" ".join(current_line))
+
+    return lines
+
+
+# ============================================================================
+# Content-hash render cache
+# ============================================================================
+
+@functools.lru_cache(maxsize=1024)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file, memoized by (path, mtime, size)."""
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class RenderCache:
+    """
+    Rendered artifacts keyed by a hash of everything that affects them.
+
+    Layout: <cache_dir>/<key[:2]>/<key><suffix>. Entries are written
+    atomically, so a crashed render never leaves a partial hit behind.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(kind: str, params: Dict[str, Any], files: Iterable[Optional[str]] = ()) -> str:
+        """
+        Hash of render parameters plus the content of input files.
+
+        Args:
+            kind: Artifact type ("thumbnail", "video", ...)
+            params: JSON-serializable render parameters
+            files: Input file paths (missing/None entries hash as absent)
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(
+            {"kind": kind, "version": RENDER_VERSION, "params": params},
+            sort_keys=True, default=str
+        ).encode())
+        for path in files:
+            exists = bool(path) and os.path.isfile(path)
+            digest.update(file_digest(path).encode() if exists else b"-")
+        return digest.hexdigest()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def fetch(self, key: str, suffix: str, output_path: Path) -> bool:
+        """Copy a cached artifact to output_path; returns False on a miss."""
+        cached = self._path(key, suffix)
+        if not cached.exists():
+            self.misses += 1
+            return False
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached, output_path)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, suffix: str, produced_path: Path) -> None:
+        """Add a freshly rendered artifact to the cache."""
+        cached = self._path(key, suffix)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        shutil.copyfile(produced_path, tmp)
+        os.replace(tmp, cached)
+
+
+# ============================================================================
+# Thumbnails
+# ============================================================================
+
+@dataclass(frozen=True)
+class ThumbnailSpec:
+    """Everything that determines a thumbnail's pixels."""
+
+    title: str
+    output_path: str
+    accent_color: str
+    key_visual: Optional[str] = None
+    width: int = 1280
+    height: int = 720
+    background: str = "#1a1a1a"
+    text_color: str = "#ffffff"
+    font_name: str = "arial.ttf"
+    quality: int = 85
+    max_file_size: int = 2 * 1024 * 1024
+
+    def cache_key(self) -> str:
+        params = asdict(self)
+        del params["output_path"]
+        return RenderCache.key("thumbnail", params, [self.key_visual])
+
+
+def render_thumbnail(spec: ThumbnailSpec) -> int:
+    """
+    Render one thumbnail to spec.output_path.
+
+    Module-level (picklable) so it can run in a process pool.
+
+    Returns:
+        File size in bytes
+    """
+    width, height = spec.width, spec.height
+    img = Image.new("RGB", (width, height), spec.background)
+    draw = ImageDraw.Draw(img)
+
+    # Darkened background visual (40% brightness) if provided
+    if spec.key_visual and Path(spec.key_visual).exists():
+        try:
+            bg_img = Image.open(spec.key_visual)
+            bg_img = bg_img.resize((width, height), Image.Resampling.LANCZOS)
+            img.paste(ImageEnhance.Brightness(bg_img).enhance(0.4), (0, 0))
+        except Exception as e:
+            logger.warning(f"Failed to load key visual: {e}")
+
+    apply_gradient(img)
+
+    # Title lines, centered vertically, each with a +4px shadow
+    font_bold = get_font(spec.font_name, 72)
+    lines = wrap_text(spec.title, max_chars=35)
+    line_height = 90
+    y_start = (height - len(lines) * line_height) // 2
+    for i, line in enumerate(lines):
+        y_pos = y_start + (i * line_height)
+        draw.text((width // 2 + 4, y_pos + 4), line, font=font_bold, fill="#000000", anchor="mm")
+        draw.text((width // 2, y_pos), line, font=font_bold, fill=spec.text_color, anchor="mm")
+
+    # Accent bar at bottom and ISH branding (top-left corner)
+    bar_height = 8
+    draw.rectangle([(0, height - bar_height), (width, height)], fill=spec.accent_color)
+    draw.text((40, 40), "INDUSTRIAL SKILLS HUB", font=get_font(spec.font_name, 36), fill=spec.accent_color)
+
+    output_path = Path(spec.output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(output_path, "JPEG", quality=spec.quality, optimize=True)
+
+    file_size = output_path.stat().st_size
+    if file_size > spec.max_file_size:
+        logger.warning(f"Thumbnail too large ({file_size} bytes), reducing quality")
+        img.save(output_path, "JPEG", quality=70, optimize=True)
+        file_size = output_path.stat().st_size
+
+    return file_size
+
+
+def render_thumbnails(
+    specs: List[ThumbnailSpec],
+    max_workers: Optional[int] = None,
+    cache: Optional[RenderCache] = None
+) -> List[int]:
+    """
+    Render many thumbnails, skipping cached ones and fanning out the rest.
+
+    Args:
+        specs: Thumbnails to render
+        max_workers: Process pool size (None = CPU count, 1 = in-process)
+        cache: Render cache (None = always render)
+
+    Returns:
+        File sizes in bytes, in the order of specs
+    """
+    sizes: List[Optional[int]] = [None] * len(specs)
+    pending: List[Tuple[int, ThumbnailSpec, Optional[str]]] = []
+
+    for i, spec in enumerate(specs):
+        key = spec.cache_key() if cache else None
+        if cache and cache.fetch(key, ".jpg", Path(spec.output_path)):
+            sizes[i] = Path(spec.output_path).stat().st_size
+        else:
+            pending.append((i, spec, key))
+
+    todo = [spec for _, spec, _ in pending]
+    if len(todo) > 1 and max_workers != 1:
+        workers = min(len(todo), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(render_thumbnail, todo))
+    else:
+        rendered = [render_thumbnail(spec) for spec in todo]
+
+    for (i, spec, key), size in zip(pending, rendered, strict=True):
+        sizes[i] = size
+        if cache:
+            cache.store(key, ".jpg", Path(spec.output_path))
+
+    return sizes
+
+
+# ============================================================================
+# Video
+# ============================================================================
+
+def probe_audio(audio_path: str) -> Tuple[float, Optional[str]]:
+    """
+    Duration (seconds) and codec of the first audio stream, in one ffprobe call.
+
+    Falls back to (60.0, None) if ffprobe is missing or fails.
+    """
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "format=duration:stream=codec_name",
+             "-of", "json", audio_path],
+            capture_output=True, text=True, check=True
+        )
+        info = json.loads(result.stdout)
+        streams = info.get("streams") or [{}]
+        return float(info["format"]["duration"]), streams[0].get("codec_name")
+    except Exception as e:
+        logger.error(f"Failed to get audio duration: {e}")
+        return 60.0, None
+
+
+def _run_ffmpeg(args: List[str]) -> None:
+    try:
+        subprocess.run(["ffmpeg", "-y", *args], check=True, capture_output=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg failed: {e.stderr.decode()}")
+        raise RuntimeError(f"Video creation failed: {e.stderr.decode()}") from e
+    except FileNotFoundError as e:
+        raise RuntimeError("FFmpeg not found. Please install FFmpeg.") from e
+
+
+class BackgroundSegments:
+    """
+    Pre-encoded background video reused across renders.
+
+    One short segment is encoded per (color, size, fps); longer backgrounds
+    are concat-demuxer lists repeating it, which ffmpeg joins with stream
+    copy (no video encode per video).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        color: str = "black",
+        size: str = "1920x1080",
+        fps: int = 30,
+        segment_seconds: int = 10
+    ):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR) / "backgrounds"
+        self.color = color
+        self.size = size
+        self.fps = fps
+        self.segment_seconds = segment_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {"color": self.color, "size": self.size, "fps": self.fps,
+                "segment_seconds": self.segment_seconds}
+
+    @property
+    def segment_path(self) -> Path:
+        return self.cache_dir / (
+            f"bg_{self.color}_{self.size}_{self.fps}fps_{self.segment_seconds}s_v{RENDER_VERSION}.mp4"
+        )
+
+    def segment(self) -> Path:
+        """Encode the background segment on first use; returns its path."""
+        path = self.segment_path
+        with self._lock:
+            if not path.exists():
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.mp4")
+                _run_ffmpeg([
+                    "-f", "lavfi",
+                    "-i", f"color=c={self.color}:s={self.size}:r={self.fps}:d={self.segment_seconds}",
+                    "-c:v", "libx264",
+                    "-tune", "stillimage",
+                    "-pix_fmt", "yuv420p",
+                    str(tmp)
+                ])
+                os.replace(tmp, path)
+        return path
+
+    def concat_list(self, duration: float) -> Path:
+        """Concat-demuxer list covering at least `duration` seconds."""
+        repeats = max(1, math.ceil(duration / self.segment_seconds))
+        segment = self.segment()
+        list_path = segment.with_name(f"{segment.stem}_x{repeats}.txt")
+        if not list_path.exists():
+            line = f"file '{segment.resolve().as_posix()}'\n"
+            tmp = list_path.with_name(f"{list_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(line * repeats)
+            os.replace(tmp, list_path)
+        return list_path
+
+
+def assemble_video(
+    audio_path: str,
+    output_path: Path,
+    background: BackgroundSegments,
+    cache: Optional[RenderCache] = None
+) -> str:
+    """
+    Mux narration over the pre-encoded background.
+
+    Video is stream-copied from the background segments; audio is copied
+    when it is already AAC and encoded to AAC otherwise. The output is cut
+    at the probed audio duration: with stream copy, -shortest alone only
+    stops at a packet boundary and can leave video running past the audio. Unchanged audio
+    with the same background is served from the render cache.
+
+    Returns:
+        Path to the generated video file
+
+    Raises:
+        RuntimeError: If ffmpeg is missing or fails
+    """
+    output_path = Path(output_path)
+    key = RenderCache.key("video", background.params, [audio_path]) if cache else None
+    if cache and cache.fetch(key, ".mp4", output_path):
+        logger.info(f"Video served from render cache: {output_path}")
+        return str(output_path)
+
+    duration, codec = probe_audio(audio_path)
+    audio_args = ["-c:a", "copy"] if codec == "aac" else ["-c:a", "aac", "-b:a", "192k"]
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _run_ffmpeg([
+        "-f", "concat", "-safe", "0", "-i", str(background.concat_list(duration)),
+        "-i", audio_path,
+        "-map", "0:v", "-map", "1:a",
+        "-c:v", "copy",
+        *audio_args,
+        "-t", f"{duration:.3f}",
+        "-shortest",
+        "-movflags", "+faststart",
+        str(output_path)
+    ])
+
+    if cache:
+        cache.store(key, ".mp4", output_path)
+    logger.info(f"Video created successfully: {output_path}")
+    return str(output_path)
@@ -29,7 +29,7 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+from PIL import Image, ImageFont
 from io import BytesIO
 from dotenv import load_dotenv
 
@@ -37,6 +37,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from agent_factory.memory.storage import SupabaseMemoryStorage
+from agents.media.rendering import (
+    RenderCache,
+    ThumbnailSpec,
+    apply_gradient,
+    get_font,
+    render_thumbnails,
+    wrap_text,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -87,7 +95,16 @@ class ThumbnailAgent:
     HEIGHT = 720
     MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
 
-    def __init__(self, use_dalle: bool = False, enable_supabase: bool = True):
+    # A/B variant accent colors, in variant order
+    COLOR_SCHEMES = ("orange", "blue", "yellow")
+
+    def __init__(
+        self,
+        use_dalle: bool = False,
+        enable_supabase: bool = True,
+        render_cache: Optional[RenderCache] = None,
+        max_workers: Optional[int] = None
+    ):
         """
         Initialize agent with Supabase connection and design configuration
 
@@ -96,6 +113,9 @@ class ThumbnailAgent:
                       If False, use Pillow template-based design (FREE, faster)
             enable_supabase: If True, connect to Supabase (required for production)
                            If False, run in standalone mode (for testing/demos)
+            render_cache: Content-hash cache for rendered thumbnails
+                          (default: data/render_cache, or $MEDIA_RENDER_CACHE)
+            max_workers: Render processes for batches (None = CPU count, 1 = in-process)
         """
         # Initialize Supabase (optional for standalone demos)
         self.storage = None
@@ -112,7 +132,9 @@ class ThumbnailAgent:
         self.output_dir = Path(os.getenv("THUMBNAIL_DIR", "data/thumbnails"))
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Font paths (fallback to system fonts)
+        # Rendering (fonts and gradient masks are cached process-wide)
+        self.render_cache = render_cache or RenderCache()
+        self.max_workers = max_workers
         self.font_bold = self._get_font("arial.ttf", 72)
         self.font_subtitle = self._get_font("arial.ttf", 36)
 
@@ -131,22 +153,7 @@ class ThumbnailAgent:
         Returns:
             ImageFont.FreeTypeFont object
         """
-        # Try common font paths
-        font_paths = [
-            f"C:\\Windows\\Fonts\\{font_name}",
-            f"/usr/share/fonts/truetype/{font_name}",
-            f"/System/Library/Fonts/{font_name}",
-        ]
-
-        for path in font_paths:
-            try:
-                return ImageFont.truetype(path, size)
-            except (OSError, IOError):
-                continue
-
-        # Fallback to default font
-        logger.warning(f"Font {font_name} not found, using default")
-        return ImageFont.load_default()
+        return get_font(font_name, size)
 
     def _register_status(self):
         """Register agent in agent_status table"""
@@ -259,44 +266,99 @@ class ThumbnailAgent:
         """
         logger.info(f"Generating thumbnails for video: {video_id}")
 
-        # Create video-specific directory
-        video_dir = self.output_dir / video_id
-        video_dir.mkdir(parents=True, exist_ok=True)
+        specs = self._variant_specs(video_id, title, key_visual)
+        sizes = render_thumbnails(specs, max_workers=self.max_workers, cache=self.render_cache)
+        variants = self._to_variants(specs, sizes)
 
-        # Generate 3 variants with different color schemes
-        variants = []
+        logger.info(f"Generated {len(variants)} thumbnail variants")
+        return variants
 
-        # Variant 1: Orange accent (default ISH brand)
-        variants.append(self._generate_variant(
-            video_id=video_id,
-            variant_id=1,
-            title=title,
-            output_path=video_dir / "variant_1.jpg",
-            color_scheme="orange",
-            key_visual=key_visual
-        ))
-
-        # Variant 2: Blue accent (professional)
-        variants.append(self._generate_variant(
-            video_id=video_id,
-            variant_id=2,
-            title=title,
-            output_path=video_dir / "variant_2.jpg",
-            color_scheme="blue",
-            key_visual=key_visual
-        ))
-
-        # Variant 3: Yellow accent (high visibility)
-        variants.append(self._generate_variant(
-            video_id=video_id,
-            variant_id=3,
+    def generate_thumbnails_batch(
+        self,
+        videos: List[Dict[str, Any]]
+    ) -> Dict[str, List[ThumbnailVariant]]:
+        """
+        Generate variants for many videos in one process pool.
+
+        Args:
+            videos: Dicts with video_id, title and optional key_visual
+
+        Returns:
+            video_id -> list of ThumbnailVariant dicts
+
+        Example:
+            >>> results = agent.generate_thumbnails_batch([
+            ...     {"video_id": "plc_001", "title": "Master 3-Wire Motor Control"},
+            ...     {"video_id": "plc_002", "title": "VFD Fault Codes Explained"},
+            ... ])
+            >>> assert len(results["plc_002"]) == 3
+        """
+        specs_by_video = {
+            video["video_id"]: self._variant_specs(
+                video["video_id"], video["title"], video.get("key_visual")
+            )
+            for video in videos
+        }
+        all_specs = [spec for specs in specs_by_video.values() for spec in specs]
+        sizes = iter(render_thumbnails(all_specs, max_workers=self.max_workers, cache=self.render_cache))
+
+        results = {}
+        for video_id, specs in specs_by_video.items():
+            results[video_id] = self._to_variants(specs, [next(sizes) for _ in specs])
+
+        logger.info(f"Generated {len(all_specs)} thumbnail variants for {len(videos)} videos")
+        return results
+
+    def _variant_specs(
+        self,
+        video_id: str,
+        title: str,
+        key_visual: Optional[str] = None
+    ) -> List[ThumbnailSpec]:
+        """Specs for the 3 A/B variants (orange, blue, yellow accents)."""
+        video_dir = self.output_dir / video_id
+        return [
+            self._spec(title, video_dir / f"variant_{variant_id}.jpg", color_scheme, key_visual)
+            for variant_id, color_scheme in enumerate(self.COLOR_SCHEMES, start=1)
+        ]
+
+    def _spec(
+        self,
+        title: str,
+        output_path: Path,
+        color_scheme: str,
+        key_visual: Optional[str] = None
+    ) -> ThumbnailSpec:
+        accent_color = {
+            "orange": BRAND_COLORS["accent_orange"],
+            "blue": BRAND_COLORS["accent_blue"],
+            "yellow": BRAND_COLORS["accent_yellow"]
+        }.get(color_scheme, BRAND_COLORS["accent_orange"])
+        return ThumbnailSpec(
             title=title,
-            output_path=video_dir / "variant_3.jpg",
-            color_scheme="yellow",
-            key_visual=key_visual
-        ))
+            output_path=str(output_path),
+            accent_color=accent_color,
+            key_visual=key_visual,
+            width=self.WIDTH,
+            height=self.HEIGHT,
+            background=BRAND_COLORS["dark_bg"],
+            text_color=BRAND_COLORS["text_white"],
+            max_file_size=self.MAX_FILE_SIZE
+        )
 
-        logger.info(f"Generated {len(variants)} thumbnail variants")
+    def _to_variants(self, specs: List[ThumbnailSpec], sizes: List[int]) -> List[ThumbnailVariant]:
+        variants = []
+        for variant_id, (spec, color_scheme, size) in enumerate(
+            zip(specs, self.COLOR_SCHEMES, sizes, strict=True), start=1
+        ):
+            logger.info(f"Generated variant {variant_id}: {spec.output_path} ({size} bytes)")
+            variants.append(ThumbnailVariant(
+                variant_id=variant_id,
+                file_path=str(Path(spec.output_path).absolute()),
+                text_overlay=spec.title,
+                color_scheme=color_scheme,
+                file_size_bytes=size
+            ))
         return variants
 
     def _generate_variant(
@@ -322,88 +384,8 @@ class ThumbnailAgent:
         Returns:
             ThumbnailVariant dict
         """
-        # Create base image
-        img = Image.new("RGB", (self.WIDTH, self.HEIGHT), BRAND_COLORS["dark_bg"])
-        draw = ImageDraw.Draw(img)
-
-        # Add background visual if provided
-        if key_visual and Path(key_visual).exists():
-            try:
-                bg_img = Image.open(key_visual)
-                bg_img = bg_img.resize((self.WIDTH, self.HEIGHT), Image.Resampling.LANCZOS)
-                # Darken background image (40% opacity)
-                enhancer = ImageEnhance.Brightness(bg_img)
-                bg_img = enhancer.enhance(0.4)
-                img.paste(bg_img, (0, 0))
-            except Exception as e:
-                logger.warning(f"Failed to load key visual: {e}")
-
-        # Add gradient overlay for text readability
-        self._add_gradient_overlay(img)
-
-        # Select accent color
-        accent_color = {
-            "orange": BRAND_COLORS["accent_orange"],
-            "blue": BRAND_COLORS["accent_blue"],
-            "yellow": BRAND_COLORS["accent_yellow"]
-        }.get(color_scheme, BRAND_COLORS["accent_orange"])
-
-        # Add text overlay (title)
-        # Break title into lines (max 35 chars per line for readability)
-        lines = self._wrap_text(title, max_chars=35)
-
-        # Calculate text position (centered vertically)
-        line_height = 90
-        total_height = len(lines) * line_height
-        y_start = (self.HEIGHT - total_height) // 2
-
-        # Draw each line with shadow for depth
-        for i, line in enumerate(lines):
-            y_pos = y_start + (i * line_height)
-
-            # Text shadow (offset +4px)
-            draw.text(
-                (self.WIDTH // 2 + 4, y_pos + 4),
-                line,
-                font=self.font_bold,
-                fill="#000000",
-                anchor="mm"
-            )
-
-            # Main text
-            draw.text(
-                (self.WIDTH // 2, y_pos),
-                line,
-                font=self.font_bold,
-                fill=BRAND_COLORS["text_white"],
-                anchor="mm"
-            )
-
-        # Add accent bar at bottom
-        bar_height = 8
-        draw.rectangle(
-            [(0, self.HEIGHT - bar_height), (self.WIDTH, self.HEIGHT)],
-            fill=accent_color
-        )
-
-        # Add ISH branding (top-left corner)
-        draw.text(
-            (40, 40),
-            "INDUSTRIAL SKILLS HUB",
-            font=self.font_subtitle,
-            fill=accent_color
-        )
-
-        # Save thumbnail with compression
-        img.save(output_path, "JPEG", quality=85, optimize=True)
-
-        # Verify file size
-        file_size = output_path.stat().st_size
-        if file_size > self.MAX_FILE_SIZE:
-            # Re-save with lower quality
-            logger.warning(f"Thumbnail too large ({file_size} bytes), reducing quality")
-            img.save(output_path, "JPEG", quality=70, optimize=True)
-            file_size = output_path.stat().st_size
+        spec = self._spec(title, output_path, color_scheme, key_visual)
+        [file_size] = render_thumbnails([spec], max_workers=1, cache=self.render_cache)
 
         logger.info(f"Generated variant {variant_id}: {output_path} ({file_size} bytes)")
 
@@ -422,22 +404,8 @@ class ThumbnailAgent:
         Args:
             img: PIL Image to modify in-place
         """
-        # Create gradient mask (dark at center, transparent at edges)
-        gradient = Image.new("RGBA", (self.WIDTH, self.HEIGHT), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(gradient)
-
-        # Draw ellipse gradient (center darkened)
-        for i in range(10):
-            opacity = int(255 * (10 - i) / 10 * 0.3)  # Max 30% opacity
-            color = (0, 0, 0, opacity)
-            offset = i * 40
-            draw.ellipse(
-                [(offset, offset), (self.WIDTH - offset, self.HEIGHT - offset)],
-                fill=color
-            )
-
-        # Composite gradient onto image
-        img.paste(gradient, (0, 0), gradient)
+        # Mask is precomputed once per resolution
+        apply_gradient(img)
 
     def _wrap_text(self, text: str, max_chars: int = 35) -> List[str]:
         """
@@ -450,23 +418,7 @@ class ThumbnailAgent:
         Returns:
             List of text lines
         """
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            test_line = " ".join(current_line + [word])
-            if len(test_line) <= max_chars:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        return lines
+        return wrap_text(text, max_chars=max_chars)
 
     def _update_status(self, status: str, error_message: Optional[str] = None):
         """Update agent status in database"""
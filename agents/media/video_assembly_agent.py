@@ -18,6 +18,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 
 from agent_factory.memory.storage import SupabaseMemoryStorage
+from agents.media.rendering import BackgroundSegments, RenderCache, assemble_video
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,9 @@ class VideoAssemblyAgent:
         """Initialize agent with Supabase connection"""
         self.storage = SupabaseMemoryStorage()
         self.agent_name = "video_assembly_agent"
+        # Background is encoded once and stream-copied; unchanged audio hits the cache
+        self.render_cache = RenderCache()
+        self.background = BackgroundSegments()
         self._register_status()
 
     def _register_status(self):
@@ -107,49 +111,10 @@ class VideoAssemblyAgent:
         Returns:
             Path to generated video file
         """
-        import subprocess
         from pathlib import Path
 
-        # Create output directory
-        output_dir = Path("data/videos")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / output_filename
-
-        # Get audio duration using ffprobe
-        try:
-            result = subprocess.run(
-                ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                 "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
-                capture_output=True, text=True, check=True
-            )
-            duration = float(result.stdout.strip())
-        except Exception as e:
-            logger.error(f"Failed to get audio duration: {e}")
-            duration = 60  # Default 60 seconds if ffprobe fails
-
-        # Create simple video with black background + audio using FFmpeg
-        # This is a minimal implementation - can be enhanced later with visuals, captions, etc.
-        try:
-            subprocess.run([
-                "ffmpeg", "-y",  # Overwrite output file
-                "-f", "lavfi", "-i", f"color=c=black:s=1920x1080:d={duration}",  # Black background
-                "-i", audio_path,  # Audio input
-                "-c:v", "libx264",  # Video codec
-                "-c:a", "aac",  # Audio codec
-                "-b:a", "192k",  # Audio bitrate
-                "-pix_fmt", "yuv420p",  # Pixel format (compatibility)
-                "-shortest",  # Stop when shortest stream ends
-                str(output_path)
-            ], check=True, capture_output=True)
-
-            logger.info(f"Video created successfully: {output_path}")
-            return str(output_path)
-
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg failed: {e.stderr.decode()}")
-            raise RuntimeError(f"Video creation failed: {e.stderr.decode()}")
-        except FileNotFoundError:
-            raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+        output_path = Path("data/videos") / output_filename
+        return assemble_video(audio_path, output_path, self.background, cache=self.render_cache)
 
     def _update_status(self, status: str, error_message: Optional[str] = None):
         """Update agent status in database"""
@@ -23,9 +23,7 @@ Based on: docs/AGENT_ORGANIZATION.md Section 5
 
 import os
 import logging
-import asyncio
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
@@ -33,6 +31,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from agent_factory.memory.storage import SupabaseMemoryStorage
+from agents.media.narration import (
+    EdgeTTSProvider,
+    NarrationEngine,
+    OpenAITTSProvider,
+    SegmentCache,
+    TTSProvider,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +60,10 @@ class VoiceProductionAgent:
         self.openai_voice = os.getenv("OPENAI_VOICE", "alloy")  # alloy, echo, fable, onyx, nova, shimmer
         self.elevenlabs_voice_id = os.getenv("ELEVENLABS_VOICE_ID", "")
 
+        # Scripts are narrated per sentence; segments are cached on disk and reused
+        self.segment_cache = SegmentCache()
+        self.last_report = None
+
         logger.info(f"VoiceProductionAgent initialized with mode: {self.voice_mode}")
         self._register_status()
 
@@ -190,95 +199,47 @@ class VoiceProductionAgent:
             >>> await agent.generate_audio("Hello world", "output/hello.mp3")
             'output/hello.mp3'
         """
-        # Ensure output directory exists
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        if self.voice_mode == "edge":
-            # FREE - Edge TTS (Microsoft neural voices)
-            return await self._generate_edge_tts(text, output_path)
-
-        elif self.voice_mode == "openai":
-            # PAID - OpenAI TTS (sync method, run in thread pool)
-            return await asyncio.to_thread(self._generate_openai_tts, text, output_path)
+        provider = self._get_provider()
+        logger.info(f"Generating audio with {provider.name} (voice: {provider.voice})")
 
-        elif self.voice_mode == "elevenlabs":
-            # PAID - ElevenLabs (custom voice clone)
-            return await asyncio.to_thread(self._generate_elevenlabs_tts, text, output_path)
+        engine = NarrationEngine(provider, cache=self.segment_cache)
+        self.last_report = await engine.synthesize(text, output_path)
 
-        else:
-            raise ValueError(f"Unknown voice mode: {self.voice_mode}. Use: edge, openai, or elevenlabs")
+        logger.info(
+            f"Audio generated successfully: {output_path} "
+            f"({self.last_report.cache_hits}/{self.last_report.unique_segments} segments cached)"
+        )
+        return output_path
 
-    async def _generate_edge_tts(self, text: str, output_path: str) -> str:
+    def _get_provider(self) -> TTSProvider:
         """
-        Generate audio using Edge TTS (FREE, Microsoft neural voices)
-
-        Args:
-            text: Script text
-            output_path: Output file path
+        TTS provider for the configured voice mode
 
         Returns:
-            str: Path to generated audio file
-        """
-        try:
-            import edge_tts
-
-            logger.info(f"Generating audio with Edge TTS (voice: {self.edge_voice})")
-
-            communicate = edge_tts.Communicate(text, self.edge_voice)
-            await communicate.save(output_path)
-
-            logger.info(f"Audio generated successfully: {output_path}")
-            return output_path
-
-        except ImportError:
-            raise ImportError("edge-tts not installed. Run: poetry add edge-tts")
-        except Exception as e:
-            logger.error(f"Edge TTS generation failed: {e}")
-            raise
-
-    def _generate_openai_tts(self, text: str, output_path: str) -> str:
-        """
-        Generate audio using OpenAI TTS API (PAID)
-
-        Args:
-            text: Script text
-            output_path: Output file path
+            TTSProvider instance
 
-        Returns:
-            str: Path to generated audio file
+        Raises:
+            ValueError: If voice mode is invalid
+            NotImplementedError: If ElevenLabs is selected but not yet implemented
         """
-        try:
-            from openai import OpenAI
-
-            logger.info(f"Generating audio with OpenAI TTS (voice: {self.openai_voice})")
+        if self.voice_mode == "edge":
+            # FREE - Edge TTS (Microsoft neural voices)
+            return EdgeTTSProvider(self.edge_voice)
 
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            response = client.audio.speech.create(
-                model="tts-1",  # or "tts-1-hd" for higher quality
-                voice=self.openai_voice,
-                input=text
-            )
-            response.stream_to_file(output_path)
+        elif self.voice_mode == "openai":
+            # PAID - OpenAI TTS (sync client, run in thread pool)
+            return OpenAITTSProvider(self.openai_voice)
 
-            logger.info(f"Audio generated successfully: {output_path}")
-            return output_path
+        elif self.voice_mode == "elevenlabs":
+            # PAID - ElevenLabs (custom voice clone); raises until voice training is done
+            return self._get_elevenlabs_provider()
 
-        except ImportError:
-            raise ImportError("openai not installed. Run: poetry add openai")
-        except Exception as e:
-            logger.error(f"OpenAI TTS generation failed: {e}")
-            raise
+        else:
+            raise ValueError(f"Unknown voice mode: {self.voice_mode}. Use: edge, openai, or elevenlabs")
 
-    def _generate_elevenlabs_tts(self, text: str, output_path: str) -> str:
+    def _get_elevenlabs_provider(self) -> TTSProvider:
         """
-        Generate audio using ElevenLabs API (PAID, custom voice clone)
-
-        Args:
-            text: Script text
-            output_path: Output file path
-
-        Returns:
-            str: Path to generated audio file
+        ElevenLabs provider (PAID, custom voice clone)
 
         Raises:
             NotImplementedError: ElevenLabs integration coming Saturday after voice training
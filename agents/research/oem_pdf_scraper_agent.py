@@ -29,7 +29,6 @@ Schedule: On-demand (triggered by user or periodic scan)
 import os
 import re
 import hashlib
-import requests
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -52,6 +51,104 @@ try:
 except ImportError:
     Image = None
 
+from agent_factory.http import get_fetch_service
+from agent_factory.knowledge.pdf_extraction import PDFExtractionEngine
+
+
+def _count_layout_pages(pdf_path: str) -> int:
+    """Page count via PyMuPDF (runs in the extraction engine)."""
+    doc = fitz.open(pdf_path)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def _extract_layout_range(pdf_path: str, start: int, end: int) -> List[Optional[Dict]]:
+    """
+    Layout-aware extraction for pages [start, end).
+
+    Module-level so PDFExtractionEngine can run it in a worker process.
+    Pages without text blocks come back as None.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        return [_layout_page_data(doc[index], index) for index in range(start, end)]
+    finally:
+        doc.close()
+
+
+def _layout_page_data(page, page_num: int) -> Optional[Dict]:
+    """Reconstruct reading order and section headings for one page."""
+    # Extract text blocks with position info
+    blocks = page.get_text("dict")["blocks"]
+
+    # Detect columns by x-position clustering
+    text_blocks = [b for b in blocks if b.get("type") == 0]  # Text blocks only
+    if not text_blocks:
+        return None
+
+    # Sort by y-position, then x-position (reading order)
+    text_blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+
+    page_data = {
+        "page_number": page_num + 1,
+        "sections": [],
+        "text": "",
+        "quality_score": 1.0,
+    }
+
+    current_section = None
+    text_lines = []
+
+    for block in text_blocks:
+        for line in block.get("lines", []):
+            # Reconstruct line text
+            line_text = ""
+            for span in line.get("spans", []):
+                line_text += span.get("text", "")
+
+            line_text = line_text.strip()
+            if not line_text:
+                continue
+
+            # Detect section headers (larger font, bold, all caps)
+            font_size = span.get("size", 0)
+            is_bold = "bold" in span.get("font", "").lower()
+            is_header = font_size > 14 or (is_bold and len(line_text) < 100)
+
+            if is_header:
+                # New section
+                if current_section:
+                    page_data["sections"].append(current_section)
+                current_section = {
+                    "heading": line_text,
+                    "content": [],
+                }
+            else:
+                # Add to current section
+                if current_section is None:
+                    current_section = {
+                        "heading": f"Page {page_num + 1}",
+                        "content": [],
+                    }
+                current_section["content"].append(line_text)
+
+            text_lines.append(line_text + "\n")
+
+    page_data["text"] = "".join(text_lines)
+
+    # Add final section
+    if current_section:
+        page_data["sections"].append(current_section)
+
+    # Quality checks
+    if len(page_data["text"]) < 50:
+        page_data["quality_score"] = 0.3
+        page_data["warning"] = "Low text extraction (possible scan/image)"
+
+    return page_data
+
 
 class OEMPDFScraperAgent:
     """
@@ -105,14 +202,21 @@ class OEMPDFScraperAgent:
         },
     }
 
-    def __init__(self, cache_dir: str = "data/cache/pdfs", output_dir: str = "data/extracted"):
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/pdfs",
+        output_dir: str = "data/extracted",
+        engine: Optional[PDFExtractionEngine] = None,
+    ):
         """
         Initialize OEM PDF scraper.
 
         Args:
             cache_dir: Directory to cache downloaded PDFs
             output_dir: Directory to save extracted content
+            engine: Shared PDFExtractionEngine (creates default if None)
         """
+        self.engine = engine or PDFExtractionEngine()
         self.cache_dir = Path(cache_dir)
         self.output_dir = Path(output_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -155,25 +259,27 @@ class OEMPDFScraperAgent:
             print(f"  [CACHE HIT] {cache_path.name}")
             return cache_path
 
-        # Download
+        # Download (streamed to disk via the shared fetch service)
         try:
             print(f"  [DOWNLOAD] {url}")
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            result = get_fetch_service().download_sync(url, cache_path, headers=self.headers)
+            result.raise_for_status()
 
             # Verify it's actually a PDF
-            if not response.content.startswith(b"%PDF"):
+            with open(cache_path, "rb") as f:
+                is_pdf = f.read(4) == b"%PDF"
+            if not is_pdf:
                 print(f"  [ERROR] Not a valid PDF: {url}")
+                cache_path.unlink(missing_ok=True)
                 return None
 
-            # Save to cache
-            cache_path.write_bytes(response.content)
             self.stats["pdfs_downloaded"] += 1
-            print(f"  [OK] Downloaded {len(response.content) / 1024:.1f} KB")
+            print(f"  [OK] Downloaded {result.size / 1024:.1f} KB")
             return cache_path
 
         except Exception as e:
             print(f"  [ERROR] Download failed: {e}")
+            cache_path.unlink(missing_ok=True)
             return None
 
     def extract_metadata(self, pdf_path: Path, manufacturer: str) -> Dict:
@@ -268,79 +374,19 @@ class OEMPDFScraperAgent:
         pages = []
 
         try:
-            doc = fitz.open(pdf_path)
-
-            for page_num, page in enumerate(doc):
-                # Extract text blocks with position info
-                blocks = page.get_text("dict")["blocks"]
-
-                # Detect columns by x-position clustering
-                text_blocks = [b for b in blocks if b.get("type") == 0]  # Text blocks only
-                if not text_blocks:
+            # Page ranges are laid out in worker processes, results arrive in order
+            for page_data in self.engine.iter_pages(
+                pdf_path,
+                extract_range=_extract_layout_range,
+                count_pages=_count_layout_pages,
+            ):
+                if page_data is None:
                     continue
-
-                # Sort by y-position, then x-position (reading order)
-                text_blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
-
-                page_data = {
-                    "page_number": page_num + 1,
-                    "sections": [],
-                    "text": "",
-                    "quality_score": 1.0,
-                }
-
-                current_section = None
-
-                for block in text_blocks:
-                    for line in block.get("lines", []):
-                        # Reconstruct line text
-                        line_text = ""
-                        for span in line.get("spans", []):
-                            line_text += span.get("text", "")
-
-                        line_text = line_text.strip()
-                        if not line_text:
-                            continue
-
-                        # Detect section headers (larger font, bold, all caps)
-                        font_size = span.get("size", 0)
-                        is_bold = "bold" in span.get("font", "").lower()
-                        is_header = font_size > 14 or (is_bold and len(line_text) < 100)
-
-                        if is_header:
-                            # New section
-                            if current_section:
-                                page_data["sections"].append(current_section)
-                            current_section = {
-                                "heading": line_text,
-                                "content": [],
-                            }
-                        else:
-                            # Add to current section
-                            if current_section is None:
-                                current_section = {
-                                    "heading": f"Page {page_num + 1}",
-                                    "content": [],
-                                }
-                            current_section["content"].append(line_text)
-
-                        page_data["text"] += line_text + "\n"
-
-                # Add final section
-                if current_section:
-                    page_data["sections"].append(current_section)
-
-                # Quality checks
-                if len(page_data["text"]) < 50:
-                    page_data["quality_score"] = 0.3
-                    page_data["warning"] = "Low text extraction (possible scan/image)"
+                if page_data["quality_score"] < 0.5:
                     self.stats["low_quality_warnings"] += 1
-
                 pages.append(page_data)
                 self.stats["pages_extracted"] += 1
 
-            doc.close()
-
         except Exception as e:
             print(f"  [ERROR] Text extraction failed: {e}")
 
@@ -475,6 +521,27 @@ class OEMPDFScraperAgent:
         if not pdf_path:
             return {"error": "Download failed"}
 
+        return self.extract_pdf_content(pdf_path, manufacturer, extract_images)
+
+    def extract_pdf_content(
+        self,
+        pdf_path: Path,
+        manufacturer: str,
+        extract_images: bool = True,
+    ) -> Dict:
+        """
+        Extract a downloaded PDF and save the result as JSON.
+
+        Args:
+            pdf_path: Local PDF (e.g. from download_pdf)
+            manufacturer: Manufacturer name
+            extract_images: Whether to extract images/diagrams
+
+        Returns:
+            Complete extraction result dictionary ("output_path" is the saved JSON)
+        """
+        pdf_path = Path(pdf_path)
+
         # Step 2: Extract metadata
         print("\n[1/4] Extracting metadata...")
         metadata = self.extract_metadata(pdf_path, manufacturer)
@@ -523,6 +590,7 @@ class OEMPDFScraperAgent:
         print(f"\n[OK] Saved result to: {output_json}")
         self.stats["pdfs_processed"] += 1
 
+        result["output_path"] = str(output_json)
         return result
 
     def process_manufacturer(
@@ -0,0 +1,25 @@
+-- Migration 010: Atom Tombstones for Incremental Re-Ingestion
+-- Date: 2026-10-18
+-- Description: Soft-delete column for atoms whose source chunks were removed
+--              when a revised source is re-ingested incrementally
+
+-- ============================================================================
+-- Add tombstone column to knowledge_atoms table
+-- ============================================================================
+
+-- NULL = live atom; set when the chunk that produced the atom disappears from
+-- its source, cleared again if the chunk comes back
+ALTER TABLE knowledge_atoms
+ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ DEFAULT NULL;
+
+-- Partial index so "live atoms only" filters stay cheap
+CREATE INDEX IF NOT EXISTS idx_knowledge_atoms_live
+ON knowledge_atoms(atom_id)
+WHERE deleted_at IS NULL;
+
+-- ============================================================================
+-- Verification
+-- ============================================================================
+
+-- SELECT column_name, data_type FROM information_schema.columns
+-- WHERE table_name = 'knowledge_atoms' AND column_name = 'deleted_at';
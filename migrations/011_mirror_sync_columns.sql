@@ -0,0 +1,80 @@
+-- Migration 011: Sync Watermarks for the Local Knowledge Mirror
+-- Date: 2026-10-18
+-- Description: updated_at columns, triggers and (updated_at, key) indexes so
+--              agent_factory/knowledge/local_mirror.py can pull changes
+--              incrementally from knowledge_atoms, equipment_manuals and
+--              user_machines
+
+-- ============================================================================
+-- Shared trigger function: bump updated_at on every UPDATE
+-- ============================================================================
+
+-- clock_timestamp() (row write time) rather than NOW() (transaction start),
+-- so a long transaction doesn't stamp rows far behind what the mirror has
+-- already pulled. Rows still become visible only at COMMIT, so the mirror
+-- re-reads a window behind its watermark (sync_overlap_seconds).
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- knowledge_atoms
+-- ============================================================================
+
+ALTER TABLE knowledge_atoms
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+-- Rows without a watermark would never be pulled
+UPDATE knowledge_atoms SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+
+DROP TRIGGER IF EXISTS trg_knowledge_atoms_touch ON knowledge_atoms;
+CREATE TRIGGER trg_knowledge_atoms_touch
+    BEFORE UPDATE ON knowledge_atoms
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+-- Keyset pagination: WHERE (updated_at, atom_id) > (...) ORDER BY updated_at, atom_id
+CREATE INDEX IF NOT EXISTS idx_knowledge_atoms_sync
+ON knowledge_atoms(updated_at, atom_id);
+
+-- ============================================================================
+-- equipment_manuals
+-- ============================================================================
+
+ALTER TABLE equipment_manuals
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+UPDATE equipment_manuals
+SET updated_at = COALESCE(indexed_at, uploaded_at, NOW())
+WHERE updated_at IS NULL;
+
+DROP TRIGGER IF EXISTS trg_equipment_manuals_touch ON equipment_manuals;
+CREATE TRIGGER trg_equipment_manuals_touch
+    BEFORE UPDATE ON equipment_manuals
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_equipment_manuals_sync
+ON equipment_manuals(updated_at, (id::text));
+
+-- ============================================================================
+-- user_machines (already has updated_at)
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trg_user_machines_touch ON user_machines;
+CREATE TRIGGER trg_user_machines_touch
+    BEFORE UPDATE ON user_machines
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_user_machines_sync
+ON user_machines(updated_at, (id::text));
+
+-- ============================================================================
+-- Verification
+-- ============================================================================
+
+-- SELECT table_name, column_name FROM information_schema.columns
+-- WHERE column_name = 'updated_at'
+--   AND table_name IN ('knowledge_atoms', 'equipment_manuals', 'user_machines');
@@ -0,0 +1,102 @@
+-- Migration 012: Exclude Tombstoned Atoms from Search RPCs
+-- Date: 2026-10-19
+-- Description: Re-creates the knowledge_atoms search functions so atoms whose
+--              source chunks were removed (deleted_at set, migration 010)
+--              are never returned
+
+-- ============================================================================
+-- Semantic search (vector similarity)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION search_atoms_by_embedding(
+    query_embedding vector(1536),
+    match_threshold float DEFAULT 0.7,
+    match_count int DEFAULT 10
+)
+RETURNS TABLE (
+    atom_id text,
+    title text,
+    summary text,
+    similarity float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        ka.atom_id,
+        ka.title,
+        ka.summary,
+        1 - (ka.embedding <=> query_embedding) as similarity
+    FROM knowledge_atoms ka
+    WHERE ka.deleted_at IS NULL
+      AND 1 - (ka.embedding <=> query_embedding) > match_threshold
+    ORDER BY ka.embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- ============================================================================
+-- Hybrid search (vector + text)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION search_atoms_hybrid(
+    query_embedding vector(1536),
+    query_text text,
+    match_count int DEFAULT 10
+)
+RETURNS TABLE (
+    atom_id text,
+    title text,
+    summary text,
+    vector_score float,
+    text_rank float,
+    combined_score float
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH vector_search AS (
+        SELECT
+            ka.atom_id,
+            ka.title,
+            ka.summary,
+            1 - (ka.embedding <=> query_embedding) as similarity
+        FROM knowledge_atoms ka
+        WHERE ka.deleted_at IS NULL
+        ORDER BY ka.embedding <=> query_embedding
+        LIMIT match_count * 3
+    ),
+    text_search AS (
+        SELECT
+            ka.atom_id,
+            ts_rank(
+                to_tsvector('english', ka.title || ' ' || ka.summary || ' ' || ka.content),
+                plainto_tsquery('english', query_text)
+            ) as rank
+        FROM knowledge_atoms ka
+        WHERE ka.deleted_at IS NULL
+          AND to_tsvector('english', ka.title || ' ' || ka.summary || ' ' || ka.content)
+            @@ plainto_tsquery('english', query_text)
+    )
+    SELECT
+        vs.atom_id,
+        vs.title,
+        vs.summary,
+        vs.similarity as vector_score,
+        COALESCE(ts.rank, 0) as text_rank,
+        (vs.similarity * 0.7 + COALESCE(ts.rank, 0) * 0.3) as combined_score
+    FROM vector_search vs
+    LEFT JOIN text_search ts ON vs.atom_id = ts.atom_id
+    ORDER BY combined_score DESC
+    LIMIT match_count;
+END;
+$$;
+
+-- ============================================================================
+-- Verification
+-- ============================================================================
+
+-- SELECT prosrc LIKE '%deleted_at IS NULL%' FROM pg_proc
+-- WHERE proname IN ('search_atoms_by_embedding', 'search_atoms_hybrid');
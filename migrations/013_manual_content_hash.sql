@@ -0,0 +1,20 @@
+-- Migration 013: Content Hash for Equipment Manuals
+-- Date: 2026-10-19
+-- Description: SHA-256 of the uploaded PDF, so the manual ingestion queue
+--              (agent_factory/knowledge/manual_ingestion.py) can skip
+--              re-indexing identical uploads across restarts
+
+ALTER TABLE equipment_manuals
+ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64);
+
+-- RIVETProDatabase.get_manual_by_hash: WHERE content_sha256 = ... AND indexed
+CREATE INDEX IF NOT EXISTS idx_equipment_manuals_content_sha256
+ON equipment_manuals(content_sha256)
+WHERE content_sha256 IS NOT NULL;
+
+-- ============================================================================
+-- Verification
+-- ============================================================================
+
+-- SELECT column_name FROM information_schema.columns
+-- WHERE table_name = 'equipment_manuals' AND column_name = 'content_sha256';
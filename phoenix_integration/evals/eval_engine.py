@@ -0,0 +1,705 @@
+"""
+Async Evaluation Engine for the Golden Dataset
+
+Runs agent diagnosis + LLM-as-judge evals without re-paying for work that
+was already done:
+
+- Async fan-out: every case's agent call and judge calls run as coroutines,
+  bounded per provider (e.g. groq=4, openai=8) instead of a fixed
+  4-thread pool.
+- Content-addressed cache: agent outputs and judge verdicts are stored under
+  sha256(case, prompt template, model). Editing one judge template only
+  re-runs that judge; everything else is a cache hit.
+- Checkpoint/resume: each finished case is appended to a JSONL results file
+  with the fingerprint (template, rails, model) of its agent and judges; a
+  restarted run skips cases whose fingerprints still match and re-runs only
+  the judges that changed. Failed calls are neither cached nor checkpointed.
+- Sharding: cases are assigned to shard (hash(case_id) % N), so N processes
+  can split a dataset and their JSONL files merged afterwards.
+- Streaming summary: pass rates are folded in as results arrive.
+
+An AgentBackend runs a synchronous agent entry point (run_eval's
+get_agent_diagnosis: RivetOrchestrator first, then the raw LLM) in worker
+threads; a StubBackend answers deterministically offline, for tests and dry runs.
+
+Usage:
+    engine = EvalEngine(
+        agent_backend=AgentBackend(get_agent_diagnosis, "groq", "llama-3.3-70b-versatile"),
+        judge_backend=LLMBackend("openai", "gpt-4-turbo"),
+        cache=ResultCache("evals/.eval_cache"),
+    )
+    report = asyncio.run(engine.run(cases, results_path="evals/eval_results.jsonl"))
+    print(report.summary)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .judges import EVAL_CONFIG, get_blocking_evals
+
+logger = logging.getLogger(__name__)
+
+
+AGENT_PROMPT_TEMPLATE = """You are an expert industrial maintenance technician.
+
+EQUIPMENT:
+- Manufacturer: {manufacturer}
+- Model: {model}
+
+FAULT:
+- Code: {fault_code}
+- Description: {fault_description}
+
+CONTEXT:
+{context}
+
+Provide a complete diagnosis in JSON format with these exact fields:
+- root_cause: Explanation of what's causing the fault
+- safety_warnings: List of critical safety warnings
+- repair_steps: Step-by-step repair procedure
+- manual_citations: Relevant manual references
+
+Respond ONLY with valid JSON."""
+
+DEFAULT_CONCURRENCY = {"groq": 4, "openai": 8, "stub": 16}
+
+
+# =============================================================================
+# PROMPTS
+# =============================================================================
+
+def build_agent_prompt(case: dict) -> str:
+    """Format the agent diagnosis prompt for a case."""
+    equipment = case.get("equipment", {})
+    input_data = case.get("input", {})
+    return AGENT_PROMPT_TEMPLATE.format(
+        manufacturer=equipment.get("manufacturer", "Unknown"),
+        model=equipment.get("model", ""),
+        fault_code=input_data.get("fault_code", "UNKNOWN"),
+        fault_description=input_data.get("fault_description", ""),
+        context=input_data.get("context", ""),
+    )
+
+
+def build_judge_prompt(template: str, case: dict, agent_output: dict) -> str:
+    """Fill a judge template with case data and agent output."""
+    equipment = case.get("equipment", {})
+    input_data = case.get("input", {})
+    expected = case.get("expected_output", {})
+    return template.format(
+        # Equipment info
+        equipment=equipment.get("model", "Unknown"),
+        manufacturer=equipment.get("manufacturer", "Unknown"),
+
+        # Fault info
+        fault_code=input_data.get("fault_code", "Unknown"),
+        fault_description=input_data.get("fault_description", ""),
+        sensor_data=json.dumps(input_data.get("sensor_data", {})),
+
+        # Agent outputs
+        agent_root_cause=agent_output.get("root_cause", ""),
+        agent_safety_warnings="\n".join(agent_output.get("safety_warnings", [])),
+        agent_repair_steps="\n".join(agent_output.get("repair_steps", [])),
+        agent_citations="\n".join(agent_output.get("manual_citations", [])),
+        agent_response=json.dumps(agent_output, indent=2),
+        retrieved_atoms="\n".join(str(a) for a in agent_output.get("retrieved_atoms", [])),
+
+        # Expected outputs (reference)
+        expected_root_cause=expected.get("root_cause", ""),
+        expected_safety_warnings="\n".join(expected.get("safety_critical_warnings", [])),
+        expected_repair_steps="\n".join(expected.get("repair_steps", [])),
+        known_valid_manuals="\n".join(expected.get("manual_citations", [])),
+
+        # Additional fields for specific templates
+        voltage_level=equipment.get("voltage", "Unknown"),
+        safety_classification=expected.get("business_impact", {}).get("safety_critical", False),
+        complexity_level="Medium",
+    )
+
+
+def parse_judge_response(raw_response: str, rails: List[str]) -> dict:
+    """Extract label and reason from a judge response."""
+    label = "UNKNOWN"
+    reason = raw_response
+
+    for rail in rails:
+        if f"LABEL: {rail}" in raw_response or raw_response.strip().startswith(rail):
+            label = rail
+            if "REASON:" in raw_response:
+                reason = raw_response.split("REASON:")[1].split("\n")[0].strip()
+            break
+
+    return {"label": label, "reason": reason, "raw_response": raw_response}
+
+
+def error_diagnosis(error: Any) -> dict:
+    """Diagnosis placeholder for a failed agent call."""
+    return {"root_cause": f"ERROR: {error}", "safety_warnings": [], "repair_steps": [], "manual_citations": []}
+
+
+def is_error_diagnosis(output: dict) -> bool:
+    """True for the placeholder a failed agent call returns (e.g. a 429)."""
+    return str(output.get("root_cause", "")).startswith("ERROR:")
+
+
+def normalize_diagnosis(result: dict) -> dict:
+    """Keep only the diagnosis fields the judges read."""
+    return {
+        "root_cause": result.get("root_cause", ""),
+        "safety_warnings": result.get("safety_warnings", []),
+        "repair_steps": result.get("repair_steps", []),
+        "manual_citations": result.get("manual_citations", []),
+    }
+
+
+# =============================================================================
+# MODEL BACKENDS
+# =============================================================================
+
+class LLMBackend:
+    """Async chat-completions backend (OpenAI or Groq).
+
+    Clients are created lazily so importing this module needs neither SDK.
+    """
+
+    def __init__(self, provider: str, model: str, wrap: Optional[Callable[[Any], Any]] = None):
+        self.provider = provider
+        self.model = model
+        self._wrap = wrap or (lambda client: client)
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            if self.provider == "groq":
+                import groq
+                client = groq.AsyncGroq()
+            elif self.provider == "openai":
+                import openai
+                client = openai.AsyncOpenAI()
+            else:
+                raise ValueError(f"Unknown provider: {self.provider}")
+            self._client = self._wrap(client)
+        return self._client
+
+    async def complete(self, prompt: str, json_mode: bool = False, temperature: float = 0.0, max_tokens: int = 1000) -> str:
+        kwargs = {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        response = await self._get_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        return response.choices[0].message.content
+
+
+class AgentBackend:
+    """Agent backend around a synchronous diagnose(case) -> dict function.
+
+    Used so the engine diagnoses through the same path as the sequential
+    runner (get_agent_diagnosis); calls run in worker threads.
+    """
+
+    def __init__(self, diagnose_fn: Callable[[dict], dict], provider: str, model: str):
+        self._diagnose_fn = diagnose_fn
+        self.provider = provider
+        self.model = model
+
+    async def diagnose(self, case: dict) -> dict:
+        return await asyncio.to_thread(self._diagnose_fn, case)
+
+
+class StubBackend:
+    """Deterministic offline backend.
+
+    Agent prompts (json_mode) get a fixed diagnosis; judge prompts get the
+    first rail of their "LABEL: [A|B|C]" line, or labels[eval rail set].
+    """
+
+    _RAILS = re.compile(r"LABEL:\s*\[([A-Z_|]+)\]")
+
+    def __init__(
+        self,
+        provider: str = "stub",
+        model: str = "stub-1",
+        latency: float = 0.0,
+        diagnosis: Optional[dict] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.provider = provider
+        self.model = model
+        self.latency = latency
+        self.diagnosis = diagnosis or {
+            "root_cause": "Stub root cause",
+            "safety_warnings": ["Lockout/Tagout before inspection"],
+            "repair_steps": ["Isolate power", "Inspect", "Restore"],
+            "manual_citations": ["Stub Manual, Section 1"],
+        }
+        self.labels = labels or {}
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def complete(self, prompt: str, json_mode: bool = False, temperature: float = 0.0, max_tokens: int = 1000) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        if json_mode:
+            return json.dumps(self.diagnosis)
+
+        match = self._RAILS.search(prompt)
+        rails = match.group(1).split("|") if match else ["UNKNOWN"]
+        label = self.labels.get(match.group(1) if match else "", rails[0])
+        return f"LABEL: {label}\nREASON: stub verdict"
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+def content_hash(value: Any) -> str:
+    """sha256 of a JSON-serializable value (key order independent)."""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ResultCache:
+    """Content-addressed store of agent outputs and judge verdicts.
+
+    One JSON file per key under <directory>/<key[:2]>/<key>.json, written
+    atomically so concurrent shards can share a cache directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.stats = CacheStats()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+        self.stats.writes += 1
+
+
+# =============================================================================
+# SHARDING / CHECKPOINTS
+# =============================================================================
+
+def case_id_of(case: dict, index: int) -> str:
+    return case.get("test_case_id", f"case_{index}")
+
+
+def shard_cases(cases: List[dict], shard_index: int, num_shards: int) -> List[dict]:
+    """Cases belonging to one shard (stable under dataset reordering)."""
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+    return [
+        case for i, case in enumerate(cases, 1)
+        if int(hashlib.sha1(case_id_of(case, i).encode()).hexdigest(), 16) % num_shards == shard_index
+    ]
+
+
+def load_checkpoint(path: str) -> Dict[str, dict]:
+    """case_id -> result from a JSONL results file (ignores a torn last line)."""
+    results: Dict[str, dict] = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping malformed checkpoint line in {path}")
+                continue
+            results[result["case_id"]] = result
+    return results
+
+
+def _truncate_torn_line(path: str) -> None:
+    """Drop a partial last line so appended results start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def merge_results(paths: Iterable[str]) -> List[dict]:
+    """Combine shard JSONL files into one result list (last write wins)."""
+    merged: Dict[str, dict] = {}
+    for path in paths:
+        merged.update(load_checkpoint(path))
+    return list(merged.values())
+
+
+# =============================================================================
+# STREAMING SUMMARY
+# =============================================================================
+
+class StreamingSummary:
+    """Incremental version of run_eval.compute_summary()."""
+
+    def __init__(self, eval_config: Optional[dict] = None):
+        self.eval_config = eval_config or EVAL_CONFIG
+        self.total = 0
+        self.counts: Dict[str, Dict[str, int]] = {name: {} for name in self.eval_config}
+
+    def add(self, result: dict) -> None:
+        self.total += 1
+        for eval_name, counts in self.counts.items():
+            label = result.get("evals", {}).get(eval_name, {}).get("label", "UNKNOWN")
+            counts[label] = counts.get(label, 0) + 1
+
+    def pass_rate(self, eval_name: str) -> float:
+        pass_label = self.eval_config[eval_name]["rails"][0]  # First rail is the "pass" label
+        return self.counts[eval_name].get(pass_label, 0) / self.total if self.total else 0
+
+    def to_dict(self) -> dict:
+        if not self.total:
+            return {}
+
+        summary = {
+            "total_cases": self.total,
+            "timestamp": datetime.utcnow().isoformat(),
+            "by_eval": {},
+        }
+        for eval_name, config in self.eval_config.items():
+            pass_rate = self.pass_rate(eval_name)
+            summary["by_eval"][eval_name] = {
+                "counts": dict(self.counts[eval_name]),
+                "pass_rate": pass_rate,
+                "threshold": config["threshold"],
+                "passed": pass_rate >= config["threshold"],
+                "blocking": config["blocking"],
+            }
+
+        summary["gate_passed"] = all(
+            summary["by_eval"][eval_name]["passed"]
+            for eval_name in get_blocking_evals()
+            if eval_name in summary["by_eval"]
+        )
+        return summary
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+@dataclass
+class EvalRunReport:
+    """Outcome of EvalEngine.run()."""
+    results: List[dict] = field(default_factory=list)
+    summary: dict = field(default_factory=dict)
+    evaluated: int = 0
+    resumed: int = 0
+    failed: int = 0
+    model_calls: int = 0
+    cache: dict = field(default_factory=dict)
+    wall_sec: float = 0.0
+
+
+class EvalEngine:
+    """Evaluate golden cases with bounded async fan-out and caching."""
+
+    def __init__(
+        self,
+        agent_backend,
+        judge_backend,
+        cache: Optional[ResultCache] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        eval_config: Optional[dict] = None,
+        max_cases_in_flight: int = 32,
+    ):
+        """
+        Args:
+            agent_backend: Backend for diagnosis calls (provider, model, complete())
+            judge_backend: Backend for judge calls
+            cache: Result cache (None disables caching)
+            concurrency: Max concurrent calls per provider (default: DEFAULT_CONCURRENCY)
+            eval_config: Judges to run (default: judges.EVAL_CONFIG)
+            max_cases_in_flight: Cases started before earlier ones finish
+        """
+        self.agent_backend = agent_backend
+        self.judge_backend = judge_backend
+        self.cache = cache
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.eval_config = eval_config or EVAL_CONFIG
+        self.max_cases_in_flight = max_cases_in_flight
+        self.model_calls = 0
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _limit(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._limits:
+            self._limits[provider] = asyncio.Semaphore(self.concurrency.get(provider, 4))
+        return self._limits[provider]
+
+    async def _call(self, backend, prompt: str, **kwargs) -> str:
+        async with self._limit(backend.provider):
+            self.model_calls += 1
+            return await backend.complete(prompt, **kwargs)
+
+    async def _call_agent(self, backend, case: dict) -> dict:
+        if hasattr(backend, "diagnose"):
+            async with self._limit(backend.provider):
+                self.model_calls += 1
+                return await backend.diagnose(case)
+        raw = await self._call(backend, build_agent_prompt(case), json_mode=True, temperature=0.3)
+        return json.loads(raw)
+
+    def _cached(self, key: str) -> Optional[dict]:
+        return self.cache.get(key) if self.cache else None
+
+    def _store(self, key: str, value: dict) -> None:
+        if self.cache:
+            self.cache.put(key, value)
+
+    def agent_fingerprint(self) -> str:
+        """Hash of what determines an agent output: prompt template and model."""
+        backend = self.agent_backend
+        return content_hash({
+            "template": content_hash(AGENT_PROMPT_TEMPLATE),
+            "model": f"{backend.provider}:{backend.model}",
+        })
+
+    def judge_fingerprint(self, eval_name: str) -> str:
+        """Hash of what determines a verdict: judge template, rails and model."""
+        config = self.eval_config[eval_name]
+        backend = self.judge_backend
+        return content_hash({
+            "template": content_hash(config["template"]),
+            "rails": config["rails"],
+            "model": f"{backend.provider}:{backend.model}",
+        })
+
+    async def diagnose(self, case: dict) -> dict:
+        """Agent diagnosis for a case (cached on case, prompt template, model)."""
+        key = content_hash({
+            "kind": "agent",
+            "case": {k: case.get(k) for k in ("equipment", "input")},
+            "fingerprint": self.agent_fingerprint(),
+        })
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        try:
+            output = normalize_diagnosis(await self._call_agent(self.agent_backend, case))
+        except Exception as e:
+            logger.error(f"Agent call failed: {e}")
+            return error_diagnosis(e)
+
+        if not is_error_diagnosis(output):
+            self._store(key, output)
+        return output
+
+    async def judge(self, eval_name: str, case: dict, agent_output: dict) -> dict:
+        """One judge verdict (cached on case, agent output, template, model)."""
+        config = self.eval_config[eval_name]
+        fingerprint = self.judge_fingerprint(eval_name)
+        key = content_hash({
+            "kind": "judge",
+            "case": case,
+            "agent_output": agent_output,
+            "fingerprint": fingerprint,
+        })
+        cached = self._cached(key)
+        if cached is not None:
+            return {**cached, "cached": True, "fingerprint": fingerprint}
+
+        try:
+            prompt = build_judge_prompt(config["template"], case, agent_output)
+            raw = await self._call(self.judge_backend, prompt, temperature=0.0, max_tokens=500)
+        except Exception as e:
+            logger.error(f"Judge {eval_name} failed: {e}")
+            return {"label": "ERROR", "reason": str(e), "raw_response": "", "cached": False, "fingerprint": fingerprint}
+
+        verdict = parse_judge_response(raw, config["rails"])
+        self._store(key, verdict)
+        return {**verdict, "cached": False, "fingerprint": fingerprint}
+
+    def _current_agent_output(self, result: dict) -> Optional[dict]:
+        """Agent output of a checkpointed result, if the current agent would reproduce it."""
+        output = result.get("agent_output")
+        if output is None or is_error_diagnosis(output) or result.get("agent_fingerprint") != self.agent_fingerprint():
+            return None
+        return output
+
+    def _current_verdicts(self, result: dict) -> Dict[str, dict]:
+        """Verdicts of a checkpointed result that the current config would reproduce."""
+        if self._current_agent_output(result) is None:
+            return {}
+        evals = result.get("evals", {})
+        return {
+            name: evals[name] for name in self.eval_config
+            if name in evals
+            and evals[name].get("fingerprint") == self.judge_fingerprint(name)
+            and evals[name].get("label") != "ERROR"
+        }
+
+    def is_current(self, result: dict) -> bool:
+        """True if a checkpointed result needs no new agent or judge calls."""
+        return len(self._current_verdicts(result)) == len(self.eval_config)
+
+    async def evaluate_case(self, case: dict, index: int = 1, previous: Optional[dict] = None) -> dict:
+        """Diagnose a case, then run every judge concurrently.
+
+        With a previous (checkpointed) result, its agent output and any
+        verdicts whose fingerprint still matches are reused.
+        """
+        previous = previous or {}
+        reused = self._current_verdicts(previous)
+        agent_output = self._current_agent_output(previous)
+        if agent_output is None:
+            agent_output = await self.diagnose(case)
+
+        names = list(self.eval_config)
+        if is_error_diagnosis(agent_output):
+            # Judging an error message wastes calls and yields meaningless verdicts
+            evals = {
+                name: {"label": "ERROR", "reason": agent_output["root_cause"], "raw_response": "", "cached": False}
+                for name in names
+            }
+        else:
+            rerun = [name for name in names if name not in reused]
+            verdicts = await asyncio.gather(*(self.judge(name, case, agent_output) for name in rerun))
+            evals = {**reused, **dict(zip(rerun, verdicts, strict=True))}
+            evals = {name: evals[name] for name in names}
+
+        return {
+            "case_id": case_id_of(case, index),
+            "fault_code": case.get("input", {}).get("fault_code"),
+            "equipment": case.get("equipment", {}).get("model"),
+            "timestamp": datetime.utcnow().isoformat(),
+            "agent_fingerprint": self.agent_fingerprint(),
+            "agent_output": agent_output,
+            "evals": evals,
+        }
+
+    async def run(
+        self,
+        cases: List[dict],
+        results_path: Optional[str] = None,
+        resume: bool = True,
+        on_result: Optional[Callable[[dict, StreamingSummary], None]] = None,
+    ) -> EvalRunReport:
+        """Evaluate cases, appending each result to results_path as it finishes.
+
+        Args:
+            cases: Golden cases (already sharded, if sharding)
+            results_path: JSONL checkpoint file (None = in-memory only)
+            resume: Skip cases already in results_path whose agent and judge
+                fingerprints match; re-run only the judges that changed
+            on_result: Called after each new result with the running summary
+
+        Returns:
+            EvalRunReport with results in dataset order
+        """
+        start = time.perf_counter()
+        report = EvalRunReport()
+        summary = StreamingSummary(self.eval_config)
+        calls_before = self.model_calls
+
+        done: Dict[str, dict] = {}
+        if results_path and resume:
+            done = load_checkpoint(results_path)
+            _truncate_torn_line(results_path)
+        elif results_path and os.path.exists(results_path):
+            os.remove(results_path)
+
+        indexed = list(enumerate(cases, 1))
+        pending = []
+        for i, case in indexed:
+            previous = done.get(case_id_of(case, i))
+            if previous and self.is_current(previous):
+                summary.add(previous)
+                report.resumed += 1
+            else:
+                pending.append((i, case, previous))
+        if report.resumed:
+            logger.info(f"Resuming: {report.resumed} cases already in {results_path}, {len(pending)} to go")
+
+        new_results: Dict[str, dict] = {}
+        sink = open(results_path, "a", encoding="utf-8") if results_path else None
+        gate = asyncio.Semaphore(self.max_cases_in_flight)
+
+        async def one(index: int, case: dict, previous: Optional[dict]):
+            async with gate:
+                try:
+                    result = await self.evaluate_case(case, index, previous)
+                except Exception as e:
+                    logger.error(f"Eval failed for {case_id_of(case, index)}: {e}")
+                    report.failed += 1
+                    return
+            new_results[result["case_id"]] = result
+            summary.add(result)
+            if any(v.get("label") == "ERROR" for v in result["evals"].values()):
+                # Reported, but left out of the checkpoint so a resumed run retries it
+                report.failed += 1
+            elif sink:
+                sink.write(json.dumps(result) + "\n")
+                sink.flush()
+            if on_result:
+                on_result(result, summary)
+
+        try:
+            await asyncio.gather(*(one(i, case, previous) for i, case, previous in pending))
+        finally:
+            if sink:
+                sink.close()
+
+        for i, case in indexed:
+            case_id = case_id_of(case, i)
+            result = new_results.get(case_id) or done.get(case_id)
+            if result:
+                report.results.append(result)
+
+        report.evaluated = len(new_results)
+        report.summary = summary.to_dict()
+        report.model_calls = self.model_calls - calls_before
+        report.cache = self.cache.stats.to_dict() if self.cache else {}
+        report.wall_sec = time.perf_counter() - start
+        return report
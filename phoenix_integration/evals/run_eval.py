@@ -15,6 +15,13 @@ Usage:
     # Dry run (show what would happen)
     python run_eval.py --dry-run
 
+    # Async engine: cached, resumable, split across 4 processes
+    python run_eval.py --parallel --shard 0/4   # ... through --shard 3/4
+    python run_eval.py --merge evals/eval_results.shard*.jsonl
+
+    # Offline (stub model backend)
+    python run_eval.py --parallel --backend stub
+
 Requires:
     - Phoenix server running (phoenix serve)
     - Golden dataset exported (datasets/golden_dataset.jsonl)
@@ -24,6 +31,7 @@ Requires:
 import os
 import json
 import argparse
+import functools
 from datetime import datetime
 from typing import Optional
 import logging
@@ -44,7 +52,21 @@ from evals.judges import (
     PROCEDURE_COMPLETENESS_TEMPLATE,
     MANUAL_CITATION_TEMPLATE,
     EVAL_CONFIG,
-    get_blocking_evals,
+)
+from evals.eval_engine import (
+    AgentBackend,
+    EvalEngine,
+    LLMBackend,
+    ResultCache,
+    StreamingSummary,
+    StubBackend,
+    build_agent_prompt,
+    build_judge_prompt,
+    error_diagnosis,
+    merge_results,
+    normalize_diagnosis,
+    parse_judge_response,
+    shard_cases,
 )
 
 # Phoenix tracing integration
@@ -138,29 +160,7 @@ def get_agent_diagnosis(case: dict, model: str = "groq") -> dict:
 
     # Fallback: Direct API call
     try:
-        equipment = case.get("equipment", {})
-        input_data = case.get("input", {})
-
-        prompt = f"""You are an expert industrial maintenance technician.
-
-EQUIPMENT:
-- Manufacturer: {equipment.get('manufacturer', 'Unknown')}
-- Model: {equipment.get('model', '')}
-
-FAULT:
-- Code: {input_data.get('fault_code', 'UNKNOWN')}
-- Description: {input_data.get('fault_description', '')}
-
-CONTEXT:
-{input_data.get('context', '')}
-
-Provide a complete diagnosis in JSON format with these exact fields:
-- root_cause: Explanation of what's causing the fault
-- safety_warnings: List of critical safety warnings
-- repair_steps: Step-by-step repair procedure
-- manual_citations: Relevant manual references
-
-Respond ONLY with valid JSON."""
+        prompt = build_agent_prompt(case)
 
         if model == "groq":
             import groq
@@ -191,21 +191,11 @@ Respond ONLY with valid JSON."""
             result = json.loads(response.choices[0].message.content)
 
         # Ensure all required fields exist
-        return {
-            "root_cause": result.get("root_cause", ""),
-            "safety_warnings": result.get("safety_warnings", []),
-            "repair_steps": result.get("repair_steps", []),
-            "manual_citations": result.get("manual_citations", []),
-        }
+        return normalize_diagnosis(result)
 
     except Exception as e:
         logger.error(f"Fallback API call failed: {e}")
-        return {
-            "root_cause": f"ERROR: {str(e)}",
-            "safety_warnings": [],
-            "repair_steps": [],
-            "manual_citations": [],
-        }
+        return error_diagnosis(e)
 
 
 def run_judge_eval(
@@ -221,43 +211,8 @@ def run_judge_eval(
     Returns:
         {"label": str, "reason": str, "raw_response": str}
     """
-    # Format the template with case data and agent output
-    prompt = template.format(
-        # Equipment info
-        equipment=case.get("equipment", {}).get("model", "Unknown"),
-        manufacturer=case.get("equipment", {}).get("manufacturer", "Unknown"),
-        
-        # Fault info
-        fault_code=case.get("input", {}).get("fault_code", "Unknown"),
-        fault_description=case.get("input", {}).get("fault_description", ""),
-        sensor_data=json.dumps(case.get("input", {}).get("sensor_data", {})),
-        
-        # Agent outputs
-        agent_root_cause=agent_output.get("root_cause", ""),
-        agent_safety_warnings="\n".join(agent_output.get("safety_warnings", [])),
-        agent_repair_steps="\n".join(agent_output.get("repair_steps", [])),
-        agent_citations="\n".join(agent_output.get("manual_citations", [])),
-        
-        # Expected outputs (reference)
-        expected_root_cause=case.get("expected_output", {}).get("root_cause", ""),
-        expected_safety_warnings="\n".join(
-            case.get("expected_output", {}).get("safety_critical_warnings", [])
-        ),
-        expected_repair_steps="\n".join(
-            case.get("expected_output", {}).get("repair_steps", [])
-        ),
-        known_valid_manuals="\n".join(
-            case.get("expected_output", {}).get("manual_citations", [])
-        ),
-        
-        # Additional fields for specific templates
-        voltage_level=case.get("equipment", {}).get("voltage", "Unknown"),
-        safety_classification=case.get("expected_output", {}).get(
-            "business_impact", {}
-        ).get("safety_critical", False),
-        complexity_level="Medium",
-    )
-    
+    prompt = build_judge_prompt(template, case, agent_output)
+
     # Call judge LLM
     response = client.chat.completions.create(
         model="gpt-4-turbo",
@@ -267,24 +222,7 @@ def run_judge_eval(
     )
     
     raw_response = response.choices[0].message.content
-    
-    # Parse response to extract label
-    label = "UNKNOWN"
-    reason = raw_response
-    
-    for rail in rails:
-        if f"LABEL: {rail}" in raw_response or raw_response.strip().startswith(rail):
-            label = rail
-            # Extract reason if present
-            if "REASON:" in raw_response:
-                reason = raw_response.split("REASON:")[1].split("\n")[0].strip()
-            break
-    
-    return {
-        "label": label,
-        "reason": reason,
-        "raw_response": raw_response
-    }
+    return parse_judge_response(raw_response, rails)
 
 
 def run_full_eval(
@@ -293,7 +231,10 @@ def run_full_eval(
     model: str = "groq",
     judge_model: str = "gpt-4-turbo",
     dry_run: bool = False,
-    use_parallel: bool = False
+    use_parallel: bool = False,
+    engine: Optional[EvalEngine] = None,
+    results_path: Optional[str] = None,
+    resume: bool = True
 ) -> list[dict]:
     """
     Run all evaluations on all cases.
@@ -304,14 +245,17 @@ def run_full_eval(
         model: "groq" or "openai" for agent calls
         judge_model: Model name for judge LLM
         dry_run: If True, don't actually run evals
-        use_parallel: If True, run cases concurrently
+        use_parallel: If True, run cases through the async EvalEngine
+        engine: Engine to use in parallel mode (default: live backends, no cache)
+        results_path: JSONL checkpoint for parallel mode
+        resume: Skip cases already in results_path
 
     Returns:
         List of eval results
     """
     if use_parallel:
         logger.info("Running cases in parallel mode...")
-        return asyncio.run(_run_parallel_eval(cases, client, model, judge_model, dry_run))
+        return asyncio.run(_run_parallel_eval(cases, model, judge_model, dry_run, engine, results_path, resume))
     else:
         return _run_sequential_eval(cases, client, model, judge_model, dry_run)
 
@@ -406,120 +350,87 @@ def _run_sequential_eval(
     return results
 
 
+AGENT_MODELS = {"groq": "llama-3.3-70b-versatile", "openai": "gpt-4-turbo"}
+
+
+def build_engine(
+    backend: str = "live",
+    model: str = "groq",
+    judge_model: str = "gpt-4-turbo",
+    cache_dir: Optional[str] = None,
+    concurrency: Optional[dict] = None
+) -> EvalEngine:
+    """Create an EvalEngine with live or stub backends.
+
+    Live agent calls go through get_agent_diagnosis (RivetOrchestrator first,
+    then Groq/OpenAI), the same path as the sequential runner.
+    """
+    if backend == "stub":
+        agent_backend, judge_backend = StubBackend(model="stub-agent"), StubBackend(model="stub-judge")
+    else:
+        agent_backend = AgentBackend(
+            functools.partial(get_agent_diagnosis, model=model),
+            provider=model,
+            model=f"rivet_orchestrator|{AGENT_MODELS[model]}",
+        )
+        judge_backend = LLMBackend("openai", judge_model, wrap=wrap_client)
+
+    return EvalEngine(
+        agent_backend=agent_backend,
+        judge_backend=judge_backend,
+        cache=ResultCache(cache_dir) if cache_dir else None,
+        concurrency=concurrency,
+    )
+
+
 async def _run_parallel_eval(
     cases: list[dict],
-    client,
     model: str,
     judge_model: str,
-    dry_run: bool
+    dry_run: bool,
+    engine: Optional[EvalEngine] = None,
+    results_path: Optional[str] = None,
+    resume: bool = True
 ) -> list[dict]:
     """
-    Run evals in parallel using asyncio.
+    Run evals concurrently with the async EvalEngine.
 
-    Note: This requires async-compatible API clients.
-    For now, we'll use concurrent.futures for parallelism.
+    Agent and judge calls fan out per case, bounded per provider; cached
+    agent outputs/verdicts are reused and finished cases are checkpointed.
     """
-    import concurrent.futures
-
-    def eval_single_case(case_with_index):
-        idx, case = case_with_index
-        case_id = case.get("test_case_id", f"case_{idx}")
-
-        if dry_run:
-            logger.info(f"  DRY RUN: Would evaluate case {case_id}")
-            return None
-
-        # Get agent diagnosis
-        agent_output = get_agent_diagnosis(case, model=model)
-
-        # Run judges
-        case_results = {
-            "case_id": case_id,
-            "fault_code": case.get("input", {}).get("fault_code"),
-            "equipment": case.get("equipment", {}).get("model"),
-            "timestamp": datetime.utcnow().isoformat(),
-            "evals": {}
-        }
-
-        # Run all judge evals
-        for eval_name, config in EVAL_CONFIG.items():
-            template = config["template"]
-            rails = config["rails"]
-            result = run_judge_eval(client, template, case, agent_output, rails)
-            case_results["evals"][eval_name] = result
+    if dry_run:
+        for i, case in enumerate(cases, 1):
+            logger.info(f"  DRY RUN: Would evaluate case {case.get('test_case_id', f'case_{i}')}")
+        return []
 
-        return case_results
+    engine = engine or build_engine(model=model, judge_model=judge_model)
+    progress = tqdm(total=len(cases), desc="Evaluating cases", unit="case") if TQDM_AVAILABLE else None
 
-    # Run cases in parallel
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {
-            executor.submit(eval_single_case, (i, case)): case
-            for i, case in enumerate(cases, 1)
-        }
-
-        # Progress indicator
-        if TQDM_AVAILABLE:
-            futures_iter = tqdm(
-                concurrent.futures.as_completed(futures),
-                total=len(futures),
-                desc="Evaluating cases",
-                unit="case"
-            )
+    def on_result(result: dict, summary: StreamingSummary):
+        if progress:
+            progress.update(1)
         else:
-            futures_iter = concurrent.futures.as_completed(futures)
+            logger.info(f"[{summary.total}/{len(cases)}] {result['case_id']}: "
+                        + ", ".join(f"{k}={v['label']}" for k, v in result["evals"].items()))
 
-        for future in futures_iter:
-            try:
-                result = future.result()
-                if result:  # Skip None (dry run)
-                    results.append(result)
-            except Exception as e:
-                logger.error(f"Parallel eval failed: {e}")
+    report = await engine.run(cases, results_path=results_path, resume=resume, on_result=on_result)
+    if progress:
+        progress.update(report.resumed)
+        progress.close()
 
-    return results
+    logger.info(
+        f"Evaluated {report.evaluated} cases ({report.resumed} resumed, {report.failed} failed) "
+        f"in {report.wall_sec:.1f}s with {report.model_calls} model calls; cache {report.cache}"
+    )
+    return report.results
 
 
 def compute_summary(results: list[dict]) -> dict:
     """Compute summary statistics from eval results."""
-    if not results:
-        return {}
-    
-    summary = {
-        "total_cases": len(results),
-        "timestamp": datetime.utcnow().isoformat(),
-        "by_eval": {}
-    }
-    
-    # Count by eval type
-    for eval_name in EVAL_CONFIG.keys():
-        counts = {}
-        for result in results:
-            label = result.get("evals", {}).get(eval_name, {}).get("label", "UNKNOWN")
-            counts[label] = counts.get(label, 0) + 1
-        
-        config = EVAL_CONFIG[eval_name]
-        pass_labels = [config["rails"][0]]  # First rail is usually the "pass" label
-        pass_count = sum(counts.get(label, 0) for label in pass_labels)
-        pass_rate = pass_count / len(results) if results else 0
-        
-        summary["by_eval"][eval_name] = {
-            "counts": counts,
-            "pass_rate": pass_rate,
-            "threshold": config["threshold"],
-            "passed": pass_rate >= config["threshold"],
-            "blocking": config["blocking"]
-        }
-    
-    # Overall pass/fail
-    blocking_evals = get_blocking_evals()
-    summary["gate_passed"] = all(
-        summary["by_eval"][eval_name]["passed"]
-        for eval_name in blocking_evals
-        if eval_name in summary["by_eval"]
-    )
-    
-    return summary
+    summary = StreamingSummary(EVAL_CONFIG)
+    for result in results:
+        summary.add(result)
+    return summary.to_dict()
 
 
 def main():
@@ -567,8 +478,55 @@ def main():
         default="gpt-4-turbo",
         help="Model to use for judge LLM (default: gpt-4-turbo)"
     )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["live", "stub"],
+        default="live",
+        help="Model backend for --parallel (stub = offline, deterministic)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="evals/.eval_cache",
+        help="Content-addressed cache for agent outputs and verdicts ('' to disable)"
+    )
+    parser.add_argument(
+        "--results-jsonl",
+        type=str,
+        default=None,
+        help="JSONL checkpoint (default: output path with .jsonl, per shard)"
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore an existing JSONL checkpoint and re-run every case"
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        default=None,
+        help="Evaluate one shard of the dataset, as INDEX/COUNT (e.g. 0/4)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=str,
+        default="",
+        help="Per-provider call limits, e.g. groq=4,openai=8"
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        default=None,
+        help="Merge shard JSONL files into --output and exit with the gate status"
+    )
 
     args = parser.parse_args()
+
+    if args.merge:
+        results = merge_results(args.merge)
+        _write_results(args.output, compute_summary(results), results)
+        _print_summary_and_exit(compute_summary(results))
     
     print("=" * 60)
     print("PHOENIX EVALUATION RUN")
@@ -585,29 +543,52 @@ def main():
         logger.error("Run export_golden_dataset.py first")
         exit(1)
     
-    # Initialize OpenAI client for judge
-    try:
-        from openai import OpenAI
-        client = OpenAI()
-        client = wrap_client(client)  # Wrap for Phoenix tracing
-        logger.info("[OK] OpenAI client initialized (Phoenix tracing enabled)")
-    except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {e}")
-        logger.error("Set OPENAI_API_KEY in your environment")
-        exit(1)
-    
     # Load dataset
     cases = load_golden_dataset(args.dataset, limit=args.limit)
-    
+
     if not cases:
         logger.error("No cases found in dataset")
         exit(1)
-    
+
+    if args.shard:
+        shard_index, num_shards = (int(part) for part in args.shard.split("/"))
+        cases = shard_cases(cases, shard_index, num_shards)
+        logger.info(f"Shard {shard_index}/{num_shards}: {len(cases)} cases")
+
+    use_engine = args.parallel or args.backend == "stub"
+    results_path = None
+    if use_engine:
+        results_path = args.results_jsonl or os.path.splitext(args.output)[0] + (
+            f".shard{shard_index}of{num_shards}.jsonl" if args.shard else ".jsonl"
+        )
+        os.makedirs(os.path.dirname(results_path) or ".", exist_ok=True)
+
+    # Initialize OpenAI client for judge (sequential mode; the engine makes its own)
+    client = None
+    if not use_engine:
+        try:
+            from openai import OpenAI
+            client = OpenAI()
+            client = wrap_client(client)  # Wrap for Phoenix tracing
+            logger.info("[OK] OpenAI client initialized (Phoenix tracing enabled)")
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI client: {e}")
+            logger.error("Set OPENAI_API_KEY in your environment")
+            exit(1)
+
     # Run evaluations
     logger.info(f"\n🔍 Running evals on {len(cases)} cases...")
     logger.info(f"  Agent model: {args.model}")
     logger.info(f"  Judge model: {args.judge_model}")
-    logger.info(f"  Parallel mode: {args.parallel}")
+    logger.info(f"  Parallel mode: {use_engine}")
+
+    engine = None
+    if use_engine:
+        concurrency = {
+            provider: int(limit)
+            for provider, limit in (item.split("=") for item in args.concurrency.split(",") if item)
+        }
+        engine = build_engine(args.backend, args.model, args.judge_model, args.cache_dir or None, concurrency)
 
     results = run_full_eval(
         cases,
@@ -615,31 +596,40 @@ def main():
         model=args.model,
         judge_model=args.judge_model,
         dry_run=args.dry_run,
-        use_parallel=args.parallel
+        use_parallel=use_engine,
+        engine=engine,
+        results_path=results_path,
+        resume=not args.no_resume
     )
-    
+
     if args.dry_run:
         print("\n🔍 DRY RUN complete. No actual evals run.")
         return
-    
+
     # Compute summary
     summary = compute_summary(results)
-    
-    # Save results
-    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
-    with open(args.output, "w") as f:
+    _write_results(args.output, summary, results)
+    _print_summary_and_exit(summary)
+
+
+def _write_results(output: str, summary: dict, results: list[dict]):
+    """Save summary + results as JSON."""
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
         json.dump({
             "summary": summary,
             "results": results
         }, f, indent=2)
 
-    logger.info(f"\n[OK] Results saved to {args.output}")
-    
-    # Print summary
+    logger.info(f"\n[OK] Results saved to {output}")
+
+
+def _print_summary_and_exit(summary: dict):
+    """Print per-eval pass rates and exit with the gate status."""
     print("\n" + "=" * 60)
     print("EVALUATION SUMMARY")
     print("=" * 60)
-    
+
     for eval_name, stats in summary.get("by_eval", {}).items():
         status = "[PASS]" if stats["passed"] else "[FAIL]"
         blocking = " [BLOCKING]" if stats["blocking"] else ""
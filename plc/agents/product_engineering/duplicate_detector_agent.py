@@ -5,12 +5,40 @@ Finds near-duplicate atoms using vector similarity.
 Merges duplicates, preserving best source and metadata.
 Prevents database bloat and ensures knowledge base quality.
 
+Candidate pairs come from LSH buckets (plc.utils.dedupe), so a nightly run
+scales with the atom count instead of comparing every pair.
+
 Schedule: Nightly at 4 AM
 Output: Deduplicated atom database, merge log
 """
 
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from difflib import SequenceMatcher
+
+try:
+    import numpy as np
+    from plc.utils.dedupe import ACTION_MERGE, DedupeEngine, DuplicatePair
+except ImportError:
+    # numpy is optional; find_duplicates raises a clear error without it
+    np = None
+    DedupeEngine = DuplicatePair = None
+    ACTION_MERGE = "merge"
+
+# Source tier points for quality scoring
+SOURCE_TIER_POINTS = {
+    "manufacturer_official": 30,
+    "iec_standard": 25,
+    "textbook": 20,
+    "community_validated": 15,
+    "user_contributed": 10,
+}
+
+STATUS_POINTS = {
+    "tested_on_hardware": 20,
+    "validated": 10,
+    "certified": 25,
+}
 
 
 class DuplicateDetectorAgent:
@@ -25,8 +53,9 @@ class DuplicateDetectorAgent:
     - Log all merge operations for audit trail
 
     Duplicate Detection Strategy:
-    - Use vector embeddings for semantic similarity
-    - Threshold: cosine similarity >0.95 = likely duplicate
+    - LSH candidate pairs: MinHash over name + description, hyperplanes over embeddings
+    - Use vector embeddings for semantic similarity (candidates only)
+    - Threshold: cosine similarity >0.95 = likely duplicate (merge)
     - Confirm with text comparison (Levenshtein distance)
     - Human review for edge cases (0.90-0.95 similarity)
 
@@ -49,12 +78,42 @@ class DuplicateDetectorAgent:
 
         Args:
             config: Configuration dictionary containing:
-                - similarity_threshold: Cosine similarity threshold (default: 0.95)
-                - auto_merge_threshold: Similarity above which to auto-merge (default: 0.98)
+                - similarity_threshold: Similarity at or above which to merge (default: 0.95)
                 - manual_review_threshold: Similarity requiring human review (default: 0.90-0.95)
+                - dedupe: Extra DedupeEngine keyword arguments (LSH tuning)
                 - supabase_credentials: For database access
         """
-        pass
+        self.config = config or {}
+        self.similarity_threshold = self.config.get("similarity_threshold", 0.95)
+        self.manual_review_threshold = self.config.get("manual_review_threshold", 0.90)
+        self.atoms: Dict[str, Dict[str, any]] = {}
+        self._engine = None
+
+    def load_atoms(self, atoms: List[Dict[str, any]]) -> int:
+        """
+        Load atoms to deduplicate (replaces previously loaded atoms).
+
+        Args:
+            atoms: PLC atom dictionaries (spec JSON or plc_atoms rows)
+
+        Returns:
+            Number of atoms loaded
+        """
+        self.atoms = {_atom_id(atom): atom for atom in atoms}
+        return len(self.atoms)
+
+    @property
+    def engine(self) -> "DedupeEngine":
+        """Lazily created DedupeEngine using the configured thresholds."""
+        if DedupeEngine is None:
+            raise ImportError("Duplicate detection requires numpy: poetry add numpy")
+        if self._engine is None:
+            self._engine = DedupeEngine(
+                merge_threshold=self.similarity_threshold,
+                review_threshold=self.manual_review_threshold,
+                **self.config.get("dedupe", {})
+            )
+        return self._engine
 
     def find_duplicates(
         self,
@@ -72,13 +131,30 @@ class DuplicateDetectorAgent:
             Sorted by similarity score (highest first)
 
         Process:
-        1. Query all atom embeddings from database
-        2. Compute pairwise cosine similarity
-        3. Filter pairs above threshold
-        4. Exclude exact duplicates (same atom_id)
+        1. Use loaded atoms (see load_atoms)
+        2. Generate candidate pairs from LSH buckets (text + embeddings)
+        3. Score candidates (cosine, or MinHash Jaccard without embeddings)
+        4. Filter pairs above threshold
         5. Sort by similarity score
         """
-        pass
+        return [
+            pair.to_tuple() for pair in self._scored_pairs()
+            if pair.similarity >= similarity_threshold
+        ]
+
+    def _scored_pairs(self) -> List["DuplicatePair"]:
+        """Candidate pairs above the review threshold, with merge/review action."""
+        if len(self.atoms) < 2:
+            return []
+
+        ids = list(self.atoms)
+        texts = [_atom_text(self.atoms[atom_id]) for atom_id in ids]
+        vectors = [self.atoms[atom_id].get("embedding") for atom_id in ids]
+        embeddings = None
+        if all(v is not None for v in vectors):
+            embeddings = np.asarray(vectors, dtype=np.float32)
+
+        return self.engine.find_duplicates(ids, texts, embeddings)
 
     def compare_atoms(self, atom_id_1: str, atom_id_2: str) -> Dict[str, any]:
         """
@@ -104,7 +180,34 @@ class DuplicateDetectorAgent:
         - Vendor/platform match
         - Quality scoring
         """
-        pass
+        atom_1 = self.atoms[atom_id_1]
+        atom_2 = self.atoms[atom_id_2]
+
+        text_similarity = SequenceMatcher(
+            None, _atom_text(atom_1).lower(), _atom_text(atom_2).lower()
+        ).ratio()
+
+        similarity = text_similarity
+        if atom_1.get("embedding") is not None and atom_2.get("embedding") is not None:
+            v1 = np.asarray(atom_1["embedding"], dtype=np.float64)
+            v2 = np.asarray(atom_2["embedding"], dtype=np.float64)
+            denom = np.linalg.norm(v1) * np.linalg.norm(v2)
+            similarity = float(v1 @ v2 / denom) if denom else 0.0
+
+        quality_scores = {
+            atom_id_1: self.calculate_quality_score(atom_1),
+            atom_id_2: self.calculate_quality_score(atom_2),
+        }
+
+        return {
+            "is_duplicate": similarity >= self.similarity_threshold,
+            "similarity_score": similarity,
+            "text_similarity": text_similarity,
+            "same_vendor": _field(atom_1, "vendor") == _field(atom_2, "vendor"),
+            "same_platform": _field(atom_1, "platform") == _field(atom_2, "platform"),
+            "better_atom": max(quality_scores, key=quality_scores.get),
+            "quality_scores": quality_scores,
+        }
 
     def calculate_quality_score(self, atom: Dict[str, any]) -> int:
         """
@@ -133,7 +236,20 @@ class DuplicateDetectorAgent:
             - Has learning objectives (concepts): +5 points
             - Has prerequisite chain: +5 points
         """
-        pass
+        provider = atom.get("schema:provider") or {}
+        tier = provider.get("plc:sourceTier") or atom.get("source_tier")
+        status = atom.get("plc:status") or atom.get("status")
+
+        score = SOURCE_TIER_POINTS.get(tier, 0) + STATUS_POINTS.get(status, 0)
+        if atom.get("plc:codeExample") or atom.get("code_example"):
+            score += 10
+        if atom.get("plc:safetyRequirements") or atom.get("safety_requirements"):
+            score += 10
+        if atom.get("plc:learningObjectives") or atom.get("learning_objectives"):
+            score += 5
+        if atom.get("plc:prerequisiteAtoms") or atom.get("prerequisite_atoms"):
+            score += 5
+        return min(score, 100)
 
     def merge_atoms(
         self,
@@ -211,24 +327,53 @@ class DuplicateDetectorAgent:
 
     def run_nightly_deduplication(self) -> Dict[str, any]:
         """
-        Execute nightly deduplication routine (scheduled at 4 AM).
+        Execute nightly duplicate detection (scheduled at 4 AM).
+
+        Merging, reference updates and review tickets need the database
+        methods above, which are not implemented yet, so this run only
+        reports what it detected; nothing is merged or archived.
 
         Process:
-        1. Find all duplicate pairs (similarity >0.95)
-        2. Auto-merge high-confidence duplicates (>0.98)
-        3. Flag edge cases for manual review (0.90-0.95)
-        4. Update all references
-        5. Generate deduplication report
+        1. Find all duplicate pairs (similarity >0.90)
+        2. Propose merges (>0.95), keeping the higher quality atom
+        3. Collect edge cases for manual review (0.90-0.95)
 
         Returns:
             Summary dictionary:
-                - duplicates_found: Count
-                - auto_merged: Count
-                - flagged_for_review: Count
-                - references_updated: Count
-                - atoms_archived: Count
+                - duplicates_detected: Count
+                - merge_candidates: List of {keep, drop, similarity, text_similarity}
+                - review_candidates: List of {atom_id_1, atom_id_2, similarity}
         """
-        pass
+        merge_candidates = []
+        review_candidates = []
+        proposed_drops = set()
+        for pair in self._scored_pairs():
+            if pair.id_1 in proposed_drops or pair.id_2 in proposed_drops:
+                continue
+
+            if pair.action == ACTION_MERGE:
+                quality_1 = self.calculate_quality_score(self.atoms[pair.id_1])
+                quality_2 = self.calculate_quality_score(self.atoms[pair.id_2])
+                keep, drop = (pair.id_1, pair.id_2) if quality_1 >= quality_2 else (pair.id_2, pair.id_1)
+                proposed_drops.add(drop)
+                merge_candidates.append({
+                    "keep": keep,
+                    "drop": drop,
+                    "similarity": pair.similarity,
+                    "text_similarity": pair.text_similarity,
+                })
+            else:
+                review_candidates.append({
+                    "atom_id_1": pair.id_1,
+                    "atom_id_2": pair.id_2,
+                    "similarity": pair.similarity,
+                })
+
+        return {
+            "duplicates_detected": len(merge_candidates) + len(review_candidates),
+            "merge_candidates": merge_candidates,
+            "review_candidates": review_candidates,
+        }
 
     def generate_deduplication_report(self) -> str:
         """
@@ -269,3 +414,20 @@ class DuplicateDetectorAgent:
                 - database_size_reduction: Bytes saved from deduplication
         """
         pass
+
+
+def _atom_id(atom: Dict[str, any]) -> str:
+    """Atom ID from spec JSON ("@id") or a plc_atoms row ("atom_id")."""
+    return atom.get("@id") or atom.get("atom_id")
+
+
+def _field(atom: Dict[str, any], name: str) -> Optional[str]:
+    """Read a plc: field from spec JSON or a plc_atoms row."""
+    return atom.get(f"plc:{name}", atom.get(name))
+
+
+def _atom_text(atom: Dict[str, any]) -> str:
+    """Name + description used for text similarity."""
+    name = atom.get("schema:name") or atom.get("name") or ""
+    description = atom.get("schema:description") or atom.get("description") or ""
+    return f"{name} {description}".strip()
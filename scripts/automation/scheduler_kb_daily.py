@@ -3,15 +3,22 @@
 DAILY KB BUILDING SCHEDULER - 24/7 Automation
 
 Runs daily at 2:00 AM to build and maintain knowledge base:
-1. Scrape new PDFs from OEM sources
-2. Build knowledge atoms from PDFs
-3. Upload atoms to Supabase
+1. Scrape new PDFs from OEM sources         \
+2. Build knowledge atoms from PDFs           } streamed (StagePipeline)
+3. Embed and upload atoms to Supabase       /
 4. Validate embeddings and quality
 5. Generate daily stats report
 6. Send Telegram notification
 
+Phases 1-3 run as one pipeline with bounded queues between download,
+extract, build, embed (batched) and upload (batched), so atoms from the
+first PDF are uploaded while later PDFs still download. Progress is
+checkpointed to data/checkpoints/kb_daily_{date}.jsonl; rerunning after a
+crash the same day resumes. Worker counts and batch sizes: KB_DAILY_*
+environment variables below.
+
 Usage:
-    poetry run python scripts/scheduler_kb_daily.py
+    poetry run python scripts/scheduler_kb_daily.py [--fresh]
 
 Logs: data/logs/kb_daily_{date}.log
 Notifications: Telegram bot (success/failure)
@@ -20,6 +27,8 @@ Notifications: Telegram bot (success/failure)
 import os
 import sys
 import json
+import asyncio
+import argparse
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -33,9 +42,10 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from agents.research.oem_pdf_scraper_agent import OEMPDFScraperAgent
-from agents.knowledge.atom_builder_from_pdf import AtomBuilderFromPDF
+from agents.knowledge.atom_builder_from_pdf import AtomBuilderFromPDF, KnowledgeAtom
 from agents.knowledge.quality_checker_agent import QualityCheckerAgent
 from agents.knowledge.citation_validator_agent import CitationValidatorAgent
+from agent_factory.workflows.stage_pipeline import PipelineCheckpoint, Stage, StagePipeline
 from supabase import create_client
 
 # ============================================================================
@@ -67,6 +77,18 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_ADMIN_CHAT_ID")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
 
+# Pipeline tuning (phases 1-3)
+DOWNLOAD_WORKERS = int(os.getenv("KB_DAILY_DOWNLOAD_WORKERS", "4"))
+EXTRACT_WORKERS = int(os.getenv("KB_DAILY_EXTRACT_WORKERS", "2"))
+EMBED_WORKERS = int(os.getenv("KB_DAILY_EMBED_WORKERS", "2"))
+EMBED_BATCH_SIZE = int(os.getenv("KB_DAILY_EMBED_BATCH", "100"))
+UPLOAD_WORKERS = int(os.getenv("KB_DAILY_UPLOAD_WORKERS", "2"))
+UPLOAD_BATCH_SIZE = int(os.getenv("KB_DAILY_UPLOAD_BATCH", "50"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("KB_DAILY_QUEUE_SIZE", "32"))
+
+ATOMS_DIR = Path("data/atoms")
+CHECKPOINT_DIR = Path("data/checkpoints")
+
 # PDF sources (can expand this list)
 PDF_SOURCES = {
     "allen_bradley": [
@@ -106,171 +128,197 @@ def send_telegram_notification(message: str, parse_mode: str = "Markdown"):
 
 
 # ============================================================================
-# PHASE 1: SCRAPE NEW PDFs
+# PHASES 1-3: STREAMING INGEST PIPELINE
 # ============================================================================
 
-def phase_1_scrape_pdfs() -> Dict[str, Any]:
-    """
-    Scrape new PDFs from OEM sources.
-    Returns: Stats dict
+def load_atoms(atoms_dir: Path) -> List[KnowledgeAtom]:
+    """Atoms saved by AtomBuilderFromPDF.process_pdf_extraction (checkpoint restore)."""
+    atoms = []
+    for atom_file in sorted(Path(atoms_dir).glob("atom_*.json")):
+        with open(atom_file, "r", encoding="utf-8") as f:
+            atoms.append(KnowledgeAtom(**json.load(f)))
+    return atoms
+
+
+def build_ingest_pipeline(
+    scraper: OEMPDFScraperAgent,
+    builder: AtomBuilderFromPDF,
+    supabase: Any,
+    checkpoint: PipelineCheckpoint,
+    counters: Dict[str, int],
+) -> StagePipeline:
     """
-    logger.info("=" * 80)
-    logger.info("PHASE 1: SCRAPING PDFs")
-    logger.info("=" * 80)
-
-    scraper = OEMPDFScraperAgent()
-
-    total_pdfs = 0
-    total_pages = 0
-    total_tables = 0
-
-    for manufacturer, urls in PDF_SOURCES.items():
-        logger.info(f"\n[{manufacturer.upper()}] Processing {len(urls)} PDFs...")
-
-        for url in urls:
-            try:
-                logger.info(f"\nProcessing: {url}")
-
-                # Download PDF
-                pdf_path = scraper.download_pdf(url, manufacturer)
-                if not pdf_path:
-                    logger.error(f"  Failed to download: {url}")
-                    continue
-
-                # Extract content
-                result = scraper.extract_pdf_content(pdf_path, manufacturer)
-
-                # Log stats
-                logger.info(f"  Pages: {result['metadata']['pages']}")
-                logger.info(f"  Tables: {len(result['tables'])}")
-                logger.info(f"  Images: {len(result['images'])}")
-
-                total_pdfs += 1
-                total_pages += result['metadata']['pages']
-                total_tables += len(result['tables'])
+    Scrape -> extract -> build -> embed -> upload, streaming.
 
-            except Exception as e:
-                logger.error(f"  Error processing {url}: {e}")
-
-    stats = {
-        "pdfs_scraped": total_pdfs,
-        "pages_extracted": total_pages,
-        "tables_extracted": total_tables,
-    }
-
-    logger.info(f"\nPHASE 1 COMPLETE: {stats}")
-    return stats
-
-
-# ============================================================================
-# PHASE 2: BUILD KNOWLEDGE ATOMS
-# ============================================================================
-
-def phase_2_build_atoms() -> Dict[str, Any]:
+    Atoms from the first PDF are embedded and uploaded while later PDFs
+    are still downloading. Every stage except embedding is checkpointed,
+    so a rerun the same day skips finished work.
     """
-    Build knowledge atoms from extracted PDFs.
-    Returns: Stats dict
-    """
-    logger.info("=" * 80)
-    logger.info("PHASE 2: BUILDING KNOWLEDGE ATOMS")
-    logger.info("=" * 80)
-
-    builder = AtomBuilderFromPDF()
-
-    extracted_dir = Path("data/extracted")
-    extraction_files = list(extracted_dir.glob("*.json"))
-
-    # Skip sample files
-    extraction_files = [f for f in extraction_files if "sample" not in f.name]
-
-    logger.info(f"Found {len(extraction_files)} extraction files")
 
-    all_atoms = []
-
-    for idx, json_file in enumerate(extraction_files, 1):
+    def download(source):
+        manufacturer, url = source
+        pdf_path = scraper.download_pdf(url, manufacturer)
+        if not pdf_path:
+            raise RuntimeError(f"Failed to download: {url}")
+        return manufacturer, pdf_path
+
+    def record_pdf(info):
+        counters["pdfs_scraped"] += 1
+        counters["pages_extracted"] += info["pages"]
+        counters["tables_extracted"] += info["tables"]
+        return info
+
+    def extract(downloaded):
+        manufacturer, pdf_path = downloaded
+        result = scraper.extract_pdf_content(pdf_path, manufacturer)
+        logger.info(f"  Extracted {pdf_path.name}: {result['stats']['page_count']} pages, "
+                    f"{result['stats']['table_count']} tables")
+        return record_pdf({
+            "json_path": result["output_path"],
+            "pages": result["stats"]["page_count"],
+            "tables": result["stats"]["table_count"],
+        })
+
+    def not_uploaded(atoms):
+        return [atom for atom in atoms if not checkpoint.done("upload", atom.atom_id)]
+
+    def build(info):
+        json_path = Path(info["json_path"])
+        atoms = builder.process_pdf_extraction(json_path, output_dir=ATOMS_DIR / json_path.stem)
+        logger.info(f"  Built {len(atoms)} atoms from {json_path.name}")
+        return atoms
+
+    def embed(atoms):
+        builder.embed_atoms(atoms, batch_size=EMBED_BATCH_SIZE)
+        return atoms
+
+    def upload(atoms):
+        table = supabase.table("knowledge_atoms")
+        existing = table.select("atom_id").in_("atom_id", [a.atom_id for a in atoms]).execute()
+        seen = {row["atom_id"] for row in existing.data}
+
+        new_atoms = []
+        for atom in atoms:
+            if atom.atom_id not in seen:
+                seen.add(atom.atom_id)
+                new_atoms.append(atom)
+
+        statuses = {}
         try:
-            logger.info(f"\n[{idx}/{len(extraction_files)}] Processing: {json_file.name}")
-
-            atoms = builder.process_pdf_extraction(
-                json_file,
-                output_dir=Path("data/atoms") / json_file.stem
-            )
-
-            all_atoms.extend(atoms)
-            logger.info(f"  Generated {len(atoms)} atoms")
-
+            if new_atoms:
+                table.insert([atom.to_dict() for atom in new_atoms]).execute()
+            statuses.update((atom.atom_id, "uploaded") for atom in new_atoms)
         except Exception as e:
-            logger.error(f"  Error: {e}")
-
-    stats = builder.get_stats()
-    stats["total_atoms"] = len(all_atoms)
-
-    logger.info(f"\nPHASE 2 COMPLETE: {stats}")
-    return stats, all_atoms
+            # Isolate the bad rows
+            logger.warning(f"  Batch insert failed ({e}), retrying {len(new_atoms)} atoms one by one")
+            for atom in new_atoms:
+                try:
+                    table.insert(atom.to_dict()).execute()
+                    statuses[atom.atom_id] = "uploaded"
+                except Exception as row_error:
+                    duplicate = "duplicate key" in str(row_error)
+                    statuses[atom.atom_id] = "skipped" if duplicate else row_error
+
+        results, reported = [], set()
+        for atom in atoms:
+            status = statuses.get(atom.atom_id, "skipped")
+            if atom.atom_id in reported and status == "uploaded":
+                status = "skipped"  # Same atom_id twice in one batch
+            reported.add(atom.atom_id)
+            results.append(status)
+        return results
+
+    stages = [
+        Stage(
+            "download", download, workers=DOWNLOAD_WORKERS,
+            key=lambda source: source[1],
+            checkpoint_value=lambda source, downloaded: [downloaded[0], str(downloaded[1])],
+            restore=lambda source, stored: (stored[0], Path(stored[1])),
+        ),
+        Stage(
+            "extract", extract, workers=EXTRACT_WORKERS,
+            key=lambda downloaded: str(downloaded[1]),
+            restore=lambda downloaded, info: record_pdf(info),
+        ),
+        Stage(
+            "build", lambda info: not_uploaded(build(info)), fan_out=True,
+            key=lambda info: info["json_path"],
+            checkpoint_value=lambda info, atoms: str(ATOMS_DIR / Path(info["json_path"]).stem),
+            restore=lambda info, atoms_dir: not_uploaded(load_atoms(atoms_dir)),
+        ),
+        Stage("embed", embed, workers=EMBED_WORKERS, batch_size=EMBED_BATCH_SIZE),
+    ]
+    if supabase is not None:
+        stages.append(Stage(
+            "upload", upload, workers=UPLOAD_WORKERS, batch_size=UPLOAD_BATCH_SIZE,
+            key=lambda atom: atom.atom_id,
+        ))
 
+    return StagePipeline(stages, queue_size=PIPELINE_QUEUE_SIZE, checkpoint=checkpoint, collect_results=True)
 
-# ============================================================================
-# PHASE 3: UPLOAD TO SUPABASE
-# ============================================================================
 
-def phase_3_upload_atoms(atoms: List[Any]) -> Dict[str, Any]:
+def phase_1_3_ingest(resume: bool = True) -> Dict[str, Any]:
     """
-    Upload atoms to Supabase.
-    Returns: Stats dict
+    Scrape PDFs, build atoms and upload them as one streaming pipeline.
+    Returns: Stats dicts for the scrape/build/upload report sections plus
+    pipeline timing.
     """
     logger.info("=" * 80)
-    logger.info("PHASE 3: UPLOADING TO SUPABASE")
+    logger.info("PHASES 1-3: SCRAPE -> BUILD -> UPLOAD (PIPELINED)")
     logger.info("=" * 80)
 
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        logger.error("Supabase credentials not found in .env")
-        return {"uploaded": 0, "failed": len(atoms), "skipped": 0}
-
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        logger.info(f"Connected to Supabase: {SUPABASE_URL}")
-    except Exception as e:
-        logger.error(f"Failed to connect to Supabase: {e}")
-        return {"uploaded": 0, "failed": len(atoms), "skipped": 0}
-
-    uploaded = 0
-    failed = 0
-    skipped = 0
+    checkpoint_path = CHECKPOINT_DIR / f"kb_daily_{datetime.now().strftime('%Y%m%d')}.jsonl"
+    if not resume and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    checkpoint = PipelineCheckpoint(checkpoint_path)
+    if len(checkpoint):
+        logger.info(f"Resuming from checkpoint {checkpoint_path} ({len(checkpoint)} finished items)")
 
-    for idx, atom in enumerate(atoms, 1):
+    supabase = None
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        logger.error("Supabase credentials not found in .env (atoms will be built but not uploaded)")
+    else:
         try:
-            # Check if atom already exists
-            existing = supabase.table("knowledge_atoms").select("id").eq("atom_id", atom.atom_id).execute()
-
-            if existing.data:
-                skipped += 1
-                if skipped % 100 == 0:
-                    logger.info(f"  Skipped {skipped}/{len(atoms)} (already exist)...")
-                continue
-
-            # Upload new atom
-            atom_dict = atom.to_dict()
-            supabase.table("knowledge_atoms").insert(atom_dict).execute()
-
-            uploaded += 1
+            supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+            logger.info(f"Connected to Supabase: {SUPABASE_URL}")
+        except Exception as e:
+            logger.error(f"Failed to connect to Supabase: {e}")
 
-            if uploaded % 100 == 0:
-                logger.info(f"  Uploaded {uploaded}/{len(atoms)}...")
+    scraper = OEMPDFScraperAgent()
+    builder = AtomBuilderFromPDF(inline_embeddings=False)
+    counters = {"pdfs_scraped": 0, "pages_extracted": 0, "tables_extracted": 0}
+    sources = [(manufacturer, url) for manufacturer, urls in PDF_SOURCES.items() for url in urls]
 
-        except Exception as e:
-            logger.error(f"  Failed to upload {atom.atom_id}: {e}")
-            failed += 1
-
-    stats = {
-        "uploaded": uploaded,
-        "failed": failed,
-        "skipped": skipped,
-        "total": len(atoms)
+    pipeline = build_ingest_pipeline(scraper, builder, supabase, checkpoint, counters)
+    try:
+        report = asyncio.run(pipeline.run(sources))
+    finally:
+        checkpoint.close()
+
+    stages = report.stages
+    build_stats = builder.get_stats()
+    build_stats["total_atoms"] = stages["build"].items_out
+
+    if supabase is not None:
+        statuses = report.results
+        upload_stats = {
+            "uploaded": sum(1 for s in statuses if s == "uploaded"),
+            "skipped": sum(1 for s in statuses if s == "skipped"),
+            "failed": stages["upload"].errors + stages["embed"].errors,
+            "total": stages["build"].items_out,
+        }
+    else:
+        upload_stats = {"uploaded": 0, "failed": stages["build"].items_out, "skipped": 0,
+                        "total": stages["build"].items_out}
+
+    logger.info(f"\nPHASES 1-3 COMPLETE\n{report.summary()}")
+    return {
+        "scrape": dict(counters),
+        "build": build_stats,
+        "upload": upload_stats,
+        "pipeline": report.to_dict(),
     }
 
-    logger.info(f"\nPHASE 3 COMPLETE: {stats}")
-    return stats
-
 
 # ============================================================================
 # PHASE 4: VALIDATE & QUALITY CHECK
@@ -465,6 +513,16 @@ def phase_5_generate_report(all_stats: Dict[str, Any]) -> str:
 ✅ **Daily KB building complete!**
     """
 
+    pipeline = all_stats.get('pipeline')
+    if pipeline:
+        lines = ["\n**Pipeline (phases 1-3)**", f"- Wall time: {pipeline['wall_seconds']:.1f}s"]
+        for name, stage in pipeline['stages'].items():
+            lines.append(
+                f"- {name}: {stage['items_out']} out, {stage['errors']} errors, "
+                f"{stage['utilization'] * 100:.0f}% utilized x{stage['workers']}"
+            )
+        report += "\n".join(lines) + "\n"
+
     # Save report to file
     report_dir = Path("data/reports")
     report_dir.mkdir(parents=True, exist_ok=True)
@@ -482,6 +540,10 @@ def phase_5_generate_report(all_stats: Dict[str, Any]) -> str:
 
 def main():
     """Main daily KB building orchestrator"""
+    parser = argparse.ArgumentParser(description="Daily KB building scheduler")
+    parser.add_argument("--fresh", action="store_true", help="Ignore today's checkpoint and start over")
+    args = parser.parse_args()
+
     start_time = datetime.now()
 
     logger.info("")
@@ -494,17 +556,10 @@ def main():
     all_stats = {}
 
     try:
-        # Phase 1: Scrape PDFs
-        scrape_stats = phase_1_scrape_pdfs()
-        all_stats['scrape'] = scrape_stats
-
-        # Phase 2: Build atoms
-        build_stats, atoms = phase_2_build_atoms()
-        all_stats['build'] = build_stats
-
-        # Phase 3: Upload to Supabase
-        upload_stats = phase_3_upload_atoms(atoms)
-        all_stats['upload'] = upload_stats
+        # Phases 1-3: Scrape, build and upload (pipelined)
+        ingest_stats = phase_1_3_ingest(resume=not args.fresh)
+        all_stats.update(ingest_stats)
+        upload_stats = all_stats['upload']
 
         # Phase 4: Validate
         validate_stats = phase_4_validate()
@@ -529,7 +584,8 @@ def main():
         logger.info("DAILY KB BUILDING SCHEDULER - COMPLETE")
         logger.info("=" * 80)
         logger.info(f"End time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        logger.info(f"Duration: {duration:.1f} seconds")
+        logger.info(f"Duration: {duration:.1f} seconds "
+                    f"(phases 1-3: {all_stats['pipeline']['wall_seconds']:.1f}s)")
         logger.info("")
 
         return 0
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Manual Search Index Backfill
+
+Rebuild BM25 chunks for indexed equipment_manuals that are missing from the
+manual search index (e.g. manuals ingested before the index existed). Each
+manual is re-extracted from its stored file_path; manuals whose file is gone
+are reported and stay listed (unranked) in search results.
+
+Usage:
+    poetry run python scripts/backfill_manual_index.py
+
+The index file is MANUAL_INDEX_PATH (default: data/manual_index.bm25).
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent_factory.knowledge.manual_indexer import ManualIndexer
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+
+def main() -> int:
+    indexer = ManualIndexer()
+    try:
+        counts = indexer.backfill_index()
+    finally:
+        indexer.close()
+    print(json.dumps(counts, indent=2))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,9 @@ Examples:
 
     # With parallel processing (10 workers)
     poetry run python scripts/ingest_batch.py --batch data/sources/urls.txt --parallel 10
+
+    # Re-ingest revised sources (only changed chunks hit the LLM)
+    poetry run python scripts/ingest_batch.py --batch data/sources/urls.txt --incremental
 """
 
 import os
@@ -49,13 +52,15 @@ def main():
     parser.add_argument("--source", type=str, help="Single source URL to ingest")
     parser.add_argument("--batch", type=str, help="File with URLs (one per line)")
     parser.add_argument("--parallel", type=int, default=1, help="Number of parallel workers (default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-ingest previously seen sources, reusing atoms for unchanged chunks")
 
     args = parser.parse_args()
 
     if args.source:
         # Single source ingestion
         logger.info(f"Ingesting single source: {args.source}")
-        result = ingest_source(args.source)
+        result = ingest_source(args.source, incremental=args.incremental)
 
         print("\n" + "="*80)
         print("INGESTION RESULTS")
@@ -64,6 +69,9 @@ def main():
         print(f"Success: {result['success']}")
         print(f"Atoms Created: {result['atoms_created']}")
         print(f"Atoms Failed: {result['atoms_failed']}")
+        if args.incremental:
+            print(f"Atoms Reused: {result.get('atoms_reused', 0)}")
+            print(f"Atoms Tombstoned: {result.get('atoms_tombstoned', 0)}")
         if result['errors']:
             print(f"Errors: {', '.join(result['errors'])}")
         print("="*80)
@@ -92,7 +100,7 @@ def main():
             logger.info(f"Processing {i}/{len(urls)}: {url}")
 
             try:
-                result = ingest_source(url)
+                result = ingest_source(url, incremental=args.incremental)
 
                 total_created += result['atoms_created']
                 total_failed += result['atoms_failed']
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Local Knowledge Mirror CLI
+
+Pull knowledge_atoms, equipment_manuals and user_machines into the local
+SQLite mirror used by the bot for low-latency and offline lookups.
+
+Usage:
+    poetry run python scripts/kb_mirror.py sync [--full] [--source vps | --provider neon]
+    poetry run python scripts/kb_mirror.py watch [--interval 300]
+    poetry run python scripts/kb_mirror.py status
+
+Examples:
+    # First sync (or after a restore): everything, dropping rows deleted upstream
+    poetry run python scripts/kb_mirror.py sync --full
+
+    # Incremental pull of atoms from the VPS KB every 5 minutes
+    poetry run python scripts/kb_mirror.py watch --source vps --table knowledge_atoms
+
+Each remote database has its own mirror file, data/kb_mirror_<source>.db
+(KB_MIRROR_DIR): "vps" for the VPS KB, otherwise the provider name.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent_factory.knowledge.local_mirror import DEFAULT_MIRROR_DIR, LocalMirror, PostgresMirrorSource, mirror_path
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def make_source(args) -> PostgresMirrorSource:
+    if args.source == "vps":
+        from agent_factory.rivet_pro.vps_kb_client import VPSKBClient
+        return PostgresMirrorSource.from_vps_client(VPSKBClient())
+    return PostgresMirrorSource.from_manager(provider=args.provider)
+
+
+def source_name(args) -> str:
+    if args.source == "vps":
+        return "vps"
+    return args.provider or os.getenv("DATABASE_PROVIDER", "neon")
+
+
+def open_mirror(args) -> LocalMirror:
+    name = source_name(args)
+    return LocalMirror(args.db or mirror_path(name), source=name)
+
+
+def cmd_sync(args) -> int:
+    mirror = open_mirror(args)
+    results = mirror.sync(make_source(args), tables=args.table or None, full=args.full, batch_size=args.batch_size)
+    for result in results:
+        status = f"FAILED: {result.error}" if result.error else "ok"
+        print(f"{result.table}: {result.upserted:,} upserted, {result.deleted:,} deleted "
+              f"in {result.seconds:.1f}s ({status})")
+    return 1 if any(r.error for r in results) else 0
+
+
+def cmd_watch(args) -> int:
+    mirror = open_mirror(args)
+    if args.table:
+        mirror.tables = {name: spec for name, spec in mirror.tables.items() if name in args.table}
+    mirror.start_background_sync(make_source(args), interval_seconds=args.interval)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mirror.stop_background_sync()
+    return 0
+
+
+def cmd_status(args) -> int:
+    paths = [Path(args.db)] if args.db else sorted(Path(os.getenv("KB_MIRROR_DIR", DEFAULT_MIRROR_DIR)).glob("kb_mirror_*.db"))
+    paths = [path for path in paths if path.exists()]
+    if not paths:
+        print("No mirror found (run: scripts/kb_mirror.py sync --full)")
+        return 1
+    report = {}
+    for path in paths:
+        mirror = LocalMirror(path)
+        report[str(path)] = {
+            "source": mirror.source,
+            "embedding_model": mirror.embedding_model,
+            "tables": mirror.status(),
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def main() -> int:
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Local SQLite knowledge mirror")
+    parser.add_argument("--db", help="Mirror file (default: data/kb_mirror_<source>.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, func, help_text in (
+        ("sync", cmd_sync, "Pull changes once"),
+        ("watch", cmd_watch, "Pull changes periodically (full resync daily)"),
+    ):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("--source", choices=["manager", "vps"], default="manager")
+        command.add_argument("--provider", help="DatabaseManager provider (default: primary)")
+        command.add_argument("--table", action="append", help="Only this table (repeatable)")
+        command.set_defaults(func=func)
+
+    subparsers.choices["sync"].add_argument("--full", action="store_true", help="Re-read everything, drop deleted rows")
+    subparsers.choices["sync"].add_argument("--batch-size", type=int, default=1000)
+    subparsers.choices["watch"].add_argument("--interval", type=float, default=300.0, help="Seconds between syncs")
+
+    status = subparsers.add_parser("status", help="Rows and staleness per table")
+    status.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
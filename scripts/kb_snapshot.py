@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Snapshot CLI
+
+Export knowledge_atoms to a columnar snapshot (Parquet, partitioned by
+vendor) and restore it into PostgreSQL or the local SQLite database.
+
+Usage:
+    poetry run python scripts/kb_snapshot.py export <dir> [--provider neon]
+    poetry run python scripts/kb_snapshot.py verify <dir>
+    poetry run python scripts/kb_snapshot.py import <dir> [--provider neon | --sqlite data/local.db]
+
+Examples:
+    # Snapshot production KB
+    poetry run python scripts/kb_snapshot.py export data/snapshots/kb-2026-10-18
+
+    # Bootstrap a local test database (resumes if interrupted)
+    poetry run python scripts/kb_snapshot.py import data/snapshots/kb-2026-10-18 --sqlite data/local.db
+
+    # Restore only Siemens atoms into the VPS database
+    poetry run python scripts/kb_snapshot.py import data/snapshots/kb-2026-10-18 --provider vps --vendor siemens
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent_factory.knowledge.kb_snapshot import (
+    DEFAULT_PARTITION_COLUMN,
+    DEFAULT_TABLE,
+    PostgresTarget,
+    SQLiteTarget,
+    SnapshotError,
+    export_postgres,
+    load_snapshot,
+    verify_snapshot,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def cmd_export(args) -> int:
+    from agent_factory.core.database_manager import DatabaseManager
+
+    db = DatabaseManager()
+    provider = db.providers[args.provider or db.primary_provider]
+    conn = provider.get_connection()
+    try:
+        manifest = export_postgres(conn, args.directory, table=args.table, partition_column=args.partition_column)
+    finally:
+        provider.release_connection(conn)
+
+    print(f"Exported {manifest.total_rows:,} rows in {len(manifest.partitions)} partitions to {args.directory}")
+    return 0
+
+
+def cmd_verify(args) -> int:
+    manifest = verify_snapshot(args.directory)
+    print(f"OK: {manifest.total_rows:,} rows, {len(manifest.partitions)} partitions, snapshot {manifest.snapshot_id}")
+    return 0
+
+
+def cmd_import(args) -> int:
+    if args.sqlite:
+        target = SQLiteTarget(args.sqlite, table=args.table)
+    else:
+        target = PostgresTarget.from_manager(provider=args.provider, table=args.table or DEFAULT_TABLE)
+
+    report = load_snapshot(
+        args.directory,
+        target,
+        verify=not args.no_verify,
+        resume=not args.restart,
+        partitions=args.vendor or None,
+    )
+    print(
+        f"Loaded {report.rows_loaded:,} rows ({report.rows_skipped:,} already loaded) "
+        f"from {report.partitions} partitions in {report.seconds:.1f}s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    return 0
+
+
+def main() -> int:
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Knowledge base snapshot export/import")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="Export a table to a snapshot directory")
+    export.add_argument("directory")
+    export.add_argument("--provider", help="DatabaseManager provider (default: primary)")
+    export.add_argument("--table", default=DEFAULT_TABLE)
+    export.add_argument("--partition-column", default=DEFAULT_PARTITION_COLUMN)
+    export.set_defaults(func=cmd_export)
+
+    verify = subparsers.add_parser("verify", help="Check snapshot checksums")
+    verify.add_argument("directory")
+    verify.set_defaults(func=cmd_verify)
+
+    load = subparsers.add_parser("import", help="Load a snapshot into PostgreSQL or SQLite")
+    load.add_argument("directory")
+    load.add_argument("--provider", help="DatabaseManager provider (default: primary)")
+    load.add_argument("--sqlite", help="Load into this SQLite file instead of PostgreSQL")
+    load.add_argument("--table", help="Target table (default: the snapshot's table)")
+    load.add_argument("--vendor", action="append", help="Only load this partition (repeatable)")
+    load.add_argument("--restart", action="store_true", help="Ignore saved progress and reload everything")
+    load.add_argument("--no-verify", action="store_true", help="Skip checksum verification")
+    load.set_defaults(func=cmd_import)
+
+    args = parser.parse_args()
+    try:
+        return args.func(args)
+    except SnapshotError as e:
+        logger.error(str(e))
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
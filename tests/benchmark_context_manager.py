@@ -0,0 +1,145 @@
+"""
+Performance benchmarks for ContextManager window fitting
+
+Measures:
+- Cold fit (first sight of every message, tokenizer runs)
+- Warm fit (cached token counts, prefix sums + binary search)
+- Legacy fit (insert(0)-based backwards walk) for comparison
+- Incremental rolling summary cost as a session grows
+
+Run with:
+    poetry run python tests/benchmark_context_manager.py
+"""
+
+import time
+from typing import Any, Dict, List
+
+from agent_factory.memory import ContextManager, MessageHistory, RollingSummary
+
+
+SESSION_SIZES = [1_000, 5_000, 10_000]
+MAX_TOKENS = 8_000
+
+
+def build_history(size: int) -> MessageHistory:
+    """Build a synthetic session mixing prose, fault codes and code."""
+    samples = [
+        "The PowerFlex 525 tripped with fault F0005 overvoltage during decel.",
+        "Check parameter P041 accel time and A442 on 1756-L83E controller.",
+        "def read_tag(plc, tag):\n    return plc.read(tag).value  # E-123",
+        "Replace the contactor and verify the 24VDC supply at terminal X1:4.",
+    ]
+    history = MessageHistory()
+    for i in range(size):
+        role = "user" if i % 2 == 0 else "assistant"
+        history.add_message(role, f"[{i}] " + samples[i % len(samples)] * (1 + i % 3))
+    return history
+
+
+def legacy_fit(messages, counter, budget) -> List[Any]:
+    """Pre-optimization algorithm: backwards walk with insert(0)."""
+    result = []
+    used = 0
+    for message in reversed(messages):
+        tokens = counter(message)
+        if used + tokens > budget:
+            break
+        result.insert(0, message)
+        used += tokens
+    return result
+
+
+class ContextBenchmark:
+    """ContextManager performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def benchmark_fit(self, size: int, iterations: int = 5):
+        """Benchmark cold and warm fit_to_window on one session size"""
+        print(f"\n=== fit_to_window on {size:,} messages ===")
+        history = build_history(size)
+        manager = ContextManager(max_tokens=MAX_TOKENS)
+        manager.token_counter.clear_cache()
+
+        start = time.perf_counter()
+        manager.fit_to_window(history)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            kept = manager.fit_to_window(history)
+        warm_ms = (time.perf_counter() - start) * 1000 / iterations
+
+        budget_all = size * 1000  # Budget that keeps everything exposes insert(0)
+        start = time.perf_counter()
+        legacy_fit(history.get_messages(), manager.token_counter, budget_all)
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        ContextManager(max_tokens=budget_all).fit_to_window(history)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        print(f"  Backend: {manager.token_counter}")
+        print(f"  Kept: {len(kept)} messages")
+        print(f"  Cold: {cold_ms:.1f}ms  Warm: {warm_ms:.2f}ms")
+        print(f"  Keep-all legacy: {legacy_ms:.1f}ms  Keep-all new: {full_ms:.1f}ms")
+
+        self.results.append({
+            "test": f"fit_{size}",
+            "cold_ms": cold_ms,
+            "warm_ms": warm_ms,
+            "legacy_keep_all_ms": legacy_ms,
+            "new_keep_all_ms": full_ms,
+        })
+
+    def benchmark_rolling_summary(self, size: int):
+        """Benchmark per-turn cost of fitting with an incremental summary"""
+        print(f"\n=== Rolling summary over {size:,} turns ===")
+        manager = ContextManager(max_tokens=MAX_TOKENS)
+        history = MessageHistory()
+        summary = RollingSummary()
+        source = build_history(size).get_messages()
+
+        start = time.perf_counter()
+        for message in source:
+            history.add_message(message.role, message.content)
+            manager.fit_to_window(history, summary=summary)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        print(f"  Total: {total_ms:.0f}ms  Per turn: {total_ms / size:.3f}ms")
+        print(f"  Summary covers {summary.covered} messages: {summary.text}")
+
+        self.results.append({
+            "test": f"rolling_summary_{size}",
+            "total_ms": total_ms,
+            "per_turn_ms": total_ms / size,
+        })
+
+    def print_summary(self):
+        """Print benchmark summary"""
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        for result in self.results:
+            print(f"\n{result['test']}:")
+            for key, value in result.items():
+                if key != "test":
+                    print(f"  {key}: {value:.2f}")
+
+
+def run_benchmarks():
+    """Run all context manager benchmarks"""
+    print("=" * 60)
+    print("CONTEXT MANAGER BENCHMARKS")
+    print("=" * 60)
+
+    benchmark = ContextBenchmark()
+    for size in SESSION_SIZES:
+        benchmark.benchmark_fit(size)
+    benchmark.benchmark_rolling_summary(2_000)
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    run_benchmarks()
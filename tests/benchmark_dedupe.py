@@ -0,0 +1,117 @@
+"""
+Performance benchmarks for LSH duplicate detection
+
+Measures on synthetic atom libraries (random text + embeddings with planted
+near-duplicates):
+- Brute-force pairwise cosine (the previous O(n^2) design) at small sizes
+- DedupeEngine at 12.5k / 25k / 50k / 100k atoms, to show near-linear scaling
+- Recall of planted duplicates
+
+Run with:
+    poetry run python tests/benchmark_dedupe.py [max_atoms] [dim]
+"""
+
+import functools
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from plc.utils.dedupe import DedupeEngine
+
+
+def vocabulary(size: int = 5000, seed: int = 1) -> List[str]:
+    """Pseudo-words, so random atoms share few shingles (like real text)."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return ["".join(rng.choice(letters, rng.integers(3, 10))) for _ in range(size)]
+
+
+WORDS = vocabulary()
+
+
+def synthetic_atoms(n: int, dim: int, duplicate_rate: float = 0.01, seed: int = 0):
+    """n atoms, of which duplicate_rate are near-copies of earlier atoms."""
+    rng = np.random.default_rng(seed)
+    originals = n - int(n * duplicate_rate)
+    texts = [" ".join(rng.choice(WORDS, 24)) for _ in range(originals)]
+    embeddings = rng.standard_normal((n, dim)).astype(np.float32)
+
+    planted = set()
+    for k in range(originals, n):
+        source = int(rng.integers(originals))
+        texts.append(texts[source] + " (rev B)")
+        embeddings[k] = embeddings[source] + 0.1 * rng.standard_normal(dim)
+        planted.add((source, k))
+    ids = [f"plc:generic:atom-{i}" for i in range(n)]
+    return ids, texts, embeddings, planted
+
+
+def brute_force(embeddings: np.ndarray, threshold: float = 0.90) -> int:
+    """All-pairs cosine similarity (quadratic time and memory)."""
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    sims = unit @ unit.T
+    return int(((np.triu(sims, 1)) >= threshold).sum())
+
+
+class DedupeBenchmark:
+    """Duplicate detection performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, label: str, atoms: int, func) -> float:
+        start = time.perf_counter()
+        found = func()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<22} n={atoms:>7,}  {elapsed:8.2f}s  {elapsed / atoms * 1e6:7.1f} us/atom  {found}")
+        self.results.append({"test": label, "atoms": atoms, "seconds": elapsed})
+        return elapsed
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY (LSH scaling vs smallest run)")
+        print("=" * 60)
+        lsh = [r for r in self.results if r["test"] == "lsh"]
+        if lsh:
+            base = lsh[0]
+            for result in lsh:
+                size_ratio = result["atoms"] / base["atoms"]
+                time_ratio = result["seconds"] / base["seconds"]
+                print(f"  n x{size_ratio:<5.1f} -> time x{time_ratio:.1f}")
+
+
+def lsh_run(ids, texts, embeddings, planted, index):
+    """Find duplicates with DedupeEngine and report recall of planted pairs"""
+    pairs = DedupeEngine().find_duplicates(ids, texts, embeddings)
+    found = {(index[p.id_1], index[p.id_2]) for p in pairs}
+    return f"pairs={len(pairs)} recall={len(planted & found) / len(planted):.3f}"
+
+
+def run_benchmarks(max_atoms: int = 100_000, dim: int = 128):
+    """Run duplicate detection benchmarks"""
+    print("=" * 60)
+    print(f"DUPLICATE DETECTION BENCHMARKS (dim={dim})")
+    print("=" * 60)
+    benchmark = DedupeBenchmark()
+
+    for n in (2_000, 8_000):
+        _, _, embeddings, _ = synthetic_atoms(n, dim)
+        benchmark.run("brute force", n, lambda embeddings=embeddings: f"pairs={brute_force(embeddings)}")
+
+    sizes = [max_atoms // 8, max_atoms // 4, max_atoms // 2, max_atoms]
+    for n in sizes:
+        ids, texts, embeddings, planted = synthetic_atoms(n, dim)
+        index = {atom_id: i for i, atom_id in enumerate(ids)}
+
+        benchmark.run("lsh", n, functools.partial(lsh_run, ids, texts, embeddings, planted, index))
+
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    run_benchmarks(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 128,
+    )
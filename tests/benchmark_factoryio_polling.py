@@ -0,0 +1,148 @@
+"""
+Performance benchmarks for Factory.io tag acquisition
+
+Compares, for N machines on one Factory.io host polled for T ticks:
+- legacy: per-machine requests.get (new connection each poll) in a
+  4-thread executor, response dumped to JSON and parsed back
+- acquisition: TagAcquisition - one keep-alive httpx client, one coalesced
+  request per host per tick, typed results
+
+Runs against a local mock Factory.io server with a small per-request
+service time, so no Factory.io install is needed.
+
+Run with:
+    poetry run python tests/benchmark_factoryio_polling.py [machines] [ticks]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import requests
+
+from agent_factory.platform.state.acquisition import TagAcquisition
+
+SERVICE_SECONDS = 0.002  # Factory.io handles one request at a time
+
+
+class MockFactoryIO:
+    """Keep-alive HTTP/1.1 server answering tag reads one at a time."""
+
+    def __init__(self, tags: Dict[str, Any]):
+        self.tags = tags
+        self.requests = 0
+        self.connections = 0
+        self.url = ""
+        self._busy = asyncio.Lock()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode().lower()
+                length = int(head.split("content-length:")[1].split("\r\n")[0]) if "content-length:" in head else 0
+                names = json.loads(await reader.readexactly(length) or b"[]")
+                async with self._busy:
+                    self.requests += 1
+                    await asyncio.sleep(SERVICE_SECONDS)
+                payload = json.dumps([{"name": n, "value": self.tags.get(n, False)} for n in names]).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(payload), payload))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+def legacy_read(url: str, tag_names: List[str]) -> str:
+    """What FactoryIOReadWriteTool._run("read") did per poll."""
+    response = requests.get(f"{url}/api/tag/values/by-name", json=tag_names, timeout=5)
+    response.raise_for_status()
+    values = {item["name"]: item["value"] for item in response.json()}
+    return json.dumps({"success": True, "values": values}, indent=2)
+
+
+class PollingBenchmark:
+    """Factory.io acquisition performance benchmarking"""
+
+    def __init__(self, machines: int, ticks: int):
+        self.machines = {f"machine_{i}": [f"m{i}_tag_{t}" for t in range(12)] for i in range(machines)}
+        self.ticks = ticks
+        self.results: List[Dict[str, Any]] = []
+
+    async def run(self, label: str, server: MockFactoryIO, poll) -> Dict[str, Any]:
+        server.requests = server.connections = 0
+        tick_ms: List[float] = []
+        for _ in range(self.ticks):
+            start = time.perf_counter()
+            await asyncio.gather(*(poll(server.url, names) for names in self.machines.values()))
+            tick_ms.append((time.perf_counter() - start) * 1000)
+
+        ordered = sorted(tick_ms)
+        row = {
+            "test": label,
+            "tick_p50_ms": ordered[len(ordered) // 2],
+            "tick_p95_ms": ordered[int(len(ordered) * 0.95)],
+            "requests_per_tick": server.requests / self.ticks,
+            "connections": server.connections,
+        }
+        print(
+            f"  {label:<12} tick p50 {row['tick_p50_ms']:7.1f} ms  p95 {row['tick_p95_ms']:7.1f} ms"
+            f"  {row['requests_per_tick']:5.1f} req/tick  {server.connections} connection(s)"
+        )
+        self.results.append(row)
+        return row
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        for result in self.results:
+            print(f"\n{result['test'].upper()}:")
+            for key, value in result.items():
+                if key != "test":
+                    print(f"  {key}: {value:.2f}")
+
+
+async def run_benchmarks(machines: int = 8, ticks: int = 50):
+    """Run Factory.io polling benchmarks"""
+    print("=" * 60)
+    print(f"FACTORY.IO POLLING BENCHMARKS ({machines} machines, {ticks} ticks)")
+    print("=" * 60)
+
+    benchmark = PollingBenchmark(machines, ticks)
+    server = MockFactoryIO({})
+    await server.start()
+
+    executor = ThreadPoolExecutor(max_workers=4)
+    loop = asyncio.get_running_loop()
+
+    async def legacy(url, names):
+        return json.loads(await loop.run_in_executor(executor, legacy_read, url, names))
+
+    await benchmark.run("legacy", server, legacy)
+    executor.shutdown()
+
+    acquisition = TagAcquisition(coalesce_seconds=0.002)
+    await benchmark.run("acquisition", server, acquisition.read)
+    print(f"  acquisition metrics: {acquisition.metrics.to_dict()}")
+    await acquisition.close()
+
+    await server.stop()
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run_benchmarks(*args))
@@ -0,0 +1,131 @@
+"""
+Performance benchmarks for KB snapshots
+
+Measures on synthetic atoms with 1536-dim embeddings:
+- Legacy upload encoding (embedding as '{0.1,0.2,...}' text, as in
+  scripts/upload_atoms_direct_postgres.py)
+- Snapshot export (rows -> partitioned Parquet)
+- Binary COPY encoding of the snapshot (the PostgreSQL import payload)
+- Full restore into SQLite
+
+Run with:
+    poetry run python tests/benchmark_kb_snapshot.py [atoms] [dim]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from agent_factory.knowledge.kb_snapshot import (
+    KIND_TEXT,
+    KIND_VECTOR,
+    SnapshotColumn,
+    SnapshotWriter,
+    SQLiteTarget,
+    encode_copy_binary,
+    load_snapshot,
+)
+
+VENDORS = ["Allen-Bradley", "Siemens", "ABB", "Schneider", "Mitsubishi", "Omron", "Yaskawa", "Danfoss"]
+
+
+def columns(dim: int) -> List[SnapshotColumn]:
+    return [
+        SnapshotColumn("atom_id", KIND_TEXT),
+        SnapshotColumn("manufacturer", KIND_TEXT),
+        SnapshotColumn("title", KIND_TEXT),
+        SnapshotColumn("content", KIND_TEXT),
+        SnapshotColumn("embedding", KIND_VECTOR, dim=dim),
+    ]
+
+
+def synthetic_rows(n: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, dim)).astype(np.float32)
+    content = "Check DC bus voltage and ramp-down time. " * 20
+    return [
+        (f"atom-{i}", VENDORS[i % len(VENDORS)], f"Fault F{i:05d}", content, embeddings[i])
+        for i in range(n)
+    ]
+
+
+class SnapshotBenchmark:
+    """KB snapshot performance benchmarking"""
+
+    def __init__(self, atoms: int):
+        self.atoms = atoms
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, label: str, func) -> float:
+        start = time.perf_counter()
+        detail = func()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<34} {elapsed:8.2f}s  {self.atoms / elapsed:>10,.0f} atoms/s  {detail or ''}")
+        self.results.append({"test": label, "seconds": elapsed})
+        return elapsed
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY (projected for 1,000,000 atoms)")
+        print("=" * 60)
+        for result in self.results:
+            projected = result["seconds"] * 1_000_000 / self.atoms
+            print(f"  {result['test']:<34} {projected / 60:6.1f} min")
+
+
+def run_benchmarks(atoms: int = 50_000, dim: int = 1536):
+    """Run snapshot benchmarks"""
+    print("=" * 60)
+    print(f"KB SNAPSHOT BENCHMARKS ({atoms:,} atoms, dim={dim})")
+    print("=" * 60)
+    benchmark = SnapshotBenchmark(atoms)
+    rows = synthetic_rows(atoms, dim)
+    cols = columns(dim)
+    workdir = Path(tempfile.mkdtemp(prefix="kb_snapshot_bench_"))
+    snapshot_dir = workdir / "snapshot"
+
+    try:
+        def legacy_encoding():
+            size = sum(len("{" + ",".join(map(str, row[4].tolist())) + "}") for row in rows)
+            return f"{size / 1e6:,.0f} MB of text"
+
+        def export():
+            writer = SnapshotWriter(snapshot_dir, cols)
+            writer.write(rows)
+            manifest = writer.close()
+            size = sum(p.bytes for p in manifest.partitions)
+            return f"{size / 1e6:,.0f} MB in {len(manifest.partitions)} files"
+
+        def copy_encoding():
+            size = 0
+            for path in sorted(snapshot_dir.glob("*/*.parquet")):
+                parquet = pq.ParquetFile(str(path))
+                for group in range(parquet.num_row_groups):
+                    size += len(encode_copy_binary(parquet.read_row_group(group), cols))
+            return f"{size / 1e6:,.0f} MB binary"
+
+        def sqlite_restore():
+            report = load_snapshot(snapshot_dir, SQLiteTarget(workdir / "kb.db"))
+            return f"{report.rows_loaded:,} rows"
+
+        benchmark.run("legacy text encoding (embeddings)", legacy_encoding)
+        benchmark.run("export to parquet", export)
+        benchmark.run("binary COPY encoding", copy_encoding)
+        benchmark.run("restore into sqlite (verify+load)", sqlite_restore)
+        benchmark.print_summary()
+
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run_benchmarks(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1536,
+    )
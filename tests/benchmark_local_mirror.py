@@ -0,0 +1,127 @@
+"""
+Performance benchmarks for the local SQLite knowledge mirror
+
+Measures, on a synthetic KB (default 20,000 atoms with 768-dim embeddings):
+- Initial sync and an incremental sync of 1% changed rows
+- Hot-path reads: get by key, FTS5 search, filtered search, semantic search
+
+Run with:
+    poetry run python tests/benchmark_local_mirror.py [atoms]
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from agent_factory.knowledge.local_mirror import LocalMirror
+
+WORDS = (
+    "drive motor fault check wiring parameter input output voltage current "
+    "overload reset controller module terminal ground shield cable encoder "
+    "ramp speed torque brake relay contactor fuse breaker alarm display"
+).split()
+VENDORS = ["allen_bradley", "siemens", "abb", "schneider", "mitsubishi"]
+SEPTEMBER = datetime(2026, 9, 1)
+
+
+class SyntheticSource:
+    """Remote stand-in with keyset pagination over generated atoms."""
+
+    def __init__(self, atoms: int, dim: int = 768):
+        rng = random.Random(42)
+        self.rows = []
+        for i in range(atoms):
+            words = rng.choices(WORDS, k=60)
+            self.rows.append({
+                "atom_id": f"atom-{i:06d}",
+                # Spread over September, as rows written over time would be
+                "updated_at": (SEPTEMBER + timedelta(minutes=2 * i)).isoformat(),
+                "title": f"Fault F{i % 10000:04d} {' '.join(words[:4])}",
+                "summary": " ".join(words[4:20]),
+                "content": " ".join(words),
+                "keywords": words[:5],
+                "vendor": VENDORS[i % len(VENDORS)],
+                "embedding": "[" + ",".join(f"{rng.random():.4f}" for _ in range(dim)) + "]",
+            })
+
+    def touch(self, fraction: float, updated: str) -> None:
+        for row in self.rows[:: int(1 / fraction)]:
+            row["updated_at"] = updated
+
+    def fetch_changes(self, table, since, limit):
+        if table.name != "knowledge_atoms":
+            return []
+        rows = sorted(self.rows, key=lambda r: (r["updated_at"], r["atom_id"]))
+        if since is not None:
+            rows = [r for r in rows if (r["updated_at"], r["atom_id"]) > since]
+        return rows[:limit]
+
+
+class MirrorBenchmark:
+    """Local mirror performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, label: str, func, repeat: int = 1) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        elapsed = statistics.median(timings)
+        print(f"  {label:<32} {elapsed * 1000:9.3f} ms")
+        self.results.append({"test": label, "ms": elapsed * 1000})
+        return elapsed
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        for result in self.results:
+            print(f"  {result['test']:<32} {result['ms']:9.3f} ms")
+
+
+def run_benchmarks(atoms: int = 20000):
+    """Run local mirror benchmarks"""
+    print("=" * 60)
+    print(f"LOCAL MIRROR BENCHMARKS ({atoms} atoms)")
+    print("=" * 60)
+
+    benchmark = MirrorBenchmark()
+    source = SyntheticSource(atoms)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = LocalMirror(Path(tmp) / "mirror.db")
+
+        benchmark.run("sync (initial)", lambda: mirror.sync_table("knowledge_atoms", source))
+        source.touch(0.01, "2026-10-02T00:00:00")
+        benchmark.run("sync (1% changed)", lambda: mirror.sync_table("knowledge_atoms", source))
+        print(f"  file size: {(Path(tmp) / 'mirror.db').stat().st_size / 1e6:.1f} MB")
+
+        query_vector = [random.random() for _ in range(768)]
+        mirror.semantic_search("knowledge_atoms", query_vector)  # Decode embeddings once
+
+        reads = {
+            "get by atom_id": lambda: mirror.get("knowledge_atoms", "atom-001234"),
+            "fts: fault code (F0042)": lambda: mirror.search_text("knowledge_atoms", "F0042", limit=5),
+            "fts: common words": lambda: mirror.search_text("knowledge_atoms", "motor overload fault", limit=5),
+            "fts: vendor filter": lambda: mirror.search_text(
+                "knowledge_atoms", "encoder fault", limit=5, filters={"vendor": "siemens"}
+            ),
+            "semantic (768-dim)": lambda: mirror.semantic_search("knowledge_atoms", query_vector, limit=5),
+        }
+        for label, func in reads.items():
+            benchmark.run(f"read: {label}", func, repeat=50)
+        mirror.close()
+
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,114 @@
+"""
+Performance benchmarks for BM25 manual search
+
+Measures, on a synthetic library (default 20,000 pages ~ 60,000 chunks):
+- Incremental index build (chunks added one at a time)
+- Save to disk and mmap load
+- Query latency for fault codes, part numbers and common words
+
+Run with:
+    poetry run python tests/benchmark_manual_search.py [pages]
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from agent_factory.knowledge.bm25_index import BM25Index
+
+WORDS = (
+    "drive motor fault check wiring parameter input output voltage current "
+    "overload reset controller module terminal ground shield cable encoder "
+    "ramp speed torque brake relay contactor fuse breaker alarm display"
+).split()
+
+
+def build_chunks(pages: int, chunks_per_page: int = 3, manuals: int = 200):
+    """Yield (manual_id, chunk) pairs with fault codes and part numbers."""
+    rng = random.Random(42)
+    for page in range(pages):
+        manual = page % manuals
+        for c in range(chunks_per_page):
+            words = rng.choices(WORDS, k=70)
+            words.insert(rng.randrange(70), f"F{rng.randrange(10000):04d}")
+            words.insert(rng.randrange(70), f"1756-L{rng.randrange(60, 90)}E")
+            yield f"manual-{manual}", {
+                "text": " ".join(words),
+                "chunk_index": page * chunks_per_page + c,
+            }
+
+
+class SearchBenchmark:
+    """BM25 search performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, label: str, func, repeat: int = 1) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        elapsed = statistics.median(timings)
+        print(f"  {label:<32} {elapsed * 1000:9.2f} ms")
+        self.results.append({"test": label, "ms": elapsed * 1000})
+        return elapsed
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        for result in self.results:
+            print(f"  {result['test']:<32} {result['ms']:9.2f} ms")
+
+
+def run_benchmarks(pages: int = 20000):
+    """Run manual search benchmarks"""
+    print("=" * 60)
+    print(f"MANUAL SEARCH BENCHMARKS ({pages} pages)")
+    print("=" * 60)
+
+    benchmark = SearchBenchmark()
+    index = BM25Index()
+
+    def build():
+        for manual_id, chunk in build_chunks(pages):
+            index.add_chunk(manual_id, chunk)
+
+    benchmark.run("build (incremental)", build)
+    print(f"  {index!r}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "manuals.bm25"
+        benchmark.run("save", lambda: index.save(path))
+        print(f"  file size: {path.stat().st_size / 1e6:.1f} MB")
+
+        loaded = {}
+        benchmark.run("load (mmap)", lambda: loaded.update(index=BM25Index.load(path)))
+        searchable = loaded["index"]
+
+        queries = {
+            "fault code (F0042)": "F0042",
+            "part number (1756-L83E)": "1756-L83E",
+            "common words": "motor overload fault",
+            "grouped by manual": "encoder fault",
+        }
+        for label, query in queries.items():
+            group = label == "grouped by manual"
+            benchmark.run(
+                f"query: {label}",
+                lambda query=query, group=group: searchable.search(query, top_k=10, group_by_manual=group),
+                repeat=20
+            )
+        searchable.close()
+
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,218 @@
+"""
+Performance benchmarks for media rendering (agents/media/rendering.py)
+
+Compares thumbnail throughput for:
+- legacy: font paths probed and the RGBA gradient redrawn for every variant,
+  variants rendered one after another (the old ThumbnailAgent path)
+- cached: cached fonts and gradient mask, still one process
+- pool: cached helpers across a process pool
+- render cache: second run over unchanged inputs (copies, no rendering)
+
+When ffmpeg is installed, also times video assembly per video: full encode
+over a generated background vs stream copy of a pre-encoded segment, and a
+render-cache hit.
+
+Run with:
+    poetry run python tests/benchmark_media_render.py [videos]
+"""
+
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Any, Dict, List
+
+from PIL import Image, ImageDraw, ImageFont
+
+from agents.media.rendering import (
+    BackgroundSegments,
+    RenderCache,
+    ThumbnailSpec,
+    assemble_video,
+    render_thumbnail,
+    render_thumbnails,
+    wrap_text,
+)
+
+TITLES = [
+    "Master 3-Wire Motor Control Circuits",
+    "VFD Fault Codes Explained: F0002 Overcurrent",
+    "Ladder Logic Basics for Allen-Bradley PLCs",
+    "Troubleshooting Proximity Sensors in 5 Minutes",
+]
+ACCENTS = ["#ff6b35", "#00b4d8", "#ffd700"]
+
+
+def legacy_font(font_name: str, size: int):
+    for path in (
+        f"C:\\Windows\\Fonts\\{font_name}",
+        f"/usr/share/fonts/truetype/{font_name}",
+        f"/System/Library/Fonts/{font_name}",
+    ):
+        try:
+            return ImageFont.truetype(path, size)
+        except (OSError, IOError):
+            continue
+    return ImageFont.load_default()
+
+
+def legacy_render(spec: ThumbnailSpec) -> int:
+    """The pre-cache ThumbnailAgent drawing path."""
+    img = Image.new("RGB", (spec.width, spec.height), spec.background)
+    draw = ImageDraw.Draw(img)
+
+    gradient = Image.new("RGBA", (spec.width, spec.height), (0, 0, 0, 0))
+    gradient_draw = ImageDraw.Draw(gradient)
+    for i in range(10):
+        offset = i * 40
+        gradient_draw.ellipse(
+            [(offset, offset), (spec.width - offset, spec.height - offset)],
+            fill=(0, 0, 0, int(255 * (10 - i) / 10 * 0.3))
+        )
+    img.paste(gradient, (0, 0), gradient)
+
+    lines = wrap_text(spec.title)
+    y_start = (spec.height - len(lines) * 90) // 2
+    for i, line in enumerate(lines):
+        y_pos = y_start + i * 90
+        draw.text((spec.width // 2 + 4, y_pos + 4), line, font=legacy_font(spec.font_name, 72),
+                  fill="#000000", anchor="mm")
+        draw.text((spec.width // 2, y_pos), line, font=legacy_font(spec.font_name, 72),
+                  fill=spec.text_color, anchor="mm")
+    draw.rectangle([(0, spec.height - 8), (spec.width, spec.height)], fill=spec.accent_color)
+    draw.text((40, 40), "INDUSTRIAL SKILLS HUB", font=legacy_font(spec.font_name, 36), fill=spec.accent_color)
+
+    img.save(spec.output_path, "JPEG", quality=spec.quality, optimize=True)
+    return Path(spec.output_path).stat().st_size
+
+
+def make_specs(out_dir: Path, videos: int) -> List[ThumbnailSpec]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        ThumbnailSpec(
+            title=f"{TITLES[v % len(TITLES)]} (Part {v + 1})",
+            output_path=str(out_dir / f"video_{v:03d}_variant_{a + 1}.jpg"),
+            accent_color=accent,
+        )
+        for v in range(videos)
+        for a, accent in enumerate(ACCENTS)
+    ]
+
+
+def write_tone(path: Path, seconds: float) -> None:
+    rate = 16000
+    frames = bytearray()
+    for n in range(int(seconds * rate)):
+        sample = int(6000 * math.sin(2 * math.pi * 220 * n / rate))
+        frames += sample.to_bytes(2, "little", signed=True)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(bytes(frames))
+
+
+class RenderBenchmark:
+    """Media rendering performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, label: str, items: int, elapsed: float) -> None:
+        row = {"test": label, "items": items, "wall_s": elapsed, "per_sec": items / elapsed}
+        print(f"  {label:<22} {items:4d} items  {elapsed:7.2f}s  {row['per_sec']:8.1f}/s")
+        self.results.append(row)
+
+    def thumbnails(self, work: Path, videos: int) -> None:
+        specs = make_specs(work / "legacy", videos)
+        start = time.perf_counter()
+        for spec in specs:
+            legacy_render(spec)
+        self.record("thumbs legacy", len(specs), time.perf_counter() - start)
+
+        specs = make_specs(work / "cached", videos)
+        start = time.perf_counter()
+        for spec in specs:
+            render_thumbnail(spec)
+        self.record("thumbs cached helpers", len(specs), time.perf_counter() - start)
+
+        specs = make_specs(work / "pool", videos)
+        start = time.perf_counter()
+        render_thumbnails(specs)
+        self.record(f"thumbs pool ({os.cpu_count()} cpu)", len(specs), time.perf_counter() - start)
+
+        cache = RenderCache(work / "cache")
+        render_thumbnails(make_specs(work / "warm", videos), cache=cache)
+        specs = make_specs(work / "hit", videos)
+        start = time.perf_counter()
+        render_thumbnails(specs, cache=cache)
+        self.record("thumbs render cache", len(specs), time.perf_counter() - start)
+
+    def videos(self, work: Path, count: int, seconds: float = 20.0) -> None:
+        audio = []
+        for i in range(count):
+            path = work / f"narration_{i}.wav"
+            write_tone(path, seconds + i * 0.1)
+            audio.append(path)
+
+        start = time.perf_counter()
+        for i, path in enumerate(audio):
+            subprocess.run([
+                "ffmpeg", "-y", "-f", "lavfi", "-i", f"color=c=black:s=1920x1080:d={seconds}",
+                "-i", str(path), "-c:v", "libx264", "-c:a", "aac", "-b:a", "192k",
+                "-pix_fmt", "yuv420p", "-shortest", str(work / f"legacy_{i}.mp4")
+            ], check=True, capture_output=True)
+        self.record("video full encode", count, time.perf_counter() - start)
+
+        background = BackgroundSegments(work / "cache")
+        background.segment()  # One-time cost, shared by every video
+        start = time.perf_counter()
+        for i, path in enumerate(audio):
+            assemble_video(str(path), work / f"copy_{i}.mp4", background)
+        self.record("video stream copy", count, time.perf_counter() - start)
+
+        cache = RenderCache(work / "cache")
+        for i, path in enumerate(audio):
+            assemble_video(str(path), work / f"warm_{i}.mp4", background, cache=cache)
+        start = time.perf_counter()
+        for i, path in enumerate(audio):
+            assemble_video(str(path), work / f"hit_{i}.mp4", background, cache=cache)
+        self.record("video render cache", count, time.perf_counter() - start)
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        for result in self.results:
+            print(f"\n{result['test'].upper()}:")
+            for key, value in result.items():
+                if key != "test":
+                    print(f"  {key}: {value:.2f}")
+
+
+def run_benchmarks(videos: int = 20):
+    """Run media rendering benchmarks"""
+    print("=" * 60)
+    print(f"MEDIA RENDER BENCHMARKS ({videos} videos x {len(ACCENTS)} thumbnails)")
+    print("=" * 60)
+
+    benchmark = RenderBenchmark()
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        benchmark.thumbnails(work, videos)
+
+        if shutil.which("ffmpeg") and shutil.which("ffprobe"):
+            benchmark.videos(work, min(videos, 5))
+        else:
+            print("  ffmpeg not installed: skipping video assembly")
+
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
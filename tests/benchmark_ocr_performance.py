@@ -1,224 +1,205 @@
 """
-Performance benchmarks for OCR Pipeline and KB Search
+Performance benchmarks for the OCR Pipeline
 
-Measures:
-- OCR latency (GPT-4o vs Gemini)
-- KB search precision with/without model filtering
-- End-to-end photo processing time
-"""
-
-import asyncio
-import time
-import os
-from pathlib import Path
-from typing import List, Dict, Any
-
-from agent_factory.integrations.telegram.ocr import OCRPipeline, OCRResult
-from agent_factory.rivet_pro.rag.retriever import search_docs
-from agent_factory.rivet_pro.models import RivetIntent, VendorType, EquipmentType, KBCoverage as RivetKBCoverage
-
-
-class PerformanceBenchmark:
-    """OCR and KB search performance benchmarking"""
-
-    def __init__(self):
-        self.results: List[Dict[str, Any]] = []
+Repeatable: vision providers are seeded stubs with log-normal latency, an
+upload cost proportional to the (base64) request size, and occasional
+failures / low-confidence answers. No API keys or network needed.
 
-    async def benchmark_ocr_latency(self, pipeline: OCRPipeline, image_bytes: bytes, iterations: int = 3):
-        """Benchmark OCR latency over multiple iterations"""
-        print(f"\n=== Benchmarking OCR Latency ({iterations} iterations) ===")
+Measures, per pipeline configuration:
+- Request latency (p50 / p95 / p99) over a workload of Telegram photos,
+  uncompressed "file" uploads and forwarded copies of earlier photos
+- Bytes uploaded, provider calls, cache hits, hedges
 
-        latencies = []
+Configurations build on each other:
+    sequential   - old behaviour: full-size upload, Gemini only after GPT-4o
+    + downscale  - re-encode to the vision models' tile limits
+    + cache      - perceptual-hash result cache
+    + hedging    - start Gemini when GPT-4o is slow
 
-        for i in range(iterations):
-            print(f"\nIteration {i+1}/{iterations}...")
+Stub latencies can be scaled down with --time-scale for quicker runs;
+reported latencies are converted back to unscaled milliseconds (local CPU
+work - decode, resize, hash - is then overstated by the same factor).
 
-            start = time.time()
-            result = await pipeline.analyze_photo(image_bytes, user_id="benchmark")
-            latency = (time.time() - start) * 1000  # Convert to ms
-
-            latencies.append(latency)
+Run with:
+    poetry run python tests/benchmark_ocr_performance.py [--requests 200] [--time-scale 1.0]
+"""
 
-            print(f"  Provider: {result.provider}")
-            print(f"  Confidence: {result.confidence:.2%}")
-            print(f"  Latency: {latency:.0f}ms")
+import argparse
+import asyncio
+import io
+import math
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from PIL import Image, ImageDraw
+
+from agent_factory.integrations.telegram.ocr import OCRPipeline, OCRResult, OCRResultCache
+from agent_factory.integrations.telegram.ocr.execution import prepare_image
+
+
+class StubVisionProvider:
+    """Seeded stand-in for a vision API."""
+
+    def __init__(
+        self,
+        name: str,
+        median_ms: float,
+        sigma: float,
+        failure_rate: float,
+        low_confidence_rate: float,
+        time_scale: float,
+        upload_bytes_per_s: float = 2_000_000,
+        seed: int = 0,
+    ):
+        self.provider_name = name
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.failure_rate = failure_rate
+        self.low_confidence_rate = low_confidence_rate
+        self.time_scale = time_scale
+        self.upload_bytes_per_s = upload_bytes_per_s
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    async def extract(self, image_bytes: bytes) -> OCRResult:
+        self.calls += 1
+        upload_ms = len(image_bytes) * 4 / 3 / self.upload_bytes_per_s * 1000  # base64
+        model_ms = self.rng.lognormvariate(math.log(self.median_ms), self.sigma)
+        roll = self.rng.random()
+        await asyncio.sleep((upload_ms + model_ms) * self.time_scale / 1000)
+
+        if roll < self.failure_rate:
+            raise ConnectionError(f"{self.provider_name}: 503 Service Unavailable")
+        confidence = 0.35 if roll < self.failure_rate + self.low_confidence_rate else 0.85
+        return OCRResult(
+            manufacturer="allen_bradley",
+            model_number="POWERFLEX525",
+            confidence=confidence,
+            provider=self.provider_name,
+        )
 
-        # Calculate stats
-        avg_latency = sum(latencies) / len(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
 
-        print(f"\nOCR Latency Stats:")
-        print(f"  Average: {avg_latency:.0f}ms")
-        print(f"  Min: {min_latency:.0f}ms")
-        print(f"  Max: {max_latency:.0f}ms")
+def synthetic_photo(seed: int, width: int, height: int, quality: int = 87) -> bytes:
+    """Nameplate-like photo: seeded blocks of colour plus a few text lines."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), (200, 200, 190))
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x, y = rng.random() * width, rng.random() * height
+        w, h = rng.random() * width / 3, rng.random() * height / 3
+        draw.rectangle([x, y, x + w, y + h], fill=tuple(rng.randrange(256) for _ in range(3)))
+    for i in range(6):
+        draw.text((width // 8, height // 4 + i * height // 12), f"CAT 25B-D{seed:03d}N{i} 480V 3PH", fill=(255, 255, 255))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def build_workload(requests: int, seed: int = 7) -> List[bytes]:
+    """
+    Telegram-shaped traffic: 80% compressed photos (1280x960), 20% photos
+    sent as files (4000x3000), and 30% forwards of an earlier photo
+    (recompressed by Telegram, so not byte-identical).
+    """
+    rng = random.Random(seed)
+    originals: List[tuple] = []
+    workload = []
+    for i in range(requests):
+        if originals and rng.random() < 0.3:
+            photo_seed, size = rng.choice(originals)
+            workload.append(synthetic_photo(photo_seed, *size, quality=rng.choice((70, 75, 80))))
+            continue
+        size = (4000, 3000) if rng.random() < 0.2 else (1280, 960)
+        originals.append((i, size))
+        workload.append(synthetic_photo(i, *size))
+    return workload
 
-        self.results.append({
-            "test": "ocr_latency",
-            "avg_ms": avg_latency,
-            "min_ms": min_latency,
-            "max_ms": max_latency,
-        })
 
-        return avg_latency
+class PerformanceBenchmark:
+    """OCR pipeline performance benchmarking"""
 
-    def benchmark_kb_search_precision(self, manufacturer: str, model_number: str):
-        """Benchmark KB search precision with/without model filtering"""
-        print(f"\n=== Benchmarking KB Search Precision ===")
+    def __init__(self, time_scale: float, concurrency: int):
+        self.time_scale = time_scale
+        self.concurrency = concurrency
+        self.results: List[Dict[str, Any]] = []
 
-        # Map manufacturer to VendorType
-        vendor_map = {
-            "siemens": VendorType.SIEMENS,
-            "allen_bradley": VendorType.ALLEN_BRADLEY,
-            "rockwell": VendorType.ALLEN_BRADLEY,
-            "schneider": VendorType.SCHNEIDER_ELECTRIC,
-            "mitsubishi": VendorType.MITSUBISHI,
+    def make_pipeline(self, downscale: bool, cache: bool, hedge: bool) -> OCRPipeline:
+        pipeline = OCRPipeline(
+            gpt4o_api_key=None,
+            gemini_api_key=None,
+            hedge_after_seconds=4.0 * self.time_scale if hedge else 3600.0,
+            cache=OCRResultCache() if cache else None,
+            max_short_side=None if downscale else 100_000,  # Never resize: JPEGs pass through
+        )
+        if not cache:
+            pipeline.cache = None  # None means "default cache" to the constructor
+        # Without hedging the adaptive delay must not kick in either
+        pipeline.hedge_floor_seconds = 1.5 * self.time_scale if hedge else pipeline.hedge_after_seconds
+        pipeline.gpt4o_provider = StubVisionProvider(
+            "gpt4o", median_ms=2800, sigma=0.45, failure_rate=0.03,
+            low_confidence_rate=0.07, time_scale=self.time_scale, seed=1,
+        )
+        pipeline.gemini_provider = StubVisionProvider(
+            "gemini", median_ms=1900, sigma=0.35, failure_rate=0.02,
+            low_confidence_rate=0.10, time_scale=self.time_scale, seed=2,
+        )
+        return pipeline
+
+    async def benchmark_config(self, label: str, workload: List[bytes], **config) -> Dict[str, Any]:
+        pipeline = self.make_pipeline(**config)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies: List[float] = []
+
+        async def one(image_bytes: bytes) -> Optional[OCRResult]:
+            async with semaphore:
+                start = time.perf_counter()
+                result = await pipeline.analyze_photo(image_bytes, user_id="benchmark", skip_quality_check=True)
+                latencies.append((time.perf_counter() - start) * 1000 / self.time_scale)
+                return result
+
+        results = await asyncio.gather(*(one(image) for image in workload))
+        metrics = pipeline.metrics
+
+        ordered = sorted(latencies)
+        row = {
+            "test": label,
+            "p50_ms": ordered[len(ordered) // 2],
+            "p95_ms": ordered[int(len(ordered) * 0.95)],
+            "p99_ms": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+            "mean_ms": statistics.mean(latencies),
+            "uploaded_mb": metrics.bytes_uploaded / 1e6,
+            "provider_calls": pipeline.gpt4o_provider.calls + pipeline.gemini_provider.calls,
+            "cache_hits": metrics.cache_hits,
+            "hedged": metrics.hedged,
+            "good_answers": sum(1 for r in results if r and not r.error and r.confidence >= 0.5),
         }
-
-        manufacturer_lower = manufacturer.lower().replace(" ", "_")
-        vendor = vendor_map.get(manufacturer_lower, VendorType.SIEMENS)
-
-        # Create intent
-        intent = RivetIntent(
-            vendor=vendor,
-            equipment_type=EquipmentType.VFD,
-            symptom=f"{model_number} troubleshooting",
-            raw_summary=f"{manufacturer} {model_number} troubleshooting",
-            context_source="text_only",
-            confidence=0.9,
-            kb_coverage=RivetKBCoverage.NONE
+        print(
+            f"  {label:<14} p50 {row['p50_ms']:6.0f}  p95 {row['p95_ms']:6.0f}  p99 {row['p99_ms']:6.0f} ms"
+            f"  | {row['uploaded_mb']:6.1f} MB  {row['provider_calls']:4d} calls"
+            f"  {row['cache_hits']:3d} cached  {row['hedged']:3d} hedged"
         )
-
-        # Search without model filter
-        print(f"\n1. Searching without model filter...")
-        start = time.time()
-        docs_without = search_docs(intent)
-        latency_without = (time.time() - start) * 1000
-
-        print(f"   Results: {len(docs_without)} documents")
-        print(f"   Latency: {latency_without:.0f}ms")
-
-        if docs_without:
-            avg_sim_without = sum(d.similarity for d in docs_without) / len(docs_without)
-            print(f"   Avg Similarity: {avg_sim_without:.3f}")
-        else:
-            avg_sim_without = 0.0
-
-        # Search with model filter
-        print(f"\n2. Searching with model filter ({model_number})...")
-        start = time.time()
-        docs_with = search_docs(intent, model_number=model_number)
-        latency_with = (time.time() - start) * 1000
-
-        print(f"   Results: {len(docs_with)} documents")
-        print(f"   Latency: {latency_with:.0f}ms")
-
-        if docs_with:
-            avg_sim_with = sum(d.similarity for d in docs_with) / len(docs_with)
-            print(f"   Avg Similarity: {avg_sim_with:.3f}")
-
-            # Show top result
-            print(f"\n   Top Result:")
-            print(f"     Title: {docs_with[0].title}")
-            print(f"     Similarity: {docs_with[0].similarity:.3f}")
-        else:
-            avg_sim_with = 0.0
-
-        # Calculate precision improvement
-        if avg_sim_without > 0:
-            precision_improvement = ((avg_sim_with - avg_sim_without) / avg_sim_without) * 100
-        else:
-            precision_improvement = 0.0
-
-        print(f"\nPrecision Analysis:")
-        print(f"  Results reduction: {len(docs_without)} → {len(docs_with)} ({len(docs_with)/max(len(docs_without), 1)*100:.0f}%)")
-        print(f"  Similarity improvement: {precision_improvement:+.1f}%")
-
-        self.results.append({
-            "test": "kb_search_precision",
-            "results_without_filter": len(docs_without),
-            "results_with_filter": len(docs_with),
-            "avg_similarity_without": avg_sim_without,
-            "avg_similarity_with": avg_sim_with,
-            "precision_improvement_pct": precision_improvement,
-            "latency_without_ms": latency_without,
-            "latency_with_ms": latency_with,
-        })
-
-        return precision_improvement
-
-    async def benchmark_e2e_flow(self, pipeline: OCRPipeline, image_bytes: bytes):
-        """Benchmark end-to-end photo → OCR → KB search flow"""
-        print(f"\n=== Benchmarking E2E Flow (Photo → OCR → KB) ===")
-
-        start_total = time.time()
-
-        # Step 1: OCR
-        print("\n1. OCR extraction...")
-        start_ocr = time.time()
-        ocr_result = await pipeline.analyze_photo(image_bytes, user_id="benchmark")
-        ocr_time = (time.time() - start_ocr) * 1000
-
-        print(f"   Provider: {ocr_result.provider}")
-        print(f"   Confidence: {ocr_result.confidence:.2%}")
-        print(f"   Time: {ocr_time:.0f}ms")
-
-        # Step 2: KB search (if manufacturer detected)
-        kb_time = 0
-        kb_results = 0
-
-        if ocr_result.manufacturer:
-            print(f"\n2. KB search...")
-
-            vendor_map = {
-                "siemens": VendorType.SIEMENS,
-                "allen_bradley": VendorType.ALLEN_BRADLEY,
-                "rockwell": VendorType.ALLEN_BRADLEY,
-                "schneider": VendorType.SCHNEIDER_ELECTRIC,
-                "mitsubishi": VendorType.MITSUBISHI,
-            }
-
-            manufacturer_lower = ocr_result.manufacturer.lower().replace(" ", "_")
-            vendor = vendor_map.get(manufacturer_lower, VendorType.SIEMENS)
-
-            intent = RivetIntent(
-                vendor=vendor,
-                equipment_type=EquipmentType.VFD,
-                symptom=f"{ocr_result.model_number or 'VFD'} troubleshooting",
-                raw_summary=f"{ocr_result.manufacturer} {ocr_result.model_number or 'VFD'} troubleshooting",
-                context_source="text_only",
-                confidence=0.9,
-                kb_coverage=RivetKBCoverage.NONE
+        self.results.append(row)
+        return row
+
+    def benchmark_prepare(self, workload: List[bytes]):
+        """Real (unscaled) CPU cost of the downscale step"""
+        for label, size in (("1280x960 photo", 1280), ("4000x3000 file", 4000)):
+            image = next(img for img in workload if Image.open(io.BytesIO(img)).width == size)
+            timings = []
+            for _ in range(10):
+                start = time.perf_counter()
+                prepared = prepare_image(image)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(
+                f"  prepare {label:<16} {statistics.median(timings):6.1f} ms  "
+                f"{len(image):,} -> {len(prepared.data):,} bytes"
             )
 
-            start_kb = time.time()
-            docs = search_docs(intent, model_number=ocr_result.model_number)
-            kb_time = (time.time() - start_kb) * 1000
-            kb_results = len(docs)
-
-            print(f"   Results: {kb_results} documents")
-            print(f"   Time: {kb_time:.0f}ms")
-        else:
-            print(f"\n2. KB search skipped (no manufacturer detected)")
-
-        # Total time
-        total_time = (time.time() - start_total) * 1000
-
-        print(f"\nE2E Timing Breakdown:")
-        print(f"  OCR: {ocr_time:.0f}ms ({ocr_time/total_time*100:.0f}%)")
-        print(f"  KB Search: {kb_time:.0f}ms ({kb_time/total_time*100:.0f}%)")
-        print(f"  Total: {total_time:.0f}ms")
-
-        self.results.append({
-            "test": "e2e_flow",
-            "ocr_ms": ocr_time,
-            "kb_search_ms": kb_time,
-            "total_ms": total_time,
-            "kb_results": kb_results,
-        })
-
-        return total_time
-
     def print_summary(self):
         """Print benchmark summary"""
         print("\n" + "=" * 60)
@@ -235,58 +216,36 @@ class PerformanceBenchmark:
                         print(f"  {key}: {value}")
 
 
-async def run_benchmarks():
+async def run_benchmarks(requests: int = 200, time_scale: float = 1.0, concurrency: int = 32):
     """Run all performance benchmarks"""
     print("=" * 60)
-    print("OCR PERFORMANCE BENCHMARKS")
+    print(f"OCR PERFORMANCE BENCHMARKS ({requests} requests, time scale {time_scale})")
     print("=" * 60)
 
-    benchmark = PerformanceBenchmark()
-
-    # Initialize pipeline
-    pipeline = OCRPipeline()
+    benchmark = PerformanceBenchmark(time_scale=time_scale, concurrency=concurrency)
+    workload = build_workload(requests)
 
-    # Check for test image
-    test_image_path = Path("tests/fixtures/sample_nameplate.jpg")
+    print("\n=== Image preparation ===")
+    benchmark.benchmark_prepare(workload)
 
-    if not test_image_path.exists():
-        print(f"\nERROR: Test image not found at {test_image_path}")
-        print("To run benchmarks, add a sample industrial nameplate image")
-        print("Expected location: tests/fixtures/sample_nameplate.jpg")
-        return
+    print("\n=== Pipeline configurations (stub providers) ===")
+    configs = [
+        ("sequential", dict(downscale=False, cache=False, hedge=False)),
+        ("+ downscale", dict(downscale=True, cache=False, hedge=False)),
+        ("+ cache", dict(downscale=True, cache=True, hedge=False)),
+        ("+ hedging", dict(downscale=True, cache=True, hedge=True)),
+    ]
+    for label, config in configs:
+        await benchmark.benchmark_config(label, workload, **config)
 
-    # Read image
-    with open(test_image_path, "rb") as f:
-        image_bytes = f.read()
-
-    # Run benchmarks
-    await benchmark.benchmark_ocr_latency(pipeline, image_bytes, iterations=3)
-
-    # Get OCR result for subsequent tests
-    ocr_result = await pipeline.analyze_photo(image_bytes, user_id="benchmark")
-
-    if ocr_result.manufacturer and ocr_result.model_number:
-        benchmark.benchmark_kb_search_precision(
-            ocr_result.manufacturer,
-            ocr_result.model_number
-        )
-
-    await benchmark.benchmark_e2e_flow(pipeline, image_bytes)
-
-    # Print summary
     benchmark.print_summary()
 
-    print("\n" + "=" * 60)
-    print("Benchmarks completed!")
-    print("=" * 60)
-
 
 if __name__ == "__main__":
-    # Check prerequisites
-    if not os.getenv("OPENAI_API_KEY"):
-        print("ERROR: OPENAI_API_KEY not set in environment")
-        print("Run: export OPENAI_API_KEY=your_key")
-        exit(1)
-
-    # Run benchmarks
-    asyncio.run(run_benchmarks())
+    parser = argparse.ArgumentParser(description="OCR pipeline benchmark (stub providers)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply stub latencies by this")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmarks(args.requests, args.time_scale, args.concurrency))
@@ -0,0 +1,127 @@
+"""
+Performance benchmarks for the shared PDF extraction engine
+
+Measures, on a synthetic 1,000-page manual:
+- Legacy path: single-threaded PyPDF2 loop, whole text in memory,
+  one regex per section keyword
+- Engine, in-process (max_workers=1)
+- Engine, process pool (max_workers=CPU count)
+- Peak RSS of this process and of worker processes
+
+Run with:
+    poetry run python tests/benchmark_pdf_extraction.py [pages]
+"""
+
+import re
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from PyPDF2 import PdfReader
+
+from agent_factory.knowledge.manual_indexer import SECTION_KEYWORDS, ManualIndexer
+from agent_factory.knowledge.pdf_extraction import PDFExtractionEngine
+from tests.test_pdf_extraction import write_pdf
+
+
+def build_manual(path: Path, pages: int) -> Path:
+    """Synthetic manual: section headers every 50 pages, fault-code body text."""
+    headers = [kw for keywords in SECTION_KEYWORDS.values() for kw in keywords]
+    texts = []
+    for i in range(pages):
+        if i % 50 == 0:
+            texts.append(headers[(i // 50) % len(headers)].title())
+        else:
+            texts.append(f"Fault F{i:04d} on 1756-L83E check parameter P{i % 300:03d} " * 8)
+    return write_pdf(path, texts)
+
+
+def legacy_index(path: Path, chunk_size: int = 500, overlap: int = 100) -> int:
+    """Pre-engine algorithm (with the end-of-text loop guard)."""
+    reader = PdfReader(str(path))
+    text = "\n".join(t for t in (p.extract_text() for p in reader.pages) if t)
+    lower = text.lower()
+    sections = []
+    for section_type, keywords in SECTION_KEYWORDS.items():
+        for keyword in keywords:
+            pattern = rf"^\s*{re.escape(keyword)}\s*$"
+            for m in re.finditer(pattern, lower, re.MULTILINE | re.IGNORECASE):
+                sections.append({"section_type": section_type, "start_pos": m.start()})
+    sections.sort(key=lambda s: s["start_pos"])
+    for i, s in enumerate(sections):
+        s["end_pos"] = sections[i + 1]["start_pos"] if i + 1 < len(sections) else len(text)
+
+    chunks = 0
+    pos = 0
+    while pos < len(text):
+        end = min(pos + chunk_size, len(text))
+        for s in sections:  # Linear scan per chunk
+            if s["start_pos"] <= pos < s["end_pos"]:
+                break
+        chunks += 1
+        if end == len(text):
+            break
+        pos = end - overlap
+    return chunks
+
+
+def peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MB (Linux reports KB)."""
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+class ExtractionBenchmark:
+    """PDF extraction performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, label: str, func) -> float:
+        start = time.perf_counter()
+        chunks = func()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<28} {elapsed:7.2f}s  chunks={chunks}")
+        self.results.append({"test": label, "seconds": elapsed, "chunks": chunks})
+        return elapsed
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        baseline = self.results[0]["seconds"]
+        for result in self.results:
+            speedup = baseline / result["seconds"] if result["seconds"] else 0
+            print(f"  {result['test']:<28} {result['seconds']:7.2f}s  x{speedup:.1f}")
+        print(f"\n  Peak RSS (parent):  {peak_rss_mb(resource.RUSAGE_SELF):.0f} MB")
+        print(f"  Peak RSS (workers): {peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB")
+
+
+def run_benchmarks(pages: int = 1000):
+    """Run PDF extraction benchmarks"""
+    print("=" * 60)
+    print(f"PDF EXTRACTION BENCHMARKS ({pages} pages)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = build_manual(Path(tmp) / "manual.pdf", pages)
+        benchmark = ExtractionBenchmark()
+
+        def engine_index(workers: int):
+            indexer = ManualIndexer.__new__(ManualIndexer)  # No database needed
+            indexer.engine = PDFExtractionEngine(max_workers=workers)
+            indexer.chunk_size, indexer.chunk_overlap = 500, 100
+            return sum(1 for _ in indexer.iter_chunks(pdf))
+
+        benchmark.run("legacy (sequential)", lambda: legacy_index(pdf))
+        benchmark.run("engine (1 worker)", lambda: engine_index(1))
+        workers = PDFExtractionEngine().max_workers
+        if workers > 1:
+            benchmark.run(f"engine ({workers} workers)", lambda: engine_index(workers))
+        benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,171 @@
+"""
+Performance benchmarks for the Telegram voice pipeline
+
+Compares, over a burst of voice notes from many chats:
+- legacy: note written to a temp file, read back, sent to a synchronous
+  transcriber from inside the event loop (blocks every other chat)
+- pipeline: VoicePipeline - in memory, async transcriber, long notes split
+  in pauses and transcribed concurrently, bounded concurrency
+
+Audio is generated locally (tone bursts separated by pauses, 16 kHz WAV;
+encoded to OGG/Opus through ffmpeg when it is installed). The transcriber
+is a stub whose latency grows with the audio length, so no API key or
+network is needed.
+
+Run with:
+    poetry run python tests/benchmark_voice_pipeline.py [notes]
+"""
+
+import asyncio
+import math
+import random
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from agent_factory.integrations.telegram.voice.audio_utils import SAMPLE_RATE, AudioConverter
+from agent_factory.integrations.telegram.voice.pipeline import VoicePipeline
+
+# Stub latency model (scaled down ~10x from Whisper: ~0.5s + 0.05s/audio s)
+BASE_SECONDS = 0.05
+PER_AUDIO_SECOND = 0.005
+
+
+def synthetic_note(seconds: float, rng: random.Random) -> bytes:
+    """Speech-like WAV: 2-8s tone bursts separated by 0.4-1.2s pauses."""
+    samples: List[int] = []
+    total = int(seconds * SAMPLE_RATE)
+    while len(samples) < total:
+        burst = int(rng.uniform(2, 8) * SAMPLE_RATE)
+        freq = rng.uniform(120, 300)
+        samples.extend(int(6000 * math.sin(2 * math.pi * freq * n / SAMPLE_RATE)) for n in range(burst))
+        samples.extend(rng.randint(-40, 40) for _ in range(int(rng.uniform(0.4, 1.2) * SAMPLE_RATE)))
+    pcm = struct.pack(f"<{total}h", *samples[:total])
+    return AudioConverter.pcm_to_wav(pcm)
+
+
+async def to_ogg(wav: bytes) -> bytes:
+    """Encode like Telegram does (Opus in OGG); WAV if ffmpeg is missing."""
+    try:
+        return await AudioConverter.pipe(wav, ["-c:a", "libopus", "-b:a", "24k", "-f", "ogg"])
+    except RuntimeError:
+        return wav
+
+
+def stub_latency(audio: bytes) -> float:
+    # Duration from size: WAV is 32 kB/s, Opus at 24 kbit/s is 3 kB/s
+    seconds = len(audio) / (32000 if audio[:4] == b"RIFF" else 3000)
+    return BASE_SECONDS + PER_AUDIO_SECOND * seconds
+
+
+class AsyncStubTranscriber:
+    async def transcribe(self, audio, language=None, filename=None):
+        await asyncio.sleep(stub_latency(audio))
+        return "check the drive fault"
+
+
+class SyncStubTranscriber:
+    """Stand-in for the old WhisperTranscriber: sync client inside async def."""
+
+    async def transcribe(self, audio_path: Path, language=None):
+        audio = audio_path.read_bytes()
+        time.sleep(stub_latency(audio))
+        return "check the drive fault"
+
+
+class VoiceBenchmark:
+    """Voice pipeline performance benchmarking"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    async def legacy(self, note: bytes, duration: float) -> None:
+        transcriber = SyncStubTranscriber()
+        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
+            tmp.write(note)
+            path = Path(tmp.name)
+        try:
+            await transcriber.transcribe(path)
+        finally:
+            path.unlink(missing_ok=True)
+
+    async def run(self, label: str, notes: List[Tuple[bytes, float]], handler) -> Dict[str, Any]:
+        latencies: List[float] = []
+        lag: List[float] = []
+        stop = asyncio.Event()
+
+        async def heartbeat():
+            # How late the event loop wakes up: what every other chat feels
+            while not stop.is_set():
+                expected = time.perf_counter() + 0.005
+                await asyncio.sleep(0.005)
+                lag.append(max(0.0, time.perf_counter() - expected))
+
+        async def one(note: bytes, duration: float):
+            # All notes arrive together: latency counts from the burst
+            await handler(note, duration)
+            latencies.append(time.perf_counter() - start)
+
+        monitor = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        await asyncio.gather(*(one(note, duration) for note, duration in notes))
+        wall = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+        ordered = sorted(latencies)
+        row = {
+            "test": label,
+            "wall_s": wall,
+            "p50_ms": ordered[len(ordered) // 2] * 1000,
+            "p95_ms": ordered[int(len(ordered) * 0.95)] * 1000,
+            "max_loop_lag_ms": max(lag) * 1000 if lag else 0.0,
+        }
+        print(
+            f"  {label:<10} wall {wall:6.2f}s  p50 {row['p50_ms']:7.0f} ms  p95 {row['p95_ms']:7.0f} ms"
+            f"  max loop lag {row['max_loop_lag_ms']:6.0f} ms"
+        )
+        self.results.append(row)
+        return row
+
+    def print_summary(self):
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        for result in self.results:
+            print(f"\n{result['test'].upper()}:")
+            for key, value in result.items():
+                if key != "test":
+                    print(f"  {key}: {value:.2f}")
+
+
+async def run_benchmarks(count: int = 30):
+    """Run voice pipeline benchmarks"""
+    print("=" * 60)
+    print(f"VOICE PIPELINE BENCHMARKS ({count} notes)")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    notes = []
+    for _ in range(count):
+        # Most notes are short; one in five is a long walk-through
+        seconds = rng.uniform(90, 240) if rng.random() < 0.2 else rng.uniform(4, 20)
+        notes.append((await to_ogg(synthetic_note(seconds, rng)), seconds))
+    kind = "OGG/Opus" if notes[0][0][:4] == b"OggS" else "WAV (ffmpeg not installed)"
+    print(f"  audio: {kind}, {sum(d for _, d in notes):.0f}s total")
+
+    benchmark = VoiceBenchmark()
+    await benchmark.run("legacy", notes, benchmark.legacy)
+
+    pipeline = VoicePipeline(AsyncStubTranscriber(), max_concurrent=8)
+    await benchmark.run("pipeline", notes, lambda note, duration: pipeline.transcribe(note, duration=duration))
+    print(f"  pipeline metrics: {pipeline.metrics.to_dict()}")
+
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else 30))
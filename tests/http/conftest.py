@@ -0,0 +1,124 @@
+"""
+Local HTTP server fixture for fetch service tests.
+
+A real keep-alive (HTTP/1.1) server on 127.0.0.1 so tests exercise the
+actual httpx connection pool, conditional requests and streaming rather
+than mocks. The server records every request, the client port it came
+from (distinct ports = distinct connections) and peak concurrency.
+
+Routes:
+    /etag?v=N            ETag "vN", answers If-None-Match with 304
+    /last-modified       Last-Modified validator, answers If-Modified-Since with 304
+    /max-age?s=N         Cache-Control: max-age=N
+    /no-store            Cache-Control: no-store (plus an ETag)
+    /same?name=X         Identical body for any name (content-addressing)
+    /big?size=N          N bytes with Content-Length (ETag, honors If-None-Match)
+    /chunked?size=N      N bytes, chunked (no Content-Length)
+    /slow?delay=S        Sleeps S seconds before answering
+    /redirect?to=PATH    302 to PATH
+    /gzip                gzip-encoded body (Cache-Control: max-age=60)
+    /status/CODE         Empty response with that status
+"""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        with server.lock:
+            server.requests.append((parsed.path, dict(self.headers)))
+            server.client_ports.add(self.client_address[1])
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            self._route(parsed.path, query)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, body=b"", headers=None, chunked=False):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 8192):
+                piece = body[i:i + 8192]
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _route(self, path, query):
+        if path == "/etag":
+            etag = f'"v{query.get("v", "1")}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, headers={"ETag": etag})
+            return self._send(200, f"etag body {etag}".encode(), {"ETag": etag, "Content-Type": "text/plain"})
+        if path == "/last-modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                return self._send(304)
+            return self._send(200, b"last-modified body", {"Last-Modified": LAST_MODIFIED})
+        if path == "/max-age":
+            return self._send(200, b"fresh body", {"Cache-Control": f"max-age={query.get('s', '60')}"})
+        if path == "/no-store":
+            return self._send(200, b"secret", {"Cache-Control": "no-store", "ETag": '"x"'})
+        if path == "/same":
+            return self._send(200, b"identical manual bytes", {"ETag": '"same"'})
+        if path in ("/big", "/chunked"):
+            body = b"x" * int(query.get("size", "1024"))
+            etag = f'"{len(body)}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, headers={"ETag": etag})
+            return self._send(200, body, {"ETag": etag}, chunked=path == "/chunked")
+        if path == "/slow":
+            time.sleep(float(query.get("delay", "0.2")))
+            return self._send(200, b"slow")
+        if path == "/redirect":
+            return self._send(302, headers={"Location": query.get("to", "/etag")})
+        if path == "/gzip":
+            body = gzip.compress(b"decoded body " * 100)
+            return self._send(200, body, {"Content-Encoding": "gzip", "Cache-Control": "max-age=60"})
+        if path.startswith("/status/"):
+            return self._send(int(path.rsplit("/", 1)[1]))
+        return self._send(404)
+
+
+@pytest.fixture
+def local_http_server():
+    """Threaded keep-alive HTTP server; yields it with a .url(path) helper."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.client_ports = set()
+    server.in_flight = 0
+    server.peak_in_flight = 0
+    server.url = lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
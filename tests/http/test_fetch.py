@@ -0,0 +1,243 @@
+"""
+Tests for the shared fetch service (agent_factory/http/fetch.py).
+
+Runs against the local keep-alive server in conftest.py.
+
+Run with:
+    poetry run pytest tests/http/test_fetch.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_factory.http import (
+    ClientError,
+    FetchConfig,
+    FetchService,
+    ResponseTooLargeError,
+    ServerError,
+)
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    service = FetchService(FetchConfig(cache_dir=str(tmp_path / "cache"), per_host_limit=4))
+    yield service
+    service.close()
+
+
+def network_paths(server):
+    return [path for path, _ in server.requests]
+
+
+class TestConnectionReuse:
+
+    def test_sequential_requests_share_one_connection(self, fetcher, local_http_server):
+        for i in range(10):
+            fetcher.fetch_sync(local_http_server.url(f"/slow?delay=0&i={i}"), use_cache=False)
+
+        assert len(local_http_server.requests) == 10
+        assert len(local_http_server.client_ports) == 1
+
+
+class TestConditionalCache:
+
+    def test_etag_revalidation(self, fetcher, local_http_server):
+        url = local_http_server.url("/etag?v=1")
+        first = fetcher.fetch_sync(url)
+        second = fetcher.fetch_sync(url)
+
+        assert first.content == second.content == b'etag body "v1"'
+        assert not first.from_cache
+        assert second.from_cache and second.revalidated
+        assert second.status_code == 200
+        assert local_http_server.requests[1][1].get("If-None-Match") == '"v1"'
+
+    def test_last_modified_revalidation(self, fetcher, local_http_server):
+        url = local_http_server.url("/last-modified")
+        fetcher.fetch_sync(url)
+        second = fetcher.fetch_sync(url)
+
+        assert second.revalidated
+        assert second.content == b"last-modified body"
+        assert "If-Modified-Since" in local_http_server.requests[1][1]
+
+    def test_fresh_response_served_without_network(self, fetcher, local_http_server):
+        url = local_http_server.url("/max-age?s=60")
+        fetcher.fetch_sync(url)
+        second = fetcher.fetch_sync(url)
+
+        assert second.from_cache and not second.revalidated
+        assert len(local_http_server.requests) == 1
+
+    def test_no_store_is_not_cached(self, fetcher, local_http_server):
+        url = local_http_server.url("/no-store")
+        fetcher.fetch_sync(url)
+        second = fetcher.fetch_sync(url)
+
+        assert not second.from_cache
+        assert "If-None-Match" not in local_http_server.requests[1][1]
+
+    def test_identical_bodies_stored_once(self, fetcher, local_http_server):
+        a = fetcher.fetch_sync(local_http_server.url("/same?name=a"))
+        b = fetcher.fetch_sync(local_http_server.url("/same?name=b"))
+
+        assert a.sha256 == b.sha256
+        blobs = [p for p in (fetcher.cache.directory / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 1
+
+    def test_cached_redirect_keeps_final_url(self, fetcher, local_http_server):
+        url = local_http_server.url("/redirect?to=/max-age")
+        fetcher.fetch_sync(url)
+        second = fetcher.fetch_sync(url)
+
+        assert second.from_cache
+        assert second.redirected
+        assert second.url.endswith("/max-age")
+
+    def test_wire_encoding_headers_not_cached(self, fetcher, local_http_server):
+        url = local_http_server.url("/gzip")
+        first = fetcher.fetch_sync(url)
+        second = fetcher.fetch_sync(url)
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.from_cache
+        assert second.content == b"decoded body " * 100
+        assert "content-encoding" not in second.headers
+        assert "content-length" not in second.headers
+
+    def test_least_recently_used_bodies_evicted(self, tmp_path, local_http_server):
+        fetcher = FetchService(FetchConfig(cache_dir=str(tmp_path / "cache"), cache_max_bytes=1000))
+        try:
+            fetcher.fetch_sync(local_http_server.url("/big?size=600"))
+            fetcher.fetch_sync(local_http_server.url("/big?size=500"))
+            again = fetcher.fetch_sync(local_http_server.url("/big?size=600"))
+        finally:
+            fetcher.close()
+
+        assert not again.from_cache
+        assert "If-None-Match" not in local_http_server.requests[2][1]
+        assert fetcher.metrics.cache_evictions == 2
+        assert fetcher.cache.size == 600
+
+
+class TestSizeCaps:
+
+    def test_declared_length_over_cap(self, fetcher, local_http_server):
+        with pytest.raises(ResponseTooLargeError):
+            fetcher.fetch_sync(local_http_server.url("/big?size=5000"), max_bytes=1000)
+
+    def test_streamed_body_over_cap(self, fetcher, local_http_server, tmp_path):
+        dest = tmp_path / "out.bin"
+        with pytest.raises(ResponseTooLargeError):
+            fetcher.download_sync(local_http_server.url("/chunked?size=100000"), dest, max_bytes=50000)
+
+        assert not dest.exists()
+        assert list(fetcher.cache.tmp_dir.iterdir()) == []
+        assert fetcher.metrics.errors == 1
+
+
+class TestDownload:
+
+    def test_streams_to_disk_and_reuses_cache(self, fetcher, local_http_server, tmp_path):
+        url = local_http_server.url("/chunked?size=300000")
+        first = fetcher.download_sync(url, tmp_path / "a" / "manual.pdf")
+        second = fetcher.download_sync(url, tmp_path / "b" / "manual.pdf")
+
+        assert first.content is None
+        assert first.path.read_bytes() == b"x" * 300000
+        assert second.revalidated
+        assert second.path.read_bytes() == first.path.read_bytes()
+
+    def test_body_file_work_runs_off_the_event_loop(self, fetcher, local_http_server, tmp_path, monkeypatch):
+        import hashlib
+        import shutil
+
+        from agent_factory.http import fetch
+
+        on_loop = []
+        real_copyfile = shutil.copyfile
+
+        def copyfile(src, dst):
+            on_loop.append(asyncio._get_running_loop() is not None)
+            return real_copyfile(src, dst)
+
+        monkeypatch.setattr(fetch.shutil, "copyfile", copyfile)
+        size = 2 * fetch._WRITE_BATCH + 12345  # Several batched writes
+        url = local_http_server.url(f"/chunked?size={size}")
+
+        first = fetcher.download_sync(url, tmp_path / "a.pdf")
+        second = fetcher.download_sync(local_http_server.url(f"/chunked?size={size}"), tmp_path / "b.pdf")
+
+        assert first.sha256 == hashlib.sha256(b"x" * size).hexdigest()
+        assert (tmp_path / "b.pdf").read_bytes() == b"x" * size
+        assert second.from_cache or second.revalidated
+        assert on_loop and not any(on_loop)
+
+    def test_redirect_reports_final_url(self, fetcher, local_http_server):
+        result = fetcher.fetch_sync(local_http_server.url("/redirect?to=/max-age"))
+
+        assert result.redirected
+        assert result.url.endswith("/max-age")
+
+    def test_http_errors_map_to_client_errors(self, fetcher, local_http_server):
+        not_found = fetcher.fetch_sync(local_http_server.url("/status/404"))
+        assert not not_found.ok
+        with pytest.raises(ClientError):
+            not_found.raise_for_status()
+        with pytest.raises(ServerError):
+            fetcher.fetch_sync(local_http_server.url("/status/503")).raise_for_status()
+
+    def test_error_response_does_not_overwrite_dest(self, fetcher, local_http_server, tmp_path):
+        dest = tmp_path / "manual.pdf"
+        dest.write_bytes(b"%PDF previous download")
+        result = fetcher.download_sync(local_http_server.url("/status/404"), dest)
+
+        assert result.path is None
+        assert result.content == b""
+        assert dest.read_bytes() == b"%PDF previous download"
+
+
+class TestConcurrency:
+
+    def test_per_host_limit(self, tmp_path, local_http_server):
+        fetcher = FetchService(FetchConfig(cache_dir=None, per_host_limit=2))
+        try:
+            urls = [local_http_server.url(f"/slow?delay=0.1&i={i}") for i in range(8)]
+            start = time.perf_counter()
+            results = asyncio.run(fetcher.fetch_many(urls))
+            elapsed = time.perf_counter() - start
+        finally:
+            fetcher.close()
+
+        assert all(r.ok for r in results)
+        assert local_http_server.peak_in_flight == 2
+        assert elapsed >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_async_and_sync_from_running_loop(self, fetcher, local_http_server):
+        result = await fetcher.fetch(local_http_server.url("/max-age"))
+        assert result.ok
+
+        # Sync API from a worker thread while this loop is running
+        cached = await asyncio.to_thread(fetcher.fetch_sync, local_http_server.url("/max-age"))
+        assert cached.from_cache
+
+
+def test_metrics(fetcher, local_http_server):
+    url = local_http_server.url("/etag?v=2")
+    fetcher.fetch_sync(url)
+    fetcher.fetch_sync(url)
+    fetcher.fetch_sync(local_http_server.url("/max-age"))
+    fetcher.fetch_sync(local_http_server.url("/max-age"))
+
+    metrics = fetcher.metrics.to_dict()
+    assert metrics["requests"] == 4
+    assert metrics["network_requests"] == 3
+    assert metrics["cache_hits"] == 1
+    assert metrics["revalidated"] == 1
+    assert metrics["cache_hit_rate"] == 0.5
+    assert metrics["http_versions"] == {"HTTP/1.1": 3}
+    assert metrics["by_host"] == {"127.0.0.1": 3}
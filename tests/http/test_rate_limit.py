@@ -0,0 +1,63 @@
+"""
+Tests for token-bucket rate limiting (agent_factory/http/rate_limit.py).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_factory.http import HostRateLimiter, TokenBucket
+
+
+def test_burst_then_refill_rate():
+    bucket = TokenBucket(rate=20, capacity=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    start = time.perf_counter()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.perf_counter() - start >= 0.08
+
+
+def test_pause_blocks_until_expiry():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.pause(0.2)
+    assert not bucket.try_acquire()
+    assert bucket.acquire() >= 0.15
+
+
+def test_wait_time_does_not_take_tokens():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.wait_time() == 0
+    assert bucket.try_acquire() and bucket.try_acquire()
+
+    assert 0.05 < bucket.wait_time() <= 0.1
+    assert 0.05 < bucket.wait_time() <= 0.1
+    assert bucket.wait_time(2) > 0.15
+
+
+def test_set_rate_ignores_non_positive():
+    bucket = TokenBucket(rate=5)
+    bucket.set_rate(0)
+    assert bucket.rate == 5
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_host_limiter_per_host_buckets():
+    limiter = HostRateLimiter(default_rate=1, default_capacity=1)
+    limiter.configure("api.stackexchange.com", rate=50, capacity=2)
+    limiter.ensure("api.stackexchange.com", rate=1, capacity=1)  # Already configured: ignored
+
+    assert limiter.bucket("https://API.stackexchange.com/2.3/search").rate == 50
+    assert limiter.bucket("www.reddit.com") is limiter.bucket("https://www.reddit.com/r/PLC")
+    assert limiter.bucket("www.reddit.com").rate == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_queues_callers():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.perf_counter()
+    await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+    assert time.perf_counter() - start >= 0.09
@@ -0,0 +1,261 @@
+"""Tests for the long-lived Atlas client against a local mock Atlas server.
+
+These tests cover:
+- Single-flight sign-in for concurrent first requests and concurrent 401s
+- Proactive background refresh inside the refresh buffer
+- Process-wide token sharing and the shared client lifecycle
+- Batch work order and asset helpers
+"""
+
+import asyncio
+import itertools
+import json
+import time
+
+import httpx
+import pytest
+
+from agent_factory.integrations.atlas import client as atlas_client
+from agent_factory.integrations.atlas.client import (
+    AtlasClient,
+    AtlasTokenCache,
+    get_atlas_client,
+    get_token_cache,
+    shutdown_atlas_client,
+)
+from agent_factory.integrations.atlas.config import atlas_config
+from agent_factory.integrations.atlas.exceptions import (
+    AtlasNotFoundError,
+    AtlasValidationError,
+)
+
+BASE_URL = "http://atlas.test/api"
+
+
+class MockAtlas:
+    """In-process Atlas API: sign-in, work orders and assets."""
+
+    def __init__(self, latency: float = 0.01):
+        self.latency = latency
+        self.signins = 0
+        self.reject_signin = False
+        self.valid_tokens = set()
+        self.work_orders = {}
+        self.assets = {f"asset-{i}": {"id": f"asset-{i}", "name": f"Pump {i}"} for i in range(5)}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._ids = itertools.count(1)
+
+    def revoke_all(self):
+        self.valid_tokens.clear()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path[len("/api"):]
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if path == "/auth/signin":
+                if self.reject_signin:
+                    return httpx.Response(401)
+                self.signins += 1
+                token = f"jwt-{self.signins}"
+                self.valid_tokens.add(token)
+                return httpx.Response(200, json={"token": token})
+
+            auth = request.headers.get("Authorization", "")
+            if auth.removeprefix("Bearer ") not in self.valid_tokens:
+                return httpx.Response(401)
+
+            body = json.loads(request.content) if request.content else {}
+            if path == "/work-orders" and request.method == "POST":
+                if not body.get("title"):
+                    return httpx.Response(400, json={"errors": {"title": "Title is required"}})
+                work_order = {"id": f"wo-{next(self._ids)}", **body}
+                self.work_orders[work_order["id"]] = work_order
+                return httpx.Response(200, json=work_order)
+            if path.startswith("/work-orders/"):
+                work_order = self.work_orders.get(path.rsplit("/", 1)[1])
+                if work_order is None:
+                    return httpx.Response(404)
+                work_order.update(body)
+                return httpx.Response(200, json=work_order)
+            if path.startswith("/assets/"):
+                asset = self.assets.get(path.rsplit("/", 1)[1])
+                return httpx.Response(200, json=asset) if asset else httpx.Response(404)
+            return httpx.Response(404)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def atlas():
+    return MockAtlas()
+
+
+def make_client(atlas, **kwargs):
+    return AtlasClient(
+        base_url=BASE_URL,
+        email="admin@example.com",
+        password="admin",
+        transport=httpx.MockTransport(atlas.handler),
+        **kwargs
+    )
+
+
+# ==========================================================================
+# Token refresh
+# ==========================================================================
+
+@pytest.mark.asyncio
+async def test_concurrent_first_requests_sign_in_once(atlas):
+    async with make_client(atlas) as client:
+        await client.create_work_order({"title": "Seed"})
+        atlas.signins = 0
+        await client._token_cache.clear()
+
+        results = await asyncio.gather(*(client.get_work_order("wo-1") for _ in range(20)))
+
+    assert all(r["id"] == "wo-1" for r in results)
+    assert atlas.signins == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401s_share_one_reauth(atlas):
+    async with make_client(atlas) as client:
+        await client.create_work_order({"title": "Seed"})
+        atlas.revoke_all()
+
+        results = await asyncio.gather(*(client.get_work_order("wo-1") for _ in range(20)))
+
+    assert len(results) == 20
+    assert atlas.signins == 2
+    assert client._token_cache.refreshes == 2
+
+
+@pytest.mark.asyncio
+async def test_token_in_refresh_buffer_is_refreshed_in_background(atlas):
+    async with make_client(atlas) as client:
+        await client.create_work_order({"title": "Seed"})
+        # Still valid, but inside the refresh buffer
+        client._token_cache._expires_at = time.monotonic() + atlas_config.atlas_token_refresh_buffer / 2
+
+        await asyncio.gather(*(client.get_work_order("wo-1") for _ in range(10)))
+        await client._refresh_task
+
+        assert atlas.signins == 2
+        assert client._token_cache.peek() == ("jwt-2", False)
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_keeps_current_token(atlas):
+    async with make_client(atlas) as client:
+        await client.create_work_order({"title": "Seed"})
+        client._token_cache._expires_at = time.monotonic() + atlas_config.atlas_token_refresh_buffer / 2
+        atlas.reject_signin = True
+
+        assert (await client.get_work_order("wo-1"))["id"] == "wo-1"
+        await client._refresh_task
+
+        assert client._token_cache.peek()[0] == "jwt-1"
+
+
+def test_nearly_expired_token_is_not_used():
+    cache = AtlasTokenCache()
+    cache._token = "jwt"
+    cache._expires_at = time.monotonic() + 1
+
+    assert cache.peek() == (None, True)
+
+
+# ==========================================================================
+# Sharing and lifecycle
+# ==========================================================================
+
+@pytest.mark.asyncio
+async def test_clients_sharing_token_cache_sign_in_once(atlas):
+    cache = get_token_cache(BASE_URL + "/", "Admin@Example.com")
+    assert cache is get_token_cache(BASE_URL, "admin@example.com")
+    await cache.clear()
+
+    async with make_client(atlas, token_cache=cache) as first, make_client(atlas, token_cache=cache) as second:
+        await asyncio.gather(
+            first.create_work_order({"title": "A"}),
+            second.create_work_order({"title": "B"}),
+        )
+
+    assert atlas.signins == 1
+
+
+@pytest.mark.asyncio
+async def test_client_opens_lazily_and_keeps_pool(atlas):
+    client = make_client(atlas)
+    assert not client.is_open
+
+    await client.create_work_order({"title": "A"})
+    pool = client._client
+    await client.get_work_order("wo-1")
+
+    assert client._client is pool
+    await client.aclose()
+    assert not client.is_open
+
+
+@pytest.mark.asyncio
+async def test_shared_client_lifecycle(monkeypatch):
+    monkeypatch.setattr(atlas_client, "_shared_client", None)
+
+    shared = get_atlas_client()
+    assert get_atlas_client() is shared
+    assert shared._token_cache is get_token_cache(atlas_config.atlas_base_url, atlas_config.atlas_email)
+
+    await shared.open()
+    await shutdown_atlas_client()
+    assert not shared.is_open
+    assert get_atlas_client() is not shared
+    await shutdown_atlas_client()
+
+
+# ==========================================================================
+# Batch helpers
+# ==========================================================================
+
+@pytest.mark.asyncio
+async def test_batch_create_reports_per_item_errors(atlas):
+    async with make_client(atlas) as client:
+        batch = await client.create_work_orders(
+            [{"title": "Fix pump"}, {"description": "no title"}, {"title": "Check motor"}]
+        )
+
+    assert not batch.ok
+    assert batch.succeeded == 2
+    assert [r and r["title"] for r in batch.results] == ["Fix pump", None, "Check motor"]
+    assert isinstance(batch.errors[1], AtlasValidationError)
+    assert batch.to_dict()["errors"][1]["type"] == "AtlasValidationError"
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_concurrency_limit(atlas):
+    async with make_client(atlas) as client:
+        created = await client.create_work_orders([{"title": f"WO {i}"} for i in range(12)])
+        atlas.peak_in_flight = 0
+
+        updated = await client.update_work_orders(
+            {wo["id"]: {"status": "IN_PROGRESS"} for wo in created.results},
+            max_concurrency=3
+        )
+
+    assert updated.ok
+    assert all(wo["status"] == "IN_PROGRESS" for wo in updated.results)
+    assert atlas.peak_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_get_assets_and_work_orders(atlas):
+    async with make_client(atlas) as client:
+        assets = await client.get_assets(["asset-0", "asset-missing", "asset-4"])
+        work_orders = await client.get_work_orders([])
+
+    assert [a and a["name"] for a in assets.results] == ["Pump 0", None, "Pump 4"]
+    assert isinstance(assets.errors[1], AtlasNotFoundError)
+    assert work_orders.ok and work_orders.results == []
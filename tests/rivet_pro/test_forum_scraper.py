@@ -0,0 +1,236 @@
+"""
+Tests for forum scraper fan-out, batching, rate limiting and caching.
+
+Uses recorded API responses from tests/fixtures/forum_scraper/ served by a
+fake requests session (no network).
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from agent_factory.http.rate_limit import HostRateLimiter
+from agent_factory.rivet_pro.research.forum_scraper import (
+    ForumScraper,
+    RedditScraper,
+    StackOverflowScraper,
+    normalize_query,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "forum_scraper"
+
+
+def load_fixture(name):
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+
+
+class FakeSession:
+    """Replays fixtures by URL substring; records calls and peak concurrency."""
+
+    def __init__(self, routes, delay=0.0, headers=None, errors=None):
+        self.routes = routes
+        self.errors = errors or {}  # URL fragment -> HTTP status
+        self.delay = delay
+        self.response_headers = headers or {}
+        self.headers = {}
+        self.calls = []
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak_in_flight = 0
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.calls.append((url, params))
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            time.sleep(self.delay)
+            for fragment, status in self.errors.items():
+                if fragment in url:
+                    return FakeResponse({}, status_code=status)
+            for fragment, fixture in self.routes.items():
+                if fragment in url:
+                    return FakeResponse(load_fixture(fixture), headers=self.response_headers)
+            return FakeResponse({"items": [], "data": {"children": []}})
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+SO_ROUTES = {"/search/advanced": "stackexchange_search.json", "/answers/": "stackexchange_answers.json"}
+REDDIT_ROUTES = {
+    "/r/PLC/search.json": "reddit_search_plc.json",
+    "/r/automation/search.json": "reddit_search_automation.json",
+    "/comments/": "reddit_comments.json",
+}
+
+
+@pytest.fixture
+def limiter():
+    return HostRateLimiter(default_rate=1000, default_capacity=1000)
+
+
+class TestStackOverflowBatching:
+
+    def test_accepted_answers_fetched_in_one_call(self, limiter):
+        session = FakeSession(SO_ROUTES)
+        scraper = StackOverflowScraper(session=session, limiter=limiter)
+        limiter.configure(scraper.HOST, rate=1000, capacity=1000)
+
+        results = scraper.search("S7-1200 ethernet")
+
+        assert len(session.calls) == 2
+        assert session.calls[1][0].endswith("/answers/61234571;58811207")
+        assert len(results) == 3  # Unanswered question dropped
+        assert "Disable LLDP on the managed switch port" in results[0].content
+        assert "Assign IP address" in results[1].content
+        assert "[No accepted answer]" in results[2].content
+
+    def test_backoff_field_pauses_host(self, limiter):
+        scraper = StackOverflowScraper(session=FakeSession(SO_ROUTES), limiter=limiter)
+        scraper.search("S7-1200 ethernet")
+
+        assert 1.0 < limiter.bucket(scraper.HOST).paused_for <= 2.0
+
+
+class TestRedditRateHeaders:
+
+    def test_exhausted_quota_pauses_host(self, limiter):
+        session = FakeSession(REDDIT_ROUTES, headers={"X-Ratelimit-Remaining": "0.0", "X-Ratelimit-Reset": "30"})
+        scraper = RedditScraper(session=session, limiter=limiter)
+        scraper._search_posts("PLC", "ethernet", 2)
+
+        assert limiter.bucket(scraper.HOST).paused_for > 25
+
+    def test_remaining_quota_spread_over_window(self, limiter):
+        session = FakeSession(REDDIT_ROUTES, headers={"X-Ratelimit-Remaining": "50", "X-Ratelimit-Reset": "100"})
+        scraper = RedditScraper(session=session, limiter=limiter)
+        scraper._search_posts("PLC", "ethernet", 2)
+
+        assert limiter.bucket(scraper.HOST).rate == 0.5
+
+    def test_comments_only_fetched_for_returned_posts(self, limiter):
+        session = FakeSession(REDDIT_ROUTES)
+        scraper = RedditScraper(session=session, limiter=limiter)
+
+        results = scraper.search("ethernet", subreddits=["PLC", "automation"], limit=2)
+
+        assert [r.metadata["score"] for r in results] == [48, 22]
+        comment_calls = [url for url, _ in session.calls if "/comments/" in url]
+        assert len(comment_calls) == 2
+        assert "EDS wizard" in results[0].content
+
+
+class TestForumScraper:
+
+    def make_scraper(self, limiter, delay=0.0, so_errors=None, reddit_errors=None):
+        so_session = FakeSession(SO_ROUTES, delay=delay, errors=so_errors)
+        reddit_session = FakeSession(REDDIT_ROUTES, delay=delay, errors=reddit_errors)
+        scraper = ForumScraper(
+            stackoverflow=StackOverflowScraper(max_retries=1, session=so_session, limiter=limiter),
+            reddit=RedditScraper(max_retries=1, session=reddit_session, limiter=limiter),
+        )
+        return scraper, so_session, reddit_session
+
+    def test_sources_queried_concurrently(self, limiter):
+        scraper, so_session, reddit_session = self.make_scraper(limiter, delay=0.1)
+        scraper.stackoverflow.limiter.configure(StackOverflowScraper.HOST, rate=1000, capacity=1000)
+        scraper.reddit.limiter.configure(RedditScraper.HOST, rate=1000, capacity=1000)
+
+        start = time.perf_counter()
+        results = scraper.search_all("ethernet", reddit_subreddits=["PLC", "automation"])
+        elapsed = time.perf_counter() - start
+
+        # Sequential would be 2 SO + 2 Reddit searches + 2 comments = 0.6s
+        assert elapsed < 0.45
+        assert reddit_session.peak_in_flight >= 2
+        assert {r.source_type for r in results} == {"stackoverflow", "reddit"}
+
+    def test_normalized_query_served_from_cache(self, limiter):
+        scraper, so_session, reddit_session = self.make_scraper(limiter)
+        first = scraper.search_all("S7-1200  Ethernet?", reddit_subreddits=["PLC"])
+        calls = len(so_session.calls) + len(reddit_session.calls)
+
+        second = scraper.search_all("s7-1200 ethernet", reddit_subreddits=["PLC"])
+
+        assert len(so_session.calls) + len(reddit_session.calls) == calls
+        assert [r.url for r in second] == [r.url for r in first]
+        assert scraper.cache.hits == 1
+
+    def test_failed_source_not_cached(self, limiter):
+        scraper, so_session, _ = self.make_scraper(limiter, so_errors={"/search/advanced": 503})
+
+        first = scraper.search_all("ethernet", reddit_subreddits=["PLC"])
+        scraper.search_all("ethernet", reddit_subreddits=["PLC"])
+
+        assert {r.source_type for r in first} == {"reddit"}  # Partial answer still returned
+        assert scraper.cache.hits == 0
+        assert len(so_session.calls) == 2
+
+    def test_failed_subreddit_not_cached(self, limiter):
+        scraper, _, reddit_session = self.make_scraper(limiter, reddit_errors={"/r/automation/": 500})
+
+        scraper.search_all("ethernet", reddit_subreddits=["PLC", "automation"])
+        scraper.search_all("ethernet", reddit_subreddits=["PLC", "automation"])
+
+        assert scraper.cache.hits == 0
+
+    def test_failed_answer_batch_not_cached(self, limiter):
+        scraper, _, _ = self.make_scraper(limiter, so_errors={"/answers/": 502})
+
+        results = scraper.search_all("ethernet", reddit_subreddits=["PLC"])
+        scraper.search_all("ethernet", reddit_subreddits=["PLC"])
+
+        assert any("[Answer unavailable]" in r.content for r in results)
+        assert scraper.cache.hits == 0
+
+
+class TestSearchErrors:
+
+    def test_stackoverflow_reports_failure(self, limiter):
+        scraper = StackOverflowScraper(
+            max_retries=1, session=FakeSession(SO_ROUTES, errors={"/search/advanced": 503}), limiter=limiter
+        )
+        errors = []
+
+        assert scraper.search("ethernet", errors=errors) == []
+        assert len(errors) == 1 and errors[0].startswith("search:")
+
+    def test_reddit_reports_failed_comment_fetch(self, limiter):
+        session = FakeSession(REDDIT_ROUTES, errors={"/comments/": 500})
+        scraper = RedditScraper(max_retries=1, session=session, limiter=limiter)
+        errors = []
+
+        results = scraper.search("ethernet", subreddits=["PLC"], limit=1, errors=errors)
+
+        assert len(results) == 1
+        assert "[No comments]" in results[0].content
+        assert errors and errors[0].startswith("comments")
+
+    def test_successful_search_reports_nothing(self, limiter):
+        scraper = RedditScraper(session=FakeSession(REDDIT_ROUTES), limiter=limiter)
+        errors = []
+        scraper.search("ethernet", subreddits=["PLC"], errors=errors)
+        assert errors == []
+
+
+def test_normalize_query():
+    assert normalize_query("  Siemens S7-1200: PROFINET   drops?! ") == "siemens s7-1200 profinet drops"
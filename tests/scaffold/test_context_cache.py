@@ -0,0 +1,168 @@
+"""Tests for SCAFFOLD context caching
+
+Covers ContextCache keying (HEAD + index signature), incremental tree
+updates from git diff, CLAUDE.md memoization, and ContextAssembler stats.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agent_factory.scaffold.context_assembler import ContextAssembler
+from agent_factory.scaffold.context_cache import (
+    ContextCache,
+    apply_name_status,
+    render_tree,
+)
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a temporary git repository with a small tree."""
+    repo = tmp_path / "cached-repo"
+    repo.mkdir()
+    git(repo, "init")
+    git(repo, "config", "user.email", "test@example.com")
+    git(repo, "config", "user.name", "Test User")
+
+    (repo / "CLAUDE.md").write_text("# Prompt\n\nBe careful.\n")
+    (repo / "README.md").write_text("# Repo")
+    (repo / "src" / "pkg" / "deep").mkdir(parents=True)
+    (repo / "src" / "main.py").write_text("print('hi')")
+    (repo / "src" / "pkg" / "mod.py").write_text("")
+    (repo / "src" / "pkg" / "deep" / "a.py").write_text("")
+    (repo / "src" / "pkg" / "deep" / "b.py").write_text("")
+    git(repo, "add", ".")
+    git(repo, "commit", "-m", "Initial commit")
+    return repo
+
+
+class TestRenderTree:
+    """Test in-process tree rendering."""
+
+    def test_depth_folds_deeper_files(self):
+        tree = render_tree("repo", ["a.py", "src/x/y/z.py", "src/x/y/w.py", "src/b.py"], max_depth=2)
+
+        assert tree.startswith("```\nrepo/") and tree.endswith("```")
+        assert "    x/ (2 files)" in tree
+        assert "z.py" not in tree
+        assert tree.index("src/") < tree.index("a.py")  # Directories first
+
+    def test_ignore_names_and_globs(self):
+        tree = render_tree(
+            "repo",
+            ["node_modules/x.js", "pkg/__pycache__/m.pyc", "dist.log", "keep.py"],
+            ignore=frozenset({"node_modules", "__pycache__", "*.log"}),
+        )
+
+        assert "keep.py" in tree
+        assert "node_modules" not in tree and "pyc" not in tree and "dist.log" not in tree
+
+    def test_line_cap(self):
+        tree = render_tree("repo", [f"f{i}.py" for i in range(50)], max_lines=10)
+
+        assert tree.endswith("... (truncated)\n```")
+
+
+def test_apply_name_status():
+    paths = {"a.py", "old.py", "gone.py"}
+    diff = "M\0a.py\0R100\0old.py\0new.py\0D\0gone.py\0A\0added.py\0C075\0a.py\0copy.py\0"
+
+    assert apply_name_status(paths, diff) == 5
+    assert paths == {"a.py", "new.py", "added.py", "copy.py"}
+
+
+class TestContextCache:
+    """Test caching against a real git repository."""
+
+    def test_second_snapshot_is_a_hit(self, git_repo):
+        cache = ContextCache(git_repo)
+
+        first = cache.snapshot(max_depth=3)
+        second = cache.snapshot(max_depth=3)
+
+        assert first.misses == ["tree", "commits"]
+        assert second.hits == ["tree", "commits"]
+        assert second.file_tree == first.file_tree
+        assert "Initial commit" in second.git_history
+        assert "deep/ (2 files)" in second.file_tree
+        assert cache.metrics.tree_full_scans == 1
+
+    def test_new_commit_updates_tree_incrementally(self, git_repo):
+        cache = ContextCache(git_repo)
+        cache.snapshot()
+
+        git(git_repo, "mv", "src/main.py", "src/app.py")
+        git(git_repo, "rm", "-q", "README.md")
+        (git_repo / "docs").mkdir()
+        (git_repo / "docs" / "guide.md").write_text("guide")
+        git(git_repo, "add", ".")
+        git(git_repo, "commit", "-m", "Reshuffle")
+
+        snapshot = cache.snapshot()
+
+        assert snapshot.misses == ["tree_incremental", "commits"]
+        assert cache.metrics.tree_incremental == 1 and cache.metrics.tree_full_scans == 1
+        assert "app.py" in snapshot.file_tree and "guide.md" in snapshot.file_tree
+        assert "main.py" not in snapshot.file_tree and "README.md" not in snapshot.file_tree
+        assert "Reshuffle" in snapshot.git_history
+        assert snapshot.file_tree == ContextCache(git_repo).snapshot().file_tree
+
+    def test_staged_change_invalidates_tree(self, git_repo):
+        cache = ContextCache(git_repo)
+        cache.snapshot()
+
+        (git_repo / "staged.py").write_text("")
+        git(git_repo, "add", "staged.py")
+
+        snapshot = cache.snapshot()
+        assert "staged.py" in snapshot.file_tree
+        assert snapshot.hits == ["commits"]
+
+    def test_outside_git_returns_none(self, tmp_path):
+        assert ContextCache(tmp_path).snapshot() is None
+
+    def test_claude_md_reparsed_only_on_change(self, git_repo):
+        cache = ContextCache(git_repo)
+        path = git_repo / "CLAUDE.md"
+        parses = []
+
+        def parse(text):
+            parses.append(text)
+            return text.upper()
+
+        assert cache.claude_md(path, parse) == ("# PROMPT\n\nBE CAREFUL.\n", False)
+        assert cache.claude_md(path, parse)[1] is True
+
+        path.write_text("# Prompt\n\nBe very careful.\n")
+        assert cache.claude_md(path, parse) == ("# PROMPT\n\nBE VERY CAREFUL.\n", False)
+        assert len(parses) == 2
+        assert cache.claude_md(git_repo / "missing.md", parse) == (None, False)
+
+
+class TestAssemblerWithCache:
+    """ContextAssembler reports per-task cache use."""
+
+    def test_assembler_reuses_snapshot_across_tasks(self, git_repo):
+        cache = ContextCache(git_repo)
+
+        first = ContextAssembler(git_repo, cache=cache)
+        first.assemble_context({"id": "task-1", "title": "One"}, "/tmp/wt1")
+        second = ContextAssembler(git_repo, cache=cache)
+        context = second.assemble_context({"id": "task-2", "title": "Two"}, "/tmp/wt2")
+
+        assert first.last_stats["misses"] == ["tree", "commits"]
+        assert second.last_stats["task_id"] == "task-2"
+        assert second.last_stats["hits"] == ["tree", "commits"]
+        assert second.last_stats["elapsed_ms"] >= 0
+        assert "Be careful." in context and "main.py" in context
+        assert cache.metrics.claude_md_hits == 1
+        assert cache.metrics.to_dict()["assemblies"] == 2
+
+    def test_default_cache_is_shared(self, git_repo):
+        assert ContextAssembler(git_repo).cache is ContextAssembler(Path(str(git_repo))).cache
@@ -0,0 +1,276 @@
+"""Tests for SCAFFOLD parallel execution
+
+Covers ParallelTaskRunner scheduling, WorktreePool recycling, thread-safe
+SessionManager state, and the orchestrator running a batch in parallel.
+"""
+
+import json
+import subprocess
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from agent_factory.scaffold import (
+    ParallelTaskRunner,
+    SlotLimits,
+    WorktreeExistsError,
+    WorktreeLimitError,
+    WorktreeManager,
+    WorktreePool,
+)
+
+
+@pytest.fixture
+def temp_repo(tmp_path):
+    """Create a temporary git repository for testing."""
+    repo_dir = tmp_path / "test-repo"
+    repo_dir.mkdir()
+
+    for cmd in (
+        ["git", "init"],
+        ["git", "config", "user.email", "test@example.com"],
+        ["git", "config", "user.name", "Test User"],
+    ):
+        subprocess.run(cmd, cwd=repo_dir, check=True, capture_output=True)
+
+    (repo_dir / "README.md").write_text("# Test Repo")
+    (repo_dir / ".gitignore").write_text(".venv/\n.scaffold/\n")
+    subprocess.run(["git", "add", "."], cwd=repo_dir, check=True, capture_output=True)
+    subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=repo_dir, check=True, capture_output=True)
+
+    return repo_dir
+
+
+class SleepyExecutor:
+    """Records start/end times and concurrency; fails chosen tasks."""
+
+    def __init__(self, duration=0.1, fail=()):
+        self.duration = duration
+        self.fail = set(fail)
+        self.started = []
+        self.finished = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, task):
+        with self._lock:
+            self.started.append(task["id"])
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.duration)
+        with self._lock:
+            self.in_flight -= 1
+            self.finished.append(task["id"])
+        return task["id"] not in self.fail
+
+
+def tasks(*specs):
+    """Task dicts from (id, [dependencies]) pairs."""
+    return [{"id": task_id, "title": task_id, "dependencies": deps} for task_id, deps in specs]
+
+
+class TestParallelTaskRunner:
+    """Test slot scheduling."""
+
+    def test_independent_tasks_fill_all_slots(self):
+        executor = SleepyExecutor(duration=0.1)
+        runner = ParallelTaskRunner(executor, max_concurrent=3)
+
+        report = runner.run(tasks(*[(f"task-{i}", []) for i in range(6)]))
+
+        assert len(report.completed) == 6
+        assert executor.peak == 3
+        assert report.peak_concurrency == 3
+        assert report.wall_sec < 0.35  # Two waves of 0.1s, not six
+
+    def test_failed_task_does_not_stop_batch(self):
+        executor = SleepyExecutor(duration=0.01, fail={"api"})
+        runner = ParallelTaskRunner(executor, max_concurrent=2)
+
+        report = runner.run(tasks(("api", []), ("ui", []), ("docs", [])))
+
+        assert report.failed == ["api"]
+        assert sorted(report.completed) == ["docs", "ui"]
+        assert executor.started == ["api", "ui", "docs"]  # Priority order
+
+    def test_safety_limit_stops_new_dispatches(self):
+        executor = SleepyExecutor(duration=0.05)
+        checks = iter([(True, None), (True, None), (False, "Cost limit exceeded")])
+        runner = ParallelTaskRunner(executor, max_concurrent=2, can_continue=lambda: next(checks))
+
+        report = runner.run(tasks(*[(f"task-{i}", []) for i in range(5)]))
+
+        assert len(report.completed) == 2
+        assert report.stopped_reason == "Cost limit exceeded"
+        assert len(report.skipped) == 3
+
+    def test_executor_exception_counts_as_failure(self):
+        def boom(task):
+            raise RuntimeError("worktree vanished")
+
+        report = ParallelTaskRunner(boom, max_concurrent=2).run(tasks(("a", [])))
+
+        assert report.failed == ["a"]
+
+
+class TestWorktreePool:
+    """Test worktree recycling with a real git repository."""
+
+    def test_slot_recycled_between_tasks(self, temp_repo):
+        pool = WorktreePool(temp_repo, size=1)
+
+        first = pool.acquire("task-1")
+        Path(first, "scratch.txt").write_text("leftover")
+        Path(first, ".venv").mkdir()
+        Path(first, ".venv", "cache").write_text("expensive")
+        pool.release("task-1")
+
+        second = pool.acquire("task-2")
+
+        assert second == first
+        assert pool.created == 1 and pool.reused == 1
+        assert not Path(second, "scratch.txt").exists()  # Untracked file scrubbed
+        assert Path(second, ".venv", "cache").exists()  # Ignored cache kept
+        branch = subprocess.run(["git", "branch", "--show-current"], cwd=second, capture_output=True, text=True)
+        assert branch.stdout.strip() == "autonomous/task-2"
+        pool.release("task-2")
+
+    def test_branch_deleted_on_release(self, temp_repo):
+        pool = WorktreePool(temp_repo, size=1)
+        pool.acquire("task-1")
+        pool.release("task-1")
+
+        branches = subprocess.run(["git", "branch"], cwd=temp_repo, capture_output=True, text=True).stdout
+        assert "autonomous/task-1" not in branches
+
+    def test_pool_limit_and_duplicates(self, temp_repo):
+        pool = WorktreePool(temp_repo, size=2)
+        pool.acquire("task-1")
+
+        with pytest.raises(WorktreeExistsError):
+            pool.acquire("task-1")
+
+        pool.acquire("task-2")
+        with pytest.raises(WorktreeLimitError):
+            pool.acquire("task-3")
+
+        assert set(pool.in_use()) == {"task-1", "task-2"}
+
+    def test_existing_branch_is_not_reset(self, temp_repo):
+        subprocess.run(["git", "branch", "autonomous/task-1"], cwd=temp_repo, check=True, capture_output=True)
+        pool = WorktreePool(temp_repo, size=1)
+
+        with pytest.raises(WorktreeExistsError):
+            pool.acquire("task-1")
+        assert pool.in_use() == {}
+
+        pool.acquire("task-2")
+        pool.release("task-2", delete_branch=False)
+        with pytest.raises(WorktreeExistsError):
+            pool.acquire("task-2")  # Recycled slot: checkout -b refuses too
+
+    def test_busy_slots_recorded_in_worktrees_json(self, temp_repo):
+        metadata_path = temp_repo / ".scaffold" / "worktrees.json"
+        metadata_path.parent.mkdir()
+        metadata_path.write_text(json.dumps({
+            "stale": {"task_id": "stale", "worktree_path": str(temp_repo.parent / "agent-factory-slot-0"),
+                      "branch_name": "autonomous/stale", "created_at": "", "creator": "scaffold-pool",
+                      "status": "active"},
+        }))
+        pool = WorktreePool(temp_repo, size=1)
+
+        path = pool.acquire("task-1")
+        saved = json.loads(metadata_path.read_text())
+        assert list(saved) == ["task-1"]
+        assert saved["task-1"]["worktree_path"] == path
+        assert saved["task-1"]["branch_name"] == "autonomous/task-1"
+        assert WorktreeManager(temp_repo).get_worktree("task-1").creator == "scaffold-pool"
+
+        pool.release("task-1")
+        assert json.loads(metadata_path.read_text()) == {}
+
+    def test_concurrent_acquire_release(self, temp_repo):
+        pool = WorktreePool(temp_repo, size=3)
+        errors = []
+
+        def worker(i):
+            try:
+                path = pool.acquire(f"task-{i}")
+                Path(path, f"out-{i}.txt").write_text(str(i))
+                pool.release(f"task-{i}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert pool.created == 3
+        assert pool.in_use() == {}
+
+
+def test_slot_limits_noop_without_limits():
+    assert SlotLimits(timeout_sec=60).apply(pid=0) is True
+
+
+class TestParallelSession:
+    """SessionManager and orchestrator under concurrent slots."""
+
+    def test_session_state_consistent_under_threads(self, temp_repo):
+        from agent_factory.scaffold.session_manager import SessionManager
+
+        manager = SessionManager(repo_root=temp_repo)
+        session_id = manager.start_session(max_tasks=40)
+
+        def worker(i):
+            manager.record_task_success(f"task-{i}", cost=0.01, duration_sec=1.0)
+            manager.mark_task_finished(f"task-{i}", success=i % 4 != 0)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        saved = json.loads((temp_repo / ".scaffold" / "sessions" / f"{session_id}.json").read_text())
+        assert len(saved["tasks_completed"]) == 30
+        assert len(saved["tasks_failed"]) == 10
+        assert saved["total_duration_sec"] == pytest.approx(40.0)
+
+    def test_orchestrator_runs_batch_in_parallel(self, temp_repo):
+        from agent_factory.scaffold.orchestrator import ScaffoldOrchestrator
+
+        orch = ScaffoldOrchestrator(repo_root=temp_repo, max_tasks=6, max_concurrent=3, max_cost=100)
+        orch.task_fetcher = Mock()
+        orch.task_fetcher.fetch_eligible_tasks.return_value = tasks(*[(f"task-{i}", []) for i in range(6)])
+        orch.result_processor = Mock()
+        orch.result_processor.process_success.return_value = None
+
+        calls = []
+
+        def execute(task, worktree_path, timeout_sec=1800, limits=None):
+            calls.append((task["id"], worktree_path, timeout_sec))
+            time.sleep(0.2)
+            return {"success": True, "output": "", "cost": 0.0, "duration_sec": 0.2, "files_changed": []}
+
+        handler = Mock()
+        handler.execute.side_effect = execute
+        orch.router = Mock()
+        orch.router.route.return_value = "claude-code"
+        orch.router.get_handler.return_value = handler
+
+        summary = orch.run()
+
+        assert summary["tasks_completed"] == 6
+        assert summary["peak_concurrency"] == 3
+        assert summary["wall_sec"] < 1.0  # ~2 waves of 0.2s plus git, not 1.2s+
+        assert len({path for _, path, _ in calls}) == 3  # Three recycled slots
+        assert all(timeout == 1800 for _, _, timeout in calls)
+        assert summary["tasks_in_progress"] == 0
@@ -0,0 +1,204 @@
+"""
+Tests for the BM25 manual chunk index (bm25_index.py).
+
+Run with:
+    poetry run pytest tests/test_bm25_index.py -v
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_factory.knowledge.bm25_index import BM25Index, tokenize
+from agent_factory.knowledge.manual_search import ManualSearchService
+
+
+def build_index(path=None):
+    """Three manuals with distinct fault-code vocabularies."""
+    index = BM25Index(path=path)
+    index.register_manual("pf525", title="PowerFlex 525", manufacturer="Allen-Bradley", component_family="VFD")
+    index.add_chunks("pf525", [
+        {"text": "Fault F0002 auxiliary input. Check wiring of the aux input.", "chunk_index": 0,
+         "section_type": "troubleshooting"},
+        {"text": "Installation and mounting clearances for the drive.", "chunk_index": 1,
+         "section_type": "installation"},
+    ])
+    index.register_manual("clx", title="ControlLogix", manufacturer="Allen-Bradley", component_family="PLC")
+    index.add_chunks("clx", [
+        {"text": "The 1756-L83E controller supports 300 nodes.", "chunk_index": 0},
+        {"text": "Major fault E-123 indicates a watchdog timeout.", "chunk_index": 1},
+    ])
+    index.register_manual("g120", title="Sinamics G120", manufacturer="Siemens", component_family="VFD")
+    index.add_chunks("g120", [
+        {"text": "Fault F30002 DC link overvoltage. Extend ramp-down time.", "chunk_index": 0},
+    ])
+    return index
+
+
+class TestTokenize:
+    """Part-number and fault-code aware tokenization."""
+
+    def test_part_numbers_keep_compound_and_parts(self):
+        terms = tokenize("Replace 1756-L83E now")
+        assert "1756-l83e" in terms
+        assert "1756l83e" in terms
+        assert "1756" in terms and "l83e" in terms
+
+    def test_fault_codes_unpadded_variant(self):
+        assert "f2" in tokenize("F0002")
+        assert "e123" in tokenize("E-123")
+
+    def test_stopwords_and_punctuation_dropped(self):
+        assert tokenize("Check the wiring.") == ["check", "wiring"]
+
+
+class TestBM25Search:
+    """Ranking, filters and grouping."""
+
+    def test_fault_code_ranks_matching_chunk_first(self):
+        hits = build_index().search("F0002")
+        assert hits[0].manual_id == "pf525"
+        assert hits[0].section_type == "troubleshooting"
+
+    def test_code_variants_match(self):
+        index = build_index()
+        assert index.search("F2")[0].manual_id == "pf525"
+        assert index.search("E123")[0].manual_id == "clx"
+        assert index.search("1756L83E")[0].manual_id == "clx"
+
+    def test_scores_descend_and_top_k(self):
+        hits = build_index().search("fault", top_k=2)
+        assert len(hits) == 2
+        assert hits[0].score >= hits[1].score
+
+    def test_filters(self):
+        index = build_index()
+        hits = index.search("fault", manufacturer="siemens")
+        assert [h.manual_id for h in hits] == ["g120"]
+        assert index.search("fault", component_family="PLC")[0].manual_id == "clx"
+        assert index.search("fault", manufacturer="Nobody") == []
+
+    def test_group_by_manual(self):
+        index = build_index()
+        index.add_chunk("pf525", {"text": "fault history parameter", "chunk_index": 2})
+        hits = index.search("fault", top_k=10, group_by_manual=True)
+        assert sorted(h.manual_id for h in hits) == ["clx", "g120", "pf525"]
+
+    def test_remove_manual(self):
+        index = build_index()
+        assert index.remove_manual("pf525")
+        assert all(h.manual_id != "pf525" for h in index.search("fault", top_k=10))
+        assert len(index) == 3
+        assert not index.remove_manual("pf525")
+
+    def test_empty_query(self):
+        assert build_index().search("the") == []
+
+
+class TestPersistence:
+    """Round trip through the mmap file format."""
+
+    def test_save_and_load(self, tmp_path):
+        index = build_index()
+        path = index.save(tmp_path / "manuals.bm25")
+
+        loaded = BM25Index.load(path)
+        assert len(loaded) == len(index)
+        for query in ("F0002", "1756-L83E", "overvoltage"):
+            expected = [(h.manual_id, h.chunk_index, round(h.score, 9)) for h in index.search(query)]
+            actual = [(h.manual_id, h.chunk_index, round(h.score, 9)) for h in loaded.search(query)]
+            assert actual == expected
+        assert loaded.search("F0002")[0].text.startswith("Fault F0002")
+        loaded.close()
+
+    def test_incremental_add_after_load_and_compaction(self, tmp_path):
+        path = build_index(tmp_path / "manuals.bm25").save()
+        index = BM25Index.load(path)
+
+        index.add_chunk("pf525", {"text": "Fault F0005 open loop", "chunk_index": 3})
+        index.register_manual("new", title="New", manufacturer="ABB", component_family="VFD")
+        index.add_chunk("new", {"text": "Fault F0005 open loop on ACS880", "chunk_index": 0})
+        index.remove_manual("g120")
+        index.save()
+
+        reloaded = BM25Index.load(path)
+        assert len(reloaded) == 6
+        assert "g120" not in reloaded
+        assert {h.manual_id for h in reloaded.search("F0005", top_k=5)} == {"pf525", "new"}
+        assert reloaded.search("ACS880")[0].manual["manufacturer"] == "ABB"
+
+    def test_load_missing_file_is_empty(self, tmp_path):
+        index = BM25Index.load(tmp_path / "missing.bm25")
+        assert len(index) == 0
+        assert index.path == tmp_path / "missing.bm25"
+
+    def test_rejects_foreign_file(self, tmp_path):
+        bad = tmp_path / "bad.bm25"
+        bad.write_bytes(b"not an index at all, just bytes")
+        with pytest.raises(ValueError):
+            BM25Index.load(bad)
+
+
+def test_search_service_ranks_by_relevance():
+    """ManualSearchService returns the most relevant manual with a chunk snippet."""
+    db = MagicMock()
+    db.search_manuals.return_value = [{"id": "g120"}, {"id": "pf525"}, {"id": "clx"}]
+    service = ManualSearchService(vector_store=MagicMock(), db=db, search_index=build_index())
+
+    results = service.search("fault F30002")
+
+    assert results[0]["manual_id"] == "g120"
+    assert results[0]["title"] == "Sinamics G120"
+    assert "F30002" in results[0]["snippet"]
+    assert results[0]["score"] > results[-1]["score"]
+
+
+def test_search_service_keeps_manuals_missing_from_index():
+    """Manuals ingested before the index existed are listed after ranked hits."""
+    db = MagicMock()
+    db.search_manuals.return_value = [
+        {"id": "g120"},
+        {"id": "old-1", "title": "Legacy Catalog", "manufacturer": "ABB", "component_family": "VFD"},
+        {"id": "old-2", "title": "Legacy Fault Guide", "manufacturer": "ABB", "component_family": "VFD"},
+    ]
+    service = ManualSearchService(vector_store=MagicMock(), db=db, search_index=build_index())
+
+    results = service.search("fault F30002", top_k=10)
+    ids = [r["manual_id"] for r in results]
+
+    assert ids[0] == "g120"
+    assert ids[-2:] == ["old-2", "old-1"]  # Title match first
+    assert len(ids) == len(set(ids))
+    assert len(service.search("fault F30002", top_k=1)) == 1
+
+
+def test_search_service_falls_back_when_index_empty():
+    db = MagicMock()
+    db.search_manuals.return_value = [
+        {"id": "m1", "title": "Manual", "manufacturer": "ABB", "component_family": "VFD"}
+    ]
+    service = ManualSearchService(vector_store=MagicMock(), db=db, search_index=BM25Index())
+
+    results = service.search("anything")
+
+    assert results[0]["manual_id"] == "m1"
+
+
+def test_pure_python_scoring_matches_numpy(monkeypatch):
+    """The fallback path (numpy not installed) ranks identically."""
+    import agent_factory.knowledge.bm25_index as bm25_module
+
+    index = build_index()
+    index.remove_manual("clx")
+    queries = [("fault", False), ("fault", True), ("F0002 wiring", False)]
+    expected = [
+        [(h.manual_id, h.chunk_index, round(h.score, 9)) for h in index.search(q, top_k=3, group_by_manual=g)]
+        for q, g in queries
+    ]
+
+    monkeypatch.setattr(bm25_module, "np", None)
+    actual = [
+        [(h.manual_id, h.chunk_index, round(h.score, 9)) for h in index.search(q, top_k=3, group_by_manual=g)]
+        for q, g in queries
+    ]
+    assert actual == expected
@@ -12,8 +12,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import threading
+import time
+from datetime import datetime
+
 import pytest
-from agent_factory.core.callbacks import EventBus, Event, EventType
+from agent_factory.core.callbacks import DispatchPolicy, EventBus, Event, EventType
 
 
 class TestEventBus:
@@ -21,7 +25,7 @@ class TestEventBus:
 
     def test_emit_and_on(self):
         """Test basic emit and listener registration (REQ-CB-004, REQ-CB-005)"""
-        bus = EventBus()
+        bus = EventBus(sync=True)
         received_events = []
 
         def listener(event: Event):
@@ -64,7 +68,7 @@ class TestEventBus:
 
     def test_multiple_listeners(self):
         """Test multiple listeners for same event (REQ-CB-005)"""
-        bus = EventBus()
+        bus = EventBus(sync=True)
         listener1_count = []
         listener2_count = []
 
@@ -83,7 +87,7 @@ class TestEventBus:
 
     def test_listener_error_isolation(self):
         """Test that listener errors don't affect other listeners (REQ-CB-008)"""
-        bus = EventBus()
+        bus = EventBus(sync=True)
         successful_calls = []
 
         def failing_listener(event: Event):
@@ -141,6 +145,172 @@ class TestEventBus:
         assert history[0].data["count"] == 1
 
 
+class TestAsyncDispatch:
+    """Test non-blocking dispatch, backpressure policies and indexed history"""
+
+    def test_emit_does_not_wait_for_slow_listener(self):
+        """Async emit returns before a slow listener finishes"""
+        bus = EventBus()
+        release = threading.Event()
+        received = []
+
+        def slow_listener(event: Event):
+            release.wait(timeout=5)
+            received.append(event)
+
+        bus.on(EventType.AGENT_END, slow_listener)
+
+        start = time.perf_counter()
+        for _ in range(10):
+            bus.emit(EventType.AGENT_END, {"output": "ok"})
+        assert time.perf_counter() - start < 0.5
+        assert received == []
+
+        release.set()
+        bus.flush()
+        assert len(received) == 10
+        bus.close()
+
+    def test_drop_newest_counts_drops(self):
+        """Full queue with DROP_NEWEST discards new events and counts them"""
+        bus = EventBus(queue_size=2, policy=DispatchPolicy.DROP_NEWEST)
+        release = threading.Event()
+        received = []
+
+        def listener(event: Event):
+            release.wait(timeout=5)
+            received.append(event.data["n"])
+
+        bus.on(EventType.TOOL_CALL, listener)
+        for n in range(10):
+            bus.emit(EventType.TOOL_CALL, {"n": n})
+
+        release.set()
+        bus.flush()
+        stats = bus.get_stats()[0]
+        assert stats.dropped > 0
+        assert stats.delivered + stats.dropped == 10
+        assert received == sorted(received)
+        bus.close()
+
+    def test_drop_oldest_keeps_latest(self):
+        """DROP_OLDEST evicts queued events so the newest is delivered"""
+        bus = EventBus(queue_size=2)
+        release = threading.Event()
+        received = []
+
+        def listener(event: Event):
+            release.wait(timeout=5)
+            received.append(event.data["n"])
+
+        bus.on(EventType.TOOL_CALL, listener, policy=DispatchPolicy.DROP_OLDEST)
+        for n in range(10):
+            bus.emit(EventType.TOOL_CALL, {"n": n})
+
+        release.set()
+        bus.flush()
+        assert received[-1] == 9
+        assert bus.get_stats()[0].dropped > 0
+        bus.close()
+
+    def test_listener_errors_counted(self):
+        """Errors in async listeners are isolated and counted"""
+        bus = EventBus()
+
+        def failing_listener(event: Event):
+            raise ValueError("Test error")
+
+        bus.on(EventType.ERROR, failing_listener)
+        bus.emit(EventType.ERROR, {"error": "x"})
+        bus.flush()
+
+        assert bus.get_stats()[0].errors == 1
+        bus.close()
+
+    def test_off_stops_worker(self):
+        """Removing the last registration releases the listener worker"""
+        bus = EventBus()
+
+        def listener(event: Event):
+            pass
+
+        bus.on(EventType.AGENT_START, listener)
+        bus.on(EventType.AGENT_END, listener)
+        assert len(bus.get_stats()) == 1
+
+        bus.off(EventType.AGENT_START, listener)
+        assert len(bus.get_stats()) == 1
+        bus.off(EventType.AGENT_END, listener)
+        assert bus.get_stats() == []
+
+    def test_history_ring_buffer_evicts_oldest(self):
+        """History keeps only the last max_history events"""
+        bus = EventBus(max_history=5)
+        for n in range(12):
+            bus.emit(EventType.TOOL_CALL, {"n": n})
+
+        history = bus.get_history()
+        assert [e.data["n"] for e in history] == [7, 8, 9, 10, 11]
+
+    def test_indexed_history_respects_eviction(self):
+        """Type and agent indexes never return events evicted from the ring"""
+        bus = EventBus(max_history=4)
+        bus.emit(EventType.ERROR, {"n": 0}, agent_name="research")
+        for n in range(1, 6):
+            bus.emit(EventType.TOOL_CALL, {"n": n}, agent_name="coding")
+
+        assert bus.get_history(event_type=EventType.ERROR) == []
+        assert bus.get_history(agent_name="research") == []
+        assert len(bus.get_history(agent_name="coding")) == 4
+
+    def test_history_indexes_bounded_by_max_history(self):
+        """Evicted events leave the type/agent indexes; empty buckets are removed"""
+        bus = EventBus(max_history=10)
+        for n in range(1000):
+            bus.emit(EventType.TOOL_CALL, {"n": n}, agent_name=f"agent-{n}")
+
+        assert len(bus._by_agent) == 10
+        assert sum(len(b) for b in bus._by_type.values()) == 10
+        assert [e.data["n"] for e in bus.get_history(agent_name="agent-995")] == [995]
+        assert bus.get_history(agent_name="agent-0") == []
+
+    def test_drop_oldest_never_drops_stop_sentinel(self):
+        """A full DROP_OLDEST queue drops new events rather than the stop sentinel"""
+        bus = EventBus(queue_size=2)
+        release = threading.Event()
+
+        def listener(event: Event):
+            release.wait(timeout=5)
+
+        bus.on(EventType.TOOL_CALL, listener, policy=DispatchPolicy.DROP_OLDEST)
+        worker = bus._workers[listener]
+        bus.emit(EventType.TOOL_CALL, {"n": 0})
+        time.sleep(0.05)  # Worker is now blocked on event 0
+        bus.emit(EventType.TOOL_CALL, {"n": 1})
+        bus.off(EventType.TOOL_CALL, listener)  # Queues the stop sentinel
+
+        worker.submit(Event(EventType.TOOL_CALL, datetime.utcnow(), {"n": 2}))  # Drops event 1
+        assert worker.submit(Event(EventType.TOOL_CALL, datetime.utcnow(), {"n": 3})) is False
+
+        release.set()
+        worker._thread.join(timeout=5)
+        assert not worker._thread.is_alive()
+
+    def test_history_combined_filters_and_limit(self):
+        """Type + agent filters combine and limit returns the newest matches"""
+        bus = EventBus()
+        for n in range(20):
+            agent = "research" if n % 2 == 0 else "coding"
+            event_type = EventType.AGENT_START if n % 3 == 0 else EventType.AGENT_END
+            bus.emit(event_type, {"n": n}, agent_name=agent)
+
+        events = bus.get_history(
+            event_type=EventType.AGENT_START, agent_name="research", limit=2
+        )
+        assert [e.data["n"] for e in events] == [12, 18]
+        assert bus.get_history(limit=0) == []
+
+
 class TestEvent:
     """Test Event dataclass (REQ-CB-004)"""
 
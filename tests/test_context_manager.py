@@ -0,0 +1,195 @@
+"""
+Tests for ContextManager window fitting, TokenCounter and RollingSummary.
+
+Run with:
+    poetry run pytest tests/test_context_manager.py -v
+"""
+
+import pytest
+
+from agent_factory.memory import ContextManager, MessageHistory, RollingSummary, TokenCounter
+from agent_factory.memory.history import Message
+
+
+def _naive_fit(messages, counter, budget):
+    """Reference implementation: walk backwards until the budget is exceeded."""
+    kept = []
+    used = 0
+    for message in reversed(messages):
+        tokens = counter(message)
+        if used + tokens > budget:
+            break
+        kept.append(message)
+        used += tokens
+    return list(reversed(kept))
+
+
+class TestTokenCounter:
+    """Test TokenCounter heuristic and caching."""
+
+    def test_part_numbers_not_undercounted(self):
+        """Part numbers and fault codes count more than len // 4."""
+        counter = TokenCounter(use_tokenizer=False)
+        text = "F0002 E-123 1756-L83E"
+        assert counter.count_text(text) > len(text) // 4
+
+    def test_message_count_cached(self):
+        """Second count of the same message is a cache hit."""
+        counter = TokenCounter(use_tokenizer=False)
+        message = Message(role="user", content="Motor overload on conveyor 3")
+        first = counter.count_message(message)
+        second = counter.count_message(message)
+        assert first == second
+        assert counter.misses == 1
+        assert counter.hits == 1
+
+    def test_cache_bounded(self):
+        """Cache evicts least recently used entries past max_cache_size."""
+        counter = TokenCounter(use_tokenizer=False, max_cache_size=2)
+        for i in range(5):
+            counter.count_message(Message(role="user", content=f"message {i}"))
+        assert len(counter._cache) == 2
+
+    def test_truncate_text_fits(self):
+        """Truncated text counts at most max_tokens."""
+        counter = TokenCounter(use_tokenizer=False)
+        text = "word " * 200
+        truncated = counter.truncate_text(text, 20)
+        assert counter.count_text(truncated) <= 20
+        assert text.startswith(truncated)
+
+
+class TestFitToWindow:
+    """Test ContextManager.fit_to_window."""
+
+    def test_matches_naive_backwards_walk(self):
+        """Binary search picks the same window as the backwards walk."""
+        counter = TokenCounter(use_tokenizer=False)
+        history = MessageHistory()
+        for i in range(200):
+            role = "user" if i % 2 == 0 else "assistant"
+            history.add_message(role, f"turn {i} " + "x" * (i % 37))
+
+        for max_tokens in (0, 5, 50, 333, 1000, 100_000):
+            manager = ContextManager(max_tokens=max_tokens, token_counter=counter)
+            expected = _naive_fit(history.get_messages(), counter, max_tokens)
+            assert manager.fit_to_window(history) == expected
+
+    def test_preserves_system_messages_first(self):
+        """System messages come first and count against the budget."""
+        history = MessageHistory()
+        history.add_message("system", "You are a maintenance assistant.")
+        for i in range(50):
+            history.add_message("user", f"question {i}")
+
+        manager = ContextManager(max_tokens=60)
+        result = manager.fit_to_window(history)
+
+        assert result[0].role == "system"
+        assert manager.count_tokens(result) <= 60
+        assert result[-1].content == "question 49"
+
+    def test_reserve_tokens(self):
+        """Reserved tokens shrink the window."""
+        history = MessageHistory()
+        for i in range(50):
+            history.add_message("user", f"question {i}")
+
+        manager = ContextManager(max_tokens=200)
+        full = manager.fit_to_window(history)
+        reserved = manager.fit_to_window(history, reserve_tokens=100)
+        assert len(reserved) < len(full)
+        assert manager.count_tokens(reserved) <= 100
+
+    def test_empty_history(self):
+        """Empty history returns empty list."""
+        manager = ContextManager()
+        assert manager.fit_to_window(MessageHistory()) == []
+
+
+class TestRollingSummary:
+    """Test incremental summary of evicted turns."""
+
+    def test_no_summary_when_everything_fits(self):
+        """No summary message is added until something is evicted."""
+        history = MessageHistory()
+        history.add_message("user", "hello")
+        summary = RollingSummary()
+
+        result = ContextManager(max_tokens=1000).fit_to_window(history, summary=summary)
+
+        assert len(result) == 1
+        assert summary.text == ""
+
+    def test_summarizer_only_sees_new_evictions(self):
+        """Each call folds only messages evicted since the previous call."""
+        calls = []
+
+        def summarizer(previous, evicted):
+            calls.append([m.content for m in evicted])
+            return (previous + " " + " ".join(m.content for m in evicted)).strip()
+
+        manager = ContextManager(
+            max_tokens=120, summarizer=summarizer, summary_max_tokens=60
+        )
+        history = MessageHistory()
+        summary = RollingSummary()
+
+        for i in range(60):
+            history.add_message("user", f"m{i}")
+            manager.fit_to_window(history, summary=summary)
+
+        folded = [content for batch in calls for content in batch]
+        assert folded == [f"m{i}" for i in range(len(folded))]
+        assert summary.covered == len(folded)
+
+        result = manager.fit_to_window(history, summary=summary)
+        assert result[0].metadata == {"summary": True}
+        assert manager.count_tokens(result) <= 120
+
+    def test_default_summary_counts_roles(self):
+        """Default summarizer keeps running role counts."""
+        history = MessageHistory()
+        for i in range(30):
+            history.add_message("user", f"question {i}")
+            history.add_message("assistant", f"answer {i}")
+
+        summary = RollingSummary()
+        result = ContextManager(max_tokens=100, summary_max_tokens=30).fit_to_window(
+            history, summary=summary
+        )
+
+        assert summary.user_count + summary.assistant_count == summary.covered
+        assert "user messages" in result[0].content
+
+    def test_summary_resets_after_clear(self):
+        """Clearing history resets the summary state."""
+        history = MessageHistory()
+        for i in range(30):
+            history.add_message("user", f"question {i}")
+        summary = RollingSummary()
+        manager = ContextManager(max_tokens=60, summary_max_tokens=30)
+        manager.fit_to_window(history, summary=summary)
+        assert summary.covered > 0
+
+        history.clear()
+        manager.fit_to_window(history, summary=summary)
+        assert summary.covered == 0
+        assert summary.text == ""
+
+
+@pytest.mark.slow
+def test_fit_10k_messages_is_fast():
+    """Fitting a 10k-message session stays well under a second once counts are cached."""
+    import time
+
+    history = MessageHistory()
+    for i in range(10_000):
+        history.add_message("user" if i % 2 == 0 else "assistant", f"turn {i} " * 10)
+
+    manager = ContextManager(max_tokens=8000)
+    manager.fit_to_window(history)  # warm the token cache
+
+    start = time.perf_counter()
+    manager.fit_to_window(history)
+    assert time.perf_counter() - start < 1.0
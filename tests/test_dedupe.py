@@ -0,0 +1,145 @@
+"""
+Tests for LSH duplicate detection (plc/utils/dedupe.py) and the
+DuplicateDetectorAgent that uses it.
+
+Run with:
+    poetry run pytest tests/test_dedupe.py -v
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from plc.agents.product_engineering.duplicate_detector_agent import DuplicateDetectorAgent
+from plc.utils.dedupe import ACTION_MERGE, ACTION_REVIEW, DedupeEngine
+
+WORDS = (
+    "motor start stop seal contactor overload timer counter latch unlatch scan "
+    "cycle input output analog digital relay sensor valve pump conveyor alarm"
+).split()
+
+
+def synthetic_library(n, dim=32, seed=0):
+    """Random atoms plus one near-duplicate (merge) and one related pair (review)."""
+    rng = np.random.default_rng(seed)
+    texts = [" ".join(rng.choice(WORDS, 20)) for _ in range(n)]
+    embeddings = rng.standard_normal((n, dim)).astype(np.float32)
+    ids = [f"plc:generic:atom-{i}" for i in range(n)]
+
+    # Near-duplicate of atom 0: same text plus punctuation, cosine ~0.99
+    ids.append("plc:generic:dup-0")
+    texts.append(texts[0] + ".")
+    embeddings = np.vstack([embeddings, embeddings[0] + 0.1 * rng.standard_normal(dim)])
+
+    # Related to atom 1: cosine ~0.92 (review band)
+    ids.append("plc:generic:related-1")
+    texts.append(texts[1])
+    noise = rng.standard_normal(dim)
+    noise -= noise @ embeddings[1] / (embeddings[1] @ embeddings[1]) * embeddings[1]
+    related = embeddings[1] + noise / np.linalg.norm(noise) * np.linalg.norm(embeddings[1]) * 0.42
+    embeddings = np.vstack([embeddings, related])
+    return ids, texts, embeddings
+
+
+class TestDedupeEngine:
+    """Candidate generation and classification."""
+
+    def test_finds_merge_and_review_pairs(self):
+        ids, texts, embeddings = synthetic_library(500)
+        pairs = DedupeEngine().find_duplicates(ids, texts, embeddings)
+
+        by_pair = {(p.id_1, p.id_2): p for p in pairs}
+        merge = by_pair[("plc:generic:atom-0", "plc:generic:dup-0")]
+        review = by_pair[("plc:generic:atom-1", "plc:generic:related-1")]
+        assert merge.action == ACTION_MERGE and merge.similarity >= 0.95
+        assert review.action == ACTION_REVIEW and 0.90 <= review.similarity < 0.95
+        assert len(pairs) == 2
+
+    def test_text_only_uses_minhash_similarity(self):
+        texts = ["Motor start stop seal-in circuit", "Motor start/stop seal in circuit", "Scan cycle basics"]
+        pairs = DedupeEngine().find_duplicates(["a", "b", "c"], texts)
+
+        assert [(p.id_1, p.id_2) for p in pairs] == [("a", "b")]
+        assert pairs[0].cosine is None
+        assert pairs[0].similarity == pairs[0].text_similarity
+
+    def test_candidates_are_sparse(self):
+        ids, texts, embeddings = synthetic_library(2000)
+        engine = DedupeEngine()
+        unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        candidates = engine.embedding_candidates(unit)
+        assert len(candidates) < len(ids) * 16  # O(n), vs ~2M pairs brute force
+        assert np.all(candidates[:, 0] < candidates[:, 1])
+
+    def test_oversized_bucket_is_star_linked(self):
+        engine = DedupeEngine(max_bucket_size=10)
+        pairs = engine._bucket_pairs(np.zeros(100, dtype=np.int64))
+        assert len(pairs) == 99
+
+    def test_empty_texts_are_not_text_duplicates(self):
+        texts = ["", "   ", "--", "Scan cycle basics"]
+        assert DedupeEngine().find_duplicates(["a", "b", "c", "d"], texts) == []
+
+        embeddings = np.array([[1.0, 0.0], [1.0, 0.001], [0.0, 1.0], [-1.0, 0.0]])
+        pairs = DedupeEngine().find_duplicates(["a", "b", "c", "d"], texts, embeddings)
+        assert [(p.id_1, p.id_2) for p in pairs] == [("a", "b")]
+        assert pairs[0].text_similarity == 0.0
+
+    def test_small_inputs(self):
+        assert DedupeEngine().find_duplicates(["a"], ["text"]) == []
+        with pytest.raises(ValueError):
+            DedupeEngine(num_perm=100, bands=16)
+
+
+class TestDuplicateDetectorAgent:
+    """Agent wiring: thresholds, comparison and quality scoring."""
+
+    def make_agent(self):
+        ids, texts, embeddings = synthetic_library(200)
+        atoms = [
+            {"@id": atom_id, "schema:name": text[:20], "schema:description": text[20:],
+             "embedding": vector.tolist()}
+            for atom_id, text, vector in zip(ids, texts, embeddings, strict=True)
+        ]
+        atoms[0]["schema:provider"] = {"plc:sourceTier": "manufacturer_official"}
+        atoms[0]["plc:status"] = "tested_on_hardware"
+        agent = DuplicateDetectorAgent({})
+        agent.load_atoms(atoms)
+        return agent
+
+    def test_find_duplicates_respects_threshold(self):
+        agent = self.make_agent()
+        assert [p[:2] for p in agent.find_duplicates()] == [("plc:generic:atom-0", "plc:generic:dup-0")]
+        assert len(agent.find_duplicates(similarity_threshold=0.90)) == 2
+
+    def test_compare_atoms_prefers_higher_quality(self):
+        result = self.make_agent().compare_atoms("plc:generic:atom-0", "plc:generic:dup-0")
+        assert result["is_duplicate"]
+        assert result["text_similarity"] > 0.95
+        assert result["better_atom"] == "plc:generic:atom-0"
+        assert result["quality_scores"]["plc:generic:atom-0"] == 50
+
+    def test_calculate_quality_score(self):
+        atom = {
+            "schema:provider": {"plc:sourceTier": "manufacturer_official"},
+            "plc:status": "certified",
+            "plc:codeExample": {"code": "..."},
+            "plc:safetyRequirements": ["NC stop"],
+            "plc:learningObjectives": ["seal-in"],
+            "plc:prerequisiteAtoms": ["plc:generic:io-basics"],
+        }
+        assert DuplicateDetectorAgent({}).calculate_quality_score(atom) == 85
+
+    def test_nightly_run_reports_candidates_without_merging(self):
+        agent = self.make_agent()
+        summary = agent.run_nightly_deduplication()
+
+        assert summary["duplicates_detected"] == 2
+        assert [(c["keep"], c["drop"]) for c in summary["merge_candidates"]] == [
+            ("plc:generic:atom-0", "plc:generic:dup-0")
+        ]
+        assert [(c["atom_id_1"], c["atom_id_2"]) for c in summary["review_candidates"]] == [
+            ("plc:generic:atom-1", "plc:generic:related-1")
+        ]
+        assert len(agent.atoms) == 202
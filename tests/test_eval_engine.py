@@ -0,0 +1,276 @@
+"""
+Tests for the async evaluation engine (phoenix_integration/evals/eval_engine.py)
+
+Runs entirely offline against StubBackend.
+
+Run with:
+    poetry run pytest tests/test_eval_engine.py -v
+"""
+
+import threading
+
+import pytest
+
+from phoenix_integration.evals.eval_engine import (
+    AgentBackend,
+    EvalEngine,
+    ResultCache,
+    StreamingSummary,
+    StubBackend,
+    load_checkpoint,
+    merge_results,
+    shard_cases,
+)
+from phoenix_integration.evals.judges import EVAL_CONFIG
+
+
+def make_cases(n):
+    return [
+        {
+            "test_case_id": f"case_{i:03d}",
+            "equipment": {"manufacturer": "Siemens", "model": f"S7-{1200 + i}"},
+            "input": {"fault_code": f"F{i:02d}", "fault_description": "Overcurrent"},
+            "expected_output": {"root_cause": "Load", "safety_critical_warnings": ["LOTO"]},
+        }
+        for i in range(n)
+    ]
+
+
+def make_engine(cache_dir=None, latency=0.0, eval_config=None, concurrency=None):
+    return EvalEngine(
+        agent_backend=StubBackend(provider="groq", model="agent", latency=latency),
+        judge_backend=StubBackend(provider="openai", model="judge", latency=latency),
+        cache=ResultCache(cache_dir) if cache_dir else None,
+        eval_config=eval_config,
+        concurrency=concurrency,
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_evaluates_every_judge():
+    engine = make_engine()
+
+    report = await engine.run(make_cases(3))
+
+    assert [r["case_id"] for r in report.results] == ["case_000", "case_001", "case_002"]
+    assert set(report.results[0]["evals"]) == set(EVAL_CONFIG)
+    assert report.results[0]["evals"]["safety_compliance"]["label"] == "SAFE"
+    assert report.model_calls == 3 * (1 + len(EVAL_CONFIG))
+    assert report.summary["gate_passed"] is True
+
+
+@pytest.mark.asyncio
+async def test_per_provider_concurrency_limit():
+    engine = make_engine(latency=0.01, concurrency={"groq": 2, "openai": 3})
+
+    await engine.run(make_cases(10))
+
+    assert engine.agent_backend.peak_in_flight == 2
+    assert engine.judge_backend.peak_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_skips_all_calls_on_rerun(tmp_path):
+    cases = make_cases(4)
+    await make_engine(tmp_path / "cache").run(cases)
+
+    engine = make_engine(tmp_path / "cache")
+    report = await engine.run(cases)
+
+    assert report.model_calls == 0
+    assert all(v["cached"] for r in report.results for v in r["evals"].values())
+
+
+@pytest.mark.asyncio
+async def test_changed_template_reruns_only_that_judge(tmp_path):
+    cases = make_cases(4)
+    await make_engine(tmp_path / "cache").run(cases)
+
+    config = {name: dict(cfg) for name, cfg in EVAL_CONFIG.items()}
+    config["safety_compliance"]["template"] += "\nBe strict about arc flash PPE.\n"
+    engine = make_engine(tmp_path / "cache", eval_config=config)
+    report = await engine.run(cases)
+
+    assert engine.agent_backend.calls == 0
+    assert engine.judge_backend.calls == len(cases)
+    assert not report.results[0]["evals"]["safety_compliance"]["cached"]
+    assert report.results[0]["evals"]["technical_accuracy"]["cached"]
+
+
+@pytest.mark.asyncio
+async def test_resume_from_checkpoint(tmp_path):
+    cases = make_cases(5)
+    results_path = str(tmp_path / "results.jsonl")
+    first = await make_engine().run(cases[:2], results_path=results_path)
+    with open(results_path, "a") as f:
+        f.write('{"case_id": "case_004", "ev')  # Torn write from a crash
+
+    engine = make_engine()
+    report = await engine.run(cases, results_path=results_path)
+
+    assert report.resumed == 2 and report.evaluated == 3
+    assert engine.agent_backend.calls == 3
+    assert report.results[:2] == first.results
+    assert report.summary["total_cases"] == 5
+    assert len(load_checkpoint(results_path)) == 5
+
+
+@pytest.mark.asyncio
+async def test_no_resume_starts_over(tmp_path):
+    results_path = str(tmp_path / "results.jsonl")
+    await make_engine().run(make_cases(2), results_path=results_path)
+
+    report = await make_engine().run(make_cases(2), results_path=results_path, resume=False)
+
+    assert report.evaluated == 2
+    assert len(open(results_path).readlines()) == 2
+
+
+def test_shards_partition_dataset():
+    cases = make_cases(40)
+    shards = [shard_cases(cases, i, 3) for i in range(3)]
+
+    ids = [c["test_case_id"] for shard in shards for c in shard]
+    assert sorted(ids) == [c["test_case_id"] for c in cases]
+    assert all(shards)
+    # Stable under reordering
+    assert shard_cases(list(reversed(cases)), 1, 3) == list(reversed(shards[1]))
+    with pytest.raises(ValueError):
+        shard_cases(cases, 3, 3)
+
+
+@pytest.mark.asyncio
+async def test_sharded_runs_merge_to_full_result(tmp_path):
+    cases = make_cases(12)
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"shard{i}.jsonl")
+        await make_engine().run(shard_cases(cases, i, 3), results_path=path)
+        paths.append(path)
+
+    merged = merge_results(paths)
+
+    assert sorted(r["case_id"] for r in merged) == [c["test_case_id"] for c in cases]
+
+
+def test_streaming_summary_counts_and_gate():
+    summary = StreamingSummary()
+    passing = {name: {"label": cfg["rails"][0]} for name, cfg in EVAL_CONFIG.items()}
+    summary.add({"evals": passing})
+    summary.add({"evals": {**passing, "safety_compliance": {"label": "UNSAFE"}}})
+
+    result = summary.to_dict()
+
+    assert result["total_cases"] == 2
+    assert result["by_eval"]["safety_compliance"]["counts"] == {"SAFE": 1, "UNSAFE": 1}
+    assert result["by_eval"]["safety_compliance"]["pass_rate"] == 0.5
+    assert result["gate_passed"] is False
+    assert StreamingSummary().to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_recorded_not_cached(tmp_path):
+    class FlakyJudge(StubBackend):
+        async def complete(self, prompt, **kwargs):
+            if "SAFETY_COMPLIANCE" in prompt or "safety engineer" in prompt:
+                raise RuntimeError("rate limited")
+            return await super().complete(prompt, **kwargs)
+
+    engine = make_engine(tmp_path / "cache")
+    engine.judge_backend = FlakyJudge(provider="openai", model="judge")
+    report = await engine.run(make_cases(1))
+
+    assert report.results[0]["evals"]["safety_compliance"]["label"] == "ERROR"
+    rerun = await make_engine(tmp_path / "cache").run(make_cases(1))
+    assert rerun.model_calls == 1  # Only the failed verdict is re-requested
+
+
+@pytest.mark.asyncio
+async def test_resume_reruns_only_changed_judges(tmp_path):
+    cases = make_cases(3)
+    results_path = str(tmp_path / "results.jsonl")
+    await make_engine().run(cases, results_path=results_path)
+
+    config = {name: dict(cfg) for name, cfg in EVAL_CONFIG.items()}
+    config["citation_accuracy"]["template"] += "\nRequire page numbers.\n"
+    engine = make_engine(eval_config=config)
+    report = await engine.run(cases, results_path=results_path)
+
+    assert report.resumed == 0 and report.evaluated == 3
+    assert engine.agent_backend.calls == 0  # Agent output reused from the checkpoint
+    assert engine.judge_backend.calls == 3
+
+    again = make_engine(eval_config=config)
+    report = await again.run(cases, results_path=results_path)
+    assert report.resumed == 3 and again.judge_backend.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_changed_judge_model_invalidates_checkpoint(tmp_path):
+    cases = make_cases(2)
+    results_path = str(tmp_path / "results.jsonl")
+    await make_engine().run(cases, results_path=results_path)
+
+    engine = make_engine()
+    engine.judge_backend.model = "judge-v2"
+    report = await engine.run(cases, results_path=results_path)
+
+    assert report.resumed == 0
+    assert engine.agent_backend.calls == 0
+    assert engine.judge_backend.calls == 2 * len(EVAL_CONFIG)
+
+
+@pytest.mark.asyncio
+async def test_agent_errors_are_not_cached_or_checkpointed(tmp_path):
+    results_path = str(tmp_path / "results.jsonl")
+    engine = make_engine(tmp_path / "cache")
+    engine.agent_backend = AgentBackend(
+        lambda case: {"root_cause": "ERROR: 429 Too Many Requests"}, provider="groq", model="agent"
+    )
+
+    report = await engine.run(make_cases(2), results_path=results_path)
+
+    assert report.failed == 2
+    assert engine.judge_backend.calls == 0  # Error output is not judged
+    assert all(v["label"] == "ERROR" for r in report.results for v in r["evals"].values())
+    assert load_checkpoint(results_path) == {}
+
+    rerun = make_engine(tmp_path / "cache")
+    report = await rerun.run(make_cases(2), results_path=results_path)
+    assert report.resumed == 0 and rerun.agent_backend.calls == 2
+    assert len(load_checkpoint(results_path)) == 2
+
+
+@pytest.mark.asyncio
+async def test_judge_errors_are_not_checkpointed(tmp_path):
+    class FlakyJudge(StubBackend):
+        async def complete(self, prompt, **kwargs):
+            if "safety engineer" in prompt:
+                raise RuntimeError("rate limited")
+            return await super().complete(prompt, **kwargs)
+
+    results_path = str(tmp_path / "results.jsonl")
+    engine = make_engine()
+    engine.judge_backend = FlakyJudge(provider="openai", model="judge")
+    report = await engine.run(make_cases(1), results_path=results_path)
+
+    assert report.failed == 1
+    assert load_checkpoint(results_path) == {}
+
+
+@pytest.mark.asyncio
+async def test_agent_backend_runs_diagnose_in_threads():
+    threads = set()
+
+    def diagnose(case):
+        threads.add(threading.get_ident())
+        return {"root_cause": f"Overload on {case['equipment']['model']}", "repair_steps": ["Reset"]}
+
+    engine = make_engine()
+    engine.agent_backend = AgentBackend(diagnose, provider="groq", model="rivet_orchestrator")
+    report = await engine.run(make_cases(3))
+
+    assert report.model_calls == 3 * (1 + len(EVAL_CONFIG))
+    assert threading.get_ident() not in threads
+    assert report.results[1]["agent_output"]["root_cause"] == "Overload on S7-1201"
+    assert report.results[1]["agent_output"]["safety_warnings"] == []
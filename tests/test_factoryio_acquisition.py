@@ -0,0 +1,208 @@
+"""
+Tests for the async Factory.io acquisition layer
+(agent_factory/platform/state/acquisition.py) against a local mock
+Factory.io Web API server.
+
+Run with:
+    poetry run pytest tests/test_factoryio_acquisition.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from agent_factory.platform.config import MachineConfig, TagConfig
+from agent_factory.platform.state.acquisition import (
+    AdaptivePollInterval,
+    FactoryIOError,
+    TagAcquisition,
+)
+from agent_factory.platform.state.machine_state_manager import MachineStateManager
+
+
+class MockFactoryIOServer:
+    """Minimal HTTP/1.1 keep-alive server for GET /api/tag/values/by-name."""
+
+    def __init__(self, tags):
+        self.tags = dict(tags)
+        self.connections = 0
+        self.requests = []  # Tag name lists, one per request
+        self.url = None
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                headers = {k.lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                names = json.loads(body or b"[]")
+                self.requests.append(names)
+                items = [
+                    {"name": name, "value": self.tags[name]} if name in self.tags
+                    else {"name": name, "error": "Tag not found"}
+                    for name in names
+                ]
+                payload = json.dumps(items).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+def machine(machine_id, url, inputs, outputs=(), interval=1):
+    return MachineConfig(
+        machine_id=machine_id,
+        scene_name=machine_id,
+        factory_io_url=url,
+        telegram_chat_id=-1000 - len(machine_id),
+        poll_interval_seconds=interval,
+        monitored_inputs=[TagConfig(tag=t, label=t) for t in inputs],
+        controllable_outputs=[TagConfig(tag=t, label=t) for t in outputs],
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_request():
+    async with MockFactoryIOServer({"at_entry": True, "conveyor_running": False, "height": 12}) as server:
+        acquisition = TagAcquisition()
+
+        a, b = await asyncio.gather(
+            acquisition.read(server.url, ["at_entry", "height"]),
+            acquisition.read(server.url, ["conveyor_running", "height"]),
+        )
+        await acquisition.close()
+
+    assert server.requests == [["at_entry", "conveyor_running", "height"]]
+    assert a.values == {"at_entry": True, "height": 12}
+    assert b.values == {"conveyor_running": False, "height": 12}
+    assert a.coalesced == 2
+    assert acquisition.metrics.coalesced_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_kept_alive_across_polls():
+    async with MockFactoryIOServer({"at_entry": True}) as server:
+        acquisition = TagAcquisition(coalesce_seconds=0)
+        for _ in range(5):
+            result = await acquisition.read(server.url, ["at_entry"])
+        await acquisition.close()
+
+    assert result.values == {"at_entry": True}
+    assert len(server.requests) == 5
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_per_tag_errors_are_typed():
+    async with MockFactoryIOServer({"at_entry": True}) as server:
+        acquisition = TagAcquisition()
+        result = await acquisition.read(server.url, ["at_entry", "missing"])
+        await acquisition.close()
+
+    assert not result.ok
+    assert result.values == {"at_entry": True}
+    assert result.errors == {"missing": "Tag not found"}
+
+
+@pytest.mark.asyncio
+async def test_connection_refused_raises_for_every_caller():
+    acquisition = TagAcquisition(timeout=1)
+
+    results = await asyncio.gather(
+        acquisition.read("http://127.0.0.1:9", ["a"]),
+        acquisition.read("http://127.0.0.1:9", ["b"]),
+        return_exceptions=True,
+    )
+    await acquisition.close()
+
+    assert all(isinstance(r, FactoryIOError) for r in results)
+    assert acquisition.metrics.requests == 1
+
+
+def test_adaptive_interval_speeds_up_and_backs_off():
+    interval = AdaptivePollInterval.for_interval(5, min_seconds=0.5, idle_factor=2)
+
+    assert interval.current_seconds == 4  # Rounded down to the 0.5 * 2^k grid
+    assert interval.record_poll(changed=True) == 0.5
+    assert [interval.record_poll(changed=False) for _ in range(6)] == [1, 2, 4, 8, 8, 8]
+
+
+def test_deadlines_align_across_intervals():
+    fast = AdaptivePollInterval(min_seconds=0.5, max_seconds=8, current_seconds=0.5)
+    slow = AdaptivePollInterval(min_seconds=0.5, max_seconds=8, current_seconds=4)
+
+    # Every slow tick is also a fast tick, so both land in the same batch
+    assert slow.next_deadline(3.7) == 4.0
+    assert fast.next_deadline(3.7) == 4.0
+    assert fast.next_deadline(4.0) == 4.5
+
+
+@pytest.mark.asyncio
+async def test_manager_coalesces_machines_on_same_host():
+    tags = {"at_entry": True, "at_exit": False, "conveyor_running": True}
+    async with MockFactoryIOServer(tags) as server:
+        manager = MachineStateManager(
+            [
+                machine("sorter", server.url, ["at_entry"], ["conveyor_running"]),
+                machine("palletizer", server.url, ["at_exit"]),
+            ],
+            min_poll_seconds=0.25,
+        )
+        await manager.start()
+        while not server.requests:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await manager.stop()
+
+    assert server.requests == [["at_entry", "at_exit", "conveyor_running"]]
+    assert server.connections == 1
+    sorter = manager.get_state("sorter")
+    assert sorter["at_entry"].tag_type == "Input"
+    assert sorter["conveyor_running"].tag_type == "Output"
+    assert set(manager.get_state("palletizer")) == {"at_exit"}
+
+
+@pytest.mark.asyncio
+async def test_manager_polls_faster_after_change():
+    async with MockFactoryIOServer({"at_entry": False}) as server:
+        manager = MachineStateManager([machine("sorter", server.url, ["at_entry"], interval=1)], min_poll_seconds=0.125)
+        changes = []
+
+        async def on_change(machine_id, changed_tags):
+            changes.append([(t.tag_name, t.value) for t in changed_tags])
+
+        manager.subscribe("sorter", on_change)
+        await manager.start()
+        while not changes:
+            await asyncio.sleep(0.01)
+        server.tags["at_entry"] = True
+        await asyncio.sleep(1.1)
+        interval_after_change = manager.states["sorter"].poll_interval
+        await manager.stop()
+
+    assert changes == [[("at_entry", False)], [("at_entry", True)]]
+    # First poll (change) dropped the interval to 0.125s, so the second change
+    # was picked up at t=0.125s and several idle polls followed inside 1.1s
+    assert len(server.requests) >= 5
+    assert interval_after_change.current_seconds > interval_after_change.min_seconds
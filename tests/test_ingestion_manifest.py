@@ -0,0 +1,143 @@
+"""
+Tests for incremental re-ingestion manifests (ingestion_manifest.py).
+
+Run with:
+    poetry run pytest tests/test_ingestion_manifest.py -v
+"""
+
+from agent_factory.workflows.ingestion_manifest import (
+    STATUS_REJECTED,
+    STATUS_STORED,
+    STATUS_TOMBSTONED,
+    SourceManifest,
+    atom_id_for,
+    chunk_hash,
+)
+
+URL = "https://example.com/manuals/powerflex-525.pdf"
+
+
+def pages(*texts):
+    return [{"text": text, "content_type": "explanation"} for text in texts]
+
+
+def ingest(manifest, chunks, rejected=()):
+    """Simulate a full chain run: store every changed chunk, tombstone removed ones."""
+    diff = manifest.diff(chunks)
+    for chunk in diff.changed:
+        if chunk["text"] in rejected:
+            manifest.record(chunk["chunk_hash"], None, STATUS_REJECTED)
+        else:
+            manifest.record(chunk["chunk_hash"], atom_id_for(manifest.url_hash, chunk["chunk_hash"]))
+    manifest.restore(e["chunk_hash"] for e in diff.restored)
+    manifest.tombstone(diff.removed_hashes)
+    manifest.save()
+    return diff
+
+
+class TestChunkHash:
+    """Stable content keys."""
+
+    def test_whitespace_insensitive(self):
+        assert chunk_hash("Fault F0002\n  aux input ") == chunk_hash("Fault F0002 aux input")
+        assert chunk_hash("Fault F0002") != chunk_hash("Fault F0003")
+
+    def test_atom_id_is_deterministic(self):
+        manifest = SourceManifest(URL)
+        content_hash = chunk_hash("Fault F0002")
+        assert atom_id_for(manifest.url_hash, content_hash) == atom_id_for(manifest.url_hash, content_hash)
+        assert atom_id_for(manifest.url_hash, content_hash).startswith(f"atom:{manifest.url_hash}:")
+
+
+class TestDiff:
+    """Classifying a new chunking run against the previous one."""
+
+    def test_first_run_everything_changed(self, tmp_path):
+        diff = SourceManifest.load(URL, tmp_path).diff(pages("a" * 60, "b" * 60))
+        assert diff.summary() == {"changed": 2, "unchanged": 0, "restored": 0, "removed": 0}
+
+    def test_revision_only_changed_pages_reprocessed(self, tmp_path):
+        original = [f"Page {i} content about parameter P{i:03d}." for i in range(500)]
+        ingest(SourceManifest.load(URL, tmp_path), pages(*original))
+
+        revised = list(original)
+        revised[10] = "Page 10 content about parameter P010, revised for firmware 7."
+        revised[250] = "Page 250 rewritten."
+        del revised[400]
+        revised.append("New appendix page.")
+
+        manifest = SourceManifest.load(URL, tmp_path)
+        diff = manifest.diff(pages(*revised))
+
+        assert sorted(c["text"] for c in diff.changed) == sorted([revised[10], revised[250], "New appendix page."])
+        assert len(diff.unchanged) == 497
+        assert len(diff.reused_atom_ids) == 497
+        assert len(diff.removed) == 3  # old pages 10, 250 and 400
+        assert set(diff.removed_hashes) == {chunk_hash(original[i]) for i in (10, 250, 400)}
+
+    def test_reordered_pages_are_free(self, tmp_path):
+        ingest(SourceManifest.load(URL, tmp_path), pages("one", "two", "three"))
+        diff = SourceManifest.load(URL, tmp_path).diff(pages("three", "one", "two"))
+        assert diff.summary() == {"changed": 0, "unchanged": 3, "restored": 0, "removed": 0}
+
+    def test_rejected_chunks_not_regenerated(self, tmp_path):
+        ingest(SourceManifest.load(URL, tmp_path), pages("good", "marketing fluff"), rejected={"marketing fluff"})
+        diff = SourceManifest.load(URL, tmp_path).diff(pages("good", "marketing fluff"))
+        assert diff.changed == []
+        assert len(diff.reused_atom_ids) == 1
+
+    def test_duplicate_chunks_collapse(self):
+        diff = SourceManifest(URL).diff(pages("Warning: disconnect power", "Warning: disconnect power"))
+        assert len(diff.changed) == 1
+
+
+class TestTombstones:
+    """Removed chunks and their return."""
+
+    def test_removed_then_restored(self, tmp_path):
+        ingest(SourceManifest.load(URL, tmp_path), pages("one", "two"))
+        ingest(SourceManifest.load(URL, tmp_path), pages("one"))
+
+        manifest = SourceManifest.load(URL, tmp_path)
+        assert manifest.chunks[chunk_hash("two")]["status"] == STATUS_TOMBSTONED
+        assert len(manifest) == 1
+
+        # Tombstoned entries are not reported as removed again
+        assert manifest.diff(pages("one")).removed == []
+
+        diff = ingest(manifest, pages("one", "two"))
+        assert diff.changed == []
+        assert diff.restored_atom_ids == [atom_id_for(manifest.url_hash, chunk_hash("two"))]
+        assert SourceManifest.load(URL, tmp_path).chunks[chunk_hash("two")]["status"] == STATUS_STORED
+
+
+class TestPersistence:
+    """Manifest files on disk."""
+
+    def test_one_file_per_source(self, tmp_path):
+        ingest(SourceManifest.load(URL, tmp_path), pages("one"))
+        ingest(SourceManifest.load(URL + "?rev=2", tmp_path), pages("one"))
+        assert len(list(tmp_path.glob("*.json"))) == 2
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_corrupt_manifest_means_full_run(self, tmp_path):
+        manifest = SourceManifest.load(URL, tmp_path)
+        manifest.path.write_text("{not json")
+        diff = SourceManifest.load(URL, tmp_path).diff(pages("one"))
+        assert len(diff.changed) == 1
+
+    def test_legacy_reconcile_persists(self, tmp_path):
+        manifest = SourceManifest.load(URL, tmp_path)
+        assert not manifest.needs_legacy_reconcile  # Nothing stored to replace legacy atoms yet
+
+        ingest(manifest, pages("rejected only"), rejected={"rejected only"})
+        assert not SourceManifest.load(URL, tmp_path).needs_legacy_reconcile
+
+        ingest(SourceManifest.load(URL, tmp_path), pages("one"))
+        manifest = SourceManifest.load(URL, tmp_path)
+        assert manifest.needs_legacy_reconcile
+        assert manifest.stored_atom_ids == [atom_id_for(manifest.url_hash, chunk_hash("one"))]
+
+        manifest.legacy_reconciled_at = "2026-10-19T00:00:00"
+        manifest.save()
+        assert not SourceManifest.load(URL, tmp_path).needs_legacy_reconcile
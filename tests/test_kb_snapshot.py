@@ -0,0 +1,214 @@
+"""
+Tests for columnar KB snapshots (kb_snapshot.py).
+
+PostgreSQL isn't available in CI, so the binary COPY encoder is checked
+against the decoder used for export; SQLite is exercised end to end.
+
+Run with:
+    poetry run pytest tests/test_kb_snapshot.py -v
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+from agent_factory.knowledge.kb_snapshot import (
+    KIND_BOOL,
+    KIND_FLOAT,
+    KIND_INT,
+    KIND_LIST,
+    KIND_TEXT,
+    KIND_TIMESTAMP,
+    KIND_VECTOR,
+    ChecksumError,
+    SnapshotColumn,
+    SnapshotWriter,
+    SQLiteTarget,
+    decode_copy_binary,
+    decode_embedding,
+    encode_copy_binary,
+    load_snapshot,
+    read_manifest,
+    rows_to_table,
+    verify_snapshot,
+)
+
+DIM = 8
+COLUMNS = [
+    SnapshotColumn("atom_id", KIND_TEXT, pg_type="text"),
+    SnapshotColumn("manufacturer", KIND_TEXT, pg_type="text"),
+    SnapshotColumn("title", KIND_TEXT, pg_type="text"),
+    SnapshotColumn("keywords", KIND_LIST, pg_type="text[]", item_kind=KIND_TEXT),
+    SnapshotColumn("quality_score", KIND_FLOAT, pg_type="double precision"),
+    SnapshotColumn("usage_count", KIND_INT, pg_type="integer"),
+    SnapshotColumn("is_direct_pdf", KIND_BOOL, pg_type="boolean"),
+    SnapshotColumn("created_at", KIND_TIMESTAMP, pg_type="timestamp with time zone"),
+    SnapshotColumn("embedding", KIND_VECTOR, pg_type=f"vector({DIM})", dim=DIM),
+]
+VENDORS = ["Allen-Bradley", "Siemens", "ABB", None]
+CREATED = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        rows.append((
+            f"atom-{i}",
+            VENDORS[i % len(VENDORS)],
+            f"Fault F{i:04d} ü",
+            ["fault", f"f{i}"] if i % 5 else None,
+            float(i) / 10,
+            i,
+            i % 2 == 0,
+            CREATED,
+            rng.standard_normal(DIM).astype(np.float32) if i % 7 else None,
+        ))
+    return rows
+
+
+def write_snapshot(directory, n=100, row_group_size=16):
+    writer = SnapshotWriter(directory, COLUMNS, row_group_size=row_group_size)
+    rows = make_rows(n)
+    writer.write(rows)
+    return writer.close(), rows
+
+
+class TestWriter:
+    """Partitioned Parquet output and manifest."""
+
+    def test_partitions_by_vendor(self, tmp_path):
+        manifest, rows = write_snapshot(tmp_path)
+
+        assert [p.key for p in manifest.partitions] == ["abb", "allen-bradley", "siemens", "unknown"]
+        assert manifest.total_rows == len(rows)
+        assert (tmp_path / "manufacturer=allen-bradley" / "part-00000.parquet").exists()
+        assert read_manifest(tmp_path).snapshot_id == manifest.snapshot_id
+
+    def test_embeddings_are_fixed_size_float32(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        manifest, _ = write_snapshot(tmp_path)
+        table = pq.read_table(tmp_path / manifest.partitions[0].path)
+        embedding_type = table.schema.field("embedding").type
+
+        assert pa.types.is_fixed_size_list(embedding_type)
+        assert embedding_type.list_size == DIM
+        assert embedding_type.value_type == pa.float32()
+
+    def test_wrong_dimension_rejected(self, tmp_path):
+        writer = SnapshotWriter(tmp_path, COLUMNS)
+        row = list(make_rows(1)[0])
+        row[-1] = np.zeros(DIM + 1, dtype=np.float32)
+        writer.write([tuple(row)])
+        with pytest.raises(Exception, match="dimensional"):
+            writer.close()
+
+
+class TestVerify:
+    """Checksums."""
+
+    def test_detects_corruption_and_missing_files(self, tmp_path):
+        manifest, _ = write_snapshot(tmp_path)
+        verify_snapshot(tmp_path)
+
+        path = tmp_path / manifest.partitions[1].path
+        data = bytearray(path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        path.write_bytes(bytes(data))
+        (tmp_path / manifest.partitions[2].path).unlink()
+
+        with pytest.raises(ChecksumError) as excinfo:
+            verify_snapshot(tmp_path)
+        assert "sha256 mismatch" in str(excinfo.value)
+        assert "missing" in str(excinfo.value)
+
+        with pytest.raises(ChecksumError):
+            load_snapshot(tmp_path, SQLiteTarget(tmp_path / "kb.db"))
+
+
+class TestSQLiteLoad:
+    """End-to-end restore into the local SQLite provider."""
+
+    def test_round_trip(self, tmp_path):
+        _, rows = write_snapshot(tmp_path / "snap")
+        report = load_snapshot(tmp_path / "snap", SQLiteTarget(tmp_path / "kb.db"))
+        assert report.rows_loaded == len(rows)
+
+        conn = sqlite3.connect(tmp_path / "kb.db")
+        conn.row_factory = sqlite3.Row
+        loaded = {r["atom_id"]: r for r in conn.execute("SELECT * FROM knowledge_atoms")}
+        assert len(loaded) == len(rows)
+
+        for row in rows[:20]:
+            got = loaded[row[0]]
+            assert got["manufacturer"] == row[1]
+            assert got["title"] == row[2]
+            assert (json.loads(got["keywords"]) if got["keywords"] else None) == row[3]
+            assert got["usage_count"] == row[5]
+            assert bool(got["is_direct_pdf"]) == row[6]
+            assert datetime.fromisoformat(got["created_at"]) == CREATED
+            if row[8] is None:
+                assert got["embedding"] is None
+            else:
+                np.testing.assert_array_equal(decode_embedding(got["embedding"]), row[8])
+
+    def test_resume_after_interruption(self, tmp_path):
+        write_snapshot(tmp_path / "snap", n=200, row_group_size=10)
+
+        class FlakyTarget(SQLiteTarget):
+            calls = 0
+
+            def load(self, table):
+                FlakyTarget.calls += 1
+                if FlakyTarget.calls == 7:
+                    raise ConnectionError("connection dropped")
+                return super().load(table)
+
+        with pytest.raises(ConnectionError):
+            load_snapshot(tmp_path / "snap", FlakyTarget(tmp_path / "kb.db"))
+
+        report = load_snapshot(tmp_path / "snap", SQLiteTarget(tmp_path / "kb.db"))
+        assert report.rows_skipped == 60
+        assert report.rows_loaded == 140
+
+        conn = sqlite3.connect(tmp_path / "kb.db")
+        assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT atom_id) FROM knowledge_atoms").fetchone() == (200, 200)
+
+        # Completed load: nothing left to do
+        assert load_snapshot(tmp_path / "snap", SQLiteTarget(tmp_path / "kb.db")).rows_loaded == 0
+        # Explicit restart replays everything (upserts, no duplicates)
+        assert load_snapshot(tmp_path / "snap", SQLiteTarget(tmp_path / "kb.db"), resume=False).rows_loaded == 200
+        assert conn.execute("SELECT COUNT(*) FROM knowledge_atoms").fetchone() == (200,)
+
+    def test_partial_load_by_vendor(self, tmp_path):
+        write_snapshot(tmp_path / "snap")
+        report = load_snapshot(tmp_path / "snap", SQLiteTarget(tmp_path / "kb.db"), partitions=["siemens"])
+
+        conn = sqlite3.connect(tmp_path / "kb.db")
+        assert report.partitions == 1
+        assert {r[0] for r in conn.execute("SELECT DISTINCT manufacturer FROM knowledge_atoms")} == {"Siemens"}
+
+
+def test_copy_binary_round_trip():
+    """Import encoding and export decoding agree field for field."""
+    rows = make_rows(30)
+    table = rows_to_table(rows, COLUMNS)
+    data = encode_copy_binary(table, COLUMNS)
+
+    chunks = [data[i:i + 97] for i in range(0, len(data), 97)]  # odd chunk boundaries
+    decoded = list(decode_copy_binary(chunks, COLUMNS))
+
+    assert len(decoded) == len(rows)
+    for original, got in zip(rows, decoded):
+        assert got[:7] == original[:7]
+        assert got[7] == int(CREATED.timestamp() * 1_000_000)
+        if original[8] is None:
+            assert got[8] is None
+        else:
+            np.testing.assert_array_equal(got[8], original[8])
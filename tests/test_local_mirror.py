@@ -0,0 +1,304 @@
+"""
+Tests for the local SQLite knowledge mirror (agent_factory/knowledge/local_mirror.py).
+
+Run with:
+    poetry run pytest tests/test_local_mirror.py -v
+"""
+
+import time
+
+import pytest
+
+from agent_factory.knowledge import local_mirror
+from agent_factory.knowledge.local_mirror import (
+    LocalMirror,
+    MirrorMiss,
+    MirrorSourceError,
+    decode_embedding,
+    encode_embedding,
+    fts_query,
+    get_local_mirror,
+    mirror_path,
+)
+
+
+class FakeSource:
+    """In-memory remote with keyset pagination; records every page request."""
+
+    def __init__(self, name=None, embedding_model=None, **tables):
+        self.name = name
+        self.embedding_model = embedding_model
+        self.tables = {name: list(rows) for name, rows in tables.items()}
+        self.calls = []
+        self.fail = False
+
+    def fetch_changes(self, table, since, limit):
+        self.calls.append((table.name, since))
+        if self.fail:
+            raise ConnectionError("all providers down")
+        rows = sorted(self.tables.get(table.name, []), key=lambda r: (r[table.updated_column], str(r[table.key])))
+        if since is not None:
+            rows = [r for r in rows if (r[table.updated_column], str(r[table.key])) > since]
+        return [dict(r) for r in rows[:limit]]
+
+
+def atom(i, updated="2026-10-01T00:00:00", **extra):
+    row = {
+        "atom_id": f"ab:fault:{i}",
+        "updated_at": updated,
+        "title": f"PowerFlex 525 fault F{i:03d}",
+        "summary": "Drive tripped on overcurrent",
+        "content": "Check motor leads and accel time",
+        "keywords": ["vfd", "overcurrent"],
+        "vendor": "allen_bradley",
+        "embedding": f"[{i},1,0]",
+    }
+    row.update(extra)
+    return row
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    m = LocalMirror(tmp_path / "mirror.db", max_staleness_seconds=60)
+    yield m
+    m.close()
+
+
+class TestSync:
+
+    def test_incremental_pull_resumes_from_watermark(self, mirror):
+        # Same updated_at on every row: the key breaks ties across pages
+        source = FakeSource(knowledge_atoms=[atom(i) for i in range(7)])
+        result = mirror.sync_table("knowledge_atoms", source, batch_size=3)
+
+        assert result.upserted == 7
+        assert mirror.status()["knowledge_atoms"]["rows"] == 7
+
+        source.tables["knowledge_atoms"].append(atom(7, updated="2026-10-02T00:00:00"))
+        source.calls.clear()
+        result = mirror.sync_table("knowledge_atoms", source, batch_size=3)
+
+        # Re-reads the overlap window behind the watermark (idempotent upserts)
+        assert result.upserted == 8
+        assert source.calls[0][1] == ("2026-09-30T23:55:00", "")
+        assert mirror.status()["knowledge_atoms"]["watermark"] == "2026-10-02T00:00:00"
+
+    def test_late_commit_behind_watermark_is_pulled(self, mirror):
+        source = FakeSource(knowledge_atoms=[atom(1, updated="2026-10-01T12:00:00")])
+        mirror.sync_table("knowledge_atoms", source)
+
+        # Stamped before atom 1 but committed after the first pull
+        source.tables["knowledge_atoms"].append(atom(2, updated="2026-10-01T11:58:00"))
+        mirror.sync_table("knowledge_atoms", source)
+
+        assert mirror.get("knowledge_atoms", "ab:fault:2") is not None
+
+    def test_source_mismatch_refused(self, tmp_path):
+        path = tmp_path / "mirror.db"
+        LocalMirror(path).sync_table("knowledge_atoms", FakeSource(name="vps", knowledge_atoms=[atom(1)]))
+
+        assert LocalMirror(path).source == "vps"
+        with pytest.raises(MirrorSourceError):
+            LocalMirror(path).sync_table("knowledge_atoms", FakeSource(name="neon", knowledge_atoms=[atom(2)]))
+        with pytest.raises(MirrorSourceError):
+            LocalMirror(path, source="supabase")
+
+    def test_embedding_model_change_forces_full_resync(self, mirror):
+        source = FakeSource(embedding_model="nomic-embed-text", knowledge_atoms=[atom(1)])
+        mirror.sync_table("knowledge_atoms", source)
+        assert mirror.embedding_model == "nomic-embed-text"
+
+        source.embedding_model = "text-embedding-3-small"
+        result = mirror.sync_table("knowledge_atoms", source)
+
+        assert result.full
+        assert mirror.embedding_model == "text-embedding-3-small"
+
+    def test_updates_and_tombstones(self, mirror):
+        source = FakeSource(knowledge_atoms=[atom(1), atom(2)])
+        mirror.sync_table("knowledge_atoms", source)
+
+        source.tables["knowledge_atoms"] = [
+            atom(1, updated="2026-10-02T00:00:00", title="Ethernet/IP timeout"),
+            atom(2, updated="2026-10-02T00:00:00", deleted_at="2026-10-02T00:00:00"),
+        ]
+        result = mirror.sync_table("knowledge_atoms", source)
+
+        assert result.deleted == 1
+        assert mirror.get("knowledge_atoms", "ab:fault:2") is None
+        assert [r["atom_id"] for r in mirror.search_text("knowledge_atoms", "ethernet")] == ["ab:fault:1"]
+        assert mirror.search_text("knowledge_atoms", "powerflex") == []
+
+    def test_full_resync_drops_hard_deleted_rows(self, mirror):
+        source = FakeSource(user_machines=[
+            {"id": 1, "user_id": "42", "nickname": "Line 1", "updated_at": "2026-10-01"},
+            {"id": 2, "user_id": "42", "nickname": "Line 2", "updated_at": "2026-10-01"},
+        ])
+        mirror.sync_table("user_machines", source)
+        source.tables["user_machines"].pop()
+
+        result = mirror.sync_table("user_machines", source, full=True)
+
+        assert result.deleted == 1
+        assert [m["nickname"] for m in mirror.select("user_machines", filters={"user_id": 42})] == ["Line 1"]
+
+    def test_failed_sync_recorded(self, mirror):
+        source = FakeSource()
+        source.fail = True
+
+        results = mirror.sync(source, tables=["equipment_manuals"])
+
+        assert results[0].error == "all providers down"
+        status = mirror.status()["equipment_manuals"]
+        assert status["last_error"] == "all providers down"
+        assert status["fresh"] is False
+
+
+class TestReads:
+
+    def test_text_search_ranks_and_filters(self, mirror):
+        rows = [atom(i) for i in range(5)]
+        rows.append(atom(99, vendor="siemens", title="S7-1200 fault F099"))
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=rows))
+
+        results = mirror.search_text("knowledge_atoms", "F003 fault", limit=3)
+        assert results[0]["atom_id"] == "ab:fault:3"
+        assert results[0]["rank"] > results[1]["rank"]
+        assert results[0]["keywords"] == ["vfd", "overcurrent"]
+        assert "embedding" not in results[0]
+
+        siemens = mirror.search_text("knowledge_atoms", "fault", filters={"vendor": "Siemens"})
+        assert [r["atom_id"] for r in siemens] == ["ab:fault:99"]
+
+    def test_semantic_search(self, mirror):
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=[atom(i) for i in range(5)]))
+
+        results = mirror.semantic_search("knowledge_atoms", [0, 1, 0], limit=2, similarity_threshold=0.5)
+
+        assert [r["atom_id"] for r in results] == ["ab:fault:0", "ab:fault:1"]
+        assert results[0]["similarity"] == pytest.approx(1.0)
+
+    def test_semantic_search_refuses_other_embedding_space(self, mirror):
+        source = FakeSource(embedding_model="nomic-embed-text", knowledge_atoms=[atom(1)])
+        mirror.sync_table("knowledge_atoms", source)
+
+        with pytest.raises(MirrorMiss):
+            mirror.semantic_search("knowledge_atoms", [0.1] * 1536)
+        with pytest.raises(MirrorMiss):
+            mirror.semantic_search("knowledge_atoms", [0, 1, 0], embedding_model="text-embedding-3-small")
+        assert mirror.semantic_search("knowledge_atoms", [0, 1, 0], embedding_model="nomic-embed-text")
+
+    def test_substring_search_matches_ilike(self, mirror):
+        rows = [
+            atom(1, title="PowerFlex 525 fault F004", created_at="2026-09-01"),
+            atom(2, title="Fault F004 on the conveyor", content="PowerFlex drive", created_at="2026-09-02"),
+            atom(3, title="Reset procedure", keywords=["f004"], created_at="2026-09-03"),
+            atom(4, title="Overcurrent", content="powerflex trips", created_at="2026-09-04"),
+        ]
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=rows))
+
+        def ids(text, **kwargs):
+            return [r["atom_id"] for r in mirror.search_substring(
+                "knowledge_atoms", text, columns=("title", "summary", "content"), array_column="keywords", **kwargs
+            )]
+
+        # Whole phrase as one substring, newest first (FTS would OR the tokens)
+        assert ids("powerflex 525") == ["ab:fault:1"]
+        assert ids("F00") == ["ab:fault:2", "ab:fault:1"]
+        assert ids("F004") == ["ab:fault:3", "ab:fault:2", "ab:fault:1"]
+        assert ids("F004", limit=1) == ["ab:fault:3"]
+        assert ids(None, filters={"vendor": "siemens"}) == []
+
+    def test_text_search_restricted_to_columns(self, mirror):
+        rows = [atom(1, title="vfd overview", keywords=["plc"]), atom(2, title="plc basics", keywords=["vfd"])]
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=rows))
+
+        found = mirror.search_text("knowledge_atoms", "vfd", columns=("keywords",))
+
+        assert [r["atom_id"] for r in found] == ["ab:fault:2"]
+
+    def test_manual_filters(self, mirror):
+        manuals = [
+            {"id": "m1", "updated_at": "1", "title": "PowerFlex 525", "manufacturer": "Allen-Bradley",
+             "component_family": "VFD", "indexed": True},
+            {"id": "m2", "updated_at": "2", "title": "G120", "manufacturer": "Siemens",
+             "component_family": "VFD", "indexed": False},
+        ]
+        mirror.sync_table("equipment_manuals", FakeSource(equipment_manuals=manuals))
+
+        found = mirror.select("equipment_manuals", filters={"indexed": True}, contains={"manufacturer": "allen"})
+
+        assert [m["id"] for m in found] == ["m1"]
+        assert found[0]["indexed"] is True
+
+
+class TestReadThrough:
+
+    def remote_down(self):
+        raise ConnectionError("all providers down")
+
+    def test_fresh_mirror_skips_remote(self, mirror):
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=[atom(1)]))
+
+        assert mirror.read_through("knowledge_atoms", remote=self.remote_down, local=lambda: "local") == "local"
+        assert mirror.metrics.local_reads == 1
+
+    def test_stale_mirror_prefers_remote_then_falls_back(self, mirror):
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=[atom(1)]))
+        mirror.max_staleness_seconds = 0
+        time.sleep(0.01)
+
+        assert mirror.read_through("knowledge_atoms", remote=lambda: "remote", local=lambda: "local") == "remote"
+        assert mirror.read_through("knowledge_atoms", remote=self.remote_down, local=lambda: "local") == "local"
+        assert mirror.metrics.fallback_reads == 1
+
+    def test_local_miss_asks_remote(self, mirror):
+        mirror.sync_table("knowledge_atoms", FakeSource(knowledge_atoms=[atom(1)]))
+
+        def mismatch():
+            raise MirrorMiss("other embedding model")
+
+        assert mirror.read_through("knowledge_atoms", remote=lambda: ["remote"], local=lambda: []) == ["remote"]
+        assert mirror.read_through("knowledge_atoms", remote=lambda: ["remote"], local=mismatch) == ["remote"]
+        assert mirror.metrics.local_misses == 2 and mirror.metrics.local_reads == 0
+
+        with pytest.raises(ConnectionError):
+            mirror.read_through("knowledge_atoms", remote=self.remote_down, local=mismatch)
+        assert mirror.read_through("knowledge_atoms", remote=self.remote_down, local=lambda: []) == []
+
+    def test_empty_mirror_reraises(self, mirror):
+        with pytest.raises(ConnectionError):
+            mirror.read_through("user_machines", remote=self.remote_down, local=lambda: [])
+        assert mirror.metrics.failed_reads == 1
+
+
+def test_layout_change_rebuilds_table(tmp_path):
+    from agent_factory.knowledge.local_mirror import MANUALS, MirrorTable
+
+    path = tmp_path / "mirror.db"
+    LocalMirror(path, tables=[MANUALS]).sync_table(
+        "equipment_manuals", FakeSource(equipment_manuals=[{"id": "m1", "updated_at": "1", "title": "x"}])
+    )
+
+    widened = MirrorTable(name="equipment_manuals", key="id", text_columns=("title", "source"))
+    mirror = LocalMirror(path, tables=[widened])
+
+    assert mirror.status()["equipment_manuals"]["rows"] == 0
+    assert mirror.status()["equipment_manuals"]["watermark"] is None
+
+
+def test_embedding_round_trip_and_fts_query():
+    assert list(decode_embedding(encode_embedding("[0.5, -1.0, 2.0]"))) == [0.5, -1.0, 2.0]
+    assert encode_embedding("[]") is None
+    assert fts_query('PowerFlex "F004" OR drive?') == '"powerflex" OR "f004" OR "or" OR "drive"'
+    assert fts_query("vfd plc", columns=("keywords",)) == '{"keywords"} : ("vfd" OR "plc")'
+
+
+def test_one_mirror_per_source(tmp_path, monkeypatch):
+    monkeypatch.setenv("KB_MIRROR_DIR", str(tmp_path))
+    monkeypatch.setattr(local_mirror, "_mirrors", {})
+    LocalMirror(mirror_path("vps"), source="vps")
+
+    assert mirror_path("vps") != mirror_path("supabase")
+    assert get_local_mirror("vps").source == "vps"
+    assert get_local_mirror("supabase") is None
@@ -0,0 +1,217 @@
+"""
+Tests for the background manual ingestion queue (manual_ingestion.py).
+
+Run with:
+    poetry run pytest tests/test_manual_ingestion.py -v
+"""
+
+import hashlib
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_factory.knowledge.bm25_index import BM25Index
+from agent_factory.knowledge.manual_indexer import ManualIndexer
+from agent_factory.knowledge.manual_ingestion import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    ManualIngestionQueue,
+)
+from agent_factory.knowledge.pdf_extraction import PDFExtractionEngine
+from test_pdf_extraction import write_pdf
+
+
+def make_db(manual_id="m-1"):
+    """Mock RIVETProDatabase that returns a fixed manual record."""
+    db = MagicMock()
+    db.create_manual.return_value = {"id": manual_id}
+    db.get_manual.return_value = {
+        "id": manual_id, "title": "Manual", "page_count": 3, "indexed": True
+    }
+    db.get_manual_by_hash.return_value = None
+    return db
+
+
+def wait_for(job, timeout=10.0):
+    """Poll until a job finishes."""
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.done, f"job still {job.status}"
+    return job
+
+
+def sha256_of(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def db():
+    return make_db()
+
+
+@pytest.fixture
+def queue(db):
+    q = ManualIngestionQueue(
+        max_workers=1,
+        indexer_factory=lambda: ManualIndexer(
+            db=db, engine=PDFExtractionEngine(max_workers=1), search_index=BM25Index()
+        )
+    )
+    yield q
+    q.shutdown()
+
+
+def submit(queue, path):
+    return queue.submit(
+        file_path=str(path),
+        sha256=sha256_of(path),
+        title="Manual",
+        manufacturer="ABB",
+        component_family="VFD",
+        size_bytes=path.stat().st_size
+    )
+
+
+def test_job_completes_with_progress_and_manual(queue, db, tmp_path):
+    """Job reports page progress and carries the manual fetched by id."""
+    pdf = write_pdf(tmp_path / "a.pdf", ["Overview", "Wiring", "Fault codes"])
+
+    job = wait_for(submit(queue, pdf))
+
+    assert job.status == JOB_COMPLETED
+    assert job.total_pages == 3
+    assert job.pages_done == 3
+    assert job.progress == 1.0
+    assert job.manual_id == "m-1"
+    assert job.manual["page_count"] == 3
+    db.get_manual.assert_called_once_with("m-1")
+    db.search_manuals.assert_not_called()
+    assert db.create_manual.call_args.kwargs["content_sha256"] == job.sha256
+    assert not pdf.exists()  # upload removed once indexed
+
+
+def test_duplicate_content_reuses_job(queue, db, tmp_path):
+    """Identical uploads are indexed once; the second file is discarded."""
+    first = write_pdf(tmp_path / "a.pdf", ["Overview"])
+    second = write_pdf(tmp_path / "b.pdf", ["Overview"])
+
+    job = wait_for(submit(queue, first))
+    again = submit(queue, second)
+
+    assert again is job
+    assert not second.exists()
+    assert db.create_manual.call_count == 1
+    assert queue.find_by_hash(job.sha256) is job
+
+
+def test_content_indexed_before_restart_is_not_reindexed(queue, db, tmp_path):
+    """A hash already stored in equipment_manuals completes without indexing."""
+    pdf = write_pdf(tmp_path / "a.pdf", ["Overview", "Wiring"])
+    db.get_manual_by_hash.return_value = {
+        "id": "m-old", "title": "Manual", "page_count": 2, "indexed": True
+    }
+
+    job = wait_for(submit(queue, pdf))
+
+    assert job.status == JOB_COMPLETED
+    assert job.deduplicated
+    assert job.manual_id == "m-old"
+    assert job.progress == 1.0
+    db.get_manual_by_hash.assert_called_once_with(job.sha256)
+    db.create_manual.assert_not_called()
+    assert not pdf.exists()
+
+
+def test_index_saved_once_per_drain(db, tmp_path):
+    """Jobs queued together are flushed to the index file once, not per job."""
+    index = BM25Index(path=tmp_path / "manuals.bm25")
+    saves = []
+    save = index.save
+    index.save = lambda *a, **kw: saves.append(1) or save(*a, **kw)
+    started = threading.Event()
+
+    def factory():
+        started.wait(5)
+        return ManualIndexer(db=db, engine=PDFExtractionEngine(max_workers=1), search_index=index)
+
+    q = ManualIngestionQueue(max_workers=1, indexer_factory=factory)
+    pdfs = [write_pdf(tmp_path / f"{i}.pdf", [f"Manual {i} wiring"]) for i in range(3)]
+    jobs = [submit(q, pdf) for pdf in pdfs]
+    started.set()
+    for job in jobs:
+        wait_for(job)
+    q.shutdown()
+
+    assert all(job.status == JOB_COMPLETED for job in jobs)
+    assert saves == [1]
+    assert not index.dirty
+    assert len(BM25Index.load(tmp_path / "manuals.bm25")) == len(index)
+
+
+def test_backfill_indexes_manuals_missing_from_index(db, tmp_path):
+    """Manuals ingested before the index are rebuilt from their stored files."""
+    pdf = write_pdf(tmp_path / "old.pdf", ["Fault F0002 auxiliary input"])
+    db.get_all_manuals.return_value = [
+        {"id": "old", "title": "Old Manual", "manufacturer": "ABB", "component_family": "VFD",
+         "file_path": str(pdf)},
+        {"id": "gone", "title": "Deleted Upload", "file_path": str(tmp_path / "gone.pdf")},
+    ]
+    index = BM25Index(path=tmp_path / "manuals.bm25")
+    indexer = ManualIndexer(db=db, engine=PDFExtractionEngine(max_workers=1), search_index=index)
+
+    assert indexer.backfill_index() == {"indexed": 1, "missing_file": 1, "failed": 0}
+    assert index.search("F2")[0].manual_id == "old"
+    assert "old" in BM25Index.load(tmp_path / "manuals.bm25")
+    assert indexer.backfill_index()["indexed"] == 0
+
+
+def test_failed_job_can_be_resubmitted(queue, tmp_path):
+    """A failed job records its error and does not block a retry."""
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"not a pdf")
+
+    failed = wait_for(submit(queue, bad))
+    assert failed.status == JOB_FAILED
+    assert failed.error
+
+    bad.write_bytes(b"not a pdf")
+    retry = submit(queue, bad)
+    assert retry.job_id != failed.job_id
+    wait_for(retry)
+
+
+def test_unknown_job_and_eviction(db, tmp_path):
+    """Finished jobs beyond max_jobs are evicted oldest first."""
+    q = ManualIngestionQueue(
+        max_workers=1,
+        indexer_factory=lambda: ManualIndexer(
+            db=db, engine=PDFExtractionEngine(max_workers=1), search_index=BM25Index()
+        ),
+        max_jobs=2
+    )
+    try:
+        jobs = []
+        for i in range(3):
+            pdf = write_pdf(tmp_path / f"{i}.pdf", [f"Page {i}"])
+            jobs.append(wait_for(submit(q, pdf)))
+
+        assert q.get("missing") is None
+        assert q.get(jobs[0].job_id) is None
+        assert q.get(jobs[2].job_id) is jobs[2]
+        assert q.find_by_hash(jobs[0].sha256) is None
+    finally:
+        q.shutdown()
+
+
+def test_to_dict_is_serializable(queue, tmp_path):
+    """to_dict exposes status fields for the API."""
+    pdf = write_pdf(tmp_path / "a.pdf", ["Overview"])
+    data = wait_for(submit(queue, pdf)).to_dict()
+
+    assert data["status"] == JOB_COMPLETED
+    assert data["progress"] == 1.0
+    assert data["finished_at"] is not None
+
@@ -0,0 +1,225 @@
+"""
+Tests for media rendering helpers (agents/media/rendering.py)
+
+Covers the font/gradient caches, content-hash render cache, batch
+thumbnail rendering, and the ffmpeg command lines for video assembly
+(ffmpeg itself is stubbed out).
+
+Run with:
+    poetry run pytest tests/test_media_rendering.py -v
+"""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from agents.media import rendering
+from agents.media.rendering import (
+    BackgroundSegments,
+    RenderCache,
+    ThumbnailSpec,
+    apply_gradient,
+    assemble_video,
+    get_font,
+    gradient_mask,
+    render_thumbnails,
+)
+from agents.media.thumbnail_agent import ThumbnailAgent
+
+
+def legacy_gradient(img):
+    """The per-variant RGBA gradient the thumbnail agent used to draw."""
+    gradient = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(gradient)
+    for i in range(10):
+        offset = i * 40
+        draw.ellipse(
+            [(offset, offset), (img.width - offset, img.height - offset)],
+            fill=(0, 0, 0, int(255 * (10 - i) / 10 * 0.3))
+        )
+    img.paste(gradient, (0, 0), gradient)
+
+
+def make_specs(tmp_path, count=4):
+    return [
+        ThumbnailSpec(
+            title=f"Motor Control Lesson {i}: Start/Stop Circuits",
+            output_path=str(tmp_path / "out" / f"thumb_{i}.jpg"),
+            accent_color="#ff6b35",
+        )
+        for i in range(count)
+    ]
+
+
+class TestCaches:
+    """Process-wide font and gradient caches."""
+
+    def test_gradient_matches_legacy_drawing(self):
+        cached = Image.new("RGB", (1280, 720), "#336699")
+        legacy = cached.copy()
+
+        apply_gradient(cached)
+        legacy_gradient(legacy)
+
+        assert ImageChops.difference(cached, legacy).getbbox() is None
+
+    def test_gradient_mask_built_once_per_resolution(self):
+        assert gradient_mask(1280, 720) is gradient_mask(1280, 720)
+        assert gradient_mask(640, 360).size == (640, 360)
+
+    def test_font_probe_is_cached(self):
+        assert get_font("missing-font.ttf", 72) is get_font("missing-font.ttf", 72)
+
+
+class TestRenderCache:
+    """Content-hash keyed artifacts."""
+
+    def test_key_tracks_params_and_file_content(self, tmp_path):
+        visual = tmp_path / "visual.png"
+        visual.write_bytes(b"one")
+        key = RenderCache.key("thumbnail", {"title": "A"}, [str(visual)])
+
+        assert key == RenderCache.key("thumbnail", {"title": "A"}, [str(visual)])
+        assert key != RenderCache.key("thumbnail", {"title": "B"}, [str(visual)])
+        visual.write_bytes(b"two!")
+        assert key != RenderCache.key("thumbnail", {"title": "A"}, [str(visual)])
+
+    def test_second_render_is_served_from_cache(self, tmp_path, monkeypatch):
+        cache = RenderCache(tmp_path / "cache")
+        specs = make_specs(tmp_path, count=2)
+        first = render_thumbnails(specs, max_workers=1, cache=cache)
+
+        def fail(spec):
+            raise AssertionError("should not render")
+
+        monkeypatch.setattr(rendering, "render_thumbnail", fail)
+        for spec in specs:
+            Path(spec.output_path).unlink()
+
+        assert render_thumbnails(specs, max_workers=1, cache=cache) == first
+        assert all(Path(spec.output_path).exists() for spec in specs)
+        assert cache.hits == 2 and cache.misses == 2
+
+    def test_output_path_is_not_part_of_key(self, tmp_path):
+        spec = make_specs(tmp_path, count=1)[0]
+        moved = ThumbnailSpec(**{**spec.__dict__, "output_path": str(tmp_path / "elsewhere.jpg")})
+
+        assert spec.cache_key() == moved.cache_key()
+
+
+def test_process_pool_matches_in_process(tmp_path):
+    specs = make_specs(tmp_path / "pool", count=3)
+    serial = make_specs(tmp_path / "serial", count=3)
+
+    pooled_sizes = render_thumbnails(specs, max_workers=2)
+    serial_sizes = render_thumbnails(serial, max_workers=1)
+
+    assert pooled_sizes == serial_sizes
+    for a, b in zip(specs, serial, strict=True):
+        assert Path(a.output_path).read_bytes() == Path(b.output_path).read_bytes()
+
+
+class TestThumbnailAgent:
+    """Agent API on top of the rendering helpers."""
+
+    @pytest.fixture
+    def agent(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("THUMBNAIL_DIR", str(tmp_path / "thumbs"))
+        return ThumbnailAgent(
+            enable_supabase=False,
+            render_cache=RenderCache(tmp_path / "cache"),
+            max_workers=1
+        )
+
+    def test_generate_thumbnails(self, agent):
+        variants = agent.generate_thumbnails("plc_001", "Master 3-Wire Motor Control", "")
+
+        assert [v["color_scheme"] for v in variants] == ["orange", "blue", "yellow"]
+        for variant in variants:
+            with Image.open(variant["file_path"]) as img:
+                assert img.size == (1280, 720)
+            assert variant["file_size_bytes"] == Path(variant["file_path"]).stat().st_size
+
+    def test_batch_reuses_cached_variants(self, agent):
+        agent.generate_thumbnails("plc_001", "Master 3-Wire Motor Control", "")
+
+        results = agent.generate_thumbnails_batch([
+            {"video_id": "plc_001", "title": "Master 3-Wire Motor Control"},
+            {"video_id": "plc_002", "title": "VFD Fault Codes Explained"},
+        ])
+
+        assert set(results) == {"plc_001", "plc_002"}
+        assert all(len(v) == 3 for v in results.values())
+        assert agent.render_cache.hits == 3
+
+
+class TestAssembleVideo:
+    """ffmpeg invocations (stubbed)."""
+
+    @pytest.fixture
+    def ffmpeg_calls(self, monkeypatch):
+        calls = []
+
+        def fake_ffmpeg(args):
+            calls.append(args)
+            Path(args[-1]).write_bytes(b"video")
+
+        monkeypatch.setattr(rendering, "_run_ffmpeg", fake_ffmpeg)
+        return calls
+
+    def test_background_encoded_once_and_stream_copied(self, tmp_path, ffmpeg_calls, monkeypatch):
+        monkeypatch.setattr(rendering, "probe_audio", lambda path: (25.0, "mp3"))
+        background = BackgroundSegments(tmp_path / "cache", segment_seconds=10)
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"narration")
+
+        assemble_video(str(audio), tmp_path / "v1.mp4", background)
+        assemble_video(str(audio), tmp_path / "v2.mp4", background)
+
+        encodes = [c for c in ffmpeg_calls if "lavfi" in c]
+        muxes = [c for c in ffmpeg_calls if "concat" in c]
+        assert len(encodes) == 1 and len(muxes) == 2
+        assert muxes[0][muxes[0].index("-c:v") + 1] == "copy"
+        assert muxes[0][muxes[0].index("-c:a") + 1] == "aac"
+        concat_list = Path(muxes[0][muxes[0].index("-i") + 1]).read_text()
+        assert concat_list.count("file ") == 3
+
+    def test_aac_audio_is_copied(self, tmp_path, ffmpeg_calls, monkeypatch):
+        monkeypatch.setattr(rendering, "probe_audio", lambda path: (5.0, "aac"))
+        audio = tmp_path / "a.m4a"
+        audio.write_bytes(b"narration")
+
+        assemble_video(str(audio), tmp_path / "v.mp4", BackgroundSegments(tmp_path / "cache"))
+
+        mux = ffmpeg_calls[-1]
+        assert mux[mux.index("-c:a") + 1] == "copy"
+
+    def test_output_cut_at_audio_duration(self, tmp_path, ffmpeg_calls, monkeypatch):
+        monkeypatch.setattr(rendering, "probe_audio", lambda path: (12.3456, "aac"))
+        audio = tmp_path / "a.m4a"
+        audio.write_bytes(b"narration")
+
+        assemble_video(str(audio), tmp_path / "v.mp4", BackgroundSegments(tmp_path / "cache"))
+
+        mux = ffmpeg_calls[-1]
+        assert mux[mux.index("-t") + 1] == "12.346"
+        assert mux.index("-t") > mux.index("-map")
+
+    def test_unchanged_audio_skips_encoding(self, tmp_path, ffmpeg_calls, monkeypatch):
+        monkeypatch.setattr(rendering, "probe_audio", lambda path: (5.0, "mp3"))
+        cache = RenderCache(tmp_path / "cache")
+        background = BackgroundSegments(tmp_path / "cache")
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"narration")
+
+        assemble_video(str(audio), tmp_path / "v1.mp4", background, cache=cache)
+        calls_after_first = len(ffmpeg_calls)
+        assemble_video(str(audio), tmp_path / "v2.mp4", background, cache=cache)
+
+        assert len(ffmpeg_calls) == calls_after_first
+        assert (tmp_path / "v2.mp4").read_bytes() == b"video"
+
+        audio.write_bytes(b"new narration")
+        assemble_video(str(audio), tmp_path / "v3.mp4", background, cache=cache)
+        assert len(ffmpeg_calls) == calls_after_first + 1
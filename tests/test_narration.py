@@ -0,0 +1,184 @@
+"""
+Tests for the segment-level narration engine (agents/media/narration.py)
+
+Runs offline against StubTTSProvider; ffmpeg's concat step is replaced by
+a byte-level join that checks the demuxer list.
+
+Run with:
+    poetry run pytest tests/test_narration.py -v
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from agents.media import narration
+from agents.media.narration import (
+    NarrationEngine,
+    SegmentCache,
+    StubTTSProvider,
+    segment_key,
+    split_segments,
+)
+
+INTRO = "Welcome back to Industrial Skills Hub."
+OUTRO = "Subscribe for more PLC tutorials."
+
+
+@pytest.fixture(autouse=True)
+def fake_concat(monkeypatch):
+    """Join segments the way `-c copy` would: bytes in list order."""
+    calls = []
+
+    def fake_ffmpeg(args):
+        assert args[args.index("-c") + 1] == "copy"
+        list_path = Path(args[args.index("-i") + 1])
+        files = [line[len("file '"):-1] for line in list_path.read_text().splitlines()]
+        Path(args[-1]).write_bytes(b"".join(Path(f).read_bytes() for f in files))
+        calls.append(files)
+
+    monkeypatch.setattr(narration, "_run_ffmpeg", fake_ffmpeg)
+    return calls
+
+
+def make_engine(tmp_path, **provider_kwargs):
+    return NarrationEngine(StubTTSProvider(**provider_kwargs), cache=SegmentCache(tmp_path / "tts"))
+
+
+class TestSegmentation:
+    """Script splitting and cache keys."""
+
+    def test_sentences_and_paragraphs(self):
+        script = f"{INTRO}  Today: motor starters!\n\nWhat does the \"seal-in\" contact do? It holds."
+
+        assert split_segments(script) == [
+            INTRO, "Today: motor starters!", 'What does the "seal-in" contact do?', "It holds.",
+        ]
+        assert split_segments(script, granularity="paragraph") == [
+            f"{INTRO} Today: motor starters!", 'What does the "seal-in" contact do? It holds.',
+        ]
+
+    def test_long_sentences_are_capped(self):
+        sentence = ", ".join(f"terminal {i}" for i in range(60)) + "."
+
+        segments = split_segments(sentence, max_chars=100)
+
+        assert all(len(s) <= 100 for s in segments)
+        assert " ".join(segments) == sentence
+
+    def test_key_normalizes_whitespace_and_separates_voices(self):
+        assert segment_key("edge", "guy", "Hello  world\n") == segment_key("edge", "guy", "Hello world")
+        assert segment_key("edge", "guy", "Hello") != segment_key("edge", "aria", "Hello")
+        assert segment_key("edge", "guy", "Hello") != segment_key("openai-tts-1", "guy", "Hello")
+
+    def test_invalid_granularity(self):
+        with pytest.raises(ValueError):
+            split_segments("Hi.", granularity="word")
+
+
+class TestNarrationEngine:
+    """Caching, concurrency and joining."""
+
+    @pytest.mark.asyncio
+    async def test_output_is_segments_in_order(self, tmp_path, fake_concat):
+        engine = make_engine(tmp_path)
+
+        report = await engine.synthesize(f"{INTRO} Step one. Step two.", str(tmp_path / "out.mp3"))
+
+        audio = (tmp_path / "out.mp3").read_bytes().decode()
+        assert audio == f"[stub-voice:{INTRO}][stub-voice:Step one.][stub-voice:Step two.]"
+        assert report.segments == 3 and report.synthesized == 3
+        assert len(fake_concat) == 1
+
+    @pytest.mark.asyncio
+    async def test_editing_one_sentence_resynthesizes_only_it(self, tmp_path):
+        engine = make_engine(tmp_path)
+        await engine.synthesize(f"{INTRO} Check the overload. {OUTRO}", str(tmp_path / "v1.mp3"))
+        engine.provider.calls.clear()
+
+        report = await engine.synthesize(f"{INTRO} Check the overload relay. {OUTRO}", str(tmp_path / "v2.mp3"))
+
+        assert engine.provider.calls == ["Check the overload relay."]
+        assert report.cache_hits == 2 and report.synthesized == 1
+
+    @pytest.mark.asyncio
+    async def test_intro_outro_shared_across_videos(self, tmp_path):
+        first = make_engine(tmp_path)
+        await first.synthesize(f"{INTRO} Video one. {OUTRO}", str(tmp_path / "a.mp3"))
+
+        second = make_engine(tmp_path)
+        await second.synthesize(f"{INTRO} Video two. {OUTRO}", str(tmp_path / "b.mp3"))
+
+        assert second.provider.calls == ["Video two."]
+
+    @pytest.mark.asyncio
+    async def test_repeated_segment_synthesized_once(self, tmp_path):
+        engine = make_engine(tmp_path)
+
+        report = await engine.synthesize("Lock it out. Tag it. Lock it out.", str(tmp_path / "out.mp3"))
+
+        assert sorted(engine.provider.calls) == ["Lock it out.", "Tag it."]
+        assert report.segments == 3 and report.unique_segments == 2
+        assert (tmp_path / "out.mp3").read_bytes().decode().count("Lock it out.") == 2
+
+    @pytest.mark.asyncio
+    async def test_misses_run_concurrently_under_provider_limit(self, tmp_path):
+        engine = make_engine(tmp_path, latency=0.02, max_concurrent=3)
+        script = " ".join(f"Sentence number {i}." for i in range(12))
+
+        await engine.synthesize(script, str(tmp_path / "out.mp3"))
+
+        assert engine.provider.peak_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_use_distinct_temp_files(self, tmp_path):
+        class RecordingProvider(StubTTSProvider):
+            paths = []
+
+            async def synthesize(self, text, output_path):
+                self.paths.append(output_path)
+                await super().synthesize(text, output_path)
+
+        cache = SegmentCache(tmp_path / "tts")
+        engines = [NarrationEngine(RecordingProvider(latency=0.02), cache=cache) for _ in range(2)]
+
+        await asyncio.gather(*(
+            engine.synthesize("Same sentence.", str(tmp_path / f"out{i}.mp3")) for i, engine in enumerate(engines)
+        ))
+
+        assert len(set(RecordingProvider.paths)) == 2
+        assert (tmp_path / "out0.mp3").read_bytes() == (tmp_path / "out1.mp3").read_bytes()
+        assert not list((tmp_path / "tts").rglob("*.tmp*"))
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_is_not_cached(self, tmp_path):
+        class FlakyProvider(StubTTSProvider):
+            async def synthesize(self, text, output_path):
+                Path(output_path).write_bytes(b"partial")
+                if "fail" in text:
+                    raise RuntimeError("TTS service error")
+                await super().synthesize(text, output_path)
+
+        engine = NarrationEngine(FlakyProvider(), cache=SegmentCache(tmp_path / "tts"))
+        with pytest.raises(RuntimeError):
+            await engine.synthesize("Good one. This will fail.", str(tmp_path / "out.mp3"))
+
+        key = segment_key("stub", "stub-voice", "This will fail.")
+        assert engine.cache.get(engine.provider, key) is None
+        assert engine.cache.get(engine.provider, segment_key("stub", "stub-voice", "Good one."))
+        assert not list((tmp_path / "tts").rglob("*.tmp*"))
+
+    @pytest.mark.asyncio
+    async def test_single_segment_skips_ffmpeg(self, tmp_path, fake_concat):
+        engine = make_engine(tmp_path)
+
+        await engine.synthesize("Just one sentence.", str(tmp_path / "out.mp3"))
+
+        assert fake_concat == []
+        assert (tmp_path / "out.mp3").read_bytes() == b"[stub-voice:Just one sentence.]"
+
+    @pytest.mark.asyncio
+    async def test_empty_script_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            await make_engine(tmp_path).synthesize("  \n\n ", str(tmp_path / "out.mp3"))
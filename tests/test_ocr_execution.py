@@ -0,0 +1,292 @@
+"""
+Tests for the OCR execution layer (agent_factory/integrations/telegram/ocr/execution.py).
+
+Run with:
+    poetry run pytest tests/test_ocr_execution.py -v
+"""
+
+import asyncio
+import io
+import random
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+ocr = pytest.importorskip("agent_factory.integrations.telegram.ocr")
+
+from PIL import Image, ImageDraw
+
+from agent_factory.integrations.telegram.ocr import OCRPipeline, OCRResult, OCRResultCache
+from agent_factory.integrations.telegram.ocr.execution import (
+    LatencyHistogram,
+    hedged_extract,
+    prepare_image,
+)
+
+
+def nameplate(width=4000, height=3000, seed=1, fmt="JPEG", quality=92) -> bytes:
+    """Synthetic plate photo: seeded blocks of colour plus a few text lines."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), (200, 200, 190))
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x, y = rng.random() * width, rng.random() * height
+        w, h = rng.random() * width / 3, rng.random() * height / 3
+        draw.rectangle([x, y, x + w, y + h], fill=tuple(rng.randrange(256) for _ in range(3)))
+    for i, line in enumerate(["PowerFlex 525", "480V 3PH 60Hz", "SER A FRN 11.001"]):
+        draw.text((width // 8, height // 3 + i * height // 10), line, fill=(255, 255, 255))
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt, quality=quality)
+    return buffer.getvalue()
+
+
+class StubProvider:
+    """Provider with a fixed delay and answer; counts calls and cancellations."""
+
+    def __init__(self, name, delay, confidence=0.9, error=None, raises=False):
+        self.provider_name = name
+        self.delay = delay
+        self.confidence = confidence
+        self.error = error
+        self.raises = raises
+        self.calls = 0
+        self.cancelled = 0
+        self.uploads = []
+
+    def is_available(self):
+        return True
+
+    async def extract(self, image_bytes):
+        self.calls += 1
+        self.uploads.append(len(image_bytes))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.raises:
+            raise ConnectionError("503 from vision API")
+        return OCRResult(
+            manufacturer="allen_bradley", model_number="POWERFLEX525",
+            confidence=self.confidence, provider=self.provider_name, error=self.error,
+        )
+
+
+def accept(result):
+    return not result.error and result.confidence >= 0.5
+
+
+class TestPrepareImage:
+
+    def test_downscales_to_tile_limits(self):
+        original = nameplate()
+        prepared = prepare_image(original)
+
+        assert prepared.resized
+        assert (prepared.width, prepared.height) == (1024, 768)
+        assert len(prepared.data) < len(original)
+        assert Image.open(io.BytesIO(prepared.data)).format == "JPEG"
+
+    def test_small_jpeg_passes_through(self):
+        original = nameplate(800, 600)
+        prepared = prepare_image(original)
+
+        assert not prepared.resized
+        assert prepared.data is original
+
+    def test_png_is_reencoded_and_garbage_passes_through(self):
+        assert prepare_image(nameplate(800, 600, fmt="PNG")).resized
+
+        prepared = prepare_image(b"not an image")
+        assert prepared.data == b"not an image"
+        assert prepared.phash is None
+
+
+class TestCache:
+
+    def test_recompressed_copy_hits_but_other_plate_misses(self):
+        cache = OCRResultCache()
+        first = prepare_image(nameplate())
+        cache.put(first, OCRResult(model_number="POWERFLEX525", confidence=0.9, provider="gpt4o"))
+
+        forwarded = prepare_image(nameplate(1280, 960, quality=70))
+        other = prepare_image(nameplate(seed=2))
+
+        assert forwarded.digest != first.digest
+        assert cache.get(forwarded).model_number == "POWERFLEX525"
+        assert cache.get(other) is None
+
+    def test_fault_codes_only_match_exactly(self):
+        cache = OCRResultCache()
+        first = prepare_image(nameplate())
+        cache.put(first, OCRResult(fault_code="F004", confidence=0.9))
+
+        assert cache.get(first).fault_code == "F004"
+        assert cache.get(prepare_image(nameplate(quality=70))) is None
+
+    def test_serial_and_identity_results_only_match_exactly(self):
+        cache = OCRResultCache()
+        first = prepare_image(nameplate())
+        cache.put(first, OCRResult(model_number="POWERFLEX525", serial_number="SN-0042", confidence=0.9))
+        forwarded = prepare_image(nameplate(quality=70))
+
+        assert cache.get(first).serial_number == "SN-0042"
+        assert cache.get(forwarded) is None
+
+        cache.put(first, OCRResult(model_number="POWERFLEX525", additional_specs={"Asset Tag": "PUMP-7"}))
+        assert cache.get(forwarded) is None
+
+        cache.put(first, OCRResult(model_number="POWERFLEX525", additional_specs={"voltage_tag": "480V"}))
+        assert cache.get(forwarded).model_number == "POWERFLEX525"
+
+    @pytest.mark.asyncio
+    async def test_inflight_serial_result_not_shared_with_near_match(self):
+        cache = OCRResultCache()
+        first, forwarded = prepare_image(nameplate()), prepare_image(nameplate(quality=70))
+        cache.begin(first)
+        waiter = asyncio.create_task(cache.wait_inflight(forwarded))
+        await asyncio.sleep(0)
+        cache.finish(first, OCRResult(model_number="POWERFLEX525", serial_number="SN-0042", confidence=0.9))
+
+        assert await waiter is None
+
+    def test_lru_and_ttl(self):
+        cache = OCRResultCache(max_entries=1)
+        a, b = prepare_image(nameplate(800, 600)), prepare_image(nameplate(800, 600, seed=2))
+        cache.put(a, OCRResult(confidence=0.9))
+        cache.put(b, OCRResult(confidence=0.8))
+        assert len(cache) == 1
+
+        cache.ttl_seconds = 0
+        cache.put(b, OCRResult(confidence=0.8))
+        assert cache.get(b) is None
+
+
+class TestHedging:
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_never_starts_fallback(self):
+        primary, fallback = StubProvider("gpt4o", 0.01), StubProvider("gemini", 0.01)
+
+        outcome = await hedged_extract([("gpt4o", primary), ("gemini", fallback)], b"img", accept, hedge_after=0.1)
+
+        assert outcome.result.provider == "gpt4o"
+        assert not outcome.hedged and fallback.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        primary, fallback = StubProvider("gpt4o", 1.0), StubProvider("gemini", 0.02)
+
+        outcome = await hedged_extract([("gpt4o", primary), ("gemini", fallback)], b"img", accept, hedge_after=0.05)
+        await asyncio.sleep(0)
+
+        assert outcome.result.provider == "gemini"
+        assert outcome.hedged and outcome.started == ["gpt4o", "gemini"]
+        assert primary.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back_immediately(self):
+        primary, fallback = StubProvider("gpt4o", 0.01, raises=True), StubProvider("gemini", 0.01)
+
+        outcome = await hedged_extract([("gpt4o", primary), ("gemini", fallback)], b"img", accept, hedge_after=10)
+
+        assert outcome.result.provider == "gemini"
+        assert not outcome.hedged
+        assert "503" in outcome.attempts[0].error
+
+    @pytest.mark.asyncio
+    async def test_no_good_answer_returns_best(self):
+        primary = StubProvider("gpt4o", 0.01, confidence=0.3)
+        fallback = StubProvider("gemini", 0.01, confidence=0.4)
+
+        outcome = await hedged_extract([("gpt4o", primary), ("gemini", fallback)], b"img", accept, hedge_after=10)
+
+        assert outcome.result.provider == "gemini"
+        assert len(outcome.attempts) == 2
+
+
+class TestPipeline:
+
+    def pipeline(self, primary, fallback, **kwargs):
+        pipeline = OCRPipeline(gpt4o_api_key=None, gemini_api_key=None, **kwargs)
+        pipeline.gpt4o_provider, pipeline.gemini_provider = primary, fallback
+        return pipeline
+
+    @pytest.mark.asyncio
+    async def test_second_photo_served_from_cache(self):
+        primary, fallback = StubProvider("gpt4o", 0.01), StubProvider("gemini", 0.01)
+        pipeline = self.pipeline(primary, fallback, cache=OCRResultCache())
+
+        first = await pipeline.analyze_photo(nameplate(), skip_quality_check=True)
+        second = await pipeline.analyze_photo(nameplate(quality=75), skip_quality_check=True)
+
+        assert not first.cached and second.cached
+        assert second.model_number == "POWERFLEX525"
+        assert primary.calls == 1
+        assert primary.uploads[0] < len(nameplate())
+        metrics = pipeline.get_metrics()
+        assert metrics["cache_hits"] == 1
+        assert metrics["latency"]["gpt4o"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_forwards_share_one_call(self):
+        primary, fallback = StubProvider("gpt4o", 0.05), StubProvider("gemini", 0.05)
+        pipeline = self.pipeline(primary, fallback, cache=OCRResultCache())
+
+        results = await asyncio.gather(*(
+            pipeline.analyze_photo(nameplate(1280, 960, quality=q), skip_quality_check=True) for q in (90, 80, 70)
+        ))
+
+        assert primary.calls == 1
+        assert sorted(r.cached for r in results) == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_recorded(self):
+        primary, fallback = StubProvider("gpt4o", 1.0), StubProvider("gemini", 0.01)
+        pipeline = self.pipeline(primary, fallback, hedge_after_seconds=0.05, cache=OCRResultCache())
+
+        result = await pipeline.analyze_photo(nameplate(800, 600), skip_quality_check=True)
+
+        assert result.provider == "gemini"
+        assert pipeline.metrics.hedged == 1 and pipeline.metrics.hedge_wins == 1
+
+    def test_hedge_delay_adapts_to_primary_p95(self):
+        pipeline = self.pipeline(None, None, hedge_after_seconds=6.0)
+        assert pipeline.hedge_delay() == 6.0
+
+        for _ in range(40):
+            pipeline.metrics.histogram("gpt4o").observe(2500)
+        assert pipeline.hedge_delay() == pytest.approx(2.5)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_raise_primary_p95():
+    from agent_factory.integrations.telegram.ocr.execution import OCRMetrics
+
+    metrics = OCRMetrics()
+    for _ in range(19):
+        metrics.histogram("gpt4o").observe(20)
+    primary, fallback = StubProvider("gpt4o", 1.0), StubProvider("gemini", 0.01)
+
+    outcome = await hedged_extract(
+        [("gpt4o", primary), ("gemini", fallback)], b"img", accept, hedge_after=0.05, metrics=metrics
+    )
+    await asyncio.sleep(0)  # Let the losing call process its cancellation
+
+    histogram = metrics.histogram("gpt4o")
+    assert outcome.result.provider == "gemini"
+    assert histogram.count == 19 and histogram.censored == 1
+    assert histogram.percentile(0.95) >= 50  # Cancelled after the 50 ms hedge, not a fast 20 ms call
+    assert histogram.to_dict()["avg_ms"] == 20
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(buckets_ms=(100, 1000))
+    for ms in (50, 150, 900, 5000):
+        histogram.observe(ms)
+
+    data = histogram.to_dict()
+
+    assert data["buckets"] == {"<=100": 1, "<=1000": 2, "+Inf": 1}
+    assert data["p50_ms"] == 900
+    assert data["avg_ms"] == pytest.approx(1525)
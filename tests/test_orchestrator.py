@@ -18,7 +18,7 @@ class TestEventBus:
 
     def test_emit_and_receive(self):
         """Events are received by listeners."""
-        bus = EventBus()
+        bus = EventBus(sync=True)
         received = []
 
         bus.on(EventType.AGENT_START, lambda e: received.append(e))
@@ -29,7 +29,7 @@ class TestEventBus:
 
     def test_multiple_listeners(self):
         """Multiple listeners receive same event."""
-        bus = EventBus()
+        bus = EventBus(sync=True)
         count = [0]
 
         bus.on(EventType.AGENT_START, lambda e: count.__setitem__(0, count[0] + 1))
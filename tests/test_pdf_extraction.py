@@ -0,0 +1,209 @@
+"""
+Tests for the shared PDF extraction engine (pdf_extraction.py).
+
+Run with:
+    poetry run pytest tests/test_pdf_extraction.py -v
+"""
+
+from pathlib import Path
+
+import pytest
+
+from agent_factory.knowledge.pdf_extraction import (
+    PDFExtractionEngine,
+    SectionIndex,
+    StreamingChunker,
+    chunk_text,
+    get_extraction_pool,
+    shutdown_extraction_pool,
+)
+
+SECTION_KEYWORDS = {
+    "installation": ["installation", "wiring"],
+    "troubleshooting": ["troubleshooting", "fault codes"],
+    "maintenance": ["maintenance", "preventive maintenance"],
+}
+
+
+def write_pdf(path: Path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in page_texts:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+    path.write_bytes(bytes(out))
+    return path
+
+
+def naive_chunks(text, size, overlap):
+    """Reference chunking by slicing the full text (terminates at the end)."""
+    chunks = []
+    pos = 0
+    while pos < len(text):
+        end = min(pos + size, len(text))
+        piece = text[pos:end].strip()
+        if piece:
+            chunks.append((piece, pos, end))
+        if end == len(text):
+            break
+        pos = end - overlap
+    return chunks
+
+
+class TestPDFExtractionEngine:
+    """Test page extraction in-process and through the process pool."""
+
+    def test_pages_in_order_sequential(self, tmp_path):
+        pdf = write_pdf(tmp_path / "m.pdf", [f"Page body {i}" for i in range(5)])
+        engine = PDFExtractionEngine(max_workers=1)
+
+        pages = list(engine.iter_pages(pdf))
+
+        assert [p.page_number for p in pages] == [1, 2, 3, 4, 5]
+        assert "Page body 3" in pages[3].text
+
+    def test_pages_in_order_parallel(self, tmp_path):
+        pdf = write_pdf(tmp_path / "m.pdf", [f"Page body {i}" for i in range(40)])
+        engine = PDFExtractionEngine(
+            max_workers=2, pages_per_task=3, max_buffered_pages=6, parallel_threshold=1
+        )
+
+        pages = list(engine.iter_pages(pdf))
+
+        assert [p.page_number for p in pages] == list(range(1, 41))
+        assert all(f"Page body {i}" in p.text for i, p in enumerate(pages))
+
+    def test_engines_share_one_spawn_pool(self, tmp_path):
+        pdf = write_pdf(tmp_path / "m.pdf", [f"Page body {i}" for i in range(8)])
+        shutdown_extraction_pool()
+        try:
+            for _ in range(2):
+                engine = PDFExtractionEngine(max_workers=2, pages_per_task=2, parallel_threshold=1)
+                assert len(list(engine.iter_pages(pdf))) == 8
+
+            pool = get_extraction_pool(4)
+            assert pool is get_extraction_pool(2)
+            assert pool._mp_context.get_start_method() == "spawn"
+            assert pool._max_workers == 2
+        finally:
+            shutdown_extraction_pool()
+
+    def test_extract_text_joins_pages(self, tmp_path):
+        pdf = write_pdf(tmp_path / "m.pdf", ["alpha", "beta"])
+        text, page_count = PDFExtractionEngine(max_workers=1).extract_text(pdf)
+
+        assert page_count == 2
+        assert "alpha" in text and "beta" in text
+
+
+class TestSectionIndex:
+    """Test combined-regex section detection with bisect lookup."""
+
+    def test_section_lookup(self):
+        text = "intro text\nInstallation\nmount it\nFault Codes\nF0002 overcurrent\n"
+        index = SectionIndex(SECTION_KEYWORDS)
+        index.scan(text)
+
+        assert index.section_at(0) == "general"
+        assert index.section_at(text.index("mount")) == "installation"
+        assert index.section_at(text.index("F0002")) == "troubleshooting"
+
+    def test_longest_keyword_wins(self):
+        index = SectionIndex(SECTION_KEYWORDS)
+        index.scan("Preventive Maintenance\nclean filters\n")
+
+        sections = index.sections(40)
+        assert len(sections) == 1
+        assert sections[0]["keyword"] == "preventive maintenance"
+        assert sections[0]["end_pos"] == 40
+
+    def test_scan_with_offsets(self):
+        index = SectionIndex(SECTION_KEYWORDS)
+        index.scan("page one\n", offset=0)
+        index.scan("Wiring\nterminal X1\n", offset=100)
+
+        assert index.section_at(99) == "general"
+        assert index.section_at(105) == "installation"
+
+
+class TestStreamingChunker:
+    """Test streaming chunks match slicing the joined text."""
+
+    @pytest.mark.parametrize("size,overlap", [(500, 100), (400, 80), (50, 10)])
+    def test_matches_full_text_slicing(self, size, overlap):
+        pages = [("word%d " % i) * (37 + i * 11) for i in range(12)]
+        pages[4] = ""  # Empty pages are skipped when joining
+        full_text = "\n".join(p for p in pages if p)
+
+        chunker = StreamingChunker(size, overlap)
+        streamed = []
+        for page in pages:
+            chunker.feed(page)
+            streamed.extend(chunker.ready())
+        streamed.extend(chunker.finish())
+
+        expected = naive_chunks(full_text, size, overlap)
+        assert [(c["text"], c["start_pos"], c["end_pos"]) for c in streamed] == expected
+        assert [c["chunk_index"] for c in streamed] == list(range(len(expected)))
+
+    def test_buffer_stays_bounded(self):
+        chunker = StreamingChunker(500, 100)
+        for _ in range(200):
+            chunker.feed("x" * 2000)
+            list(chunker.ready())
+            assert len(chunker._buffer) < 2000 + 500 + 1
+
+    def test_short_text_terminates(self):
+        chunks = chunk_text("short manual", 500, 100)
+        assert len(chunks) == 1
+        assert chunks[0]["text"] == "short manual"
+
+    def test_overlap_must_be_smaller(self):
+        with pytest.raises(ValueError):
+            StreamingChunker(100, 100)
+
+
+def test_manual_indexer_streams_sections(tmp_path):
+    """ManualIndexer.iter_chunks tags chunks with detected sections."""
+    from unittest.mock import MagicMock
+
+    from agent_factory.knowledge.manual_indexer import ManualIndexer
+
+    pdf = write_pdf(tmp_path / "m.pdf", ["Overview", "Troubleshooting", "F0002 " * 100])
+    indexer = ManualIndexer(db=MagicMock(), engine=PDFExtractionEngine(max_workers=1))
+
+    stats = {}
+    chunks = list(indexer.iter_chunks(pdf, stats))
+
+    assert stats["page_count"] == 3
+    assert stats["section_count"] == 2
+    assert chunks[0]["section_type"] == "introduction"
+    assert chunks[-1]["section_type"] == "troubleshooting"
@@ -0,0 +1,179 @@
+"""
+Tests for the KnowledgeGapFiller write path and background fill queue.
+
+Run with:
+    poetry run pytest tests/test_response_gap_filler.py -v
+"""
+
+import asyncio
+
+import pytest
+
+gap_filler = pytest.importorskip("agent_factory.tools.response_gap_filler")
+
+AtomCandidate = gap_filler.AtomCandidate
+GapType = gap_filler.GapType
+KnowledgeGap = gap_filler.KnowledgeGap
+KnowledgeGapFiller = gap_filler.KnowledgeGapFiller
+gap_signature = gap_filler.gap_signature
+
+
+class FakeDB:
+    """Records queries; answers the bulk upsert's RETURNING clause."""
+
+    def __init__(self, existing=(), fail_bulk=False):
+        self.existing = set(existing)
+        self.fail_bulk = fail_bulk
+        self.queries = []
+
+    def execute_query(self, sql, params=None, fetch_mode="all"):
+        self.queries.append((sql, params))
+        if "ON CONFLICT" in sql:
+            if self.fail_bulk:
+                raise RuntimeError("value too long for type character varying")
+            ids = params[::15]
+            return [(atom_id, atom_id not in self.existing) for atom_id in ids]
+        if sql.strip().startswith("SELECT"):
+            return [(params[0],)] if params[0] in self.existing else []
+        return None
+
+
+def make_filler(db=None, **kwargs):
+    filler = KnowledgeGapFiller(research_executor=object(), **kwargs)
+    filler._db_manager = db or FakeDB()
+    return filler
+
+
+def make_atoms(n):
+    return [AtomCandidate(id=f"atom:test_{i}", title=f"Fault F{i}", content=f"Fault F{i} content") for i in range(n)]
+
+
+def make_gap(query="My Lenze drive shows F0001", fault_code="F0001"):
+    return KnowledgeGap(
+        gap_type=GapType.MISSING_FAULT_CODE,
+        description=f"Missing fault code documentation: {fault_code}",
+        original_query=query,
+        extracted_manufacturer="Lenze",
+        extracted_equipment_type="VFD",
+        extracted_fault_code=fault_code,
+    )
+
+
+class TestBatchedWrites:
+
+    @pytest.mark.asyncio
+    async def test_one_embedding_call_and_one_upsert(self):
+        db = FakeDB(existing={"atom:test_1"})
+        filler = make_filler(db)
+        embed_calls = []
+
+        async def fake_embeddings(texts):
+            embed_calls.append(list(texts))
+            return [[0.1, 0.2] for _ in texts]
+
+        filler._generate_embeddings = fake_embeddings
+        created, updated, failures = await filler._insert_atoms(make_atoms(4))
+
+        assert len(embed_calls) == 1 and len(embed_calls[0]) == 4
+        assert len(db.queries) == 1
+        sql, params = db.queries[0]
+        assert "ON CONFLICT (atom_id) DO UPDATE" in sql
+        assert len(params) == 4 * 15
+        assert params[12] == "[0.1,0.2]"
+        assert created == ["atom:test_0", "atom:test_2", "atom:test_3"]
+        assert updated == ["atom:test_1"]
+        assert failures == []
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_collapsed(self):
+        db = FakeDB()
+        filler = make_filler(db)
+        filler._generate_embeddings = lambda texts: asyncio.sleep(0, [[] for _ in texts])
+
+        atoms = make_atoms(2) + make_atoms(1)
+        created, _, _ = await filler._insert_atoms(atoms)
+
+        assert created == ["atom:test_0", "atom:test_1"]
+        assert len(db.queries[0][1]) == 2 * 15
+
+    @pytest.mark.asyncio
+    async def test_bulk_failure_falls_back_to_rows(self):
+        db = FakeDB(existing={"atom:test_0"}, fail_bulk=True)
+        filler = make_filler(db)
+        filler._generate_embeddings = lambda texts: asyncio.sleep(0, [[] for _ in texts])
+
+        created, updated, failures = await filler._insert_atoms(make_atoms(2))
+
+        assert updated == ["atom:test_0"]
+        assert created == ["atom:test_1"]
+        assert failures == []
+
+
+class TestFillQueue:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_same_gap_fills_once(self):
+        filler = make_filler()
+        calls = []
+
+        async def slow_fill(gap):
+            calls.append(gap.gap_id)
+            await asyncio.sleep(0.05)
+            return gap.gap_id
+
+        filler.fill_gap = slow_fill
+        first = filler.schedule_fill(make_gap("My Lenze drive shows F0001"))
+        second = filler.schedule_fill(make_gap("lenze VFD F0001 fault??"))
+
+        assert first is second
+        assert await first == calls[0]
+        assert len(calls) == 1
+        assert filler.fill_queue.stats["deduplicated"] == 1
+
+        # Finished fills don't block a later re-fill
+        await filler.schedule_fill(make_gap())
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_detect_and_schedule_does_not_wait(self):
+        filler = make_filler()
+        release = asyncio.Event()
+
+        async def blocked_fill(gap):
+            await release.wait()
+            return gap
+
+        filler.fill_gap = blocked_fill
+        gap = filler.detect_and_schedule("Lenze VFD fault F0001", [], 0.1)
+
+        assert gap is not None
+        assert filler.fill_queue.in_flight == 1
+        release.set()
+        await filler.fill_queue.join()
+        assert filler.fill_queue.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent_fills(self):
+        filler = make_filler(max_concurrent_fills=2)
+        running = 0
+        peak = 0
+
+        async def fill(gap):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        filler.fill_gap = fill
+        for code in ("F0001", "F0002", "F0003", "F0004", "F0005"):
+            filler.schedule_fill(make_gap(fault_code=code))
+        await filler.fill_queue.join()
+
+        assert peak == 2
+        assert filler.fill_queue.stats["completed"] == 5
+
+
+def test_gap_signature():
+    assert gap_signature(make_gap("a")) == gap_signature(make_gap("b"))
+    assert gap_signature(make_gap(fault_code="F0001")) != gap_signature(make_gap(fault_code="F0002"))
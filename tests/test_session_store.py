@@ -0,0 +1,180 @@
+"""
+Tests for the bounded session store (agent_factory/memory/session_store.py)
+and the Telegram session manager built on it.
+
+Run with:
+    poetry run pytest tests/test_session_store.py -v
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_factory.memory import InMemoryStorage, Session, SessionStore, SQLiteStorage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_session(key):
+    return Session(session_id=f"telegram_{key}", user_id=f"telegram_{key}")
+
+
+class TestSessionStore:
+    """LRU, TTL and spill behaviour."""
+
+    def test_lru_eviction_at_cap(self):
+        store = SessionStore(max_sessions=3, shards=1)
+        for key in range(3):
+            store.put(key, make_session(key))
+
+        assert store.get(0) is not None  # 0 is now most recently used
+        store.put(3, make_session(3))
+
+        assert len(store) == 3
+        assert store.get(1) is None
+        assert store.get(0) is not None and store.get(3) is not None
+        assert store.metrics.evicted == 1
+
+    def test_cap_holds_across_shards(self):
+        store = SessionStore(max_sessions=64, shards=8)
+        for key in range(1000):
+            store.put(key, make_session(key))
+
+        assert len(store) <= 64
+        assert store.get(999) is not None
+
+    def test_lazy_expiry_on_get(self):
+        clock = FakeClock()
+        store = SessionStore(ttl_seconds=60, shards=1, clock=clock)
+        store.put(1, make_session(1))
+
+        clock.now += 59
+        assert store.get(1) is not None  # Touch resets the idle time
+        clock.now += 61
+        assert 1 not in store
+        assert store.get(1) is None
+        assert len(store) == 0 and store.metrics.expired == 1
+
+    def test_sweep_stops_at_first_live_entry(self):
+        clock = FakeClock()
+        store = SessionStore(ttl_seconds=60, shards=2, clock=clock)
+        for key in range(4):
+            store.put(key, make_session(key))
+        clock.now += 30
+        store.get(2)
+        clock.now += 40
+
+        assert sorted(store.sweep()) == [0, 1, 3]
+        assert len(store) == 1
+        assert store.sweep(ttl_seconds=1) == [2]
+
+    def test_spill_and_restore(self, tmp_path):
+        spill = SQLiteStorage(str(tmp_path / "spill.db"))
+        store = SessionStore(max_sessions=1, shards=1, spill_storage=spill)
+        first = make_session(1)
+        first.add_user_message("Motor 3 tripped on F0002")
+        store.put(1, first)
+        store.put(2, make_session(2))
+        store.flush_spills()
+
+        assert store.metrics.spilled == 1
+        restored = store.get(1, session_id="telegram_1")
+
+        assert restored.history.get_messages()[0].content == "Motor 3 tripped on F0002"
+        assert store.metrics.restored == 1
+        assert store.get(2) is None  # Restoring 1 evicted 2 in turn
+
+    def test_stale_spilled_session_is_discarded(self):
+        spill = InMemoryStorage()
+        stale = make_session(1)
+        stale.last_active = datetime.now() - timedelta(hours=2)
+        spill.save_session(stale)
+        store = SessionStore(ttl_seconds=3600, spill_storage=spill)
+
+        assert store.get(1, session_id="telegram_1") is None
+        store.flush_spills()
+        assert spill.load_session("telegram_1") is None
+
+    def test_spill_writes_do_not_block_put(self):
+        release = threading.Event()
+
+        class SlowStorage(InMemoryStorage):
+            def save_session(self, session):
+                release.wait(timeout=5)
+                super().save_session(session)
+
+        spill = SlowStorage()
+        store = SessionStore(max_sessions=1, shards=1, spill_storage=spill)
+        first = make_session(1)
+        store.put(1, first)
+        store.put(2, make_session(2))  # Returns while the write is still blocked
+
+        assert store.metrics.spilled == 0
+        assert store.get(1, session_id="telegram_1") is first  # Served from the pending write
+
+        release.set()
+        store.close()
+        assert spill.load_session("telegram_2") is not None  # Evicted by restoring 1
+
+    def test_pop_removes_spilled_copy(self):
+        spill = InMemoryStorage()
+        store = SessionStore(max_sessions=1, shards=1, spill_storage=spill)
+        store.put(1, make_session(1))
+        store.put(2, make_session(2))
+
+        store.pop(1, session_id="telegram_1")
+
+        assert store.get(1, session_id="telegram_1") is None
+        store.flush_spills()
+        assert spill.load_session("telegram_1") is None
+
+
+class TestTelegramSessionManager:
+    """Public behaviour callers rely on."""
+
+    @pytest.fixture
+    def manager_cls(self):
+        module = pytest.importorskip("agent_factory.integrations.telegram.session_manager")
+        return module.TelegramSessionManager
+
+    def test_token_bucket_rate_limit(self, manager_cls):
+        manager = manager_cls()
+
+        results = [manager.check_rate_limit(1, limit=3, window_seconds=60) for _ in range(4)]
+
+        assert results[:3] == [(True, None)] * 3
+        allowed, wait = results[3]
+        assert not allowed and 1 <= wait <= 20
+        assert manager.check_rate_limit(2, limit=3)[0]  # Per chat
+        assert manager.get_stats()["rate_limited"] == 1
+
+    def test_agent_type_and_reset(self, manager_cls):
+        manager = manager_cls()
+        assert manager.get_agent_type(5) == "bob"
+
+        manager.set_agent_type(5, "research")
+        session = manager.get_or_create(5)
+        manager.set_pending_approval(5, "delete_files", {"count": 2})
+
+        assert manager.get_agent_type(5) == "research"
+        assert manager.get_stats()["agent_distribution"] == {"research": 1}
+        manager.reset_session(5)
+        assert manager.get_or_create(5) is not session
+        assert manager.get_pending_approval(5) is None
+
+    def test_bounded_sessions_and_buckets(self, manager_cls):
+        manager = manager_cls(max_sessions=10, shards=2)
+        for chat_id in range(100):
+            manager.get_or_create(chat_id)
+            manager.check_rate_limit(chat_id)
+
+        stats = manager.get_stats()
+        assert stats["active_sessions"] <= 10
+        assert stats["rate_limit_buckets"] == 10
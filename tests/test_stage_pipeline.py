@@ -0,0 +1,135 @@
+"""
+Tests for the streaming stage pipeline (agent_factory/workflows/stage_pipeline.py).
+
+Run with:
+    poetry run pytest tests/test_stage_pipeline.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_factory.workflows.stage_pipeline import PipelineCheckpoint, Stage, StagePipeline
+
+
+@pytest.mark.asyncio
+async def test_stages_overlap():
+    events = []
+
+    async def download(n):
+        await asyncio.sleep(0.02)
+        events.append(("download", n))
+        return n
+
+    async def upload(n):
+        events.append(("upload", n))
+        return n * 10
+
+    report = await StagePipeline([Stage("download", download), Stage("upload", upload)]).run(range(5))
+
+    assert sorted(report.results) == [0, 10, 20, 30, 40]
+    # The first item is uploaded before the last one is downloaded
+    assert events.index(("upload", 0)) < events.index(("download", 4))
+
+
+@pytest.mark.asyncio
+async def test_workers_run_concurrently_and_sync_funcs_use_threads():
+    def slow(n):
+        time.sleep(0.05)
+        return n
+
+    start = time.perf_counter()
+    report = await StagePipeline([Stage("work", slow, workers=4)]).run(range(8))
+    elapsed = time.perf_counter() - start
+
+    assert sorted(report.results) == list(range(8))
+    assert elapsed < 0.3  # Sequential would be 0.4s
+    assert report.stages["work"].utilization(report.wall_seconds) > 0.5
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_batching():
+    batches = []
+
+    async def split(n):
+        return [f"{n}-{i}" for i in range(3)]
+
+    async def upload(items):
+        batches.append(len(items))
+        return [item.upper() for item in items]
+
+    report = await StagePipeline([
+        Stage("split", split, fan_out=True),
+        Stage("upload", upload, batch_size=4, batch_timeout=0.05),
+    ]).run(range(4))
+
+    assert len(report.results) == 12
+    assert sum(batches) == 12 and max(batches) == 4
+    assert report.stages["upload"].calls == len(batches)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_per_item():
+    async def parse(n):
+        if n == 2:
+            raise ValueError("corrupt PDF")
+        return n
+
+    async def upload(items):
+        return [RuntimeError("rejected") if n == 3 else n for n in items]
+
+    report = await StagePipeline([
+        Stage("parse", parse),
+        Stage("upload", upload, batch_size=10, batch_timeout=0.01),
+    ]).run(range(5))
+
+    assert sorted(report.results) == [0, 1, 4]
+    assert report.stages["parse"].errors == 1
+    assert report.stages["upload"].errors == 1
+    assert {e["error"] for e in report.errors} == {"corrupt PDF", "rejected"}
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_resumes_after_crash(tmp_path):
+    path = tmp_path / "run.jsonl"
+    calls = []
+    site_down = True
+
+    async def extract(url):
+        calls.append(url)
+        if url == "c" and site_down:
+            raise ConnectionError("vendor site down")
+        return f"{url}.json"
+
+    def stages():
+        return [Stage(
+            "extract", extract, key=lambda url: url,
+            restore=lambda url, stored: stored,
+        )]
+
+    first = await StagePipeline(stages(), checkpoint=PipelineCheckpoint(path)).run(["a", "b", "c"])
+    assert sorted(first.results) == ["a.json", "b.json"]
+
+    calls.clear()
+    site_down = False
+    second = await StagePipeline(stages(), checkpoint=PipelineCheckpoint(path)).run(["a", "b", "c"])
+
+    assert calls == ["c"]
+    assert sorted(second.results) == ["a.json", "b.json", "c.json"]
+    assert second.stages["extract"].restored == 2
+
+
+def test_checkpoint_ignores_torn_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    checkpoint = PipelineCheckpoint(path)
+    checkpoint.mark("upload", "atom:1", "uploaded")
+    checkpoint.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"stage": "upload", "ke')
+
+    reloaded = PipelineCheckpoint(path)
+
+    assert reloaded.done("upload", "atom:1")
+    assert reloaded.get("upload", "atom:1") == "uploaded"
+    assert len(reloaded) == 1
@@ -0,0 +1,195 @@
+"""
+Tests for per-chat agent queues (agent_factory/integrations/telegram/dispatcher.py)
+
+Run with:
+    poetry run pytest tests/test_telegram_dispatcher.py -v
+"""
+
+import asyncio
+
+import pytest
+
+dispatcher = pytest.importorskip("agent_factory.integrations.telegram.dispatcher")
+ChatDispatcher = dispatcher.ChatDispatcher
+DispatcherBusy = dispatcher.DispatcherBusy
+
+
+class RecordingHandler:
+    """Turn handler that records calls and per-chat overlap."""
+
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.turns = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.busy_chats = set()
+        self.overlapped = False
+
+    async def __call__(self, chat_id, text):
+        if chat_id in self.busy_chats:
+            self.overlapped = True
+        self.busy_chats.add(chat_id)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            self.turns.append((chat_id, text))
+            return f"reply to {text!r}"
+        finally:
+            self.in_flight -= 1
+            self.busy_chats.discard(chat_id)
+
+
+@pytest.mark.asyncio
+async def test_rapid_messages_coalesce_into_one_turn():
+    handler = RecordingHandler()
+    chats = ChatDispatcher(coalesce_seconds=0.05)
+
+    replies = await asyncio.gather(
+        chats.submit(1, "Motor 3 tripped", handler),
+        chats.submit(1, "fault F0002", handler),
+        chats.submit(1, "on the PowerFlex 525", handler),
+    )
+
+    assert handler.turns == [(1, "Motor 3 tripped\nfault F0002\non the PowerFlex 525")]
+    assert replies[:2] == [None, None]
+    assert replies[2].startswith("reply to")
+    assert chats.metrics.coalesced == 2 and chats.metrics.turns == 1
+    assert chats.queue_depth(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_turns_are_serialized_per_chat():
+    handler = RecordingHandler(latency=0.03)
+    chats = ChatDispatcher(coalesce_seconds=0)
+
+    first = asyncio.create_task(chats.submit(1, "one", handler))
+    await asyncio.sleep(0.01)  # First turn is running
+    second = await chats.submit(1, "two", handler)
+
+    assert await first == "reply to 'one'"
+    assert second == "reply to 'two'"
+    assert [text for _, text in handler.turns] == ["one", "two"]
+    assert not handler.overlapped
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_limit():
+    handler = RecordingHandler(latency=0.02)
+    chats = ChatDispatcher(max_concurrent=2, coalesce_seconds=0)
+
+    await asyncio.gather(*(chats.submit(chat_id, "hi", handler) for chat_id in range(8)))
+
+    assert handler.peak_in_flight == 2
+    assert len(handler.turns) == 8
+    assert chats.metrics.max_wait_sec > 0
+    assert chats.metrics.to_dict()["avg_turn_sec"] > 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_chat_queue_is_deep():
+    handler = RecordingHandler(latency=0.05)
+    chats = ChatDispatcher(max_queued_per_chat=2, coalesce_seconds=0.2)
+
+    accepted = [asyncio.create_task(chats.submit(1, str(i), handler)) for i in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(DispatcherBusy) as busy:
+        await chats.submit(1, "2", handler)
+
+    assert busy.value.retry_after >= 1
+    assert "busy" in busy.value.user_message
+    assert chats.metrics.shed == 1
+    await asyncio.gather(*accepted)
+    assert chats.metrics.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_total_queue_is_full():
+    handler = RecordingHandler()
+    chats = ChatDispatcher(max_queued_total=3, coalesce_seconds=0.1)
+
+    accepted = [asyncio.create_task(chats.submit(chat_id, "hi", handler)) for chat_id in range(3)]
+    await asyncio.sleep(0)
+    with pytest.raises(DispatcherBusy):
+        await chats.submit(99, "hi", handler)
+
+    await asyncio.gather(*accepted)
+    assert chats.metrics.peak_queued == 3
+
+
+@pytest.mark.asyncio
+async def test_handler_error_reaches_caller_and_queue_continues():
+    calls = []
+
+    async def flaky(chat_id, text):
+        calls.append(text)
+        if text == "bad":
+            raise RuntimeError("agent crashed")
+        return "ok"
+
+    chats = ChatDispatcher(coalesce_seconds=0)
+    with pytest.raises(RuntimeError):
+        await chats.submit(1, "bad", flaky)
+
+    assert await chats.submit(1, "good", flaky) == "ok"
+    assert chats.metrics.failed_turns == 1
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_queued_messages():
+    handler = RecordingHandler(latency=1.0)
+    chats = ChatDispatcher(coalesce_seconds=0)
+
+    pending = asyncio.create_task(chats.submit(1, "slow", handler))
+    await asyncio.sleep(0.01)
+    await chats.shutdown()
+
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert chats.metrics.active_chats == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_keeps_arrival_order_without_waiting():
+    handler = RecordingHandler()
+    chats = ChatDispatcher(coalesce_seconds=0.05)
+
+    first = chats.enqueue(1, "Motor 3 tripped", handler)
+    second = chats.enqueue(1, "fault F0002", handler)
+
+    assert chats.queue_depth(1) == 2
+    assert await first is None
+    assert await second == "reply to 'Motor 3 tripped\\nfault F0002'"
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_keeps_chat_slot_until_thread_finishes():
+    import threading
+
+    release = threading.Event()
+    events = []
+
+    def slow_agent(text):
+        release.wait(5)
+        events.append(f"{text} finished")
+        return text
+
+    async def turn(chat_id, text):
+        events.append(f"{text} started")
+        try:
+            return await chats.run_blocking(chat_id, slow_agent, text, timeout=0.05)
+        except asyncio.TimeoutError:
+            return "timed out"
+
+    chats = ChatDispatcher(max_concurrent=1, coalesce_seconds=0)
+    assert await chats.submit(1, "first", turn) == "timed out"
+
+    second = asyncio.create_task(chats.submit(2, "second", turn))
+    await asyncio.sleep(0.1)
+    assert events == ["first started"]  # Slot still held by the abandoned call
+
+    release.set()
+    assert await second == "second"
+    assert events == ["first started", "first finished", "second started", "second finished"]
+    assert chats.metrics.timed_out == 1
+    await chats.shutdown()
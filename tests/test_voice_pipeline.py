@@ -0,0 +1,159 @@
+"""
+Tests for the in-memory voice pipeline (agent_factory/integrations/telegram/voice/).
+
+Run with:
+    poetry run pytest tests/test_voice_pipeline.py -v
+"""
+
+import asyncio
+import math
+import struct
+
+import pytest
+
+pytest.importorskip("agent_factory.integrations.telegram.voice")
+
+from agent_factory.integrations.telegram.voice.audio_utils import (
+    SAMPLE_RATE,
+    AudioConverter,
+    detect_format,
+    plan_segments,
+)
+from agent_factory.integrations.telegram.voice.pipeline import VoicePipeline
+from agent_factory.integrations.telegram.voice.transcriber import WhisperTranscriber
+
+
+def speech(pattern):
+    """16 kHz PCM from (seconds, loud) pairs: a 220 Hz tone or near-silence."""
+    samples = []
+    for seconds, loud in pattern:
+        for n in range(int(seconds * SAMPLE_RATE)):
+            samples.append(int(8000 * math.sin(2 * math.pi * 220 * n / SAMPLE_RATE)) if loud else (n % 7) - 3)
+    return struct.pack(f"<{len(samples)}h", *samples)
+
+
+def wav(pattern):
+    return AudioConverter.pcm_to_wav(speech(pattern))
+
+
+class StubTranscriber:
+    """Returns the segment's filename; tracks concurrency."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def transcribe(self, audio, language=None, filename=None):
+        self.calls.append((filename, len(audio)))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return f"<{filename}>"
+
+
+def test_detect_format():
+    assert detect_format(b"OggS\x00\x02" + b"\x00" * 20) == "ogg"
+    assert detect_format(wav([(0.1, True)])) == "wav"
+    assert detect_format(b"ID3\x04rest") == "mp3"
+    assert detect_format(b"\x00\x00\x00\x20ftypM4A ") == "m4a"
+    assert detect_format(b"garbage") is None
+
+
+def test_segments_cut_in_pauses():
+    # 25s talk, 1s pause, 25s talk, 1s pause, 25s talk
+    pcm = speech([(25, True), (1, False), (25, True), (1, False), (25, True)])
+
+    ranges = plan_segments(pcm, target_seconds=30, max_seconds=40)
+
+    cuts = [end / 2 / SAMPLE_RATE for _, end in ranges[:-1]]
+    assert cuts == [pytest.approx(25.5, abs=0.1), pytest.approx(51.5, abs=0.1)]
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(pcm)
+
+
+def test_hard_cut_without_pauses():
+    ranges = plan_segments(speech([(50, True)]), target_seconds=10, max_seconds=20)
+
+    assert [round((end - start) / 2 / SAMPLE_RATE) for start, end in ranges] == [20, 20, 10]
+
+
+@pytest.mark.asyncio
+async def test_short_ogg_uploaded_unchanged(monkeypatch):
+    async def no_ffmpeg(*args, **kwargs):
+        raise AssertionError("ffmpeg should not run for a short OGG note")
+
+    monkeypatch.setattr(AudioConverter, "pipe", no_ffmpeg)
+    transcriber = StubTranscriber()
+    note = b"OggS" + b"\x00" * 1000
+
+    transcript = await VoicePipeline(transcriber).transcribe(note, duration=8)
+
+    assert transcript.text == "<voice.ogg>"
+    assert not transcript.converted
+    assert transcriber.calls == [("voice.ogg", len(note))]
+
+
+@pytest.mark.asyncio
+async def test_long_note_split_and_transcribed_concurrently():
+    transcriber = StubTranscriber()
+    pipeline = VoicePipeline(transcriber, split_after_seconds=20, target_segment_seconds=10, max_segment_seconds=15)
+    note = wav([(9, True), (0.5, False), (9, True), (0.5, False), (9, True)])
+
+    transcript = await pipeline.transcribe(note, duration=28)
+
+    assert transcript.segments == 3
+    assert transcript.text == "<segment-0.wav> <segment-1.wav> <segment-2.wav>"
+    assert transcriber.peak == 3
+    assert pipeline.metrics.split == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_bounded_across_chats():
+    transcriber = StubTranscriber()
+    pipeline = VoicePipeline(transcriber, max_concurrent=2)
+
+    await asyncio.gather(*(pipeline.transcribe(b"OggS" + bytes(100), duration=5) for _ in range(6)))
+
+    assert transcriber.peak == 2
+    assert pipeline.metrics.peak_in_flight == 2
+    assert pipeline.metrics.passthrough == 6
+
+
+@pytest.mark.asyncio
+async def test_long_ogg_without_ffmpeg_falls_back_to_single_upload(monkeypatch):
+    async def missing(*args, **kwargs):
+        raise RuntimeError("ffmpeg not found")
+
+    monkeypatch.setattr(AudioConverter, "pipe", missing)
+    transcriber = StubTranscriber()
+
+    transcript = await VoicePipeline(transcriber).transcribe(b"OggS" + bytes(100), duration=300)
+
+    assert transcript.text == "<voice.ogg>" and transcript.segments == 1
+
+
+@pytest.mark.asyncio
+async def test_whisper_transcriber_uses_async_client_with_bytes():
+    class FakeTranscriptions:
+        def __init__(self):
+            self.kwargs = None
+
+        async def create(self, **kwargs):
+            self.kwargs = kwargs
+            return " reset the drive \n"
+
+    class FakeClient:
+        def __init__(self):
+            self.audio = type("Audio", (), {})()
+            self.audio.transcriptions = FakeTranscriptions()
+
+    client = FakeClient()
+    transcriber = WhisperTranscriber(client=client)
+
+    text = await transcriber.transcribe(b"OggS...", language="en", filename="note.ogg")
+
+    assert text == "reset the drive"
+    assert client.audio.transcriptions.kwargs["file"] == ("note.ogg", b"OggS...")
+    assert client.audio.transcriptions.kwargs["language"] == "en"
@@ -0,0 +1,271 @@
+"""
+Tests for the durable Stripe webhook queue
+(agent_factory/api/services/webhook_queue.py)
+
+Run with:
+    poetry run pytest tests/test_webhook_queue.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from agent_factory.api.services.webhook_queue import WebhookEventQueue
+
+
+def event(event_id, event_type="invoice.payment_succeeded", customer="cus_1", created=1000, **obj):
+    return json.dumps({
+        "id": event_id,
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"id": f"obj_{event_id}", "customer": customer, **obj}},
+    })
+
+
+async def enqueue(queue, event_id, event_type="invoice.payment_succeeded", customer="cus_1", created=1000, **obj):
+    return await queue.enqueue(
+        event_id, event_type, event(event_id, event_type, customer, created, **obj),
+        ordering_key=customer, created=created,
+    )
+
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+class Recorder:
+    """Handler that records calls and can fail or block per object id."""
+
+    def __init__(self, fail_times=None, delay=0.0):
+        self.calls = []
+        self.fail_times = dict(fail_times or {})
+        self.delay = delay
+
+    async def __call__(self, obj):
+        self.calls.append(obj["id"])
+        await asyncio.sleep(self.delay)
+        if self.fail_times.get(obj["id"], 0) > 0:
+            self.fail_times[obj["id"]] -= 1
+            raise RuntimeError("database unavailable")
+
+
+def make_queue(handler, db=":memory:", **kwargs):
+    kwargs.setdefault("base_backoff", 0.01)
+    kwargs.setdefault("poll_interval", 0.01)
+    return WebhookEventQueue(db, handlers={"invoice.payment_succeeded": handler}, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_event_processed_in_background():
+    handler = Recorder()
+    queue = make_queue(handler)
+
+    assert await enqueue(queue, "evt_1") is True
+    assert handler.calls == []  # Nothing runs before workers start
+
+    await queue.start()
+    await wait_for(lambda: queue.get("evt_1")["status"] == "done")
+    await queue.stop()
+
+    assert handler.calls == ["obj_evt_1"]
+    assert queue.metrics()["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redelivery_is_not_processed_twice():
+    handler = Recorder()
+    queue = make_queue(handler)
+    await queue.start()
+
+    assert await enqueue(queue, "evt_1") is True
+    await wait_for(lambda: queue.get("evt_1")["status"] == "done")
+    assert await enqueue(queue, "evt_1") is False
+    assert await enqueue(queue, "evt_1") is False
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert handler.calls == ["obj_evt_1"]
+    metrics = queue.metrics()
+    assert metrics["duplicates"] == 2
+    assert queue.get("evt_1")["duplicates"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_retried_with_backoff():
+    handler = Recorder(fail_times={"obj_evt_1": 2})
+    queue = make_queue(handler)
+    await queue.start()
+
+    await enqueue(queue, "evt_1")
+    await wait_for(lambda: queue.get("evt_1")["status"] == "done")
+    await queue.stop()
+
+    assert handler.calls == ["obj_evt_1"] * 3
+    assert queue.get("evt_1")["attempts"] == 2
+    assert queue.metrics()["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_dead_lettered_after_max_attempts():
+    handler = Recorder(fail_times={"obj_evt_1": 99})
+    queue = make_queue(handler, max_attempts=3)
+    await queue.start()
+
+    await enqueue(queue, "evt_1")
+    await wait_for(lambda: queue.get("evt_1")["status"] == "dead")
+    await queue.stop()
+
+    stored = queue.get("evt_1")
+    assert stored["attempts"] == 3
+    assert "database unavailable" in stored["last_error"]
+    assert queue.metrics()["dead"] == 1
+
+
+@pytest.mark.asyncio
+async def test_per_customer_order_kept_across_retries():
+    # evt_1 fails once; evt_2 (same customer, later) must wait for it,
+    # while evt_3 (another customer) is not held up.
+    handler = Recorder(fail_times={"obj_evt_1": 1})
+    queue = make_queue(handler, workers=4, base_backoff=0.1)
+
+    await enqueue(queue, "evt_2", customer="cus_a", created=1002)
+    await enqueue(queue, "evt_1", customer="cus_a", created=1001)  # Delivered out of order
+    await enqueue(queue, "evt_3", customer="cus_b", created=1003)
+    await queue.start()
+    await wait_for(lambda: queue.metrics()["processed"] == 3)
+    await queue.stop()
+
+    assert handler.calls == ["obj_evt_1", "obj_evt_3", "obj_evt_1", "obj_evt_2"]
+
+
+@pytest.mark.asyncio
+async def test_different_customers_run_concurrently():
+    handler = Recorder(delay=0.1)
+    queue = make_queue(handler, workers=4)
+    for i in range(4):
+        await enqueue(queue, f"evt_{i}", customer=f"cus_{i}")
+
+    start = asyncio.get_running_loop().time()
+    await queue.start()
+    await wait_for(lambda: queue.metrics()["processed"] == 4)
+    elapsed = asyncio.get_running_loop().time() - start
+    await queue.stop()
+
+    assert elapsed < 0.3  # Not 4 x 0.1s
+
+
+@pytest.mark.asyncio
+async def test_events_survive_restart(tmp_path):
+    db = str(tmp_path / "webhooks.db")
+    blocker = asyncio.Event()
+
+    async def slow(obj):
+        await blocker.wait()
+
+    first = make_queue(slow, db=db, lease_seconds=0.05)
+    await first.start()
+    await enqueue(first, "evt_1")
+    await enqueue(first, "evt_2", customer="cus_2")
+    await wait_for(lambda: first.get("evt_1")["status"] == "processing")
+    await first.stop()  # Crash/shutdown mid-handler
+    first.close()
+    await asyncio.sleep(0.1)  # Let the dead worker's lease expire
+
+    handler = Recorder()
+    second = make_queue(handler, db=db)
+    assert await enqueue(second, "evt_1") is False  # Still deduplicated
+    await second.start()
+    await wait_for(lambda: second.metrics()["done"] == 2)
+    await second.stop()
+
+    assert sorted(handler.calls) == ["obj_evt_1", "obj_evt_2"]
+
+
+@pytest.mark.asyncio
+async def test_start_leaves_live_leases_alone(tmp_path):
+    db = str(tmp_path / "webhooks.db")
+    blocker = asyncio.Event()
+
+    async def slow(obj):
+        await blocker.wait()
+
+    owner = make_queue(slow, db=db)
+    await owner.start()
+    await enqueue(owner, "evt_1")
+    await wait_for(lambda: owner.get("evt_1")["status"] == "processing")
+
+    handler = Recorder()
+    other = make_queue(handler, db=db)
+    await other.start()  # Another process sharing the store
+    await asyncio.sleep(0.05)
+
+    assert handler.calls == []
+    assert other.get("evt_1")["status"] == "processing"
+
+    blocker.set()
+    await wait_for(lambda: owner.get("evt_1")["status"] == "done")
+    await owner.stop()
+    await other.stop()
+
+
+@pytest.mark.asyncio
+async def test_claim_is_conditional_on_queued(tmp_path):
+    db = str(tmp_path / "webhooks.db")
+    first = make_queue(Recorder(), db=db)
+    second = make_queue(Recorder(), db=db)
+    await enqueue(first, "evt_1")
+    await enqueue(first, "evt_2", customer="cus_2")
+
+    claimed = [first._claim(), second._claim(), second._claim()]
+
+    assert sorted(row[1] for row in claimed[:2]) == ["evt_1", "evt_2"]
+    assert claimed[2] is None
+
+
+@pytest.mark.asyncio
+async def test_lease_renewed_while_handler_runs(tmp_path):
+    db = str(tmp_path / "webhooks.db")
+    handler = Recorder(delay=0.2)
+    owner = make_queue(handler, db=db, lease_seconds=0.06)
+    other = make_queue(handler, db=db, lease_seconds=0.06)
+    await owner.start()
+    await other.start()
+    await enqueue(owner, "evt_1")
+
+    await wait_for(lambda: owner.get("evt_1")["status"] == "done")
+    await owner.stop()
+    await other.stop()
+
+    assert handler.calls == ["obj_evt_1"]  # Never reclaimed mid-handler
+
+
+@pytest.mark.asyncio
+async def test_unhandled_event_type_is_completed():
+    queue = make_queue(Recorder())
+    await queue.start()
+    await queue.enqueue("evt_x", "customer.created", event("evt_x", "customer.created"))
+    await wait_for(lambda: queue.get("evt_x")["status"] == "done")
+    await queue.stop()
+
+    assert queue.metrics()["unhandled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_lag():
+    queue = make_queue(Recorder())
+    await enqueue(queue, "evt_1")
+    await asyncio.sleep(0.05)
+
+    metrics = queue.metrics()
+    assert metrics["queued"] == 1
+    assert metrics["lag_sec"] >= 0.05
+
+    await queue.start()
+    await wait_for(lambda: queue.metrics()["done"] == 1)
+    await queue.stop()
+    assert queue.metrics()["lag_sec"] == 0.0
+    assert queue.metrics()["last_lag_sec"] >= 0.05